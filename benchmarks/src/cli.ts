@@ -0,0 +1,233 @@
+/**
+ * Benchmark entry point.
+ *
+ *   npm run bench -w @nodetool-ai/benchmarks -- kernel --scale 0.1 --out kernel.json
+ *   npm run bench -w @nodetool-ai/benchmarks -- inbox --stores memory,group-commit
+ *   npm run bench -w @nodetool-ai/benchmarks -- partition --partitions 4
+ *   npm run bench -w @nodetool-ai/benchmarks -- framing --sizes 1,16,256
+ *   npm run bench -w @nodetool-ai/benchmarks -- packing --turns 100,300
+ *
+ * Writes the JSON report to `--out` (or stdout) and a one-line summary per
+ * scenario to stderr. Run with `--expose-gc` (the `bench` script does) so
+ * heap figures are measured after a full collection.
+ */
+
+import { writeFile } from "node:fs/promises";
+import { parseArgs } from "node:util";
+import { runKernelSuite } from "./kernel/suite.js";
+import type { KernelBenchResult } from "./kernel/run.js";
+import { runInboxSuite, type InboxBenchResult } from "./inbox/suite.js";
+import {
+  runPartitionSuite,
+  type PartitionBenchResult
+} from "./partition/suite.js";
+import { runFramingSuite, type FramingBenchResult } from "./framing/suite.js";
+import { runPackingSuite, type PackingBenchResult } from "./packing/suite.js";
+import type { BenchReport } from "./report.js";
+
+const USAGE = `usage: bench <suite> [options]
+
+suites:
+  kernel                 WorkflowRunner per-message and per-node overhead
+  inbox                  durable inbox messages/sec per store
+  partition              in-process vs multi-process runs of CPU-bound graphs
+  framing                Python bridge frame encode/decode, 1-256 MiB frames
+  packing                context-packer token counting on long agent threads
+
+options:
+  --scale <n>            multiply item counts (default 1)
+  --scenario <a,b,...>   kernel, partition: run only these scenarios
+  --buffer-limit <n>     kernel: per-inbox buffer limit (default unbounded)
+  --stores <a,b,...>     inbox: run only these stores
+  --inboxes <n>          inbox: concurrent inboxes (default 32)
+  --partitions <n>       partition: processes per run (default min(4, cores))
+  --work <n>             partition: hash rounds per item (default 200000)
+  --sizes <a,b,...>      framing: frame sizes in MiB (default 1,4,16,64,256)
+  --chunk <n>            framing: bytes per decoder push (default 65536)
+  --baseline-max <n>     framing: largest MiB size for the concat baseline
+                         (default 16)
+  --turns <a,b,...>      packing: thread lengths in turns (default 50,100,300)
+  --budget <n>           packing: token budget per pack (default 32000)
+  --recount-max <n>      packing: longest thread for the uncached loop
+                         (default 100)
+  --out <file>           write the JSON report here instead of stdout`;
+
+function summariseInbox(r: InboxBenchResult): string {
+  return (
+    `${r.store.padEnd(12)} ` +
+    `${Math.round(r.messagesPerSec).toLocaleString().padStart(12)} msg/s  ` +
+    `append ${Math.round(r.appendsPerSec).toLocaleString()}/s  ` +
+    `consume ${Math.round(r.consumesPerSec).toLocaleString()}/s` +
+    (r.commits === null ? "" : `  ${r.commits} commits`)
+  );
+}
+
+function summarisePartition(r: PartitionBenchResult): string {
+  return (
+    `${r.scenario.padEnd(12)} ${r.partitioned.status.padEnd(9)} ` +
+    `${Math.round(r.inProcess.itemsPerSec).toLocaleString().padStart(10)} ` +
+    `→ ${Math.round(r.partitioned.itemsPerSec).toLocaleString()} items/s  ` +
+    `x${r.speedup.toFixed(2)} over ${r.partitions} processes  ` +
+    `${r.partitioned.frames.toLocaleString()} frames`
+  );
+}
+
+function summariseFraming(r: FramingBenchResult): string {
+  const mb = (r.frameBytes / 1048576).toFixed(0);
+  return (
+    `${`${mb} MiB`.padEnd(10)} ` +
+    `decode ${r.decodeMs.toFixed(1).padStart(8)} ms  ` +
+    `${Math.round(r.decodeMBps).toLocaleString().padStart(7)} MiB/s  ` +
+    (r.speedup === null
+      ? "no baseline  "
+      : `x${r.speedup.toFixed(1)} over concat  `) +
+    `encode ${r.encodeMs.toFixed(2)} ms → writeFrame ` +
+    `${r.writeFrameMs.toFixed(3)} ms`
+  );
+}
+
+function summarisePacking(r: PackingBenchResult): string {
+  return (
+    `${`${r.turns} turns`.padEnd(10)} ` +
+    `cold ${r.coldMs.toFixed(1).padStart(8)} ms  ` +
+    `warm ${r.warmMs.toFixed(2).padStart(7)} ms  ` +
+    `x${r.warmSpeedup.toFixed(1)}  per turn: ` +
+    (r.recountTurnMs === null
+      ? ""
+      : `recount ${r.recountTurnMs.toFixed(2)} ms → `) +
+    `memoized ${r.memoizedTurnMs.toFixed(2)} ms → ` +
+    `incremental ${r.incrementalTurnMs.toFixed(3)} ms`
+  );
+}
+
+function summarise(r: KernelBenchResult): string {
+  const p99 = Math.max(0, ...Object.values(r.edgeLatencyMs).map((l) => l.p99));
+  return (
+    `${r.scenario.padEnd(12)} ${r.status.padEnd(9)} ` +
+    `${Math.round(r.itemsPerSec).toLocaleString().padStart(12)} items/s  ` +
+    `worst edge p99 ${p99.toFixed(3)} ms  ` +
+    `heap +${(r.heap.growthBytes / 1048576).toFixed(1)} MiB  ` +
+    `gc ${r.gc.totalMs.toFixed(1)} ms`
+  );
+}
+
+async function main(): Promise<number> {
+  const { positionals, values } = parseArgs({
+    allowPositionals: true,
+    options: {
+      scale: { type: "string" },
+      scenario: { type: "string" },
+      "buffer-limit": { type: "string" },
+      stores: { type: "string" },
+      inboxes: { type: "string" },
+      partitions: { type: "string" },
+      work: { type: "string" },
+      sizes: { type: "string" },
+      chunk: { type: "string" },
+      "baseline-max": { type: "string" },
+      turns: { type: "string" },
+      budget: { type: "string" },
+      "recount-max": { type: "string" },
+      out: { type: "string" },
+      help: { type: "boolean", short: "h" }
+    }
+  });
+  const [suite] = positionals;
+  if (
+    values.help ||
+    (suite !== "kernel" &&
+      suite !== "inbox" &&
+      suite !== "partition" &&
+      suite !== "framing" &&
+      suite !== "packing")
+  ) {
+    process.stderr.write(`${USAGE}\n`);
+    return values.help ? 0 : 2;
+  }
+  const scale = values.scale ? Number(values.scale) : undefined;
+
+  let report: BenchReport<
+    | KernelBenchResult
+    | InboxBenchResult
+    | PartitionBenchResult
+    | FramingBenchResult
+    | PackingBenchResult
+  >;
+  let healthy: boolean;
+  if (suite === "packing") {
+    // A pack that differs from packContext throws, as does a bad option.
+    report = await runPackingSuite({
+      turns: values.turns?.split(",").map((s) => Number(s.trim())),
+      budget: values.budget ? Number(values.budget) : undefined,
+      recountMaxTurns: values["recount-max"]
+        ? Number(values["recount-max"])
+        : undefined,
+      onResult: (r) => process.stderr.write(`${summarisePacking(r)}\n`)
+    });
+    healthy = true;
+  } else if (suite === "framing") {
+    // A frame that fails to decode throws, so a finished run is healthy.
+    report = await runFramingSuite({
+      sizesMb: values.sizes?.split(",").map((s) => Number(s.trim())),
+      chunkBytes: values.chunk ? Number(values.chunk) : undefined,
+      baselineMaxMb: values["baseline-max"]
+        ? Number(values["baseline-max"])
+        : undefined,
+      onResult: (r) => process.stderr.write(`${summariseFraming(r)}\n`)
+    });
+    healthy = true;
+  } else if (suite === "partition") {
+    const partition = await runPartitionSuite({
+      scale,
+      scenarios: values.scenario?.split(",").map((s) => s.trim()),
+      partitions: values.partitions ? Number(values.partitions) : undefined,
+      work: values.work ? Number(values.work) : undefined,
+      onResult: (r) => process.stderr.write(`${summarisePartition(r)}\n`)
+    });
+    healthy = partition.results.every(
+      (r) =>
+        r.inProcess.status === "completed" &&
+        r.partitioned.status === "completed" &&
+        r.partitioned.delivered === r.items
+    );
+    report = partition;
+  } else if (suite === "inbox") {
+    const inbox = await runInboxSuite({
+      scale,
+      stores: values.stores?.split(",").map((s) => s.trim()),
+      inboxes: values.inboxes ? Number(values.inboxes) : undefined,
+      onResult: (r) => process.stderr.write(`${summariseInbox(r)}\n`)
+    });
+    healthy = inbox.results.every((r) => r.consumed === r.messages);
+    report = inbox;
+  } else {
+    const kernel = await runKernelSuite({
+      scale,
+      scenarios: values.scenario?.split(",").map((s) => s.trim()),
+      bufferLimit: values["buffer-limit"]
+        ? Number(values["buffer-limit"])
+        : null,
+      onResult: (r) => process.stderr.write(`${summarise(r)}\n`)
+    });
+    healthy = kernel.results.every(
+      (r) => r.status === "completed" && r.delivered === r.items
+    );
+    report = kernel;
+  }
+
+  const json = `${JSON.stringify(report, null, 2)}\n`;
+  if (values.out) {
+    await writeFile(values.out, json);
+  } else {
+    process.stdout.write(json);
+  }
+  return healthy ? 0 : 1;
+}
+
+main().then(
+  (code) => process.exit(code),
+  (err) => {
+    process.stderr.write(`${err instanceof Error ? err.stack : String(err)}\n`);
+    process.exit(1);
+  }
+);
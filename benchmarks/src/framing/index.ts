@@ -0,0 +1,8 @@
+export {
+  ConcatFrameDecoder,
+  runFramingScenario,
+  runFramingSuite,
+  type FramingBenchResult,
+  type FramingScenarioOptions,
+  type FramingSuiteOptions
+} from "./suite.js";
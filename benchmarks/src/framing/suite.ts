@@ -0,0 +1,213 @@
+/**
+ * The `framing` suite: the Python bridge's length-prefixed framing on large
+ * frames, as image and tensor payloads produce them.
+ *
+ * Each frame size is encoded once, then cut into pipe-sized chunks (64 KiB,
+ * what a Linux pipe delivers per `data` event) and fed through:
+ *
+ *  - `FrameDecoder` — the runtime's chunk-list decoder, which copies a frame
+ *    once when it is complete.
+ *  - `ConcatFrameDecoder` — the previous decoder, kept here as the baseline:
+ *    it concatenates every chunk onto everything buffered so far, so its cost
+ *    grows with the square of the frame size. It only runs up to
+ *    `baselineMaxMb`.
+ *
+ * Encoding is measured both ways too: `encodeFrame` (header and payload
+ * concatenated into a new buffer) against `writeFrame` into a corking sink
+ * (two chunks, no payload copy).
+ */
+
+import {
+  encodeFrame,
+  FrameDecoder,
+  writeFrame,
+  type FrameSink
+} from "@nodetool-ai/runtime";
+import { GcRecorder, now, type GcSummary } from "../metrics.js";
+import { createReport, type BenchReport } from "../report.js";
+
+export interface FramingBenchResult {
+  frameBytes: number;
+  chunkBytes: number;
+  /** Chunks per frame. */
+  chunks: number;
+  /** Frames decoded per measurement; smaller frames repeat more. */
+  iterations: number;
+  /** Mean milliseconds to decode one frame. */
+  decodeMs: number;
+  decodeMBps: number;
+  decodeGc: GcSummary;
+  /** Same, with the concatenating decoder; null above `baselineMaxMb`. */
+  baselineDecodeMs: number | null;
+  baselineGc: GcSummary | null;
+  /** Baseline decode time over chunk-list decode time. */
+  speedup: number | null;
+  /** Mean milliseconds for `encodeFrame`. */
+  encodeMs: number;
+  /** Mean milliseconds for `writeFrame` into a corking sink. */
+  writeFrameMs: number;
+}
+
+export interface FramingScenarioOptions {
+  /** Bytes per `push`. Default 64 KiB. */
+  chunkBytes?: number;
+  /** Frames decoded per measurement. Default: enough for ~64 MiB. */
+  iterations?: number;
+  /** Also run the concatenating decoder. Default true. */
+  baseline?: boolean;
+}
+
+export interface FramingSuiteOptions {
+  /** Frame sizes in MiB. Default 1, 4, 16, 64 and 256. */
+  sizesMb?: number[];
+  /** Bytes per `push`. Default 64 KiB. */
+  chunkBytes?: number;
+  /** Largest size the concatenating baseline runs at. Default 16 MiB. */
+  baselineMaxMb?: number;
+  onResult?: (result: FramingBenchResult) => void;
+}
+
+const MB = 1024 * 1024;
+const DEFAULT_SIZES_MB = [1, 4, 16, 64, 256];
+const DEFAULT_CHUNK_BYTES = 64 * 1024;
+const DEFAULT_BASELINE_MAX_MB = 16;
+
+interface Decoder {
+  push(chunk: Buffer, onFrame: (frame: Buffer) => void): void;
+}
+
+/**
+ * The decoder `FrameDecoder` replaced: one `Buffer.concat` per chunk. Kept
+ * only as this suite's baseline.
+ */
+export class ConcatFrameDecoder implements Decoder {
+  private _buffer = Buffer.alloc(0);
+
+  push(chunk: Buffer, onFrame: (frame: Buffer) => void): void {
+    this._buffer = Buffer.concat([this._buffer, chunk]);
+    while (this._buffer.length >= 4) {
+      const length = this._buffer.readUInt32BE(0);
+      if (this._buffer.length < 4 + length) break;
+      const frame = this._buffer.subarray(4, 4 + length);
+      this._buffer = this._buffer.subarray(4 + length);
+      onFrame(frame);
+    }
+  }
+}
+
+/** A `Writable`-shaped sink that only counts bytes. */
+function countingSink(): FrameSink & { bytes: number } {
+  return {
+    bytes: 0,
+    write(chunk: Buffer) {
+      this.bytes += chunk.length;
+      return true;
+    },
+    cork() {},
+    uncork() {}
+  };
+}
+
+function timeDecode(
+  create: () => Decoder,
+  frame: Buffer,
+  chunkBytes: number,
+  iterations: number
+): { ms: number; gc: GcSummary } {
+  const expected = frame.length - 4;
+  const gc = new GcRecorder();
+  gc.start();
+  const started = now();
+  for (let i = 0; i < iterations; i++) {
+    const decoder = create();
+    let decoded = -1;
+    for (let offset = 0; offset < frame.length; offset += chunkBytes) {
+      decoder.push(frame.subarray(offset, offset + chunkBytes), (f) => {
+        decoded = f.length;
+      });
+    }
+    if (decoded !== expected) {
+      throw new Error(`Decoded ${decoded} bytes, expected ${expected}`);
+    }
+  }
+  const ms = (now() - started) / iterations;
+  return { ms, gc: gc.stop() };
+}
+
+export function runFramingScenario(
+  frameBytes: number,
+  options: FramingScenarioOptions = {}
+): FramingBenchResult {
+  const chunkBytes = options.chunkBytes ?? DEFAULT_CHUNK_BYTES;
+  const iterations =
+    options.iterations ?? Math.max(1, Math.floor((64 * MB) / frameBytes));
+  const payload = Buffer.alloc(frameBytes - 4, 0xa5);
+
+  let started = now();
+  let frame = encodeFrame(payload);
+  for (let i = 1; i < iterations; i++) frame = encodeFrame(payload);
+  const encodeMs = (now() - started) / iterations;
+
+  const sink = countingSink();
+  started = now();
+  for (let i = 0; i < iterations; i++) writeFrame(sink, payload);
+  const writeFrameMs = (now() - started) / iterations;
+
+  const decode = timeDecode(
+    () => new FrameDecoder({ maxFrameSize: frameBytes }),
+    frame,
+    chunkBytes,
+    iterations
+  );
+  const baseline =
+    options.baseline === false
+      ? null
+      : timeDecode(
+          () => new ConcatFrameDecoder(),
+          frame,
+          chunkBytes,
+          iterations
+        );
+
+  return {
+    frameBytes,
+    chunkBytes,
+    chunks: Math.ceil(frameBytes / chunkBytes),
+    iterations,
+    decodeMs: decode.ms,
+    decodeMBps: decode.ms > 0 ? frameBytes / MB / (decode.ms / 1000) : 0,
+    decodeGc: decode.gc,
+    baselineDecodeMs: baseline?.ms ?? null,
+    baselineGc: baseline?.gc ?? null,
+    speedup: baseline && decode.ms > 0 ? baseline.ms / decode.ms : null,
+    encodeMs,
+    writeFrameMs
+  };
+}
+
+export async function runFramingSuite(
+  options: FramingSuiteOptions = {}
+): Promise<BenchReport<FramingBenchResult>> {
+  const sizesMb = options.sizesMb?.length ? options.sizesMb : DEFAULT_SIZES_MB;
+  const invalid = sizesMb.filter((mb) => !(mb > 0));
+  if (invalid.length > 0) {
+    throw new Error(`Invalid frame size(s): ${invalid.join(", ")}`);
+  }
+  const chunkBytes = options.chunkBytes ?? DEFAULT_CHUNK_BYTES;
+  const baselineMaxMb = options.baselineMaxMb ?? DEFAULT_BASELINE_MAX_MB;
+
+  const results: FramingBenchResult[] = [];
+  for (const mb of sizesMb) {
+    const result = runFramingScenario(Math.round(mb * MB), {
+      chunkBytes,
+      baseline: mb <= baselineMaxMb
+    });
+    options.onResult?.(result);
+    results.push(result);
+  }
+  return createReport(
+    "framing",
+    { sizesMb, chunkBytes, baselineMaxMb },
+    results
+  );
+}
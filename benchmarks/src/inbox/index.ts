@@ -0,0 +1,8 @@
+export {
+  INBOX_STORES,
+  runInboxScenario,
+  runInboxSuite,
+  type InboxBenchResult,
+  type InboxStoreName,
+  type InboxSuiteOptions
+} from "./suite.js";
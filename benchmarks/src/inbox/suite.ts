@@ -0,0 +1,158 @@
+/**
+ * The `inbox` suite: durable-inbox throughput per store.
+ *
+ * Appends `messages` to each of `inboxes` inboxes concurrently through
+ * `DurableInbox` (which serialises appends per inbox, as the trigger wakeup
+ * service does), then drains every inbox with `getPending` + `markConsumed`.
+ * Each store gets a fresh SQLite file, so the figures include real journal
+ * syncs:
+ *
+ *  - `memory`       — `MemoryDurableInboxStore`, the ceiling
+ *  - `drizzle`      — `DrizzleDurableInboxStore`, one transaction per write
+ *  - `group-commit` — `GroupCommitDurableInboxStore`, batched commits
+ */
+
+import { mkdtempSync, rmSync } from "node:fs";
+import { tmpdir } from "node:os";
+import { join } from "node:path";
+import {
+  DurableInbox,
+  MemoryDurableInboxStore,
+  type DurableInboxStore
+} from "@nodetool-ai/kernel";
+import { closeDb, initDb } from "@nodetool-ai/models";
+import {
+  DrizzleDurableInboxStore,
+  GroupCommitDurableInboxStore
+} from "@nodetool-ai/websocket";
+import { now } from "../metrics.js";
+import { createReport, type BenchReport } from "../report.js";
+
+export const INBOX_STORES = ["memory", "drizzle", "group-commit"] as const;
+export type InboxStoreName = (typeof INBOX_STORES)[number];
+
+export interface InboxBenchResult {
+  store: InboxStoreName;
+  inboxes: number;
+  messages: number;
+  /** Messages read back pending and consumed; equals `messages` when healthy. */
+  consumed: number;
+  appendMs: number;
+  consumeMs: number;
+  appendsPerSec: number;
+  consumesPerSec: number;
+  /** Messages appended and consumed per second, end to end. */
+  messagesPerSec: number;
+  /** Write transactions, for the group-commit store. */
+  commits: number | null;
+}
+
+export interface InboxSuiteOptions {
+  /** Multiplier on the message count (10,000 at scale 1). */
+  scale?: number;
+  /** Concurrent inboxes sharing the store. Default 32. */
+  inboxes?: number;
+  /** Run only these stores. Default all. */
+  stores?: string[];
+  onResult?: (result: InboxBenchResult) => void;
+}
+
+const BASE_MESSAGES = 10_000;
+
+function createStore(name: InboxStoreName): DurableInboxStore {
+  switch (name) {
+    case "memory":
+      return new MemoryDurableInboxStore();
+    case "drizzle":
+      return new DrizzleDurableInboxStore();
+    case "group-commit":
+      return new GroupCommitDurableInboxStore();
+  }
+}
+
+export async function runInboxScenario(
+  storeName: InboxStoreName,
+  messages: number,
+  inboxCount: number
+): Promise<InboxBenchResult> {
+  const dir = mkdtempSync(join(tmpdir(), "bench-inbox-"));
+  initDb(join(dir, "bench.sqlite3"));
+  try {
+    const store = createStore(storeName);
+    const inboxes = Array.from(
+      { length: inboxCount },
+      (_, i) => new DurableInbox("bench", `node-${i}`, store)
+    );
+    const perInbox = Math.ceil(messages / inboxCount);
+    const total = perInbox * inboxCount;
+
+    const appendStarted = now();
+    await Promise.all(
+      inboxes.flatMap((inbox) =>
+        Array.from({ length: perInbox }, (_, i) =>
+          inbox.append("trigger", { i, at: Date.now() })
+        )
+      )
+    );
+    const appendMs = now() - appendStarted;
+
+    const consumeStarted = now();
+    const counts = await Promise.all(
+      inboxes.map(async (inbox) => {
+        const pending = await inbox.getPending("trigger", perInbox);
+        await Promise.all(pending.map((m) => inbox.markConsumed(m)));
+        return pending.length;
+      })
+    );
+    const consumeMs = now() - consumeStarted;
+    const consumed = counts.reduce((a, b) => a + b, 0);
+
+    const rate = (n: number, ms: number) => (ms > 0 ? (n * 1000) / ms : 0);
+    return {
+      store: storeName,
+      inboxes: inboxCount,
+      messages: total,
+      consumed,
+      appendMs,
+      consumeMs,
+      appendsPerSec: rate(total, appendMs),
+      consumesPerSec: rate(consumed, consumeMs),
+      messagesPerSec: rate(total, appendMs + consumeMs),
+      commits:
+        store instanceof GroupCommitDurableInboxStore
+          ? store.stats.commits
+          : null
+    };
+  } finally {
+    closeDb();
+    rmSync(dir, { recursive: true, force: true });
+  }
+}
+
+export async function runInboxSuite(
+  options: InboxSuiteOptions = {}
+): Promise<BenchReport<InboxBenchResult>> {
+  const scale = options.scale ?? 1;
+  const inboxes = options.inboxes ?? 32;
+  const unknown = (options.stores ?? []).filter(
+    (name) => !(INBOX_STORES as readonly string[]).includes(name)
+  );
+  if (unknown.length > 0) {
+    throw new Error(
+      `Unknown inbox store(s): ${unknown.join(", ")}. ` +
+        `Known: ${INBOX_STORES.join(", ")}`
+    );
+  }
+  const selected = options.stores?.length
+    ? INBOX_STORES.filter((s) => options.stores!.includes(s))
+    : INBOX_STORES;
+
+  const messages = Math.max(inboxes, Math.round(BASE_MESSAGES * scale));
+  const results: InboxBenchResult[] = [];
+  for (const store of selected) {
+    const result = await runInboxScenario(store, messages, inboxes);
+    options.onResult?.(result);
+    results.push(result);
+  }
+  return createReport("inbox", { scale, inboxes }, results);
+}
@@ -0,0 +1,24 @@
+/**
+ * @nodetool-ai/benchmarks – Public API
+ */
+
+export {
+  GcRecorder,
+  HeapRecorder,
+  LatencySampler,
+  percentile,
+  type GcSummary,
+  type HeapSummary,
+  type LatencySummary
+} from "./metrics.js";
+export {
+  benchEnvironment,
+  createReport,
+  type BenchEnvironment,
+  type BenchReport
+} from "./report.js";
+export * from "./kernel/index.js";
+export * from "./inbox/index.js";
+export * from "./partition/index.js";
+export * from "./framing/index.js";
+export * from "./packing/index.js";
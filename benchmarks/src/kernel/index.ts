@@ -0,0 +1,15 @@
+export {
+  KERNEL_SCENARIOS,
+  fanOutFanIn,
+  linearChain,
+  streaming,
+  zipJoin,
+  type KernelScenario,
+  type ScenarioSpec
+} from "./scenarios.js";
+export {
+  runKernelScenario,
+  type KernelBenchResult,
+  type KernelRunnerOptions
+} from "./run.js";
+export { runKernelSuite, type KernelSuiteOptions } from "./suite.js";
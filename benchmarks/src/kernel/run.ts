@@ -0,0 +1,86 @@
+/**
+ * Run kernel scenarios through `WorkflowRunner` and collect their metrics.
+ */
+
+import { WorkflowRunner, type WorkflowRunnerOptions } from "@nodetool-ai/kernel";
+import {
+  GcRecorder,
+  HeapRecorder,
+  now,
+  type GcSummary,
+  type HeapSummary,
+  type LatencySummary
+} from "../metrics.js";
+import type { KernelScenario } from "./scenarios.js";
+
+export interface KernelBenchResult {
+  scenario: string;
+  status: string;
+  items: number;
+  /** Items the sink actually received; equals `items` on a healthy run. */
+  delivered: number;
+  nodes: number;
+  edges: number;
+  wallMs: number;
+  itemsPerSec: number;
+  /** Node invocations per second across the whole graph. */
+  messagesPerSec: number;
+  edgeLatencyMs: Record<string, LatencySummary>;
+  heap: HeapSummary;
+  gc: GcSummary;
+}
+
+export type KernelRunnerOptions = Pick<
+  WorkflowRunnerOptions,
+  "bufferLimit" | "strict"
+>;
+
+export async function runKernelScenario(
+  scenario: KernelScenario,
+  runnerOptions: KernelRunnerOptions = {}
+): Promise<KernelBenchResult> {
+  const runner = new WorkflowRunner(`bench-${scenario.name}`, {
+    ...runnerOptions,
+    resolveExecutor: scenario.resolveExecutor
+  });
+  const graphData = {
+    nodes: scenario.graph.nodes,
+    edges: scenario.graph.edges
+  };
+
+  const heap = new HeapRecorder();
+  const gc = new GcRecorder();
+  heap.start();
+  gc.start();
+  const started = now();
+  const result = await runner.run(
+    { job_id: `bench-${scenario.name}`, params: scenario.params },
+    graphData
+  );
+  const wallMs = now() - started;
+  const gcSummary = gc.stop();
+  const heapSummary = heap.stop();
+
+  const edgeLatencyMs: Record<string, LatencySummary> = {};
+  let messages = 0;
+  for (const [edgeId, sampler] of scenario.edgeLatency) {
+    const summary = sampler.summary();
+    edgeLatencyMs[edgeId] = summary;
+    messages += summary.count;
+  }
+  const seconds = wallMs / 1000;
+  return {
+    scenario: scenario.name,
+    status: result.status,
+    items: scenario.items,
+    delivered: scenario.delivered(),
+    nodes: graphData.nodes.length,
+    edges: graphData.edges.length,
+    wallMs,
+    itemsPerSec: seconds > 0 ? scenario.delivered() / seconds : 0,
+    messagesPerSec: seconds > 0 ? messages / seconds : 0,
+    edgeLatencyMs,
+    heap: heapSummary,
+    gc: gcSummary
+  };
+}
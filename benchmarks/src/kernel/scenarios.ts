@@ -0,0 +1,214 @@
+/**
+ * Synthetic graphs for the kernel suite.
+ *
+ * Every scenario is fed by one `test.Input` (the item count) into a
+ * streaming `bench.Source` whose output is an iteration: each item gets its
+ * own correlation token, so multi-input nodes downstream join branches by
+ * item identity (the correlation-era `zip_all`).
+ *
+ * Items are `{ t }` stamps. Each node records `now - t` against the edge the
+ * item arrived on and re-stamps what it emits, so per-edge latency is the
+ * time from an upstream emit to the downstream `process` call — queueing,
+ * routing and scheduling included. Node bodies do nothing else, so
+ * throughput is pure kernel overhead.
+ */
+
+import type { Edge, NodeDescriptor } from "@nodetool-ai/protocol";
+import { Graph, type NodeExecutor } from "@nodetool-ai/kernel";
+import { LatencySampler, now } from "../metrics.js";
+
+export interface KernelScenario {
+  name: string;
+  /** Items the source emits and the sink should receive. */
+  items: number;
+  graph: Graph;
+  /** Run parameters for the `test.Input` node. */
+  params: Record<string, unknown>;
+  resolveExecutor: (node: NodeDescriptor) => NodeExecutor;
+  /** Latency samplers keyed by edge id. */
+  edgeLatency: Map<string, LatencySampler>;
+  /** Items the sink has received so far. */
+  delivered: () => number;
+}
+
+interface Stamp {
+  t: number;
+}
+
+const COUNT_INPUT = "count";
+
+/**
+ * Shared node/edge assembly and executor wiring. Executors are keyed by node
+ * type; each records latency for the edge it was fed by.
+ */
+class ScenarioBuilder {
+  readonly nodes: NodeDescriptor[] = [];
+  readonly edges: Edge[] = [];
+  readonly edgeLatency = new Map<string, LatencySampler>();
+  /** Target node id + handle → edge id, for latency attribution. */
+  private _edgeInto = new Map<string, string>();
+  private _delivered = 0;
+
+  constructor() {
+    this.nodes.push({ id: "count", type: "test.Input", name: COUNT_INPUT });
+    this.nodes.push({
+      id: "source",
+      type: "bench.Source",
+      is_streaming_output: true,
+      output_correlation: {
+        output: { kind: "iteration", source: "__execution__" }
+      }
+    });
+    this.connect("count", "source", "count", "value");
+  }
+
+  node(id: string, type: string, extra: Partial<NodeDescriptor> = {}): string {
+    this.nodes.push({ id, type, ...extra });
+    return id;
+  }
+
+  connect(
+    source: string,
+    target: string,
+    targetHandle = "input",
+    sourceHandle = "output"
+  ): void {
+    const id = `${source}->${target}.${targetHandle}`;
+    this.edges.push({ id, source, sourceHandle, target, targetHandle });
+    if (source !== "count") {
+      this.edgeLatency.set(id, new LatencySampler());
+      this._edgeInto.set(`${target}.${targetHandle}`, id);
+    }
+  }
+
+  build(name: string, items: number): KernelScenario {
+    const graph = new Graph({ nodes: this.nodes, edges: this.edges });
+    graph.validate();
+    return {
+      name,
+      items,
+      graph,
+      params: { [COUNT_INPUT]: items },
+      resolveExecutor: (node) => this._executor(node),
+      edgeLatency: this.edgeLatency,
+      delivered: () => this._delivered
+    };
+  }
+
+  private _observe(nodeId: string, inputs: Record<string, unknown>): void {
+    const at = now();
+    for (const [handle, value] of Object.entries(inputs)) {
+      const edgeId = this._edgeInto.get(`${nodeId}.${handle}`);
+      if (!edgeId) continue;
+      this.edgeLatency.get(edgeId)!.record(at - (value as Stamp).t);
+    }
+  }
+
+  private _executor(node: NodeDescriptor): NodeExecutor {
+    const observe = (inputs: Record<string, unknown>) =>
+      this._observe(node.id, inputs);
+    const deliver = () => {
+      this._delivered++;
+    };
+    switch (node.type) {
+      case "bench.Source":
+        return {
+          async process() {
+            return {};
+          },
+          async *genProcess(inputs) {
+            const n = Number(inputs.count);
+            for (let i = 0; i < n; i++) yield { output: { t: now() } };
+          }
+        };
+      case "bench.Sink":
+        return {
+          async process(inputs) {
+            observe(inputs);
+            deliver();
+            return {};
+          }
+        };
+      default:
+        // Pass-through for chains, fan-out branches, joins.
+        return {
+          async process(inputs) {
+            observe(inputs);
+            return { output: { t: now() } };
+          }
+        };
+    }
+  }
+}
+
+/** source → pass_1 → … → pass_depth → sink. */
+export function linearChain(depth: number, items: number): KernelScenario {
+  const b = new ScenarioBuilder();
+  let prev = "source";
+  for (let i = 1; i <= depth; i++) {
+    const id = b.node(`pass_${i}`, "bench.Pass");
+    b.connect(prev, id);
+    prev = id;
+  }
+  b.connect(prev, b.node("sink", "bench.Sink"));
+  return b.build(`chain-${depth}`, items);
+}
+
+/**
+ * source → width pass nodes → one merge with `width` inputs → sink. Every
+ * branch carries the same item tokens, so the merge fires once per item
+ * after all `width` copies of it arrive.
+ */
+export function fanOutFanIn(width: number, items: number): KernelScenario {
+  const b = new ScenarioBuilder();
+  const merge = b.node("merge", "bench.Pass");
+  for (let i = 1; i <= width; i++) {
+    const id = b.node(`branch_${i}`, "bench.Pass");
+    b.connect("source", id);
+    b.connect(id, merge, `in_${i}`);
+  }
+  b.connect(merge, b.node("sink", "bench.Sink"));
+  return b.build(`fan-${width}`, items);
+}
+
+/**
+ * source → two branches of unequal depth → a two-input join → sink. The
+ * join pairs the branches by item token (what `zip_all` did by arrival
+ * order before correlation), so the sink sees `items` pairs and the short
+ * branch's items wait in the join's inbox for their partners.
+ */
+export function zipJoin(items: number): KernelScenario {
+  const b = new ScenarioBuilder();
+  b.connect("source", b.node("left", "bench.Pass"));
+  b.connect("source", b.node("right_1", "bench.Pass"));
+  b.connect("right_1", b.node("right", "bench.Pass"));
+  const join = b.node("join", "bench.Pass");
+  b.connect("left", join, "a");
+  b.connect("right", join, "b");
+  b.connect(join, b.node("sink", "bench.Sink"));
+  return b.build("zip-all", items);
+}
+
+/** source → sink: one edge, the per-message floor. */
+export function streaming(items: number): KernelScenario {
+  const b = new ScenarioBuilder();
+  b.connect("source", b.node("sink", "bench.Sink"));
+  return b.build(`stream-${items}`, items);
+}
+
+export interface ScenarioSpec {
+  name: string;
+  create: (scale: number) => KernelScenario;
+}
+
+/**
+ * The default suite. `scale` multiplies item counts, so `--scale 0.01` gives
+ * a quick smoke run and `--scale 1` the full numbers (1M for streaming).
+ */
+export const KERNEL_SCENARIOS: readonly ScenarioSpec[] = [
+  { name: "stream", create: (s) => streaming(Math.round(1_000_000 * s)) },
+  { name: "chain-10", create: (s) => linearChain(10, Math.round(50_000 * s)) },
+  { name: "chain-100", create: (s) => linearChain(100, Math.round(5_000 * s)) },
+  { name: "fan-16", create: (s) => fanOutFanIn(16, Math.round(20_000 * s)) },
+  { name: "zip-all", create: (s) => zipJoin(Math.round(100_000 * s)) }
+];
@@ -0,0 +1,51 @@
+/**
+ * The `kernel` suite: every scenario in {@link KERNEL_SCENARIOS}, run in
+ * sequence in this process.
+ */
+
+import { createReport, type BenchReport } from "../report.js";
+import { KERNEL_SCENARIOS } from "./scenarios.js";
+import { runKernelScenario, type KernelBenchResult } from "./run.js";
+
+export interface KernelSuiteOptions {
+  /** Multiplier on each scenario's item count. Default 1. */
+  scale?: number;
+  /** Run only these scenarios, by name. Default all. */
+  scenarios?: string[];
+  /** Per-inbox buffer limit passed to the runner. Default unbounded. */
+  bufferLimit?: number | null;
+  /** Called after each scenario, e.g. for progress output. */
+  onResult?: (result: KernelBenchResult) => void;
+}
+
+export async function runKernelSuite(
+  options: KernelSuiteOptions = {}
+): Promise<BenchReport<KernelBenchResult>> {
+  const scale = options.scale ?? 1;
+  const selected = options.scenarios?.length
+    ? KERNEL_SCENARIOS.filter((s) => options.scenarios!.includes(s.name))
+    : KERNEL_SCENARIOS;
+  const unknown = (options.scenarios ?? []).filter(
+    (name) => !KERNEL_SCENARIOS.some((s) => s.name === name)
+  );
+  if (unknown.length > 0) {
+    throw new Error(
+      `Unknown kernel scenario(s): ${unknown.join(", ")}. ` +
+        `Known: ${KERNEL_SCENARIOS.map((s) => s.name).join(", ")}`
+    );
+  }
+
+  const results: KernelBenchResult[] = [];
+  for (const spec of selected) {
+    const result = await runKernelScenario(spec.create(scale), {
+      bufferLimit: options.bufferLimit ?? null
+    });
+    options.onResult?.(result);
+    results.push(result);
+  }
+  return createReport(
+    "kernel",
+    { scale, bufferLimit: options.bufferLimit ?? null },
+    results
+  );
+}
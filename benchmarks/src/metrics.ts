@@ -0,0 +1,167 @@
+/**
+ * Measurement primitives shared by the benchmark suites: bounded latency
+ * sampling with percentiles, GC time via `perf_hooks`, and heap tracking.
+ */
+
+import { PerformanceObserver, performance } from "node:perf_hooks";
+
+export interface LatencySummary {
+  /** Samples observed (not retained — see {@link LatencySampler}). */
+  count: number;
+  p50: number;
+  p90: number;
+  p99: number;
+  p999: number;
+  max: number;
+  mean: number;
+}
+
+/**
+ * Nearest-rank percentile over an ascending array. Returns 0 for no samples so
+ * an empty edge serialises as a number rather than `null`.
+ */
+export function percentile(sorted: readonly number[], p: number): number {
+  if (sorted.length === 0) return 0;
+  const rank = Math.ceil((p / 100) * sorted.length);
+  return sorted[Math.min(sorted.length - 1, Math.max(0, rank - 1))];
+}
+
+/**
+ * Latency recorder with a fixed memory bound. Keeps every `stride`-th sample;
+ * when the buffer fills it drops every other retained sample and doubles the
+ * stride, so a 1M-item run retains an even spread across the whole run
+ * instead of just its first `capacity` items. Count, mean and max are exact.
+ */
+export class LatencySampler {
+  private _samples: number[] = [];
+  private _stride = 1;
+  private _count = 0;
+  private _sum = 0;
+  private _max = 0;
+
+  constructor(private readonly _capacity: number = 10_000) {}
+
+  record(ms: number): void {
+    if (this._count % this._stride === 0) {
+      if (this._samples.length >= this._capacity) {
+        this._samples = this._samples.filter((_, i) => i % 2 === 0);
+        this._stride *= 2;
+      }
+      if (this._count % this._stride === 0) this._samples.push(ms);
+    }
+    this._count++;
+    this._sum += ms;
+    if (ms > this._max) this._max = ms;
+  }
+
+  summary(): LatencySummary {
+    const sorted = [...this._samples].sort((a, b) => a - b);
+    return {
+      count: this._count,
+      p50: percentile(sorted, 50),
+      p90: percentile(sorted, 90),
+      p99: percentile(sorted, 99),
+      p999: percentile(sorted, 99.9),
+      max: this._max,
+      mean: this._count === 0 ? 0 : this._sum / this._count
+    };
+  }
+}
+
+export interface GcSummary {
+  count: number;
+  totalMs: number;
+}
+
+/** Sums GC pause time reported by V8 between `start()` and `stop()`. */
+export class GcRecorder {
+  private _observer: PerformanceObserver | null = null;
+  private _count = 0;
+  private _totalMs = 0;
+
+  start(): void {
+    this._observer = new PerformanceObserver((list) => {
+      this._consume(list.getEntries());
+    });
+    this._observer.observe({ entryTypes: ["gc"] });
+  }
+
+  stop(): GcSummary {
+    if (this._observer) {
+      // Entries are delivered asynchronously; collect the undelivered tail.
+      this._consume(this._observer.takeRecords());
+      this._observer.disconnect();
+      this._observer = null;
+    }
+    return { count: this._count, totalMs: this._totalMs };
+  }
+
+  private _consume(entries: readonly { duration: number }[]): void {
+    for (const entry of entries) {
+      this._count++;
+      this._totalMs += entry.duration;
+    }
+  }
+}
+
+export interface HeapSummary {
+  /** `heapUsed` before the run, after a forced GC when available. */
+  beforeBytes: number;
+  /** `heapUsed` after the run, after a forced GC when available. */
+  afterBytes: number;
+  /** Retained growth: `afterBytes - beforeBytes`. */
+  growthBytes: number;
+  /** Highest `heapUsed` seen while the run was in progress. */
+  peakBytes: number;
+  /** Whether `global.gc` was exposed (`--expose-gc`); without it the
+   * before/after figures include garbage and are noisy. */
+  forcedGc: boolean;
+}
+
+/** Tracks heap usage around a run, sampling the peak on an interval. */
+export class HeapRecorder {
+  private _before = 0;
+  private _peak = 0;
+  private _timer: ReturnType<typeof setInterval> | null = null;
+
+  start(sampleMs = 25): void {
+    collectGarbage();
+    this._before = process.memoryUsage().heapUsed;
+    this._peak = this._before;
+    this._timer = setInterval(() => this._sample(), sampleMs);
+    this._timer.unref();
+  }
+
+  stop(): HeapSummary {
+    if (this._timer) clearInterval(this._timer);
+    this._timer = null;
+    this._sample();
+    const forcedGc = collectGarbage();
+    const after = process.memoryUsage().heapUsed;
+    return {
+      beforeBytes: this._before,
+      afterBytes: after,
+      growthBytes: after - this._before,
+      peakBytes: this._peak,
+      forcedGc
+    };
+  }
+
+  private _sample(): void {
+    const used = process.memoryUsage().heapUsed;
+    if (used > this._peak) this._peak = used;
+  }
+}
+
+/** Run a full GC if the process was started with `--expose-gc`. */
+function collectGarbage(): boolean {
+  const gc = (globalThis as { gc?: () => void }).gc;
+  if (!gc) return false;
+  gc();
+  return true;
+}
+
+/** Monotonic milliseconds. */
+export function now(): number {
+  return performance.now();
+}
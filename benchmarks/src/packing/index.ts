@@ -0,0 +1,7 @@
+export {
+  agentTurn,
+  runPackingScenario,
+  runPackingSuite,
+  type PackingBenchResult,
+  type PackingSuiteOptions
+} from "./suite.js";
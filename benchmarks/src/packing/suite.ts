@@ -0,0 +1,206 @@
+/**
+ * The `packing` suite: context-packer token accounting on long agent
+ * threads, cold and warm.
+ *
+ * Each thread is `turns` synthetic agent turns — a user message, an
+ * assistant tool call, a tool result of a few KiB and an assistant answer —
+ * so a 300-turn thread is 1,200 messages. For each length:
+ *
+ *  - `coldMs` — one `packContext` over the whole thread with the
+ *    per-message count cache emptied first: every message goes through BPE.
+ *  - `warmMs` — the same call again: every count is a cache hit.
+ *  - The agent loop, where the thread grows one turn before every pack,
+ *    reported as mean milliseconds per turn:
+ *     - `recountTurnMs` — `packContext` with the cache emptied each turn,
+ *       which is what packing cost before counts were memoized. Only run up
+ *       to `recountMaxTurns`, as it is quadratic in the thread length.
+ *     - `memoizedTurnMs` — `packContext` each turn, cache kept.
+ *     - `incrementalTurnMs` — `ContextPacker.sync` then `pack`, which only
+ *       counts the new turn.
+ */
+
+import {
+  clearMessageTokenCache,
+  ContextPacker,
+  estimateMessageTokens,
+  packContext,
+  type Message
+} from "@nodetool-ai/runtime";
+import { now } from "../metrics.js";
+import { createReport, type BenchReport } from "../report.js";
+
+export interface PackingBenchResult {
+  turns: number;
+  messages: number;
+  /** Token total of the whole thread. */
+  threadTokens: number;
+  /** Token budget each pack was given. */
+  budget: number;
+  /** Messages the budget kept. */
+  kept: number;
+  coldMs: number;
+  warmMs: number;
+  /** Cold time over warm time. */
+  warmSpeedup: number;
+  /** Null above `recountMaxTurns`. */
+  recountTurnMs: number | null;
+  memoizedTurnMs: number;
+  incrementalTurnMs: number;
+}
+
+export interface PackingSuiteOptions {
+  /** Thread lengths in turns. Default 50, 100 and 300. */
+  turns?: number[];
+  /** Token budget per pack. Default 32,000. */
+  budget?: number;
+  /** Longest thread the uncached agent loop runs on. Default 100 turns. */
+  recountMaxTurns?: number;
+  onResult?: (result: PackingBenchResult) => void;
+}
+
+const DEFAULT_TURNS = [50, 100, 300];
+const DEFAULT_BUDGET = 32_000;
+const DEFAULT_RECOUNT_MAX_TURNS = 100;
+const SYSTEM_PROMPT =
+  "You are a research agent. Use the search tool, cite what you find and " +
+  "answer in plain prose.";
+
+const WORDS = (
+  "the of pipeline node graph tensor image latency token cache budget " +
+  "worker bridge frame schema column stream batch python model prompt " +
+  "result error retry shard vector index query 2048 0.75 /tmp/out.png"
+).split(" ");
+
+/** Deterministic filler text of about `words` words. */
+function prose(seed: number, words: number): string {
+  let state = Math.imul(seed + 1, 2654435761) >>> 0;
+  const out: string[] = [];
+  for (let i = 0; i < words; i++) {
+    state = (Math.imul(state, 1103515245) + 12345) >>> 0;
+    out.push(WORDS[state % WORDS.length]);
+  }
+  return out.join(" ");
+}
+
+/** One synthetic agent turn: question, tool call, tool result, answer. */
+export function agentTurn(i: number): Message[] {
+  return [
+    { role: "user", content: prose(i * 4, 20 + (i % 40)) },
+    {
+      role: "assistant",
+      content: null,
+      toolCalls: [
+        {
+          id: `call-${i}`,
+          name: "search",
+          args: { query: prose(i * 4 + 1, 8), limit: 10, offset: i }
+        }
+      ]
+    },
+    {
+      role: "tool",
+      toolCallId: `call-${i}`,
+      content: prose(i * 4 + 2, 300 + ((i * 37) % 500))
+    },
+    { role: "assistant", content: prose(i * 4 + 3, 60 + ((i * 13) % 120)) }
+  ];
+}
+
+function sameMessages(a: Message[], b: Message[]): boolean {
+  return a.length === b.length && a.every((msg, i) => msg === b[i]);
+}
+
+export function runPackingScenario(
+  turns: number,
+  options: { budget?: number; recount?: boolean } = {}
+): PackingBenchResult {
+  const budget = options.budget ?? DEFAULT_BUDGET;
+  const perTurn = Array.from({ length: turns }, (_, i) => agentTurn(i));
+  const thread = perTurn.flat();
+
+  clearMessageTokenCache();
+  let started = now();
+  const packed = packContext(thread, SYSTEM_PROMPT, budget);
+  const coldMs = now() - started;
+  started = now();
+  packContext(thread, SYSTEM_PROMPT, budget);
+  const warmMs = now() - started;
+  const threadTokens = thread.reduce(
+    (sum, msg) => sum + estimateMessageTokens(msg),
+    0
+  );
+
+  let recountTurnMs: number | null = null;
+  if (options.recount !== false) {
+    const growing: Message[] = [];
+    started = now();
+    for (let i = 0; i < turns; i++) {
+      growing.push(...perTurn[i]);
+      clearMessageTokenCache();
+      packContext(growing, SYSTEM_PROMPT, budget);
+    }
+    recountTurnMs = (now() - started) / turns;
+  }
+
+  clearMessageTokenCache();
+  let growing: Message[] = [];
+  started = now();
+  for (let i = 0; i < turns; i++) {
+    growing.push(...perTurn[i]);
+    packContext(growing, SYSTEM_PROMPT, budget);
+  }
+  const memoizedTurnMs = (now() - started) / turns;
+
+  clearMessageTokenCache();
+  growing = [];
+  const packer = new ContextPacker();
+  let last = packer.pack(SYSTEM_PROMPT, budget);
+  started = now();
+  for (let i = 0; i < turns; i++) {
+    growing.push(...perTurn[i]);
+    packer.sync(growing);
+    last = packer.pack(SYSTEM_PROMPT, budget);
+  }
+  const incrementalTurnMs = (now() - started) / turns;
+  const expected = packContext(growing, SYSTEM_PROMPT, budget);
+  if (!sameMessages(last.messages, expected.messages)) {
+    throw new Error(`Incremental pack of ${turns} turns differs`);
+  }
+
+  return {
+    turns,
+    messages: thread.length,
+    threadTokens,
+    budget,
+    kept: packed.messages.length,
+    coldMs,
+    warmMs,
+    warmSpeedup: warmMs > 0 ? coldMs / warmMs : 0,
+    recountTurnMs,
+    memoizedTurnMs,
+    incrementalTurnMs
+  };
+}
+
+export async function runPackingSuite(
+  options: PackingSuiteOptions = {}
+): Promise<BenchReport<PackingBenchResult>> {
+  const turns = options.turns?.length ? options.turns : DEFAULT_TURNS;
+  const invalid = turns.filter((n) => !(Number.isInteger(n) && n > 0));
+  if (invalid.length > 0) {
+    throw new Error(`Invalid turn count(s): ${invalid.join(", ")}`);
+  }
+  const budget = options.budget ?? DEFAULT_BUDGET;
+  const recountMaxTurns = options.recountMaxTurns ?? DEFAULT_RECOUNT_MAX_TURNS;
+
+  const results: PackingBenchResult[] = [];
+  for (const n of turns) {
+    const result = runPackingScenario(n, {
+      budget,
+      recount: n <= recountMaxTurns
+    });
+    options.onResult?.(result);
+    results.push(result);
+  }
+  return createReport("packing", { turns, budget, recountMaxTurns }, results);
+}
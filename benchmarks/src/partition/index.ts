@@ -0,0 +1,13 @@
+export {
+  PARTITION_SCENARIOS,
+  parallelChains,
+  pinnedPipeline,
+  runPartitionScenario,
+  runPartitionSuite,
+  type PartitionBenchResult,
+  type PartitionRunStats,
+  type PartitionScenario,
+  type PartitionScenarioName,
+  type PartitionSuiteOptions
+} from "./suite.js";
+export { resolveExecutor as resolvePartitionBenchExecutor, spin } from "./nodes.js";
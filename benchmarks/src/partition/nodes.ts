@@ -0,0 +1,53 @@
+/**
+ * Executor module for the `partition` suite. Both the in-process baseline
+ * and every partition process resolve nodes through it, so the two runs
+ * execute identical code.
+ *
+ *  - `bench.Source` — streams `count` integers
+ *  - `bench.Spin`   — burns `work` iterations of integer hashing per item
+ *  - `bench.Sink`   — counts what arrives
+ */
+
+import type { NodeExecutor } from "@nodetool-ai/kernel";
+import type { NodeDescriptor } from "@nodetool-ai/protocol";
+
+/** Mix `value` through `work` rounds of a 32-bit integer hash. */
+export function spin(value: number, work: number): number {
+  let h = value | 0;
+  for (let i = 0; i < work; i++) {
+    h = Math.imul(h ^ (h >>> 15), 0x2c1b3c6d);
+    h = Math.imul(h ^ (h >>> 12), 0x297a2d39);
+    h ^= h >>> 15;
+  }
+  return h;
+}
+
+export function resolveExecutor(node: NodeDescriptor): NodeExecutor {
+  const props = (node.properties ?? {}) as Record<string, number>;
+  switch (node.type) {
+    case "bench.Source":
+      return {
+        process: async () => ({}),
+        async *genProcess() {
+          for (let i = 0; i < props.count; i++) yield { value: i };
+        }
+      };
+    case "bench.Spin":
+      return {
+        process: async (inputs) => ({
+          value: spin(inputs.value as number, props.work)
+        })
+      };
+    case "bench.Sink":
+      return {
+        process: async () => ({}),
+        async run(inputs, outputs) {
+          let count = 0;
+          for await (const _ of inputs.stream("value")) count++;
+          await outputs.emit("count", count);
+        }
+      };
+    default:
+      throw new Error(`Unknown benchmark node type: ${node.type}`);
+  }
+}
@@ -0,0 +1,257 @@
+/**
+ * The `partition` suite: in-process versus multi-process runs of CPU-bound
+ * graphs, through `WorkflowRunner` and `PartitionedRunner` respectively.
+ *
+ *  - `parallel` — `partitions` independent source → spin → sink chains,
+ *    partitioned by connected component: no edge crosses a process, so
+ *    this is the ceiling for branch parallelism.
+ *  - `pipeline` — source → spin → spin → sink, pinned so each spin runs in
+ *    its own process: every item crosses a process boundary once, so the
+ *    speed-up is pipeline overlap minus framing and msgpack costs.
+ *
+ * Nodes come from `./nodes.ts`, imported by both runs. Partitioned wall time
+ * includes starting the child processes.
+ */
+
+import { availableParallelism } from "node:os";
+import type { Edge, NodeDescriptor } from "@nodetool-ai/protocol";
+import {
+  Graph,
+  PartitionedRunner,
+  WorkflowRunner,
+  type PartitionOptions
+} from "@nodetool-ai/kernel";
+import { now } from "../metrics.js";
+import { createReport, type BenchReport } from "../report.js";
+import { resolveExecutor } from "./nodes.js";
+
+export const PARTITION_SCENARIOS = ["parallel", "pipeline"] as const;
+export type PartitionScenarioName = (typeof PARTITION_SCENARIOS)[number];
+
+export interface PartitionScenario {
+  name: PartitionScenarioName;
+  graph: Graph;
+  /** Items all sinks together should receive. */
+  items: number;
+  partitioning: PartitionOptions;
+}
+
+export interface PartitionRunStats {
+  status: string;
+  wallMs: number;
+  itemsPerSec: number;
+  /** Items the sinks received. */
+  delivered: number;
+}
+
+export interface PartitionBenchResult {
+  scenario: PartitionScenarioName;
+  partitions: number;
+  items: number;
+  /** Hash rounds per item per spin node. */
+  work: number;
+  inProcess: PartitionRunStats;
+  partitioned: PartitionRunStats & {
+    crossEdges: number;
+    /** Frames relayed through the coordinator, both directions. */
+    frames: number;
+  };
+  /** Partitioned items/sec over in-process items/sec. */
+  speedup: number;
+}
+
+export interface PartitionSuiteOptions {
+  /** Multiplier on the item count (2,000 at scale 1). */
+  scale?: number;
+  /** Processes per run. Default: available parallelism, at most 4. */
+  partitions?: number;
+  /** Hash rounds per item per spin node. Default 200,000. */
+  work?: number;
+  /** Run only these scenarios. Default all. */
+  scenarios?: string[];
+  /** Node flags for partition processes. Default: this process's. */
+  execArgv?: string[];
+  onResult?: (result: PartitionBenchResult) => void;
+}
+
+const BASE_ITEMS = 2_000;
+const DEFAULT_WORK = 200_000;
+const EXECUTOR_MODULE = new URL(
+  `./nodes${import.meta.url.endsWith(".ts") ? ".ts" : ".js"}`,
+  import.meta.url
+).href;
+
+class ChainBuilder {
+  readonly nodes: NodeDescriptor[] = [];
+  readonly edges: Edge[] = [];
+
+  add(id: string, type: string, extra: Partial<NodeDescriptor> = {}): string {
+    this.nodes.push({ id, type, ...extra });
+    return id;
+  }
+
+  chain(prefix: string, count: number, spins: number, work: number): string[] {
+    const ids = [
+      this.add(`${prefix}source`, "bench.Source", {
+        is_streaming_output: true,
+        properties: { count }
+      })
+    ];
+    for (let i = 0; i < spins; i++) {
+      ids.push(
+        this.add(`${prefix}spin-${i}`, "bench.Spin", { properties: { work } })
+      );
+    }
+    ids.push(
+      this.add(`${prefix}sink`, "bench.Sink", { is_streaming_input: true })
+    );
+    for (let i = 1; i < ids.length; i++) {
+      this.edges.push({
+        id: `${ids[i - 1]}->${ids[i]}`,
+        source: ids[i - 1],
+        sourceHandle: "value",
+        target: ids[i],
+        targetHandle: "value"
+      });
+    }
+    return ids;
+  }
+}
+
+/** `chains` independent chains sharing `items` between them. */
+export function parallelChains(
+  chains: number,
+  items: number,
+  work: number
+): PartitionScenario {
+  const builder = new ChainBuilder();
+  const perChain = Math.max(1, Math.floor(items / chains));
+  for (let c = 0; c < chains; c++) builder.chain(`c${c}-`, perChain, 1, work);
+  return {
+    name: "parallel",
+    graph: new Graph({ nodes: builder.nodes, edges: builder.edges }),
+    items: perChain * chains,
+    partitioning: { partitions: chains, strategy: "component" }
+  };
+}
+
+/** One chain of two spin stages, each pinned to its own process. */
+export function pinnedPipeline(items: number, work: number): PartitionScenario {
+  const builder = new ChainBuilder();
+  const [source, first, second, sink] = builder.chain("", items, 2, work);
+  return {
+    name: "pipeline",
+    graph: new Graph({ nodes: builder.nodes, edges: builder.edges }),
+    items,
+    partitioning: {
+      partitions: 2,
+      strategy: "pinned",
+      pins: { [source]: 0, [first]: 0, [second]: 1, [sink]: 1 }
+    }
+  };
+}
+
+function delivered(outputs: Record<string, unknown[]>): number {
+  let total = 0;
+  for (const values of Object.values(outputs)) {
+    for (const value of values) if (typeof value === "number") total += value;
+  }
+  return total;
+}
+
+function stats(
+  status: string,
+  wallMs: number,
+  outputs: Record<string, unknown[]>
+): PartitionRunStats {
+  const received = delivered(outputs);
+  return {
+    status,
+    wallMs,
+    itemsPerSec: wallMs > 0 ? (received * 1000) / wallMs : 0,
+    delivered: received
+  };
+}
+
+export async function runPartitionScenario(
+  scenario: PartitionScenario,
+  options: { work: number; execArgv?: string[] }
+): Promise<PartitionBenchResult> {
+  const graphData = {
+    nodes: scenario.graph.nodes,
+    edges: scenario.graph.edges
+  };
+  const jobId = `bench-partition-${scenario.name}`;
+
+  let started = now();
+  const local = await new WorkflowRunner(jobId, { resolveExecutor }).run(
+    { job_id: jobId, params: {} },
+    graphData
+  );
+  const inProcess = stats(local.status, now() - started, local.outputs);
+
+  started = now();
+  const remote = await new PartitionedRunner(jobId, {
+    ...scenario.partitioning,
+    executorModule: EXECUTOR_MODULE,
+    execArgv: options.execArgv
+  }).run({ job_id: jobId, params: {} }, graphData);
+  const partitioned = {
+    ...stats(remote.status, now() - started, remote.outputs),
+    crossEdges: remote.crossEdges,
+    frames: remote.partitions.reduce(
+      (sum, p) => sum + p.traffic.framesIn + p.traffic.framesOut,
+      0
+    )
+  };
+
+  return {
+    scenario: scenario.name,
+    partitions: remote.partitions.length,
+    items: scenario.items,
+    work: options.work,
+    inProcess,
+    partitioned,
+    speedup:
+      inProcess.itemsPerSec > 0
+        ? partitioned.itemsPerSec / inProcess.itemsPerSec
+        : 0
+  };
+}
+
+export async function runPartitionSuite(
+  options: PartitionSuiteOptions = {}
+): Promise<BenchReport<PartitionBenchResult>> {
+  const scale = options.scale ?? 1;
+  const work = options.work ?? DEFAULT_WORK;
+  const partitions =
+    options.partitions ?? Math.max(2, Math.min(4, availableParallelism()));
+  const unknown = (options.scenarios ?? []).filter(
+    (name) => !(PARTITION_SCENARIOS as readonly string[]).includes(name)
+  );
+  if (unknown.length > 0) {
+    throw new Error(
+      `Unknown partition scenario(s): ${unknown.join(", ")}. ` +
+        `Known: ${PARTITION_SCENARIOS.join(", ")}`
+    );
+  }
+  const selected = options.scenarios?.length
+    ? PARTITION_SCENARIOS.filter((s) => options.scenarios!.includes(s))
+    : PARTITION_SCENARIOS;
+
+  const items = Math.max(partitions, Math.round(BASE_ITEMS * scale));
+  const results: PartitionBenchResult[] = [];
+  for (const name of selected) {
+    const scenario =
+      name === "parallel"
+        ? parallelChains(partitions, items, work)
+        : pinnedPipeline(items, work);
+    const result = await runPartitionScenario(scenario, {
+      work,
+      execArgv: options.execArgv
+    });
+    options.onResult?.(result);
+    results.push(result);
+  }
+  return createReport("partition", { scale, partitions, work }, results);
+}
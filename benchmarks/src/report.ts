@@ -0,0 +1,59 @@
+/**
+ * JSON report envelope. One file per suite run; two files from different
+ * commits diff cleanly because keys and scenario order are stable.
+ */
+
+import { execFileSync } from "node:child_process";
+import { arch, cpus, platform } from "node:os";
+
+export interface BenchEnvironment {
+  node: string;
+  platform: string;
+  arch: string;
+  cpu: string;
+  /** `git rev-parse HEAD` of the checkout, when available. */
+  commit: string | null;
+}
+
+export interface BenchReport<TResult> {
+  suite: string;
+  createdAt: string;
+  environment: BenchEnvironment;
+  options: Record<string, unknown>;
+  results: TResult[];
+}
+
+function gitCommit(): string | null {
+  try {
+    return execFileSync("git", ["rev-parse", "HEAD"], {
+      encoding: "utf8",
+      stdio: ["ignore", "pipe", "ignore"]
+    }).trim();
+  } catch {
+    return null;
+  }
+}
+
+export function benchEnvironment(): BenchEnvironment {
+  return {
+    node: process.version,
+    platform: platform(),
+    arch: arch(),
+    cpu: cpus()[0]?.model ?? "unknown",
+    commit: gitCommit()
+  };
+}
+
+export function createReport<TResult>(
+  suite: string,
+  options: Record<string, unknown>,
+  results: TResult[]
+): BenchReport<TResult> {
+  return {
+    suite,
+    createdAt: new Date().toISOString(),
+    environment: benchEnvironment(),
+    options,
+    results
+  };
+}
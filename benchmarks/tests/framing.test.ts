@@ -0,0 +1,45 @@
+import { describe, expect, it } from "vitest";
+import {
+  ConcatFrameDecoder,
+  runFramingScenario,
+  runFramingSuite
+} from "../src/framing/index.js";
+
+describe("framing suite", () => {
+  it("decodes a multi-chunk frame with both decoders", () => {
+    const result = runFramingScenario(1024 * 1024, {
+      chunkBytes: 16 * 1024,
+      iterations: 2
+    });
+    expect(result.chunks).toBe(64);
+    expect(result.decodeMs).toBeGreaterThan(0);
+    expect(result.baselineDecodeMs).toBeGreaterThan(0);
+    expect(result.speedup).toBeGreaterThan(0);
+  });
+
+  it("skips the baseline above its ceiling", async () => {
+    const report = await runFramingSuite({
+      sizesMb: [0.25, 1],
+      baselineMaxMb: 0.5
+    });
+    expect(report.results.map((r) => r.baselineDecodeMs === null)).toEqual([
+      false,
+      true
+    ]);
+  });
+
+  it("baseline decoder splits frames like the runtime one", () => {
+    const frames: number[] = [];
+    const decoder = new ConcatFrameDecoder();
+    const frame = Buffer.from([0, 0, 0, 2, 9, 9, 0, 0, 0, 1, 7]);
+    decoder.push(frame.subarray(0, 3), (f) => frames.push(f.length));
+    decoder.push(frame.subarray(3), (f) => frames.push(f.length));
+    expect(frames).toEqual([2, 1]);
+  });
+
+  it("rejects invalid sizes", async () => {
+    await expect(runFramingSuite({ sizesMb: [0] })).rejects.toThrow(
+      /Invalid frame size/
+    );
+  });
+});
@@ -0,0 +1,27 @@
+import { describe, expect, it } from "vitest";
+import { runInboxScenario, runInboxSuite } from "../src/inbox/index.js";
+
+describe("inbox suite", () => {
+  it.each(["memory", "drizzle", "group-commit"] as const)(
+    "%s appends and consumes every message",
+    async (store) => {
+      const result = await runInboxScenario(store, 40, 4);
+      expect(result.messages).toBe(40);
+      expect(result.consumed).toBe(40);
+      expect(result.messagesPerSec).toBeGreaterThan(0);
+    }
+  );
+
+  it("group commit batches across inboxes", async () => {
+    const result = await runInboxScenario("group-commit", 40, 4);
+    // 40 appends and 40 consumes in far fewer transactions.
+    expect(result.commits).toBeGreaterThan(0);
+    expect(result.commits).toBeLessThan(80);
+  });
+
+  it("rejects unknown store names", async () => {
+    await expect(runInboxSuite({ stores: ["nope"] })).rejects.toThrow(
+      /Unknown inbox store/
+    );
+  });
+});
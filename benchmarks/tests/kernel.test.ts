@@ -0,0 +1,47 @@
+import { describe, expect, it } from "vitest";
+import {
+  fanOutFanIn,
+  linearChain,
+  runKernelScenario,
+  runKernelSuite,
+  streaming,
+  zipJoin
+} from "../src/kernel/index.js";
+
+describe("kernel scenarios", () => {
+  it.each([
+    ["stream", () => streaming(200)],
+    ["chain", () => linearChain(5, 50)],
+    ["fan", () => fanOutFanIn(4, 50)],
+    ["zip", () => zipJoin(50)]
+  ])("%s delivers every item and samples every edge", async (_, create) => {
+    const scenario = create();
+    const result = await runKernelScenario(scenario);
+    expect(result.status).toBe("completed");
+    expect(result.delivered).toBe(scenario.items);
+    for (const latency of Object.values(result.edgeLatencyMs)) {
+      expect(latency.count).toBe(scenario.items);
+      expect(latency.p50).toBeGreaterThanOrEqual(0);
+    }
+    expect(result.itemsPerSec).toBeGreaterThan(0);
+  });
+
+  it("reports a JSON-serialisable suite run", async () => {
+    const report = await runKernelSuite({
+      scale: 0.0005,
+      scenarios: ["stream", "zip-all"]
+    });
+    expect(report.suite).toBe("kernel");
+    expect(report.results.map((r) => r.scenario)).toEqual([
+      "stream-500",
+      "zip-all"
+    ]);
+    expect(JSON.parse(JSON.stringify(report)).results).toHaveLength(2);
+  });
+
+  it("rejects unknown scenario names", async () => {
+    await expect(runKernelSuite({ scenarios: ["nope"] })).rejects.toThrow(
+      /Unknown kernel scenario/
+    );
+  });
+});
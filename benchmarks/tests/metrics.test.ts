@@ -0,0 +1,27 @@
+import { describe, expect, it } from "vitest";
+import { LatencySampler, percentile } from "../src/metrics.js";
+
+describe("percentile", () => {
+  it("uses nearest rank", () => {
+    const sorted = [1, 2, 3, 4, 5, 6, 7, 8, 9, 10];
+    expect(percentile(sorted, 50)).toBe(5);
+    expect(percentile(sorted, 90)).toBe(9);
+    expect(percentile(sorted, 99)).toBe(10);
+    expect(percentile([], 50)).toBe(0);
+  });
+});
+
+describe("LatencySampler", () => {
+  it("stays within capacity while keeping exact count, mean and max", () => {
+    const sampler = new LatencySampler(100);
+    for (let i = 1; i <= 10_000; i++) sampler.record(i);
+    const summary = sampler.summary();
+    expect(summary.count).toBe(10_000);
+    expect(summary.max).toBe(10_000);
+    expect(summary.mean).toBeCloseTo(5000.5);
+    // Retained samples span the whole run, not just its head.
+    expect(summary.p50).toBeGreaterThan(4000);
+    expect(summary.p50).toBeLessThan(6000);
+    expect(summary.p99).toBeGreaterThan(9000);
+  });
+});
@@ -0,0 +1,41 @@
+import { describe, expect, it } from "vitest";
+import {
+  agentTurn,
+  runPackingScenario,
+  runPackingSuite
+} from "../src/packing/index.js";
+
+describe("packing suite", () => {
+  it("packs a thread cold, warm and turn by turn", () => {
+    const result = runPackingScenario(6, { budget: 2_000 });
+    expect(result.messages).toBe(24);
+    expect(result.kept).toBeGreaterThan(0);
+    expect(result.kept).toBeLessThan(24);
+    expect(result.threadTokens).toBeGreaterThan(2_000);
+    expect(result.coldMs).toBeGreaterThan(0);
+    expect(result.recountTurnMs).not.toBeNull();
+    expect(result.incrementalTurnMs).toBeGreaterThan(0);
+  });
+
+  it("builds the same turn every time", () => {
+    expect(agentTurn(7)).toEqual(agentTurn(7));
+    expect(agentTurn(7)).not.toEqual(agentTurn(8));
+  });
+
+  it("skips the recount loop above its ceiling", async () => {
+    const report = await runPackingSuite({
+      turns: [2, 4],
+      recountMaxTurns: 3
+    });
+    expect(report.results.map((r) => r.recountTurnMs === null)).toEqual([
+      false,
+      true
+    ]);
+  });
+
+  it("rejects invalid turn counts", async () => {
+    await expect(runPackingSuite({ turns: [0] })).rejects.toThrow(
+      /Invalid turn count/
+    );
+  });
+});
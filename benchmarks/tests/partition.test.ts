@@ -0,0 +1,52 @@
+import { describe, expect, it } from "vitest";
+import {
+  parallelChains,
+  pinnedPipeline,
+  runPartitionScenario,
+  runPartitionSuite
+} from "../src/partition/index.js";
+
+const EXEC_ARGV = ["--import", "tsx", "--conditions=nodetool-dev"];
+
+describe("partition suite", () => {
+  it.each([
+    ["parallel", () => parallelChains(2, 20, 100)],
+    ["pipeline", () => pinnedPipeline(20, 100)]
+  ])("%s delivers every item in both runs", async (_, create) => {
+    const scenario = create();
+    const result = await runPartitionScenario(scenario, {
+      work: 100,
+      execArgv: EXEC_ARGV
+    });
+    expect(result.inProcess).toMatchObject({
+      status: "completed",
+      delivered: 20
+    });
+    expect(result.partitioned).toMatchObject({
+      status: "completed",
+      delivered: 20
+    });
+    expect(result.partitions).toBe(2);
+    expect(result.speedup).toBeGreaterThan(0);
+  });
+
+  it("cuts only the pipeline", async () => {
+    const parallel = await runPartitionScenario(parallelChains(2, 10, 1), {
+      work: 1,
+      execArgv: EXEC_ARGV
+    });
+    const pipeline = await runPartitionScenario(pinnedPipeline(10, 1), {
+      work: 1,
+      execArgv: EXEC_ARGV
+    });
+    expect(parallel.partitioned.crossEdges).toBe(0);
+    expect(pipeline.partitioned.crossEdges).toBe(1);
+    expect(pipeline.partitioned.frames).toBeGreaterThan(10);
+  });
+
+  it("rejects unknown scenario names", async () => {
+    await expect(runPartitionSuite({ scenarios: ["nope"] })).rejects.toThrow(
+      /Unknown partition scenario/
+    );
+  });
+});
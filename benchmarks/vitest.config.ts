@@ -0,0 +1,22 @@
+import { defineConfig } from "vitest/config";
+import { resolve } from "path";
+
+export default defineConfig({
+  resolve: {
+    alias: {
+      "@nodetool-ai/kernel": resolve(__dirname, "../packages/kernel/src/index.ts"),
+      "@nodetool-ai/models": resolve(__dirname, "../packages/models/src/index.ts"),
+      "@nodetool-ai/websocket": resolve(
+        __dirname,
+        "../packages/websocket/src/index.ts"
+      ),
+      "@nodetool-ai/protocol": resolve(__dirname, "../packages/protocol/src"),
+      "@nodetool-ai/config": resolve(__dirname, "../packages/config/src/index.ts")
+    }
+  },
+  test: {
+    root: resolve(__dirname),
+    include: ["tests/**/*.test.ts"],
+    testTimeout: 30000
+  }
+});
@@ -117,6 +117,23 @@ export async function requireAudioBytes(
   throw new Error("Could not load audio: the connected reference is empty (0 bytes).");
 }
 
+/**
+ * `prepareWorkerInputs` for CPU-bound audio nodes: load the `audio` input's
+ * bytes on the main thread, where the context's storage is, and inline them
+ * as `data` so the worker never needs to resolve the URI.
+ */
+export async function inlineAudioInput(
+  inputs: Record<string, unknown>,
+  context?: ProcessingContext
+): Promise<Record<string, unknown>> {
+  const audio = inputs.audio;
+  if (!isObjectLike(audio) || (audio as AudioRefLike).data) return inputs;
+  return {
+    ...inputs,
+    audio: { ...audio, data: await requireAudioBytes(audio, context) }
+  };
+}
+
 /** Strip a `file://` scheme from a URI, returning a plain filesystem path. */
 export function uriToPath(uriOrPath: string): string {
   if (uriOrPath.startsWith("file://")) {
@@ -4,6 +4,7 @@ import type { ProcessingContext } from "@nodetool-ai/runtime";
 import { tagAsServer } from "@nodetool-ai/nodes-utils";
 import { importHidden } from "@nodetool-ai/config";
 import {
+  inlineAudioInput,
   requireAudioBytes,
   audioRefFromWav,
   decodeAudioToWav,
@@ -49,6 +50,9 @@ type BitcrushNodeOutputs = {
 
 export class BitcrushNode extends BaseNode {
   static readonly nodeType = "lib.audio.Bitcrush";
+  static readonly cpuBound = true;
+  static readonly workerModule = import.meta.url;
+  static readonly prepareWorkerInputs = inlineAudioInput;
   static readonly title = "Bitcrush";
   static readonly description =
     "Applies a bitcrushing effect to an audio file, reducing bit depth and/or sample rate.\n    audio, effect, distortion\n\n    Use cases:\n    - Create lo-fi or retro-style audio effects\n    - Simulate vintage digital audio equipment\n    - Add digital distortion and artifacts to sounds";
@@ -133,6 +137,9 @@ type CompressNodeOutputs = {
 
 export class CompressNode extends BaseNode {
   static readonly nodeType = "lib.audio.Compress";
+  static readonly cpuBound = true;
+  static readonly workerModule = import.meta.url;
+  static readonly prepareWorkerInputs = inlineAudioInput;
   static readonly title = "Compress";
   static readonly description =
     "Applies dynamic range compression to an audio file.\n    audio, effect, dynamics\n\n    Use cases:\n    - Even out volume levels in a recording\n    - Increase perceived loudness of audio\n    - Control peaks in audio signals";
@@ -267,6 +274,9 @@ type DistortionNodeOutputs = {
 
 export class DistortionNode extends BaseNode {
   static readonly nodeType = "lib.audio.Distortion";
+  static readonly cpuBound = true;
+  static readonly workerModule = import.meta.url;
+  static readonly prepareWorkerInputs = inlineAudioInput;
   static readonly title = "Distortion";
   static readonly description =
     "Applies a distortion effect to an audio file.\n    audio, effect, distortion\n\n    Use cases:\n    - Add grit and character to instruments\n    - Create aggressive sound effects\n    - Simulate overdriven amplifiers";
@@ -334,6 +344,9 @@ type LimiterNodeOutputs = {
 
 export class LimiterNode extends BaseNode {
   static readonly nodeType = "lib.audio.Limiter";
+  static readonly cpuBound = true;
+  static readonly workerModule = import.meta.url;
+  static readonly prepareWorkerInputs = inlineAudioInput;
   static readonly title = "Limiter";
   static readonly description =
     "Applies a limiter effect to an audio file.\n    audio, effect, dynamics\n\n    Use cases:\n    - Prevent audio clipping\n    - Increase perceived loudness without distortion\n    - Control dynamic range of audio";
@@ -438,6 +451,9 @@ type ReverbNodeOutputs = {
 
 export class ReverbNode extends BaseNode {
   static readonly nodeType = "lib.audio.Reverb";
+  static readonly cpuBound = true;
+  static readonly workerModule = import.meta.url;
+  static readonly prepareWorkerInputs = inlineAudioInput;
   static readonly title = "Reverb";
   static readonly description =
     "Applies a reverb effect to an audio file.\n    audio, effect, reverb\n\n    Use cases:\n    - Add spatial depth to dry recordings\n    - Simulate different room acoustics\n    - Create atmospheric sound effects";
@@ -889,6 +905,9 @@ type NoiseGateNodeOutputs = {
 
 export class NoiseGateNode extends BaseNode {
   static readonly nodeType = "lib.audio.NoiseGate";
+  static readonly cpuBound = true;
+  static readonly workerModule = import.meta.url;
+  static readonly prepareWorkerInputs = inlineAudioInput;
   static readonly title = "Noise Gate";
   static readonly description =
     "Applies a noise gate effect to an audio file.\n    audio, effect, dynamics\n\n    Use cases:\n    - Reduce background noise in recordings\n    - Clean up audio tracks with unwanted low-level sounds\n    - Create rhythmic effects by gating sustained sounds";
@@ -996,6 +1015,9 @@ type PhaserNodeOutputs = {
 
 export class PhaserNode extends BaseNode {
   static readonly nodeType = "lib.audio.Phaser";
+  static readonly cpuBound = true;
+  static readonly workerModule = import.meta.url;
+  static readonly prepareWorkerInputs = inlineAudioInput;
   static readonly title = "Phaser";
   static readonly description =
     "Applies a phaser effect to an audio file.\n    audio, effect, modulation\n\n    Use cases:\n    - Create sweeping, swooshing sounds\n    - Add movement to static sounds\n    - Produce psychedelic or space-like effects";
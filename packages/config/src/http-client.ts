@@ -0,0 +1,366 @@
+/**
+ * Shared HTTP client for provider and embedding calls.
+ *
+ * Plain `fetch` uses Node's default dispatcher: a short keep-alive, no cap
+ * on sockets per origin and HTTP/1.1 only. Under load that means a fresh
+ * TLS handshake whenever a socket idles out and a burst of parallel calls
+ * opening as many sockets as it has requests. {@link HttpClient} routes
+ * requests through one undici `Agent` instead, with a pool per origin:
+ * sockets are kept alive between calls, capped per origin (further requests
+ * queue), and HTTP/2 is negotiated where the origin offers it.
+ *
+ * Identical GETs (same URL and headers) issued while one is already in
+ * flight are sent once; every caller gets its own copy of the response.
+ *
+ * undici is loaded lazily. Off Node, or when it cannot be loaded, requests
+ * go to plain `fetch`. So does every request when `globalThis.fetch` has
+ * been replaced (a test stub, a wrapper): the replacement is called with
+ * exactly what the caller passed.
+ */
+import { getEnv } from "./environment.js";
+import { createLogger } from "./logging.js";
+import { importHidden } from "./node-import.js";
+
+type UndiciModule = typeof import("undici");
+type UndiciAgent = InstanceType<UndiciModule["Agent"]>;
+type UndiciPool = InstanceType<UndiciModule["Pool"]>;
+type PoolOptions = ConstructorParameters<UndiciModule["Pool"]>[1];
+
+const log = createLogger("nodetool.config.http");
+
+/** `fetch` as this module found it, before any test or wrapper replaced it. */
+const nativeFetch: typeof fetch | undefined = globalThis.fetch;
+
+const DEFAULT_MAX_SOCKETS = 32;
+const DEFAULT_KEEP_ALIVE_MS = 30_000;
+
+export interface HttpClientOptions {
+  /** Sockets per origin; requests over this wait in the pool's queue. */
+  maxSockets?: number;
+  /** How long an idle socket is kept open. */
+  keepAliveMs?: number;
+  /** Offer HTTP/2 during the TLS handshake. */
+  http2?: boolean;
+  /** Send identical concurrent GETs once. Default true. */
+  coalesce?: boolean;
+}
+
+/** One origin's pool, as undici reports it. */
+export interface HttpOriginStats {
+  /** Open sockets. */
+  connected: number;
+  /** Open sockets with no request on them. */
+  free: number;
+  /** Requests sent and awaiting a response. */
+  running: number;
+  /** Requests waiting for a socket. */
+  queued: number;
+}
+
+export interface HttpClientStats {
+  /** Requests sent over the network. */
+  requests: number;
+  /** Requests answered by an identical GET already in flight. */
+  coalesced: number;
+  /** Sockets opened. */
+  connections: number;
+  /** Requests sent on a socket an earlier request had opened. */
+  reused: number;
+  connectionErrors: number;
+  /**
+   * Requests sent while `maxSockets` others to the same origin still held
+   * their socket — awaiting a response, or streaming its body — so had to
+   * wait for one. Under HTTP/2 one socket carries many requests, so this
+   * overcounts there.
+   */
+  queued: number;
+  /** Most such requests waiting on one origin at once. */
+  maxQueueDepth: number;
+  /** Live pool state per origin, keyed by origin URL. */
+  origins: Record<string, HttpOriginStats>;
+}
+
+interface Waiter {
+  resolve: (response: Response) => void;
+  reject: (error: unknown) => void;
+}
+
+function intEnv(key: string, fallback: number): number {
+  const raw = getEnv(key);
+  const parsed = Number(raw);
+  return raw !== undefined && Number.isInteger(parsed) && parsed > 0
+    ? parsed
+    : fallback;
+}
+
+/** Options from the `NODETOOL_HTTP_*` and `NODETOOL_HTTP2` variables. */
+function optionsFromEnv(): HttpClientOptions {
+  const http2 = getEnv("NODETOOL_HTTP2")?.trim().toLowerCase();
+  return {
+    maxSockets: intEnv("NODETOOL_HTTP_MAX_SOCKETS", DEFAULT_MAX_SOCKETS),
+    keepAliveMs: intEnv("NODETOOL_HTTP_KEEPALIVE_MS", DEFAULT_KEEP_ALIVE_MS),
+    http2: http2 !== "0" && http2 !== "false"
+  };
+}
+
+/** Statuses whose response never has a body. */
+const NULL_BODY_STATUSES = new Set([101, 204, 205, 304]);
+
+/**
+ * `response` with `release` called once its body has been read to the end,
+ * failed or been cancelled: until then the socket is still busy with it.
+ * A response without a body releases at once.
+ */
+function releaseAfterBody(response: Response, release: () => void): Response {
+  const body = response.body;
+  if (!body || NULL_BODY_STATUSES.has(response.status)) {
+    release();
+    return response;
+  }
+  const reader = body.getReader();
+  const tracked = new ReadableStream<Uint8Array>({
+    async pull(controller) {
+      try {
+        const { done, value } = await reader.read();
+        if (done) {
+          release();
+          controller.close();
+        } else {
+          controller.enqueue(value);
+        }
+      } catch (err) {
+        release();
+        controller.error(err);
+      }
+    },
+    cancel(reason) {
+      release();
+      return reader.cancel(reason);
+    }
+  });
+  const wrapped = new Response(tracked, {
+    status: response.status,
+    statusText: response.statusText,
+    headers: response.headers
+  });
+  // A constructed Response has no URL of its own; keep the fetched one's.
+  Object.defineProperties(wrapped, {
+    url: { value: response.url },
+    redirected: { value: response.redirected }
+  });
+  return wrapped;
+}
+
+function requestUrl(input: string | URL | Request): string {
+  if (typeof input === "string") return input;
+  if (input instanceof URL) return input.href;
+  return input.url;
+}
+
+export class HttpClient {
+  readonly maxSockets: number;
+  readonly keepAliveMs: number;
+  readonly http2: boolean;
+  readonly coalesce: boolean;
+  private _agent: Promise<UndiciAgent | null> | null = null;
+  private _pools = new Map<string, UndiciPool>();
+  private _inFlight = new Map<string, Waiter[]>();
+  private _active = new Map<string, number>();
+  private _counters = {
+    requests: 0,
+    coalesced: 0,
+    connections: 0,
+    connectionErrors: 0,
+    queued: 0,
+    maxQueueDepth: 0
+  };
+
+  constructor(options: HttpClientOptions = {}) {
+    this.maxSockets = options.maxSockets ?? DEFAULT_MAX_SOCKETS;
+    this.keepAliveMs = options.keepAliveMs ?? DEFAULT_KEEP_ALIVE_MS;
+    this.http2 = options.http2 ?? true;
+    this.coalesce = options.coalesce ?? true;
+  }
+
+  /** Drop-in for `fetch`, bound so it can be passed as a `fetchFn`. */
+  readonly fetch = (
+    input: string | URL | Request,
+    init?: RequestInit
+  ): Promise<Response> => {
+    const current = globalThis.fetch;
+    if (current !== nativeFetch) return current(input, init);
+    if (!this._coalescable(input, init)) return this._send(input, init);
+
+    const url = requestUrl(input);
+    const method = (init?.method ?? "GET").toUpperCase();
+    const headers = [...new Headers(init?.headers)]
+      .map(([name, value]) => `${name}: ${value}`)
+      .join("\n");
+    const key = `${method} ${url}\n${headers}`;
+    const waiters = this._inFlight.get(key);
+    if (waiters) {
+      this._counters.coalesced++;
+      return new Promise((resolve, reject) => {
+        waiters.push({ resolve, reject });
+      });
+    }
+    return this._lead(key, input, init);
+  };
+
+  get stats(): HttpClientStats {
+    const origins: Record<string, HttpOriginStats> = {};
+    for (const [origin, pool] of this._pools) {
+      const { connected, free, running, queued } = pool.stats;
+      origins[origin] = { connected, free, running, queued };
+    }
+    const { requests, connections } = this._counters;
+    return {
+      ...this._counters,
+      reused: Math.max(0, requests - connections),
+      origins
+    };
+  }
+
+  /** Close every pooled socket. Later requests open new ones. */
+  async close(): Promise<void> {
+    const agent = this._agent ? await this._agent : null;
+    this._agent = null;
+    this._pools.clear();
+    await agent?.close();
+  }
+
+  private _coalescable(
+    input: string | URL | Request,
+    init: RequestInit | undefined
+  ): boolean {
+    if (!this.coalesce) return false;
+    if (typeof input !== "string" && !(input instanceof URL)) return false;
+    const method = (init?.method ?? "GET").toUpperCase();
+    // A caller's signal would abort every joined request with it.
+    return (
+      (method === "GET" || method === "HEAD") &&
+      init?.body == null &&
+      init?.signal == null
+    );
+  }
+
+  /**
+   * Send the first of a set of identical GETs. Whoever joined while it was
+   * in flight gets a clone, taken before the leader's caller can read the
+   * body.
+   */
+  private async _lead(
+    key: string,
+    input: string | URL | Request,
+    init: RequestInit | undefined
+  ): Promise<Response> {
+    const waiters: Waiter[] = [];
+    this._inFlight.set(key, waiters);
+    try {
+      const response = await this._send(input, init);
+      this._inFlight.delete(key);
+      for (const waiter of waiters) waiter.resolve(response.clone());
+      return response;
+    } catch (err) {
+      this._inFlight.delete(key);
+      for (const waiter of waiters) waiter.reject(err);
+      throw err;
+    }
+  }
+
+  private async _send(
+    input: string | URL | Request,
+    init: RequestInit | undefined
+  ): Promise<Response> {
+    const agent = await this._loadAgent();
+    if (!agent || (init && "dispatcher" in init)) {
+      return nativeFetch!(input, init);
+    }
+    const origin = new URL(requestUrl(input)).origin;
+    const active = (this._active.get(origin) ?? 0) + 1;
+    this._active.set(origin, active);
+    this._counters.requests++;
+    if (active > this.maxSockets) {
+      this._counters.queued++;
+      this._counters.maxQueueDepth = Math.max(
+        this._counters.maxQueueDepth,
+        active - this.maxSockets
+      );
+    }
+    let released = false;
+    const release = () => {
+      if (released) return;
+      released = true;
+      const left = (this._active.get(origin) ?? 1) - 1;
+      if (left > 0) this._active.set(origin, left);
+      else this._active.delete(origin);
+    };
+    try {
+      // `dispatcher` is undici's extension to RequestInit; Node's fetch
+      // accepts it, the DOM typing does not know it.
+      const response = await nativeFetch!(input, {
+        ...init,
+        dispatcher: agent
+      } as RequestInit);
+      // Headers are in, but a streamed body (SSE, a long completion) keeps
+      // the socket busy until it ends: only then does the request stop
+      // counting against the origin.
+      return releaseAfterBody(response, release);
+    } catch (err) {
+      release();
+      throw err;
+    }
+  }
+
+  private _loadAgent(): Promise<UndiciAgent | null> {
+    this._agent ??= this._createAgent();
+    return this._agent;
+  }
+
+  private async _createAgent(): Promise<UndiciAgent | null> {
+    if (!nativeFetch) return null;
+    let undici: UndiciModule | null;
+    try {
+      undici = await importHidden<UndiciModule>("undici");
+    } catch (err) {
+      log.debug("undici unavailable, using the default dispatcher", err);
+      return null;
+    }
+    if (!undici) return null;
+    const { Agent, Pool } = undici;
+    const agent = new Agent({
+      connections: this.maxSockets,
+      keepAliveTimeout: this.keepAliveMs,
+      allowH2: this.http2,
+      factory: (origin, opts) => {
+        // SAFETY: the Agent hands its factory the options it was built with,
+        // which are Pool options; the factory signature only says `object`.
+        const pool = new Pool(origin, opts as PoolOptions);
+        this._pools.set(new URL(String(origin)).origin, pool);
+        return pool;
+      }
+    });
+    agent.on("connect", () => {
+      this._counters.connections++;
+    });
+    agent.on("connectionError", () => {
+      this._counters.connectionErrors++;
+    });
+    return agent;
+  }
+}
+
+let sharedClient: HttpClient | null = null;
+
+/**
+ * The process-wide client, created on first use from `NODETOOL_HTTP_*`
+ * (default 32 sockets per origin, 30 s keep-alive, HTTP/2 on).
+ */
+export function getHttpClient(): HttpClient {
+  sharedClient ??= new HttpClient(optionsFromEnv());
+  return sharedClient;
+}
+
+/** `fetch` through the process-wide {@link HttpClient}. */
+export const sharedFetch: typeof fetch = (input, init) =>
+  getHttpClient().fetch(input, init);
@@ -17,6 +17,15 @@ export {
 
 export { getByteLimitEnv } from "./byte-limits.js";
 
+export {
+  HttpClient,
+  getHttpClient,
+  sharedFetch,
+  type HttpClientOptions,
+  type HttpClientStats,
+  type HttpOriginStats
+} from "./http-client.js";
+
 export { isAuthEnforced } from "./deployment.js";
 
 export { isGoogleWorkspaceEnabled } from "./google-workspace.js";
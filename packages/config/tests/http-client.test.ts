@@ -0,0 +1,148 @@
+/**
+ * Tests for HttpClient against a local HTTP server: sockets are reused
+ * between calls and capped per origin, a streamed body holds its socket
+ * until it ends, identical concurrent GETs are sent once, and a replaced
+ * global fetch is called as-is.
+ */
+import {
+  describe,
+  it,
+  expect,
+  beforeAll,
+  afterAll,
+  afterEach,
+  vi
+} from "vitest";
+import { createServer, type Server } from "node:http";
+import type { AddressInfo } from "node:net";
+import { HttpClient } from "../src/http-client.js";
+
+let server: Server;
+let base: string;
+let connections = 0;
+const hits = new Map<string, number>();
+
+beforeAll(async () => {
+  server = createServer((req, res) => {
+    const path = req.url ?? "/";
+    hits.set(path, (hits.get(path) ?? 0) + 1);
+    if (path.startsWith("/stream")) {
+      // Headers and a first chunk at once, the rest of the body later.
+      res.setHeader("content-type", "text/event-stream");
+      res.write("data: a\n\n");
+      setTimeout(() => res.end("data: b\n\n"), 50);
+      return;
+    }
+    const delay = path.startsWith("/slow") ? 50 : 0;
+    setTimeout(() => {
+      res.setHeader("content-type", "text/plain");
+      res.end(`${path} ${req.headers.authorization ?? ""}`.trim());
+    }, delay);
+  });
+  server.on("connection", () => connections++);
+  await new Promise<void>((resolve) => server.listen(0, "127.0.0.1", resolve));
+  base = `http://127.0.0.1:${(server.address() as AddressInfo).port}`;
+});
+
+afterAll(async () => {
+  await new Promise((resolve) => server.close(resolve));
+});
+
+afterEach(() => {
+  vi.unstubAllGlobals();
+  hits.clear();
+  connections = 0;
+});
+
+describe("HttpClient", () => {
+  it("keeps one socket alive across sequential requests", async () => {
+    const client = new HttpClient({ coalesce: false });
+    for (let i = 0; i < 5; i++) {
+      const res = await client.fetch(`${base}/models`);
+      expect(await res.text()).toBe("/models");
+    }
+    expect(connections).toBe(1);
+    expect(client.stats).toMatchObject({
+      requests: 5,
+      connections: 1,
+      reused: 4
+    });
+    await client.close();
+  });
+
+  it("caps sockets per origin and counts queued requests", async () => {
+    const client = new HttpClient({ maxSockets: 2 });
+    const bodies = await Promise.all(
+      [1, 2, 3, 4, 5].map(async (i) =>
+        (await client.fetch(`${base}/slow/${i}`)).text()
+      )
+    );
+    expect(bodies).toEqual([1, 2, 3, 4, 5].map((i) => `/slow/${i}`));
+    expect(connections).toBe(2);
+    expect(client.stats.queued).toBe(3);
+    expect(client.stats.maxQueueDepth).toBe(3);
+    expect(client.stats.origins[base]).toMatchObject({ connected: 2 });
+    await client.close();
+  });
+
+  it("counts a request waiting behind a streaming body as queued", async () => {
+    const client = new HttpClient({ maxSockets: 1, coalesce: false });
+    // Headers arrive at once; the body still holds the only socket.
+    const first = await client.fetch(`${base}/stream/1`);
+    const second = client.fetch(`${base}/stream/2`);
+
+    expect(await first.text()).toBe("data: a\n\ndata: b\n\n");
+    expect(await (await second).text()).toBe("data: a\n\ndata: b\n\n");
+    expect(client.stats).toMatchObject({ queued: 1, maxQueueDepth: 1 });
+    expect(connections).toBe(1);
+
+    // Both bodies were read, so nothing holds the socket any more.
+    await (await client.fetch(`${base}/models`)).text();
+    const cancelled = await client.fetch(`${base}/stream/3`);
+    await cancelled.body!.cancel();
+    await (await client.fetch(`${base}/models`)).text();
+    expect(client.stats.queued).toBe(1);
+    await client.close();
+  });
+
+  it("sends identical concurrent GETs once", async () => {
+    const client = new HttpClient();
+    const [a, b, c] = await Promise.all([
+      client.fetch(`${base}/slow/list`),
+      client.fetch(`${base}/slow/list`),
+      client.fetch(`${base}/slow/list`, {
+        headers: { authorization: "Bearer other" }
+      })
+    ]);
+    expect(await a.text()).toBe("/slow/list");
+    expect(await b.text()).toBe("/slow/list");
+    expect(await c.text()).toBe("/slow/list Bearer other");
+    expect(hits.get("/slow/list")).toBe(2);
+    expect(client.stats).toMatchObject({ requests: 2, coalesced: 1 });
+    await client.close();
+  });
+
+  it("does not coalesce writes or requests carrying a signal", async () => {
+    const client = new HttpClient();
+    const signal = new AbortController().signal;
+    await Promise.all([
+      client.fetch(`${base}/slow/w`, { method: "POST", body: "x" }),
+      client.fetch(`${base}/slow/w`, { method: "POST", body: "x" }),
+      client.fetch(`${base}/slow/w`, { signal }),
+      client.fetch(`${base}/slow/w`, { signal })
+    ]);
+    expect(hits.get("/slow/w")).toBe(4);
+    await client.close();
+  });
+
+  it("calls a replaced global fetch with the caller's arguments", async () => {
+    const stub = vi.fn(async () => new Response("stubbed"));
+    vi.stubGlobal("fetch", stub);
+    const client = new HttpClient();
+    const init = { headers: { accept: "text/plain" } };
+    const res = await client.fetch(`${base}/models`, init);
+    expect(await res.text()).toBe("stubbed");
+    expect(stub).toHaveBeenCalledWith(`${base}/models`, init);
+    expect(client.stats.requests).toBe(0);
+  });
+});
@@ -10,8 +10,12 @@ import { createLogger } from "@nodetool-ai/config";
 import { hydrateGraphNodeFlags } from "@nodetool-ai/node-sdk";
 import {
   Graph,
+  GraphValidationError,
   WorkflowRunner,
+  pruneGraphToTargets,
   withExplicitNodeFlags,
+  type ChromeTrace,
+  type RunProfile,
   type RunResult
 } from "@nodetool-ai/kernel";
 import {
@@ -20,6 +24,7 @@ import {
 } from "@nodetool-ai/runtime";
 import type { PythonJobLifecycle } from "@nodetool-ai/runtime";
 import type {
+  GraphData,
   HydratedGraphData,
   ProcessingMessage
 } from "@nodetool-ai/protocol";
@@ -33,6 +38,24 @@ import type { ExecutionSessionOptions } from "./types.js";
 
 const log = createLogger("nodetool.execution.session");
 
+/**
+ * Drop what `targetNodes` do not need before preflight and bridge startup,
+ * so an unconfigured provider on a pruned side branch cannot refuse the run.
+ * An unknown target is left for the kernel, which fails the run with it.
+ */
+function prunedForTargets(
+  graph: GraphData,
+  targetNodes: readonly string[] | undefined
+): GraphData {
+  if (!targetNodes?.length) return graph;
+  try {
+    return pruneGraphToTargets(graph, targetNodes);
+  } catch (err) {
+    if (err instanceof GraphValidationError) return graph;
+    throw err;
+  }
+}
+
 export class ExecutionSession {
   readonly jobId: string;
   readonly workflowId: string | null;
@@ -56,6 +79,7 @@ export class ExecutionSession {
     persistence: ExecutionSessionOptions["persistence"];
     params: Record<string, unknown>;
     triggerEvent: ExecutionSessionOptions["triggerEvent"];
+    targetNodes: string[] | undefined;
     bridge: { pendingRequestCount?: number } | null;
     lifecycle: PythonJobLifecycle | null;
     userId: string;
@@ -97,6 +121,7 @@ export class ExecutionSession {
       workflow_id: string | undefined;
       params: typeof init.params;
       trigger_event?: NonNullable<typeof init.triggerEvent>;
+      target_nodes?: string[];
     };
     const runRequest: RunRequestFields = {
       job_id: init.jobId,
@@ -106,6 +131,9 @@ export class ExecutionSession {
     if (init.triggerEvent) {
       runRequest.trigger_event = init.triggerEvent;
     }
+    if (init.targetNodes?.length) {
+      runRequest.target_nodes = init.targetNodes;
+    }
 
     this.resultPromise = init.runner
       .run(runRequest, init.graph)
@@ -183,7 +211,10 @@ export class ExecutionSession {
     const workflowId = options.workflowId ?? null;
     const registry = options.registry;
 
-    const normalized = normalizeGraph(options.graph);
+    const normalized = prunedForTargets(
+      normalizeGraph(options.graph),
+      options.targetNodes
+    );
 
     // A caller that brings no context still gets one that can reach the
     // secret store. The bare `new ProcessingContext(...)` this replaced
@@ -277,6 +308,27 @@ export class ExecutionSession {
     if (options.supervisor) {
       runnerOptions.supervisor = options.supervisor;
     }
+    if (options.coalesceMessages) {
+      runnerOptions.coalesceMessages = options.coalesceMessages;
+    }
+    if (options.scheduler) {
+      runnerOptions.scheduler = options.scheduler;
+    }
+    if (options.workerPool) {
+      runnerOptions.workerPool = options.workerPool;
+    }
+    if (options.graphCache) {
+      runnerOptions.graphCache = options.graphCache;
+    }
+    if (options.profile) {
+      runnerOptions.profile = options.profile;
+    }
+    if (options.flowControl) {
+      runnerOptions.flowControl = options.flowControl;
+    }
+    if (options.checkpoint) {
+      runnerOptions.checkpoint = options.checkpoint;
+    }
     const runner = new WorkflowRunner(jobId, runnerOptions);
 
     try {
@@ -297,6 +349,7 @@ export class ExecutionSession {
       persistence: options.persistence ?? null,
       params: options.params ?? {},
       triggerEvent: options.triggerEvent ?? null,
+      targetNodes: options.targetNodes,
       bridge,
       lifecycle: options.jobLifecycleBridge ?? bridge,
       userId: context.userId,
@@ -346,6 +399,22 @@ export class ExecutionSession {
     };
   }
 
+  /**
+   * The run's profile so far — complete once `result` has settled. Null
+   * unless the session was created with `profile`.
+   */
+  profile(): RunProfile | null {
+    return this.runner.profiler?.summary() ?? null;
+  }
+
+  /**
+   * The run's timeline as a Chrome Trace Event file, for Perfetto or
+   * `chrome://tracing`. Null unless the session was created with `profile`.
+   */
+  chromeTrace(): ChromeTrace | null {
+    return this.runner.profiler?.toChromeTrace() ?? null;
+  }
+
   /** The reason passed to the most recent `cancel()` call, if any. */
   get cancelReason(): string | null {
     return this._cancelReason;
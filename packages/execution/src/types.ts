@@ -12,6 +12,13 @@ import type {
   NodeTypeResolver,
   NodeValidator,
   RunResult,
+  MessageCoalescingOptions,
+  ResourceScheduler,
+  WorkerPool,
+  CompiledGraphCache,
+  RunProfilerOptions,
+  FlowControlOptions,
+  RunCheckpointOptions,
   SupervisorHandle
 } from "@nodetool-ai/kernel";
 import type { NodeRegistry } from "@nodetool-ai/node-sdk";
@@ -149,6 +156,12 @@ export interface ExecutionSessionOptions {
     payload: unknown;
     input_id: string;
   } | null;
+  /**
+   * Run only these nodes and their ancestors (see
+   * `RunJobRequest.target_nodes`). The rest of the graph is pruned before
+   * preflight, so it is neither checked nor started.
+   */
+  targetNodes?: string[];
   /**
    * Pre-built execution context. When omitted, the facade builds a minimal
    * one (no storage/secrets/persistence wiring) suitable for hermetic runs
@@ -186,6 +199,47 @@ export interface ExecutionSessionOptions {
    * surface and the one place strict mode is meant to be on by default.
    */
   strict?: boolean;
+  /**
+   * Forwarded to `WorkflowRunnerOptions.coalesceMessages`: batches chatty
+   * progress/stream messages for one tick before they reach the session's
+   * consumers. Off when omitted.
+   */
+  coalesceMessages?: MessageCoalescingOptions;
+  /**
+   * Forwarded to `WorkflowRunnerOptions.scheduler`. Pass the same scheduler
+   * to every session in the process so its pool limits hold server-wide.
+   */
+  scheduler?: ResourceScheduler;
+  /**
+   * Forwarded to `WorkflowRunnerOptions.workerPool`: CPU-bound nodes run in
+   * these worker threads. Share one pool across sessions.
+   */
+  workerPool?: WorkerPool;
+  /**
+   * Forwarded to `WorkflowRunnerOptions.graphCache`: repeated runs of an
+   * unchanged graph reuse its prepared form. Build it with
+   * `version: () => registry.revision` and share it across sessions.
+   */
+  graphCache?: CompiledGraphCache;
+  /**
+   * Forwarded to `WorkflowRunnerOptions.profile`: records where the run's
+   * time went. Read the timeline with `session.chromeTrace()`; the summary
+   * is on `RunResult.profile`. Off when omitted.
+   */
+  profile?: RunProfilerOptions;
+  /**
+   * Forwarded to `WorkflowRunnerOptions.flowControl`: adaptive per-edge
+   * credits in place of one static buffer limit, with per-node-type
+   * block / keep-latest policies. Off when omitted.
+   */
+  flowControl?: FlowControlOptions;
+  /**
+   * Forwarded to `WorkflowRunnerOptions.checkpoint`: completed nodes are
+   * written to the store as the run goes, and with `resume` a recovered job
+   * re-executes only what its earlier attempt left unfinished. Off when
+   * omitted.
+   */
+  checkpoint?: RunCheckpointOptions;
   /**
    * Provider/model catalogs the run preflight checks the graph's selections
    * against. Defaults to the process-wide provider registry — the same
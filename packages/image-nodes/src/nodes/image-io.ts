@@ -262,6 +262,22 @@ export async function decodeRgba(
   return IS_NODE ? decodeBytesNode(bytes) : decodeBytesBrowser(bytes);
 }
 
+/**
+ * `prepareWorkerInputs` for CPU-bound image nodes: decode the `image` input to
+ * a raw-RGBA ref on the main thread, where the context and sharp are, so the
+ * worker only runs the pixel loop.
+ */
+export async function inlineRgbaImageInput(
+  inputs: Record<string, unknown>,
+  context?: ProcessingContext
+): Promise<Record<string, unknown>> {
+  const image = inputs.image;
+  if (!isObjectLike(image) || isRawRgbaImage(image)) return inputs;
+  const { rgba, width, height } = await decodeRgba(image, context);
+  if (!width || !height) return inputs;
+  return { ...inputs, image: rawRgbaImageRef(rgba, width, height) };
+}
+
 /**
  * Read just the pixel dimensions of an image input, cheaply. In-flight refs
  * (raw-RGBA, GPU texture, preview bitmap) all carry their dimensions, so this
@@ -5,7 +5,11 @@ import * as d from "typegpu/data";
 import { filtersConvolve3x3V1 } from "@nodetool-ai/gpu/pool";
 import { pickImage } from "./lib-image-utils.js";
 import { runShaderNode, type Desc } from "./lib-shader-utils.js";
-import { decodeRgba, rawRgbaImageRef } from "./image-io.js";
+import {
+  decodeRgba,
+  inlineRgbaImageInput,
+  rawRgbaImageRef
+} from "./image-io.js";
 import { tagAsBrowserGpu, tagAsContentCard } from "@nodetool-ai/nodes-utils";
 
 function createEnhanceNode(desc: Desc): NodeClass {
@@ -16,6 +20,12 @@ function createEnhanceNode(desc: Desc): NodeClass {
     static readonly inlineFields = desc.inlineFields;
     static readonly inputFields  = desc.inputFields;
     static readonly metadataOutputTypes = desc.outputs;
+    // Everything but the two shader-backed kernels is a JS pixel loop.
+    static readonly cpuBound = !(
+      desc.nodeType.endsWith(".Detail") || desc.nodeType.endsWith(".EdgeEnhance")
+    );
+    static readonly workerModule = import.meta.url;
+    static readonly prepareWorkerInputs = inlineRgbaImageInput;
 
     async process(
       context?: ProcessingContext
@@ -12,7 +12,12 @@ import {
 } from "@nodetool-ai/gpu/pool";
 import { pickImage } from "./lib-image-utils.js";
 import { runShaderNode, type Desc } from "./lib-shader-utils.js";
-import { decodeRgba, imageDimensions, rawRgbaImageRef } from "./image-io.js";
+import {
+  decodeRgba,
+  imageDimensions,
+  inlineRgbaImageInput,
+  rawRgbaImageRef
+} from "./image-io.js";
 import { tagAsBrowserGpu, tagAsContentCard } from "@nodetool-ai/nodes-utils";
 
 function createFilterNode(desc: Desc): NodeClass {
@@ -23,6 +28,10 @@ function createFilterNode(desc: Desc): NodeClass {
     static readonly inlineFields = desc.inlineFields;
     static readonly inputFields  = desc.inputFields;
     static readonly metadataOutputTypes = desc.outputs;
+    // Canny is the one pure-JS pixel loop here; the rest run on the GPU.
+    static readonly cpuBound = desc.nodeType.endsWith(".Canny");
+    static readonly workerModule = import.meta.url;
+    static readonly prepareWorkerInputs = inlineRgbaImageInput;
 
     async process(
       context?: ProcessingContext
@@ -27,12 +27,14 @@ import { EMPTY_LINEAGE } from "@nodetool-ai/protocol";
 // Stryker disable next-line StringLiteral: logger name is a diagnostic label, not a behavioural contract
 const log = createLogger("nodetool.kernel.actor");
 import type {
+  BatchItemResult,
   ProcessingContext,
   NodeExecutor,
   InvocationAccount
 } from "@nodetool-ai/runtime";
 import {
   createInvocationAccount,
+  currentInvocationAccount,
   inInvocationAccount,
   isRecoverableNodeError,
   providerFailureDetail
@@ -63,6 +65,10 @@ import { NodeInputs, NodeOutputs } from "./io.js";
 import { WorkflowSuspendedError } from "./suspendable.js";
 import type { NodeAnalysis } from "./correlation-analysis.js";
 import { applyDynamicSlotTypes } from "./dynamic-slots.js";
+import type { NodeResultMemo } from "./memoization.js";
+import type { PayloadSpiller } from "./payload-spill.js";
+import { ResourceHold, type ResourcePool } from "./resource-scheduler.js";
+import type { RunProfiler } from "./run-profiler.js";
 import {
   iterationRootId,
   projectLineageKey,
@@ -241,7 +247,7 @@ export class NodeActor {
   private _streamingCollectedOutputs: Record<string, unknown> | null = null;
 
   /** Handles where multiple upstream values should be collected into a list. */
-  private _listInputHandles: Set<string>;
+  private _listInputHandles: ReadonlySet<string>;
 
   /** Callback to route outputs downstream. */
   private _sendOutputs: (
@@ -308,6 +314,30 @@ export class NodeActor {
   /** Records every escalation/verdict pair for `RunResult.interventions`. */
   private _onIntervention: ((i: Intervention) => void) | undefined;
 
+  /**
+   * Result memo for this run, if memoization is on. Consulted only for
+   * `process()` invocations of nodes the memo deems eligible.
+   */
+  private _memo: NodeResultMemo | undefined;
+
+  /**
+   * Payload spiller for this run, if spilling is on. Inputs are materialised
+   * through it before the node sees them.
+   */
+  private _spiller: PayloadSpiller | undefined;
+
+  /**
+   * Pool of this node's resource class, when the run has a scheduler and the
+   * class is throttled. Each invocation holds one slot while the node runs.
+   */
+  private _resourcePool: ResourcePool | undefined;
+
+  /** Priority of this node's slot requests: its remaining critical path. */
+  private _resourcePriority: number;
+
+  /** Run profiler, when the run is profiled. */
+  private _profiler: RunProfiler | undefined;
+
   constructor(opts: {
     node: NodeDescriptor;
     inbox: NodeInbox;
@@ -319,13 +349,18 @@ export class NodeActor {
     ) => Promise<void>;
     emitMessage: (msg: unknown) => void;
     executionContext?: ProcessingContext;
-    listInputHandles?: Set<string>;
+    listInputHandles?: ReadonlySet<string>;
     controlContext?: Record<string, unknown> | null;
     correlation?: NodeAnalysis;
     cancelSignal?: AbortSignal;
     signalSlotEos?: (nodeId: string, slot: string) => void;
     supervisor?: SupervisorHandle;
     onIntervention?: (i: Intervention) => void;
+    memo?: NodeResultMemo;
+    spiller?: PayloadSpiller;
+    resourcePool?: ResourcePool;
+    resourcePriority?: number;
+    profiler?: RunProfiler;
   }) {
     this.node = opts.node;
     this.inbox = opts.inbox;
@@ -340,6 +375,11 @@ export class NodeActor {
     this._signalSlotEos = opts.signalSlotEos;
     this._supervisor = opts.supervisor;
     this._onIntervention = opts.onIntervention;
+    this._memo = opts.memo;
+    this._spiller = opts.spiller;
+    this._resourcePool = opts.resourcePool;
+    this._resourcePriority = opts.resourcePriority ?? 0;
+    this._profiler = opts.profiler;
   }
 
   // -----------------------------------------------------------------------
@@ -409,11 +449,18 @@ export class NodeActor {
           // _lastEnvelopes as the tracker lets unmigrated filters that
           // call inputs.stream()+outputs.emit() inherit lineage from the
           // single-edge input automatically — matching the buffered rule.
+          // Waits on the inbox and on downstream delivery run idle, off the
+          // node's resource slot.
+          const hold = this._resourceHold();
+          const idle = <T>(wait: () => Promise<T>) =>
+            hold ? hold.idle(wait) : wait();
           const nodeInputs = new NodeInputs(
             this.inbox,
             this._lastEnvelopes,
             this._correlation,
-            this._cancelSignal
+            this._cancelSignal,
+            this._spiller,
+            hold ? idle : undefined
           );
           const nodeOutputs = new NodeOutputs({
             sendFn: async (slot: string, value: unknown, opts) => {
@@ -449,10 +496,10 @@ export class NodeActor {
                   };
                 }
               }
-              await this._route({ [slot]: value }, hints);
+              await idle(() => this._route({ [slot]: value }, hints));
             },
             emitGroupFn: async (values, opts) => {
-              await this._emitGroup(values, opts?.lineage);
+              await idle(() => this._emitGroup(values, opts?.lineage));
             },
             eosCallback: (slot: string) => {
               this._signalSlotEos?.(this.node.id, slot || "output");
@@ -462,13 +509,15 @@ export class NodeActor {
               // outgoing edge for `slot` at the envelope's projected key.
               // §5. The drop signal lets downstream joins move past keys
               // that were intentionally filtered out.
-              await this._propagateLineageDone(
-                slot,
-                envelope.correlation_lineage
+              await idle(() =>
+                this._propagateLineageDone(slot, envelope.correlation_lineage)
               );
             }
           });
-          await this._runStreamingInput(nodeInputs, nodeOutputs);
+          await this._withResource(
+            () => this._runStreamingInput(nodeInputs, nodeOutputs),
+            hold
+          );
           this._latestResult = nodeOutputs.collected();
           // Site #5 (RFC §5): streaming-input run() — one committed result.
           this._emitGenerationComplete(this._latestResult);
@@ -496,12 +545,14 @@ export class NodeActor {
             });
             this._emitNodeStatus("warning", undefined, warning);
           }
-          const outputs = await this._executor.process(
-            this._applyDynamicSlots({
-              ...(this.node.properties ?? {}),
-              ...(this.node.dynamic_properties ?? {})
-            }),
-            this._executionContext
+          const outputs = await this._withResource(() =>
+            this._executor.process(
+              this._applyDynamicSlots({
+                ...(this.node.properties ?? {}),
+                ...(this.node.dynamic_properties ?? {})
+              }),
+              this._executionContext
+            )
           );
           this._latestResult = outputs;
           await this._sendOutputs(this.node.id, outputs);
@@ -837,6 +888,30 @@ export class NodeActor {
       return { values, envelopes };
     };
 
+    // Invocations ready while more input is already buffered wait here and
+    // run as one `processBatch` call; see `_batchSize`.
+    const batchSize = this._batchSize();
+    const queued: Array<{
+      values: Record<string, unknown>;
+      envelopes: Map<string, MessageEnvelope>;
+    }> = [];
+    const flush = async (): Promise<void> => {
+      if (queued.length > 0) await this._executeBatch(queued.splice(0));
+    };
+    const fire = async (
+      values: Record<string, unknown>,
+      envelopes: Map<string, MessageEnvelope>
+    ): Promise<void> => {
+      if (batchSize < 2) {
+        // Set per-invocation envelopes so output routing can derive lineage.
+        this._lastEnvelopes = envelopes;
+        await this._executeWithInputs(values);
+        return;
+      }
+      queued.push({ values, envelopes });
+      if (queued.length >= batchSize) await flush();
+    };
+
     const tryFire = async (candidateKeys: Iterable<string>): Promise<void> => {
       for (const key of candidateKeys) {
         if (driverHandle === null) {
@@ -848,9 +923,7 @@ export class NodeActor {
           }
           if (!isReady(key)) continue;
           const { values, envelopes } = collect(key);
-          // Set per-invocation envelopes so output routing can derive lineage.
-          this._lastEnvelopes = envelopes;
-          await this._executeWithInputs(values);
+          await fire(values, envelopes);
           fired.add(key);
         } else {
           // Repeating driver: drain the whole backlog for this key, not just
@@ -860,8 +933,7 @@ export class NodeActor {
           // driver envelope per pass, so this loop terminates.
           while (isReady(key)) {
             const { values, envelopes } = collect(key);
-            this._lastEnvelopes = envelopes;
-            await this._executeWithInputs(values);
+            await fire(values, envelopes);
           }
         }
       }
@@ -870,9 +942,11 @@ export class NodeActor {
     // Pre-seed: if any handle starts with no upstream (closed), nothing
     // arrives. Continue and let the loop terminate.
     for await (const [handle, envelope] of this.inbox.iterAnyWithEnvelope()) {
-      if (handle === "__control__") continue;
       const cls = handleClass.get(handle);
-      if (cls === undefined) continue;
+      if (handle === "__control__" || cls === undefined) {
+        if (!this.inbox.hasAny()) await flush();
+        continue;
+      }
 
       if (cls === "max") {
         const scope = handleScope.get(handle)!;
@@ -950,11 +1024,14 @@ export class NodeActor {
         const candidates = enumerateAllPendingKeys(maxBuckets);
         await tryFire(candidates);
       }
+      // Keep gathering only while the next envelope is already here.
+      if (!this.inbox.hasAny()) await flush();
     }
 
     // After iteration ends, every handle is closed. Multi-edge list inputs
     // gated on close are now ready: re-fire any pending max-scope keys.
     await tryFire(enumerateAllPendingKeys(maxBuckets));
+    await flush();
 
     // If the node has no max-scope inputs (all empty / prefix), fire once.
     if ([...handleClass.values()].every((c) => c !== "max") && !fired.has("")) {
@@ -1171,15 +1248,22 @@ export class NodeActor {
    *
    * Returns the outputs to route, or `SKIPPED` when the invocation was retired
    * without emitting.
+   *
+   * `firstAccount` is what the first attempt spent when it already ran
+   * elsewhere — a batched item's share of its `processBatch` call.
    */
   private async _invokeWithRecovery(
     inputs: Record<string, unknown>,
-    invoke: () => Promise<Record<string, unknown>>
+    invoke: () => Promise<Record<string, unknown>>,
+    firstAccount?: InvocationAccount
   ): Promise<Record<string, unknown> | typeof SKIPPED> {
     for (let attempt = 1; ; attempt++) {
       // A fresh account per attempt: what the previous try spent is not what
       // this one spent.
-      const account = createInvocationAccount();
+      const account =
+        attempt === 1 && firstAccount
+          ? firstAccount
+          : createInvocationAccount();
       try {
         return await inInvocationAccount(account, invoke);
       } catch (err) {
@@ -1385,6 +1469,21 @@ export class NodeActor {
   private async _executeWithInputs(
     inputs: Record<string, unknown>
   ): Promise<void> {
+    await this._invoke(await this._prepareInputs(inputs));
+  }
+
+  /**
+   * The inputs a node actually sees: spilled payloads materialised, node
+   * properties merged under the edge inputs, dynamic slots and the control
+   * context applied. Reads `_lastEnvelopes`, so call it per invocation.
+   */
+  private async _prepareInputs(
+    inputs: Record<string, unknown>
+  ): Promise<Record<string, unknown>> {
+    this._profiler?.recordDequeue(this.node.id, this.inbox, this._lastEnvelopes);
+    if (this._spiller) {
+      inputs = await this._spiller.materializeInputs(inputs);
+    }
     // Merge node properties as defaults — edge inputs override.
     // This matches Python's behavior where process() always receives
     // the node's own property values as baseline inputs.
@@ -1410,7 +1509,19 @@ export class NodeActor {
       type: this.node.type,
       inputHandles: Object.keys(inputs)
     });
+    return inputs;
+  }
 
+  /**
+   * One invocation on prepared inputs, under the current `_lastEnvelopes`:
+   * memo, recovery, routing and status. `batched` is this invocation's share
+   * of a {@link _executeBatch} call, with what that call spent on it; it
+   * stands in for the first attempt only, so a retry runs `process()` alone.
+   */
+  private async _invoke(
+    inputs: Record<string, unknown>,
+    batched?: { result: BatchItemResult; account: InvocationAccount }
+  ): Promise<void> {
     this._currentInvocationLineage = this._computeInvocationLineage();
 
     if (this.node.is_streaming_output && this._executor.genProcess) {
@@ -1418,10 +1529,49 @@ export class NodeActor {
       return;
     }
 
-    const outputs = await this._invokeWithRecovery(inputs, () =>
-      this._executor.process(inputs, this._executionContext)
+    const memoKey = this._memo?.isEligible(this.node)
+      ? this._memo.keyFor(inputs)
+      : undefined;
+    if (memoKey) {
+      const cached = await this._memo!.lookup(this.node, memoKey);
+      if (cached !== undefined) {
+        this._latestResult = cached;
+        await this._sendOutputs(
+          this.node.id,
+          cached,
+          this._currentHints(Object.keys(cached))
+        );
+        // A replay is not a new generation: no generation_complete, so asset
+        // autosave does not store the same result a second time.
+        this._emitNodeStatus("cached", cached);
+        return;
+      }
+    }
+
+    // Only what the node itself computed is memoized — a supervisor's
+    // substitute is a repair for this run, not the node's answer.
+    const computed: { outputs?: Record<string, unknown> } = {};
+    const outputs = await this._invokeWithRecovery(
+      inputs,
+      async () => {
+        if (batched) {
+          const { result } = batched;
+          batched = undefined;
+          if ("error" in result) throw result.error;
+          computed.outputs = result.outputs;
+          return computed.outputs;
+        }
+        computed.outputs = await this._withResource(() =>
+          this._executor.process(inputs, this._executionContext)
+        );
+        return computed.outputs;
+      },
+      batched?.account
     );
     if (outputs === SKIPPED) return;
+    if (memoKey && outputs === computed.outputs) {
+      await this._memo!.store(this.node, memoKey, outputs);
+    }
     this._latestResult = outputs;
     await this._sendOutputs(
       this.node.id,
@@ -1433,6 +1583,78 @@ export class NodeActor {
     this._emitGenerationComplete(outputs, inputs);
   }
 
+  /**
+   * Invocations per {@link _executeBatch} group: the executor's
+   * `maxBatchSize` when it implements `processBatch`, else 1. Streaming
+   * outputs go through `genProcess`, and memoized nodes look up and store
+   * per invocation, so both stay at 1.
+   */
+  private _batchSize(): number {
+    const max = this._executor.maxBatchSize ?? 1;
+    if (!this._executor.processBatch || !(max >= 2)) return 1;
+    if (this.node.is_streaming_output && this._executor.genProcess) return 1;
+    if (this._memo?.isEligible(this.node)) return 1;
+    return Math.floor(max);
+  }
+
+  /**
+   * Run a group of ready invocations through one `processBatch` call, then
+   * route each in order under its own envelopes, so lineage, recovery and
+   * status stay per invocation. A batch call that fails as a whole fails
+   * every item's first attempt; retries run `process()` one by one.
+   */
+  private async _executeBatch(
+    items: Array<{
+      values: Record<string, unknown>;
+      envelopes: Map<string, MessageEnvelope>;
+    }>
+  ): Promise<void> {
+    const prepared: Record<string, unknown>[] = [];
+    for (const item of items) {
+      this._lastEnvelopes = item.envelopes;
+      prepared.push(await this._prepareInputs(item.values));
+    }
+    if (prepared.length === 1) {
+      await this._invoke(prepared[0]);
+      return;
+    }
+
+    // One account for the whole call, so the profiler sees its bridge time.
+    const account = createInvocationAccount();
+    let results: BatchItemResult[];
+    try {
+      results = await inInvocationAccount(account, () =>
+        this._withResource(() =>
+          this._executor.processBatch!(prepared, this._executionContext)
+        )
+      );
+      if (results.length !== prepared.length) {
+        throw new Error(
+          `processBatch returned ${results.length} results for ` +
+            `${prepared.length} inputs`
+        );
+      }
+    } catch (err) {
+      const error = err instanceof Error ? err : new Error(String(err));
+      results = prepared.map(() => ({ error }));
+    }
+
+    // What the call spent cannot be split by item, so each failed item is
+    // escalated with an even share of the cost and the call's asset flag:
+    // a retry of an item whose batch spent money or made assets is unsafe.
+    const share: InvocationAccount = {
+      ...account,
+      costUsd: account.costUsd / items.length
+    };
+    for (let i = 0; i < items.length; i++) {
+      this._lastEnvelopes = items[i].envelopes;
+      await this._invoke(prepared[i], {
+        result: results[i],
+        account: { ...share }
+      });
+    }
+  }
+
   /**
    * The streaming-output invocation, with its own recovery rules.
    *
@@ -1447,15 +1669,23 @@ export class NodeActor {
       const account = createInvocationAccount();
       let emitted = false;
       this._streamingCollectedOutputs = {};
+      // The slot is held while the generator computes its next frame, not
+      // while that frame is routed.
+      const hold = this._resourceHold();
       try {
-        await inInvocationAccount(account, async () => {
-          for await (const partial of this._executor.genProcess!(
-            inputs,
-            this._executionContext
-          )) {
-            emitted = (await this._routeStreamingFrame(partial)) || emitted;
-          }
-        });
+        await inInvocationAccount(account, () =>
+          this._withResource(async () => {
+            for await (const partial of this._executor.genProcess!(
+              inputs,
+              this._executionContext
+            )) {
+              const routed = hold
+                ? await hold.idle(() => this._routeStreamingFrame(partial))
+                : await this._routeStreamingFrame(partial);
+              emitted = routed || emitted;
+            }
+          }, hold)
+        );
       } catch (err) {
         if (err instanceof WorkflowSuspendedError) throw err;
         if (err instanceof RoutingError) throw err.cause;
@@ -1524,6 +1754,77 @@ export class NodeActor {
     }
   }
 
+  /**
+   * Run `fn` holding a slot in this node's resource pool. A buffered node
+   * holds it only while `process()` runs, so routing its outputs never keeps
+   * a slot busy. A streaming node passes a `hold` and gives the slot up
+   * while it waits on its inbox or on delivery.
+   */
+  private _withResource<T>(
+    fn: () => Promise<T>,
+    hold?: ResourceHold
+  ): Promise<T> {
+    if (this._profiler) {
+      return this._profiledWithResource(fn, this._profiler, hold);
+    }
+    return this._inSlot(fn, hold);
+  }
+
+  private _inSlot<T>(fn: () => Promise<T>, hold?: ResourceHold): Promise<T> {
+    if (hold) return hold.run(fn);
+    return this._resourcePool
+      ? this._resourcePool.run(fn, this._resourcePriority, this._cancelSignal)
+      : fn();
+  }
+
+  /** A {@link ResourceHold} on this node's pool, if it has one. */
+  private _resourceHold(): ResourceHold | undefined {
+    return this._resourcePool
+      ? new ResourceHold(
+          this._resourcePool,
+          this._resourcePriority,
+          this._cancelSignal
+        )
+      : undefined;
+  }
+
+  /**
+   * {@link _withResource} with the slot wait, the run and the Python-bridge
+   * and image-encode shares of it recorded. Both are read off the invocation
+   * account the bridge executor and image codec charge, so they cover only
+   * this invocation.
+   */
+  private async _profiledWithResource<T>(
+    fn: () => Promise<T>,
+    profiler: RunProfiler,
+    hold?: ResourceHold
+  ): Promise<T> {
+    const account = currentInvocationAccount();
+    const bridgeBefore = account?.bridgeMs ?? 0;
+    const encodeBefore = account?.encodeMs ?? 0;
+    const requestedAt = profiler.now();
+    let startedAt: number | undefined;
+    const timed = () => {
+      startedAt = profiler.now();
+      return fn();
+    };
+    try {
+      return await this._inSlot(timed, hold);
+    } finally {
+      // Cancelled while still waiting for a slot: the node never ran.
+      if (startedAt !== undefined) {
+        profiler.recordExecution(
+          this.node.id,
+          requestedAt,
+          startedAt,
+          profiler.now(),
+          (account?.bridgeMs ?? 0) - bridgeBefore,
+          (account?.encodeMs ?? 0) - encodeBefore
+        );
+      }
+    }
+  }
+
   /** Route one yielded frame. Returns true when anything went downstream. */
   private async _routeStreamingFrame(
     partial: Record<string, unknown>
@@ -1840,14 +2141,19 @@ export class NodeActor {
         // Merge node properties as defaults (matching _executeWithInputs behavior)
         const baseProps = this.node.properties ?? {};
         const dynProps = this.node.dynamic_properties ?? {};
-        const merged = this._applyDynamicSlots({
+        let merged = this._applyDynamicSlots({
           ...baseProps,
           ...dynProps,
           ...inputs,
           ...this._currentControlProperties
         });
+        if (this._spiller) {
+          merged = await this._spiller.materializeInputs(merged);
+        }
         const outputs = await this._invokeWithRecovery(merged, () =>
-          this._executor.process(merged, this._executionContext)
+          this._withResource(() =>
+            this._executor.process(merged, this._executionContext)
+          )
         );
         if (outputs === SKIPPED) continue;
         this._latestResult = outputs;
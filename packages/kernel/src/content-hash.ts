@@ -0,0 +1,130 @@
+/**
+ * Stable content hashing for workflow values.
+ *
+ * Non-cryptographic: the hashes key caches and message ids inside one
+ * deployment, where the adversary is an accidental collision, not a forged
+ * one. Implemented without `node:crypto` so the kernel still loads in V8
+ * isolates (browser, Edge) without a polyfill.
+ */
+
+/**
+ * Incremental 64-bit FNV-1a built from two independently seeded 32-bit
+ * streams. Both halves consume every byte; the differing offset bases keep
+ * the streams independent.
+ */
+class Fnv64 {
+  private _h1 = 0x811c9dc5 | 0;
+  private _h2 = 0xcbf29ce4 | 0;
+
+  byte(b: number): void {
+    this._h1 = Math.imul(this._h1 ^ b, 16777619);
+    this._h2 = Math.imul(this._h2 ^ b, 16777619);
+  }
+
+  /** Feed both bytes of every UTF-16 code unit. */
+  string(input: string): void {
+    for (let i = 0; i < input.length; i++) {
+      const ch = input.charCodeAt(i);
+      this.byte(ch & 0xff);
+      this.byte((ch >>> 8) & 0xff);
+    }
+  }
+
+  bytes(input: Uint8Array): void {
+    for (let i = 0; i < input.length; i++) {
+      this.byte(input[i]);
+    }
+  }
+
+  hex(): string {
+    const u1 = (this._h1 >>> 0).toString(16).padStart(8, "0");
+    const u2 = (this._h2 >>> 0).toString(16).padStart(8, "0");
+    return u1 + u2;
+  }
+}
+
+/** Stable 16-hex-character hash of a string. */
+export function fnv1a64Hex(input: string): string {
+  const h = new Fnv64();
+  h.string(input);
+  return h.hex();
+}
+
+function feedValue(h: Fnv64, value: unknown, seen: Set<object>): void {
+  if (value === null || value === undefined) {
+    h.string("n;");
+    return;
+  }
+  switch (typeof value) {
+    case "string":
+      h.string(`s${value.length}:`);
+      h.string(value);
+      return;
+    case "number":
+    case "bigint":
+      h.string(`d${String(value)};`);
+      return;
+    case "boolean":
+      h.string(value ? "t;" : "f;");
+      return;
+    case "function":
+    case "symbol":
+      h.string("x;");
+      return;
+  }
+
+  const obj = value as object;
+  if (ArrayBuffer.isView(obj)) {
+    // Typed arrays, Buffers and DataViews: hash the bytes they view, so two
+    // equal images decoded into different buffers share one hash.
+    const bytes = new Uint8Array(obj.buffer, obj.byteOffset, obj.byteLength);
+    h.string(`b${obj.constructor.name}${bytes.length}:`);
+    h.bytes(bytes);
+    return;
+  }
+  if (obj instanceof ArrayBuffer) {
+    h.string(`b${obj.byteLength}:`);
+    h.bytes(new Uint8Array(obj));
+    return;
+  }
+  if (obj instanceof Date) {
+    h.string(`D${obj.getTime()};`);
+    return;
+  }
+  if (seen.has(obj)) {
+    h.string("c;");
+    return;
+  }
+  seen.add(obj);
+  if (Array.isArray(obj)) {
+    h.string(`a${obj.length}[`);
+    for (const item of obj) feedValue(h, item, seen);
+    h.string("]");
+  } else {
+    const record = obj as Record<string, unknown>;
+    // Sorted keys, undefined values skipped — the same equivalence
+    // `JSON.stringify` draws, so `{a: 1}` and `{a: 1, b: undefined}` agree.
+    const keys = Object.keys(record)
+      .filter((k) => record[k] !== undefined)
+      .sort();
+    h.string(`o${keys.length}{`);
+    for (const key of keys) {
+      h.string(`${key.length}:`);
+      h.string(key);
+      feedValue(h, record[key], seen);
+    }
+    h.string("}");
+  }
+  seen.delete(obj);
+}
+
+/**
+ * Hash a workflow value by content. Object keys are order-insensitive and
+ * binary payloads are hashed by their bytes, so structurally equal values
+ * produce the same hash however they were built.
+ */
+export function contentHash(value: unknown): string {
+  const h = new Fnv64();
+  feedValue(h, value, new Set());
+  return h.hex();
+}
@@ -9,40 +9,11 @@
  */
 
 import { createLogger } from "@nodetool-ai/config";
+import { fnv1a64Hex } from "./content-hash.js";
 
 // Stryker disable next-line StringLiteral: logger name is a diagnostic label, not a behavioural contract
 const log = createLogger("nodetool.kernel.durable-inbox");
 
-/**
- * Stable 16-hex-character hash of a string. Used to build durable
- * message IDs — collision resistance only needs to cover messages
- * within a single workflow run, so a non-cryptographic hash is
- * sufficient. Implemented inline to avoid pulling `node:crypto`,
- * which lets this file load in V8 isolates (browser, Edge) without
- * a polyfill.
- */
-function fnv1a64Hex(input: string): string {
-  // 64-bit hash via two independently seeded 32-bit FNV-1a streams. Both
-  // halves consume both bytes of every UTF-16 code unit; the differing
-  // offset bases keep the streams independent. (Feeding only the high byte
-  // to one half would make it depend solely on string length for ASCII
-  // input, collapsing this to an effectively 32-bit hash.)
-  let h1 = 0x811c9dc5 | 0;
-  let h2 = 0xcbf29ce4 | 0;
-  for (let i = 0; i < input.length; i++) {
-    const ch = input.charCodeAt(i);
-    const lo = ch & 0xff;
-    const hi = (ch >>> 8) & 0xff;
-    h1 = Math.imul(h1 ^ lo, 16777619);
-    h1 = Math.imul(h1 ^ hi, 16777619);
-    h2 = Math.imul(h2 ^ lo, 16777619);
-    h2 = Math.imul(h2 ^ hi, 16777619);
-  }
-  const u1 = (h1 >>> 0).toString(16).padStart(8, "0");
-  const u2 = (h2 >>> 0).toString(16).padStart(8, "0");
-  return u1 + u2;
-}
-
 export interface DurableMessage {
   id: string;
   runId: string;
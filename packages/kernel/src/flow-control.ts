@@ -0,0 +1,252 @@
+/**
+ * Adaptive credit-based flow control for node inboxes.
+ *
+ * `bufferLimit` caps every inbox handle at one static count, so a fast text
+ * source feeding a slow TTS node either queues without bound (no limit) or
+ * throttles every edge in the graph to the slowest consumer's pace (a low
+ * one). With flow control, each consuming handle grants its producers
+ * credits — the number of messages it lets queue — from its own measured
+ * service time: enough to cover `targetQueueMs` of work, between
+ * `minCredits` and `maxCredits`. A consumer that keeps up earns a deep
+ * queue; a slow one throttles only its own producers. Independently of
+ * credits, a handle holding `maxQueuedBytes` of payload admits nothing more,
+ * so a few huge frames cannot pin the heap.
+ *
+ * What a producer does when a handle is out of credits is the consuming
+ * node type's {@link FlowPolicy}: `block` (the default) waits, never losing a
+ * message; `keep_latest` drops the oldest queued message instead, which is
+ * what a preview stream wants — the newest frame, never a backlog.
+ *
+ * Service time is sampled only while the consumer is busy — when it takes
+ * its next message with a backlog already waiting — so idle gaps between
+ * bursts do not read as a slow consumer.
+ */
+
+import type { MessageEnvelope } from "./inbox.js";
+import { estimatePayloadBytes } from "./payload-size.js";
+
+/** What a producer does when a handle has no credits left. */
+export type FlowPolicy = "block" | "keep_latest";
+
+/** Opt-in flow-control settings for a {@link WorkflowRunner}. */
+export interface FlowControlOptions {
+  /** Credits a handle grants before its consumer has been measured. Default 16. */
+  initialCredits?: number;
+  /** Fewest credits a handle grants. Default 1. */
+  minCredits?: number;
+  /** Most credits a handle grants. Default 1024. */
+  maxCredits?: number;
+  /** Work a handle may have queued, in ms of measured service time. Default 1000. */
+  targetQueueMs?: number;
+  /** Payload bytes a handle may hold queued. Default 64 MiB. */
+  maxQueuedBytes?: number;
+  /** Policy by consuming node type. Types not listed `block`. */
+  policies?: Record<string, FlowPolicy>;
+}
+
+/** Flow-control counters for one edge, reported on `RunResult.flowControl`. */
+export interface EdgeFlowStats {
+  edgeId: string;
+  source: string;
+  target: string;
+  targetHandle: string;
+  policy: FlowPolicy;
+  /** Credits the target handle currently grants (shared by its edges). */
+  credits: number;
+  /** Messages queued on the target handle. */
+  queued: number;
+  /** Estimated payload bytes queued on the target handle. */
+  queuedBytes: number;
+  /** Times a producer on this edge waited for credit. */
+  stalls: number;
+  /** Time producers on this edge spent waiting for credit, in ms. */
+  stallMs: number;
+  /** Messages from this edge dropped by `keep_latest`. */
+  dropped: number;
+}
+
+/** The target-handle share of {@link EdgeFlowStats}. */
+export type HandleFlowStats = Pick<
+  EdgeFlowStats,
+  "policy" | "credits" | "queued" | "queuedBytes"
+>;
+
+/** The per-edge share of {@link EdgeFlowStats}. */
+type EdgeCounters = Pick<EdgeFlowStats, "stalls" | "stallMs" | "dropped">;
+
+const DEFAULTS = {
+  initialCredits: 16,
+  minCredits: 1,
+  maxCredits: 1024,
+  targetQueueMs: 1000,
+  maxQueuedBytes: 64 * 1024 * 1024
+};
+
+/** Weight of the newest service-time sample in the moving average. */
+const SERVICE_EWMA_ALPHA = 0.2;
+
+/** Handle carrying control events; never throttled or dropped. */
+const CONTROL_HANDLE = "__control__";
+
+class HandleCredits {
+  credits: number;
+  queued = 0;
+  queuedBytes = 0;
+  /** Moving average of ms per message while the consumer is busy. */
+  serviceMs: number | undefined;
+  lastTakeAt: number | undefined;
+  /** Whether messages were still queued right after the last take. */
+  backlogAfterTake = false;
+
+  constructor(initialCredits: number) {
+    this.credits = initialCredits;
+  }
+}
+
+/** One consumer inbox's credit accounting, across its handles. */
+export class InboxFlowControl {
+  readonly policy: FlowPolicy;
+  private readonly _opts: typeof DEFAULTS;
+  private _handles = new Map<string, HandleCredits>();
+  private _edges = new Map<string, EdgeCounters>();
+  /** Estimated size of each queued envelope, to release on dequeue. */
+  private _sizes = new WeakMap<MessageEnvelope, number>();
+
+  constructor(policy: FlowPolicy = "block", options: FlowControlOptions = {}) {
+    this.policy = policy;
+    const minCredits = Math.max(1, options.minCredits ?? DEFAULTS.minCredits);
+    const maxCredits = Math.max(
+      minCredits,
+      options.maxCredits ?? DEFAULTS.maxCredits
+    );
+    this._opts = {
+      minCredits,
+      maxCredits,
+      initialCredits: clamp(
+        options.initialCredits ?? DEFAULTS.initialCredits,
+        minCredits,
+        maxCredits
+      ),
+      targetQueueMs: options.targetQueueMs ?? DEFAULTS.targetQueueMs,
+      maxQueuedBytes: options.maxQueuedBytes ?? DEFAULTS.maxQueuedBytes
+    };
+  }
+
+  /** Whether `handle` has no credit left for another message. */
+  isFull(handle: string): boolean {
+    if (handle === CONTROL_HANDLE) return false;
+    const state = this._handles.get(handle);
+    if (!state) return false;
+    return (
+      state.queued >= state.credits ||
+      (state.queued > 0 && state.queuedBytes >= this._opts.maxQueuedBytes)
+    );
+  }
+
+  /** Whether a full `handle` drops its oldest message rather than blocking. */
+  keepsLatest(handle: string): boolean {
+    return this.policy === "keep_latest" && handle !== CONTROL_HANDLE;
+  }
+
+  onEnqueue(handle: string, envelope: MessageEnvelope): void {
+    const state = this._state(handle);
+    const bytes = estimatePayloadBytes(envelope.data);
+    this._sizes.set(envelope, bytes);
+    state.queued++;
+    state.queuedBytes += bytes;
+  }
+
+  /** A consumer took `envelopes`, leaving `remaining` queued. */
+  onDequeue(
+    handle: string,
+    envelopes: readonly MessageEnvelope[],
+    remaining: number
+  ): void {
+    if (envelopes.length === 0) return;
+    const state = this._state(handle);
+    this._release(state, envelopes);
+    const now = performance.now();
+    if (state.backlogAfterTake && state.lastTakeAt !== undefined) {
+      const sample = (now - state.lastTakeAt) / envelopes.length;
+      state.serviceMs =
+        state.serviceMs === undefined
+          ? sample
+          : state.serviceMs + SERVICE_EWMA_ALPHA * (sample - state.serviceMs);
+      state.credits = clamp(
+        Math.ceil(this._opts.targetQueueMs / Math.max(state.serviceMs, 1e-3)),
+        this._opts.minCredits,
+        this._opts.maxCredits
+      );
+    }
+    state.lastTakeAt = now;
+    state.backlogAfterTake = remaining > 0;
+  }
+
+  /** `keep_latest` discarded `envelope` to make room. */
+  onDrop(handle: string, envelope: MessageEnvelope): void {
+    this._release(this._state(handle), [envelope]);
+    this._edge(envelope.source_edge_id).dropped++;
+  }
+
+  /** A producer on `edgeId` waited `ms` for credit. */
+  onStall(edgeId: string | undefined, ms: number): void {
+    const edge = this._edge(edgeId);
+    edge.stalls++;
+    edge.stallMs += ms;
+  }
+
+  handleStats(handle: string): HandleFlowStats {
+    const state = this._handles.get(handle);
+    return {
+      policy: this.policy,
+      credits: state?.credits ?? this._opts.initialCredits,
+      queued: state?.queued ?? 0,
+      queuedBytes: state?.queuedBytes ?? 0
+    };
+  }
+
+  edgeStats(edgeId: string): EdgeCounters {
+    const edge = this._edges.get(edgeId);
+    return {
+      stalls: edge?.stalls ?? 0,
+      stallMs: edge?.stallMs ?? 0,
+      dropped: edge?.dropped ?? 0
+    };
+  }
+
+  private _release(
+    state: HandleCredits,
+    envelopes: readonly MessageEnvelope[]
+  ): void {
+    for (const envelope of envelopes) {
+      state.queued = Math.max(0, state.queued - 1);
+      state.queuedBytes = Math.max(
+        0,
+        state.queuedBytes - (this._sizes.get(envelope) ?? 0)
+      );
+    }
+  }
+
+  private _state(handle: string): HandleCredits {
+    let state = this._handles.get(handle);
+    if (!state) {
+      state = new HandleCredits(this._opts.initialCredits);
+      this._handles.set(handle, state);
+    }
+    return state;
+  }
+
+  private _edge(edgeId: string | undefined): EdgeCounters {
+    const key = edgeId ?? "";
+    let edge = this._edges.get(key);
+    if (!edge) {
+      edge = { stalls: 0, stallMs: 0, dropped: 0 };
+      this._edges.set(key, edge);
+    }
+    return edge;
+  }
+}
+
+function clamp(value: number, min: number, max: number): number {
+  return Math.min(max, Math.max(min, value));
+}
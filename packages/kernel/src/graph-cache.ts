@@ -0,0 +1,151 @@
+/**
+ * Compiled-graph cache – the prepared, immutable form of a workflow graph,
+ * shared by every run of the same graph.
+ *
+ * Before it spawns an actor, a run rewrites bypassed nodes, builds the
+ * `Graph` edge indexes, drops dangling edges, runs static correlation
+ * analysis, validates edges and node properties and classifies multi-edge
+ * list inputs. None of that depends on the run's params, so a trigger-driven
+ * workflow that runs thousands of times a day with the same graph repeats it
+ * for nothing. A runner given a {@link CompiledGraphCache} looks the graph up
+ * by a content hash of its nodes and edges plus the cache's `version` — the
+ * node registry's revision, since validation and hydration read the
+ * registry — and only pays for per-run state on a hit.
+ *
+ * Only graphs that compiled cleanly are cached; a graph that fails
+ * validation is re-validated (and fails) every run. Entries are evicted
+ * least recently used first.
+ *
+ * Everything in a {@link CompiledGraph} is shared between concurrent runs and
+ * must not be mutated.
+ */
+
+import type { Graph } from "./graph.js";
+import type { CorrelationAnalysisResult } from "./correlation-analysis.js";
+import { contentHash } from "./content-hash.js";
+import { criticalPathLengths } from "./resource-scheduler.js";
+
+/** The run-independent preparation of one graph. */
+export class CompiledGraph {
+  private _criticalPath: ReadonlyMap<string, number> | undefined;
+
+  constructor(
+    readonly graph: Graph,
+    readonly correlation: CorrelationAnalysisResult,
+    /** nodeId → handles that aggregate several edges into a list. */
+    readonly multiEdgeListInputs: ReadonlyMap<string, ReadonlySet<string>>,
+    /** Time the preparation took, in ms. */
+    readonly compileMs: number
+  ) {}
+
+  /** {@link criticalPathLengths} of the graph, computed on first use. */
+  get criticalPath(): ReadonlyMap<string, number> {
+    this._criticalPath ??= criticalPathLengths(this.graph);
+    return this._criticalPath;
+  }
+}
+
+export interface CompiledGraphCacheOptions {
+  /** Most graphs kept. Default 64. */
+  maxEntries?: number;
+  /**
+   * Part of every key. Pass the node registry's `revision` so registering or
+   * reloading nodes invalidates graphs prepared against the old set.
+   */
+  version?: () => string | number;
+}
+
+/** Process-wide cache counters. */
+export interface CompiledGraphCacheStats {
+  size: number;
+  hits: number;
+  misses: number;
+  evictions: number;
+  /** Preparation time hits did not spend, net of hashing, in ms. */
+  savedMs: number;
+}
+
+/** How one run's graph preparation went, reported on `RunResult.graphCache`. */
+export interface GraphPreparationStats {
+  hit: boolean;
+  /** Time the run spent preparing its graph, hashing included, in ms. */
+  setupMs: number;
+  /** Preparation time the hit saved; 0 on a miss. */
+  savedMs: number;
+}
+
+const DEFAULT_MAX_ENTRIES = 64;
+
+/**
+ * An LRU map from graph key to {@link CompiledGraph}. Share one across the
+ * runners of a process; graphs prepared with different `validateNode`
+ * callbacks need different caches (or versions).
+ */
+export class CompiledGraphCache {
+  private readonly _maxEntries: number;
+  private readonly _version: (() => string | number) | undefined;
+  private _entries = new Map<string, CompiledGraph>();
+  private _hits = 0;
+  private _misses = 0;
+  private _evictions = 0;
+  private _savedMs = 0;
+
+  constructor(options: CompiledGraphCacheOptions = {}) {
+    const maxEntries = options.maxEntries ?? DEFAULT_MAX_ENTRIES;
+    if (!(maxEntries >= 1)) {
+      throw new Error(
+        `Compiled graph cache needs at least 1 entry, got ${maxEntries}`
+      );
+    }
+    this._maxEntries = maxEntries;
+    this._version = options.version;
+  }
+
+  get stats(): CompiledGraphCacheStats {
+    return {
+      size: this._entries.size,
+      hits: this._hits,
+      misses: this._misses,
+      evictions: this._evictions,
+      savedMs: this._savedMs
+    };
+  }
+
+  /** Cache key for `graphData`: content hash of nodes and edges plus version. */
+  keyFor(graphData: { nodes: unknown; edges: unknown }): string {
+    const hash = contentHash({ nodes: graphData.nodes, edges: graphData.edges });
+    return this._version ? `${this._version()}:${hash}` : hash;
+  }
+
+  /**
+   * The compiled graph for `key`, marking it most recently used. `lookupMs`
+   * is what finding it cost (hashing the graph); the rest of its compile time
+   * is counted as saved.
+   */
+  get(key: string, lookupMs = 0): CompiledGraph | undefined {
+    const entry = this._entries.get(key);
+    if (!entry) {
+      this._misses++;
+      return undefined;
+    }
+    this._entries.delete(key);
+    this._entries.set(key, entry);
+    this._hits++;
+    this._savedMs += Math.max(0, entry.compileMs - lookupMs);
+    return entry;
+  }
+
+  set(key: string, compiled: CompiledGraph): void {
+    this._entries.delete(key);
+    this._entries.set(key, compiled);
+    while (this._entries.size > this._maxEntries) {
+      const oldest = this._entries.keys().next().value as string;
+      this._entries.delete(oldest);
+      this._evictions++;
+    }
+  }
+
+  clear(): void {
+    this._entries.clear();
+  }
+}
@@ -0,0 +1,279 @@
+/**
+ * Graph partitioning for multi-process runs (see `PartitionedRunner`).
+ *
+ * {@link partitionGraph} assigns every node to one of N partitions and
+ * builds, per partition, the graph its process runs: the nodes it owns plus
+ * stand-ins for the remote nodes it exchanges messages with. A stand-in keeps
+ * the original node's id, flags and correlation declarations but has type
+ * {@link REMOTE_NODE_TYPE} and no properties, so the partition's runner
+ * spawns no actor for it and treats it as neither an input nor a variable
+ * writer.
+ *
+ * Stand-ins cover two roles:
+ *  - targets of edges leaving the partition — deliveries to them are
+ *    forwarded over the wire;
+ *  - every ancestor of an owned node that the partition does not own, with
+ *    the edges between them. They never run; they are there so the
+ *    partition's static correlation analysis sees the same upstream graph as
+ *    a single-process run, and assigns every owned input the same scope.
+ *    Without them a cut below an iteration source would change how joins
+ *    downstream of the cut pair their inputs.
+ *
+ * Some nodes must share a process whatever the strategy: both ends of a
+ * control edge (control responses are awaited in-process) and the Set/Get
+ * Variable nodes of one channel (channels live on the run's context).
+ */
+
+import type { Edge, GraphData, NodeDescriptor } from "@nodetool-ai/protocol";
+import { isControlEdge } from "@nodetool-ai/protocol";
+import { GraphValidationError } from "./graph.js";
+import {
+  GET_VARIABLE_NODE_TYPE,
+  SET_VARIABLE_NODE_TYPE,
+  variableChannelName
+} from "./graph-utils.js";
+
+/** Node type of a stand-in for a node that runs in another partition. */
+export const REMOTE_NODE_TYPE = "nodetool.partition.Remote";
+
+/**
+ * How nodes are grouped before groups are spread over partitions:
+ *  - `component` — connected components stay whole; no edge is cut.
+ *  - `pack` — nodes of one node pack (by default, their type's namespace)
+ *    stay together.
+ *  - `pinned` — `pins` fixes nodes to partitions; unpinned nodes are grouped
+ *    by connected component among themselves.
+ */
+export type PartitionStrategy = "component" | "pack" | "pinned";
+
+export interface PartitionOptions {
+  /** Number of partitions (processes). At most 255. */
+  partitions: number;
+  /** Default `component`. */
+  strategy?: PartitionStrategy;
+  /** `pinned`: partition index by node id. */
+  pins?: Record<string, number>;
+  /** `pack`: a node's pack. Default: its type up to the last `.`. */
+  packOf?: (node: NodeDescriptor) => string;
+}
+
+export interface GraphPartition<T extends GraphData = GraphData> {
+  index: number;
+  /** Nodes this partition runs. */
+  nodeIds: string[];
+  /** Owned nodes, stand-ins and the edges between them. */
+  graph: T;
+  /** Owning partition of each stand-in in `graph`. */
+  remoteOwners: Record<string, number>;
+}
+
+export interface PartitionPlan<T extends GraphData = GraphData> {
+  /** Non-empty partitions, by ascending index. */
+  partitions: GraphPartition<T>[];
+  /** Partition index by node id. */
+  owners: Map<string, number>;
+  /** Edges whose endpoints run in different partitions. */
+  crossEdges: Edge[];
+}
+
+/** Most partitions a plan may have: wire frames route on one byte. */
+export const MAX_PARTITIONS = 255;
+
+class UnionFind {
+  private _parent = new Map<string, string>();
+
+  find(id: string): string {
+    let root = id;
+    while (this._parent.has(root)) root = this._parent.get(root)!;
+    // Path compression.
+    while (id !== root) {
+      const next = this._parent.get(id)!;
+      this._parent.set(id, root);
+      id = next;
+    }
+    return root;
+  }
+
+  union(a: string, b: string): void {
+    const ra = this.find(a);
+    const rb = this.find(b);
+    if (ra !== rb) this._parent.set(ra, rb);
+  }
+}
+
+function defaultPackOf(node: NodeDescriptor): string {
+  const dot = node.type.lastIndexOf(".");
+  return dot > 0 ? node.type.slice(0, dot) : node.type;
+}
+
+function standIn(node: NodeDescriptor): NodeDescriptor {
+  const { name: _name, ...rest } = node;
+  return { ...rest, type: REMOTE_NODE_TYPE, properties: {} };
+}
+
+/**
+ * Split `data` into at most `options.partitions` partitions. Groups are
+ * placed largest first on the least-loaded partition, by node count.
+ *
+ * Throws a `GraphValidationError` for pins outside the partition range, or
+ * when pins separate nodes that must run together.
+ */
+export function partitionGraph<T extends GraphData>(
+  data: T,
+  options: PartitionOptions
+): PartitionPlan<T> {
+  const count = Math.floor(options.partitions);
+  if (!(count >= 1 && count <= MAX_PARTITIONS)) {
+    throw new GraphValidationError(
+      `Partition count must be between 1 and ${MAX_PARTITIONS}, got ${options.partitions}`
+    );
+  }
+  const strategy = options.strategy ?? "component";
+  const pins = strategy === "pinned" ? (options.pins ?? {}) : {};
+  for (const [nodeId, index] of Object.entries(pins)) {
+    if (!Number.isInteger(index) || index < 0 || index >= count) {
+      throw new GraphValidationError(
+        `Node ${nodeId} is pinned to partition ${index}, outside 0..${count - 1}`
+      );
+    }
+  }
+
+  const nodes = new Map(data.nodes.map((n) => [n.id, n]));
+  const edges = data.edges.filter(
+    (e) => nodes.has(e.source) && nodes.has(e.target)
+  );
+  const groups = new UnionFind();
+
+  // Always together: control edges and variable channels.
+  for (const edge of edges) {
+    if (isControlEdge(edge)) groups.union(edge.source, edge.target);
+  }
+  const channelMembers = new Map<string, string>();
+  for (const node of data.nodes) {
+    if (
+      node.type !== SET_VARIABLE_NODE_TYPE &&
+      node.type !== GET_VARIABLE_NODE_TYPE
+    ) {
+      continue;
+    }
+    const channel = variableChannelName(node);
+    const first = channelMembers.get(channel);
+    if (first === undefined) channelMembers.set(channel, node.id);
+    else groups.union(first, node.id);
+  }
+
+  if (strategy === "component") {
+    for (const edge of edges) groups.union(edge.source, edge.target);
+  } else if (strategy === "pack") {
+    const packOf = options.packOf ?? defaultPackOf;
+    const firstOfPack = new Map<string, string>();
+    for (const node of data.nodes) {
+      const pack = packOf(node);
+      const first = firstOfPack.get(pack);
+      if (first === undefined) firstOfPack.set(pack, node.id);
+      else groups.union(first, node.id);
+    }
+  } else {
+    for (const edge of edges) {
+      if (
+        !Object.hasOwn(pins, edge.source) &&
+        !Object.hasOwn(pins, edge.target)
+      ) {
+        groups.union(edge.source, edge.target);
+      }
+    }
+  }
+
+  // Collect groups and the pin each carries.
+  const members = new Map<string, string[]>();
+  for (const node of data.nodes) {
+    const root = groups.find(node.id);
+    const list = members.get(root) ?? [];
+    list.push(node.id);
+    members.set(root, list);
+  }
+  const load = new Array<number>(count).fill(0);
+  const owners = new Map<string, number>();
+  const unpinned: string[][] = [];
+  for (const group of members.values()) {
+    const pinned = group.filter((id) => Object.hasOwn(pins, id));
+    const targets = new Set(pinned.map((id) => pins[id]));
+    if (targets.size > 1) {
+      throw new GraphValidationError(
+        `Nodes ${pinned.join(", ")} are pinned to different partitions but ` +
+          "must run in one process (control edge or variable channel)"
+      );
+    }
+    if (targets.size === 0) {
+      unpinned.push(group);
+      continue;
+    }
+    const index = pins[pinned[0]];
+    for (const id of group) owners.set(id, index);
+    load[index] += group.length;
+  }
+  unpinned.sort((a, b) => b.length - a.length);
+  for (const group of unpinned) {
+    const index = load.indexOf(Math.min(...load));
+    for (const id of group) owners.set(id, index);
+    load[index] += group.length;
+  }
+
+  const incoming = new Map<string, Edge[]>();
+  for (const edge of edges) {
+    const list = incoming.get(edge.target) ?? [];
+    list.push(edge);
+    incoming.set(edge.target, list);
+  }
+
+  const crossEdges = edges.filter(
+    (e) => owners.get(e.source) !== owners.get(e.target)
+  );
+  const partitions: GraphPartition<T>[] = [];
+  for (let index = 0; index < count; index++) {
+    const owned = data.nodes.filter((n) => owners.get(n.id) === index);
+    if (owned.length === 0) continue;
+    const included = new Set(owned.map((n) => n.id));
+    // Remote ancestors, so correlation scopes match the whole graph.
+    const stack = [...included];
+    while (stack.length > 0) {
+      const id = stack.pop()!;
+      for (const edge of incoming.get(id) ?? []) {
+        if (included.has(edge.source)) continue;
+        included.add(edge.source);
+        stack.push(edge.source);
+      }
+    }
+    // Remote targets of edges leaving the partition.
+    for (const edge of crossEdges) {
+      if (owners.get(edge.source) === index) included.add(edge.target);
+    }
+
+    const remoteOwners: Record<string, number> = {};
+    const partitionNodes: NodeDescriptor[] = [];
+    for (const node of data.nodes) {
+      if (!included.has(node.id)) continue;
+      const owner = owners.get(node.id)!;
+      if (owner === index) {
+        partitionNodes.push(node);
+      } else {
+        partitionNodes.push(standIn(node));
+        remoteOwners[node.id] = owner;
+      }
+    }
+    partitions.push({
+      index,
+      nodeIds: owned.map((n) => n.id),
+      graph: {
+        ...data,
+        nodes: partitionNodes,
+        edges: edges.filter(
+          (e) => included.has(e.source) && included.has(e.target)
+        )
+      } as T,
+      remoteOwners
+    });
+  }
+
+  return { partitions, owners, crossEdges };
+}
@@ -6,7 +6,7 @@
 
 import type { Edge, GraphData, NodeDescriptor } from "@nodetool-ai/protocol";
 import { isControlEdge, TypeMetadata } from "@nodetool-ai/protocol";
-import { Graph } from "./graph.js";
+import { Graph, GraphValidationError } from "./graph.js";
 import { getDynamicSlotTypeString } from "./dynamic-slots.js";
 import { isObjectValue, isString } from "./predicates.js";
 
@@ -118,6 +118,77 @@ export function getDownstreamSubgraph(
   return { initialEdges, nodes, edges: filteredEdges };
 }
 
+/** Node type that publishes to a variable channel. */
+export const SET_VARIABLE_NODE_TYPE = "nodetool.variable.SetVariable";
+/** Node type that reads a variable channel. */
+export const GET_VARIABLE_NODE_TYPE = "nodetool.variable.GetVariable";
+
+export function variableChannelName(node: NodeDescriptor): string {
+  const raw = isObjectValue(node.properties) ? node.properties.name : undefined;
+  return isString(raw) ? raw.trim() : "";
+}
+
+/**
+ * Prune a graph to what producing `targetIds` needs: the targets and every
+ * node they transitively depend on. Dependencies follow incoming data and
+ * control edges, and variable channels — a Get Variable node depends on
+ * every Set Variable node writing its channel, though no edge joins them.
+ * Only edges between kept nodes survive.
+ *
+ * Returns `data` itself when nothing is pruned. Throws a
+ * `GraphValidationError` naming any target that is not in the graph.
+ */
+export function pruneGraphToTargets<T extends GraphData>(
+  data: T,
+  targetIds: readonly string[]
+): T {
+  const graph = new Graph(data);
+  const unknown = targetIds.filter((id) => !graph.findNode(id));
+  if (unknown.length > 0) {
+    throw new GraphValidationError(
+      `Unknown target node(s): ${unknown.join(", ")}`
+    );
+  }
+
+  let writers: Map<string, string[]> | undefined;
+  const writersOf = (name: string): string[] => {
+    if (!writers) {
+      writers = new Map();
+      for (const node of graph.nodes) {
+        if (node.type !== SET_VARIABLE_NODE_TYPE) continue;
+        const channel = variableChannelName(node);
+        const list = writers.get(channel) ?? [];
+        list.push(node.id);
+        writers.set(channel, list);
+      }
+    }
+    return writers.get(name) ?? [];
+  };
+
+  const keep = new Set<string>(targetIds);
+  const stack = [...keep];
+  const visit = (id: string) => {
+    if (keep.has(id)) return;
+    keep.add(id);
+    stack.push(id);
+  };
+  while (stack.length > 0) {
+    const id = stack.pop()!;
+    for (const edge of graph.findIncomingEdges(id)) visit(edge.source);
+    const node = graph.findNode(id)!;
+    if (node.type === GET_VARIABLE_NODE_TYPE) {
+      for (const writer of writersOf(variableChannelName(node))) visit(writer);
+    }
+  }
+
+  if (keep.size === data.nodes.length) return data;
+  return {
+    ...data,
+    nodes: data.nodes.filter((n) => keep.has(n.id)),
+    edges: data.edges.filter((e) => keep.has(e.source) && keep.has(e.target))
+  } as T;
+}
+
 // ---------------------------------------------------------------------------
 // Bypass rewriting
 // ---------------------------------------------------------------------------
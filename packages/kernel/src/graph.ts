@@ -478,7 +478,15 @@ export class Graph {
         // `retry_safe: true` for a node whose class never declared it would
         // hand the supervisor a retry on a side-effecting node. An unresolved
         // type therefore gets no retry rather than the saved claim.
-        retry_safe: descriptorDefaults.retry_safe ?? false
+        retry_safe: descriptorDefaults.retry_safe ?? false,
+        // Purity follows the same rule: a saved file claiming a node is pure
+        // would let a memoizing runner replay a side-effecting node's output.
+        is_pure: descriptorDefaults.is_pure ?? false,
+        // A saved class is only a scheduling hint, so it may fill in for a
+        // type the registry does not know.
+        ...((descriptorDefaults.resource_class ?? node.resource_class) && {
+          resource_class: descriptorDefaults.resource_class ?? node.resource_class
+        })
       };
 
       resolvedNodes.push(hydratedNode);
@@ -9,6 +9,14 @@
  *   - Async iteration with backpressure (optional buffer limit).
  *   - Arrival-order multiplexing for iterAny.
  *   - MessageEnvelope wrapping for metadata propagation.
+ *   - Batched put/drain (putMany, iterInputBatch) for high-rate streams.
+ *   - Optional adaptive per-handle credits (see flow-control.ts).
+ *
+ * Per-item cost is constant: buffers are ring buffers, and the arrival queue
+ * is never searched. Each buffered envelope carries a sequence number; the
+ * arrival queue records (handle, seq) pairs, and an entry whose envelope was
+ * already consumed through a per-handle iterator is skipped when it reaches
+ * the head instead of being spliced out when the envelope is taken.
  */
 
 import { getNodeBuiltinSync } from "@nodetool-ai/config";
@@ -17,6 +25,7 @@ import type {
   LineageDone,
   LineageScopeClosed
 } from "@nodetool-ai/protocol";
+import { releasePayloadRefs } from "./payload-spill.js";
 
 // Stryker disable next-line StringLiteral: module name; on failure getNodeBuiltinSync returns null and randomUUID falls back, so the literal is not behaviourally observable
 const _nodeCrypto = getNodeBuiltinSync<typeof import("node:crypto")>("node:crypto");
@@ -43,6 +52,8 @@ function randomUUID(): string {
 }
 import { EMPTY_LINEAGE } from "@nodetool-ai/protocol";
 import { tryProjectLineageKey, type Scope } from "./correlation-analysis.js";
+import { RingBuffer } from "./ring-buffer.js";
+import type { InboxFlowControl } from "./flow-control.js";
 
 // ---------------------------------------------------------------------------
 // MessageEnvelope
@@ -63,6 +74,31 @@ export interface PutOptions {
   source_edge_id?: string;
 }
 
+/** One item of a {@link NodeInbox.putMany} batch. */
+export interface InboxEntry extends PutOptions {
+  handle: string;
+  data: unknown;
+}
+
+/** A buffered envelope and its position in the inbox's arrival order. */
+interface Slot {
+  envelope: MessageEnvelope;
+  seq: number;
+}
+
+/** Arrival-queue record: an envelope with sequence `seq` arrived on `handle`. */
+interface ArrivalEntry {
+  handle: string;
+  seq: number;
+}
+
+/**
+ * Stale arrival entries tolerated beyond the live ones before the queue is
+ * compacted. Keeps memory bounded for consumers that only ever read through
+ * per-handle iterators, which leave their arrival entries behind.
+ */
+const ARRIVAL_SLACK = 64;
+
 function makeEnvelope(
   data: unknown,
   opts: PutOptions = {}
@@ -103,14 +139,25 @@ function deferred<T = void>(): Deferred<T> {
 
 export class NodeInbox {
   /** Per-handle FIFO of envelopes. */
-  private _buffers = new Map<string, MessageEnvelope[]>();
+  private _buffers = new Map<string, RingBuffer<Slot>>();
+
+  /** Envelopes buffered across all handles. */
+  private _bufferedCount = 0;
+
+  /** Sequence number of the next appended envelope. */
+  private _nextSeq = 0;
+
+  /** Sequence number of the next prepended envelope (counts down). */
+  private _prependSeq = -1;
 
   /** Number of open upstream sources per handle. */
   private _openCounts = new Map<string, number>();
 
-  /** Global arrival order queue of handle names. */
-  // Stryker disable next-line ArrayDeclaration: a non-empty seed is equivalent — a bogus handle has no matching buffer entry and is skipped by tryPopAny's stale guard
-  private _arrival: string[] = [];
+  /**
+   * Global arrival order, ascending by `seq`. May hold stale entries for
+   * envelopes already consumed per-handle; see {@link _isLive}.
+   */
+  private _arrival = new RingBuffer<ArrivalEntry>();
 
   /** Optional per-handle buffer capacity. */
   private _bufferLimit: number | null;
@@ -138,6 +185,12 @@ export class NodeInbox {
   /** Waiters: producers blocking when buffer is full. */
   private _putWaiters: Array<Deferred<void>> = [];
 
+  /** Times a producer parked on a full buffer. */
+  private _blockedPuts = 0;
+
+  /** Optional adaptive credits, on top of `_bufferLimit`. */
+  private _flow: InboxFlowControl | null;
+
   /**
    * Per-(source_edge_id, projected lineage key) record of `lineage_done`
    * signals. The projection is canonical (root=index in scope order) so
@@ -163,11 +216,18 @@ export class NodeInbox {
     opts: {
       maxPendingKeys?: number;
       maxPendingMessagesPerKey?: number;
+      flowControl?: InboxFlowControl;
     } = {}
   ) {
     this._bufferLimit = bufferLimit;
     this._maxPendingKeys = opts.maxPendingKeys ?? 10_000;
     this._maxPendingMessagesPerKey = opts.maxPendingMessagesPerKey ?? 10_000;
+    this._flow = opts.flowControl ?? null;
+  }
+
+  /** Flow control this inbox was built with, if any. */
+  get flowControl(): InboxFlowControl | null {
+    return this._flow;
   }
 
   /** Configured pending-key limit (read by the actor for diagnostics). */
@@ -180,6 +240,14 @@ export class NodeInbox {
     return this._maxPendingMessagesPerKey;
   }
 
+  /**
+   * Times a producer has parked on a full buffer. Lets a caller tell a
+   * `put` that waited for space from one that merely took a while.
+   */
+  get blockedPuts(): number {
+    return this._blockedPuts;
+  }
+
   // -----------------------------------------------------------------------
   // Producer API
   // -----------------------------------------------------------------------
@@ -191,14 +259,14 @@ export class NodeInbox {
   addUpstream(handle: string, count: number = 1): void {
     const cur = this._openCounts.get(handle) ?? 0;
     this._openCounts.set(handle, cur + count);
-    if (!this._buffers.has(handle)) {
-      this._buffers.set(handle, []);
-    }
+    this._bufferFor(handle);
   }
 
   /**
    * Enqueue an item for a handle.
-   * Blocks (via returned promise) if the per-handle buffer is at capacity.
+   * Blocks (via returned promise) if the per-handle buffer is at capacity,
+   * unless the handle's flow policy is `keep_latest`, which drops the oldest
+   * buffered item instead.
    */
   async put(
     handle: string,
@@ -207,33 +275,46 @@ export class NodeInbox {
   ): Promise<void> {
     if (this._closed) return;
 
-    const buf = this._buffers.get(handle);
-    if (!buf) {
-      // Handle not registered – auto-create
-      this._buffers.set(handle, []);
-    }
+    // Handle not registered – auto-create
+    const buf = this._bufferFor(handle);
 
-    // Backpressure: wait if buffer is at limit
-    if (this._bufferLimit !== null && !this._backpressureReleased) {
-      while (
-        !this._closed &&
-        !this._backpressureReleased &&
-        // Stryker disable next-line OptionalChaining: the buffer was auto-created above, so get(handle) is always defined here — the ?. is defensive
-        (this._buffers.get(handle)?.length ?? 0) >= this._bufferLimit
-      ) {
-        const d = deferred<void>();
-        this._putWaiters.push(d);
-        await d.promise;
-      }
+    // Backpressure: wait (or drop the oldest) if buffer is at limit
+    if (this._isFull(handle, buf)) {
+      await this._makeSpace(handle, buf, opts.source_edge_id);
       if (this._closed) return;
     }
 
-    const envelope = makeEnvelope(item, opts);
-    this._buffers.get(handle)!.push(envelope);
-    this._arrival.push(handle);
+    this._append(handle, buf, makeEnvelope(item, opts));
     this._notifyWaiters();
   }
 
+  /**
+   * Enqueue a batch of items, in order, waking consumers once for the whole
+   * batch instead of once per item. Items may target different handles.
+   *
+   * Backpressure applies per handle exactly as in `put()`: on reaching a full
+   * buffer the items queued so far are published, and the rest of the batch
+   * waits for space.
+   */
+  async putMany(entries: Iterable<InboxEntry>): Promise<void> {
+    if (this._closed) return;
+    let unpublished = false;
+    for (const entry of entries) {
+      const buf = this._bufferFor(entry.handle);
+      if (this._isFull(entry.handle, buf)) {
+        if (unpublished) {
+          this._notifyWaiters();
+          unpublished = false;
+        }
+        await this._makeSpace(entry.handle, buf, entry.source_edge_id);
+        if (this._closed) return;
+      }
+      this._append(entry.handle, buf, makeEnvelope(entry.data, entry));
+      unpublished = true;
+    }
+    if (unpublished) this._notifyWaiters();
+  }
+
   /**
    * Prepend an envelope back to the front of a handle's buffer.
    * Used for push-back scenarios.
@@ -241,8 +322,11 @@ export class NodeInbox {
   prepend(handle: string, envelope: MessageEnvelope): void {
     const buf = this._buffers.get(handle);
     if (buf) {
-      buf.unshift(envelope);
-      this._arrival.unshift(handle);
+      const seq = this._prependSeq--;
+      buf.unshift({ envelope, seq });
+      this._arrival.unshift({ handle, seq });
+      this._bufferedCount++;
+      this._flow?.onEnqueue(handle, envelope);
       this._notifyWaiters();
     }
   }
@@ -369,9 +453,7 @@ export class NodeInbox {
     while (true) {
       const buf = this._buffers.get(handle);
       if (buf && buf.length > 0) {
-        const envelope = buf.shift()!;
-        this._removeFromArrival(handle);
-        this._notifyPutWaiters();
+        const envelope = this._take(handle, buf, 1)[0];
         yield envelope.data;
         continue;
       }
@@ -393,9 +475,7 @@ export class NodeInbox {
     while (true) {
       const buf = this._buffers.get(handle);
       if (buf && buf.length > 0) {
-        const envelope = buf.shift()!;
-        this._removeFromArrival(handle);
-        this._notifyPutWaiters();
+        const envelope = this._take(handle, buf, 1)[0];
         yield envelope;
         continue;
       }
@@ -406,6 +486,44 @@ export class NodeInbox {
     }
   }
 
+  /**
+   * Yield items for a single handle until EOS, in batches of everything
+   * buffered at the time (at most `maxItems` per batch). A consumer that can
+   * process items in bulk pays one await per burst rather than one per item.
+   */
+  async *iterInputBatch(
+    handle: string,
+    maxItems: number = Infinity
+  ): AsyncGenerator<unknown[]> {
+    for await (const batch of this.iterInputBatchWithEnvelope(
+      handle,
+      maxItems
+    )) {
+      yield batch.map((envelope) => envelope.data);
+    }
+  }
+
+  /**
+   * Envelope form of {@link iterInputBatch}. Batches are never empty.
+   */
+  async *iterInputBatchWithEnvelope(
+    handle: string,
+    maxItems: number = Infinity
+  ): AsyncGenerator<MessageEnvelope[]> {
+    const limit = Math.max(1, Math.floor(maxItems));
+    while (true) {
+      const buf = this._buffers.get(handle);
+      if (buf && buf.length > 0) {
+        yield this._take(handle, buf, limit);
+        continue;
+      }
+      if (this._isHandleDone(handle) || this._closed) {
+        return;
+      }
+      await this._waitForData();
+    }
+  }
+
   /**
    * Yield (handle, item) tuples in arrival order across all handles.
    * Completes when all handles are drained.
@@ -460,17 +578,16 @@ export class NodeInbox {
    */
   tryPopAnyWithEnvelope(): [string, MessageEnvelope] | null {
     while (this._arrival.length > 0) {
-      const handle = this._arrival[0];
-      const buf = this._buffers.get(handle);
-      // Stryker disable next-line ConditionalExpression,LogicalOperator,EqualityOperator: defensive stale guard — _removeFromArrival keeps the arrival queue in lock-step with buffers, so the head is always backed by a non-empty buffer; the empty/undefined case is unreachable
-      if (buf && buf.length > 0) {
-        this._arrival.shift();
-        const envelope = buf.shift()!;
+      const entry = this._arrival.shift()!;
+      const buf = this._buffers.get(entry.handle);
+      if (buf && this._isLive(entry)) {
+        const slot = buf.shift()!;
+        this._bufferedCount--;
+        this._flow?.onDequeue(entry.handle, [slot.envelope], buf.length);
         this._notifyPutWaiters();
-        return [handle, envelope];
+        return [entry.handle, slot.envelope];
       }
-      // Stale arrival entry (buffer already consumed) – skip
-      this._arrival.shift();
+      // Stale arrival entry (envelope already consumed per-handle) – skip
     }
     return null;
   }
@@ -491,10 +608,7 @@ export class NodeInbox {
   drainHandle(handle: string): MessageEnvelope[] {
     const buf = this._buffers.get(handle);
     if (!buf?.length) return [];
-    const drained = buf.splice(0);
-    this._arrival = this._arrival.filter((h) => h !== handle);
-    this._notifyPutWaiters();
-    return drained;
+    return this._take(handle, buf, buf.length);
   }
 
   /** Whether any handle has buffered data. */
@@ -505,6 +619,11 @@ export class NodeInbox {
     return false;
   }
 
+  /** Envelopes currently buffered for a handle. */
+  depth(handle: string): number {
+    return this._buffers.get(handle)?.length ?? 0;
+  }
+
   /** Whether a specific handle has buffered data. */
   hasBuffered(handle: string): boolean {
     const buf = this._buffers.get(handle);
@@ -577,6 +696,106 @@ export class NodeInbox {
   // Internal helpers
   // -----------------------------------------------------------------------
 
+  private _bufferFor(handle: string): RingBuffer<Slot> {
+    let buf = this._buffers.get(handle);
+    if (!buf) {
+      buf = new RingBuffer<Slot>();
+      this._buffers.set(handle, buf);
+    }
+    return buf;
+  }
+
+  private _isFull(handle: string, buf: RingBuffer<Slot>): boolean {
+    if (this._backpressureReleased) return false;
+    if (this._bufferLimit !== null && buf.length >= this._bufferLimit) {
+      return true;
+    }
+    return this._flow?.isFull(handle) ?? false;
+  }
+
+  /**
+   * Make room on a full `buf`: drop its oldest envelopes under `keep_latest`,
+   * otherwise wait for a consumer.
+   */
+  private async _makeSpace(
+    handle: string,
+    buf: RingBuffer<Slot>,
+    edgeId: string | undefined
+  ): Promise<void> {
+    if (this._flow?.keepsLatest(handle)) {
+      while (buf.length > 0 && this._isFull(handle, buf)) {
+        const slot = buf.shift()!;
+        this._bufferedCount--;
+        // Never read, so its spilled payloads would stay pinned until the
+        // end-of-run sweep; give their leases back now.
+        releasePayloadRefs(slot.envelope.data);
+        this._flow.onDrop(handle, slot.envelope);
+      }
+      return;
+    }
+    await this._waitForSpace(handle, buf, edgeId);
+  }
+
+  /** Park until `buf` has room, the inbox closes, or backpressure is released. */
+  private async _waitForSpace(
+    handle: string,
+    buf: RingBuffer<Slot>,
+    edgeId: string | undefined
+  ): Promise<void> {
+    const startedAt = this._flow ? performance.now() : 0;
+    let parked = false;
+    while (!this._closed && this._isFull(handle, buf)) {
+      parked = true;
+      this._blockedPuts++;
+      const d = deferred<void>();
+      this._putWaiters.push(d);
+      await d.promise;
+    }
+    if (parked) this._flow?.onStall(edgeId, performance.now() - startedAt);
+  }
+
+  private _append(
+    handle: string,
+    buf: RingBuffer<Slot>,
+    envelope: MessageEnvelope
+  ): void {
+    const seq = this._nextSeq++;
+    buf.push({ envelope, seq });
+    this._arrival.push({ handle, seq });
+    this._bufferedCount++;
+    this._flow?.onEnqueue(handle, envelope);
+  }
+
+  /**
+   * Consume up to `max` envelopes from the head of one handle's buffer. Their
+   * arrival entries become stale and are skipped or compacted later.
+   */
+  private _take(
+    handle: string,
+    buf: RingBuffer<Slot>,
+    max: number
+  ): MessageEnvelope[] {
+    const slots = buf.shiftMany(max);
+    this._bufferedCount -= slots.length;
+    if (this._arrival.length > 2 * this._bufferedCount + ARRIVAL_SLACK) {
+      this._arrival.retain((entry) => this._isLive(entry));
+    }
+    const envelopes = slots.map((slot) => slot.envelope);
+    this._flow?.onDequeue(handle, envelopes, buf.length);
+    this._notifyPutWaiters();
+    return envelopes;
+  }
+
+  /**
+   * Whether an arrival entry still refers to a buffered envelope. Buffers are
+   * consumed from the head and are ascending by `seq`, so an entry is live
+   * exactly when its handle's head has not moved past it.
+   */
+  private _isLive(entry: ArrivalEntry): boolean {
+    const head = this._buffers.get(entry.handle)?.peek();
+    return head !== undefined && entry.seq >= head.seq;
+  }
+
   private _isHandleDone(handle: string): boolean {
     const buf = this._buffers.get(handle);
     // Stryker disable next-line ConditionalExpression,BooleanLiteral: equivalent — _isHandleDone is only consulted after the iterator's buffered-data branch, so `buf` is always empty here; forcing `empty` true changes nothing
@@ -623,16 +842,4 @@ export class NodeInbox {
     if (this._closed) return;
     await this._waitForData();
   }
-
-  /**
-   * Remove the first occurrence of `handle` from the arrival queue.
-   * Called after consuming from a specific handle.
-   */
-  private _removeFromArrival(handle: string): void {
-    const idx = this._arrival.indexOf(handle);
-    // Stryker disable next-line ConditionalExpression: forcing this true is equivalent — _removeFromArrival is only called right after consuming a buffered item, so the handle is always present (idx >= 0); the guard is defensive against an idx === -1 that cannot occur
-    if (idx >= 0) {
-      this._arrival.splice(idx, 1);
-    }
-  }
 }
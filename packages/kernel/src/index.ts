@@ -13,7 +13,11 @@ export {
   type NodeTypeResolver,
   type ResolvedNodeType
 } from "./graph.js";
-export { NodeInbox, type MessageEnvelope } from "./inbox.js";
+export {
+  NodeInbox,
+  type InboxEntry,
+  type MessageEnvelope
+} from "./inbox.js";
 export { syntheticEdgeId, externalEdgeId } from "./edge-ids.js";
 export {
   analyzeCorrelation,
@@ -69,8 +73,104 @@ export {
   type RunResult,
   type NodeValidationIssue,
   type NodeValidator,
-  type OutputRoutingHints
+  type OutputRoutingHints,
+  type PartitionBinding
 } from "./runner.js";
+export {
+  NodeResultMemo,
+  type MemoizationOptions,
+  type MemoizationStats
+} from "./memoization.js";
+export {
+  MessageCoalescer,
+  type MessageCoalescingOptions,
+  type MessageCoalescingStats
+} from "./message-coalescer.js";
+export {
+  PayloadRef,
+  PayloadSpiller,
+  releasePayloadRefs,
+  type PayloadSpillOptions,
+  type PayloadSpillStats
+} from "./payload-spill.js";
+export {
+  ResourcePool,
+  ResourceHold,
+  ResourceScheduler,
+  resourceClassOf,
+  criticalPathLengths,
+  type ResourcePoolStats,
+  type ResourceRelease
+} from "./resource-scheduler.js";
+export {
+  WorkerPool,
+  WorkerNodeExecutor,
+  WorkerUnavailableError,
+  ownedArrayBuffers,
+  type WorkerPoolOptions,
+  type WorkerPoolStats,
+  type WorkerTaskStats
+} from "./worker-pool.js";
+export {
+  CompiledGraph,
+  CompiledGraphCache,
+  type CompiledGraphCacheOptions,
+  type CompiledGraphCacheStats,
+  type GraphPreparationStats
+} from "./graph-cache.js";
+export { estimatePayloadBytes } from "./payload-size.js";
+export {
+  RunProfiler,
+  type RunProfilerOptions,
+  type RunProfile,
+  type NodeProfile,
+  type EdgeProfile,
+  type ChromeTrace,
+  type ChromeTraceEvent
+} from "./run-profiler.js";
+export {
+  InboxFlowControl,
+  type FlowPolicy,
+  type FlowControlOptions,
+  type EdgeFlowStats,
+  type HandleFlowStats
+} from "./flow-control.js";
+export {
+  partitionGraph,
+  REMOTE_NODE_TYPE,
+  MAX_PARTITIONS,
+  type PartitionStrategy,
+  type PartitionOptions,
+  type GraphPartition,
+  type PartitionPlan
+} from "./graph-partition.js";
+export {
+  PartitionChannel,
+  RemoteInbox,
+  COORDINATOR,
+  CROSS_PARTITION_WINDOW,
+  type PartitionMessage,
+  type PartitionOutcome,
+  type ChannelStats,
+  type FrameStream
+} from "./partition-wire.js";
+export {
+  PartitionedRunner,
+  type PartitionedRunnerOptions,
+  type PartitionedRunResult,
+  type PartitionStats
+} from "./partitioned-runner.js";
+export type { PartitionExecutorModule } from "./partition-host.js";
+export {
+  MemoryRunCheckpointStore,
+  RunCheckpointer,
+  type RunCheckpointStore,
+  type RunCheckpointOptions,
+  type RunCheckpointStats,
+  type NodeCheckpoint,
+  type CheckpointEmission
+} from "./run-checkpoint.js";
+export { contentHash } from "./content-hash.js";
 export {
   NodeInputs,
   NodeOutputs,
@@ -90,6 +190,7 @@ export {
   getNodeInputTypes,
   getDownstreamSubgraph,
   isNodeBypassed,
+  pruneGraphToTargets,
   rewriteBypassedNodes
 } from "./graph-utils.js";
 export {
@@ -12,12 +12,15 @@ import type { CorrelationLineage } from "@nodetool-ai/protocol";
 import type { MessageEnvelope } from "./inbox.js";
 import { NodeInbox } from "./inbox.js";
 import type { NodeAnalysis, Scope } from "./correlation-analysis.js";
+import type { PayloadSpiller } from "./payload-spill.js";
 
 export class NodeInputs {
   private _inbox: NodeInbox;
   private _envelopeTracker: Map<string, MessageEnvelope> | null;
   private _analysis: NodeAnalysis | undefined;
   private _signal: AbortSignal;
+  private _spiller: PayloadSpiller | undefined;
+  private _idle: (<T>(wait: () => Promise<T>) => Promise<T>) | undefined;
 
   /**
    * `envelopeTracker`, when provided, records the most recently consumed
@@ -33,17 +36,27 @@ export class NodeInputs {
    * `signal` is the run's cancellation signal (aborted by
    * `WorkflowRunner.cancel()`). Defaults to a never-aborted signal so test
    * fixtures that construct NodeInputs directly stay terse.
+   *
+   * `spiller`, when the run spills large payloads, turns the `PayloadRef`s
+   * in delivered values back into bytes before they are handed out.
+   *
+   * `idle`, when provided, wraps every wait for the next inbox item; the
+   * actor uses it to give up the node's resource slot while it waits.
    */
   constructor(
     inbox: NodeInbox,
     envelopeTracker?: Map<string, MessageEnvelope> | null,
     analysis?: NodeAnalysis,
-    signal?: AbortSignal
+    signal?: AbortSignal,
+    spiller?: PayloadSpiller,
+    idle?: <T>(wait: () => Promise<T>) => Promise<T>
   ) {
     this._inbox = inbox;
     this._envelopeTracker = envelopeTracker ?? null;
     this._analysis = analysis;
     this._signal = signal ?? new AbortController().signal;
+    this._spiller = spiller;
+    this._idle = idle;
   }
 
   /**
@@ -78,9 +91,11 @@ export class NodeInputs {
    * has no named union for. The kernel never inspects the payload.
    */
   async first(name: string, defaultValue?: unknown): Promise<unknown> {
-    for await (const envelope of this._inbox.iterInputWithEnvelope(name)) {
+    for await (const envelope of this._waiting(
+      this._inbox.iterInputWithEnvelope(name)
+    )) {
       this._envelopeTracker?.set(name, envelope);
-      return envelope.data;
+      return this._data(envelope);
     }
     return defaultValue;
   }
@@ -92,9 +107,11 @@ export class NodeInputs {
     name: string,
     defaultValue?: TDefault
   ): Promise<MessageEnvelope | TDefault | undefined> {
-    for await (const envelope of this._inbox.iterInputWithEnvelope(name)) {
+    for await (const envelope of this._waiting(
+      this._inbox.iterInputWithEnvelope(name)
+    )) {
       this._envelopeTracker?.set(name, envelope);
-      return envelope;
+      return this._materialized(envelope);
     }
     return defaultValue;
   }
@@ -104,9 +121,30 @@ export class NodeInputs {
    * handle is recorded so the actor can derive invocation lineage.
    */
   async *stream(name: string): AsyncGenerator<unknown> {
-    for await (const envelope of this._inbox.iterInputWithEnvelope(name)) {
+    for await (const envelope of this._waiting(
+      this._inbox.iterInputWithEnvelope(name)
+    )) {
       this._envelopeTracker?.set(name, envelope);
-      yield envelope.data;
+      yield this._spiller ? await this._data(envelope) : envelope.data;
+    }
+  }
+
+  /**
+   * Async generator: yields batches of everything buffered on a handle (at
+   * most `maxItems` each) until EOS. For consumers that handle a burst of
+   * small items — tokens, rows, audio chunks — in one step.
+   */
+  async *streamBatch(
+    name: string,
+    maxItems?: number
+  ): AsyncGenerator<unknown[]> {
+    for await (const batch of this._waiting(
+      this._inbox.iterInputBatchWithEnvelope(name, maxItems)
+    )) {
+      this._envelopeTracker?.set(name, batch[batch.length - 1]);
+      yield this._spiller
+        ? await Promise.all(batch.map((envelope) => this._data(envelope)))
+        : batch.map((envelope) => envelope.data);
     }
   }
 
@@ -114,9 +152,11 @@ export class NodeInputs {
    * Async generator: yields MessageEnvelopes until EOS.
    */
   async *streamWithEnvelope(name: string): AsyncGenerator<MessageEnvelope> {
-    for await (const envelope of this._inbox.iterInputWithEnvelope(name)) {
+    for await (const envelope of this._waiting(
+      this._inbox.iterInputWithEnvelope(name)
+    )) {
       this._envelopeTracker?.set(name, envelope);
-      yield envelope;
+      yield this._spiller ? await this._materialized(envelope) : envelope;
     }
   }
 
@@ -124,9 +164,14 @@ export class NodeInputs {
    * Async generator: yields [handle, item] tuples in arrival order.
    */
   async *any(): AsyncGenerator<[string, unknown]> {
-    for await (const [handle, envelope] of this._inbox.iterAnyWithEnvelope()) {
+    for await (const [handle, envelope] of this._waiting(
+      this._inbox.iterAnyWithEnvelope()
+    )) {
       this._envelopeTracker?.set(handle, envelope);
-      yield [handle, envelope.data];
+      yield [
+        handle,
+        this._spiller ? await this._data(envelope) : envelope.data
+      ];
     }
   }
 
@@ -134,9 +179,14 @@ export class NodeInputs {
    * Async generator: yields [handle, MessageEnvelope] tuples.
    */
   async *anyWithEnvelope(): AsyncGenerator<[string, MessageEnvelope]> {
-    for await (const [handle, envelope] of this._inbox.iterAnyWithEnvelope()) {
+    for await (const [handle, envelope] of this._waiting(
+      this._inbox.iterAnyWithEnvelope()
+    )) {
       this._envelopeTracker?.set(handle, envelope);
-      yield [handle, envelope];
+      yield [
+        handle,
+        this._spiller ? await this._materialized(envelope) : envelope
+      ];
     }
   }
 
@@ -153,6 +203,37 @@ export class NodeInputs {
   hasStream(name: string): boolean {
     return this._inbox.isOpen(name);
   }
+
+  /** `items`, with each wait for the next one run through `idle`. */
+  private _waiting<T>(items: AsyncIterable<T>): AsyncIterable<T> {
+    const idle = this._idle;
+    if (!idle) return items;
+    return {
+      [Symbol.asyncIterator]() {
+        const it = items[Symbol.asyncIterator]();
+        return {
+          next: () => idle(() => it.next()),
+          return: async (value?: unknown) =>
+            (await it.return?.(value)) ?? { done: true, value: undefined }
+        };
+      }
+    };
+  }
+
+  private async _data(envelope: MessageEnvelope): Promise<unknown> {
+    return this._spiller
+      ? this._spiller.materialize(envelope.data)
+      : envelope.data;
+  }
+
+  /** The envelope, or a copy carrying materialised data. */
+  private async _materialized(
+    envelope: MessageEnvelope
+  ): Promise<MessageEnvelope> {
+    if (!this._spiller) return envelope;
+    const data = await this._spiller.materialize(envelope.data);
+    return data === envelope.data ? envelope : { ...envelope, data };
+  }
 }
 
 // ---------------------------------------------------------------------------
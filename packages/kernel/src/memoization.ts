@@ -0,0 +1,136 @@
+/**
+ * Content-addressed node result memoization.
+ *
+ * A memoized invocation is keyed by the node type and the content hash of
+ * every resolved input — declared properties, dynamic properties and edge
+ * values alike, since the actor merges them into one record before calling
+ * `process()`. Re-running a graph after editing one prompt then serves every
+ * unchanged upstream node from the cache; only the edited node and the cone
+ * downstream of it see new input hashes and execute.
+ *
+ * Results live in the run's `ProcessingContext.cache`, through the context's
+ * own `getCachedResult` / `cacheResult` helpers, so a host that shares one
+ * cache adapter across runs shares memoized results the same way.
+ */
+
+import { createLogger } from "@nodetool-ai/config";
+import type { NodeDescriptor } from "@nodetool-ai/protocol";
+import type { ProcessingContext } from "@nodetool-ai/runtime";
+import { contentHash } from "./content-hash.js";
+
+/** Opt-in memoization settings for a {@link WorkflowRunner}. */
+export interface MemoizationOptions {
+  /**
+   * Also memoize nodes that declare `retry_safe` but not `is_pure`. A retry
+   * safe node tolerates being re-run; whether it also tolerates *not* being
+   * re-run (a web fetch, a clock read) is the caller's call, so it is off by
+   * default.
+   */
+  includeRetrySafe?: boolean;
+  /** Lifetime of a cached result in seconds. Default one hour. */
+  ttlSeconds?: number;
+}
+
+/** Per-run memoization counters, reported on `RunResult.memoization`. */
+export interface MemoizationStats {
+  /** Invocations served from the cache without calling the node. */
+  hits: number;
+  /** Eligible invocations that executed and were cached. */
+  misses: number;
+}
+
+// Stryker disable next-line StringLiteral: logger name is a diagnostic label, not a behavioural contract
+const log = createLogger("nodetool.kernel.memoization");
+
+const DEFAULT_TTL_SECONDS = 3600;
+
+/**
+ * Cache lookups and counters for one run. Only `process()` invocations are
+ * memoized: a streaming node's result is the sequence of frames it emitted,
+ * which replaying one record cannot reproduce.
+ */
+export class NodeResultMemo {
+  private _hits = 0;
+  private _misses = 0;
+
+  constructor(
+    private readonly _context: ProcessingContext,
+    private readonly _options: MemoizationOptions = {}
+  ) {}
+
+  /** Whether invocations of `node` may be served from the cache. */
+  isEligible(node: NodeDescriptor): boolean {
+    if (node.is_streaming_input || node.is_streaming_output) return false;
+    if (node.is_controlled) return false;
+    return (
+      node.is_pure === true ||
+      (this._options.includeRetrySafe === true && node.retry_safe === true)
+    );
+  }
+
+  /**
+   * Key for one invocation. Keys starting with `_` are actor-injected context
+   * (`_control_context`), not inputs of the computation, and are left out.
+   */
+  keyFor(inputs: Record<string, unknown>): Record<string, string> {
+    const hashes: Record<string, string> = {};
+    for (const [handle, value] of Object.entries(inputs)) {
+      if (handle.startsWith("_") || value === undefined) continue;
+      hashes[handle] = contentHash(value);
+    }
+    return hashes;
+  }
+
+  /**
+   * The cached outputs for `key`, counting a hit when found. A cache that
+   * fails to answer is a miss, not a node failure: the node simply runs.
+   */
+  async lookup(
+    node: NodeDescriptor,
+    key: Record<string, string>
+  ): Promise<Record<string, unknown> | undefined> {
+    let cached: Record<string, unknown> | undefined;
+    try {
+      cached = await this._context.getCachedResult<Record<string, unknown>>(
+        node.type,
+        key
+      );
+    } catch (err) {
+      // Stryker disable next-line StringLiteral,ObjectLiteral: diagnostic log args only
+      log.warn("Memo lookup failed", {
+        nodeId: node.id,
+        error: err instanceof Error ? err.message : String(err)
+      });
+      return undefined;
+    }
+    if (cached !== undefined) this._hits++;
+    return cached;
+  }
+
+  /** Record a freshly computed result, counting a miss. */
+  async store(
+    node: NodeDescriptor,
+    key: Record<string, string>,
+    outputs: Record<string, unknown>
+  ): Promise<void> {
+    this._misses++;
+    try {
+      await this._context.cacheResult(
+        node.type,
+        key,
+        outputs,
+        this._options.ttlSeconds ?? DEFAULT_TTL_SECONDS
+      );
+    } catch (err) {
+      // Stryker disable next-line StringLiteral,ObjectLiteral: diagnostic log args only
+      log.warn("Memo store failed", {
+        nodeId: node.id,
+        error: err instanceof Error ? err.message : String(err)
+      });
+    }
+  }
+
+  get stats(): MemoizationStats {
+    return { hits: this._hits, misses: this._misses };
+  }
+}
@@ -0,0 +1,226 @@
+/**
+ * MessageCoalescer – batches chatty ProcessingMessages between the runner and
+ * its transport.
+ *
+ * A streaming LLM node emits one `output_update` per token and a ForEach over
+ * 50k rows one `node_progress` per row; forwarded one by one, each becomes a
+ * WebSocket frame. The coalescer holds those messages for one tick and
+ * collapses each stream to what a client would render anyway:
+ *
+ *   - `node_progress`: latest value wins per node; `chunk` text concatenates.
+ *   - `edge_update`: latest value wins per edge.
+ *   - `output_update` with `disposition: "replace"`: latest wins per output.
+ *   - `output_update` appending a text `chunk` value, and text `chunk`
+ *     messages: consecutive pieces on one stream concatenate. An appended
+ *     plain string is a whole result (one per ForEach row, say) and is
+ *     delivered as-is, like any other appended value.
+ *
+ * Every other message type — `job_update`, `node_update`, errors,
+ * `generation_complete` — is a barrier: everything pending is flushed, in
+ * arrival order, before it is delivered. Terminal events therefore always
+ * follow the progress that preceded them, and the relative order of all
+ * non-coalesced messages is unchanged.
+ */
+
+import type { ProcessingMessage } from "@nodetool-ai/protocol";
+import { isObjectValue, isString } from "./predicates.js";
+
+export interface MessageCoalescingOptions {
+  /**
+   * How long a coalesced message may wait before it is flushed. Default 33 ms
+   * (~30 frames/s); 16–50 ms keeps a UI feeling live.
+   */
+  intervalMs?: number;
+}
+
+export interface MessageCoalescingStats {
+  /** Messages handed to the coalescer. */
+  received: number;
+  /** Messages delivered after coalescing. */
+  delivered: number;
+}
+
+const DEFAULT_INTERVAL_MS = 33;
+
+/** How a pending slot may absorb a later message on the same stream. */
+type SlotKind = "latest" | "text" | "progress" | "fixed";
+
+interface Slot {
+  stream: string;
+  kind: SlotKind;
+  msg: ProcessingMessage;
+}
+
+interface TextChunkValue {
+  type: "chunk";
+  content: string;
+  content_type?: string;
+  done?: boolean;
+}
+
+function isTextChunk(value: unknown): value is TextChunkValue {
+  if (!isObjectValue(value)) return false;
+  const v = value as Partial<TextChunkValue>;
+  return (
+    v.type === "chunk" &&
+    isString(v.content) &&
+    (v.content_type === undefined || v.content_type === "text")
+  );
+}
+
+
+type AnyMessage = ProcessingMessage & Record<string, unknown>;
+
+export class MessageCoalescer {
+  private readonly _intervalMs: number;
+  /** Pending slots in arrival order. */
+  private _slots: Slot[] = [];
+  /** Stream key → that stream's most recent pending slot. */
+  private _tails = new Map<string, Slot>();
+  private _timer: ReturnType<typeof setTimeout> | null = null;
+  private _received = 0;
+  private _delivered = 0;
+
+  constructor(
+    private readonly _deliver: (msg: ProcessingMessage) => void,
+    options: MessageCoalescingOptions = {}
+  ) {
+    this._intervalMs = options.intervalMs ?? DEFAULT_INTERVAL_MS;
+  }
+
+  get stats(): MessageCoalescingStats {
+    return { received: this._received, delivered: this._delivered };
+  }
+
+  push(msg: ProcessingMessage): void {
+    this._received++;
+    const m = msg as AnyMessage;
+    switch (msg.type) {
+      case "node_progress":
+        this._absorb(`progress:${m.node_id}`, "progress", msg);
+        return;
+      case "edge_update":
+        this._absorb(`edge:${m.edge_id}`, "latest", msg);
+        return;
+      case "output_update": {
+        const stream = `output:${m.node_id}:${m.output_name}`;
+        if (m.disposition === "replace") {
+          this._absorb(stream, "latest", msg);
+        } else if (isTextChunk(m.value)) {
+          this._absorb(stream, "text", msg);
+        } else {
+          // Strings, media and other appended values are delivered as-is,
+          // in order: the client lists each one as its own result.
+          this._absorb(stream, "fixed", msg);
+        }
+        return;
+      }
+      case "chunk": {
+        const stream = `chunk:${m.node_id}:${m.thread_id}`;
+        const text =
+          isString(m.content) && (m.content_type ?? "text") === "text";
+        this._absorb(stream, text ? "text" : "fixed", msg);
+        return;
+      }
+      default:
+        this.flush();
+        this._emit(msg);
+    }
+  }
+
+  /** Deliver everything pending, in arrival order. */
+  flush(): void {
+    if (this._timer !== null) {
+      clearTimeout(this._timer);
+      this._timer = null;
+    }
+    if (this._slots.length === 0) return;
+    const slots = this._slots;
+    this._slots = [];
+    this._tails.clear();
+    for (const slot of slots) this._emit(slot.msg);
+  }
+
+  private _emit(msg: ProcessingMessage): void {
+    this._delivered++;
+    this._deliver(msg);
+  }
+
+  private _absorb(stream: string, kind: SlotKind, msg: ProcessingMessage): void {
+    const tail = this._tails.get(stream);
+    if (tail && tail.kind === kind) {
+      const merged = this._merge(tail, msg);
+      if (merged) {
+        tail.msg = merged;
+        this._closeIfDone(tail);
+        return;
+      }
+    }
+    const slot: Slot = { stream, kind, msg };
+    this._slots.push(slot);
+    this._tails.set(stream, slot);
+    this._closeIfDone(slot);
+    this._arm();
+  }
+
+  /** The combination of a pending slot and a later message, or null. */
+  private _merge(slot: Slot, msg: ProcessingMessage): ProcessingMessage | null {
+    const prev = slot.msg as AnyMessage;
+    const next = msg as AnyMessage;
+    switch (slot.kind) {
+      case "latest":
+        return msg;
+      case "progress": {
+        if (prev.chunk === undefined) return msg;
+        const chunk =
+          next.chunk === undefined
+            ? prev.chunk
+            : String(prev.chunk) + String(next.chunk);
+        return { ...next, chunk } as ProcessingMessage;
+      }
+      case "text": {
+        if (msg.type === "output_update") {
+          // Both are text chunks: only those open a "text" slot.
+          const a = prev.value as TextChunkValue;
+          const b = next.value as TextChunkValue;
+          return {
+            ...next,
+            value: { ...b, content: a.content + b.content }
+          } as ProcessingMessage;
+        }
+        // Reasoning and answer text interleave on one chunk stream; only
+        // pieces of the same kind concatenate.
+        if (prev.thinking !== next.thinking) return null;
+        return {
+          ...next,
+          content: String(prev.content) + String(next.content)
+        } as ProcessingMessage;
+      }
+      case "fixed":
+        return null;
+    }
+  }
+
+  /**
+   * A text stream that signalled `done` must not absorb a later piece: the
+   * next one starts a new stream on the client.
+   */
+  private _closeIfDone(slot: Slot): void {
+    const m = slot.msg as AnyMessage;
+    const done =
+      m.done === true || (isTextChunk(m.value) && m.value.done === true);
+    if (done && this._tails.get(slot.stream) === slot) {
+      this._tails.delete(slot.stream);
+    }
+  }
+
+  private _arm(): void {
+    if (this._timer !== null) return;
+    this._timer = setTimeout(() => {
+      this._timer = null;
+      this.flush();
+    }, this._intervalMs);
+    // Node: a pending flush must not keep the process alive on its own.
+    (this._timer as { unref?: () => void }).unref?.();
+  }
+}
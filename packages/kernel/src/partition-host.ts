@@ -0,0 +1,240 @@
+/**
+ * Child-process side of a partitioned run (see `PartitionedRunner`).
+ *
+ * Run as a script, this module serves one partition over file descriptor 3,
+ * which the coordinator opens as a pipe: it waits for the `start` message,
+ * loads the executor module it names, runs its partition's graph with a
+ * {@link WorkflowRunner} and reports every processing message and the
+ * outcome back. Values arriving for the partition's nodes are applied to
+ * their inboxes strictly in the order sent, per (node, handle), and
+ * acknowledged once admitted.
+ *
+ * The executor module is this process's node registry: it must export
+ * `resolveExecutor(node)`, and may export `validateNode` and
+ * `createExecutionContext(options)`. Without the latter, nodes get a plain
+ * `ProcessingContext`.
+ */
+
+import { createLogger, getNodeBuiltinSync } from "@nodetool-ai/config";
+import type { NodeDescriptor, ProcessingMessage } from "@nodetool-ai/protocol";
+import { ProcessingContext } from "@nodetool-ai/runtime";
+import type { NodeExecutor } from "./actor.js";
+import type { NodeInbox } from "./inbox.js";
+import {
+  COORDINATOR,
+  PartitionChannel,
+  RemoteInbox,
+  type FrameStream,
+  type PartitionMessage,
+  type PartitionOutcome
+} from "./partition-wire.js";
+import { WorkflowRunner, type NodeValidator } from "./runner.js";
+
+// Stryker disable next-line StringLiteral: logger name is a diagnostic label, not a behavioural contract
+const log = createLogger("nodetool.kernel.partition-host");
+
+/** What a partition's executor module exports. */
+export interface PartitionExecutorModule {
+  resolveExecutor(node: NodeDescriptor): NodeExecutor;
+  validateNode?: NodeValidator;
+  createExecutionContext?(options: {
+    jobId: string;
+    workflowId: string | null;
+    onMessage: (msg: ProcessingMessage) => void;
+  }): ProcessingContext;
+}
+
+type StartMessage = Extract<PartitionMessage, { type: "start" }>;
+type InboundMessage = Extract<
+  PartitionMessage,
+  { type: "put" | "signal" | "eos" }
+>;
+
+/**
+ * Serve one partition over `stream`. Resolves once the partition's outcome
+ * has been sent; the coordinator ends the stream when the whole run is over.
+ */
+export function servePartition(stream: FrameStream): Promise<void> {
+  let runner: WorkflowRunner | null = null;
+  let cancelRequested = false;
+  let partition = -1;
+  let finished = false;
+  const remoteInboxes = new Map<string, RemoteInbox>();
+  let localInboxes: ReadonlyMap<string, NodeInbox> = new Map();
+  let markReady!: () => void;
+  const ready = new Promise<void>((resolve) => (markReady = resolve));
+  /** Tail of the delivery queue of each (node, handle). */
+  const queues = new Map<string, Promise<void>>();
+  /** Unsent acknowledgements by sender, node and handle. */
+  const acks = new Map<number, Map<string, number>>();
+  let ackFlushScheduled = false;
+  let settle!: () => void;
+  const served = new Promise<void>((resolve) => (settle = resolve));
+
+  const channel = new PartitionChannel(stream, (_route, payload) => {
+    const msg = PartitionChannel.decode(payload);
+    switch (msg.type) {
+      case "start":
+        void start(msg);
+        break;
+      case "put":
+      case "signal":
+      case "eos":
+        enqueue(msg);
+        break;
+      case "ack":
+        remoteInboxes.get(msg.node)?.ack(msg.handle, msg.count);
+        break;
+      case "cancel":
+        cancelRequested = true;
+        runner?.cancel();
+        break;
+    }
+  });
+
+  function enqueue(msg: InboundMessage): void {
+    if (finished) {
+      // Nothing reads this partition's inboxes any more; keep the sender's
+      // window moving.
+      if (msg.type === "put") ack(msg.from, msg.node, msg.handle);
+      return;
+    }
+    const key = `${msg.node}\u0000${msg.handle}`;
+    const tail = (queues.get(key) ?? ready).then(() => deliver(msg));
+    queues.set(
+      key,
+      tail.catch((error) => {
+        // Stryker disable next-line StringLiteral,ObjectLiteral: diagnostic log args only
+        log.warn("Cross-partition delivery failed", {
+          node: msg.node,
+          handle: msg.handle,
+          error: error instanceof Error ? error.message : String(error)
+        });
+      })
+    );
+  }
+
+  async function deliver(msg: InboundMessage): Promise<void> {
+    const inbox = localInboxes.get(msg.node);
+    if (msg.type === "put") {
+      await inbox?.put(msg.handle, msg.data, {
+        metadata: msg.metadata,
+        correlation_lineage: msg.lineage,
+        source_edge_id: msg.edge
+      });
+      ack(msg.from, msg.node, msg.handle);
+    } else if (msg.type === "eos") {
+      inbox?.markSourceDone(msg.handle);
+    } else if (msg.signal.type === "lineage_done") {
+      inbox?.signalLineageDone(msg.handle, msg.signal, msg.scope);
+    } else {
+      inbox?.signalLineageScopeClosed(msg.handle, msg.signal, msg.scope);
+    }
+  }
+
+  function ack(from: number, node: string, handle: string): void {
+    const perSender = acks.get(from) ?? new Map<string, number>();
+    const key = `${node}\u0000${handle}`;
+    perSender.set(key, (perSender.get(key) ?? 0) + 1);
+    acks.set(from, perSender);
+    if (ackFlushScheduled) return;
+    ackFlushScheduled = true;
+    setImmediate(() => {
+      ackFlushScheduled = false;
+      for (const [to, counts] of acks) {
+        for (const [key, count] of counts) {
+          const [ackNode, ackHandle] = key.split("\u0000");
+          channel.send(to, {
+            type: "ack",
+            node: ackNode,
+            handle: ackHandle,
+            count
+          });
+        }
+      }
+      acks.clear();
+    });
+  }
+
+  async function start(msg: StartMessage): Promise<void> {
+    partition = msg.partition;
+    for (const [nodeId, owner] of Object.entries(msg.remote_owners)) {
+      remoteInboxes.set(
+        nodeId,
+        new RemoteInbox(nodeId, owner, partition, channel)
+      );
+    }
+    try {
+      const mod = (await import(
+        msg.executor_module
+      )) as PartitionExecutorModule;
+      const contextOptions = {
+        jobId: msg.job_id,
+        workflowId: msg.workflow_id ?? null,
+        onMessage: (message: ProcessingMessage) =>
+          channel.send(COORDINATOR, { type: "message", message })
+      };
+      runner = new WorkflowRunner(msg.job_id, {
+        resolveExecutor: (node) => mod.resolveExecutor(node),
+        validateNode: mod.validateNode,
+        executionContext: mod.createExecutionContext
+          ? mod.createExecutionContext(contextOptions)
+          : new ProcessingContext({
+              ...contextOptions,
+              retainMessageQueue: false
+            }),
+        partition: {
+          remoteInboxes,
+          onInboxesReady: (inboxes) => {
+            localInboxes = inboxes;
+            markReady();
+          }
+        }
+      });
+      if (cancelRequested) runner.cancel();
+      const result = await runner.run(
+        {
+          job_id: msg.job_id,
+          workflow_id: msg.workflow_id,
+          params: msg.params
+        },
+        msg.graph
+      );
+      finish({
+        status: result.status,
+        error: result.error,
+        outputs: result.outputs
+      });
+    } catch (error) {
+      finish({
+        status: "failed",
+        error: error instanceof Error ? error.message : String(error),
+        outputs: {}
+      });
+    }
+  }
+
+  function finish(outcome: PartitionOutcome): void {
+    finished = true;
+    channel.send(COORDINATOR, { type: "done", partition, ...outcome });
+    settle();
+  }
+
+  return served;
+}
+
+function isEntryPoint(): boolean {
+  const url = getNodeBuiltinSync<typeof import("node:url")>("node:url");
+  const entry = process.argv[1];
+  return !!url && !!entry && url.pathToFileURL(entry).href === import.meta.url;
+}
+
+if (isEntryPoint()) {
+  const net = getNodeBuiltinSync<typeof import("node:net")>("node:net")!;
+  const socket = new net.Socket({ fd: 3, readable: true, writable: true });
+  // The coordinator ends the pipe once every partition is done (or it gave
+  // up on the run); nothing here outlives it.
+  socket.on("end", () => process.exit(0));
+  socket.on("error", () => process.exit(1));
+  void servePartition(socket);
+}
@@ -0,0 +1,267 @@
+/**
+ * Wire protocol between the processes of a partitioned run.
+ *
+ * Every process talks only to the coordinator, over one pipe, in the Python
+ * bridge's length-prefixed msgpack framing (`writeFrame` / `FrameDecoder`).
+ * A frame's payload is one routing byte — the destination partition, or
+ * {@link COORDINATOR} — followed by the msgpack-packed message. The
+ * coordinator forwards partition-to-partition frames as they are, reading
+ * only that byte, so payloads are packed and unpacked once.
+ *
+ * A cross-partition edge is a {@link RemoteInbox} on the sending side: the
+ * runner delivers to it as to any inbox, and it forwards values, lineage
+ * signals and end-of-stream to the owning partition, where they are applied
+ * to the real inbox in the order sent. Values travel with their metadata,
+ * correlation lineage and source edge id. Each (node, handle) stream has a
+ * window of {@link CROSS_PARTITION_WINDOW} unacknowledged values: the
+ * receiver acknowledges a value once its inbox has admitted it, so a full inbox
+ * on one side blocks the producer on the other exactly as it would
+ * in-process, without stalling other streams on the same pipe.
+ */
+
+import { pack, unpack } from "msgpackr";
+import { FrameDecoder, writeFrame } from "@nodetool-ai/runtime";
+import {
+  EMPTY_LINEAGE,
+  type CorrelationLineage,
+  type GraphData,
+  type LineageControlSignal,
+  type LineageDone,
+  type LineageScopeClosed,
+  type ProcessingMessage
+} from "@nodetool-ai/protocol";
+import { NodeInbox, type InboxEntry, type PutOptions } from "./inbox.js";
+
+/** Routing byte of frames addressed to the coordinator. */
+export const COORDINATOR = 0xff;
+
+/** Unacknowledged values allowed per cross-partition (node, handle) stream. */
+export const CROSS_PARTITION_WINDOW = 256;
+
+/** Terminal state of one partition, as reported in its `done` message. */
+export interface PartitionOutcome {
+  status: "completed" | "failed" | "cancelled" | "suspended";
+  error?: string;
+  outputs: Record<string, unknown[]>;
+}
+
+export type PartitionMessage =
+  | {
+      type: "start";
+      partition: number;
+      job_id: string;
+      workflow_id?: string;
+      params: Record<string, unknown>;
+      graph: GraphData;
+      remote_owners: Record<string, number>;
+      executor_module: string;
+    }
+  | {
+      type: "put";
+      from: number;
+      node: string;
+      handle: string;
+      data: unknown;
+      metadata: Record<string, unknown>;
+      lineage: CorrelationLineage;
+      edge: string;
+    }
+  | {
+      type: "signal";
+      node: string;
+      handle: string;
+      signal: LineageControlSignal;
+      scope: string[];
+    }
+  | { type: "eos"; node: string; handle: string }
+  | { type: "ack"; node: string; handle: string; count: number }
+  | { type: "cancel" }
+  | { type: "message"; message: ProcessingMessage }
+  | ({ type: "done"; partition: number } & PartitionOutcome);
+
+/** Traffic over one {@link PartitionChannel}. */
+export interface ChannelStats {
+  framesIn: number;
+  framesOut: number;
+  bytesIn: number;
+  bytesOut: number;
+}
+
+/** The parts of a pipe a {@link PartitionChannel} uses. */
+export interface FrameStream {
+  write(chunk: Buffer): boolean;
+  cork?(): void;
+  uncork?(): void;
+  on(event: "data", listener: (chunk: Buffer) => void): unknown;
+}
+
+/** Framed, routed messages over one pipe. */
+export class PartitionChannel {
+  readonly stats: ChannelStats = {
+    framesIn: 0,
+    framesOut: 0,
+    bytesIn: 0,
+    bytesOut: 0
+  };
+  private readonly _stream: FrameStream;
+  private readonly _decoder = new FrameDecoder();
+
+  /**
+   * `onFrame` receives each frame's routing byte and its raw payload, still
+   * including that byte; {@link decode} unpacks the message.
+   */
+  constructor(
+    stream: FrameStream,
+    onFrame: (route: number, payload: Buffer) => void
+  ) {
+    this._stream = stream;
+    stream.on("data", (chunk: Buffer) => {
+      this._decoder.push(chunk, (payload) => {
+        this.stats.framesIn++;
+        this.stats.bytesIn += payload.length + 4;
+        onFrame(payload[0], payload);
+      });
+    });
+  }
+
+  static decode(payload: Buffer): PartitionMessage {
+    return unpack(payload.subarray(1)) as PartitionMessage;
+  }
+
+  /** Pack `message` and send it towards `route`. */
+  send(route: number, message: PartitionMessage): void {
+    const body = pack(message);
+    const payload = Buffer.allocUnsafe(body.length + 1);
+    payload[0] = route;
+    payload.set(body, 1);
+    this.forward(payload);
+  }
+
+  /** Send an already-routed payload unchanged. */
+  forward(payload: Buffer): boolean {
+    this.stats.framesOut++;
+    this.stats.bytesOut += payload.length + 4;
+    return writeFrame(this._stream, payload);
+  }
+}
+
+/**
+ * Stand-in inbox for a node owned by another partition. Deliveries are
+ * forwarded to `partition` over `channel` instead of buffered; nothing is
+ * ever read from it locally.
+ */
+export class RemoteInbox extends NodeInbox {
+  private readonly _nodeId: string;
+  private readonly _partition: number;
+  private readonly _from: number;
+  private readonly _channel: PartitionChannel;
+  private readonly _window: number;
+  private _inFlight = new Map<string, number>();
+  private _creditWaiters = new Map<string, Array<() => void>>();
+
+  constructor(
+    nodeId: string,
+    partition: number,
+    from: number,
+    channel: PartitionChannel,
+    window: number = CROSS_PARTITION_WINDOW
+  ) {
+    super();
+    this._nodeId = nodeId;
+    this._partition = partition;
+    this._from = from;
+    this._channel = channel;
+    this._window = window;
+  }
+
+  override async put(
+    handle: string,
+    item: unknown,
+    opts: PutOptions = {}
+  ): Promise<void> {
+    while (!this.isClosed() && this._unacked(handle) >= this._window) {
+      await new Promise<void>((resolve) => {
+        const waiters = this._creditWaiters.get(handle) ?? [];
+        waiters.push(resolve);
+        this._creditWaiters.set(handle, waiters);
+      });
+    }
+    if (this.isClosed()) return;
+    this._inFlight.set(handle, this._unacked(handle) + 1);
+    this._channel.send(this._partition, {
+      type: "put",
+      from: this._from,
+      node: this._nodeId,
+      handle,
+      data: item,
+      metadata: opts.metadata ?? {},
+      lineage: opts.correlation_lineage ?? EMPTY_LINEAGE,
+      edge: opts.source_edge_id ?? ""
+    });
+  }
+
+  override async putMany(entries: Iterable<InboxEntry>): Promise<void> {
+    for (const entry of entries) {
+      await this.put(entry.handle, entry.data, entry);
+    }
+  }
+
+  override markSourceDone(handle: string): void {
+    this._channel.send(this._partition, {
+      type: "eos",
+      node: this._nodeId,
+      handle
+    });
+    super.markSourceDone(handle);
+  }
+
+  override signalLineageDone(
+    handle: string,
+    signal: LineageDone,
+    scope: readonly string[]
+  ): void {
+    this._channel.send(this._partition, {
+      type: "signal",
+      node: this._nodeId,
+      handle,
+      signal,
+      scope: [...scope]
+    });
+  }
+
+  override signalLineageScopeClosed(
+    handle: string,
+    signal: LineageScopeClosed,
+    parentScope: readonly string[]
+  ): void {
+    this._channel.send(this._partition, {
+      type: "signal",
+      node: this._nodeId,
+      handle,
+      signal,
+      scope: [...parentScope]
+    });
+  }
+
+  override async closeAll(): Promise<void> {
+    await super.closeAll();
+    for (const handle of [...this._creditWaiters.keys()]) this._wake(handle);
+  }
+
+  /** The owning partition's inbox admitted `count` values sent on `handle`. */
+  ack(handle: string, count: number): void {
+    this._inFlight.set(handle, Math.max(0, this._unacked(handle) - count));
+    this._wake(handle);
+  }
+
+  private _unacked(handle: string): number {
+    return this._inFlight.get(handle) ?? 0;
+  }
+
+  private _wake(handle: string): void {
+    const waiters = this._creditWaiters.get(handle);
+    if (!waiters) return;
+    this._creditWaiters.delete(handle);
+    for (const wake of waiters) wake();
+  }
+}
@@ -0,0 +1,322 @@
+/**
+ * Multi-process workflow execution.
+ *
+ * A single `WorkflowRunner` runs every actor on one event loop, so CPU-bound
+ * JS nodes in independent branches take turns instead of running in
+ * parallel. `PartitionedRunner` splits the graph with
+ * {@link partitionGraph} and runs each partition in its own child process
+ * (`partition-host`), each with an ordinary runner over its share of the
+ * graph. Edges cut by the split are carried over framed msgpack pipes (see
+ * `partition-wire`) with their metadata, correlation lineage, lineage
+ * signals and end-of-stream intact, so the nodes of a partition see exactly
+ * the inputs they would in a single process.
+ *
+ * This process only coordinates: it spawns the partitions, relays frames
+ * between them without decoding them, forwards their processing messages
+ * and merges their outcomes into one {@link RunResult}. The first partition
+ * to fail, crash or suspend fails the run and cancels the rest — a
+ * suspended partition cannot be resumed independently of the others, so
+ * suspension is not supported here.
+ *
+ * Nodes in a child process are resolved by the executor module each child
+ * imports (see `PartitionExecutorModule`), not by a callback: functions do
+ * not cross process boundaries.
+ */
+
+import { createLogger, getNodeBuiltinSync } from "@nodetool-ai/config";
+import type {
+  HydratedGraphData,
+  ProcessingMessage
+} from "@nodetool-ai/protocol";
+import type { ChildProcess } from "node:child_process";
+import {
+  partitionGraph,
+  type PartitionOptions,
+  type PartitionPlan
+} from "./graph-partition.js";
+import { pruneGraphToTargets, rewriteBypassedNodes } from "./graph-utils.js";
+import {
+  COORDINATOR,
+  PartitionChannel,
+  type ChannelStats,
+  type FrameStream,
+  type PartitionOutcome
+} from "./partition-wire.js";
+import type { RunJobRequest, RunResult } from "./runner.js";
+
+// Stryker disable next-line StringLiteral: logger name is a diagnostic label, not a behavioural contract
+const log = createLogger("nodetool.kernel.partitioned-runner");
+
+export interface PartitionedRunnerOptions extends PartitionOptions {
+  /**
+   * Module every partition imports to resolve its nodes: a path or a
+   * `file:` URL. See `PartitionExecutorModule`.
+   */
+  executorModule: string;
+  /** Node flags for the child processes. Default: this process's. */
+  execArgv?: string[];
+  /** Child entry point. Default: the `partition-host` module next to this one. */
+  hostModule?: string;
+  /** Every processing message of the run, as it happens. */
+  onMessage?: (msg: ProcessingMessage) => void;
+}
+
+/** One partition's share of a run. */
+export interface PartitionStats {
+  index: number;
+  /** Nodes the partition ran. */
+  nodes: number;
+  status: PartitionOutcome["status"];
+  /** Frames and bytes this process received from and sent to the partition. */
+  traffic: ChannelStats;
+}
+
+export interface PartitionedRunResult extends RunResult {
+  partitions: PartitionStats[];
+  /** Edges carried between processes. */
+  crossEdges: number;
+}
+
+interface Child {
+  index: number;
+  nodes: number;
+  process: ChildProcess;
+  channel: PartitionChannel;
+  outcome?: PartitionOutcome;
+}
+
+export class PartitionedRunner {
+  readonly jobId: string;
+  private readonly _options: PartitionedRunnerOptions;
+  private _children = new Map<number, Child>();
+  private _cancelled = false;
+  private _running = false;
+
+  constructor(jobId: string, options: PartitionedRunnerOptions) {
+    this.jobId = jobId;
+    this._options = options;
+  }
+
+  /** Cancel every partition of the current run. */
+  cancel(): void {
+    this._cancelled = true;
+    this._cancelAll();
+  }
+
+  async run(
+    request: RunJobRequest,
+    graphData: HydratedGraphData
+  ): Promise<PartitionedRunResult> {
+    if (this._running) {
+      throw new Error(
+        `PartitionedRunner "${this.jobId}" is already running; ` +
+          "create a new runner instance per job"
+      );
+    }
+    this._running = true;
+    const jobId = request.job_id ?? this.jobId;
+    const messages: ProcessingMessage[] = [];
+    const emit = (msg: ProcessingMessage) => {
+      messages.push(msg);
+      this._options.onMessage?.(msg);
+    };
+    const finish = (
+      status: RunResult["status"],
+      extra: Partial<PartitionedRunResult> = {}
+    ): PartitionedRunResult => {
+      emit({
+        type: "job_update",
+        status,
+        job_id: jobId,
+        workflow_id: request.workflow_id ?? null,
+        error: extra.error
+      });
+      return {
+        outputs: {},
+        messages,
+        status,
+        partitions: [],
+        crossEdges: 0,
+        ...extra
+      };
+    };
+
+    emit({
+      type: "job_update",
+      status: "running",
+      job_id: jobId,
+      workflow_id: request.workflow_id ?? null
+    });
+
+    let plan: PartitionPlan<HydratedGraphData>;
+    try {
+      let data = rewriteBypassedNodes(graphData) as HydratedGraphData;
+      if (request.target_nodes?.length) {
+        data = pruneGraphToTargets(data, request.target_nodes);
+      }
+      plan = partitionGraph(data, this._options);
+    } catch (err) {
+      return finish("failed", {
+        error: err instanceof Error ? err.message : String(err)
+      });
+    }
+    if (this._cancelled) return finish("cancelled");
+
+    // Stryker disable next-line StringLiteral,ObjectLiteral: diagnostic log args only
+    log.info("Partitioned run started", {
+      jobId,
+      partitions: plan.partitions.length,
+      crossEdges: plan.crossEdges.length
+    });
+
+    let firstFailure: string | undefined;
+    try {
+      const settled = plan.partitions.map(
+        (partition) =>
+          new Promise<void>((resolve) => {
+            const child = this._spawn(
+              partition.index,
+              partition.nodeIds.length,
+              (msg) => {
+                if (msg.type !== "job_update") emit(msg);
+              },
+              (outcome) => {
+                if (child.outcome) return;
+                child.outcome = outcome;
+                if (outcome.status !== "completed" && !firstFailure) {
+                  firstFailure =
+                    outcome.status === "suspended"
+                      ? `Partition ${partition.index} suspended; suspension ` +
+                        "is not supported in partitioned runs"
+                      : (outcome.error ??
+                        `Partition ${partition.index} ${outcome.status}`);
+                  this._cancelAll();
+                }
+                resolve();
+              }
+            );
+            child.channel.send(partition.index, {
+              type: "start",
+              partition: partition.index,
+              job_id: jobId,
+              workflow_id: request.workflow_id,
+              params: request.params ?? {},
+              graph: partition.graph,
+              remote_owners: partition.remoteOwners,
+              executor_module: toModuleUrl(this._options.executorModule)
+            });
+          })
+      );
+      if (this._cancelled) this._cancelAll();
+      await Promise.all(settled);
+
+      const outputs: Record<string, unknown[]> = {};
+      const partitions: PartitionStats[] = [];
+      for (const child of this._children.values()) {
+        Object.assign(outputs, child.outcome!.outputs);
+        partitions.push({
+          index: child.index,
+          nodes: child.nodes,
+          status: child.outcome!.status,
+          traffic: { ...child.channel.stats }
+        });
+      }
+      const extra = {
+        outputs,
+        partitions,
+        crossEdges: plan.crossEdges.length
+      };
+      if (this._cancelled) return finish("cancelled", extra);
+      if (firstFailure) {
+        // Stryker disable next-line StringLiteral,ObjectLiteral: diagnostic log args only
+        log.error("Partitioned run failed", { jobId, error: firstFailure });
+        return finish("failed", { ...extra, error: firstFailure });
+      }
+      return finish("completed", extra);
+    } finally {
+      for (const child of this._children.values()) {
+        child.process.stdio[3]?.end();
+        if (child.process.exitCode === null) child.process.kill();
+      }
+      this._children.clear();
+      this._running = false;
+    }
+  }
+
+  private _spawn(
+    index: number,
+    nodes: number,
+    onMessage: (msg: ProcessingMessage) => void,
+    onDone: (outcome: PartitionOutcome) => void
+  ): Child {
+    const cp = getNodeBuiltinSync<typeof import("node:child_process")>(
+      "node:child_process"
+    );
+    if (!cp) {
+      throw new Error("child_process is not available in this runtime");
+    }
+    const proc = cp.spawn(
+      process.execPath,
+      [
+        ...(this._options.execArgv ?? process.execArgv),
+        toModulePath(this._options.hostModule ?? defaultHostModule())
+      ],
+      { stdio: ["ignore", "inherit", "inherit", "pipe"] }
+    );
+    const pipe = proc.stdio[3] as unknown as FrameStream;
+    const channel = new PartitionChannel(pipe, (route, payload) => {
+      if (route !== COORDINATOR) {
+        // Partition to partition: relay untouched.
+        this._children.get(route)?.channel.forward(payload);
+        return;
+      }
+      const msg = PartitionChannel.decode(payload);
+      if (msg.type === "message") onMessage(msg.message);
+      else if (msg.type === "done") onDone(msg);
+    });
+    proc.stdio[3]?.on("error", () => {
+      // Reported through the exit below.
+    });
+    proc.on("exit", (code, signal) => {
+      onDone({
+        status: "failed",
+        error: `Partition ${index} exited unexpectedly (${signal ?? `code ${code}`})`,
+        outputs: {}
+      });
+    });
+    proc.on("error", (err) => {
+      onDone({
+        status: "failed",
+        error: `Partition ${index} could not start: ${err.message}`,
+        outputs: {}
+      });
+    });
+    const child: Child = { index, nodes, process: proc, channel };
+    this._children.set(index, child);
+    return child;
+  }
+
+  private _cancelAll(): void {
+    for (const child of this._children.values()) {
+      if (!child.outcome) child.channel.send(child.index, { type: "cancel" });
+    }
+  }
+}
+
+function defaultHostModule(): string {
+  const ext = import.meta.url.endsWith(".ts") ? ".ts" : ".js";
+  return new URL(`./partition-host${ext}`, import.meta.url).href;
+}
+
+function toModuleUrl(specifier: string): string {
+  if (specifier.startsWith("file:")) return specifier;
+  const url = getNodeBuiltinSync<typeof import("node:url")>("node:url")!;
+  const path = getNodeBuiltinSync<typeof import("node:path")>("node:path")!;
+  return url.pathToFileURL(path.resolve(specifier)).href;
+}
+
+function toModulePath(specifier: string): string {
+  if (!specifier.startsWith("file:")) return specifier;
+  const url = getNodeBuiltinSync<typeof import("node:url")>("node:url")!;
+  return url.fileURLToPath(specifier);
+}
@@ -0,0 +1,53 @@
+/**
+ * Payload size estimation for edge values.
+ *
+ * Exact sizes would mean serialising every message; the run profiler and
+ * flow control only need an order of magnitude, per message, cheaply. Typed
+ * arrays and buffers count their byte length, strings their length, a
+ * spilled {@link PayloadRef} its blob size, and containers the sum of what
+ * they hold.
+ */
+
+import { PayloadRef } from "./payload-spill.js";
+
+/** Largest array walked element by element; longer ones are extrapolated. */
+const SAMPLE_ITEMS = 256;
+const MAX_DEPTH = 6;
+
+/**
+ * Estimated in-memory payload size of an edge value, in bytes. Cheap by
+ * construction: long arrays are sampled and deep structures cut off.
+ */
+export function estimatePayloadBytes(value: unknown, depth = 0): number {
+  if (value === null || value === undefined) return 0;
+  switch (typeof value) {
+    case "string":
+      return value.length;
+    case "number":
+    case "bigint":
+      return 8;
+    case "boolean":
+      return 4;
+    case "object":
+      break;
+    default:
+      return 0;
+  }
+  if (ArrayBuffer.isView(value)) return value.byteLength;
+  if (value instanceof ArrayBuffer) return value.byteLength;
+  if (value instanceof PayloadRef) return value.byteLength;
+  if (depth >= MAX_DEPTH) return 0;
+  if (Array.isArray(value)) {
+    const n = Math.min(value.length, SAMPLE_ITEMS);
+    let sum = 0;
+    for (let i = 0; i < n; i++) sum += estimatePayloadBytes(value[i], depth + 1);
+    return n === value.length ? sum : Math.round((sum / n) * value.length);
+  }
+  let sum = 0;
+  for (const key in value as Record<string, unknown>) {
+    sum +=
+      key.length +
+      estimatePayloadBytes((value as Record<string, unknown>)[key], depth + 1);
+  }
+  return sum;
+}
@@ -0,0 +1,361 @@
+/**
+ * Edge payload spilling – large byte payloads travel between actors as
+ * storage references instead of in-memory buffers.
+ *
+ * Without it, an image, audio or video buffer emitted on an edge sits in
+ * every downstream inbox until consumed, so a batch of 200 4K frames queued
+ * behind a slow consumer pins gigabytes of heap. With spilling on, the runner
+ * writes each `Uint8Array` at or above the threshold once to the run's temp
+ * storage (`ProcessingContext.storage`) and delivers a {@link PayloadRef} in
+ * its place — the buffer itself, or the `data` of a media ref, at any depth
+ * of plain objects and arrays.
+ *
+ * Every delivery gets its own `PayloadRef`, so the stored blob is reference
+ * counted per downstream edge. The consuming actor materialises the bytes
+ * just before handing inputs to the node; that read releases the delivery's
+ * lease, as does an inbox dropping the delivery unread (see
+ * {@link releasePayloadRefs}), and the blob is deleted once every lease has
+ * been released. Whatever
+ * is still stored when the run ends (undelivered, cancelled) is deleted then.
+ */
+
+import { createLogger } from "@nodetool-ai/config";
+import type { StorageAdapter } from "@nodetool-ai/runtime";
+
+// Stryker disable next-line StringLiteral: logger name is a diagnostic label, not a behavioural contract
+const log = createLogger("nodetool.kernel.payload-spill");
+
+/** Opt-in spilling settings for a {@link WorkflowRunner}. */
+export interface PayloadSpillOptions {
+  /** Byte size at which a buffer is spilled. Default 8 MiB. */
+  thresholdBytes?: number;
+  /**
+   * Where spilled payloads are written. Defaults to the execution context's
+   * temp storage; with neither, spilling is off for the run.
+   */
+  storage?: StorageAdapter;
+}
+
+/** Per-run spill counters, reported on `RunResult.payloadSpill`. */
+export interface PayloadSpillStats {
+  /** Buffers written to storage. */
+  spilled: number;
+  /** Total bytes written to storage. */
+  spilledBytes: number;
+  /** Deliveries whose bytes were read back by a consumer. */
+  materialized: number;
+  /** Stored blobs deleted, on last release or at run end. */
+  released: number;
+}
+
+const DEFAULT_THRESHOLD_BYTES = 8 * 1024 * 1024;
+
+/** Nesting depth searched for buffers; media refs sit at depth 1 or 2. */
+const MAX_DEPTH = 4;
+
+/** One stored buffer, shared by every delivery of it. */
+class SpilledBlob {
+  /** Deliveries that have not been materialised yet. */
+  leases = 0;
+  deleted = false;
+
+  constructor(
+    readonly uri: string,
+    readonly byteLength: number
+  ) {}
+}
+
+/**
+ * Stand-in for a spilled buffer inside an edge value. One per delivery: the
+ * first {@link PayloadRef.bytes} call reads the blob and releases this
+ * delivery's lease; later calls return the same bytes.
+ */
+export class PayloadRef {
+  private _bytes: Uint8Array | null = null;
+  private _pending: Promise<Uint8Array> | null = null;
+  private _released = false;
+
+  /** @internal */
+  constructor(
+    private readonly _spiller: PayloadSpiller,
+    private readonly _blob: SpilledBlob
+  ) {
+    _blob.leases++;
+  }
+
+  /** Storage URI of the spilled bytes. */
+  get payloadRef(): string {
+    return this._blob.uri;
+  }
+
+  get byteLength(): number {
+    return this._blob.byteLength;
+  }
+
+  bytes(): Promise<Uint8Array> {
+    if (this._bytes) return Promise.resolve(this._bytes);
+    if (this._released && !this._pending) {
+      return Promise.reject(
+        new Error(`Payload ${this._blob.uri} was released unread`)
+      );
+    }
+    this._released = true;
+    this._pending ??= this._spiller._read(this._blob).then((bytes) => {
+      this._bytes = bytes;
+      this._pending = null;
+      return bytes;
+    });
+    return this._pending;
+  }
+
+  /**
+   * Give up this delivery's lease without reading it, e.g. when the message
+   * carrying it is dropped. A no-op once read or released.
+   */
+  release(): void {
+    if (this._released) return;
+    this._released = true;
+    void this._spiller._release(this._blob);
+  }
+}
+
+const isPlainObject = (value: unknown): value is Record<string, unknown> => {
+  if (typeof value !== "object" || value === null) return false;
+  const proto = Object.getPrototypeOf(value);
+  return proto === Object.prototype || proto === null;
+};
+
+/**
+ * Release the lease of every {@link PayloadRef} in `value`, for a delivery
+ * that will never be materialised.
+ */
+export function releasePayloadRefs(value: unknown, depth = 0): void {
+  if (value instanceof PayloadRef) {
+    value.release();
+    return;
+  }
+  if (depth >= MAX_DEPTH) return;
+  if (Array.isArray(value)) {
+    for (const item of value) releasePayloadRefs(item, depth + 1);
+  } else if (isPlainObject(value)) {
+    for (const key of Object.keys(value)) {
+      releasePayloadRefs(value[key], depth + 1);
+    }
+  }
+}
+
+/**
+ * The spill state for one run: threshold, target storage, the blobs still
+ * stored and the counters.
+ */
+export class PayloadSpiller {
+  private readonly _threshold: number;
+  private _blobs = new Set<SpilledBlob>();
+  private _seq = 0;
+  private readonly _stats: PayloadSpillStats = {
+    spilled: 0,
+    spilledBytes: 0,
+    materialized: 0,
+    released: 0
+  };
+
+  constructor(
+    private readonly _storage: StorageAdapter,
+    private readonly _keyPrefix: string,
+    options: PayloadSpillOptions = {}
+  ) {
+    this._threshold = options.thresholdBytes ?? DEFAULT_THRESHOLD_BYTES;
+  }
+
+  /**
+   * The run's counters. The object is live: the runner hands it out on
+   * `RunResult` and the end-of-run sweep in {@link close} still updates it.
+   */
+  get stats(): Readonly<PayloadSpillStats> {
+    return this._stats;
+  }
+
+  /** Deliveries leased and not yet read or released, across all blobs. */
+  get outstandingLeases(): number {
+    let leases = 0;
+    for (const blob of this._blobs) leases += blob.leases;
+    return leases;
+  }
+
+  /**
+   * Write every oversized buffer in `value` to storage. Returns a template
+   * for {@link lease} — `value` itself when nothing was spilled, so a run
+   * of small values pays one walk and no copies.
+   */
+  async spill(value: unknown): Promise<unknown> {
+    return this._spillWalk(value, 0);
+  }
+
+  /**
+   * One delivery of a spilled template: containers are copied and every
+   * blob gets a fresh {@link PayloadRef} holding its own lease.
+   */
+  lease(template: unknown): unknown {
+    return this._leaseWalk(template, 0);
+  }
+
+  /**
+   * Replace every {@link PayloadRef} in `value` with its bytes. Values with
+   * no refs are returned as-is.
+   */
+  async materialize(value: unknown): Promise<unknown> {
+    if (this._stats.spilled === 0) return value;
+    return this._materializeWalk(value, 0);
+  }
+
+  /** {@link materialize} each value of a node's input record. */
+  async materializeInputs(
+    inputs: Record<string, unknown>
+  ): Promise<Record<string, unknown>> {
+    if (this._stats.spilled === 0) return inputs;
+    let out: Record<string, unknown> | null = null;
+    for (const key of Object.keys(inputs)) {
+      const next = await this._materializeWalk(inputs[key], 0);
+      if (next !== inputs[key]) {
+        out ??= { ...inputs };
+        out[key] = next;
+      }
+    }
+    return out ?? inputs;
+  }
+
+  /** Delete every blob still stored. Called once when the run ends. */
+  async close(): Promise<void> {
+    const blobs = [...this._blobs];
+    this._blobs.clear();
+    await Promise.all(blobs.map((blob) => this._delete(blob)));
+  }
+
+  /** @internal Read a blob for a {@link PayloadRef} and release its lease. */
+  async _read(blob: SpilledBlob): Promise<Uint8Array> {
+    const bytes = await this._storage.retrieve(blob.uri);
+    if (!bytes) {
+      throw new Error(`Spilled payload ${blob.uri} is no longer in storage`);
+    }
+    this._stats.materialized++;
+    await this._release(blob);
+    return bytes;
+  }
+
+  /** @internal Drop one lease on `blob`; the last one deletes it. */
+  async _release(blob: SpilledBlob): Promise<void> {
+    blob.leases--;
+    if (blob.leases <= 0) {
+      this._blobs.delete(blob);
+      await this._delete(blob);
+    }
+  }
+
+  private async _delete(blob: SpilledBlob): Promise<void> {
+    if (blob.deleted) return;
+    blob.deleted = true;
+    this._stats.released++;
+    try {
+      await this._storage.delete(blob.uri);
+    } catch (err) {
+      // Stryker disable next-line StringLiteral,ObjectLiteral: diagnostic log args only
+      log.warn("Failed to delete spilled payload", {
+        uri: blob.uri,
+        error: err instanceof Error ? err.message : String(err)
+      });
+    }
+  }
+
+  private async _spillWalk(value: unknown, depth: number): Promise<unknown> {
+    if (value instanceof Uint8Array) {
+      return value.byteLength >= this._threshold
+        ? this._write(value)
+        : value;
+    }
+    if (depth >= MAX_DEPTH) return value;
+    if (Array.isArray(value)) {
+      let out: unknown[] | null = null;
+      for (let i = 0; i < value.length; i++) {
+        const next = await this._spillWalk(value[i], depth + 1);
+        if (next !== value[i]) {
+          out ??= value.slice();
+          out[i] = next;
+        }
+      }
+      return out ?? value;
+    }
+    if (isPlainObject(value)) {
+      let out: Record<string, unknown> | null = null;
+      for (const key of Object.keys(value)) {
+        const next = await this._spillWalk(value[key], depth + 1);
+        if (next !== value[key]) {
+          out ??= { ...value };
+          out[key] = next;
+        }
+      }
+      return out ?? value;
+    }
+    return value;
+  }
+
+  private async _write(bytes: Uint8Array): Promise<SpilledBlob> {
+    const key = `${this._keyPrefix}/${this._seq++}.bin`;
+    const uri = await this._storage.store(
+      key,
+      bytes,
+      "application/octet-stream"
+    );
+    const blob = new SpilledBlob(uri, bytes.byteLength);
+    this._blobs.add(blob);
+    this._stats.spilled++;
+    this._stats.spilledBytes += bytes.byteLength;
+    return blob;
+  }
+
+  private _leaseWalk(value: unknown, depth: number): unknown {
+    if (value instanceof SpilledBlob) return new PayloadRef(this, value);
+    if (depth >= MAX_DEPTH) return value;
+    if (Array.isArray(value)) {
+      return value.map((item) => this._leaseWalk(item, depth + 1));
+    }
+    if (isPlainObject(value)) {
+      const out: Record<string, unknown> = {};
+      for (const key of Object.keys(value)) {
+        out[key] = this._leaseWalk(value[key], depth + 1);
+      }
+      return out;
+    }
+    return value;
+  }
+
+  private async _materializeWalk(
+    value: unknown,
+    depth: number
+  ): Promise<unknown> {
+    if (value instanceof PayloadRef) return value.bytes();
+    if (depth >= MAX_DEPTH) return value;
+    if (Array.isArray(value)) {
+      let out: unknown[] | null = null;
+      for (let i = 0; i < value.length; i++) {
+        const next = await this._materializeWalk(value[i], depth + 1);
+        if (next !== value[i]) {
+          out ??= value.slice();
+          out[i] = next;
+        }
+      }
+      return out ?? value;
+    }
+    if (isPlainObject(value)) {
+      let out: Record<string, unknown> | null = null;
+      for (const key of Object.keys(value)) {
+        const next = await this._materializeWalk(value[key], depth + 1);
+        if (next !== value[key]) {
+          out ??= { ...value };
+          out[key] = next;
+        }
+      }
+      return out ?? value;
+    }
+    return value;
+  }
+}
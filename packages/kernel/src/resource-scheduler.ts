@@ -0,0 +1,330 @@
+/**
+ * Resource-class scheduling – bounded pools for the work nodes actually
+ * contend on, with critical-path priority.
+ *
+ * Without it, every actor whose inputs are ready runs at once: a wide graph
+ * fires 30 provider calls and 10 ffmpeg processes together while the node on
+ * the critical path waits behind them. A {@link ResourceScheduler} holds one
+ * {@link ResourcePool} per resource class (`cpu`, `ffmpeg`, `python`,
+ * `provider:openai`, …), each with a capacity. A node invocation acquires a
+ * slot in its class's pool before it runs and releases it when the node
+ * returns (a streaming node also while it waits on input or delivery, see
+ * {@link ResourceHold}); classes with no configured pool run unthrottled,
+ * as before.
+ *
+ * Waiting invocations are granted slots highest priority first. The runner
+ * uses the node's remaining critical-path length — the number of nodes on the
+ * longest data path from it to a sink — so the work that gates the most
+ * downstream nodes goes first. Ties are granted in arrival order.
+ *
+ * One scheduler is meant to be shared by every runner in the process, which
+ * is what makes a limit server-wide rather than per run.
+ */
+
+import type { NodeDescriptor } from "@nodetool-ai/protocol";
+import { isDataEdge } from "@nodetool-ai/protocol";
+import type { Graph } from "./graph.js";
+import { isObjectValue, isNonEmptyString } from "./predicates.js";
+
+/** Per-pool counters. */
+export interface ResourcePoolStats {
+  name: string;
+  capacity: number;
+  /** Slots currently held. */
+  active: number;
+  /** Invocations waiting for a slot. */
+  waiting: number;
+  /** Slots granted since the pool was created. */
+  acquired: number;
+  /** Grants that had to wait for a slot. */
+  queued: number;
+  /** Total time granted invocations spent waiting, in ms. */
+  waitMs: number;
+}
+
+/** Releases a held slot. Idempotent. */
+export type ResourceRelease = () => void;
+
+interface Waiter {
+  priority: number;
+  seq: number;
+  enqueuedAt: number;
+  grant: (release: ResourceRelease) => void;
+  reject: (err: unknown) => void;
+}
+
+/** A counting semaphore whose waiters are served by priority. */
+export class ResourcePool {
+  private _active = 0;
+  private _waiters: Waiter[] = [];
+  private _seq = 0;
+  private _acquired = 0;
+  private _queued = 0;
+  private _waitMs = 0;
+
+  constructor(
+    readonly name: string,
+    private _capacity: number
+  ) {
+    if (!(_capacity >= 1)) {
+      throw new Error(
+        `Resource pool "${name}" needs a capacity of at least 1, got ${_capacity}`
+      );
+    }
+  }
+
+  get capacity(): number {
+    return this._capacity;
+  }
+
+  /**
+   * Change the capacity. Raising it grants waiting invocations immediately;
+   * lowering it takes effect as held slots are released.
+   */
+  setCapacity(capacity: number): void {
+    if (!(capacity >= 1)) {
+      throw new Error(
+        `Resource pool "${this.name}" needs a capacity of at least 1, got ${capacity}`
+      );
+    }
+    this._capacity = capacity;
+    this._dispatch();
+  }
+
+  get stats(): ResourcePoolStats {
+    return {
+      name: this.name,
+      capacity: this._capacity,
+      active: this._active,
+      waiting: this._waiters.length,
+      acquired: this._acquired,
+      queued: this._queued,
+      waitMs: this._waitMs
+    };
+  }
+
+  /**
+   * Wait for a slot. Higher `priority` is served first. Rejects with the
+   * signal's reason if `signal` aborts before a slot is granted.
+   */
+  acquire(priority = 0, signal?: AbortSignal): Promise<ResourceRelease> {
+    if (signal?.aborted) return Promise.reject(abortReason(signal));
+    if (this._active < this._capacity && this._waiters.length === 0) {
+      this._active++;
+      this._acquired++;
+      return Promise.resolve(this._releaser());
+    }
+    return new Promise<ResourceRelease>((resolve, reject) => {
+      const onAbort = () => {
+        const index = this._waiters.indexOf(waiter);
+        if (index !== -1) this._waiters.splice(index, 1);
+        reject(abortReason(signal!));
+      };
+      const waiter: Waiter = {
+        priority,
+        seq: this._seq++,
+        enqueuedAt: Date.now(),
+        grant: (release) => {
+          signal?.removeEventListener("abort", onAbort);
+          resolve(release);
+        },
+        reject
+      };
+      this._insert(waiter);
+      signal?.addEventListener("abort", onAbort, { once: true });
+    });
+  }
+
+  /** Acquire a slot, run `fn`, and release the slot however `fn` ends. */
+  async run<T>(
+    fn: () => Promise<T>,
+    priority = 0,
+    signal?: AbortSignal
+  ): Promise<T> {
+    const release = await this.acquire(priority, signal);
+    try {
+      return await fn();
+    } finally {
+      release();
+    }
+  }
+
+  /** Keep waiters sorted: priority descending, then arrival order. */
+  private _insert(waiter: Waiter): void {
+    let lo = 0;
+    let hi = this._waiters.length;
+    while (lo < hi) {
+      const mid = (lo + hi) >>> 1;
+      const other = this._waiters[mid];
+      if (
+        other.priority > waiter.priority ||
+        (other.priority === waiter.priority && other.seq < waiter.seq)
+      ) {
+        lo = mid + 1;
+      } else {
+        hi = mid;
+      }
+    }
+    this._waiters.splice(lo, 0, waiter);
+  }
+
+  private _releaser(): ResourceRelease {
+    let released = false;
+    return () => {
+      if (released) return;
+      released = true;
+      this._active--;
+      this._dispatch();
+    };
+  }
+
+  private _dispatch(): void {
+    while (this._active < this._capacity && this._waiters.length > 0) {
+      const waiter = this._waiters.shift()!;
+      this._active++;
+      this._acquired++;
+      this._queued++;
+      this._waitMs += Date.now() - waiter.enqueuedAt;
+      waiter.grant(this._releaser());
+    }
+  }
+}
+
+/**
+ * A slot held by a streaming invocation only while it computes. A streaming
+ * node also waits — on its inbox, on a downstream consumer's backpressure —
+ * and holding the slot through those waits deadlocks a chain of same-class
+ * nodes on a small pool: the producer blocks on the consumer while sitting
+ * on the slot the consumer needs. Waits run through {@link idle}, which
+ * gives the slot back and takes it again once no wait is pending.
+ */
+export class ResourceHold {
+  private _release: ResourceRelease | null = null;
+  private _pending: Promise<void> | null = null;
+  private _idle = 0;
+  private _done = false;
+
+  constructor(
+    private _pool: ResourcePool,
+    private _priority = 0,
+    private _signal?: AbortSignal
+  ) {}
+
+  /** Take the slot, run `fn`, and give the slot back for good. */
+  async run<T>(fn: () => Promise<T>): Promise<T> {
+    await this._take();
+    try {
+      return await fn();
+    } finally {
+      this._done = true;
+      this._giveBack();
+    }
+  }
+
+  /** Run `wait` without the slot. */
+  async idle<T>(wait: () => Promise<T>): Promise<T> {
+    if (this._done) return wait();
+    this._idle++;
+    this._giveBack();
+    try {
+      return await wait();
+    } finally {
+      if (--this._idle === 0 && !this._done) await this._take();
+    }
+  }
+
+  private _take(): Promise<void> {
+    if (this._release) return Promise.resolve();
+    this._pending ??= this._pool.acquire(this._priority, this._signal).then(
+      (release) => {
+        this._pending = null;
+        // Granted after a wait began or the run ended: not wanted now.
+        if (this._idle > 0 || this._done) release();
+        else this._release = release;
+      },
+      (err: unknown) => {
+        this._pending = null;
+        throw err;
+      }
+    );
+    return this._pending;
+  }
+
+  private _giveBack(): void {
+    this._release?.();
+    this._release = null;
+  }
+}
+
+function abortReason(signal: AbortSignal): unknown {
+  return signal.reason ?? new Error("Resource acquisition aborted");
+}
+
+/** Named resource pools, shared by every run that is given the scheduler. */
+export class ResourceScheduler {
+  private _pools = new Map<string, ResourcePool>();
+
+  /** `limits` maps a resource class to its pool capacity. */
+  constructor(limits: Record<string, number> = {}) {
+    for (const [name, capacity] of Object.entries(limits)) {
+      this.setLimit(name, capacity);
+    }
+  }
+
+  /** Create the pool for `resourceClass`, or change its capacity. */
+  setLimit(resourceClass: string, capacity: number): ResourcePool {
+    const pool = this._pools.get(resourceClass);
+    if (pool) {
+      pool.setCapacity(capacity);
+      return pool;
+    }
+    const created = new ResourcePool(resourceClass, capacity);
+    this._pools.set(resourceClass, created);
+    return created;
+  }
+
+  /** The pool for `resourceClass`, or undefined when it is unthrottled. */
+  pool(resourceClass: string | undefined): ResourcePool | undefined {
+    return resourceClass === undefined
+      ? undefined
+      : this._pools.get(resourceClass);
+  }
+
+  get stats(): ResourcePoolStats[] {
+    return [...this._pools.values()].map((pool) => pool.stats);
+  }
+}
+
+/**
+ * The resource class a node runs in: its declared `resource_class`, else
+ * `provider:<name>` when its `model` property names a provider, else none.
+ */
+export function resourceClassOf(node: NodeDescriptor): string | undefined {
+  if (isNonEmptyString(node.resource_class)) return node.resource_class;
+  const model = node.properties?.model;
+  if (isObjectValue(model) && isNonEmptyString(model.provider)) {
+    return `provider:${model.provider}`;
+  }
+  return undefined;
+}
+
+/**
+ * Remaining critical-path length per node: 1 for a sink, else one more than
+ * its longest-path data successor. Computed over `Graph.topologicalSort`, so
+ * nodes it leaves out (cycles, nested scopes) are absent and get priority 0.
+ */
+export function criticalPathLengths(graph: Graph): Map<string, number> {
+  const order = graph.topologicalSort().flat();
+  const lengths = new Map<string, number>();
+  for (let i = order.length - 1; i >= 0; i--) {
+    const id = order[i].id;
+    let longest = 0;
+    for (const edge of graph.findOutgoingEdges(id)) {
+      if (!isDataEdge(edge)) continue;
+      const next = lengths.get(edge.target) ?? 0;
+      if (next > longest) longest = next;
+    }
+    lengths.set(id, longest + 1);
+  }
+  return lengths;
+}
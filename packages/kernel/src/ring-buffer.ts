@@ -0,0 +1,86 @@
+/**
+ * RingBuffer – growable circular FIFO with O(1) push, shift and unshift.
+ *
+ * `Array#shift` and `Array#unshift` move every element, which makes a queue
+ * that sees 100k small items (tokens, rows, audio chunks) quadratic. The
+ * backing array doubles when full and never shrinks below its initial size.
+ */
+
+const INITIAL_CAPACITY = 16;
+
+export class RingBuffer<T> {
+  private _items: Array<T | undefined>;
+  private _head = 0;
+  private _length = 0;
+
+  constructor(initialCapacity: number = INITIAL_CAPACITY) {
+    this._items = new Array<T | undefined>(Math.max(1, initialCapacity));
+  }
+
+  get length(): number {
+    return this._length;
+  }
+
+  /** Append at the tail. */
+  push(item: T): void {
+    if (this._length === this._items.length) this._grow();
+    this._items[(this._head + this._length) % this._items.length] = item;
+    this._length++;
+  }
+
+  /** Insert at the head. */
+  unshift(item: T): void {
+    if (this._length === this._items.length) this._grow();
+    this._head = (this._head - 1 + this._items.length) % this._items.length;
+    this._items[this._head] = item;
+    this._length++;
+  }
+
+  /** Remove and return the head, or undefined when empty. */
+  shift(): T | undefined {
+    if (this._length === 0) return undefined;
+    const item = this._items[this._head];
+    // Drop the reference so a consumed payload can be collected.
+    this._items[this._head] = undefined;
+    this._head = (this._head + 1) % this._items.length;
+    this._length--;
+    return item;
+  }
+
+  /** The head without removing it, or undefined when empty. */
+  peek(): T | undefined {
+    return this._length === 0 ? undefined : this._items[this._head];
+  }
+
+  /** Remove and return up to `max` items from the head, oldest first. */
+  shiftMany(max: number): T[] {
+    const n = Math.min(max, this._length);
+    const out = new Array<T>(n);
+    for (let i = 0; i < n; i++) out[i] = this.shift()!;
+    return out;
+  }
+
+  /** Remove and return every item, oldest first. */
+  drain(): T[] {
+    return this.shiftMany(this._length);
+  }
+
+  /** Keep only the items matching `keep`, preserving order. */
+  retain(keep: (item: T) => boolean): void {
+    const kept: T[] = [];
+    while (this._length > 0) {
+      const item = this.shift()!;
+      if (keep(item)) kept.push(item);
+    }
+    for (const item of kept) this.push(item);
+  }
+
+  private _grow(): void {
+    const next = new Array<T | undefined>(this._items.length * 2);
+    for (let i = 0; i < this._length; i++) {
+      next[i] = this._items[(this._head + i) % this._items.length];
+    }
+    this._items = next;
+    this._head = 0;
+  }
+}
@@ -0,0 +1,384 @@
+/**
+ * Crash-resume checkpoints: what each node of a run has already produced.
+ *
+ * A run that dies with the process (a deploy, an OOM kill) used to start from
+ * scratch when its job was recovered, paying again for every LLM call and
+ * image generation it had already made. With checkpointing on, the runner
+ * hands each node's output records to a {@link RunCheckpointStore} as soon as
+ * the node completes. A resumed run of the same job loads them back: a node
+ * whose checkpoint still matches the graph spawns no actor, and its recorded
+ * outputs — lineage included — are replayed into the inboxes downstream, so
+ * only the incomplete frontier executes.
+ *
+ * A checkpoint is keyed by a fingerprint of the node and, recursively, of
+ * everything upstream of it (types, properties, wiring, input values). An
+ * edit anywhere upstream therefore invalidates the nodes below it. A node is
+ * only restored when every node feeding it is restored too; otherwise the
+ * re-run upstream would feed it a second time.
+ *
+ * Not checkpointed: input nodes (they are re-dispatched, which is free),
+ * nodes with control edges (agent / controlled-node exchanges are a dialogue,
+ * not a record) and variable nodes (they act through run-scoped channels).
+ * Nor is a node whose output outgrows `maxEmissions` records or `maxBytes`:
+ * its records are held in memory until it completes, so a long stream is
+ * dropped from checkpointing rather than buffered whole.
+ */
+
+import { createLogger } from "@nodetool-ai/config";
+import type { CorrelationLineage, NodeDescriptor } from "@nodetool-ai/protocol";
+import { isControlEdge } from "@nodetool-ai/protocol";
+import { contentHash } from "./content-hash.js";
+import type { Graph } from "./graph.js";
+import {
+  GET_VARIABLE_NODE_TYPE,
+  SET_VARIABLE_NODE_TYPE
+} from "./graph-utils.js";
+import { estimatePayloadBytes } from "./payload-size.js";
+import type { OutputRoutingHints } from "./runner.js";
+
+// Stryker disable next-line StringLiteral: logger name is a diagnostic label, not a behavioural contract
+const log = createLogger("nodetool.kernel.run-checkpoint");
+
+const DEFAULT_MAX_EMISSIONS = 1000;
+const DEFAULT_MAX_BYTES = 32 * 1024 * 1024;
+
+/** One output record a node sent, with the routing the actor gave it. */
+export interface CheckpointEmission {
+  outputs: Record<string, unknown>;
+  /** `OutputRoutingHints.invocationLineage`. */
+  lineage?: CorrelationLineage;
+  /** `OutputRoutingHints.perSlotLineage`. */
+  slotLineage?: Record<string, CorrelationLineage>;
+  /** `OutputRoutingHints.lineageDoneSlots`. */
+  dropped?: string[];
+  /** `OutputRoutingHints.skipInvocation`. */
+  skipped?: boolean;
+}
+
+/** Everything a completed node contributed to its run. */
+export interface NodeCheckpoint {
+  nodeId: string;
+  /** Fingerprint of the node and its upstream when it ran. */
+  fingerprint: string;
+  /** Every output record the node sent, in order. */
+  emissions: CheckpointEmission[];
+  /** The node's final result, as collected for output nodes. */
+  result: Record<string, unknown>;
+}
+
+/**
+ * Where checkpoints live. `save` is called once per completed node, while the
+ * run is still going; `load` once, when a resumed run starts.
+ */
+export interface RunCheckpointStore {
+  load(runId: string): Promise<NodeCheckpoint[]>;
+  save(runId: string, checkpoint: NodeCheckpoint): Promise<void>;
+}
+
+/**
+ * In-memory implementation of RunCheckpointStore.
+ * Survives a runner, not a process: for tests and single-process retries.
+ */
+export class MemoryRunCheckpointStore implements RunCheckpointStore {
+  private _runs = new Map<string, Map<string, NodeCheckpoint>>();
+
+  async load(runId: string): Promise<NodeCheckpoint[]> {
+    return [...(this._runs.get(runId)?.values() ?? [])];
+  }
+
+  async save(runId: string, checkpoint: NodeCheckpoint): Promise<void> {
+    let run = this._runs.get(runId);
+    if (!run) {
+      run = new Map();
+      this._runs.set(runId, run);
+    }
+    run.set(checkpoint.nodeId, checkpoint);
+  }
+}
+
+/** Opt-in checkpointing settings for a {@link WorkflowRunner}. */
+export interface RunCheckpointOptions {
+  store: RunCheckpointStore;
+  /**
+   * Restore what an earlier attempt at the same job completed. Default false:
+   * the run executes every node and only writes checkpoints.
+   */
+  resume?: boolean;
+  /** Most output records a checkpointed node may send. Default 1000. */
+  maxEmissions?: number;
+  /**
+   * Most output bytes, as `estimatePayloadBytes` counts them, a checkpointed
+   * node may send. Default 32 MiB.
+   */
+  maxBytes?: number;
+}
+
+/** Per-run checkpoint counters, reported on `RunResult.checkpoint`. */
+export interface RunCheckpointStats {
+  /** Nodes restored from an earlier attempt instead of executing. */
+  restored: number;
+  /** Completed nodes written to the store. */
+  saved: number;
+  /** Writes the store rejected; those nodes execute again on resume. */
+  failed: number;
+  /** Nodes whose output outgrew the limits; they execute again on resume. */
+  skipped: number;
+}
+
+/**
+ * Records and restores one run's checkpoints. Owned by the runner; `record`
+ * and `complete` are called from actor callbacks.
+ */
+export class RunCheckpointer {
+  private readonly _stats: RunCheckpointStats = {
+    restored: 0,
+    saved: 0,
+    failed: 0,
+    skipped: 0
+  };
+  private _fingerprints = new Map<string, string>();
+  private _eligible = new Set<string>();
+  private _pending = new Map<string, CheckpointEmission[]>();
+  private _pendingBytes = new Map<string, number>();
+  private _writes = new Set<Promise<void>>();
+
+  constructor(
+    private readonly _runId: string,
+    private readonly _options: RunCheckpointOptions
+  ) {}
+
+  get stats(): RunCheckpointStats {
+    return { ...this._stats };
+  }
+
+  /**
+   * Fingerprint the graph and, on a resumed run, return the checkpoints of
+   * the nodes that need not run again.
+   *
+   * `inputs` holds the external input nodes the runner dispatches itself and
+   * the value each receives; `runsHere` excludes nodes executed elsewhere.
+   */
+  async prepare(
+    graph: Graph,
+    inputs: ReadonlyMap<string, unknown>,
+    runsHere: (nodeId: string) => boolean
+  ): Promise<Map<string, NodeCheckpoint>> {
+    const restored = new Map<string, NodeCheckpoint>();
+    this._fingerprintGraph(graph, inputs);
+    for (const node of graph.nodes) {
+      if (
+        runsHere(node.id) &&
+        !inputs.has(node.id) &&
+        this._fingerprints.has(node.id) &&
+        isCheckpointable(graph, node)
+      ) {
+        this._eligible.add(node.id);
+      }
+    }
+    if (!this._options.resume) return restored;
+
+    let saved: NodeCheckpoint[];
+    try {
+      saved = await this._options.store.load(this._runId);
+    } catch (error) {
+      // Stryker disable next-line StringLiteral,ObjectLiteral: diagnostic log args only
+      log.warn("Checkpoint load failed; running every node", {
+        runId: this._runId,
+        error: error instanceof Error ? error.message : String(error)
+      });
+      return restored;
+    }
+    const candidates = new Map<string, NodeCheckpoint>();
+    for (const checkpoint of saved) {
+      if (
+        this._eligible.has(checkpoint.nodeId) &&
+        checkpoint.fingerprint === this._fingerprints.get(checkpoint.nodeId)
+      ) {
+        candidates.set(checkpoint.nodeId, checkpoint);
+      }
+    }
+    // A candidate stays only if everything feeding it is restored too, or is
+    // an input the runner dispatches again.
+    const resolved = new Map<string, boolean>();
+    const restorable = (nodeId: string): boolean => {
+      const known = resolved.get(nodeId);
+      if (known !== undefined) return known;
+      resolved.set(nodeId, false);
+      const ok =
+        candidates.has(nodeId) &&
+        graph
+          .findIncomingEdges(nodeId)
+          .every(
+            (edge) => inputs.has(edge.source) || restorable(edge.source)
+          );
+      resolved.set(nodeId, ok);
+      return ok;
+    };
+    for (const [nodeId, checkpoint] of candidates) {
+      if (restorable(nodeId)) restored.set(nodeId, checkpoint);
+    }
+    this._stats.restored = restored.size;
+    return restored;
+  }
+
+  /**
+   * Remember one output record of a node, if its node is checkpointed. A node
+   * that goes over the limits stops being checkpointed for this run.
+   */
+  record(
+    nodeId: string,
+    outputs: Record<string, unknown>,
+    hints: OutputRoutingHints
+  ): void {
+    if (!this._eligible.has(nodeId)) return;
+    let emissions = this._pending.get(nodeId);
+    if (!emissions) {
+      emissions = [];
+      this._pending.set(nodeId, emissions);
+    }
+    const {
+      maxEmissions = DEFAULT_MAX_EMISSIONS,
+      maxBytes = DEFAULT_MAX_BYTES
+    } = this._options;
+    const bytes =
+      (this._pendingBytes.get(nodeId) ?? 0) + estimatePayloadBytes(outputs);
+    if (emissions.length >= maxEmissions || bytes > maxBytes) {
+      this._eligible.delete(nodeId);
+      this._pending.delete(nodeId);
+      this._pendingBytes.delete(nodeId);
+      this._stats.skipped++;
+      // Stryker disable next-line StringLiteral,ObjectLiteral: diagnostic log args only
+      log.debug("Output too large to checkpoint", {
+        runId: this._runId,
+        nodeId,
+        emissions: emissions.length + 1,
+        bytes
+      });
+      return;
+    }
+    this._pendingBytes.set(nodeId, bytes);
+    const emission: CheckpointEmission = { outputs };
+    if (hints.invocationLineage) emission.lineage = hints.invocationLineage;
+    if (hints.perSlotLineage) emission.slotLineage = hints.perSlotLineage;
+    if (hints.lineageDoneSlots?.size) {
+      emission.dropped = [...hints.lineageDoneSlots];
+    }
+    if (hints.skipInvocation) emission.skipped = true;
+    emissions.push(emission);
+  }
+
+  /**
+   * Write a node's checkpoint, or drop what was recorded for it when it did
+   * not complete cleanly. The write runs in the background; `flush` awaits it.
+   */
+  complete(
+    nodeId: string,
+    result: Record<string, unknown>,
+    succeeded: boolean
+  ): void {
+    const emissions = this._pending.get(nodeId) ?? [];
+    this._pending.delete(nodeId);
+    this._pendingBytes.delete(nodeId);
+    if (!succeeded || !this._eligible.has(nodeId)) return;
+    const checkpoint: NodeCheckpoint = {
+      nodeId,
+      fingerprint: this._fingerprints.get(nodeId)!,
+      emissions,
+      result
+    };
+    const write = this._options.store.save(this._runId, checkpoint).then(
+      () => {
+        this._stats.saved++;
+      },
+      (error) => {
+        this._stats.failed++;
+        // Stryker disable next-line StringLiteral,ObjectLiteral: diagnostic log args only
+        log.warn("Checkpoint write failed", {
+          runId: this._runId,
+          nodeId,
+          error: error instanceof Error ? error.message : String(error)
+        });
+      }
+    );
+    this._writes.add(write);
+    void write.finally(() => this._writes.delete(write));
+  }
+
+  /** Wait for every checkpoint write issued so far. */
+  async flush(): Promise<void> {
+    while (this._writes.size > 0) {
+      await Promise.all(this._writes);
+    }
+  }
+
+  private _fingerprintGraph(
+    graph: Graph,
+    inputs: ReadonlyMap<string, unknown>
+  ): void {
+    const visiting = new Set<string>();
+    const visit = (node: NodeDescriptor): string | undefined => {
+      const known = this._fingerprints.get(node.id);
+      if (known !== undefined) return known;
+      // A cycle has no stable upstream; leave its nodes unfingerprinted.
+      if (visiting.has(node.id)) return undefined;
+      visiting.add(node.id);
+      const upstream: string[][] = [];
+      for (const edge of graph.findIncomingEdges(node.id)) {
+        const source = graph.findNode(edge.source);
+        const print = source ? visit(source) : undefined;
+        if (print === undefined) {
+          visiting.delete(node.id);
+          return undefined;
+        }
+        upstream.push([
+          edge.targetHandle,
+          edge.sourceHandle,
+          edge.edge_type ?? "data",
+          print
+        ]);
+      }
+      upstream.sort((a, b) =>
+        a.join("\u0000").localeCompare(b.join("\u0000"))
+      );
+      const print = contentHash({
+        type: node.type,
+        properties: node.properties ?? {},
+        dynamic_properties: node.dynamic_properties ?? {},
+        input: inputs.has(node.id) ? inputs.get(node.id) : undefined,
+        upstream
+      });
+      visiting.delete(node.id);
+      this._fingerprints.set(node.id, print);
+      return print;
+    };
+    for (const node of graph.nodes) visit(node);
+  }
+}
+
+/** Whether a node's completion can stand in for running it again. */
+function isCheckpointable(graph: Graph, node: NodeDescriptor): boolean {
+  if (
+    node.type === SET_VARIABLE_NODE_TYPE ||
+    node.type === GET_VARIABLE_NODE_TYPE
+  ) {
+    return false;
+  }
+  return (
+    !graph.findIncomingEdges(node.id).some(isControlEdge) &&
+    !graph.findOutgoingEdges(node.id).some(isControlEdge)
+  );
+}
+
+/** Routing hints to replay a recorded emission with. */
+export function emissionHints(
+  emission: CheckpointEmission
+): OutputRoutingHints {
+  const hints: OutputRoutingHints = {};
+  if (emission.lineage) hints.invocationLineage = emission.lineage;
+  if (emission.slotLineage) hints.perSlotLineage = emission.slotLineage;
+  if (emission.dropped?.length) {
+    hints.lineageDoneSlots = new Set(emission.dropped);
+  }
+  if (emission.skipped) hints.skipInvocation = true;
+  return hints;
+}
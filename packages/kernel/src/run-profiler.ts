@@ -0,0 +1,388 @@
+/**
+ * Run profiler – where a run's time went, node by node and edge by edge.
+ *
+ * A run's wall time hides very different bottlenecks: a node can sit with
+ * inputs queued in its {@link NodeInbox}, wait for a slot in its resource
+ * pool, run in JS, wait on the Python bridge, or be blocked upstream on a full
+ * downstream inbox (backpressure). The profiler separates those per node,
+ * tracks messages, bytes and inbox depth per edge, and exports the run as a
+ * Chrome Trace Event file that Perfetto (ui.perfetto.dev) and
+ * `chrome://tracing` open directly.
+ *
+ * A runner only creates one when `WorkflowRunnerOptions.profile` is set;
+ * every hook is behind `profiler?.`, so an unprofiled run pays one property
+ * read per invocation and per delivery batch.
+ *
+ * Byte counts are estimates (see {@link estimatePayloadBytes}).
+ */
+
+import type { Graph } from "./graph.js";
+import type { InboxEntry, MessageEnvelope, NodeInbox } from "./inbox.js";
+import { syntheticEdgeId } from "./edge-ids.js";
+import { estimatePayloadBytes } from "./payload-size.js";
+
+/** Opt-in profiling settings for a {@link WorkflowRunner}. */
+export interface RunProfilerOptions {
+  /**
+   * Most trace events kept. Totals keep counting past the limit; only the
+   * timeline is cut, and the overflow is reported as `droppedEvents`.
+   * Default 200,000.
+   */
+  maxEvents?: number;
+}
+
+/** Where one node's time went, in ms. */
+export interface NodeProfile {
+  nodeId: string;
+  nodeType: string;
+  invocations: number;
+  /** Time inputs sat in the inbox before the invocation that took them. */
+  queuedMs: number;
+  /** Time spent waiting for a resource-pool slot. */
+  resourceWaitMs: number;
+  /** Time inside the node, bridge time included. */
+  executingMs: number;
+  /** Part of `executingMs` spent waiting on the Python bridge. */
+  bridgeMs: number;
+  /** Part of `executingMs` spent encoding raw images for a boundary. */
+  encodeMs: number;
+  /** Time blocked delivering outputs into full downstream inboxes. */
+  backpressureMs: number;
+}
+
+/** Traffic over one edge. */
+export interface EdgeProfile {
+  edgeId: string;
+  source: string;
+  target: string;
+  targetHandle: string;
+  messages: number;
+  /** Estimated payload bytes delivered. */
+  bytes: number;
+  /** Deepest the target handle's buffer was seen after a delivery. */
+  maxDepth: number;
+  /** Time deliveries over this edge were blocked by backpressure, in ms. */
+  backpressureMs: number;
+}
+
+/** Per-run profile, reported on `RunResult.profile`. */
+export interface RunProfile {
+  jobId: string;
+  /** Epoch ms the run started. */
+  startedAt: number;
+  wallMs: number;
+  nodes: NodeProfile[];
+  edges: EdgeProfile[];
+  /** Timeline events not kept because of `maxEvents`. */
+  droppedEvents: number;
+}
+
+/** One event of the Chrome Trace Event format; times are in µs. */
+export interface ChromeTraceEvent {
+  name: string;
+  cat?: string;
+  ph: "X" | "b" | "e" | "C" | "M";
+  ts: number;
+  dur?: number;
+  pid: number;
+  tid: number;
+  id?: string;
+  args?: Record<string, unknown>;
+}
+
+/** A Chrome Trace Event file (JSON object form). */
+export interface ChromeTrace {
+  traceEvents: ChromeTraceEvent[];
+  displayTimeUnit: "ms";
+  otherData: { job_id: string; started_at: number; dropped_events: number };
+}
+
+const DEFAULT_MAX_EVENTS = 200_000;
+const PID = 1;
+/** Track for run-level events (inbox-depth counters). */
+const RUN_TID = 0;
+
+/**
+ * Collects one run's timings. The runner and actors feed it through the
+ * `record*` hooks; {@link summary} and {@link toChromeTrace} read it at any
+ * point, including mid-run.
+ */
+export class RunProfiler {
+  readonly jobId: string;
+  private readonly _maxEvents: number;
+  private readonly _originPerf = performance.now();
+  private readonly _originEpoch = Date.now();
+  private _endedPerf: number | undefined;
+  private _nodes = new Map<string, NodeProfile>();
+  private _tids = new Map<string, number>();
+  private _edges = new Map<string, EdgeProfile>();
+  private _events: ChromeTraceEvent[] = [];
+  private _dropped = 0;
+  private _nextQueueId = 0;
+  /** Envelopes already counted as queued, so a re-read input counts once. */
+  private _seen = new WeakSet<MessageEnvelope>();
+
+  constructor(jobId: string, options: RunProfilerOptions = {}) {
+    this.jobId = jobId;
+    this._maxEvents = options.maxEvents ?? DEFAULT_MAX_EVENTS;
+  }
+
+  /** Monotonic clock the hooks take their timestamps from, in ms. */
+  now(): number {
+    return performance.now();
+  }
+
+  /** Register the run's nodes and edges once its graph is prepared. */
+  registerGraph(graph: Graph): void {
+    for (const node of graph.nodes) this._node(node.id, node.type);
+    for (const edge of graph.edges) {
+      const edgeId =
+        edge.id ??
+        syntheticEdgeId(
+          edge.source,
+          edge.sourceHandle,
+          edge.target,
+          edge.targetHandle
+        );
+      this._edges.set(edgeId, {
+        edgeId,
+        source: edge.source,
+        target: edge.target,
+        targetHandle: edge.targetHandle,
+        messages: 0,
+        bytes: 0,
+        maxDepth: 0,
+        backpressureMs: 0
+      });
+    }
+  }
+
+  /** Stop the clock; `wallMs` is fixed from here on. */
+  end(): void {
+    this._endedPerf ??= performance.now();
+  }
+
+  /**
+   * An invocation of `nodeId` took `envelopes` (by input handle) from
+   * `inbox`. Each envelope's time in the inbox counts once, however many
+   * invocations read it.
+   */
+  recordDequeue(
+    nodeId: string,
+    inbox: NodeInbox,
+    envelopes: ReadonlyMap<string, MessageEnvelope>
+  ): void {
+    const node = this._node(nodeId);
+    const nowUs = this._epochUs(Date.now());
+    const tid = this._tid(nodeId);
+    for (const [handle, envelope] of envelopes) {
+      if (this._seen.has(envelope)) continue;
+      this._seen.add(envelope);
+      const start = Math.min(this._epochUs(envelope.timestamp), nowUs);
+      node.queuedMs += (nowUs - start) / 1000;
+      const id = String(this._nextQueueId++);
+      const name = `queued ${handle}`;
+      this._push({ name, cat: "queue", ph: "b", ts: start, pid: PID, tid, id });
+      this._push({ name, cat: "queue", ph: "e", ts: nowUs, pid: PID, tid, id });
+      this._depthCounter(nodeId, handle, inbox.depth(handle));
+    }
+  }
+
+  /**
+   * One invocation of `nodeId`: it asked for a resource slot at `requestedAt`,
+   * started at `startedAt` and finished at `endedAt` (all from {@link now}),
+   * `bridgeMs` of it on the Python bridge and `encodeMs` encoding images.
+   */
+  recordExecution(
+    nodeId: string,
+    requestedAt: number,
+    startedAt: number,
+    endedAt: number,
+    bridgeMs: number,
+    encodeMs = 0
+  ): void {
+    const node = this._node(nodeId);
+    const tid = this._tid(nodeId);
+    const waitMs = startedAt - requestedAt;
+    const execMs = endedAt - startedAt;
+    node.invocations++;
+    node.resourceWaitMs += waitMs;
+    node.executingMs += execMs;
+    node.bridgeMs += bridgeMs;
+    node.encodeMs += encodeMs;
+    if (waitMs > 0) {
+      this._push({
+        name: "resource wait",
+        cat: "resource",
+        ph: "X",
+        ts: this._perfUs(requestedAt),
+        dur: waitMs * 1000,
+        pid: PID,
+        tid
+      });
+    }
+    this._push({
+      name: node.nodeType,
+      cat: "execute",
+      ph: "X",
+      ts: this._perfUs(startedAt),
+      dur: execMs * 1000,
+      pid: PID,
+      tid,
+      args: {
+        bridge_ms: bridgeMs,
+        encode_ms: encodeMs,
+        js_ms: Math.max(0, execMs - bridgeMs)
+      }
+    });
+  }
+
+  /**
+   * `sourceNodeId` delivered `entries` into `inbox` between `startedAt` and
+   * `endedAt`; `blocked` when the inbox made it wait for space.
+   */
+  recordDelivery(
+    sourceNodeId: string,
+    inbox: NodeInbox,
+    entries: readonly InboxEntry[],
+    startedAt: number,
+    endedAt: number,
+    blocked: boolean
+  ): void {
+    const blockedMs = blocked ? endedAt - startedAt : 0;
+    const touched = new Set<EdgeProfile>();
+    for (const entry of entries) {
+      const edge = entry.source_edge_id
+        ? this._edges.get(entry.source_edge_id)
+        : undefined;
+      if (!edge) continue;
+      edge.messages++;
+      edge.bytes += estimatePayloadBytes(entry.data);
+      touched.add(edge);
+    }
+    for (const edge of touched) {
+      const depth = inbox.depth(edge.targetHandle);
+      if (depth > edge.maxDepth) edge.maxDepth = depth;
+      edge.backpressureMs += blockedMs;
+      this._depthCounter(edge.target, edge.targetHandle, depth);
+    }
+    if (!blocked) return;
+    this._node(sourceNodeId).backpressureMs += blockedMs;
+    this._push({
+      name: "backpressure",
+      cat: "backpressure",
+      ph: "X",
+      ts: this._perfUs(startedAt),
+      dur: blockedMs * 1000,
+      pid: PID,
+      tid: this._tid(sourceNodeId),
+      args: { edges: [...touched].map((e) => e.edgeId) }
+    });
+  }
+
+  summary(): RunProfile {
+    return {
+      jobId: this.jobId,
+      startedAt: this._originEpoch,
+      wallMs: (this._endedPerf ?? performance.now()) - this._originPerf,
+      nodes: [...this._nodes.values()].map((n) => ({ ...n })),
+      edges: [...this._edges.values()].map((e) => ({ ...e })),
+      droppedEvents: this._dropped
+    };
+  }
+
+  /** The run as a Chrome Trace Event file: one track per node. */
+  toChromeTrace(): ChromeTrace {
+    const metadata: ChromeTraceEvent[] = [
+      {
+        name: "process_name",
+        ph: "M",
+        ts: 0,
+        pid: PID,
+        tid: RUN_TID,
+        args: { name: `job ${this.jobId}` }
+      },
+      {
+        name: "thread_name",
+        ph: "M",
+        ts: 0,
+        pid: PID,
+        tid: RUN_TID,
+        args: { name: "run" }
+      }
+    ];
+    for (const [nodeId, tid] of this._tids) {
+      const node = this._nodes.get(nodeId)!;
+      metadata.push({
+        name: "thread_name",
+        ph: "M",
+        ts: 0,
+        pid: PID,
+        tid,
+        args: { name: `${node.nodeType} (${nodeId})` }
+      });
+    }
+    return {
+      traceEvents: [...metadata, ...this._events],
+      displayTimeUnit: "ms",
+      otherData: {
+        job_id: this.jobId,
+        started_at: this._originEpoch,
+        dropped_events: this._dropped
+      }
+    };
+  }
+
+  private _node(nodeId: string, nodeType?: string): NodeProfile {
+    let node = this._nodes.get(nodeId);
+    if (!node) {
+      node = {
+        nodeId,
+        nodeType: nodeType ?? nodeId,
+        invocations: 0,
+        queuedMs: 0,
+        resourceWaitMs: 0,
+        executingMs: 0,
+        bridgeMs: 0,
+        encodeMs: 0,
+        backpressureMs: 0
+      };
+      this._nodes.set(nodeId, node);
+    }
+    return node;
+  }
+
+  private _tid(nodeId: string): number {
+    let tid = this._tids.get(nodeId);
+    if (tid === undefined) {
+      tid = this._tids.size + 1;
+      this._tids.set(nodeId, tid);
+    }
+    return tid;
+  }
+
+  private _depthCounter(nodeId: string, handle: string, depth: number): void {
+    this._push({
+      name: `inbox ${nodeId}.${handle}`,
+      cat: "inbox",
+      ph: "C",
+      ts: this._perfUs(performance.now()),
+      pid: PID,
+      tid: RUN_TID,
+      args: { depth }
+    });
+  }
+
+  private _perfUs(perfMs: number): number {
+    return (perfMs - this._originPerf) * 1000;
+  }
+
+  private _epochUs(epochMs: number): number {
+    return (epochMs - this._originEpoch) * 1000;
+  }
+
+  private _push(event: ChromeTraceEvent): void {
+    if (this._events.length < this._maxEvents) this._events.push(event);
+    else this._dropped++;
+  }
+}
@@ -99,16 +99,58 @@ import type { ProcessingContext } from "@nodetool-ai/runtime";
 import { withWorkflowSpan } from "@nodetool-ai/runtime/tracing";
 import { isControlEdge, isDataEdge } from "@nodetool-ai/protocol";
 import { Graph, GraphValidationError } from "./graph.js";
-import { rewriteBypassedNodes } from "./graph-utils.js";
+import { pruneGraphToTargets, rewriteBypassedNodes } from "./graph-utils.js";
 import { dynamicSlotPropertyTypes } from "./dynamic-slots.js";
-import { NodeInbox } from "./inbox.js";
+import { NodeInbox, type InboxEntry } from "./inbox.js";
 import { NodeActor, type NodeExecutor } from "./actor.js";
 import { syntheticEdgeId } from "./edge-ids.js";
+import {
+  NodeResultMemo,
+  type MemoizationOptions,
+  type MemoizationStats
+} from "./memoization.js";
+import {
+  MessageCoalescer,
+  type MessageCoalescingOptions
+} from "./message-coalescer.js";
+import {
+  PayloadSpiller,
+  type PayloadSpillOptions,
+  type PayloadSpillStats
+} from "./payload-spill.js";
+import {
+  criticalPathLengths,
+  resourceClassOf,
+  type ResourceScheduler
+} from "./resource-scheduler.js";
+import { WorkerNodeExecutor, type WorkerPool } from "./worker-pool.js";
+import {
+  CompiledGraph,
+  type CompiledGraphCache,
+  type GraphPreparationStats
+} from "./graph-cache.js";
+import {
+  RunProfiler,
+  type RunProfile,
+  type RunProfilerOptions
+} from "./run-profiler.js";
+import {
+  InboxFlowControl,
+  type EdgeFlowStats,
+  type FlowControlOptions
+} from "./flow-control.js";
 import {
   analyzeCorrelation,
   projectLineageKey,
   type CorrelationAnalysisResult
 } from "./correlation-analysis.js";
+import {
+  RunCheckpointer,
+  emissionHints,
+  type NodeCheckpoint,
+  type RunCheckpointOptions,
+  type RunCheckpointStats
+} from "./run-checkpoint.js";
 import {
   lineageRelated,
   type NodeOutputRead,
@@ -202,6 +244,14 @@ export interface RunJobRequest {
     payload: unknown;
     input_id: string;
   };
+
+  /**
+   * Node ids whose results the run must produce — e.g. the output a user is
+   * previewing. When set, only these nodes and their ancestors run; every
+   * other node is pruned before the graph is prepared. An unknown id fails
+   * the run as a graph validation error.
+   */
+  target_nodes?: string[];
 }
 
 export interface WorkflowRunnerOptions {
@@ -249,6 +299,111 @@ export interface WorkflowRunnerOptions {
    * behaves exactly as it does today. See docs/workflow-supervisor-design.md.
    */
   supervisor?: SupervisorHandle;
+
+  /**
+   * Opt-in content-addressed result memoization. Pure nodes (and, with
+   * `includeRetrySafe`, retry-safe ones) whose inputs hash to a previous
+   * invocation are served from `executionContext.cache` instead of running,
+   * so only the nodes downstream of an edit execute again. Requires an
+   * `executionContext`; ignored without one.
+   */
+  memoize?: MemoizationOptions;
+
+  /**
+   * Coalesce chatty messages (`node_progress`, `edge_update`, text
+   * `output_update` and `chunk` streams) for up to `intervalMs` before they
+   * reach `executionContext.emit` and `RunResult.messages`. `job_update`,
+   * `node_update` and every other message type flush what is pending and keep
+   * their order. Off by default: every message is delivered as emitted.
+   */
+  coalesceMessages?: MessageCoalescingOptions;
+
+  /**
+   * Spill byte payloads of at least `thresholdBytes` on data edges to the
+   * run's temp storage and deliver a `PayloadRef` instead, so media queued in
+   * inboxes does not pin the heap. Consumers see the bytes again: the actor
+   * materialises refs before a node reads its inputs. Uses
+   * `executionContext.storage` unless `storage` is given; off without either.
+   */
+  spillPayloads?: PayloadSpillOptions;
+
+  /**
+   * Resource pools node invocations must hold a slot in (see
+   * `ResourceScheduler`). Each node runs in the pool of its
+   * `resource_class` — or `provider:<name>` for nodes whose `model` names a
+   * provider — and waiting invocations are served longest remaining critical
+   * path first. Share one scheduler across runners for process-wide limits.
+   * Absent, every ready node runs immediately.
+   */
+  scheduler?: ResourceScheduler;
+
+  /**
+   * Worker threads for CPU-bound nodes (see `WorkerPool`). Executors that
+   * carry a `worker` spec — node classes marked `cpuBound` — run their
+   * `process` calls in the pool instead of on the event loop. Share one pool
+   * across runners. Absent, every node runs in-process.
+   */
+  workerPool?: WorkerPool;
+
+  /**
+   * Prepared graphs shared across runs (see `CompiledGraphCache`). A run of
+   * a graph already in the cache skips bypass rewriting, edge indexing,
+   * correlation analysis, validation and list-input detection. Absent, every
+   * run prepares its graph from scratch.
+   */
+  graphCache?: CompiledGraphCache;
+
+  /**
+   * Profile the run (see `RunProfiler`): per node, time queued in the inbox,
+   * waiting for a resource slot, executing, on the Python bridge and blocked
+   * by backpressure; per edge, messages, bytes and inbox depth. The summary
+   * lands on `RunResult.profile` and the timeline is available as a Chrome
+   * trace from `runner.profiler`. Absent, nothing is timed.
+   */
+  profile?: RunProfilerOptions;
+
+  /**
+   * Adaptive credit-based flow control (see `InboxFlowControl`): each input
+   * handle lets as many messages queue as its consumer's measured service
+   * time covers, instead of one static `bufferLimit` for every edge, and
+   * caps queued payload bytes. Per-node-type policies choose whether a
+   * producer out of credits blocks or drops the oldest queued message.
+   * Per-edge credits, stalls and drops land on `RunResult.flowControl`.
+   * Absent, only `bufferLimit` applies.
+   */
+  flowControl?: FlowControlOptions;
+
+  /**
+   * This runner's share of a multi-process run (see `PartitionedRunner`).
+   * Absent, every node in the graph runs here.
+   */
+  partition?: PartitionBinding;
+
+  /**
+   * Crash-resume checkpoints (see `RunCheckpointer`): each node's output
+   * records go to `store` as soon as the node completes, and with `resume` a
+   * run of the same job id restores the nodes an earlier attempt finished —
+   * their outputs are replayed downstream instead of executing them again.
+   * Counters land on `RunResult.checkpoint`. Absent, nothing is recorded.
+   */
+  checkpoint?: RunCheckpointOptions;
+}
+
+/**
+ * Ties a runner into a multi-process run. Nodes listed in `remoteInboxes` run
+ * in another process: the runner spawns no actor for them, neither validates
+ * nor initializes them, and delivers their inputs to the given inbox, which
+ * forwards them, instead of to one of its own.
+ */
+export interface PartitionBinding {
+  /** Forwarding inbox by remote node id. */
+  remoteInboxes: ReadonlyMap<string, NodeInbox>;
+  /**
+   * Called once per run, after every inbox exists and before any node runs,
+   * with the run's inboxes by node id: where values arriving from other
+   * processes are delivered.
+   */
+  onInboxesReady?: (inboxes: ReadonlyMap<string, NodeInbox>) => void;
 }
 
 // ---------------------------------------------------------------------------
@@ -288,6 +443,27 @@ export interface RunResult {
    * working.
    */
   interventions?: Intervention[];
+
+  /** Cache hits and misses for the run. Absent when memoization is off. */
+  memoization?: MemoizationStats;
+
+  /** Spilled payload counters. Absent when spilling is off. */
+  payloadSpill?: PayloadSpillStats;
+
+  /**
+   * Whether the graph came from the compiled-graph cache and the setup time
+   * that saved. Absent without a cache or when preparation failed.
+   */
+  graphCache?: GraphPreparationStats;
+
+  /** Where the run's time went. Absent when profiling is off. */
+  profile?: RunProfile;
+
+  /** Credits, stalls and drops per edge. Absent when flow control is off. */
+  flowControl?: EdgeFlowStats[];
+
+  /** Restored and saved nodes. Absent when checkpointing is off. */
+  checkpoint?: RunCheckpointStats;
 }
 
 /**
@@ -346,7 +522,14 @@ export class WorkflowRunner {
    * Multi-edge list inputs: nodeId → set of handles that aggregate
    * multiple edges into a list.
    */
-  private _multiEdgeListInputs = new Map<string, Set<string>>();
+  private _multiEdgeListInputs: ReadonlyMap<string, ReadonlySet<string>> =
+    new Map();
+
+  /** This run's entry in the compiled-graph cache, when one is configured. */
+  private _compiled: CompiledGraph | undefined;
+
+  /** How this run's graph was prepared. Set only with a graph cache. */
+  private _graphPreparation: GraphPreparationStats | undefined;
 
   /** Collected outputs from output nodes. */
   private _outputs = new Map<string, unknown[]>();
@@ -462,6 +645,24 @@ export class WorkflowRunner {
     Map<string, Record<string, unknown>>
   >();
 
+  /** Result memo for the current run; undefined when memoization is off. */
+  private _memo: NodeResultMemo | undefined;
+
+  /** Message coalescer for the current run; undefined when coalescing is off. */
+  private _coalescer: MessageCoalescer | undefined;
+
+  /** Payload spiller for the current run; undefined when spilling is off. */
+  private _spiller: PayloadSpiller | undefined;
+
+  /** Profiler for the current run; undefined when profiling is off. */
+  private _profiler: RunProfiler | undefined;
+
+  /** Checkpoints for the current run; undefined when checkpointing is off. */
+  private _checkpointer: RunCheckpointer | undefined;
+
+  /** Nodes restored from an earlier attempt, with what they produced. */
+  private _restored = new Map<string, NodeCheckpoint>();
+
   /** Undefined on an unsupervised run, so its `RunResult` is unchanged. */
   private _recordedInterventions(): Intervention[] | undefined {
     return this._interventions.length > 0 ? this._interventions : undefined;
@@ -670,49 +871,14 @@ export class WorkflowRunner {
         job_id: request.job_id,
         workflow_id: request.workflow_id ?? null
       });
-      // Rewrite the graph to route around nodes marked
-      // `ui_properties.bypassed === true`. Each outgoing edge of a
-      // bypassed node is re-attached to the matching upstream source
-      // (by type compatibility); outgoing edges with no compatible
-      // upstream are dropped, as is the bypassed node itself.
-      const effectiveGraph = rewriteBypassedNodes(graphData);
-      this._graph = new Graph(effectiveGraph);
-
-      // Python parity: _filter_invalid_edges — silently remove edges
-      // whose source or target node doesn't exist in the graph.
-      this._filterInvalidEdges();
-
-      // Static correlation analysis is mandatory. Issues abort the run with
-      // a graph validation error before any actor is spawned.
-      this._correlation = analyzeCorrelation({
-        nodes: this._graph.nodes,
-        edges: this._graph.edges
-      });
-      if (this._correlation.issues.length > 0) {
-        const lines = this._correlation.issues.map((i) => `  - ${i.message}`);
-        throw new GraphValidationError(
-          `Correlation analysis failed:\n${lines.join("\n")}`,
-          this._correlation.issues
-            .filter((i): i is typeof i & { nodeId: string } => !!i.nodeId)
-            .map((i) => ({
-              nodeId: i.nodeId,
-              nodeType: i.nodeType,
-              property: i.handle ?? "",
-              message: i.message
-            }))
-        );
-      }
-
-      // Validate
-      this._graph.validate();
-
-      // Pre-flight node validation: catch missing required fields and
-      // unset model selections before spawning any actors.
-      this._validateNodes();
+      this._prepareGraph(
+        request.target_nodes?.length
+          ? this._pruneToTargets(graphData, request.target_nodes)
+          : graphData
+      );
+      this._profiler?.registerGraph(this._graph);
       this._validateRequiredInputs(request.params ?? {});
-
-      // Detect multi-edge list inputs
-      this._detectMultiEdgeListInputs();
+      await this._prepareCheckpoints(request.params ?? {});
 
       // Initialize inboxes
       this._initializeInboxes();
@@ -766,7 +932,13 @@ export class WorkflowRunner {
           messages: this._messages,
           status: "suspended",
           suspend: this._suspend,
-          interventions: this._recordedInterventions()
+          interventions: this._recordedInterventions(),
+          memoization: this._memo?.stats,
+          payloadSpill: this._spiller?.stats,
+          graphCache: this._graphPreparation,
+          profile: this._finishProfile(),
+          flowControl: this.flowControlStats(),
+          checkpoint: this._checkpointer?.stats
         };
       }
 
@@ -791,13 +963,23 @@ export class WorkflowRunner {
           messages: this._messages,
           status: "failed",
           error,
-          interventions: this._recordedInterventions()
+          interventions: this._recordedInterventions(),
+          memoization: this._memo?.stats,
+          payloadSpill: this._spiller?.stats,
+          graphCache: this._graphPreparation,
+          profile: this._finishProfile(),
+          flowControl: this.flowControlStats(),
+          checkpoint: this._checkpointer?.stats
         };
       }
 
       const status = this._cancelled ? "cancelled" : "completed";
       // Stryker disable next-line StringLiteral,ObjectLiteral: diagnostic log args only
-      log.info("Workflow completed", { jobId: request.job_id, status });
+      log.info("Workflow completed", {
+        jobId: request.job_id,
+        status,
+        memoization: this._memo?.stats
+      });
 
       this._emit({
         type: "job_update",
@@ -810,7 +992,13 @@ export class WorkflowRunner {
         outputs: Object.fromEntries(this._outputs),
         messages: this._messages,
         status,
-        interventions: this._recordedInterventions()
+        interventions: this._recordedInterventions(),
+        memoization: this._memo?.stats,
+        payloadSpill: this._spiller?.stats,
+        graphCache: this._graphPreparation,
+        profile: this._finishProfile(),
+        flowControl: this.flowControlStats(),
+        checkpoint: this._checkpointer?.stats
       };
     } catch (err) {
       const message = err instanceof Error ? err.message : String(err);
@@ -842,9 +1030,20 @@ export class WorkflowRunner {
         messages: this._messages,
         status: "failed",
         error: message,
-        interventions: this._recordedInterventions()
+        interventions: this._recordedInterventions(),
+        memoization: this._memo?.stats,
+        payloadSpill: this._spiller?.stats,
+        graphCache: this._graphPreparation,
+        profile: this._finishProfile(),
+        flowControl: this.flowControlStats(),
+        checkpoint: this._checkpointer?.stats
       };
     } finally {
+      // Every exit emits a job_update, which already flushed; this only
+      // disarms the tick timer.
+      this._coalescer?.flush();
+      // Deletes whatever no consumer materialised (cancelled, undelivered).
+      await this._spiller?.close();
       this._running = false;
     }
   }
@@ -855,6 +1054,8 @@ export class WorkflowRunner {
     this._edgeCounterLastEmitMs = new Map();
     this._edgeCounterDirty = new Set();
     this._multiEdgeListInputs = new Map();
+    this._compiled = undefined;
+    this._graphPreparation = undefined;
     this._outputs = new Map();
     this._messages = [];
     this._cancelled = false;
@@ -868,6 +1069,38 @@ export class WorkflowRunner {
     this._suspend = undefined;
     this._interventions = [];
     this._recordedOutputs = new Map();
+    const ctx = this._options.executionContext;
+    this._memo =
+      this._options.memoize && ctx
+        ? new NodeResultMemo(ctx, this._options.memoize)
+        : undefined;
+    this._coalescer = this._options.coalesceMessages
+      ? new MessageCoalescer(
+          (msg) => this._deliver(msg),
+          this._options.coalesceMessages
+        )
+      : undefined;
+    const spillStorage =
+      this._options.spillPayloads?.storage ?? ctx?.storage ?? undefined;
+    this._spiller =
+      this._options.spillPayloads && spillStorage
+        ? new PayloadSpiller(
+            spillStorage,
+            `payload-spill/${this.jobId}/${Date.now().toString(36)}`,
+            this._options.spillPayloads
+          )
+        : undefined;
+    this._profiler = this._options.profile
+      ? new RunProfiler(this.jobId, this._options.profile)
+      : undefined;
+    this._checkpointer = undefined;
+    this._restored = new Map();
+  }
+
+  /** Stop the profiler's clock and summarise the run. */
+  private _finishProfile(): RunProfile | undefined {
+    this._profiler?.end();
+    return this._profiler?.summary();
   }
 
   /**
@@ -975,6 +1208,46 @@ export class WorkflowRunner {
     }
   }
 
+  /**
+   * The current (or last) run's profiler, for its Chrome trace. Undefined
+   * when profiling is off.
+   */
+  get profiler(): RunProfiler | undefined {
+    return this._profiler;
+  }
+
+  /**
+   * Flow-control counters for every data edge of the current (or last) run,
+   * live mid-run. Undefined when flow control is off.
+   */
+  flowControlStats(): EdgeFlowStats[] | undefined {
+    if (!this._options.flowControl) return undefined;
+    if (!this._graph) return [];
+    const stats: EdgeFlowStats[] = [];
+    for (const edge of this._graph.edges) {
+      if (isControlEdge(edge)) continue;
+      const flow = this._inboxes.get(edge.target)?.flowControl;
+      if (!flow) continue;
+      const edgeId =
+        edge.id ??
+        syntheticEdgeId(
+          edge.source,
+          edge.sourceHandle,
+          edge.target,
+          edge.targetHandle
+        );
+      stats.push({
+        edgeId,
+        source: edge.source,
+        target: edge.target,
+        targetHandle: edge.targetHandle,
+        ...flow.handleStats(edge.targetHandle),
+        ...flow.edgeStats(edgeId)
+      });
+    }
+    return stats;
+  }
+
   /** Actors spawned and not yet finished. Zero before and after a run. */
   get liveActorCount(): number {
     return this._liveActors;
@@ -1022,6 +1295,120 @@ export class WorkflowRunner {
     }
   }
 
+  // -----------------------------------------------------------------------
+  // Graph preparation
+  // -----------------------------------------------------------------------
+
+  /**
+   * Set up the run's graph, correlation analysis and list-input map: from
+   * the compiled-graph cache when it holds this graph, else by compiling it
+   * (and caching the result when a cache is configured).
+   */
+  private _prepareGraph(graphData: HydratedGraphData): void {
+    const cache = this._options.graphCache;
+    if (!cache) {
+      this._compileGraph(graphData);
+      return;
+    }
+    const start = performance.now();
+    const key = cache.keyFor(graphData);
+    const cached = cache.get(key, performance.now() - start);
+    if (cached) {
+      this._compiled = cached;
+      this._graph = cached.graph;
+      this._correlation = cached.correlation;
+      this._multiEdgeListInputs = cached.multiEdgeListInputs;
+      const setupMs = performance.now() - start;
+      this._graphPreparation = {
+        hit: true,
+        setupMs,
+        savedMs: Math.max(0, cached.compileMs - setupMs)
+      };
+      return;
+    }
+    const compileStart = performance.now();
+    this._compileGraph(graphData);
+    const compileMs = performance.now() - compileStart;
+    this._compiled = new CompiledGraph(
+      this._graph,
+      this._correlation!,
+      this._multiEdgeListInputs,
+      compileMs
+    );
+    cache.set(key, this._compiled);
+    this._graphPreparation = {
+      hit: false,
+      setupMs: performance.now() - start,
+      savedMs: 0
+    };
+  }
+
+  /**
+   * Demand-driven execution: keep only what `targets` need. The pruned graph
+   * is what gets prepared, so the compiled-graph cache keys on it too.
+   */
+  private _pruneToTargets(
+    graphData: HydratedGraphData,
+    targets: readonly string[]
+  ): HydratedGraphData {
+    const pruned = pruneGraphToTargets(graphData, targets);
+    if (pruned !== graphData) {
+      // Stryker disable next-line StringLiteral,ObjectLiteral: diagnostic log args only
+      log.info("Pruned graph to targets", {
+        targets,
+        kept: pruned.nodes.length,
+        skipped: graphData.nodes.length - pruned.nodes.length
+      });
+    }
+    return pruned;
+  }
+
+  /** The run-independent graph preparation. Throws on an invalid graph. */
+  private _compileGraph(graphData: HydratedGraphData): void {
+    // Rewrite the graph to route around nodes marked
+    // `ui_properties.bypassed === true`. Each outgoing edge of a
+    // bypassed node is re-attached to the matching upstream source
+    // (by type compatibility); outgoing edges with no compatible
+    // upstream are dropped, as is the bypassed node itself.
+    const effectiveGraph = rewriteBypassedNodes(graphData);
+    this._graph = new Graph(effectiveGraph);
+
+    // Python parity: _filter_invalid_edges — silently remove edges
+    // whose source or target node doesn't exist in the graph.
+    this._filterInvalidEdges();
+
+    // Static correlation analysis is mandatory. Issues abort the run with
+    // a graph validation error before any actor is spawned.
+    this._correlation = analyzeCorrelation({
+      nodes: this._graph.nodes,
+      edges: this._graph.edges
+    });
+    if (this._correlation.issues.length > 0) {
+      const lines = this._correlation.issues.map((i) => `  - ${i.message}`);
+      throw new GraphValidationError(
+        `Correlation analysis failed:\n${lines.join("\n")}`,
+        this._correlation.issues
+          .filter((i): i is typeof i & { nodeId: string } => !!i.nodeId)
+          .map((i) => ({
+            nodeId: i.nodeId,
+            nodeType: i.nodeType,
+            property: i.handle ?? "",
+            message: i.message
+          }))
+      );
+    }
+
+    // Validate
+    this._graph.validate();
+
+    // Pre-flight node validation: catch missing required fields and
+    // unset model selections before spawning any actors.
+    this._validateNodes();
+
+    // Detect multi-edge list inputs
+    this._detectMultiEdgeListInputs();
+  }
+
   // -----------------------------------------------------------------------
   // Invalid edge filtering (Python parity: _filter_invalid_edges)
   // -----------------------------------------------------------------------
@@ -1073,6 +1460,7 @@ export class WorkflowRunner {
 
     const issues: NodeValidationIssue[] = [];
     for (const node of this._graph.nodes) {
+      if (this._isRemoteNode(node.id)) continue;
       const handles = connectedByNode.get(node.id) ?? new Set<string>();
       const nodeIssues = validator(node, handles);
       if (nodeIssues && nodeIssues.length > 0) {
@@ -1160,6 +1548,90 @@ export class WorkflowRunner {
     }
   }
 
+  /**
+   * Start checkpointing and, on a resumed run, pick the nodes an earlier
+   * attempt completed. Fingerprints cover the values input nodes are about
+   * to dispatch, so resuming with different params re-runs what they feed.
+   */
+  private async _prepareCheckpoints(
+    params: Record<string, unknown>
+  ): Promise<void> {
+    if (!this._options.checkpoint) return;
+    const inputs = new Map<string, unknown>();
+    for (const node of this._graph.nodes) {
+      // Live-streamed inputs carry values no fingerprint can see, so what
+      // they feed is never restored.
+      if (!this._isExternalInputNode(node) || node.is_streaming_output) {
+        continue;
+      }
+      if (this._graph.findIncomingEdges(node.id).length > 0) continue;
+      const properties = isObjectValue(node.properties)
+        ? node.properties
+        : {};
+      const inputName = this._getExternalInputName(node);
+      inputs.set(
+        node.id,
+        hasDefinedOwnProperty(params, inputName)
+          ? params[inputName]
+          : properties.value
+      );
+    }
+    this._checkpointer = new RunCheckpointer(
+      this._effectiveJobId,
+      this._options.checkpoint
+    );
+    this._restored = await this._checkpointer.prepare(
+      this._graph,
+      inputs,
+      (nodeId) => !this._isRemoteNode(nodeId)
+    );
+    if (this._restored.size > 0) {
+      // Stryker disable next-line StringLiteral,ObjectLiteral: diagnostic log args only
+      log.info("Resuming from checkpoints", {
+        jobId: this._effectiveJobId,
+        restored: this._restored.size
+      });
+    }
+  }
+
+  /**
+   * Stand in for a restored node's actor: replay what it emitted, close its
+   * edges and report it completed, as if it had just run.
+   */
+  private async _replayCheckpoint(
+    node: NodeDescriptor,
+    checkpoint: NodeCheckpoint
+  ): Promise<void> {
+    for (const emission of checkpoint.emissions) {
+      await this._sendMessages(
+        node.id,
+        emission.outputs,
+        emissionHints(emission)
+      );
+    }
+    await this._sendEOS(node.id);
+    this._completedNodes.add(node.id);
+    if (this._isOutputNode(node)) {
+      const name = node.name ?? node.id;
+      const collected = this._outputs.get(name) ?? [];
+      collected.push(...Object.values(checkpoint.result));
+      this._outputs.set(name, collected);
+    }
+    this._emit({
+      type: "node_update",
+      node_id: node.id,
+      node_name: node.name ?? node.type,
+      node_type: node.type,
+      status: "completed",
+      result: checkpoint.result,
+      error: null,
+      properties: isObjectValue(node.properties)
+        ? (node.properties as Record<string, unknown>)
+        : null,
+      provider_cost: null
+    });
+  }
+
   // -----------------------------------------------------------------------
   // Node initialization
   // -----------------------------------------------------------------------
@@ -1177,6 +1649,9 @@ export class WorkflowRunner {
   private async _initializeGraph(): Promise<void> {
     const initialized: NodeExecutor[] = [];
     for (const node of this._graph.nodes) {
+      if (this._isRemoteNode(node.id) || this._restored.has(node.id)) {
+        continue;
+      }
       const executor = this._resolveExecutor(node);
       if (!executor.initialize) continue;
       try {
@@ -1215,6 +1690,10 @@ export class WorkflowRunner {
     let executor = this._executors.get(node.id);
     if (!executor) {
       executor = this._options.resolveExecutor(node);
+      const pool = this._options.workerPool;
+      if (pool && executor.worker) {
+        executor = new WorkerNodeExecutor(executor, executor.worker, pool);
+      }
       this._executors.set(node.id, executor);
     }
     return executor;
@@ -1225,8 +1704,21 @@ export class WorkflowRunner {
   // -----------------------------------------------------------------------
 
   private _initializeInboxes(): void {
+    const remoteInboxes = this._options.partition?.remoteInboxes;
     for (const node of this._graph.nodes) {
-      const inbox = new NodeInbox(this._options.bufferLimit ?? null);
+      // A restored node reads nothing; deliveries to it are skipped.
+      if (this._restored.has(node.id)) continue;
+      const flowControl = this._options.flowControl;
+      const inbox =
+        remoteInboxes?.get(node.id) ??
+        new NodeInbox(this._options.bufferLimit ?? null, {
+          flowControl: flowControl
+            ? new InboxFlowControl(
+                flowControl.policies?.[node.type] ?? "block",
+                flowControl
+              )
+            : undefined
+        });
 
       // Count upstream sources per handle from data edges
       const incomingData = this._graph.findDataEdges(node.id);
@@ -1256,6 +1748,7 @@ export class WorkflowRunner {
 
       this._inboxes.set(node.id, inbox);
     }
+    this._options.partition?.onInboxesReady?.(this._inboxes);
   }
 
   // -----------------------------------------------------------------------
@@ -1266,6 +1759,7 @@ export class WorkflowRunner {
     // Find handles that receive more than one edge AND whose property type
     // is a list type.  Non-list handles with multiple edges should NOT be
     // marked for aggregation (Python parity: _classify_list_inputs).
+    const listInputs = new Map<string, Set<string>>();
     const handleEdgeCounts = new Map<string, number>(); // key = nodeId:handle
     for (const edge of this._graph.edges) {
       if (isControlEdge(edge)) continue;
@@ -1296,12 +1790,13 @@ export class WorkflowRunner {
           }
         }
 
-        if (!this._multiEdgeListInputs.has(nodeId)) {
-          this._multiEdgeListInputs.set(nodeId, new Set());
+        if (!listInputs.has(nodeId)) {
+          listInputs.set(nodeId, new Set());
         }
-        this._multiEdgeListInputs.get(nodeId)!.add(handle);
+        listInputs.get(nodeId)!.add(handle);
       }
     }
+    this._multiEdgeListInputs = listInputs;
   }
 
   // -----------------------------------------------------------------------
@@ -1357,6 +1852,11 @@ export class WorkflowRunner {
         .filter(isControlEdge);
       if (incomingControl.length > 0) continue;
       if (!this._isExternalInputNode(node)) continue;
+      // Everything this input feeds was restored from a checkpoint.
+      const fed = this._graph.findOutgoingEdges(node.id);
+      if (fed.length > 0 && fed.every((e) => this._restored.has(e.target))) {
+        continue;
+      }
 
       const inputName = this._getExternalInputName(node);
       const properties = isObjectValue(node.properties)
@@ -1477,6 +1977,10 @@ export class WorkflowRunner {
     const actorPromises: Array<Promise<void>> = [];
     /** Parallel to `actorPromises` — maps a settled index back to its node. */
     const actorNodeIds: string[] = [];
+    const scheduler = this._options.scheduler;
+    const criticalPath = scheduler
+      ? (this._compiled?.criticalPath ?? criticalPathLengths(this._graph))
+      : undefined;
 
     for (const node of this._graph.nodes) {
       // Skip input-only nodes that have no incoming edges
@@ -1493,6 +1997,19 @@ export class WorkflowRunner {
       ) {
         continue; // pure input node, already dispatched
       }
+      if (this._isRemoteNode(node.id)) continue; // runs in another process
+
+      const checkpoint = this._restored.get(node.id);
+      if (checkpoint) {
+        actorNodeIds.push(node.id);
+        this._liveActors++;
+        actorPromises.push(
+          this._replayCheckpoint(node, checkpoint).finally(() => {
+            this._liveActors--;
+          })
+        );
+        continue;
+      }
 
       const inbox = this._inboxes.get(node.id)!;
       const executor = this._resolveExecutor(node);
@@ -1507,6 +2024,9 @@ export class WorkflowRunner {
         inbox,
         executor,
         sendOutputs: async (nodeId, outputs, hints) => {
+          if (!this._cancelled) {
+            this._checkpointer?.record(nodeId, outputs, hints ?? {});
+          }
           await this._sendMessages(nodeId, outputs, hints);
         },
         emitMessage: (msg) => {
@@ -1520,7 +2040,13 @@ export class WorkflowRunner {
         signalSlotEos: (sourceNodeId, slot) =>
           this._signalSlotEos(sourceNodeId, slot),
         supervisor: this._supervisor,
-        onIntervention: (intervention) => this._interventions.push(intervention)
+        onIntervention: (intervention) =>
+          this._interventions.push(intervention),
+        memo: this._memo,
+        spiller: this._spiller,
+        resourcePool: scheduler?.pool(resourceClassOf(node)),
+        resourcePriority: criticalPath?.get(node.id),
+        profiler: this._profiler
       });
 
       actorNodeIds.push(node.id);
@@ -1549,6 +2075,16 @@ export class WorkflowRunner {
               };
             }
 
+            // Checkpoint a clean completion; anything else drops what the
+            // node recorded, so a resumed run executes it again.
+            this._checkpointer?.complete(
+              node.id,
+              result.outputs ?? {},
+              result.error === undefined &&
+                result.suspend === undefined &&
+                !this._cancelled
+            );
+
             // After actor completes, send EOS to all downstream inboxes
             await this._sendEOS(node.id);
 
@@ -1612,6 +2148,7 @@ export class WorkflowRunner {
     // would keep writing to inboxes and emitting messages after the runner
     // reported a terminal status.
     const settled = await Promise.allSettled(actorPromises);
+    await this._checkpointer?.flush();
     for (const [index, outcome] of settled.entries()) {
       if (outcome.status !== "rejected") continue;
       const nodeId = actorNodeIds[index];
@@ -1737,6 +2274,14 @@ export class WorkflowRunner {
       }))
     });
 
+    // Data deliveries are grouped per target inbox and enqueued with one
+    // putMany each, so a target fed by several edges of this node is woken
+    // once for the whole output record rather than once per edge.
+    const deliveries = new Map<NodeInbox, InboxEntry[]>();
+    // Spilled templates per output handle: each value is written to storage
+    // once, however many edges it fans out to.
+    const spilled = this._spiller ? new Map<string, unknown>() : undefined;
+
     for (const edge of outgoing) {
       if (isControlEdge(edge)) {
         // Route control events from controller nodes to controlled nodes.
@@ -1855,13 +2400,48 @@ export class WorkflowRunner {
       const lineage =
         routingHints.perSlotLineage?.[edge.sourceHandle] ??
         routingHints.invocationLineage;
-      await targetInbox.put(edge.targetHandle, value, {
+      let batch = deliveries.get(targetInbox);
+      if (!batch) {
+        batch = [];
+        deliveries.set(targetInbox, batch);
+      }
+      let data = value;
+      if (spilled) {
+        let template = spilled.get(edge.sourceHandle);
+        if (template === undefined) {
+          template = await this._spiller!.spill(value);
+          spilled.set(edge.sourceHandle, template);
+        }
+        if (template !== value) data = this._spiller!.lease(template);
+      }
+      batch.push({
+        handle: edge.targetHandle,
+        data,
         source_edge_id: edgeId,
         correlation_lineage: lineage
       });
       this._incrementEdgeCounter(edge);
     }
 
+    const profiler = this._profiler;
+    for (const [targetInbox, batch] of deliveries) {
+      if (!profiler) {
+        await targetInbox.putMany(batch);
+        continue;
+      }
+      const blockedBefore = targetInbox.blockedPuts;
+      const startedAt = profiler.now();
+      await targetInbox.putMany(batch);
+      profiler.recordDelivery(
+        sourceNodeId,
+        targetInbox,
+        batch,
+        startedAt,
+        profiler.now(),
+        targetInbox.blockedPuts !== blockedBefore
+      );
+    }
+
     // Emit output_update for each produced output handle.
     // Skip constant and input nodes: the client already holds their value
     // as a property (or supplied it as a runtime param), so re-sending it
@@ -2325,6 +2905,7 @@ export class WorkflowRunner {
     this._flushEdgeCounters();
     for (const edge of this._graph.edges) {
       try {
+        if (this._isRemoteNode(edge.target)) continue;
         const inbox = this._inboxes.get(edge.target);
         if (!inbox) continue;
         const edgeId =
@@ -2397,6 +2978,7 @@ export class WorkflowRunner {
   private _checkPendingInboxWork(): string[] {
     const pending: string[] = [];
     for (const [nodeId, inbox] of this._inboxes) {
+      if (this._isRemoteNode(nodeId)) continue;
       if (inbox.hasPendingWork()) pending.push(nodeId);
     }
     return pending;
@@ -2406,6 +2988,11 @@ export class WorkflowRunner {
   // Helpers
   // -----------------------------------------------------------------------
 
+  /** Whether `nodeId` runs in another process of a partitioned run. */
+  private _isRemoteNode(nodeId: string): boolean {
+    return this._options.partition?.remoteInboxes.has(nodeId) ?? false;
+  }
+
   private _isOutputNode(node: NodeDescriptor): boolean {
     // An output node has no outgoing data edges
     const outgoing = this._graph.findOutgoingEdges(node.id).filter(isDataEdge);
@@ -2434,6 +3021,14 @@ export class WorkflowRunner {
   }
 
   private _emit(msg: ProcessingMessage): void {
+    if (this._coalescer) {
+      this._coalescer.push(msg);
+    } else {
+      this._deliver(msg);
+    }
+  }
+
+  private _deliver(msg: ProcessingMessage): void {
     // Retain for RunResult.messages — except the realtime-audio firehose: a
     // live synth patch emits ~50 audio-chunk output_updates per node per
     // second, each holding a sample buffer, so retaining them grows the heap
@@ -0,0 +1,513 @@
+/**
+ * Worker-thread execution for CPU-bound nodes.
+ *
+ * Pure-JS pixel and sample loops (Canny, histogram equalisation, audio
+ * effects) run on the event loop: while one of them grinds through a 4K frame
+ * every other actor, the WebSocket stream and the server itself stall. A
+ * {@link WorkerPool} is a fixed set of `worker_threads` shared by every run in
+ * the process. A runner given one wraps each executor that carries a
+ * `worker` spec (`BaseNode.cpuBound`) in a {@link WorkerNodeExecutor}, whose
+ * `process` runs in the pool.
+ *
+ * The worker imports the node's module, finds the class by `nodeType` among
+ * its exports and calls `process` on a fresh instance. There is no
+ * `ProcessingContext` on that side, so the spec's `prepare` hook first
+ * resolves refs into bytes on the main thread. Buffers `prepare` created are
+ * transferred to the worker rather than copied, and the worker transfers the
+ * buffers in its outputs back; buffers the node received on its inbox are
+ * copied, since a fan-out delivers the same buffer to several consumers.
+ *
+ * When a node cannot run in a worker — its module or class does not load
+ * there, or its inputs or outputs cannot be cloned — the executor falls back
+ * to running it in-process. Errors the node itself throws are not retried.
+ */
+
+import { createLogger, getNodeBuiltinSync } from "@nodetool-ai/config";
+import type { ProcessingContext, WorkerNodeSpec } from "@nodetool-ai/runtime";
+import type { NodeExecutor } from "./actor.js";
+
+// Stryker disable next-line StringLiteral: logger name is a diagnostic label, not a behavioural contract
+const log = createLogger("nodetool.kernel.worker-pool");
+
+type WorkerThreads = typeof import("node:worker_threads");
+type Worker = import("node:worker_threads").Worker;
+
+/** Per-node-type timings, reported by {@link WorkerPool.stats}. */
+export interface WorkerTaskStats {
+  /** Tasks that ran to completion or a node error. */
+  tasks: number;
+  /** Tasks that failed, including ones that fell back in-process. */
+  failed: number;
+  /** Total time tasks waited for a free worker, in ms. */
+  queueWaitMs: number;
+  /** Longest single wait for a free worker, in ms. */
+  maxQueueWaitMs: number;
+  /** Total time spent in the node's `process` inside a worker, in ms. */
+  runMs: number;
+}
+
+export interface WorkerPoolStats {
+  size: number;
+  /** Workers currently started. */
+  workers: number;
+  /** Workers running a task. */
+  busy: number;
+  /** Tasks waiting for a free worker. */
+  queued: number;
+  byNodeType: Record<string, WorkerTaskStats>;
+}
+
+export interface WorkerPoolOptions {
+  /**
+   * Number of worker threads. Default: available parallelism minus one for
+   * the main thread, at least 1.
+   */
+  size?: number;
+}
+
+/**
+ * The task could not be run in a worker at all — as opposed to the node
+ * throwing. {@link WorkerNodeExecutor} runs the node in-process instead.
+ */
+export class WorkerUnavailableError extends Error {
+  constructor(message: string, options?: { cause?: unknown }) {
+    super(message, options);
+    this.name = "WorkerUnavailableError";
+  }
+}
+
+interface SerializedError {
+  name: string;
+  message: string;
+  stack?: string;
+}
+
+type WorkerReply =
+  | { id: number; ok: true; outputs: Record<string, unknown>; runMs: number }
+  | {
+      id: number;
+      ok: false;
+      unavailable: boolean;
+      error: SerializedError;
+      runMs: number;
+    };
+
+interface Task {
+  id: number;
+  spec: Pick<WorkerNodeSpec, "module" | "nodeType">;
+  inputs: Record<string, unknown>;
+  transfer: ArrayBuffer[];
+  enqueuedAt: number;
+  resolve: (outputs: Record<string, unknown>) => void;
+  reject: (err: unknown) => void;
+}
+
+interface Slot {
+  worker: Worker;
+  task: Task | null;
+}
+
+/**
+ * Worker bootstrap. Plain CommonJS evaluated with `eval: true`, so it needs
+ * no file of its own next to the compiled kernel; node modules are loaded
+ * with dynamic `import()` and inherit the parent's loaders via `execArgv`.
+ */
+const WORKER_SOURCE = `
+const { parentPort } = require("node:worker_threads");
+const { performance } = require("node:perf_hooks");
+const modules = new Map();
+const classes = new Map();
+
+function findClass(exports, nodeType) {
+  for (const value of Object.values(exports)) {
+    const candidates = Array.isArray(value) ? value : [value];
+    for (const candidate of candidates) {
+      if (typeof candidate === "function" && candidate.nodeType === nodeType) {
+        return candidate;
+      }
+    }
+  }
+  return undefined;
+}
+
+async function loadClass(spec) {
+  const key = spec.module + "#" + spec.nodeType;
+  let cls = classes.get(key);
+  if (cls) return cls;
+  let pending = modules.get(spec.module);
+  if (!pending) {
+    pending = import(spec.module);
+    modules.set(spec.module, pending);
+  }
+  cls = findClass(await pending, spec.nodeType);
+  if (!cls) {
+    throw new Error("No node class " + spec.nodeType + " exported by " + spec.module);
+  }
+  classes.set(key, cls);
+  return cls;
+}
+
+function ownedBuffers(value, depth, out) {
+  if (ArrayBuffer.isView(value)) {
+    const buffer = value.buffer;
+    if (
+      buffer instanceof ArrayBuffer &&
+      value.byteOffset === 0 &&
+      value.byteLength === buffer.byteLength
+    ) {
+      out.add(buffer);
+    }
+    return;
+  }
+  if (depth >= 4 || typeof value !== "object" || value === null) return;
+  if (Array.isArray(value)) {
+    for (const item of value) ownedBuffers(item, depth + 1, out);
+    return;
+  }
+  const proto = Object.getPrototypeOf(value);
+  if (proto !== Object.prototype && proto !== null) return;
+  for (const key of Object.keys(value)) ownedBuffers(value[key], depth + 1, out);
+}
+
+function serializeError(err) {
+  return err instanceof Error
+    ? { name: err.name, message: err.message, stack: err.stack }
+    : { name: "Error", message: String(err) };
+}
+
+parentPort.on("message", async (task) => {
+  let cls;
+  try {
+    cls = await loadClass(task.spec);
+  } catch (err) {
+    parentPort.postMessage({
+      id: task.id, ok: false, unavailable: true, error: serializeError(err), runMs: 0
+    });
+    return;
+  }
+  const start = performance.now();
+  let outputs;
+  try {
+    outputs = await new cls().toExecutor().process(task.inputs);
+  } catch (err) {
+    parentPort.postMessage({
+      id: task.id, ok: false, unavailable: false, error: serializeError(err),
+      runMs: performance.now() - start
+    });
+    return;
+  }
+  const runMs = performance.now() - start;
+  const transfer = new Set();
+  ownedBuffers(outputs, 0, transfer);
+  try {
+    parentPort.postMessage({ id: task.id, ok: true, outputs, runMs }, [...transfer]);
+  } catch (err) {
+    parentPort.postMessage({
+      id: task.id, ok: false, unavailable: true, error: serializeError(err), runMs
+    });
+  }
+});
+`;
+
+/** Nesting depth searched for buffers; media refs sit at depth 1 or 2. */
+const MAX_DEPTH = 4;
+
+const isPlainObject = (value: unknown): value is Record<string, unknown> => {
+  if (typeof value !== "object" || value === null) return false;
+  const proto = Object.getPrototypeOf(value);
+  return proto === Object.prototype || proto === null;
+};
+
+/**
+ * ArrayBuffers in `value` that a typed-array view spans whole. Partial views
+ * are skipped: they share a buffer with something else (Node's `Buffer`
+ * pool, a slice of a larger frame) that must not be detached.
+ */
+export function ownedArrayBuffers(
+  value: unknown,
+  out: Set<ArrayBuffer> = new Set(),
+  depth = 0
+): Set<ArrayBuffer> {
+  if (ArrayBuffer.isView(value)) {
+    const buffer = value.buffer;
+    if (
+      buffer instanceof ArrayBuffer &&
+      value.byteOffset === 0 &&
+      value.byteLength === buffer.byteLength
+    ) {
+      out.add(buffer);
+    }
+    return out;
+  }
+  if (depth >= MAX_DEPTH) return out;
+  if (Array.isArray(value)) {
+    for (const item of value) ownedArrayBuffers(item, out, depth + 1);
+  } else if (isPlainObject(value)) {
+    for (const key of Object.keys(value)) {
+      ownedArrayBuffers(value[key], out, depth + 1);
+    }
+  }
+  return out;
+}
+
+function defaultPoolSize(): number {
+  const os = getNodeBuiltinSync<typeof import("node:os")>("node:os");
+  const cores = os?.availableParallelism?.() ?? os?.cpus().length ?? 2;
+  return Math.max(1, cores - 1);
+}
+
+function reviveError(error: SerializedError): Error {
+  const err = new Error(error.message);
+  err.name = error.name;
+  if (error.stack) err.stack = error.stack;
+  return err;
+}
+
+/**
+ * A fixed-size set of worker threads running node `process` calls. Workers
+ * start on first use and are replaced if one dies; tasks wait in arrival
+ * order for a free worker. Idle workers do not keep the process alive.
+ */
+export class WorkerPool {
+  readonly size: number;
+  private _slots: Slot[] = [];
+  private _queue: Task[] = [];
+  private _seq = 0;
+  private _closed = false;
+  private _stats = new Map<string, WorkerTaskStats>();
+
+  constructor(options: WorkerPoolOptions = {}) {
+    const size = options.size ?? defaultPoolSize();
+    if (!(size >= 1)) {
+      throw new Error(`Worker pool needs a size of at least 1, got ${size}`);
+    }
+    this.size = size;
+  }
+
+  get stats(): WorkerPoolStats {
+    const byNodeType: Record<string, WorkerTaskStats> = {};
+    for (const [nodeType, stats] of this._stats) {
+      byNodeType[nodeType] = { ...stats };
+    }
+    return {
+      size: this.size,
+      workers: this._slots.length,
+      busy: this._slots.filter((slot) => slot.task !== null).length,
+      queued: this._queue.length,
+      byNodeType
+    };
+  }
+
+  /**
+   * Run the node `spec` names on `inputs` in a worker. `transfer` lists
+   * buffers in `inputs` to move instead of copy; they are detached on the
+   * caller's side once the task is dispatched. Rejects with
+   * {@link WorkerUnavailableError} when the task could not run in a worker,
+   * or with the node's own error.
+   */
+  run(
+    spec: Pick<WorkerNodeSpec, "module" | "nodeType">,
+    inputs: Record<string, unknown>,
+    transfer: ArrayBuffer[] = []
+  ): Promise<Record<string, unknown>> {
+    if (this._closed) {
+      return Promise.reject(new WorkerUnavailableError("Worker pool is closed"));
+    }
+    return new Promise((resolve, reject) => {
+      this._queue.push({
+        id: this._seq++,
+        spec: { module: spec.module, nodeType: spec.nodeType },
+        inputs,
+        transfer,
+        enqueuedAt: performance.now(),
+        resolve,
+        reject
+      });
+      this._dispatch();
+    });
+  }
+
+  /** Terminate every worker and reject queued and running tasks. */
+  async close(): Promise<void> {
+    this._closed = true;
+    const closed = new WorkerUnavailableError("Worker pool is closed");
+    for (const task of this._queue.splice(0)) task.reject(closed);
+    const slots = this._slots.splice(0);
+    for (const slot of slots) slot.task?.reject(closed);
+    await Promise.all(slots.map((slot) => slot.worker.terminate()));
+  }
+
+  private _statsFor(nodeType: string): WorkerTaskStats {
+    let stats = this._stats.get(nodeType);
+    if (!stats) {
+      stats = { tasks: 0, failed: 0, queueWaitMs: 0, maxQueueWaitMs: 0, runMs: 0 };
+      this._stats.set(nodeType, stats);
+    }
+    return stats;
+  }
+
+  private _dispatch(): void {
+    while (this._queue.length > 0) {
+      const slot = this._freeSlot();
+      if (!slot) return;
+      const task = this._queue.shift()!;
+      const waited = performance.now() - task.enqueuedAt;
+      const stats = this._statsFor(task.spec.nodeType);
+      stats.queueWaitMs += waited;
+      if (waited > stats.maxQueueWaitMs) stats.maxQueueWaitMs = waited;
+      try {
+        slot.worker.postMessage(
+          { id: task.id, spec: task.spec, inputs: task.inputs },
+          task.transfer
+        );
+      } catch (err) {
+        // DataCloneError: the inputs hold something structured clone
+        // cannot carry (functions, class instances with private state).
+        stats.failed++;
+        task.reject(
+          new WorkerUnavailableError(
+            `Inputs of ${task.spec.nodeType} cannot be sent to a worker`,
+            { cause: err }
+          )
+        );
+        continue;
+      }
+      slot.task = task;
+      slot.worker.ref();
+    }
+  }
+
+  private _freeSlot(): Slot | null {
+    for (const slot of this._slots) {
+      if (slot.task === null) return slot;
+    }
+    if (this._slots.length >= this.size) return null;
+    return this._spawn();
+  }
+
+  private _spawn(): Slot | null {
+    const threads = getNodeBuiltinSync<WorkerThreads>("node:worker_threads");
+    if (!threads) {
+      const err = new WorkerUnavailableError(
+        "worker_threads is not available in this runtime"
+      );
+      for (const task of this._queue.splice(0)) task.reject(err);
+      return null;
+    }
+    const worker = new threads.Worker(WORKER_SOURCE, { eval: true });
+    worker.unref();
+    const slot: Slot = { worker, task: null };
+    worker.on("message", (reply: WorkerReply) => this._onReply(slot, reply));
+    worker.on("error", (err) => this._onExit(slot, err));
+    worker.on("exit", (code) =>
+      this._onExit(slot, new Error(`Worker exited with code ${code}`))
+    );
+    this._slots.push(slot);
+    return slot;
+  }
+
+  private _onReply(slot: Slot, reply: WorkerReply): void {
+    const task = slot.task;
+    if (!task || task.id !== reply.id) return;
+    slot.task = null;
+    slot.worker.unref();
+    const stats = this._statsFor(task.spec.nodeType);
+    stats.runMs += reply.runMs;
+    if (reply.ok) {
+      stats.tasks++;
+      task.resolve(reply.outputs);
+    } else {
+      stats.failed++;
+      if (reply.unavailable) {
+        task.reject(
+          new WorkerUnavailableError(
+            `${task.spec.nodeType} cannot run in a worker: ${reply.error.message}`,
+            { cause: reviveError(reply.error) }
+          )
+        );
+      } else {
+        stats.tasks++;
+        task.reject(reviveError(reply.error));
+      }
+    }
+    this._dispatch();
+  }
+
+  /** A worker crashed or exited: fail its task and replace it on demand. */
+  private _onExit(slot: Slot, err: Error): void {
+    const index = this._slots.indexOf(slot);
+    if (index === -1) return;
+    this._slots.splice(index, 1);
+    const task = slot.task;
+    slot.task = null;
+    if (task) {
+      this._statsFor(task.spec.nodeType).failed++;
+      // Stryker disable next-line StringLiteral,ObjectLiteral: diagnostic log args only
+      log.warn("Worker died while running a node", {
+        nodeType: task.spec.nodeType,
+        error: err.message
+      });
+      task.reject(err);
+    }
+    void slot.worker.terminate();
+    this._dispatch();
+  }
+}
+
+/**
+ * A node executor whose `process` runs in a {@link WorkerPool}. Every other
+ * entry point — streaming, live properties, lifecycle hooks — goes to the
+ * wrapped in-process executor.
+ */
+export class WorkerNodeExecutor implements NodeExecutor {
+  readonly worker: WorkerNodeSpec;
+  genProcess?: NodeExecutor["genProcess"];
+  run?: NodeExecutor["run"];
+  applyProperties?: NodeExecutor["applyProperties"];
+  preProcess?: NodeExecutor["preProcess"];
+  finalize?: NodeExecutor["finalize"];
+  initialize?: NodeExecutor["initialize"];
+  emitTriggerEvent?: NodeExecutor["emitTriggerEvent"];
+
+  constructor(
+    private readonly _inner: NodeExecutor,
+    worker: WorkerNodeSpec,
+    private readonly _pool: WorkerPool
+  ) {
+    this.worker = worker;
+    this.genProcess = _inner.genProcess?.bind(_inner);
+    this.run = _inner.run?.bind(_inner);
+    this.applyProperties = _inner.applyProperties?.bind(_inner);
+    this.preProcess = _inner.preProcess?.bind(_inner);
+    this.finalize = _inner.finalize?.bind(_inner);
+    this.initialize = _inner.initialize?.bind(_inner);
+    this.emitTriggerEvent = _inner.emitTriggerEvent?.bind(_inner);
+  }
+
+  async process(
+    inputs: Record<string, unknown>,
+    context?: ProcessingContext
+  ): Promise<Record<string, unknown>> {
+    let prepared = inputs;
+    let transfer: ArrayBuffer[] = [];
+    if (this.worker.prepare) {
+      prepared = await this.worker.prepare(inputs, context);
+      // Only buffers `prepare` allocated are ours to detach.
+      const received = ownedArrayBuffers(inputs);
+      transfer = [...ownedArrayBuffers(prepared)].filter(
+        (buffer) => !received.has(buffer)
+      );
+    }
+    try {
+      return await this._pool.run(this.worker, prepared, transfer);
+    } catch (err) {
+      if (!(err instanceof WorkerUnavailableError)) throw err;
+      // Stryker disable next-line StringLiteral,ObjectLiteral: diagnostic log args only
+      log.debug("Running node in-process", {
+        nodeType: this.worker.nodeType,
+        reason: err.message
+      });
+      return this._inner.process(inputs, context);
+    }
+  }
+}
@@ -0,0 +1,166 @@
+/**
+ * Batched invocation: a buffered node whose executor implements
+ * `processBatch` gets the invocations that are ready together — a ForEach
+ * fan-out queued behind a slow first item — in groups of up to
+ * `maxBatchSize`, and each result still leaves under its own lineage.
+ */
+
+import { describe, it, expect } from "vitest";
+import type { Escalation, NodeDescriptor } from "@nodetool-ai/protocol";
+import { recordInvocationCost } from "@nodetool-ai/runtime";
+import type { NodeExecutor } from "../src/actor.js";
+import type { SupervisorHandle } from "../src/supervisor.js";
+import {
+  runWorkflow,
+  foreachNode,
+  forwardOutput,
+  iterationOutput,
+  dataEdge
+} from "./correlation/_harness.js";
+import { indicesAt, valuesFrom } from "./correlation/_assertions.js";
+
+const ITEMS = ["a", "b", "c", "d", "e", "f"];
+
+function classifier(maxBatchSize: number, failOn?: string) {
+  const groups: number[] = [];
+  const classify = (text: unknown) => {
+    if (text === failOn) throw new Error(`cannot classify ${String(text)}`);
+    return { label: `label(${String(text)})` };
+  };
+  const executor: NodeExecutor = {
+    maxBatchSize,
+    async process(ins) {
+      groups.push(1);
+      // Hold this item so the rest of the fan-out queues up behind it.
+      await new Promise((r) => setTimeout(r, 20));
+      return classify(ins.text);
+    },
+    async processBatch(inputs) {
+      groups.push(inputs.length);
+      return inputs.map((ins) => {
+        try {
+          return { outputs: classify(ins.text) };
+        } catch (error) {
+          return { error: error as Error };
+        }
+      });
+    }
+  };
+  return { executor, groups };
+}
+
+function fanOut(
+  executor: NodeExecutor,
+  opts: { retrySafe?: boolean; supervisor?: SupervisorHandle } = {}
+) {
+  const nodes: NodeDescriptor[] = [
+    {
+      id: "src",
+      type: "nodetool.input.IntegerInput",
+      name: "items",
+      properties: { value: ITEMS }
+    },
+    {
+      id: "fe",
+      type: "nodetool.control.ForEach",
+      is_streaming_output: true,
+      outputs: { output: "any", index: "int" },
+      output_correlation: {
+        output: iterationOutput("items"),
+        index: iterationOutput("items")
+      }
+    },
+    {
+      id: "cls",
+      type: "test.Classifier",
+      retry_safe: opts.retrySafe,
+      outputs: { label: "any" },
+      output_correlation: { label: forwardOutput("text") }
+    },
+    { id: "sink", type: "test.Sink", is_streaming_input: true }
+  ];
+  return runWorkflow({
+    jobId: "batching",
+    nodes,
+    edges: [
+      dataEdge("src", "value", "fe", "input_list", "eSrc"),
+      dataEdge("fe", "output", "cls", "text", "eFe"),
+      dataEdge("cls", "label", "sink", "value", "eCls")
+    ],
+    executors: { fe: foreachNode(), cls: executor },
+    captureFrom: { sink: ["value"] },
+    supervisor: opts.supervisor
+  });
+}
+
+describe("NodeActor — batched invocations", () => {
+  it("groups queued invocations and keeps per-item order and lineage", async () => {
+    const { executor, groups } = classifier(4);
+    const { result, captured } = await fanOut(executor);
+
+    expect(result.status).toBe("completed");
+    expect(groups.reduce((a, b) => a + b, 0)).toBe(ITEMS.length);
+    expect(groups.every((n) => n <= 4)).toBe(true);
+    expect(groups.some((n) => n > 1)).toBe(true);
+
+    const envs = captured.get("sink")!.get("value")!;
+    expect(valuesFrom(envs)).toEqual(ITEMS.map((t) => `label(${t})`));
+    expect(indicesAt(envs, "fe:items")).toEqual([0, 1, 2, 3, 4, 5]);
+    const completes = result.messages.filter(
+      (m) => m.type === "generation_complete" && m.node_id === "cls"
+    );
+    expect(completes).toHaveLength(ITEMS.length);
+  });
+
+  it("runs one invocation at a time when maxBatchSize is below 2", async () => {
+    const { executor, groups } = classifier(1);
+    const { result } = await fanOut(executor);
+
+    expect(result.status).toBe("completed");
+    expect(groups).toEqual(ITEMS.map(() => 1));
+  });
+
+  it("fails only from the item whose batch entry is an error", async () => {
+    const { executor } = classifier(8, "c");
+    const { result, captured } = await fanOut(executor);
+
+    expect(result.status).toBe("failed");
+    expect(result.error).toMatch(/cannot classify c/);
+    // Nothing at or after the failed item leaves the node.
+    const values = valuesFrom(captured.get("sink")!.get("value")!);
+    for (const value of values) {
+      expect(["label(a)", "label(b)"]).toContain(value);
+    }
+  });
+
+  it("does not retry a failed item whose batch spent money", async () => {
+    const { executor } = classifier(8, "c");
+    const processBatch = executor.processBatch!;
+    executor.processBatch = async (inputs, context) => {
+      recordInvocationCost(0.03 * inputs.length);
+      return processBatch(inputs, context);
+    };
+    const retried: unknown[] = [];
+    const process = executor.process;
+    executor.process = async (ins, context) => {
+      if (ins.text === "c") retried.push(ins.text);
+      return process(ins, context);
+    };
+    const seen: Escalation[] = [];
+    const supervisor: SupervisorHandle = {
+      async decide(escalation) {
+        seen.push(escalation);
+        return { verdict: { action: "retry" }, decidedBy: "agent" };
+      },
+      close() {}
+    };
+
+    const { result } = await fanOut(executor, { retrySafe: true, supervisor });
+
+    expect(result.status).toBe("failed");
+    expect(seen).toHaveLength(1);
+    expect(seen[0].spentCostUsd).toBeCloseTo(0.03);
+    expect(seen[0].allowedActions).not.toContain("retry");
+    expect(retried).toEqual([]);
+  });
+});
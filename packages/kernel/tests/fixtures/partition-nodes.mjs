@@ -0,0 +1,44 @@
+// Plain-JS executor module for partitioned-runner tests. Partition processes
+// import this file by URL, outside vitest's transform, so it must not be
+// TypeScript.
+
+export function resolveExecutor(node) {
+  const props = node.properties ?? {};
+  switch (node.type) {
+    case "test.ForEach":
+      return {
+        process: async () => ({}),
+        async *genProcess(inputs) {
+          const list = inputs.input_list ?? [];
+          for (let i = 0; i < list.length; i++) yield { output: list[i] };
+        }
+      };
+    case "test.Square":
+      if (props.fail) {
+        return {
+          process: async () => {
+            throw new Error("boom");
+          }
+        };
+      }
+      return { process: async ({ value }) => ({ value: value * value }) };
+    case "test.Join":
+      return {
+        process: async ({ left, right }) => ({ value: `${left}|${right}` })
+      };
+    case "test.Collect":
+      return {
+        process: async () => ({}),
+        async run(inputs, outputs) {
+          const items = [];
+          for await (const env of inputs.streamWithEnvelope("value")) {
+            items.push({ data: env.data, lineage: env.correlation_lineage });
+          }
+          items.sort((a, b) => String(a.data).localeCompare(String(b.data)));
+          await outputs.emit("output", items);
+        }
+      };
+    default:
+      return { process: async () => ({}) };
+  }
+}
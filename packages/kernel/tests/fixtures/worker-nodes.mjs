@@ -0,0 +1,30 @@
+// Plain-JS node classes for worker-pool tests. Workers import this file
+// directly, outside vitest's transform, so it must not be TypeScript.
+import { threadId } from "node:worker_threads";
+
+const node = (nodeType, process) =>
+  class {
+    static nodeType = nodeType;
+    toExecutor() {
+      return { process };
+    }
+  };
+
+export const DoubleNode = node("test.Double", async (inputs) => {
+  const data = inputs.data;
+  const output = new Uint8Array(data.length);
+  for (let i = 0; i < data.length; i++) output[i] = data[i] * 2;
+  return { output, threadId };
+});
+
+export const TEST_NODES = [
+  node("test.Fail", async () => {
+    throw new Error("boom");
+  }),
+  node("test.Exit", async () => process.exit(3)),
+  node("test.Sleep", async (inputs) => {
+    await new Promise((resolve) => setTimeout(resolve, inputs.ms));
+    return { threadId };
+  }),
+  node("test.Function", async () => ({ output: () => 1 }))
+];
@@ -0,0 +1,231 @@
+/**
+ * Adaptive credit-based flow control.
+ *
+ * Covers:
+ *  - Credits adapting to the consumer's measured service time
+ *  - Queued-bytes cap
+ *  - NodeInbox integration: blocking on credits, keep_latest drops, stalls
+ *  - Runner integration: per-node-type policy and per-edge stats
+ */
+
+import { describe, it, expect, vi, afterEach } from "vitest";
+import {
+  EMPTY_LINEAGE,
+  type Edge,
+  type NodeDescriptor
+} from "@nodetool-ai/protocol";
+import { InboxFlowControl } from "../src/flow-control.js";
+import { NodeInbox } from "../src/inbox.js";
+import { WorkflowRunner } from "../src/runner.js";
+import type { NodeExecutor } from "../src/actor.js";
+
+const sleep = (ms: number) => new Promise((r) => setTimeout(r, ms));
+
+afterEach(() => {
+  vi.restoreAllMocks();
+});
+
+describe("InboxFlowControl", () => {
+  it("sizes credits to the consumer's busy service time", async () => {
+    let clock = 0;
+    vi.spyOn(performance, "now").mockImplementation(() => clock);
+    const flow = new InboxFlowControl("block", {
+      initialCredits: 4,
+      targetQueueMs: 100
+    });
+    const inbox = new NodeInbox(null, { flowControl: flow });
+    await inbox.putMany([1, 2, 3].map((data) => ({ handle: "in", data })));
+    expect(flow.handleStats("in").credits).toBe(4);
+
+    inbox.drainHandle("in"); // idle until now: nothing sampled
+    await inbox.putMany([4, 5].map((data) => ({ handle: "in", data })));
+    inbox.tryPopAny();
+    clock = 50;
+    inbox.tryPopAny(); // one message per 50 ms with a backlog waiting
+
+    expect(flow.handleStats("in")).toMatchObject({ credits: 2, queued: 0 });
+  });
+
+  it("ignores idle gaps between bursts", async () => {
+    let clock = 0;
+    vi.spyOn(performance, "now").mockImplementation(() => clock);
+    const flow = new InboxFlowControl("block", { initialCredits: 8 });
+    const inbox = new NodeInbox(null, { flowControl: flow });
+    await inbox.put("in", 1);
+    inbox.tryPopAny();
+    clock = 10_000;
+    await inbox.put("in", 2);
+    inbox.tryPopAny();
+
+    expect(flow.handleStats("in").credits).toBe(8);
+  });
+
+  it("stops admitting once the queued bytes reach the cap", async () => {
+    const flow = new InboxFlowControl("block", { maxQueuedBytes: 100 });
+    const inbox = new NodeInbox(null, { flowControl: flow });
+    await inbox.put("in", new Uint8Array(100));
+
+    expect(flow.isFull("in")).toBe(true);
+    expect(flow.handleStats("in").queuedBytes).toBe(100);
+    inbox.drainHandle("in");
+    expect(flow.isFull("in")).toBe(false);
+  });
+
+  it("never throttles control events", () => {
+    const flow = new InboxFlowControl("keep_latest", { initialCredits: 1 });
+    const envelope = {
+      data: null,
+      metadata: {},
+      timestamp: 0,
+      event_id: "e",
+      correlation_lineage: EMPTY_LINEAGE,
+      source_edge_id: ""
+    };
+    flow.onEnqueue("__control__", envelope);
+    flow.onEnqueue("__control__", envelope);
+    expect(flow.isFull("__control__")).toBe(false);
+    expect(flow.keepsLatest("__control__")).toBe(false);
+  });
+});
+
+describe("NodeInbox – flow control", () => {
+  it("blocks a producer out of credits and records the stall", async () => {
+    const flow = new InboxFlowControl("block", { initialCredits: 1 });
+    const inbox = new NodeInbox(null, { flowControl: flow });
+    await inbox.put("in", 1, { source_edge_id: "e1" });
+    let delivered = false;
+    const pending = inbox
+      .put("in", 2, { source_edge_id: "e1" })
+      .then(() => (delivered = true));
+    await sleep(5);
+    expect(delivered).toBe(false);
+
+    expect(inbox.tryPopAny()).toEqual(["in", 1]);
+    await pending;
+    expect(flow.edgeStats("e1").stalls).toBe(1);
+    expect(flow.edgeStats("e1").stallMs).toBeGreaterThan(0);
+  });
+
+  it("drops the oldest message under keep_latest", async () => {
+    const flow = new InboxFlowControl("keep_latest", { initialCredits: 2 });
+    const inbox = new NodeInbox(null, { flowControl: flow });
+    await inbox.putMany(
+      [1, 2, 3, 4].map((data) => ({
+        handle: "in",
+        data,
+        source_edge_id: "e1"
+      }))
+    );
+
+    expect(inbox.drainHandle("in").map((e) => e.data)).toEqual([3, 4]);
+    expect(flow.edgeStats("e1")).toMatchObject({ stalls: 0, dropped: 2 });
+    expect(inbox.tryPopAny()).toBeNull();
+  });
+});
+
+describe("WorkflowRunner – flowControl", () => {
+  const nodes: NodeDescriptor[] = [
+    { id: "trig", type: "test.Input", name: "trig" },
+    { id: "producer", type: "test.Streamer", is_streaming_output: true },
+    { id: "tts", type: "test.Slow" },
+    { id: "preview", type: "test.Preview", is_streaming_input: true }
+  ];
+  const edges: Edge[] = [
+    {
+      id: "e-trig",
+      source: "trig",
+      sourceHandle: "value",
+      target: "producer",
+      targetHandle: "start"
+    },
+    {
+      id: "e-tts",
+      source: "producer",
+      sourceHandle: "value",
+      target: "tts",
+      targetHandle: "value"
+    },
+    {
+      id: "e-preview",
+      source: "producer",
+      sourceHandle: "value",
+      target: "preview",
+      targetHandle: "value"
+    }
+  ];
+
+  function runner(seen: number[], spoken: number[]) {
+    return new WorkflowRunner("job-flow", {
+      flowControl: {
+        initialCredits: 2,
+        maxCredits: 2,
+        policies: { "test.Preview": "keep_latest" }
+      },
+      resolveExecutor: (node) => {
+        if (node.id === "producer") {
+          return {
+            async *genProcess() {
+              for (let i = 0; i < 8; i++) yield { value: i };
+            },
+            process: async () => ({})
+          } as unknown as NodeExecutor;
+        }
+        if (node.id === "tts") {
+          return {
+            async process(inputs: Record<string, unknown>) {
+              await sleep(5);
+              spoken.push(inputs.value as number);
+              return {};
+            }
+          };
+        }
+        if (node.id === "preview") {
+          return {
+            async process() {
+              return {};
+            },
+            async run(inputs: { stream(h: string): AsyncIterable<unknown> }) {
+              await sleep(100);
+              for await (const v of inputs.stream("value")) {
+                seen.push(v as number);
+              }
+            }
+          } as unknown as NodeExecutor;
+        }
+        return { process: async (i: Record<string, unknown>) => i };
+      }
+    });
+  }
+
+  it("blocks on one edge and keeps the latest on another", async () => {
+    const seen: number[] = [];
+    const spoken: number[] = [];
+    const result = await runner(seen, spoken).run(
+      { job_id: "job-flow", params: { trig: 0 } },
+      { nodes, edges }
+    );
+
+    expect(result.status).toBe("completed");
+    expect(spoken).toEqual([0, 1, 2, 3, 4, 5, 6, 7]);
+    // The preview only woke after the producer finished: it sees the newest two.
+    expect(seen).toEqual([6, 7]);
+
+    const stats = result.flowControl!;
+    const edge = (id: string) => stats.find((e) => e.edgeId === id)!;
+    expect(edge("e-tts")).toMatchObject({ policy: "block", dropped: 0 });
+    expect(edge("e-tts").stalls).toBeGreaterThan(0);
+    expect(edge("e-preview")).toMatchObject({
+      policy: "keep_latest",
+      stalls: 0,
+      dropped: 6
+    });
+  });
+
+  it("reports nothing when off", async () => {
+    const result = await new WorkflowRunner("job-flow", {
+      resolveExecutor: () => ({ process: async () => ({}) })
+    }).run({ job_id: "job-flow", params: { trig: 0 } }, { nodes, edges });
+
+    expect(result.flowControl).toBeUndefined();
+  });
+});
@@ -0,0 +1,187 @@
+/**
+ * Compiled-graph cache.
+ *
+ * Covers:
+ *  - Key stability and versioning
+ *  - LRU eviction and counters
+ *  - Runner integration: repeated runs skip preparation, invalid graphs are
+ *    never cached
+ */
+
+import { describe, it, expect } from "vitest";
+import type { NodeDescriptor } from "@nodetool-ai/protocol";
+import { CompiledGraph, CompiledGraphCache } from "../src/graph-cache.js";
+import { Graph } from "../src/graph.js";
+import { analyzeCorrelation } from "../src/correlation-analysis.js";
+import { WorkflowRunner } from "../src/runner.js";
+import type { NodeExecutor } from "../src/actor.js";
+
+const nodes: NodeDescriptor[] = [
+  { id: "a", type: "test.Source", properties: { value: 1 } },
+  { id: "b", type: "test.Sink" }
+];
+const edges = [
+  { source: "a", sourceHandle: "output", target: "b", targetHandle: "in" }
+];
+
+function compiled(compileMs = 5): CompiledGraph {
+  const graph = new Graph({ nodes, edges });
+  return new CompiledGraph(
+    graph,
+    analyzeCorrelation({ nodes: graph.nodes, edges: graph.edges }),
+    new Map(),
+    compileMs
+  );
+}
+
+describe("CompiledGraphCache", () => {
+  it("keys by content, not key order or identity", () => {
+    const cache = new CompiledGraphCache();
+    const reordered = {
+      nodes: [
+        { properties: { value: 1 }, type: "test.Source", id: "a" },
+        { type: "test.Sink", id: "b" }
+      ],
+      edges: structuredClone(edges)
+    };
+    expect(cache.keyFor({ nodes, edges })).toBe(cache.keyFor(reordered));
+    expect(
+      cache.keyFor({
+        nodes: [{ ...nodes[0], properties: { value: 2 } }, nodes[1]],
+        edges
+      })
+    ).not.toBe(cache.keyFor({ nodes, edges }));
+  });
+
+  it("folds the version into the key", () => {
+    let revision = 1;
+    const cache = new CompiledGraphCache({ version: () => revision });
+    const before = cache.keyFor({ nodes, edges });
+    revision = 2;
+    expect(cache.keyFor({ nodes, edges })).not.toBe(before);
+  });
+
+  it("evicts the least recently used graph", () => {
+    const cache = new CompiledGraphCache({ maxEntries: 2 });
+    cache.set("a", compiled());
+    cache.set("b", compiled());
+    cache.get("a");
+    cache.set("c", compiled());
+
+    expect(cache.get("b")).toBeUndefined();
+    expect(cache.get("a")).toBeDefined();
+    expect(cache.stats).toMatchObject({ size: 2, evictions: 1 });
+  });
+
+  it("counts compile time net of lookup as saved", () => {
+    const cache = new CompiledGraphCache();
+    cache.set("a", compiled(10));
+    cache.get("a", 3);
+    cache.get("missing");
+    expect(cache.stats).toMatchObject({ hits: 1, misses: 1, savedMs: 7 });
+  });
+
+  it("computes critical-path lengths once", () => {
+    const entry = compiled();
+    expect(entry.criticalPath).toBe(entry.criticalPath);
+    expect(Object.fromEntries(entry.criticalPath)).toEqual({ a: 2, b: 1 });
+  });
+
+  it("rejects a size below one", () => {
+    expect(() => new CompiledGraphCache({ maxEntries: 0 })).toThrow(
+      /at least 1/
+    );
+  });
+});
+
+describe("WorkflowRunner – graphCache", () => {
+  function setup(issues: { property: string; message: string }[] = []) {
+    let validations = 0;
+    const seen: unknown[] = [];
+    const resolveExecutor = (node: NodeDescriptor): NodeExecutor => ({
+      async process(inputs) {
+        if (node.id === "a") return { output: node.properties?.value };
+        seen.push(inputs.in);
+        return {};
+      }
+    });
+    const validateNode = () => {
+      validations++;
+      return issues;
+    };
+    return {
+      seen,
+      resolveExecutor,
+      validateNode,
+      validations: () => validations
+    };
+  }
+
+  it("prepares an unchanged graph once", async () => {
+    const cache = new CompiledGraphCache();
+    const t = setup();
+    const run = (id: string) =>
+      new WorkflowRunner(id, {
+        resolveExecutor: t.resolveExecutor,
+        validateNode: t.validateNode,
+        graphCache: cache
+      }).run({ job_id: id }, { nodes, edges });
+
+    const first = await run("r1");
+    const second = await run("r2");
+
+    expect(first.status).toBe("completed");
+    expect(second.status).toBe("completed");
+    expect(t.seen).toEqual([1, 1]);
+    // Two nodes validated on the first run only.
+    expect(t.validations()).toBe(2);
+    expect(first.graphCache).toMatchObject({ hit: false, savedMs: 0 });
+    expect(second.graphCache?.hit).toBe(true);
+    expect(cache.stats).toMatchObject({ size: 1, hits: 1, misses: 1 });
+  });
+
+  it("re-prepares a changed graph", async () => {
+    const cache = new CompiledGraphCache();
+    const t = setup();
+    const run = (graphNodes: NodeDescriptor[]) =>
+      new WorkflowRunner("job", {
+        resolveExecutor: t.resolveExecutor,
+        graphCache: cache
+      }).run({ job_id: "job" }, { nodes: graphNodes, edges });
+
+    await run(nodes);
+    const changed = await run([
+      { ...nodes[0], properties: { value: 2 } },
+      nodes[1]
+    ]);
+
+    expect(changed.graphCache?.hit).toBe(false);
+    expect(t.seen).toEqual([1, 2]);
+    expect(cache.stats.size).toBe(2);
+  });
+
+  it("never caches a graph that fails validation", async () => {
+    const cache = new CompiledGraphCache();
+    const t = setup([{ property: "value", message: "required" }]);
+    const run = () =>
+      new WorkflowRunner("bad", {
+        resolveExecutor: t.resolveExecutor,
+        validateNode: t.validateNode,
+        graphCache: cache
+      }).run({ job_id: "bad" }, { nodes, edges });
+
+    expect((await run()).status).toBe("failed");
+    expect((await run()).status).toBe("failed");
+    expect(t.validations()).toBe(4);
+    expect(cache.stats.size).toBe(0);
+  });
+
+  it("reports nothing without a cache", async () => {
+    const t = setup();
+    const result = await new WorkflowRunner("plain", {
+      resolveExecutor: t.resolveExecutor
+    }).run({ job_id: "plain" }, { nodes, edges });
+
+    expect(result.graphCache).toBeUndefined();
+  });
+});
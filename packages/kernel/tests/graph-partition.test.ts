@@ -0,0 +1,143 @@
+/**
+ * Graph partitioning for multi-process runs.
+ *
+ * Covers:
+ *  - Strategies: component, pack, pinned
+ *  - Control edges and variable channels never cut
+ *  - Stand-ins: remote targets and remote ancestors, no properties
+ *  - Pin validation
+ */
+
+import { describe, it, expect } from "vitest";
+import type { Edge, NodeDescriptor } from "@nodetool-ai/protocol";
+import {
+  partitionGraph,
+  REMOTE_NODE_TYPE
+} from "../src/graph-partition.js";
+import { GraphValidationError } from "../src/graph.js";
+
+const edge = (source: string, target: string, extra: Partial<Edge> = {}) => ({
+  id: `${source}->${target}`,
+  source,
+  sourceHandle: "value",
+  target,
+  targetHandle: "value",
+  ...extra
+});
+
+const node = (id: string, type = "test.Node", extra = {}): NodeDescriptor => ({
+  id,
+  type,
+  ...extra
+});
+
+describe("partitionGraph", () => {
+  it("keeps connected components whole and balances them", () => {
+    const plan = partitionGraph(
+      {
+        nodes: ["a1", "a2", "a3", "b1", "b2", "c1"].map((id) => node(id)),
+        edges: [edge("a1", "a2"), edge("a2", "a3"), edge("b1", "b2")]
+      },
+      { partitions: 2 }
+    );
+
+    expect(plan.crossEdges).toEqual([]);
+    expect(plan.partitions.map((p) => p.nodeIds)).toEqual([
+      ["a1", "a2", "a3"],
+      ["b1", "b2", "c1"]
+    ]);
+    expect(plan.partitions[0].graph.nodes.map((n) => n.type)).not.toContain(
+      REMOTE_NODE_TYPE
+    );
+  });
+
+  it("skips empty partitions", () => {
+    const plan = partitionGraph(
+      { nodes: [node("a"), node("b")], edges: [edge("a", "b")] },
+      { partitions: 4 }
+    );
+    expect(plan.partitions.map((p) => p.index)).toEqual([0]);
+  });
+
+  it("groups nodes by pack", () => {
+    const plan = partitionGraph(
+      {
+        nodes: [
+          node("a", "lib.image.Resize"),
+          node("b", "lib.text.Split"),
+          node("c", "lib.image.Crop")
+        ],
+        edges: [edge("a", "b"), edge("b", "c")]
+      },
+      { partitions: 2, strategy: "pack" }
+    );
+
+    expect(plan.owners.get("a")).toBe(plan.owners.get("c"));
+    expect(plan.owners.get("b")).not.toBe(plan.owners.get("a"));
+    expect(plan.crossEdges.map((e) => e.id)).toEqual(["a->b", "b->c"]);
+  });
+
+  it("adds stand-ins for remote targets and every remote ancestor", () => {
+    const plan = partitionGraph(
+      {
+        nodes: [
+          node("src", "test.Source", { name: "src", properties: { x: 1 } }),
+          node("fe"),
+          node("work"),
+          node("sink")
+        ],
+        edges: [edge("src", "fe"), edge("fe", "work"), edge("work", "sink")]
+      },
+      { partitions: 2, strategy: "pinned", pins: { src: 0, fe: 0, work: 1, sink: 0 } }
+    );
+
+    const [first, second] = plan.partitions;
+    expect(first.remoteOwners).toEqual({ work: 1 });
+    expect(first.graph.edges).toHaveLength(3);
+    expect(second.remoteOwners).toEqual({ src: 0, fe: 0, sink: 0 });
+    const src = second.graph.nodes.find((n) => n.id === "src")!;
+    expect(src).toEqual({ id: "src", type: REMOTE_NODE_TYPE, properties: {} });
+  });
+
+  it("never cuts control edges or variable channels", () => {
+    const plan = partitionGraph(
+      {
+        nodes: [
+          node("agent"),
+          node("tool"),
+          node("set", "nodetool.variable.SetVariable", {
+            properties: { name: "v" }
+          }),
+          node("get", "nodetool.variable.GetVariable", {
+            properties: { name: "v" }
+          })
+        ],
+        edges: [edge("agent", "tool", { edge_type: "control" })]
+      },
+      { partitions: 4 }
+    );
+
+    expect(plan.owners.get("agent")).toBe(plan.owners.get("tool"));
+    expect(plan.owners.get("set")).toBe(plan.owners.get("get"));
+  });
+
+  it("rejects pins that split nodes that must run together", () => {
+    const data = {
+      nodes: [node("agent"), node("tool")],
+      edges: [edge("agent", "tool", { edge_type: "control" })]
+    };
+    expect(() =>
+      partitionGraph(data, {
+        partitions: 2,
+        strategy: "pinned",
+        pins: { agent: 0, tool: 1 }
+      })
+    ).toThrow(GraphValidationError);
+    expect(() =>
+      partitionGraph(data, { partitions: 2, strategy: "pinned", pins: { agent: 2 } })
+    ).toThrow(/outside 0..1/);
+    expect(() => partitionGraph(data, { partitions: 0 })).toThrow(
+      GraphValidationError
+    );
+  });
+});
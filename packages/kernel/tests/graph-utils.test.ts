@@ -7,7 +7,8 @@ import { Graph } from "../src/graph.js";
 import {
   findNodeOrThrow,
   getNodeInputTypes,
-  getDownstreamSubgraph
+  getDownstreamSubgraph,
+  pruneGraphToTargets
 } from "../src/graph-utils.js";
 import type { NodeDescriptor, Edge } from "@nodetool-ai/protocol";
 
@@ -224,3 +225,80 @@ describe("getDownstreamSubgraph", () => {
     expect(result.edges).toHaveLength(1);
   });
 });
+
+describe("pruneGraphToTargets", () => {
+  //  A --> B --> C
+  //  A --> D (side branch)
+  //  E --control--> B
+  const nodes: NodeDescriptor[] = [
+    { id: "A", type: "t" },
+    { id: "B", type: "t" },
+    { id: "C", type: "t" },
+    { id: "D", type: "t" },
+    { id: "E", type: "t" }
+  ];
+  const edges: Edge[] = [
+    { source: "A", sourceHandle: "out", target: "B", targetHandle: "in" },
+    { source: "B", sourceHandle: "out", target: "C", targetHandle: "in" },
+    { source: "A", sourceHandle: "out", target: "D", targetHandle: "in" },
+    {
+      source: "E",
+      sourceHandle: "__control__",
+      target: "B",
+      targetHandle: "__control__",
+      edge_type: "control"
+    }
+  ];
+
+  it("keeps the targets and their data and control ancestors", () => {
+    const pruned = pruneGraphToTargets({ nodes, edges }, ["B"]);
+    expect(pruned.nodes.map((n) => n.id).sort()).toEqual(["A", "B", "E"]);
+    expect(pruned.edges).toHaveLength(2);
+  });
+
+  it("returns the graph itself when every node is needed", () => {
+    const graph = { nodes: nodes.slice(0, 3), edges: edges.slice(0, 2) };
+    expect(pruneGraphToTargets(graph, ["C"])).toBe(graph);
+  });
+
+  it("keeps the writers of a variable a kept reader reads", () => {
+    const pruned = pruneGraphToTargets(
+      {
+        nodes: [
+          { id: "src", type: "t" },
+          {
+            id: "set",
+            type: "nodetool.variable.SetVariable",
+            properties: { name: "v" }
+          },
+          {
+            id: "other",
+            type: "nodetool.variable.SetVariable",
+            properties: { name: "w" }
+          },
+          {
+            id: "get",
+            type: "nodetool.variable.GetVariable",
+            properties: { name: "v" }
+          }
+        ],
+        edges: [
+          {
+            source: "src",
+            sourceHandle: "out",
+            target: "set",
+            targetHandle: "value"
+          }
+        ]
+      },
+      ["get"]
+    );
+    expect(pruned.nodes.map((n) => n.id).sort()).toEqual(["get", "set", "src"]);
+  });
+
+  it("rejects an unknown target", () => {
+    expect(() => pruneGraphToTargets({ nodes, edges }, ["B", "nope"])).toThrow(
+      /Unknown target node\(s\): nope/
+    );
+  });
+});
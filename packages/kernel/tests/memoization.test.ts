@@ -0,0 +1,233 @@
+/**
+ * Content-addressed node result memoization, end to end through the runner.
+ *
+ * Two runs share one ProcessingContext (and so one cache). The second run
+ * must serve unchanged pure nodes from the cache and execute only the nodes
+ * whose input hashes changed.
+ */
+
+import { describe, it, expect } from "vitest";
+import { ProcessingContext } from "@nodetool-ai/runtime";
+import type { Edge, NodeDescriptor, NodeUpdate } from "@nodetool-ai/protocol";
+import { WorkflowRunner, type RunResult } from "../src/runner.js";
+import type { NodeExecutor } from "../src/actor.js";
+import type { MemoizationOptions } from "../src/memoization.js";
+import { contentHash } from "../src/content-hash.js";
+import { Graph } from "../src/graph.js";
+
+/** input → a (pure) → b (pure) → out, plus a side branch input → c → out2. */
+function graph(opts: { cRetrySafe?: boolean; aPure?: boolean } = {}): {
+  nodes: NodeDescriptor[];
+  edges: Edge[];
+} {
+  return {
+    nodes: [
+      { id: "input", type: "test.Input", name: "x" },
+      { id: "a", type: "test.Upper", is_pure: opts.aPure ?? true },
+      { id: "b", type: "test.Suffix", is_pure: true, properties: { s: "!" } },
+      { id: "c", type: "test.Len", retry_safe: opts.cRetrySafe ?? false },
+      { id: "out", type: "test.Output", name: "result" },
+      { id: "out2", type: "test.Output", name: "length" }
+    ],
+    edges: [
+      { source: "input", sourceHandle: "value", target: "a", targetHandle: "text" },
+      { source: "a", sourceHandle: "output", target: "b", targetHandle: "text" },
+      { source: "b", sourceHandle: "output", target: "out", targetHandle: "value" },
+      { source: "input", sourceHandle: "value", target: "c", targetHandle: "text" },
+      { source: "c", sourceHandle: "output", target: "out2", targetHandle: "value" }
+    ]
+  };
+}
+
+function countingExecutors(calls: Record<string, number>) {
+  const count = (id: string) => {
+    calls[id] = (calls[id] ?? 0) + 1;
+  };
+  const executors: Record<string, NodeExecutor> = {
+    a: {
+      async process(ins) {
+        count("a");
+        return { output: String(ins.text).toUpperCase() };
+      }
+    },
+    b: {
+      async process(ins) {
+        count("b");
+        return { output: `${ins.text}${ins.s}` };
+      }
+    },
+    c: {
+      async process(ins) {
+        count("c");
+        return { output: String(ins.text).length };
+      }
+    }
+  };
+  return executors;
+}
+
+async function run(
+  context: ProcessingContext,
+  calls: Record<string, number>,
+  params: Record<string, unknown>,
+  g = graph(),
+  memoize: MemoizationOptions | undefined = {}
+): Promise<RunResult> {
+  const executors = countingExecutors(calls);
+  const runner = new WorkflowRunner("memo-test", {
+    resolveExecutor: (node) =>
+      executors[node.id] ?? {
+        async process(ins) {
+          return ins;
+        }
+      },
+    executionContext: context,
+    memoize
+  });
+  return runner.run({ job_id: "memo-test", params }, g as never);
+}
+
+describe("WorkflowRunner – memoization", () => {
+  it("serves unchanged pure nodes from the cache on a re-run", async () => {
+    const context = new ProcessingContext({ jobId: "memo" });
+    const calls: Record<string, number> = {};
+
+    const first = await run(context, calls, { x: "hi" });
+    expect(first.status).toBe("completed");
+    expect(first.outputs.result).toEqual(["HI!"]);
+    expect(first.memoization).toEqual({ hits: 0, misses: 2 });
+
+    const second = await run(context, calls, { x: "hi" });
+    expect(second.outputs.result).toEqual(["HI!"]);
+    expect(second.memoization).toEqual({ hits: 2, misses: 0 });
+    expect(calls.a).toBe(1);
+    expect(calls.b).toBe(1);
+    // c is neither pure nor opted in: it runs every time.
+    expect(calls.c).toBe(2);
+  });
+
+  it("re-executes only the cone downstream of a changed input", async () => {
+    const context = new ProcessingContext({ jobId: "memo" });
+    const calls: Record<string, number> = {};
+    await run(context, calls, { x: "hi" });
+
+    // A different input to `a` that still produces the same value for `b`
+    // is served downstream of the edit: `b` sees the same input hash.
+    const result = await run(context, calls, { x: "HI" });
+    expect(result.outputs.result).toEqual(["HI!"]);
+    expect(calls.a).toBe(2);
+    expect(calls.b).toBe(1);
+    expect(result.memoization).toEqual({ hits: 1, misses: 1 });
+  });
+
+  it("keys on node properties as well as edge inputs", async () => {
+    const context = new ProcessingContext({ jobId: "memo" });
+    const calls: Record<string, number> = {};
+    await run(context, calls, { x: "hi" });
+
+    const edited = graph();
+    edited.nodes[2] = { ...edited.nodes[2], properties: { s: "?" } };
+    const result = await run(context, calls, { x: "hi" }, edited);
+    expect(result.outputs.result).toEqual(["HI?"]);
+    expect(calls.a).toBe(1);
+    expect(calls.b).toBe(2);
+  });
+
+  it("memoizes retry-safe nodes only when opted in", async () => {
+    const context = new ProcessingContext({ jobId: "memo" });
+    const calls: Record<string, number> = {};
+    const g = graph({ cRetrySafe: true });
+    await run(context, calls, { x: "hi" }, g);
+    await run(context, calls, { x: "hi" }, g);
+    expect(calls.c).toBe(2);
+
+    await run(context, calls, { x: "hi" }, g, { includeRetrySafe: true });
+    await run(context, calls, { x: "hi" }, g, { includeRetrySafe: true });
+    expect(calls.c).toBe(3);
+  });
+
+  it("emits a cached node status for a replayed invocation", async () => {
+    const context = new ProcessingContext({ jobId: "memo" });
+    const calls: Record<string, number> = {};
+    await run(context, calls, { x: "hi" });
+    const result = await run(context, calls, { x: "hi" });
+    const cached = result.messages.filter(
+      (m) => m.type === "node_update" && (m as NodeUpdate).status === "cached"
+    ) as NodeUpdate[];
+    expect(cached.map((m) => m.node_id).sort()).toEqual(["a", "b"]);
+    // A replay is not a new generation.
+    expect(
+      result.messages.some(
+        (m) =>
+          m.type === "generation_complete" &&
+          (m as { node_id: string }).node_id === "a"
+      )
+    ).toBe(false);
+  });
+
+  it("is off unless requested", async () => {
+    const context = new ProcessingContext({ jobId: "memo" });
+    const calls: Record<string, number> = {};
+    const first = await run(context, calls, { x: "hi" }, graph(), undefined);
+    await run(context, calls, { x: "hi" }, graph(), undefined);
+    expect(calls.a).toBe(2);
+    expect(first.memoization).toBeUndefined();
+  });
+
+  it("does not cache a failed invocation", async () => {
+    const context = new ProcessingContext({ jobId: "memo" });
+    let attempts = 0;
+    const runner = () =>
+      new WorkflowRunner("memo-test", {
+        resolveExecutor: (node) =>
+          node.id === "a"
+            ? {
+                async process() {
+                  attempts++;
+                  throw new Error("boom");
+                }
+              }
+            : {
+                async process(ins) {
+                  return ins;
+                }
+              },
+        executionContext: context,
+        memoize: {}
+      });
+    const g = graph();
+    await runner().run({ job_id: "j", params: { x: "hi" } }, g as never);
+    await runner().run({ job_id: "j", params: { x: "hi" } }, g as never);
+    expect(attempts).toBe(2);
+  });
+});
+
+describe("contentHash", () => {
+  it("ignores object key order and hashes bytes by content", () => {
+    expect(contentHash({ a: 1, b: [2, "x"] })).toBe(
+      contentHash({ b: [2, "x"], a: 1 })
+    );
+    expect(contentHash({ data: new Uint8Array([1, 2, 3]) })).toBe(
+      contentHash({ data: new Uint8Array([1, 2, 3]) })
+    );
+    expect(contentHash(new Uint8Array([1, 2, 3]))).not.toBe(
+      contentHash(new Uint8Array([1, 2, 4]))
+    );
+    expect(contentHash("1")).not.toBe(contentHash(1));
+  });
+});
+
+describe("graph hydration — purity comes from the registry", () => {
+  it("ignores a saved is_pure the registry never declared", async () => {
+    const loaded = await Graph.loadFromDict(
+      { nodes: [{ id: "n1", type: "test.Writer", is_pure: true }], edges: [] },
+      {
+        resolver: async () => ({
+          nodeType: "test.Writer",
+          descriptorDefaults: {}
+        })
+      }
+    );
+    expect(loaded.nodes[0].is_pure).toBe(false);
+  });
+});
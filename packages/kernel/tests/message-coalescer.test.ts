@@ -0,0 +1,296 @@
+/**
+ * MessageCoalescer tests.
+ *
+ * Covers:
+ *  - Latest-wins streams (node_progress, edge_update, replace outputs)
+ *  - Text concatenation for text chunk values and chunk messages; plain
+ *    appended strings delivered one by one
+ *  - Barrier flushing and ordering around non-coalesced messages
+ *  - Timer-driven flush
+ *  - Runner integration via `coalesceMessages`
+ */
+
+import { afterEach, describe, expect, it, vi } from "vitest";
+import type { NodeDescriptor, ProcessingMessage } from "@nodetool-ai/protocol";
+import { MessageCoalescer } from "../src/message-coalescer.js";
+import { WorkflowRunner } from "../src/runner.js";
+
+function collector(): {
+  out: ProcessingMessage[];
+  coalescer: MessageCoalescer;
+} {
+  const out: ProcessingMessage[] = [];
+  const coalescer = new MessageCoalescer((msg) => out.push(msg), {
+    intervalMs: 10_000
+  });
+  return { out, coalescer };
+}
+
+function progress(node: string, value: number, chunk?: string) {
+  return {
+    type: "node_progress",
+    node_id: node,
+    progress: value,
+    total: 100,
+    ...(chunk === undefined ? {} : { chunk })
+  } as ProcessingMessage;
+}
+
+function output(node: string, value: unknown, disposition = "append") {
+  return {
+    type: "output_update",
+    node_id: node,
+    node_name: node,
+    output_name: "output",
+    value,
+    output_type: "str",
+    metadata: {},
+    disposition
+  } as ProcessingMessage;
+}
+
+/** One piece of streamed text, as an LLM node appends it. */
+function text(content: string) {
+  return { type: "chunk", content };
+}
+
+function nodeUpdate(node: string, status: string) {
+  return {
+    type: "node_update",
+    node_id: node,
+    node_name: node,
+    node_type: "test.Node",
+    status
+  } as ProcessingMessage;
+}
+
+afterEach(() => {
+  vi.useRealTimers();
+});
+
+describe("MessageCoalescer – latest wins", () => {
+  it("keeps only the last node_progress per node", () => {
+    const { out, coalescer } = collector();
+    for (let i = 1; i <= 50; i++) coalescer.push(progress("a", i));
+    coalescer.push(progress("b", 7));
+    coalescer.flush();
+
+    expect(out).toHaveLength(2);
+    expect(out[0]).toMatchObject({ node_id: "a", progress: 50 });
+    expect(out[1]).toMatchObject({ node_id: "b", progress: 7 });
+  });
+
+  it("concatenates progress chunks while taking the latest counter", () => {
+    const { out, coalescer } = collector();
+    coalescer.push(progress("a", 1, "foo"));
+    coalescer.push(progress("a", 2, "bar"));
+    coalescer.flush();
+
+    expect(out).toHaveLength(1);
+    expect(out[0]).toMatchObject({ progress: 2, chunk: "foobar" });
+  });
+
+  it("keeps only the last edge_update per edge", () => {
+    const { out, coalescer } = collector();
+    for (let i = 1; i <= 5; i++) {
+      coalescer.push({
+        type: "edge_update",
+        workflow_id: "wf",
+        edge_id: "e1",
+        status: "active",
+        counter: i
+      } as ProcessingMessage);
+    }
+    coalescer.flush();
+
+    expect(out).toHaveLength(1);
+    expect(out[0]).toMatchObject({ edge_id: "e1", counter: 5 });
+  });
+
+  it("keeps only the last replace-disposition output", () => {
+    const { out, coalescer } = collector();
+    coalescer.push(output("a", { frame: 1 }, "replace"));
+    coalescer.push(output("a", { frame: 2 }, "replace"));
+    coalescer.flush();
+
+    expect(out).toHaveLength(1);
+    expect(out[0]).toMatchObject({ value: { frame: 2 } });
+  });
+});
+
+describe("MessageCoalescer – text streams", () => {
+  it("delivers appended string outputs one by one", () => {
+    const { out, coalescer } = collector();
+    for (const row of ["apple", "pear", "plum"]) {
+      coalescer.push(output("foreach", row));
+    }
+    coalescer.flush();
+
+    // Each string is one result item on the client, not a token.
+    expect(out.map((m) => (m as { value: unknown }).value)).toEqual([
+      "apple",
+      "pear",
+      "plum"
+    ]);
+  });
+
+  it("concatenates text chunk values and keeps the last flags", () => {
+    const { out, coalescer } = collector();
+    coalescer.push(output("llm", { type: "chunk", content: "a", done: false }));
+    coalescer.push(output("llm", { type: "chunk", content: "b", done: true }));
+    coalescer.push(output("llm", { type: "chunk", content: "c", done: false }));
+    coalescer.flush();
+
+    // "c" follows a done chunk, so it starts a new stream.
+    expect(out.map((m) => (m as { value: unknown }).value)).toEqual([
+      { type: "chunk", content: "ab", done: true },
+      { type: "chunk", content: "c", done: false }
+    ]);
+  });
+
+  it("delivers non-text appended values one by one", () => {
+    const { out, coalescer } = collector();
+    coalescer.push(output("img", { type: "image", uri: "a.png" }));
+    coalescer.push(output("img", { type: "image", uri: "b.png" }));
+    coalescer.flush();
+
+    expect(out).toHaveLength(2);
+  });
+
+  it("merges chunk messages only within the same thinking mode", () => {
+    const { out, coalescer } = collector();
+    const chunk = (content: string, thinking: boolean) =>
+      ({
+        type: "chunk",
+        node_id: "llm",
+        thread_id: "t1",
+        content,
+        content_type: "text",
+        thinking,
+        done: false
+      }) as ProcessingMessage;
+    coalescer.push(chunk("think ", true));
+    coalescer.push(chunk("more", true));
+    coalescer.push(chunk("answer", false));
+    coalescer.push(chunk("!", false));
+    coalescer.flush();
+
+    expect(out.map((m) => (m as { content: string }).content)).toEqual([
+      "think more",
+      "answer!"
+    ]);
+  });
+});
+
+describe("MessageCoalescer – barriers", () => {
+  it("flushes pending messages before a non-coalesced message", () => {
+    const { out, coalescer } = collector();
+    coalescer.push(nodeUpdate("llm", "running"));
+    coalescer.push(output("llm", text("a")));
+    coalescer.push(progress("llm", 1));
+    coalescer.push(output("llm", text("b")));
+    coalescer.push(nodeUpdate("llm", "completed"));
+
+    expect(out.map((m) => m.type)).toEqual([
+      "node_update",
+      "output_update",
+      "node_progress",
+      "node_update"
+    ]);
+    expect(out[1]).toMatchObject({ value: { content: "ab" } });
+  });
+
+  it("does not merge across a barrier", () => {
+    const { out, coalescer } = collector();
+    coalescer.push(output("llm", text("a")));
+    coalescer.push(nodeUpdate("other", "running"));
+    coalescer.push(output("llm", text("b")));
+    coalescer.flush();
+
+    expect(out.map((m) => m.type)).toEqual([
+      "output_update",
+      "node_update",
+      "output_update"
+    ]);
+  });
+
+  it("counts received and delivered messages", () => {
+    const { coalescer } = collector();
+    for (let i = 0; i < 10; i++) coalescer.push(output("llm", text("x")));
+    coalescer.push(nodeUpdate("llm", "completed"));
+
+    expect(coalescer.stats).toEqual({ received: 11, delivered: 2 });
+  });
+});
+
+describe("MessageCoalescer – timer", () => {
+  it("flushes pending messages after the interval", () => {
+    vi.useFakeTimers();
+    const out: ProcessingMessage[] = [];
+    const coalescer = new MessageCoalescer((msg) => out.push(msg), {
+      intervalMs: 20
+    });
+    coalescer.push(output("llm", text("a")));
+    coalescer.push(output("llm", text("b")));
+    expect(out).toHaveLength(0);
+
+    vi.advanceTimersByTime(20);
+    expect(out).toHaveLength(1);
+    expect(out[0]).toMatchObject({ value: { content: "ab" } });
+
+    coalescer.push(output("llm", text("c")));
+    vi.advanceTimersByTime(20);
+    expect(out).toHaveLength(2);
+  });
+});
+
+describe("WorkflowRunner – coalesceMessages", () => {
+  const nodes: NodeDescriptor[] = [
+    { id: "llm", type: "test.Tokens", is_streaming_output: true }
+  ];
+  const tokens = Array.from({ length: 200 }, (_, i) => `t${i} `);
+  const resolveExecutor = () => ({
+    async process() {
+      return {};
+    },
+    async *genProcess() {
+      for (const token of tokens) {
+        yield { output: { type: "chunk", content: token } };
+      }
+    }
+  });
+
+  it("delivers fewer messages with the same rendered text", async () => {
+    const plain = new WorkflowRunner("job-plain", { resolveExecutor });
+    const plainResult = await plain.run(
+      { job_id: "job-plain" },
+      { nodes, edges: [] }
+    );
+
+    const coalesced = new WorkflowRunner("job-coalesced", {
+      resolveExecutor,
+      coalesceMessages: { intervalMs: 10_000 }
+    });
+    const coalescedResult = await coalesced.run(
+      { job_id: "job-coalesced" },
+      { nodes, edges: [] }
+    );
+
+    const rendered = (messages: ProcessingMessage[]) =>
+      messages
+        .filter((m) => m.type === "output_update")
+        .map((m) => (m as { value: { content: string } }).value.content)
+        .join("");
+
+    expect(coalescedResult.status).toBe("completed");
+    expect(rendered(coalescedResult.messages)).toBe(
+      rendered(plainResult.messages)
+    );
+    expect(rendered(coalescedResult.messages)).toBe(tokens.join(""));
+    expect(coalescedResult.messages.length).toBeLessThan(
+      plainResult.messages.length
+    );
+    // The terminal job_update is still the last message.
+    expect(coalescedResult.messages.at(-1)?.type).toBe("job_update");
+  });
+});
@@ -0,0 +1,247 @@
+/**
+ * Multi-process runs.
+ *
+ * Covers:
+ *  - RemoteInbox: forwarding, per-handle credit window, end-of-stream
+ *  - PartitionedRunner against child processes: a pipeline cut three times
+ *    produces the same outputs and lineage as a single-process run;
+ *    independent components run with no cross traffic; a failing partition
+ *    fails the run and stops the others
+ */
+
+import { describe, it, expect } from "vitest";
+import type { Edge, NodeDescriptor } from "@nodetool-ai/protocol";
+import {
+  PartitionChannel,
+  RemoteInbox,
+  type PartitionMessage
+} from "../src/partition-wire.js";
+import { PartitionedRunner } from "../src/partitioned-runner.js";
+import { WorkflowRunner } from "../src/runner.js";
+
+const MODULE = new URL("./fixtures/partition-nodes.mjs", import.meta.url).href;
+const EXEC_ARGV = ["--import", "tsx", "--conditions=nodetool-dev"];
+const sleep = (ms: number) => new Promise((r) => setTimeout(r, ms));
+
+function loopback() {
+  const sent: Array<{ route: number; msg: PartitionMessage }> = [];
+  const channel = new PartitionChannel(
+    {
+      write(chunk: Buffer) {
+        // Strip the 4-byte length prefix; what is left is a routed payload.
+        const payload = chunk.subarray(4);
+        sent.push({ route: payload[0], msg: PartitionChannel.decode(payload) });
+        return true;
+      },
+      on: () => undefined
+    },
+    () => undefined
+  );
+  return { channel, sent };
+}
+
+describe("RemoteInbox", () => {
+  it("forwards values with their lineage and waits for credit", async () => {
+    const { channel, sent } = loopback();
+    const inbox = new RemoteInbox("b", 1, 0, channel, 2);
+    const lineage = { "fe:items": { id: "t", index: 0 } } as never;
+    await inbox.put("in", 1, { correlation_lineage: lineage, source_edge_id: "e" });
+    await inbox.put("in", 2);
+    let third = false;
+    const pending = inbox.put("in", 3).then(() => (third = true));
+    await inbox.put("other", 9); // other streams are not held up
+    await sleep(5);
+    expect(third).toBe(false);
+
+    inbox.ack("in", 1);
+    await pending;
+    inbox.markSourceDone("in");
+
+    expect(sent.every((s) => s.route === 1)).toBe(true);
+    expect(sent[0].msg).toMatchObject({
+      type: "put",
+      from: 0,
+      node: "b",
+      handle: "in",
+      data: 1,
+      lineage,
+      edge: "e"
+    });
+    expect(sent.map((s) => s.msg.type)).toEqual([
+      "put",
+      "put",
+      "put",
+      "put",
+      "eos"
+    ]);
+  });
+
+  it("releases blocked producers on close", async () => {
+    const { channel } = loopback();
+    const inbox = new RemoteInbox("b", 1, 0, channel, 1);
+    await inbox.put("in", 1);
+    const pending = inbox.put("in", 2);
+    await inbox.closeAll();
+    await expect(pending).resolves.toBeUndefined();
+  });
+});
+
+describe("PartitionedRunner", () => {
+  const nodes: NodeDescriptor[] = [
+    {
+      id: "src",
+      type: "nodetool.input.IntegerInput",
+      name: "items",
+      properties: { value: [1, 2, 3, 4] }
+    },
+    {
+      id: "fe",
+      type: "test.ForEach",
+      is_streaming_output: true,
+      outputs: { output: "any" },
+      output_correlation: {
+        output: { kind: "iteration", source: "__execution__", group: "items" }
+      }
+    },
+    {
+      id: "square",
+      type: "test.Square",
+      outputs: { value: "any" },
+      output_correlation: { value: { kind: "forward", source: "value" } }
+    },
+    {
+      id: "join",
+      type: "test.Join",
+      outputs: { value: "any" },
+      output_correlation: { value: { kind: "single", source: "__execution__" } }
+    },
+    { id: "sink", type: "test.Collect", is_streaming_input: true }
+  ];
+  const edges: Edge[] = [
+    ["src", "value", "fe", "input_list"],
+    ["fe", "output", "square", "value"],
+    ["fe", "output", "join", "left"],
+    ["square", "value", "join", "right"],
+    ["join", "value", "sink", "value"]
+  ].map(([source, sourceHandle, target, targetHandle]) => ({
+    id: `${source}.${sourceHandle}->${target}.${targetHandle}`,
+    source,
+    sourceHandle,
+    target,
+    targetHandle
+  }));
+  // Every edge below `fe` crosses a process boundary at least once.
+  const pins = { src: 0, fe: 0, square: 1, join: 0, sink: 1 };
+
+  async function inProcess(graphNodes: NodeDescriptor[]) {
+    const { resolveExecutor } = await import(MODULE);
+    return new WorkflowRunner("job-local", { resolveExecutor }).run(
+      { job_id: "job-local", params: {} },
+      { nodes: graphNodes, edges }
+    );
+  }
+
+  it(
+    "matches a single-process run across partition boundaries",
+    async () => {
+      const seen: string[] = [];
+      const result = await new PartitionedRunner("job-part", {
+        partitions: 2,
+        strategy: "pinned",
+        pins,
+        executorModule: MODULE,
+        execArgv: EXEC_ARGV,
+        onMessage: (msg) => seen.push(msg.type)
+      }).run({ job_id: "job-part", params: {} }, { nodes, edges });
+
+      expect(result.error).toBeUndefined();
+      expect(result.status).toBe("completed");
+      const local = await inProcess(nodes);
+      expect(result.outputs).toEqual(local.outputs);
+      const items = result.outputs.sink[0] as Array<{
+        data: string;
+        lineage: Record<string, { index: number }>;
+      }>;
+      expect(items.map((i) => i.data)).toEqual(["1|1", "2|4", "3|9", "4|16"]);
+      expect(items.map((i) => Object.values(i.lineage)[0].index)).toEqual([
+        0, 1, 2, 3
+      ]);
+
+      expect(result.crossEdges).toBe(3);
+      expect(result.partitions.map((p) => p.status)).toEqual([
+        "completed",
+        "completed"
+      ]);
+      expect(result.partitions[1].traffic.framesIn).toBeGreaterThan(4);
+      expect(seen[0]).toBe("job_update");
+      expect(seen.at(-1)).toBe("job_update");
+      expect(seen.filter((t) => t === "job_update")).toHaveLength(2);
+      expect(seen).toContain("node_update");
+    },
+    30_000
+  );
+
+  it(
+    "runs independent components without cross traffic",
+    async () => {
+      const twin = (id: string) => `${id}2`;
+      const doubled = {
+        nodes: [
+          ...nodes,
+          ...nodes.map((n) => ({
+            ...n,
+            id: twin(n.id),
+            name: n.name && `${n.name}2`
+          }))
+        ],
+        edges: [
+          ...edges,
+          ...edges.map((e) => ({
+            ...e,
+            id: `${e.id}#2`,
+            source: twin(e.source),
+            target: twin(e.target)
+          }))
+        ]
+      };
+      const result = await new PartitionedRunner("job-comp", {
+        partitions: 2,
+        executorModule: MODULE,
+        execArgv: EXEC_ARGV
+      }).run({ job_id: "job-comp", params: {} }, doubled);
+
+      expect(result.status).toBe("completed");
+      expect(result.crossEdges).toBe(0);
+      expect(result.partitions.map((p) => p.nodes)).toEqual([5, 5]);
+      const data = (name: string) =>
+        (result.outputs[name][0] as Array<{ data: string }>).map((i) => i.data);
+      expect(data("sink2")).toEqual(data("sink"));
+      expect(data("sink")).toHaveLength(4);
+    },
+    30_000
+  );
+
+  it(
+    "fails the run when one partition fails",
+    async () => {
+      const failing = nodes.map((n) =>
+        n.id === "square" ? { ...n, properties: { fail: true } } : n
+      );
+      const result = await new PartitionedRunner("job-fail", {
+        partitions: 2,
+        strategy: "pinned",
+        pins,
+        executorModule: MODULE,
+        execArgv: EXEC_ARGV
+      }).run({ job_id: "job-fail", params: {} }, { nodes: failing, edges });
+
+      expect(result.status).toBe("failed");
+      expect(result.error).toMatch(/boom/);
+      expect(result.messages.at(-1)).toMatchObject({
+        type: "job_update",
+        status: "failed"
+      });
+    },
+    30_000
+  );
+});
@@ -0,0 +1,227 @@
+/**
+ * Edge payload spilling.
+ *
+ * Large buffers on data edges travel as storage references, consumers see
+ * the original bytes, and every stored blob is deleted by the end of the run
+ * — on its last consumption, or by the end-of-run sweep.
+ */
+
+import { describe, it, expect } from "vitest";
+import type { NodeDescriptor } from "@nodetool-ai/protocol";
+import { InMemoryStorageAdapter } from "@nodetool-ai/runtime";
+import { WorkflowRunner } from "../src/runner.js";
+import { NodeInbox } from "../src/inbox.js";
+import { NodeInputs } from "../src/io.js";
+import { PayloadRef, PayloadSpiller } from "../src/payload-spill.js";
+import { InboxFlowControl } from "../src/flow-control.js";
+import type { NodeExecutor } from "../src/actor.js";
+
+const THRESHOLD = 1024;
+
+function bytes(size: number, fill: number): Uint8Array {
+  return new Uint8Array(size).fill(fill);
+}
+
+/** InMemoryStorageAdapter that counts live entries. */
+class CountingStorage extends InMemoryStorageAdapter {
+  live = 0;
+  stored = 0;
+
+  override async store(
+    key: string,
+    data: Uint8Array,
+    contentType?: string
+  ): Promise<string> {
+    this.live++;
+    this.stored++;
+    return super.store(key, data, contentType);
+  }
+
+  override async delete(uri: string): Promise<boolean> {
+    const deleted = await super.delete(uri);
+    if (deleted) this.live--;
+    return deleted;
+  }
+}
+
+describe("PayloadSpiller", () => {
+  it("leaves small values untouched", async () => {
+    const spiller = new PayloadSpiller(new CountingStorage(), "t", {
+      thresholdBytes: THRESHOLD
+    });
+    const value = { type: "image", data: bytes(16, 1) };
+    expect(await spiller.spill(value)).toBe(value);
+    expect(spiller.stats.spilled).toBe(0);
+  });
+
+  it("replaces nested buffers with per-delivery refs", async () => {
+    const storage = new CountingStorage();
+    const spiller = new PayloadSpiller(storage, "t", {
+      thresholdBytes: THRESHOLD
+    });
+    const value = {
+      images: [{ type: "image", uri: "a.png", data: bytes(THRESHOLD, 7) }]
+    };
+    const template = await spiller.spill(value);
+    const a = spiller.lease(template) as typeof value;
+    const b = spiller.lease(template) as typeof value;
+
+    expect(a.images[0].data).toBeInstanceOf(PayloadRef);
+    expect(a.images[0].data).not.toBe(b.images[0].data);
+    expect(a.images[0].uri).toBe("a.png");
+    expect(storage.stored).toBe(1);
+
+    const restored = (await spiller.materialize(a)) as typeof value;
+    expect(restored.images[0].data).toEqual(bytes(THRESHOLD, 7));
+    // One lease still out: the blob stays.
+    expect(storage.live).toBe(1);
+
+    await spiller.materialize(b);
+    expect(storage.live).toBe(0);
+    expect(spiller.stats).toMatchObject({
+      spilled: 1,
+      spilledBytes: THRESHOLD,
+      materialized: 2,
+      released: 1
+    });
+  });
+
+  it("reads a ref once however often it is materialised", async () => {
+    const storage = new CountingStorage();
+    const spiller = new PayloadSpiller(storage, "t", {
+      thresholdBytes: THRESHOLD
+    });
+    const ref = spiller.lease(
+      await spiller.spill(bytes(THRESHOLD, 3))
+    ) as PayloadRef;
+
+    const first = await ref.bytes();
+    const second = await ref.bytes();
+    expect(second).toBe(first);
+    expect(spiller.stats.materialized).toBe(1);
+  });
+
+  it("close() deletes blobs no consumer read", async () => {
+    const storage = new CountingStorage();
+    const spiller = new PayloadSpiller(storage, "t", {
+      thresholdBytes: THRESHOLD
+    });
+    spiller.lease(await spiller.spill(bytes(THRESHOLD, 1)));
+    expect(storage.live).toBe(1);
+
+    await spiller.close();
+    expect(storage.live).toBe(0);
+  });
+
+  it("NodeInputs hands out materialised values", async () => {
+    const spiller = new PayloadSpiller(new CountingStorage(), "t", {
+      thresholdBytes: THRESHOLD
+    });
+    const inbox = new NodeInbox();
+    inbox.addUpstream("in", 1);
+    await inbox.put(
+      "in",
+      spiller.lease(await spiller.spill(bytes(THRESHOLD, 9)))
+    );
+    inbox.markSourceDone("in");
+
+    const inputs = new NodeInputs(inbox, null, undefined, undefined, spiller);
+    const items: unknown[] = [];
+    for await (const item of inputs.stream("in")) items.push(item);
+    expect(items).toEqual([bytes(THRESHOLD, 9)]);
+  });
+
+  it("releases the lease of a keep_latest drop", async () => {
+    const storage = new CountingStorage();
+    const spiller = new PayloadSpiller(storage, "t", {
+      thresholdBytes: THRESHOLD
+    });
+    const flow = new InboxFlowControl("keep_latest", { initialCredits: 1 });
+    const inbox = new NodeInbox(null, { flowControl: flow });
+    inbox.addUpstream("in", 1);
+    const template = await spiller.spill({ data: bytes(THRESHOLD, 5) });
+
+    await inbox.put("in", spiller.lease(template));
+    await inbox.put("in", spiller.lease(template));
+    expect(spiller.outstandingLeases).toBe(1);
+    expect(storage.live).toBe(1);
+
+    const kept = inbox.drainHandle("in")[0].data;
+    await spiller.materialize(kept);
+    expect(spiller.outstandingLeases).toBe(0);
+    expect(storage.live).toBe(0);
+  });
+});
+
+describe("WorkflowRunner – spillPayloads", () => {
+  const nodes: NodeDescriptor[] = [
+    { id: "src", type: "test.Source" },
+    { id: "a", type: "test.Sink" },
+    { id: "b", type: "test.Sink" }
+  ];
+  const edges = [
+    { source: "src", sourceHandle: "output", target: "a", targetHandle: "in" },
+    { source: "src", sourceHandle: "output", target: "b", targetHandle: "in" }
+  ];
+
+  function setup(payload: unknown) {
+    const seen: Record<string, unknown> = {};
+    const resolveExecutor = (node: NodeDescriptor): NodeExecutor => ({
+      async process(inputs) {
+        if (node.id === "src") return { output: payload };
+        seen[node.id] = inputs.in;
+        return {};
+      }
+    });
+    return { seen, resolveExecutor };
+  }
+
+  it("delivers spilled media to every consumer and frees the blob", async () => {
+    const storage = new CountingStorage();
+    const image = { type: "image", uri: "", data: bytes(4 * THRESHOLD, 5) };
+    const { seen, resolveExecutor } = setup(image);
+    const runner = new WorkflowRunner("spill", {
+      resolveExecutor,
+      spillPayloads: { thresholdBytes: THRESHOLD, storage }
+    });
+
+    const result = await runner.run({ job_id: "spill" }, { nodes, edges });
+
+    expect(result.status).toBe("completed");
+    expect(seen.a).toEqual(image);
+    expect(seen.b).toEqual(image);
+    // Written once for both edges, read once per edge, then deleted.
+    expect(storage.stored).toBe(1);
+    expect(storage.live).toBe(0);
+    expect(result.payloadSpill).toEqual({
+      spilled: 1,
+      spilledBytes: 4 * THRESHOLD,
+      materialized: 2,
+      released: 1
+    });
+  });
+
+  it("passes values below the threshold through in memory", async () => {
+    const storage = new CountingStorage();
+    const payload = bytes(THRESHOLD - 1, 2);
+    const { seen, resolveExecutor } = setup(payload);
+    const runner = new WorkflowRunner("small", {
+      resolveExecutor,
+      spillPayloads: { thresholdBytes: THRESHOLD, storage }
+    });
+
+    await runner.run({ job_id: "small" }, { nodes, edges });
+
+    expect(seen.a).toBe(payload);
+    expect(storage.stored).toBe(0);
+  });
+
+  it("reports no spill stats when spilling is off", async () => {
+    const { resolveExecutor } = setup(bytes(4 * THRESHOLD, 1));
+    const runner = new WorkflowRunner("off", { resolveExecutor });
+
+    const result = await runner.run({ job_id: "off" }, { nodes, edges });
+
+    expect(result.payloadSpill).toBeUndefined();
+  });
+});
@@ -0,0 +1,327 @@
+/**
+ * Resource-class scheduling.
+ *
+ * Covers:
+ *  - Pool capacity, priority order and FIFO ties
+ *  - Abort while waiting
+ *  - A held slot given up while idle
+ *  - Resource class resolution and critical-path lengths
+ *  - Runner integration: pool limits hold within and across runs, and
+ *    chained streaming nodes sharing a one-slot pool do not deadlock
+ */
+
+import { describe, it, expect } from "vitest";
+import type { NodeDescriptor } from "@nodetool-ai/protocol";
+import {
+  ResourceHold,
+  ResourcePool,
+  ResourceScheduler,
+  criticalPathLengths,
+  resourceClassOf
+} from "../src/resource-scheduler.js";
+import { Graph } from "../src/graph.js";
+import { WorkflowRunner } from "../src/runner.js";
+import type { NodeExecutor } from "../src/actor.js";
+
+const tick = () => new Promise((resolve) => setTimeout(resolve, 0));
+
+describe("ResourcePool", () => {
+  it("grants up to capacity and queues the rest", async () => {
+    const pool = new ResourcePool("cpu", 2);
+    const a = await pool.acquire();
+    await pool.acquire();
+    let granted = false;
+    const waiting = pool.acquire().then((release) => {
+      granted = true;
+      return release;
+    });
+    await tick();
+    expect(granted).toBe(false);
+    expect(pool.stats).toMatchObject({ active: 2, waiting: 1 });
+
+    a();
+    (await waiting)();
+    expect(granted).toBe(true);
+    expect(pool.stats).toMatchObject({ active: 1, acquired: 3, queued: 1 });
+  });
+
+  it("serves higher priority first and ties in arrival order", async () => {
+    const pool = new ResourcePool("cpu", 1);
+    const hold = await pool.acquire();
+    const order: string[] = [];
+    const wait = (label: string, priority: number) =>
+      pool.acquire(priority).then((release) => {
+        order.push(label);
+        release();
+      });
+    const all = Promise.all([
+      wait("low", 1),
+      wait("high-1", 5),
+      wait("mid", 3),
+      wait("high-2", 5)
+    ]);
+    hold();
+    await all;
+    expect(order).toEqual(["high-1", "high-2", "mid", "low"]);
+  });
+
+  it("releasing twice frees one slot", async () => {
+    const pool = new ResourcePool("cpu", 1);
+    const release = await pool.acquire();
+    release();
+    release();
+    expect(pool.stats.active).toBe(0);
+  });
+
+  it("rejects a waiter whose signal aborts", async () => {
+    const pool = new ResourcePool("cpu", 1);
+    await pool.acquire();
+    const controller = new AbortController();
+    const waiting = pool.acquire(0, controller.signal);
+    controller.abort(new Error("cancelled"));
+    await expect(waiting).rejects.toThrow("cancelled");
+    expect(pool.stats.waiting).toBe(0);
+  });
+
+  it("rejects a capacity below one", () => {
+    expect(() => new ResourcePool("cpu", 0)).toThrow(/at least 1/);
+  });
+});
+
+describe("ResourceHold", () => {
+  it("gives the slot back while idle and takes it again after", async () => {
+    const pool = new ResourcePool("gpu", 1);
+    const hold = new ResourceHold(pool);
+    let other = false;
+    await hold.run(async () => {
+      expect(pool.stats.active).toBe(1);
+      await hold.idle(async () => {
+        await pool.run(async () => {
+          other = true;
+        });
+      });
+      expect(pool.stats.active).toBe(1);
+    });
+    expect(other).toBe(true);
+    expect(pool.stats.active).toBe(0);
+  });
+});
+
+describe("ResourceScheduler", () => {
+  it("returns no pool for unthrottled classes", () => {
+    const scheduler = new ResourceScheduler({ ffmpeg: 2 });
+    expect(scheduler.pool("ffmpeg")?.capacity).toBe(2);
+    expect(scheduler.pool("cpu")).toBeUndefined();
+    expect(scheduler.pool(undefined)).toBeUndefined();
+  });
+
+  it("setLimit resizes an existing pool", () => {
+    const scheduler = new ResourceScheduler({ ffmpeg: 2 });
+    const pool = scheduler.pool("ffmpeg");
+    scheduler.setLimit("ffmpeg", 4);
+    expect(scheduler.pool("ffmpeg")).toBe(pool);
+    expect(pool?.capacity).toBe(4);
+  });
+});
+
+describe("resourceClassOf", () => {
+  it("prefers the declared class, then the model provider", () => {
+    expect(
+      resourceClassOf({ id: "a", type: "t", resource_class: "ffmpeg" })
+    ).toBe("ffmpeg");
+    expect(
+      resourceClassOf({
+        id: "b",
+        type: "t",
+        properties: { model: { type: "language_model", provider: "openai" } }
+      })
+    ).toBe("provider:openai");
+    expect(resourceClassOf({ id: "c", type: "t" })).toBeUndefined();
+  });
+});
+
+describe("criticalPathLengths", () => {
+  it("counts nodes on the longest path to a sink", () => {
+    const edge = (source: string, target: string) => ({
+      source,
+      sourceHandle: "output",
+      target,
+      targetHandle: "input"
+    });
+    const graph = new Graph({
+      nodes: ["a", "b", "c", "d", "e"].map((id) => ({ id, type: "t" })),
+      // a → b → c → d, a → e
+      edges: [edge("a", "b"), edge("b", "c"), edge("c", "d"), edge("a", "e")]
+    });
+    const lengths = criticalPathLengths(graph);
+    expect(Object.fromEntries(lengths)).toEqual({
+      a: 4,
+      b: 3,
+      c: 2,
+      d: 1,
+      e: 1
+    });
+  });
+});
+
+describe("WorkflowRunner – scheduler", () => {
+  /** Independent nodes in one class; records peak concurrency. */
+  function wideGraph(width: number, resourceClass: string) {
+    const nodes: NodeDescriptor[] = Array.from({ length: width }, (_, i) => ({
+      id: `n${i}`,
+      type: "test.Work",
+      resource_class: resourceClass
+    }));
+    return { nodes, edges: [] };
+  }
+
+  function tracker() {
+    let active = 0;
+    let peak = 0;
+    const resolveExecutor = (): NodeExecutor => ({
+      async process() {
+        active++;
+        peak = Math.max(peak, active);
+        await new Promise((resolve) => setTimeout(resolve, 5));
+        active--;
+        return {};
+      }
+    });
+    return { resolveExecutor, peak: () => peak };
+  }
+
+  it("caps concurrent invocations of a class", async () => {
+    const scheduler = new ResourceScheduler({ ffmpeg: 2 });
+    const t = tracker();
+    const runner = new WorkflowRunner("sched", {
+      resolveExecutor: t.resolveExecutor,
+      scheduler
+    });
+
+    const result = await runner.run(
+      { job_id: "sched" },
+      wideGraph(8, "ffmpeg")
+    );
+
+    expect(result.status).toBe("completed");
+    expect(t.peak()).toBe(2);
+    expect(scheduler.pool("ffmpeg")?.stats).toMatchObject({
+      active: 0,
+      acquired: 8
+    });
+  });
+
+  it("holds the limit across concurrent runs sharing a scheduler", async () => {
+    const scheduler = new ResourceScheduler({ ffmpeg: 3 });
+    const t = tracker();
+    const runs = ["r1", "r2"].map((id) =>
+      new WorkflowRunner(id, {
+        resolveExecutor: t.resolveExecutor,
+        scheduler
+      }).run({ job_id: id }, wideGraph(6, "ffmpeg"))
+    );
+
+    await Promise.all(runs);
+
+    expect(t.peak()).toBe(3);
+  });
+
+  it("leaves unthrottled classes alone", async () => {
+    const t = tracker();
+    const runner = new WorkflowRunner("free", {
+      resolveExecutor: t.resolveExecutor,
+      scheduler: new ResourceScheduler({ ffmpeg: 1 })
+    });
+
+    await runner.run({ job_id: "free" }, wideGraph(4, "cpu"));
+
+    expect(t.peak()).toBe(4);
+  });
+
+  /** src → relay → sink; src and relay share the `gpu` class. */
+  async function runChain(source: NodeExecutor) {
+    const nodes: NodeDescriptor[] = [
+      {
+        id: "src",
+        type: "test.Stream",
+        resource_class: "gpu",
+        is_streaming_input: source.run !== undefined,
+        is_streaming_output: source.genProcess !== undefined
+      },
+      {
+        id: "relay",
+        type: "test.Stream",
+        resource_class: "gpu",
+        is_streaming_input: true
+      },
+      { id: "sink", type: "test.Sink", is_streaming_input: true }
+    ];
+    const edge = (source: string, target: string) => ({
+      source,
+      sourceHandle: "output",
+      target,
+      targetHandle: "input"
+    });
+    const received: unknown[] = [];
+    const relay: NodeExecutor = {
+      async process() {
+        return {};
+      },
+      async run(inputs, outputs) {
+        for await (const value of inputs.stream("input")) {
+          await outputs.emit("output", (value as number) * 10);
+        }
+      }
+    };
+    const sink: NodeExecutor = {
+      async process() {
+        return {};
+      },
+      async run(inputs) {
+        for await (const value of inputs.stream("input")) received.push(value);
+      }
+    };
+    const scheduler = new ResourceScheduler({ gpu: 1 });
+    const runner = new WorkflowRunner("chain", {
+      resolveExecutor: (node) =>
+        node.id === "src" ? source : node.id === "relay" ? relay : sink,
+      scheduler,
+      bufferLimit: 1
+    });
+    const result = await runner.run(
+      { job_id: "chain" },
+      { nodes, edges: [edge("src", "relay"), edge("relay", "sink")] }
+    );
+    return { result, received, stats: scheduler.pool("gpu")!.stats };
+  }
+
+  it("runs a streaming chain of one class on a one-slot pool", async () => {
+    const { result, received, stats } = await runChain({
+      async process() {
+        return {};
+      },
+      async run(_inputs, outputs) {
+        for (let i = 1; i <= 5; i++) await outputs.emit("output", i);
+      }
+    });
+
+    expect(result.status).toBe("completed");
+    expect(received).toEqual([10, 20, 30, 40, 50]);
+    expect(stats.active).toBe(0);
+  });
+
+  it("routes a generator's frames off the slot", async () => {
+    const { result, received, stats } = await runChain({
+      async process() {
+        return {};
+      },
+      async *genProcess() {
+        for (let i = 1; i <= 5; i++) yield { output: i };
+      }
+    });
+
+    expect(result.status).toBe("completed");
+    expect(received).toEqual([10, 20, 30, 40, 50]);
+    expect(stats.active).toBe(0);
+  });
+});
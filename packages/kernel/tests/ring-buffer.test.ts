@@ -0,0 +1,32 @@
+import { describe, it, expect } from "vitest";
+import { RingBuffer } from "../src/ring-buffer.js";
+
+describe("RingBuffer", () => {
+  it("is a FIFO across growth and wrap-around", () => {
+    const ring = new RingBuffer<number>(2);
+    ring.push(1);
+    ring.push(2);
+    expect(ring.shift()).toBe(1);
+    ring.push(3);
+    ring.push(4); // grows while wrapped
+    ring.unshift(0);
+    expect(ring.length).toBe(4);
+    expect(ring.drain()).toEqual([0, 2, 3, 4]);
+    expect(ring.shift()).toBeUndefined();
+    expect(ring.peek()).toBeUndefined();
+  });
+
+  it("shiftMany takes at most the buffered count", () => {
+    const ring = new RingBuffer<number>();
+    for (let i = 0; i < 5; i++) ring.push(i);
+    expect(ring.shiftMany(3)).toEqual([0, 1, 2]);
+    expect(ring.shiftMany(10)).toEqual([3, 4]);
+  });
+
+  it("retain filters in place and preserves order", () => {
+    const ring = new RingBuffer<number>();
+    for (let i = 0; i < 6; i++) ring.push(i);
+    ring.retain((n) => n % 2 === 0);
+    expect(ring.drain()).toEqual([0, 2, 4]);
+  });
+});
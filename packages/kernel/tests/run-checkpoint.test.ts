@@ -0,0 +1,300 @@
+/**
+ * Crash-resume checkpoints, end to end through the runner.
+ *
+ * Covers:
+ *  - A run killed mid-graph resumes with only the incomplete frontier
+ *  - Restored streaming nodes replay their items with lineage intact
+ *  - Edits upstream and changed params invalidate what they feed
+ *  - Without `resume`, checkpoints are written but never read
+ *  - A node whose output outgrows the limits is not checkpointed
+ */
+
+import { describe, it, expect } from "vitest";
+import type { Edge, NodeDescriptor } from "@nodetool-ai/protocol";
+import { WorkflowRunner, type RunResult } from "../src/runner.js";
+import type { NodeExecutor } from "../src/actor.js";
+import {
+  MemoryRunCheckpointStore,
+  type RunCheckpointStore
+} from "../src/run-checkpoint.js";
+
+const FIXTURE_NODES = new URL("./fixtures/partition-nodes.mjs", import.meta.url)
+  .href;
+
+const edge = (
+  source: string,
+  sourceHandle: string,
+  target: string,
+  targetHandle: string
+): Edge => ({
+  id: `${source}.${sourceHandle}->${target}.${targetHandle}`,
+  source,
+  sourceHandle,
+  target,
+  targetHandle
+});
+
+/** input → a → b → c → out */
+function chain(bSuffix = "!"): { nodes: NodeDescriptor[]; edges: Edge[] } {
+  return {
+    nodes: [
+      { id: "input", type: "test.Input", name: "x" },
+      { id: "a", type: "test.Upper" },
+      { id: "b", type: "test.Suffix", properties: { s: bSuffix } },
+      { id: "c", type: "test.Twice" },
+      { id: "out", type: "test.Output", name: "result" }
+    ],
+    edges: [
+      edge("input", "value", "a", "text"),
+      edge("a", "output", "b", "text"),
+      edge("b", "output", "c", "text"),
+      edge("c", "output", "out", "value")
+    ]
+  };
+}
+
+interface Attempt {
+  calls: Record<string, number>;
+  runner: WorkflowRunner;
+  result: RunResult;
+}
+
+async function attempt(
+  store: RunCheckpointStore,
+  opts: {
+    resume?: boolean;
+    killAt?: string;
+    params?: Record<string, unknown>;
+    graph?: { nodes: NodeDescriptor[]; edges: Edge[] };
+    maxBytes?: number;
+  } = {}
+): Promise<Attempt> {
+  const calls: Record<string, number> = {};
+  const count = (id: string) => {
+    calls[id] = (calls[id] ?? 0) + 1;
+    // Stands in for the process dying: nothing after this point completes.
+    if (id === opts.killAt) runner.cancel();
+  };
+  const executors: Record<string, NodeExecutor> = {
+    a: {
+      async process(ins) {
+        count("a");
+        return { output: String(ins.text).toUpperCase() };
+      }
+    },
+    b: {
+      async process(ins) {
+        count("b");
+        return { output: `${ins.text}${ins.s}` };
+      }
+    },
+    c: {
+      async process(ins) {
+        count("c");
+        return { output: `${ins.text}${ins.text}` };
+      }
+    }
+  };
+  const runner: WorkflowRunner = new WorkflowRunner("ckpt-job", {
+    resolveExecutor: (node) =>
+      executors[node.id] ?? {
+        async process(ins) {
+          count(node.id);
+          return ins;
+        }
+      },
+    checkpoint: { store, resume: opts.resume, maxBytes: opts.maxBytes }
+  });
+  const result = await runner.run(
+    { job_id: "ckpt-job", params: opts.params ?? { x: "hi" } },
+    (opts.graph ?? chain()) as never
+  );
+  return { calls, runner, result };
+}
+
+const total = (calls: Record<string, number>) =>
+  Object.values(calls).reduce((sum, n) => sum + n, 0);
+
+describe("WorkflowRunner – checkpoints", () => {
+  it("resumes a killed run with strictly less work", async () => {
+    const baseline = await attempt(new MemoryRunCheckpointStore());
+    expect(baseline.result.outputs.result).toEqual(["HI!HI!"]);
+
+    const store = new MemoryRunCheckpointStore();
+    const killed = await attempt(store, { killAt: "c" });
+    expect(killed.result.status).toBe("cancelled");
+    expect(killed.result.checkpoint).toEqual({
+      restored: 0,
+      saved: 2,
+      failed: 0,
+      skipped: 0
+    });
+    expect((await store.load("ckpt-job")).map((c) => c.nodeId).sort()).toEqual(
+      ["a", "b"]
+    );
+
+    const resumed = await attempt(store, { resume: true });
+    expect(resumed.result.status).toBe("completed");
+    expect(resumed.result.outputs).toEqual(baseline.result.outputs);
+    expect(resumed.calls).toEqual({ c: 1, out: 1 });
+    expect(total(resumed.calls)).toBeLessThan(total(baseline.calls));
+    expect(resumed.result.checkpoint?.restored).toBe(2);
+    const restoredUpdates = resumed.result.messages.filter(
+      (m) =>
+        m.type === "node_update" &&
+        m.status === "completed" &&
+        (m.node_id === "a" || m.node_id === "b")
+    );
+    expect(restoredUpdates).toHaveLength(2);
+
+    // A second resume of a completed run executes nothing at all.
+    const again = await attempt(store, { resume: true });
+    expect(again.calls).toEqual({});
+    expect(again.result.outputs).toEqual(baseline.result.outputs);
+  });
+
+  it("re-runs whatever an upstream edit or a new param feeds", async () => {
+    const store = new MemoryRunCheckpointStore();
+    await attempt(store);
+
+    const edited = await attempt(store, { resume: true, graph: chain("?") });
+    expect(edited.calls).toEqual({ b: 1, c: 1, out: 1 });
+    expect(edited.result.outputs.result).toEqual(["HI?HI?"]);
+
+    const reparam = await attempt(store, {
+      resume: true,
+      params: { x: "yo" }
+    });
+    expect(reparam.calls).toEqual({ input: 1, a: 1, b: 1, c: 1, out: 1 });
+  });
+
+  it("writes checkpoints but ignores them without resume", async () => {
+    const store = new MemoryRunCheckpointStore();
+    await attempt(store);
+    const fresh = await attempt(store);
+    expect(fresh.calls).toEqual({ input: 1, a: 1, b: 1, c: 1, out: 1 });
+    expect(fresh.result.checkpoint).toEqual({
+      restored: 0,
+      saved: 4,
+      failed: 0,
+      skipped: 0
+    });
+  });
+
+  it("re-runs a node whose output was too large to checkpoint", async () => {
+    const store = new MemoryRunCheckpointStore();
+    // `{ output: "HI" }` estimates at 8 bytes, b's `{ output: "HI!" }` at 9.
+    const killed = await attempt(store, { killAt: "c", maxBytes: 8 });
+    expect(killed.result.checkpoint).toEqual({
+      restored: 0,
+      saved: 1,
+      failed: 0,
+      skipped: 1
+    });
+
+    const resumed = await attempt(store, { resume: true, maxBytes: 8 });
+    expect(resumed.result.status).toBe("completed");
+    expect(resumed.calls).toEqual({ b: 1, c: 1, out: 1 });
+    expect(resumed.result.outputs.result).toEqual(["HI!HI!"]);
+  });
+
+  it("runs every node when the store fails", async () => {
+    const broken: RunCheckpointStore = {
+      load: async () => {
+        throw new Error("db down");
+      },
+      save: async () => {
+        throw new Error("db down");
+      }
+    };
+    const { calls, result } = await attempt(broken, { resume: true });
+    expect(result.status).toBe("completed");
+    expect(calls).toEqual({ input: 1, a: 1, b: 1, c: 1, out: 1 });
+    expect(result.checkpoint).toEqual({
+      restored: 0,
+      saved: 0,
+      failed: 4,
+      skipped: 0
+    });
+  });
+
+  it("replays streamed items with their lineage", async () => {
+    const nodes: NodeDescriptor[] = [
+      {
+        id: "src",
+        type: "nodetool.input.IntegerInput",
+        name: "items",
+        properties: { value: [1, 2, 3] }
+      },
+      {
+        id: "fe",
+        type: "test.ForEach",
+        is_streaming_output: true,
+        outputs: { output: "any" },
+        output_correlation: {
+          output: { kind: "iteration", source: "__execution__", group: "items" }
+        }
+      },
+      {
+        id: "square",
+        type: "test.Square",
+        outputs: { value: "any" },
+        output_correlation: { value: { kind: "forward", source: "value" } }
+      },
+      {
+        id: "join",
+        type: "test.Join",
+        outputs: { value: "any" },
+        output_correlation: {
+          value: { kind: "single", source: "__execution__" }
+        }
+      },
+      { id: "sink", type: "test.Collect", is_streaming_input: true }
+    ];
+    const edges = [
+      edge("src", "value", "fe", "input_list"),
+      edge("fe", "output", "square", "value"),
+      edge("fe", "output", "join", "left"),
+      edge("square", "value", "join", "right"),
+      edge("join", "value", "sink", "value")
+    ];
+    const { resolveExecutor } = await import(FIXTURE_NODES);
+    const store = new MemoryRunCheckpointStore();
+    const calls: Record<string, number> = {};
+    const run = (failSink: boolean, resume: boolean) =>
+      new WorkflowRunner("ckpt-stream", {
+        resolveExecutor: (node: NodeDescriptor): NodeExecutor => {
+          const inner = resolveExecutor(node) as NodeExecutor;
+          calls[node.id] = (calls[node.id] ?? 0) + 1;
+          if (node.id === "sink" && failSink) {
+            return {
+              process: async () => ({}),
+              async run() {
+                throw new Error("worker lost");
+              }
+            };
+          }
+          return inner;
+        },
+        checkpoint: { store, resume }
+      }).run({ job_id: "ckpt-stream", params: {} }, { nodes, edges } as never);
+
+    const failed = await run(true, false);
+    expect(failed.status).toBe("failed");
+    for (const id of Object.keys(calls)) delete calls[id];
+
+    const resumed = await run(false, true);
+    expect(resumed.status).toBe("completed");
+    // Only the sink's executor was resolved: the rest were restored, and the
+    // input feeding them was not dispatched again.
+    expect(Object.keys(calls)).toEqual(["sink"]);
+    const items = resumed.outputs.sink[0] as Array<{
+      data: string;
+      lineage: Record<string, { index: number }>;
+    }>;
+    expect(items.map((i) => i.data)).toEqual(["1|1", "2|4", "3|9"]);
+    expect(items.map((i) => Object.values(i.lineage)[0].index)).toEqual([
+      0, 1, 2
+    ]);
+  });
+});
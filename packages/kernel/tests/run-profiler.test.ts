@@ -0,0 +1,224 @@
+/**
+ * Run profiler.
+ *
+ * Covers:
+ *  - Payload size estimation
+ *  - Timeline bookkeeping and the Chrome trace shape
+ *  - Runner integration: execution, queue and backpressure time per node,
+ *    traffic per edge, nothing recorded when off
+ */
+
+import { describe, it, expect } from "vitest";
+import type { Edge, NodeDescriptor } from "@nodetool-ai/protocol";
+import { RunProfiler } from "../src/run-profiler.js";
+import { estimatePayloadBytes } from "../src/payload-size.js";
+import { Graph } from "../src/graph.js";
+import { NodeInbox } from "../src/inbox.js";
+import { WorkflowRunner } from "../src/runner.js";
+import type { NodeExecutor } from "../src/actor.js";
+
+const sleep = (ms: number) => new Promise((r) => setTimeout(r, ms));
+
+describe("estimatePayloadBytes", () => {
+  it("counts buffers, strings and containers", () => {
+    expect(estimatePayloadBytes(new Uint8Array(1000))).toBe(1000);
+    expect(estimatePayloadBytes("abcd")).toBe(4);
+    expect(estimatePayloadBytes({ data: new Uint8Array(10) })).toBe(14);
+    expect(estimatePayloadBytes([1, 2, 3])).toBe(24);
+    expect(estimatePayloadBytes(null)).toBe(0);
+  });
+
+  it("extrapolates long arrays from a sample", () => {
+    expect(estimatePayloadBytes(new Array(10_000).fill(1))).toBe(80_000);
+  });
+});
+
+describe("RunProfiler", () => {
+  const graph = new Graph({
+    nodes: [
+      { id: "a", type: "test.Source" },
+      { id: "b", type: "test.Sink" }
+    ],
+    edges: [
+      {
+        id: "e1",
+        source: "a",
+        sourceHandle: "out",
+        target: "b",
+        targetHandle: "in"
+      }
+    ]
+  });
+
+  it("splits execution between JS and the bridge", () => {
+    const profiler = new RunProfiler("job");
+    profiler.registerGraph(graph);
+    profiler.recordExecution("b", 10, 12, 20, 5, 1);
+
+    const b = profiler.summary().nodes.find((n) => n.nodeId === "b")!;
+    expect(b).toMatchObject({
+      invocations: 1,
+      resourceWaitMs: 2,
+      executingMs: 8,
+      bridgeMs: 5,
+      encodeMs: 1
+    });
+    const span = profiler
+      .toChromeTrace()
+      .traceEvents.find((e) => e.cat === "execute")!;
+    expect(span).toMatchObject({ ph: "X", name: "test.Sink", dur: 8000 });
+    expect(span.args).toEqual({ bridge_ms: 5, encode_ms: 1, js_ms: 3 });
+  });
+
+  it("counts delivered messages, bytes and depth per edge", async () => {
+    const profiler = new RunProfiler("job");
+    profiler.registerGraph(graph);
+    const inbox = new NodeInbox();
+    const batch = [
+      { handle: "in", data: "hello", source_edge_id: "e1" },
+      { handle: "in", data: "world", source_edge_id: "e1" }
+    ];
+    await inbox.putMany(batch);
+    profiler.recordDelivery("a", inbox, batch, 0, 1, false);
+
+    expect(profiler.summary().edges[0]).toMatchObject({
+      edgeId: "e1",
+      messages: 2,
+      bytes: 10,
+      maxDepth: 2,
+      backpressureMs: 0
+    });
+    const counter = profiler
+      .toChromeTrace()
+      .traceEvents.find((e) => e.ph === "C")!;
+    expect(counter).toMatchObject({ name: "inbox b.in", args: { depth: 2 } });
+  });
+
+  it("counts an envelope's queue time once", async () => {
+    const profiler = new RunProfiler("job");
+    const inbox = new NodeInbox();
+    await inbox.put("in", 1);
+    const [envelope] = inbox.drainHandle("in");
+    envelope.timestamp -= 50;
+    const envelopes = new Map([["in", envelope]]);
+
+    profiler.recordDequeue("b", inbox, envelopes);
+    profiler.recordDequeue("b", inbox, envelopes);
+
+    const b = profiler.summary().nodes[0];
+    expect(b.queuedMs).toBeGreaterThanOrEqual(50);
+    expect(b.queuedMs).toBeLessThan(100);
+    const queued = profiler
+      .toChromeTrace()
+      .traceEvents.filter((e) => e.cat === "queue");
+    expect(queued.map((e) => e.ph)).toEqual(["b", "e"]);
+  });
+
+  it("names one track per node and caps the timeline", () => {
+    const profiler = new RunProfiler("job", { maxEvents: 2 });
+    profiler.registerGraph(graph);
+    for (let i = 0; i < 3; i++) profiler.recordExecution("a", 0, 0, 1, 0);
+
+    const trace = profiler.toChromeTrace();
+    const names = trace.traceEvents
+      .filter((e) => e.ph === "M" && e.name === "thread_name")
+      .map((e) => e.args?.name);
+    expect(names).toContain("test.Source (a)");
+    expect(trace.traceEvents.filter((e) => e.ph === "X")).toHaveLength(2);
+    expect(trace.otherData.dropped_events).toBe(1);
+    expect(profiler.summary().nodes[0].invocations).toBe(3);
+  });
+});
+
+describe("WorkflowRunner – profile", () => {
+  const nodes: NodeDescriptor[] = [
+    { id: "trig", type: "test.Input", name: "trig" },
+    { id: "producer", type: "test.Streamer", is_streaming_output: true },
+    { id: "consumer", type: "test.Slow" }
+  ];
+  const edges: Edge[] = [
+    {
+      id: "e-trig",
+      source: "trig",
+      sourceHandle: "value",
+      target: "producer",
+      targetHandle: "start"
+    },
+    {
+      id: "e-data",
+      source: "producer",
+      sourceHandle: "value",
+      target: "consumer",
+      targetHandle: "value"
+    }
+  ];
+
+  function runner(profile: boolean) {
+    return new WorkflowRunner("job-profile", {
+      bufferLimit: 1,
+      profile: profile ? {} : undefined,
+      resolveExecutor: (node) => {
+        if (node.id === "producer") {
+          return {
+            async *genProcess() {
+              for (let i = 0; i < 4; i++) yield { value: "x".repeat(100) };
+            },
+            process: async () => ({})
+          } as unknown as NodeExecutor;
+        }
+        if (node.id === "consumer") {
+          return {
+            async process() {
+              await sleep(10);
+              return {};
+            }
+          };
+        }
+        return { process: async (i: Record<string, unknown>) => i };
+      }
+    });
+  }
+
+  it("reports where each node's time went", async () => {
+    const r = runner(true);
+    const result = await r.run(
+      { job_id: "job-profile", params: { trig: 0 } },
+      { nodes, edges }
+    );
+
+    expect(result.status).toBe("completed");
+    const profile = result.profile!;
+    const node = (id: string) => profile.nodes.find((n) => n.nodeId === id)!;
+    expect(node("consumer").invocations).toBe(4);
+    expect(node("consumer").executingMs).toBeGreaterThanOrEqual(30);
+    expect(node("consumer").queuedMs).toBeGreaterThan(0);
+    // A one-slot inbox ahead of a slow consumer blocks the producer.
+    expect(node("producer").backpressureMs).toBeGreaterThan(0);
+
+    const edge = profile.edges.find((e) => e.edgeId === "e-data")!;
+    expect(edge).toMatchObject({ messages: 4, bytes: 400, maxDepth: 1 });
+    expect(edge.backpressureMs).toBeGreaterThan(0);
+    expect(profile.wallMs).toBeGreaterThanOrEqual(node("consumer").executingMs);
+
+    const trace = r.profiler!.toChromeTrace();
+    expect(trace.otherData.job_id).toBe("job-profile");
+    const slow = trace.traceEvents.filter(
+      (e) => e.cat === "execute" && e.name === "test.Slow"
+    );
+    expect(slow).toHaveLength(4);
+    expect(trace.traceEvents.some((e) => e.cat === "backpressure")).toBe(true);
+    expect(JSON.parse(JSON.stringify(trace))).toEqual(trace);
+  });
+
+  it("records nothing when off", async () => {
+    const r = runner(false);
+    const result = await r.run(
+      { job_id: "job-profile", params: { trig: 0 } },
+      { nodes, edges }
+    );
+
+    expect(result.status).toBe("completed");
+    expect(result.profile).toBeUndefined();
+    expect(r.profiler).toBeUndefined();
+  });
+});
@@ -0,0 +1,115 @@
+/**
+ * `target_nodes` on RunJobRequest: demand-driven execution.
+ *
+ * Exercises WorkflowRunner.run() end-to-end and asserts that only the
+ * targets and their ancestors run — side branches, and required inputs that
+ * only feed them, are skipped.
+ */
+import { describe, it, expect } from "vitest";
+import { WorkflowRunner } from "../src/runner.js";
+import type { Edge, NodeDescriptor } from "@nodetool-ai/protocol";
+import type { NodeExecutor } from "../src/actor.js";
+
+//  src --> preview
+//  src --> expensive --> final
+const nodes: NodeDescriptor[] = [
+  { id: "src", type: "test.Source", properties: { value: 2 } },
+  { id: "preview", type: "test.Double" },
+  { id: "expensive", type: "test.Double" },
+  { id: "final", type: "test.Double" }
+];
+const edges: Edge[] = [
+  {
+    source: "src",
+    sourceHandle: "output",
+    target: "preview",
+    targetHandle: "in"
+  },
+  {
+    source: "src",
+    sourceHandle: "output",
+    target: "expensive",
+    targetHandle: "in"
+  },
+  {
+    source: "expensive",
+    sourceHandle: "output",
+    target: "final",
+    targetHandle: "in"
+  }
+];
+
+function runner(ran: string[]) {
+  return new WorkflowRunner("job", {
+    resolveExecutor: (node): NodeExecutor => ({
+      async process(inputs) {
+        ran.push(node.id);
+        if (node.id === "src") return { output: node.properties?.value };
+        return { output: (inputs.in as number) * 2 };
+      }
+    })
+  });
+}
+
+describe("WorkflowRunner – target_nodes", () => {
+  it("runs only the targets and their ancestors", async () => {
+    const ran: string[] = [];
+    const result = await runner(ran).run(
+      { job_id: "job", target_nodes: ["preview"] },
+      { nodes, edges }
+    );
+
+    expect(result.status).toBe("completed");
+    expect(ran.sort()).toEqual(["preview", "src"]);
+  });
+
+  it("runs the whole graph without targets", async () => {
+    const ran: string[] = [];
+    await runner(ran).run({ job_id: "job" }, { nodes, edges });
+    expect(ran.sort()).toEqual(["expensive", "final", "preview", "src"]);
+  });
+
+  it("does not require inputs that only feed pruned nodes", async () => {
+    const ran: string[] = [];
+    const result = await new WorkflowRunner("job", {
+      resolveExecutor: (node): NodeExecutor => ({
+        async process() {
+          ran.push(node.id);
+          return { output: 1 };
+        }
+      })
+    }).run(
+      { job_id: "job", target_nodes: ["a"] },
+      {
+        nodes: [
+          { id: "a", type: "test.Source" },
+          { id: "in", type: "nodetool.input.StringInput", name: "prompt" },
+          { id: "b", type: "test.Sink" }
+        ],
+        edges: [
+          {
+            source: "in",
+            sourceHandle: "output",
+            target: "b",
+            targetHandle: "in"
+          }
+        ]
+      }
+    );
+
+    expect(result.status).toBe("completed");
+    expect(ran).toEqual(["a"]);
+  });
+
+  it("fails the run on an unknown target", async () => {
+    const ran: string[] = [];
+    const result = await runner(ran).run(
+      { job_id: "job", target_nodes: ["missing"] },
+      { nodes, edges }
+    );
+
+    expect(result.status).toBe("failed");
+    expect(result.error).toContain("Unknown target node(s): missing");
+    expect(ran).toEqual([]);
+  });
+});
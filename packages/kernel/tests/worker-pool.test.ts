@@ -0,0 +1,231 @@
+/**
+ * Worker-thread execution for CPU-bound nodes.
+ *
+ * Covers:
+ *  - Running a node in a worker and transferring buffers both ways
+ *  - Node errors vs. tasks that cannot run in a worker (in-process fallback)
+ *  - Worker crash recovery
+ *  - Per-node-type queue wait and run time
+ *  - Runner integration via `workerPool`
+ */
+
+import { afterAll, describe, expect, it } from "vitest";
+import { threadId } from "node:worker_threads";
+import type { NodeDescriptor } from "@nodetool-ai/protocol";
+import {
+  WorkerNodeExecutor,
+  WorkerPool,
+  WorkerUnavailableError,
+  ownedArrayBuffers
+} from "../src/worker-pool.js";
+import { WorkflowRunner } from "../src/runner.js";
+import type { NodeExecutor } from "../src/actor.js";
+
+const MODULE = new URL("./fixtures/worker-nodes.mjs", import.meta.url).href;
+const spec = (nodeType: string) => ({ module: MODULE, nodeType });
+
+const pool = new WorkerPool({ size: 2 });
+
+afterAll(async () => {
+  await pool.close();
+});
+
+describe("WorkerPool", () => {
+  it("runs a node off the main thread", async () => {
+    const outputs = await pool.run(spec("test.Double"), {
+      data: new Uint8Array([1, 2, 3])
+    });
+
+    expect(outputs.output).toEqual(new Uint8Array([2, 4, 6]));
+    expect(outputs.threadId).not.toBe(threadId);
+  });
+
+  it("moves listed input buffers instead of copying them", async () => {
+    const data = new Uint8Array([5, 6]);
+    const running = pool.run(spec("test.Double"), { data }, [data.buffer]);
+    // Detached as soon as the task is posted.
+    expect(data.byteLength).toBe(0);
+    expect((await running).output).toEqual(new Uint8Array([10, 12]));
+  });
+
+  it("rejects with the node's own error", async () => {
+    const failure = pool.run(spec("test.Fail"), {});
+    await expect(failure).rejects.toThrow("boom");
+    await expect(failure).rejects.not.toBeInstanceOf(WorkerUnavailableError);
+  });
+
+  it("reports unknown node types as unavailable", async () => {
+    await expect(pool.run(spec("test.Missing"), {})).rejects.toBeInstanceOf(
+      WorkerUnavailableError
+    );
+  });
+
+  it("reports uncloneable inputs and outputs as unavailable", async () => {
+    await expect(
+      pool.run(spec("test.Double"), { data: new Uint8Array(1), fn: () => 1 })
+    ).rejects.toBeInstanceOf(WorkerUnavailableError);
+    await expect(pool.run(spec("test.Function"), {})).rejects.toBeInstanceOf(
+      WorkerUnavailableError
+    );
+  });
+
+  it("replaces a worker that dies mid-task", async () => {
+    await expect(pool.run(spec("test.Exit"), {})).rejects.toThrow(/exited/);
+    const outputs = await pool.run(spec("test.Double"), {
+      data: new Uint8Array([1])
+    });
+    expect(outputs.output).toEqual(new Uint8Array([2]));
+  });
+
+  it("records queue wait separately from run time", async () => {
+    const single = new WorkerPool({ size: 1 });
+    try {
+      await Promise.all([
+        single.run(spec("test.Sleep"), { ms: 30 }),
+        single.run(spec("test.Sleep"), { ms: 30 })
+      ]);
+      const stats = single.stats.byNodeType["test.Sleep"];
+      expect(stats.tasks).toBe(2);
+      expect(stats.runMs).toBeGreaterThanOrEqual(50);
+      // The second task waited for the first to finish.
+      expect(stats.maxQueueWaitMs).toBeGreaterThanOrEqual(20);
+      expect(single.stats).toMatchObject({ size: 1, workers: 1, busy: 0 });
+    } finally {
+      await single.close();
+    }
+  });
+
+  it("rejects a size below one", () => {
+    expect(() => new WorkerPool({ size: 0 })).toThrow(/at least 1/);
+  });
+});
+
+describe("ownedArrayBuffers", () => {
+  it("skips views that share their buffer", () => {
+    const whole = new Uint8Array(4);
+    const backing = new ArrayBuffer(8);
+    const slice = new Uint8Array(backing, 4, 4);
+    const found = ownedArrayBuffers({ image: { data: whole }, list: [slice] });
+    expect([...found]).toEqual([whole.buffer]);
+  });
+});
+
+describe("WorkerNodeExecutor", () => {
+  const inProcess = (label: string): NodeExecutor => ({
+    async process() {
+      return { output: label };
+    }
+  });
+
+  it("transfers buffers prepare created, not ones it received", async () => {
+    const received = new Uint8Array([1, 2]);
+    let created: Uint8Array | undefined;
+    const executor = new WorkerNodeExecutor(
+      inProcess("inline"),
+      {
+        ...spec("test.Double"),
+        async prepare(inputs) {
+          created = new Uint8Array([3, 4]);
+          return { ...inputs, data: created };
+        }
+      },
+      pool
+    );
+
+    const outputs = await executor.process({ data: received, keep: received });
+
+    expect(outputs.output).toEqual(new Uint8Array([6, 8]));
+    expect(created?.byteLength).toBe(0);
+    expect(received.byteLength).toBe(2);
+  });
+
+  it("falls back in-process when the node cannot run in a worker", async () => {
+    const executor = new WorkerNodeExecutor(
+      inProcess("inline"),
+      spec("test.Missing"),
+      pool
+    );
+    expect(await executor.process({})).toEqual({ output: "inline" });
+  });
+
+  it("does not retry a node that threw", async () => {
+    const executor = new WorkerNodeExecutor(
+      inProcess("inline"),
+      spec("test.Fail"),
+      pool
+    );
+    await expect(executor.process({})).rejects.toThrow("boom");
+  });
+});
+
+describe("WorkflowRunner – workerPool", () => {
+  const nodes: NodeDescriptor[] = [
+    { id: "src", type: "test.Source" },
+    { id: "double", type: "test.Double" },
+    { id: "sink", type: "test.Sink" }
+  ];
+  const edges = [
+    {
+      source: "src",
+      sourceHandle: "output",
+      target: "double",
+      targetHandle: "data"
+    },
+    {
+      source: "double",
+      sourceHandle: "threadId",
+      target: "sink",
+      targetHandle: "threadId"
+    }
+  ];
+
+  function setup() {
+    const seen: Record<string, unknown> = {};
+    const resolveExecutor = (node: NodeDescriptor): NodeExecutor => {
+      if (node.id === "src") {
+        return {
+          async process() {
+            return { output: new Uint8Array([1, 2]) };
+          }
+        };
+      }
+      if (node.id === "double") {
+        return {
+          async process() {
+            return { threadId };
+          },
+          worker: spec("test.Double")
+        };
+      }
+      return {
+        async process(inputs) {
+          seen.threadId = inputs.threadId;
+          return {};
+        }
+      };
+    };
+    return { seen, resolveExecutor };
+  }
+
+  it("runs cpuBound executors in the pool", async () => {
+    const { seen, resolveExecutor } = setup();
+    const runner = new WorkflowRunner("workers", {
+      resolveExecutor,
+      workerPool: pool
+    });
+
+    const result = await runner.run({ job_id: "workers" }, { nodes, edges });
+
+    expect(result.status).toBe("completed");
+    expect(seen.threadId).not.toBe(threadId);
+  });
+
+  it("runs them in-process without a pool", async () => {
+    const { seen, resolveExecutor } = setup();
+    const runner = new WorkflowRunner("inline", { resolveExecutor });
+
+    await runner.run({ job_id: "inline" }, { nodes, edges });
+
+    expect(seen.threadId).toBe(threadId);
+  });
+});
@@ -256,7 +256,10 @@ export type { EventType } from "./run-event.js";
 export { RunLease } from "./run-lease.js";
 
 export { TriggerInput } from "./trigger-input.js";
-export { RunInboxMessage } from "./run-inbox-message.js";
+export {
+  RunInboxMessage,
+  type RunInboxMessageInsert
+} from "./run-inbox-message.js";
 export { TriggerRegistration } from "./trigger-registration.js";
 export { ExternalIdentity } from "./external-identity.js";
 export type { LinkExternalIdentityParams } from "./external-identity.js";
@@ -2,11 +2,28 @@
  * RunInboxMessage model — durable inbox for events delivered to a run's nodes.
  */
 
-import { eq, and, asc, max } from "drizzle-orm";
+import { eq, and, asc, max, inArray } from "drizzle-orm";
 import { DBModel, createTimeOrderedUuid } from "./base-model.js";
-import { getDb } from "./db.js";
+import { getDb, getDbType, type DbTransaction } from "./db.js";
 import { runInboxMessages } from "./schema/run-inbox-messages.js";
 
+/** One row for {@link RunInboxMessage.commitBatch}; defaults as in the constructor. */
+export interface RunInboxMessageInsert {
+  message_id: string;
+  run_id: string;
+  node_id: string;
+  handle: string;
+  msg_seq: number;
+  payload_json: unknown | null;
+  payload_ref: string | null;
+  status: string;
+  consumed_at: string | null;
+  created_at: string;
+}
+
+/** Rows per multi-row statement; keeps SQLite under its bound-parameter limit. */
+const BATCH_CHUNK = 500;
+
 export class RunInboxMessage extends DBModel {
   static override table = runInboxMessages;
 
@@ -83,4 +100,70 @@ export class RunInboxMessage extends DBModel {
       .orderBy(asc(runInboxMessages.msg_seq));
     return rows.map((r) => new RunInboxMessage(r));
   }
+
+  /**
+   * Insert `rows` and mark the `consumed` message ids consumed, in one
+   * transaction and a handful of multi-row statements. Rows whose
+   * `message_id` already exists are skipped, so replaying a batch after a
+   * partial failure is safe.
+   */
+  static async commitBatch(
+    rows: readonly RunInboxMessageInsert[],
+    consumed: readonly string[],
+    consumedAt = new Date().toISOString()
+  ): Promise<void> {
+    if (rows.length === 0 && consumed.length === 0) return;
+    const now = new Date().toISOString();
+    const values = rows.map((row) => ({
+      ...row,
+      id: createTimeOrderedUuid(),
+      claim_worker_id: null,
+      claim_expires_at: null,
+      updated_at: now
+    }));
+
+    const statements = (tx: DbTransaction): unknown[] => {
+      const out: unknown[] = [];
+      for (let i = 0; i < values.length; i += BATCH_CHUNK) {
+        out.push(
+          tx
+            .insert(runInboxMessages)
+            .values(values.slice(i, i + BATCH_CHUNK))
+            .onConflictDoNothing({ target: runInboxMessages.message_id })
+        );
+      }
+      for (let i = 0; i < consumed.length; i += BATCH_CHUNK) {
+        out.push(
+          tx
+            .update(runInboxMessages)
+            .set({
+              status: "consumed",
+              consumed_at: consumedAt,
+              updated_at: now
+            })
+            .where(
+              inArray(
+                runInboxMessages.message_id,
+                consumed.slice(i, i + BATCH_CHUNK)
+              )
+            )
+        );
+      }
+      return out;
+    };
+
+    const db = getDb();
+    if (getDbType() === "sqlite") {
+      // better-sqlite3 transactions must be fully synchronous.
+      db.transaction((tx: DbTransaction): void => {
+        for (const statement of statements(tx)) {
+          (statement as { run: () => void }).run();
+        }
+      });
+    } else {
+      await db.transaction(async (tx: DbTransaction): Promise<void> => {
+        for (const statement of statements(tx)) await statement;
+      });
+    }
+  }
 }
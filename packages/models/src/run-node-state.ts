@@ -116,6 +116,22 @@ export class RunNodeState extends DBModel {
     return rows.map((r: Record<string, unknown>) => new RunNodeState(r));
   }
 
+  /** Get all completed nodes for a run. */
+  static async getCompletedNodes(runId: string): Promise<RunNodeState[]> {
+    const db = getDb();
+    const rows = await db
+      .select()
+      .from(runNodeState)
+      .where(
+        and(
+          eq(runNodeState.run_id, runId),
+          eq(runNodeState.status, "completed")
+        )
+      )
+      .limit(10000);
+    return rows.map((r: Record<string, unknown>) => new RunNodeState(r));
+  }
+
   static async getSuspendedNodes(runId: string): Promise<RunNodeState[]> {
     const db = getDb();
     const rows = await db
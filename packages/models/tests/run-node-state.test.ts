@@ -2,7 +2,8 @@
  * Tests for the RunNodeState model.
  *
  * Covers: constructor defaults, beforeSave, getNodeState, getOrCreate,
- * getIncompleteNodes, getSuspendedNodes, state transitions, status checks.
+ * getIncompleteNodes, getCompletedNodes, getSuspendedNodes, state
+ * transitions, status checks.
  */
 
 import { describe, it, expect, beforeEach, afterEach } from "vitest";
@@ -155,6 +156,27 @@ describe("RunNodeState model", () => {
     expect(incomplete).toHaveLength(0);
   });
 
+  // ── getCompletedNodes ─────────────────────────────────────────────
+
+  it("returns only completed nodes of the run", async () => {
+    const done = await RunNodeState.getOrCreate("r1", "n1");
+    await done.markCompleted({ output: 1 });
+    await RunNodeState.create<RunNodeState>({
+      run_id: "r1",
+      node_id: "n2",
+      status: "running"
+    });
+    await RunNodeState.create<RunNodeState>({
+      run_id: "r2",
+      node_id: "n1",
+      status: "completed"
+    });
+
+    const completed = await RunNodeState.getCompletedNodes("r1");
+    expect(completed.map((n) => n.node_id)).toEqual(["n1"]);
+    expect(completed[0].outputs_json).toEqual({ output: 1 });
+  });
+
   // ── getSuspendedNodes ─────────────────────────────────────────────
 
   it("returns only suspended nodes", async () => {
@@ -153,6 +153,15 @@ export type NodeClass = {
   inputFields?: string[];
   requiredSettings?: string[];
   requiredRuntimes?: string[];
+  /** Resource pool the node runs in. See `BaseNode.resourceClass`. */
+  resourceClass?: string;
+  /** Runs in a worker thread when the runner has a pool. See `BaseNode.cpuBound`. */
+  cpuBound?: boolean;
+  workerModule?: string;
+  prepareWorkerInputs?: (
+    inputs: Record<string, unknown>,
+    context?: ProcessingContext
+  ) => Promise<Record<string, unknown>>;
   isStreamingInput: boolean;
   /**
    * Per-instance override of {@link isStreamingInput}. See
@@ -286,6 +295,24 @@ export const hasStreamingOutput = (cls: StreamingOutputSource): boolean => {
   return false;
 };
 
+/**
+ * Whether a node class declares its outputs a function of its inputs alone:
+ * `effect: "pure"`, or `cacheTtl: "forever"`, which implies it. Surfaced on
+ * descriptors as `is_pure`, the flag a memoizing runner caches on.
+ */
+export const isPureNodeClass = (
+  cls: Pick<NodeClass, "effect" | "cacheTtl">
+): boolean => cls.effect === "pure" || cls.cacheTtl === "forever";
+
+/**
+ * The resource class a node class declares: `resourceClass`, else its first
+ * required runtime (`ffmpeg`, `python`, …). Surfaced on descriptors as
+ * `resource_class`.
+ */
+export const resourceClassOfNodeClass = (
+  cls: Pick<NodeClass, "resourceClass" | "requiredRuntimes">
+): string | undefined => cls.resourceClass ?? cls.requiredRuntimes?.[0];
+
 export abstract class BaseNode {
   static readonly nodeType: string = "";
   static readonly title: string = "";
@@ -304,6 +331,30 @@ export abstract class BaseNode {
   static readonly inputFields: string[] | undefined = undefined;
   static readonly requiredSettings: string[] | undefined = undefined;
   static readonly requiredRuntimes: string[] | undefined = undefined;
+  /**
+   * Resource class this node's work runs in (`cpu`, `ffmpeg`, `python`,
+   * `provider:<name>`, …). A runner with a resource scheduler makes each
+   * invocation hold a slot in that class's pool, so server-wide limits on
+   * ffmpeg processes or provider calls hold. Unset falls back to the first
+   * `requiredRuntimes` entry; with neither, the node is unthrottled.
+   */
+  static readonly resourceClass: string | undefined = undefined;
+  /**
+   * Pure-JS CPU work (pixel or sample loops) that should not block the event
+   * loop. With `workerModule` set — normally the defining module's
+   * `import.meta.url` — a runner with a worker pool runs `process` in a
+   * worker thread on a fresh instance. The node must not need the
+   * `ProcessingContext` there; `prepareWorkerInputs` runs first on the main
+   * thread to resolve refs into bytes.
+   */
+  static readonly cpuBound: boolean = false;
+  static readonly workerModule: string | undefined = undefined;
+  static readonly prepareWorkerInputs:
+    | ((
+        inputs: Record<string, unknown>,
+        context?: ProcessingContext
+      ) => Promise<Record<string, unknown>>)
+    | undefined = undefined;
   static readonly isStreamingInput: boolean = false;
   /**
    * Decide {@link isStreamingInput} per node instance, from its saved
@@ -795,6 +846,16 @@ export abstract class BaseNode {
         return this.run!(inputs, outputs, context);
       };
     }
+    const ctor = this.constructor as typeof BaseNode;
+    if (ctor.cpuBound && ctor.workerModule) {
+      executor.worker = {
+        module: ctor.workerModule,
+        nodeType: ctor.nodeType,
+        ...(ctor.prepareWorkerInputs
+          ? { prepare: ctor.prepareWorkerInputs.bind(ctor) }
+          : {})
+      };
+    }
     return executor;
   }
 
@@ -814,7 +875,9 @@ export abstract class BaseNode {
       is_controlled: this.isControlled,
       is_join_node: this.isJoinNode || undefined,
       is_trigger: this.isTrigger || undefined,
-      retry_safe: this.retrySafe || undefined
+      retry_safe: this.retrySafe || undefined,
+      is_pure: isPureNodeClass(this) || undefined,
+      resource_class: resourceClassOfNodeClass(this)
     };
     if (Object.keys(propertyTypes).length > 0) {
       desc.propertyTypes = propertyTypes;
@@ -92,6 +92,8 @@ export interface NodeMetadata {
    * The frontend uses this to show install prompts before execution.
    */
   required_runtimes?: string[];
+  /** Resource pool the node runs in. See `BaseNode.resourceClass`. */
+  resource_class?: string;
   supports_dynamic_inputs?: boolean;
   /**
    * Types a user may pick for a dynamic input slot on this node. Unset means
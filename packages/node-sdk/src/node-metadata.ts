@@ -7,7 +7,7 @@
  */
 
 import type { NodeClass } from "./base-node.js";
-import { hasStreamingOutput } from "./base-node.js";
+import { hasStreamingOutput, resourceClassOfNodeClass } from "./base-node.js";
 import type {
   NodeMetadata,
   OutputSlotMetadata,
@@ -282,6 +282,7 @@ export function getNodeMetadata(
     input_fields: nodeClass.inputFields,
     required_settings: nodeClass.requiredSettings ?? [],
     required_runtimes: nodeClass.requiredRuntimes ?? [],
+    resource_class: resourceClassOfNodeClass(nodeClass),
     is_streaming_input: nodeClass.isStreamingInput || false,
     is_streaming_output: hasStreamingOutput(nodeClass),
     input_mode: nodeClass.inputMode,
@@ -7,7 +7,11 @@ import type {
 import { supportsPlatform } from "@nodetool-ai/protocol";
 import type { NodeExecutor, ResolvedNodeType } from "@nodetool-ai/kernel";
 import type { NodeClass } from "./base-node.js";
-import { hasStreamingOutput } from "./base-node.js";
+import {
+  hasStreamingOutput,
+  isPureNodeClass,
+  resourceClassOfNodeClass
+} from "./base-node.js";
 import type {
   NodeMetadata,
   PythonMetadataLoadOptions,
@@ -571,6 +575,14 @@ export function hydrateGraphNodeFlags(
       // supervisor a retry on a side-effecting node — the asymmetric failure
       // docs/workflow-supervisor-design.md §5.3 exists to prevent.
       retry_safe: (cls ? cls.retrySafe : meta?.retry_safe) ?? false,
+      // Registry-only for the same reason: a memoizing runner replays a pure
+      // node's cached output instead of running it.
+      is_pure: cls ? isPureNodeClass(cls) : meta?.effect === "pure",
+      resource_class:
+        (cls
+          ? resourceClassOfNodeClass(cls)
+          : (meta?.resource_class ?? meta?.required_runtimes?.[0])) ??
+        node.resource_class,
       always_emit_output_updates:
         (cls
           ? cls.alwaysEmitOutputUpdates
@@ -685,6 +697,11 @@ export function createGraphNodeTypeResolver(
           // nothing.
           is_trigger: metadata.is_trigger ?? false,
           retry_safe: metadata.retry_safe ?? false,
+          is_pure: metadata.effect === "pure",
+          ...((metadata.resource_class ?? metadata.required_runtimes?.[0]) && {
+            resource_class:
+              metadata.resource_class ?? metadata.required_runtimes?.[0]
+          }),
           ...(metadata.input_mode && { input_mode: metadata.input_mode }),
           ...(metadata.output_correlation && {
             output_correlation: metadata.output_correlation
@@ -174,3 +174,40 @@ describe("BaseNode", () => {
     expect(results[0].control).toEqual({ node: "meta" });
   });
 });
+
+describe("BaseNode.toExecutor – worker spec", () => {
+  it("is absent unless the class is cpuBound with a worker module", () => {
+    class NoModule extends ConcreteNode {
+      static readonly cpuBound = true;
+    }
+    expect(new ConcreteNode().toExecutor().worker).toBeUndefined();
+    expect(new NoModule().toExecutor().worker).toBeUndefined();
+  });
+
+  it("carries the module, node type and bound prepare hook", async () => {
+    class PixelNode extends BaseNode {
+      static readonly nodeType = "test.Pixel";
+      static readonly cpuBound = true;
+      static readonly workerModule = "file:///nodes/pixel.js";
+      static readonly prepareWorkerInputs = async function (
+        this: unknown,
+        inputs: Record<string, unknown>
+      ) {
+        return { ...inputs, boundTo: this };
+      };
+
+      async process(): Promise<Record<string, unknown>> {
+        return {};
+      }
+    }
+    const worker = new PixelNode().toExecutor().worker;
+    expect(worker).toMatchObject({
+      module: "file:///nodes/pixel.js",
+      nodeType: "test.Pixel"
+    });
+    expect(await worker!.prepare!({ a: 1 })).toEqual({
+      a: 1,
+      boundTo: PixelNode
+    });
+  });
+});
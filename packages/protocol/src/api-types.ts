@@ -997,6 +997,11 @@ export interface RunJobRequest {
     payload: unknown;
     input_id: string;
   } | null;
+  /**
+   * Run only these nodes and their ancestors — "run to here" for a previewed
+   * output. Everything else in the graph is skipped.
+   */
+  target_nodes?: string[] | null;
 }
 
 /**
@@ -1023,6 +1028,11 @@ export interface RunJobExecutionOptions {
   persistence?: "job" | "session";
   event_detail?: "full" | "outputs" | "terminal";
   asset_persistence?: "auto" | "temporary";
+  /**
+   * Checkpoint each node's outputs so a run its server loses resumes where it
+   * stopped. Only for `persistence: "job"`.
+   */
+  checkpoint?: boolean;
 }
 
 export interface ResourceLimits {
@@ -142,6 +142,13 @@ const executeResultDataSchema = z
   })
   .passthrough();
 
+/** `result.data` for `execute.batch` (v5): per item, a result or an error. */
+const executeBatchResultDataSchema = z
+  .object({
+    items: z.array(z.union([executeResultDataSchema, errorDataSchema]))
+  })
+  .passthrough();
+
 /** `result.data` for `worker.status`. */
 const workerStatusDataSchema = z
   .object({
@@ -168,6 +175,7 @@ const comfyExecuteResultDataSchema = z
 /** `data` shared by `result`/`chunk`: one of the known shapes, or any record. */
 const resultOrChunkDataSchema = z.union([
   executeResultDataSchema,
+  executeBatchResultDataSchema,
   workerStatusDataSchema,
   comfyExecuteResultDataSchema,
   genericDataSchema
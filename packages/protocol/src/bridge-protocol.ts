@@ -46,14 +46,15 @@
  *   3. Update `MIN_NODETOOL_CORE_VERSION` to that new release.
  */
 
-export const BRIDGE_PROTOCOL_VERSION = 4;
+export const BRIDGE_PROTOCOL_VERSION = 5;
 
 /**
  * Hard floor: the JS runtime rejects (at `discover`) any worker reporting a
  * protocol below this. Stays at 1 because every protocol change so far has
  * been additive — `models.*` (v2) is negotiated via `supportsModelManagement`,
- * `comfy.*` (v3) via `supportsComfy`, and run identity + `job.*` + `models.evict`
- * (v4) via `supportsJobLifecycle` — so a v1 worker still connects and runs
+ * `comfy.*` (v3) via `supportsComfy`, run identity + `job.*` + `models.evict`
+ * (v4) via `supportsJobLifecycle`, and `execute.batch` (v5) via
+ * `supportsExecuteBatch` — so a v1 worker still connects and runs
  * every pre-v2 feature; it just doesn't expose the newer families. Move this
  * only for a real wire break.
  *
@@ -63,6 +64,13 @@ export const BRIDGE_PROTOCOL_VERSION = 4;
  * JS side sends them unconditionally; only the new `job.start` / `job.end` /
  * `models.evict` message types are gated, because a pre-v4 worker answers
  * those with `Unknown message type`.
+ *
+ * v5 adds `execute.batch`: several invocations of one node type in one frame,
+ * `{node_type, secrets, items: [{fields, blobs}], …identity}`, answered by one
+ * `result` whose `items` holds, per input and in order, either
+ * `{outputs, blobs}` or `{error, traceback?}`. Progress frames carry the
+ * batch's request id. A pre-v5 worker never receives it; the JS side sends
+ * one `execute` per item instead.
  */
 export const MIN_BRIDGE_PROTOCOL_VERSION = 1;
 
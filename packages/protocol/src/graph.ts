@@ -183,6 +183,22 @@ export interface NodeDescriptor {
    */
   retry_safe?: boolean;
 
+  /**
+   * Whether the node's outputs depend only on its inputs (`effect: "pure"` or
+   * `cacheTtl: "forever"` on the class). Like `retry_safe`, resolved from the
+   * registry only. A memoizing runner serves pure nodes from its result cache
+   * when their input hashes match a previous invocation.
+   */
+  is_pure?: boolean;
+
+  /**
+   * Resource class the node's work runs in (`cpu`, `ffmpeg`, `python`,
+   * `provider:<name>`, …). A runner given a resource scheduler makes each
+   * invocation hold a slot in that class's pool. Resolved from the registry
+   * (`resourceClass`, else the first `requiredRuntimes` entry).
+   */
+  resource_class?: string;
+
   /** Whether this node consumes streaming input. */
   is_streaming_input?: boolean;
 
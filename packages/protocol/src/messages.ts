@@ -80,6 +80,7 @@ export type JobStatus =
 export type NodeStatus =
   | "pending"
   | "running"
+  | "cached"
   | "completed"
   | "failed"
   | "error";
@@ -671,6 +672,7 @@ export type UnifiedCommandType =
   | "cancel_job"
   | "update_node_properties"
   | "get_status"
+  | "get_job_profile"
   | "set_mode"
   | "set_permission_mode"
   | "clear_models"
@@ -41,6 +41,7 @@ export const UNIFIED_COMMAND_TYPES = [
   "cancel_job",
   "update_node_properties",
   "get_status",
+  "get_job_profile",
   "set_mode",
   "set_permission_mode",
   "clear_models",
@@ -107,11 +108,14 @@ export const runJobDataSchema = z
     graph: runJobGraphSchema.nullable().optional(),
     explicit_types: z.boolean().optional(),
     require_terminal_result: z.boolean().optional(),
+    profile: z.boolean().optional(),
+    target_nodes: z.array(z.string()).nullable().optional(),
     execution_options: z
       .object({
         persistence: z.enum(["job", "session"]).optional(),
         event_detail: z.enum(["full", "outputs", "terminal"]).optional(),
-        asset_persistence: z.enum(["auto", "temporary"]).optional()
+        asset_persistence: z.enum(["auto", "temporary"]).optional(),
+        checkpoint: z.boolean().optional()
       })
       .passthrough()
       .nullable()
@@ -257,6 +261,7 @@ export const commandDataSchemas = {
   cancel_job: looseDataSchema,
   update_node_properties: looseDataSchema,
   get_status: looseDataSchema,
+  get_job_profile: jobIdDataSchema,
   set_mode: looseDataSchema,
   set_permission_mode: looseDataSchema,
   clear_models: looseDataSchema,
@@ -0,0 +1,964 @@
+/**
+ * A small Apache Arrow IPC codec for the dataframes that cross the Python
+ * bridge.
+ *
+ * Reads and writes the IPC *stream* format — a Schema message, one
+ * RecordBatch message per chunk, an end-of-stream marker — which is what
+ * `pyarrow.ipc.open_stream` / `new_stream` and `pandas.read_feather`'s
+ * in-memory cousins speak. Only flat, uncompressed, non-dictionary columns
+ * of these types are supported:
+ *
+ *   null, bool, int8–int64, uint8–uint64, float32, float64, utf8,
+ *   large_utf8, timestamp (any unit), date32, date64
+ *
+ * which covers what a pandas frame of numbers, strings, dates and datetimes
+ * turns into. Anything else is refused with an error naming the column.
+ *
+ * {@link ArrowTable} holds the decoded buffers as they arrived: a cell is
+ * read straight out of its column's bytes, so a frame can be passed around,
+ * re-encoded or read column by column without building a JS object per
+ * row. 64-bit integers are read as JS numbers and lose precision above
+ * 2^53.
+ */
+
+/** Column types this codec reads and writes. */
+export type ArrowType =
+  | { kind: "null" }
+  | { kind: "bool" }
+  | { kind: "int"; bitWidth: 8 | 16 | 32 | 64; signed: boolean }
+  | { kind: "float"; bitWidth: 32 | 64 }
+  | { kind: "utf8"; large: boolean }
+  | { kind: "timestamp"; unit: ArrowTimeUnit; timezone: string | null }
+  | { kind: "date"; unit: "day" | "ms" };
+
+export type ArrowTimeUnit = "s" | "ms" | "us" | "ns";
+
+export interface ArrowField {
+  name: string;
+  type: ArrowType;
+  nullable: boolean;
+}
+
+/** One column's buffers within one record batch. */
+interface ArrowChunk {
+  length: number;
+  nullCount: number;
+  /** Validity bitmap; null when the chunk has no nulls. */
+  validity: Uint8Array | null;
+  /** utf8 only: `length + 1` int32 (int64 for large_utf8) offsets. */
+  offsets: DataView | null;
+  /** Values: fixed-width numbers, a bitmap for bool, utf8 bytes. */
+  data: DataView;
+}
+
+interface ArrowBatch {
+  length: number;
+  /** One chunk per schema field, in schema order. */
+  chunks: ArrowChunk[];
+}
+
+const TWO_32 = 2 ** 32;
+const MS_PER_DAY = 86_400_000;
+const TIME_UNITS: ArrowTimeUnit[] = ["s", "ms", "us", "ns"];
+const MS_PER_UNIT: Record<ArrowTimeUnit, number> = {
+  s: 1000,
+  ms: 1,
+  us: 1e-3,
+  ns: 1e-6
+};
+
+const utf8Encoder = new TextEncoder();
+const utf8Decoder = new TextDecoder();
+
+function view(bytes: Uint8Array): DataView {
+  return new DataView(bytes.buffer, bytes.byteOffset, bytes.byteLength);
+}
+
+function readInt64(data: DataView, byteOffset: number, signed = true): number {
+  const lo = data.getUint32(byteOffset, true);
+  const hi = signed
+    ? data.getInt32(byteOffset + 4, true)
+    : data.getUint32(byteOffset + 4, true);
+  return hi * TWO_32 + lo;
+}
+
+function writeInt64(data: DataView, byteOffset: number, value: number): void {
+  const hi = Math.floor(value / TWO_32);
+  data.setUint32(byteOffset, value - hi * TWO_32, true);
+  data.setInt32(byteOffset + 4, hi, true);
+}
+
+function bit(bitmap: Uint8Array, index: number): boolean {
+  return ((bitmap[index >> 3] >> (index & 7)) & 1) === 1;
+}
+
+/** A column of an {@link ArrowTable}: one field over every batch. */
+export class ArrowColumn {
+  readonly field: ArrowField;
+  readonly length: number;
+  private readonly _chunks: ArrowChunk[];
+  /** Row index at which each chunk starts. */
+  private readonly _starts: number[];
+
+  constructor(field: ArrowField, chunks: ArrowChunk[]) {
+    this.field = field;
+    this._chunks = chunks;
+    this._starts = [];
+    let start = 0;
+    for (const chunk of chunks) {
+      this._starts.push(start);
+      start += chunk.length;
+    }
+    this.length = start;
+  }
+
+  get name(): string {
+    return this.field.name;
+  }
+
+  get nullCount(): number {
+    return this._chunks.reduce((sum, c) => sum + c.nullCount, 0);
+  }
+
+  /**
+   * The value at `index`: a number, string, boolean or null. Timestamps are
+   * ISO-8601 strings, dates `YYYY-MM-DD`; 64-bit integers are numbers.
+   */
+  get(index: number): unknown {
+    if (!(index >= 0 && index < this.length)) {
+      throw new RangeError(`Row ${index} out of range for ${this.length}`);
+    }
+    let lo = 0;
+    let hi = this._chunks.length - 1;
+    while (lo < hi) {
+      const mid = (lo + hi + 1) >> 1;
+      if (this._starts[mid] <= index) lo = mid;
+      else hi = mid - 1;
+    }
+    const chunk = this._chunks[lo];
+    return readCell(this.field.type, chunk, index - this._starts[lo]);
+  }
+
+  toArray(): unknown[] {
+    const out: unknown[] = new Array(this.length);
+    let row = 0;
+    for (const chunk of this._chunks) {
+      for (let i = 0; i < chunk.length; i++) {
+        out[row++] = readCell(this.field.type, chunk, i);
+      }
+    }
+    return out;
+  }
+}
+
+function readCell(type: ArrowType, chunk: ArrowChunk, i: number): unknown {
+  if (type.kind === "null") return null;
+  if (chunk.validity && !bit(chunk.validity, i)) return null;
+  const data = chunk.data;
+  switch (type.kind) {
+    case "bool":
+      return ((data.getUint8(i >> 3) >> (i & 7)) & 1) === 1;
+    case "int":
+      switch (type.bitWidth) {
+        case 8:
+          return type.signed ? data.getInt8(i) : data.getUint8(i);
+        case 16:
+          return type.signed
+            ? data.getInt16(i * 2, true)
+            : data.getUint16(i * 2, true);
+        case 32:
+          return type.signed
+            ? data.getInt32(i * 4, true)
+            : data.getUint32(i * 4, true);
+        default:
+          return readInt64(data, i * 8, type.signed);
+      }
+    case "float":
+      return type.bitWidth === 32
+        ? data.getFloat32(i * 4, true)
+        : data.getFloat64(i * 8, true);
+    case "utf8": {
+      const offsets = chunk.offsets!;
+      const start = type.large
+        ? readInt64(offsets, i * 8)
+        : offsets.getInt32(i * 4, true);
+      const end = type.large
+        ? readInt64(offsets, i * 8 + 8)
+        : offsets.getInt32(i * 4 + 4, true);
+      return utf8Decoder.decode(
+        new Uint8Array(data.buffer, data.byteOffset + start, end - start)
+      );
+    }
+    case "timestamp": {
+      const ms = readInt64(data, i * 8) * MS_PER_UNIT[type.unit];
+      return new Date(Math.floor(ms)).toISOString();
+    }
+    case "date": {
+      const ms =
+        type.unit === "day"
+          ? data.getInt32(i * 4, true) * MS_PER_DAY
+          : readInt64(data, i * 8);
+      return new Date(ms).toISOString().slice(0, 10);
+    }
+  }
+}
+
+/**
+ * A dataframe held as Arrow columns. Built by {@link decodeArrowIpc} or
+ * {@link buildArrowTable}; written by {@link encodeArrowIpc}.
+ */
+export class ArrowTable {
+  readonly fields: ArrowField[];
+  readonly numRows: number;
+  /** @internal Record batches, for re-encoding without a copy per cell. */
+  readonly batches: ArrowBatch[];
+  private _columns: ArrowColumn[] | null = null;
+
+  constructor(fields: ArrowField[], batches: ArrowBatch[]) {
+    this.fields = fields;
+    this.batches = batches;
+    this.numRows = batches.reduce((sum, b) => sum + b.length, 0);
+  }
+
+  get columns(): ArrowColumn[] {
+    this._columns ??= this.fields.map(
+      (field, i) =>
+        new ArrowColumn(field, this.batches.map((b) => b.chunks[i]))
+    );
+    return this._columns;
+  }
+
+  column(name: string): ArrowColumn | undefined {
+    return this.columns.find((c) => c.name === name);
+  }
+
+  /**
+   * Row-major cells, `data[row][column]` — the `data` of a `DataframeRef`.
+   * The one place rows are built, for consumers that need them.
+   */
+  toMatrix(): unknown[][] {
+    const columns = this.columns.map((c) => c.toArray());
+    const out: unknown[][] = new Array(this.numRows);
+    for (let r = 0; r < this.numRows; r++) {
+      const row: unknown[] = new Array(columns.length);
+      for (let c = 0; c < columns.length; c++) row[c] = columns[c][r];
+      out[r] = row;
+    }
+    return out;
+  }
+}
+
+// ── Building from JS values ────────────────────────────────────────────
+
+/**
+ * Build a one-batch table from `numRows` × `names.length` cells, read
+ * through `cell(row, column)` so callers can serve them from rows, a matrix
+ * or anything else without reshaping first.
+ *
+ * Column types are inferred: all-integer numbers become int64, other
+ * numbers float64, and booleans and strings their own types; null and
+ * undefined are nulls. Returns null when a column mixes kinds or holds
+ * anything else (objects, dates, bigints), or when a column's text passes
+ * 2 GiB — the caller then keeps its own representation.
+ */
+export function buildArrowTable(
+  names: string[],
+  numRows: number,
+  cell: (row: number, column: number) => unknown
+): ArrowTable | null {
+  const fields: ArrowField[] = [];
+  const chunks: ArrowChunk[] = [];
+  for (let c = 0; c < names.length; c++) {
+    const type = inferType(numRows, (r) => cell(r, c));
+    if (!type) return null;
+    const chunk = buildChunk(type, numRows, (r) => cell(r, c));
+    if (!chunk) return null;
+    fields.push({ name: names[c], type, nullable: true });
+    chunks.push(chunk);
+  }
+  return new ArrowTable(fields, [{ length: numRows, chunks }]);
+}
+
+function inferType(
+  numRows: number,
+  value: (row: number) => unknown
+): ArrowType | null {
+  let kind: "number" | "boolean" | "string" | null = null;
+  let integral = true;
+  for (let r = 0; r < numRows; r++) {
+    const v = value(r);
+    if (v === null || v === undefined) continue;
+    const k = typeof v;
+    if (k !== "number" && k !== "boolean" && k !== "string") return null;
+    if (kind !== null && kind !== k) return null;
+    kind = k;
+    if (k === "number" && integral) {
+      integral = Number.isSafeInteger(v);
+    }
+  }
+  switch (kind) {
+    case null:
+      return { kind: "null" };
+    case "boolean":
+      return { kind: "bool" };
+    case "string":
+      return { kind: "utf8", large: false };
+    default:
+      return integral
+        ? { kind: "int", bitWidth: 64, signed: true }
+        : { kind: "float", bitWidth: 64 };
+  }
+}
+
+function buildChunk(
+  type: ArrowType,
+  numRows: number,
+  value: (row: number) => unknown
+): ArrowChunk | null {
+  const empty = new DataView(new ArrayBuffer(0));
+  if (type.kind === "null") {
+    return {
+      length: numRows,
+      nullCount: numRows,
+      validity: null,
+      offsets: null,
+      data: empty
+    };
+  }
+  const validity = new Uint8Array(Math.ceil(numRows / 8));
+  let nullCount = 0;
+  const valid = (r: number, v: unknown): boolean => {
+    if (v === null || v === undefined) {
+      nullCount++;
+      return false;
+    }
+    validity[r >> 3] |= 1 << (r & 7);
+    return true;
+  };
+
+  let data: Uint8Array;
+  let offsets: Uint8Array | null = null;
+  if (type.kind === "bool") {
+    data = new Uint8Array(Math.ceil(numRows / 8));
+    for (let r = 0; r < numRows; r++) {
+      const v = value(r);
+      if (valid(r, v) && v) data[r >> 3] |= 1 << (r & 7);
+    }
+  } else if (type.kind === "utf8") {
+    const offsetBytes = new Uint8Array((numRows + 1) * 4);
+    const offsetView = view(offsetBytes);
+    let text = new Uint8Array(Math.max(64, numRows * 8));
+    let end = 0;
+    for (let r = 0; r < numRows; r++) {
+      const v = value(r);
+      if (valid(r, v)) {
+        const s = v as string;
+        // UTF-8 needs at most three bytes per UTF-16 code unit.
+        if (text.length - end < s.length * 3) {
+          const grown = new Uint8Array(
+            Math.max(text.length * 2, end + s.length * 3)
+          );
+          grown.set(text.subarray(0, end));
+          text = grown;
+        }
+        end += utf8Encoder.encodeInto(s, text.subarray(end)).written;
+        if (end > 0x7fffffff) return null;
+      }
+      offsetView.setInt32((r + 1) * 4, end, true);
+    }
+    offsets = offsetBytes;
+    data = text.subarray(0, end);
+  } else {
+    data = new Uint8Array(numRows * 8);
+    const out = view(data);
+    const integral = type.kind === "int";
+    for (let r = 0; r < numRows; r++) {
+      const v = value(r);
+      if (!valid(r, v)) continue;
+      if (integral) writeInt64(out, r * 8, v as number);
+      else out.setFloat64(r * 8, v as number, true);
+    }
+  }
+  return {
+    length: numRows,
+    nullCount,
+    validity: nullCount > 0 ? validity : null,
+    offsets: offsets ? view(offsets) : null,
+    data: view(data)
+  };
+}
+
+// ── Flatbuffers ────────────────────────────────────────────────────────
+//
+// IPC metadata is flatbuffers (Schema.fbs, Message.fbs in the Arrow repo).
+// The handful of tables used here are written and read by hand rather than
+// through generated code.
+
+/** Message.header union tags. */
+const HEADER_SCHEMA = 1;
+const HEADER_DICTIONARY_BATCH = 2;
+const HEADER_RECORD_BATCH = 3;
+/** Type union tags. */
+const TYPE_NULL = 1;
+const TYPE_INT = 2;
+const TYPE_FLOAT = 3;
+const TYPE_UTF8 = 5;
+const TYPE_BOOL = 6;
+const TYPE_DATE = 8;
+const TYPE_TIMESTAMP = 10;
+const TYPE_LARGE_UTF8 = 20;
+/** MetadataVersion.V5. */
+const METADATA_V5 = 4;
+const CONTINUATION = 0xffffffff;
+
+/**
+ * Back-to-front flatbuffer builder, after the reference implementation:
+ * children are written before their parents, so every offset points
+ * forward, and alignment is kept relative to the end of the buffer.
+ */
+class FlatBuilder {
+  private _bytes = new Uint8Array(256);
+  private _view = new DataView(this._bytes.buffer);
+  private _space = 256;
+  private _minAlign = 1;
+  private _vtable: number[] = [];
+  private _objectStart = 0;
+
+  /** Bytes written so far; an object's position, counted from the end. */
+  offset(): number {
+    return this._bytes.length - this._space;
+  }
+
+  private _grow(): void {
+    const old = this._bytes;
+    const bytes = new Uint8Array(old.length * 2);
+    bytes.set(old, bytes.length - old.length);
+    this._space += bytes.length - old.length;
+    this._bytes = bytes;
+    this._view = new DataView(bytes.buffer);
+  }
+
+  /** Pad so that `size` bytes written after `additional` more are aligned. */
+  private _prep(size: number, additional: number): void {
+    if (size > this._minAlign) this._minAlign = size;
+    const pad = -(this.offset() + additional) & (size - 1);
+    while (this._space < pad + size + additional) this._grow();
+    for (let i = 0; i < pad; i++) this._bytes[--this._space] = 0;
+  }
+
+  int8(value: number): void {
+    this._prep(1, 0);
+    this._view.setInt8(--this._space, value);
+  }
+
+  int16(value: number): void {
+    this._prep(2, 0);
+    this._space -= 2;
+    this._view.setInt16(this._space, value, true);
+  }
+
+  int32(value: number): void {
+    this._prep(4, 0);
+    this._space -= 4;
+    this._view.setInt32(this._space, value, true);
+  }
+
+  int64(value: number): void {
+    this._prep(8, 0);
+    this._space -= 8;
+    writeInt64(this._view, this._space, value);
+  }
+
+  /** A uoffset to an object written earlier. */
+  offsetTo(target: number): void {
+    this._prep(4, 0);
+    const relative = this.offset() - target + 4;
+    this._space -= 4;
+    this._view.setUint32(this._space, relative, true);
+  }
+
+  string(value: string): number {
+    const utf8 = utf8Encoder.encode(value);
+    this._prep(4, utf8.length + 1);
+    this._bytes[--this._space] = 0;
+    this._space -= utf8.length;
+    this._bytes.set(utf8, this._space);
+    return this._endVector(utf8.length);
+  }
+
+  offsetVector(targets: number[]): number {
+    this._prep(4, targets.length * 4);
+    for (let i = targets.length - 1; i >= 0; i--) this.offsetTo(targets[i]);
+    return this._endVector(targets.length);
+  }
+
+  /** A vector of structs of two int64s (FieldNode, Buffer). */
+  pairVector(pairs: Array<[number, number]>): number {
+    this._prep(4, pairs.length * 16);
+    this._prep(8, pairs.length * 16);
+    for (let i = pairs.length - 1; i >= 0; i--) {
+      this.int64(pairs[i][1]);
+      this.int64(pairs[i][0]);
+    }
+    return this._endVector(pairs.length);
+  }
+
+  private _endVector(length: number): number {
+    this._space -= 4;
+    this._view.setUint32(this._space, length, true);
+    return this.offset();
+  }
+
+  startTable(fieldCount: number): void {
+    this._vtable = new Array<number>(fieldCount).fill(0);
+    this._objectStart = this.offset();
+  }
+
+  field(id: number, write: () => void): void {
+    write();
+    this._vtable[id] = this.offset();
+  }
+
+  endTable(): number {
+    this.int32(0);
+    const object = this.offset();
+    let count = this._vtable.length;
+    while (count > 0 && this._vtable[count - 1] === 0) count--;
+    for (let i = count - 1; i >= 0; i--) {
+      this.int16(this._vtable[i] ? object - this._vtable[i] : 0);
+    }
+    this.int16(object - this._objectStart);
+    this.int16((count + 2) * 2);
+    this._view.setInt32(
+      this._bytes.length - object,
+      this.offset() - object,
+      true
+    );
+    return object;
+  }
+
+  finish(root: number): Uint8Array {
+    this._prep(this._minAlign, 4);
+    this.offsetTo(root);
+    return this._bytes.slice(this._space);
+  }
+}
+
+/** A flatbuffer table being read. */
+class FlatTable {
+  constructor(
+    private readonly _view: DataView,
+    private readonly _pos: number
+  ) {}
+
+  static root(view: DataView): FlatTable {
+    return new FlatTable(view, view.getUint32(0, true));
+  }
+
+  /** Absolute position of field `id`, or 0 when absent. */
+  private _field(id: number): number {
+    const vtable = this._pos - this._view.getInt32(this._pos, true);
+    const entry = 4 + id * 2;
+    if (entry >= this._view.getUint16(vtable, true)) return 0;
+    const rel = this._view.getUint16(vtable + entry, true);
+    return rel ? this._pos + rel : 0;
+  }
+
+  private _deref(pos: number): number {
+    return pos + this._view.getUint32(pos, true);
+  }
+
+  uint8(id: number, fallback = 0): number {
+    const p = this._field(id);
+    return p ? this._view.getUint8(p) : fallback;
+  }
+
+  int16(id: number, fallback = 0): number {
+    const p = this._field(id);
+    return p ? this._view.getInt16(p, true) : fallback;
+  }
+
+  int32(id: number, fallback = 0): number {
+    const p = this._field(id);
+    return p ? this._view.getInt32(p, true) : fallback;
+  }
+
+  int64(id: number, fallback = 0): number {
+    const p = this._field(id);
+    return p ? readInt64(this._view, p) : fallback;
+  }
+
+  has(id: number): boolean {
+    return this._field(id) !== 0;
+  }
+
+  table(id: number): FlatTable | null {
+    const p = this._field(id);
+    return p ? new FlatTable(this._view, this._deref(p)) : null;
+  }
+
+  string(id: number): string | null {
+    const p = this._field(id);
+    if (!p) return null;
+    const s = this._deref(p);
+    const length = this._view.getUint32(s, true);
+    return utf8Decoder.decode(
+      new Uint8Array(
+        this._view.buffer,
+        this._view.byteOffset + s + 4,
+        length
+      )
+    );
+  }
+
+  tables(id: number): FlatTable[] {
+    const p = this._field(id);
+    if (!p) return [];
+    const v = this._deref(p);
+    const out: FlatTable[] = [];
+    const length = this._view.getUint32(v, true);
+    for (let i = 0; i < length; i++) {
+      out.push(new FlatTable(this._view, this._deref(v + 4 + i * 4)));
+    }
+    return out;
+  }
+
+  pairs(id: number): Array<[number, number]> {
+    const p = this._field(id);
+    if (!p) return [];
+    const v = this._deref(p);
+    const out: Array<[number, number]> = [];
+    const length = this._view.getUint32(v, true);
+    for (let i = 0; i < length; i++) {
+      const at = v + 4 + i * 16;
+      out.push([readInt64(this._view, at), readInt64(this._view, at + 8)]);
+    }
+    return out;
+  }
+}
+
+// ── Encoding ───────────────────────────────────────────────────────────
+
+function typeTag(type: ArrowType): number {
+  switch (type.kind) {
+    case "null":
+      return TYPE_NULL;
+    case "bool":
+      return TYPE_BOOL;
+    case "int":
+      return TYPE_INT;
+    case "float":
+      return TYPE_FLOAT;
+    case "utf8":
+      return type.large ? TYPE_LARGE_UTF8 : TYPE_UTF8;
+    case "timestamp":
+      return TYPE_TIMESTAMP;
+    case "date":
+      return TYPE_DATE;
+  }
+}
+
+function writeType(b: FlatBuilder, type: ArrowType): number {
+  if (type.kind === "int") {
+    b.startTable(2);
+    b.field(0, () => b.int32(type.bitWidth));
+    b.field(1, () => b.int8(type.signed ? 1 : 0));
+    return b.endTable();
+  }
+  if (type.kind === "float") {
+    b.startTable(1);
+    // Precision: HALF, SINGLE, DOUBLE.
+    b.field(0, () => b.int16(type.bitWidth === 32 ? 1 : 2));
+    return b.endTable();
+  }
+  if (type.kind === "timestamp") {
+    const timezone = type.timezone === null ? 0 : b.string(type.timezone);
+    b.startTable(2);
+    if (timezone) b.field(1, () => b.offsetTo(timezone));
+    b.field(0, () => b.int16(TIME_UNITS.indexOf(type.unit)));
+    return b.endTable();
+  }
+  if (type.kind === "date") {
+    b.startTable(1);
+    // DateUnit: DAY, MILLISECOND.
+    b.field(0, () => b.int16(type.unit === "day" ? 0 : 1));
+    return b.endTable();
+  }
+  b.startTable(0);
+  return b.endTable();
+}
+
+function message(
+  headerType: number,
+  header: (b: FlatBuilder) => number,
+  bodyLength: number
+): Uint8Array {
+  const b = new FlatBuilder();
+  const h = header(b);
+  b.startTable(5);
+  b.field(3, () => b.int64(bodyLength));
+  b.field(2, () => b.offsetTo(h));
+  b.field(0, () => b.int16(METADATA_V5));
+  b.field(1, () => b.int8(headerType));
+  return b.finish(b.endTable());
+}
+
+function schemaMessage(fields: ArrowField[]): Uint8Array {
+  return message(
+    HEADER_SCHEMA,
+    (b) => {
+      const offsets = fields.map((field) => {
+        const name = b.string(field.name);
+        const type = writeType(b, field.type);
+        const children = b.offsetVector([]);
+        b.startTable(7);
+        b.field(0, () => b.offsetTo(name));
+        b.field(3, () => b.offsetTo(type));
+        b.field(5, () => b.offsetTo(children));
+        b.field(1, () => b.int8(field.nullable ? 1 : 0));
+        b.field(2, () => b.int8(typeTag(field.type)));
+        return b.endTable();
+      });
+      const vector = b.offsetVector(offsets);
+      b.startTable(4);
+      b.field(1, () => b.offsetTo(vector));
+      // Endianness.Little
+      b.field(0, () => b.int16(0));
+      return b.endTable();
+    },
+    0
+  );
+}
+
+/** The buffers of one chunk, in IPC order. */
+function chunkBuffers(type: ArrowType, chunk: ArrowChunk): Uint8Array[] {
+  if (type.kind === "null") return [];
+  const bytes = (v: DataView): Uint8Array =>
+    new Uint8Array(v.buffer, v.byteOffset, v.byteLength);
+  const validity = chunk.validity ?? new Uint8Array(0);
+  return type.kind === "utf8"
+    ? [validity, bytes(chunk.offsets!), bytes(chunk.data)]
+    : [validity, bytes(chunk.data)];
+}
+
+const pad8 = (n: number): number => (n + 7) & ~7;
+
+/**
+ * Encode `table` as an Arrow IPC stream: schema, one record batch per
+ * batch of the table, end-of-stream. Buffers are copied once, into the
+ * returned bytes.
+ */
+export function encodeArrowIpc(table: ArrowTable): Uint8Array {
+  const parts: Array<{ metadata: Uint8Array; body: Uint8Array[] }> = [
+    { metadata: schemaMessage(table.fields), body: [] }
+  ];
+  for (const batch of table.batches) {
+    const body: Uint8Array[] = [];
+    const nodes: Array<[number, number]> = [];
+    const buffers: Array<[number, number]> = [];
+    let bodyLength = 0;
+    batch.chunks.forEach((chunk, i) => {
+      nodes.push([chunk.length, chunk.nullCount]);
+      for (const buffer of chunkBuffers(table.fields[i].type, chunk)) {
+        buffers.push([bodyLength, buffer.byteLength]);
+        body.push(buffer);
+        bodyLength += pad8(buffer.byteLength);
+      }
+    });
+    const metadata = message(
+      HEADER_RECORD_BATCH,
+      (b) => {
+        const buffersVector = b.pairVector(buffers);
+        const nodesVector = b.pairVector(nodes);
+        b.startTable(5);
+        b.field(0, () => b.int64(batch.length));
+        b.field(1, () => b.offsetTo(nodesVector));
+        b.field(2, () => b.offsetTo(buffersVector));
+        return b.endTable();
+      },
+      bodyLength
+    );
+    parts.push({ metadata, body });
+  }
+
+  let total = 8;
+  for (const { metadata, body } of parts) {
+    total += 8 + pad8(metadata.byteLength);
+    for (const buffer of body) total += pad8(buffer.byteLength);
+  }
+  const out = new Uint8Array(total);
+  const outView = view(out);
+  let at = 0;
+  for (const { metadata, body } of parts) {
+    outView.setUint32(at, CONTINUATION, true);
+    outView.setInt32(at + 4, pad8(metadata.byteLength), true);
+    out.set(metadata, at + 8);
+    at += 8 + pad8(metadata.byteLength);
+    for (const buffer of body) {
+      out.set(buffer, at);
+      at += pad8(buffer.byteLength);
+    }
+  }
+  // End of stream: continuation marker and a zero length.
+  outView.setUint32(at, CONTINUATION, true);
+  return out;
+}
+
+// ── Decoding ───────────────────────────────────────────────────────────
+
+function readType(field: FlatTable, name: string): ArrowType {
+  const tag = field.uint8(2);
+  const type = field.table(3);
+  switch (tag) {
+    case TYPE_NULL:
+      return { kind: "null" };
+    case TYPE_BOOL:
+      return { kind: "bool" };
+    case TYPE_UTF8:
+      return { kind: "utf8", large: false };
+    case TYPE_LARGE_UTF8:
+      return { kind: "utf8", large: true };
+    case TYPE_INT: {
+      const bitWidth = type?.int32(0) ?? 0;
+      if (
+        bitWidth === 8 ||
+        bitWidth === 16 ||
+        bitWidth === 32 ||
+        bitWidth === 64
+      ) {
+        return { kind: "int", bitWidth, signed: type?.uint8(1) === 1 };
+      }
+      break;
+    }
+    case TYPE_FLOAT: {
+      const precision = type?.int16(0) ?? 0;
+      if (precision === 1 || precision === 2) {
+        return { kind: "float", bitWidth: precision === 1 ? 32 : 64 };
+      }
+      break;
+    }
+    case TYPE_TIMESTAMP: {
+      const unit = TIME_UNITS[type?.int16(0) ?? -1];
+      if (unit) {
+        return { kind: "timestamp", unit, timezone: type?.string(1) ?? null };
+      }
+      break;
+    }
+    case TYPE_DATE: {
+      // The unit defaults to MILLISECOND when the field is left out.
+      const unit = type?.int16(0, 1) ?? 1;
+      if (unit === 0 || unit === 1) {
+        return { kind: "date", unit: unit === 0 ? "day" : "ms" };
+      }
+      break;
+    }
+  }
+  throw new Error(`Arrow column "${name}" has an unsupported type (${tag})`);
+}
+
+function readSchema(schema: FlatTable): ArrowField[] {
+  return schema.tables(1).map((field) => {
+    const name = field.string(0) ?? "";
+    if (field.has(4)) {
+      throw new Error(`Arrow column "${name}" is dictionary-encoded`);
+    }
+    return {
+      name,
+      type: readType(field, name),
+      nullable: field.uint8(1) === 1
+    };
+  });
+}
+
+function readBatch(
+  batch: FlatTable,
+  body: Uint8Array,
+  fields: ArrowField[]
+): ArrowBatch {
+  if (batch.has(3)) {
+    throw new Error("Compressed Arrow batches are not supported");
+  }
+  const nodes = batch.pairs(1);
+  const buffers = batch.pairs(2);
+  if (nodes.length !== fields.length) {
+    throw new Error(
+      `Arrow batch has ${nodes.length} columns, schema has ${fields.length}`
+    );
+  }
+  let next = 0;
+  const take = (): Uint8Array => {
+    const [offset, length] = buffers[next++] ?? [0, -1];
+    if (length < 0 || offset + length > body.byteLength) {
+      throw new Error("Arrow batch buffer out of bounds");
+    }
+    return body.subarray(offset, offset + length);
+  };
+  const chunks = fields.map((field, i): ArrowChunk => {
+    const [length, nullCount] = nodes[i];
+    if (field.type.kind === "null") {
+      return {
+        length,
+        nullCount: length,
+        validity: null,
+        offsets: null,
+        data: new DataView(new ArrayBuffer(0))
+      };
+    }
+    const validity = take();
+    const offsets = field.type.kind === "utf8" ? view(take()) : null;
+    return {
+      length,
+      nullCount,
+      validity: nullCount > 0 ? validity : null,
+      offsets,
+      data: view(take())
+    };
+  });
+  return { length: batch.int64(0), chunks };
+}
+
+/**
+ * Decode an Arrow IPC stream into a table. Buffers are not copied: the
+ * table reads from `bytes`, which must not be reused while it is alive.
+ */
+export function decodeArrowIpc(bytes: Uint8Array): ArrowTable {
+  const input = view(bytes);
+  let fields: ArrowField[] | null = null;
+  const batches: ArrowBatch[] = [];
+  let at = 0;
+  while (at + 4 <= bytes.byteLength) {
+    let length = input.getInt32(at, true);
+    at += 4;
+    // Streams before Arrow 0.15 have no continuation marker.
+    if (length === -1) {
+      if (at + 4 > bytes.byteLength) break;
+      length = input.getInt32(at, true);
+      at += 4;
+    }
+    if (length === 0) break;
+    if (length < 0 || at + length > bytes.byteLength) {
+      throw new Error("Truncated Arrow IPC message");
+    }
+    const msg = FlatTable.root(view(bytes.subarray(at, at + length)));
+    at += length;
+    const bodyLength = msg.int64(3);
+    if (at + bodyLength > bytes.byteLength) {
+      throw new Error("Truncated Arrow IPC message body");
+    }
+    const body = bytes.subarray(at, at + bodyLength);
+    at += bodyLength;
+    const header = msg.table(2);
+    const headerType = msg.uint8(1);
+    if (!header) throw new Error("Arrow IPC message has no header");
+    if (headerType === HEADER_SCHEMA) {
+      fields = readSchema(header);
+    } else if (headerType === HEADER_RECORD_BATCH) {
+      if (!fields) throw new Error("Arrow record batch before its schema");
+      batches.push(readBatch(header, body, fields));
+    } else if (headerType === HEADER_DICTIONARY_BATCH) {
+      throw new Error("Dictionary-encoded Arrow columns are not supported");
+    }
+  }
+  if (!fields) throw new Error("Arrow IPC stream has no schema");
+  return new ArrowTable(fields, batches);
+}
@@ -4,38 +4,110 @@
  * Truncates a conversation to fit within a token budget.
  * Drops oldest messages first, keeping the most recent ones.
  * Token counts come from js-tiktoken (see `./token-counter.ts`).
+ *
+ * Counting is the expensive part, so per-message counts are memoized in a
+ * bounded LRU keyed by the encoding and a hash of the counted text: packing
+ * the same thread again only hashes it. For a thread that grows turn by
+ * turn, {@link ContextPacker} keeps running totals and counts each message
+ * once, when it is appended.
  */
 
+import { getNodeBuiltinSync } from "@nodetool-ai/config";
 import type { Message } from "./providers/types.js";
-import { countTokens, truncateToTokens } from "./token-counter.js";
+import {
+  countTokens,
+  TOKEN_ENCODING,
+  truncateToTokens
+} from "./token-counter.js";
 import { isString } from "./type-predicates.js";
 
+const nodeCrypto =
+  getNodeBuiltinSync<typeof import("node:crypto")>("node:crypto");
+
 /** Fixed token overhead for non-text content blocks (images, audio). */
 const NON_TEXT_BLOCK_TOKENS = 25;
 
-function estimateMessageTokens(msg: Message): number {
-  let tokens = 0;
+/** Per-message counts kept; the least recently used go first. */
+const MESSAGE_TOKEN_CACHE_SIZE = 4096;
+
+const messageTokenCache = new Map<string, number>();
+
+/** The strings a message is charged for, plus its fixed-cost tokens. */
+function messageTexts(msg: Message): { texts: string[]; fixed: number } {
+  const texts: string[] = [];
+  let fixed = 0;
   if (msg.content === null || msg.content === undefined) {
-    tokens = 1;
+    fixed = 1;
   } else if (isString(msg.content)) {
-    tokens = countTokens(msg.content);
+    texts.push(msg.content);
   } else {
     for (const part of msg.content) {
-      tokens +=
-        part.type === "text" ? countTokens(part.text) : NON_TEXT_BLOCK_TOKENS;
+      if (part.type === "text") texts.push(part.text ?? "");
+      else fixed += NON_TEXT_BLOCK_TOKENS;
     }
   }
   for (const call of msg.toolCalls ?? []) {
-    tokens += countTokens(call.name) + countTokens(JSON.stringify(call.args));
+    texts.push(call.name ?? "", JSON.stringify(call.args) ?? "");
+  }
+  return { texts, fixed };
+}
+
+function cacheKey(texts: string[], fixed: number): string | null {
+  if (!nodeCrypto || texts.length === 0) return null;
+  // Length-prefixed, so moving text between pieces changes the key.
+  const hash = nodeCrypto.createHash("sha256").update(`${fixed}`);
+  for (const text of texts) hash.update(`:${text.length}:`).update(text);
+  return `${TOKEN_ENCODING}:${hash.digest("base64")}`;
+}
+
+/**
+ * Token cost of one message: its text, tool-call names and arguments, 25 per
+ * non-text block, and 1 for a message without content. Memoized by content,
+ * so a message seen before (by value, not identity) is not counted again.
+ */
+export function estimateMessageTokens(msg: Message): number {
+  const { texts, fixed } = messageTexts(msg);
+  const key = cacheKey(texts, fixed);
+  if (key !== null) {
+    const hit = messageTokenCache.get(key);
+    if (hit !== undefined) {
+      messageTokenCache.delete(key);
+      messageTokenCache.set(key, hit);
+      return hit;
+    }
+  }
+  let tokens = fixed;
+  for (const text of texts) tokens += countTokens(text);
+  if (key !== null) {
+    messageTokenCache.set(key, tokens);
+    if (messageTokenCache.size > MESSAGE_TOKEN_CACHE_SIZE) {
+      messageTokenCache.delete(messageTokenCache.keys().next().value!);
+    }
   }
   return tokens;
 }
 
+/** Forget every memoized message count (for tests and cold benchmarks). */
+export function clearMessageTokenCache(): void {
+  messageTokenCache.clear();
+}
+
 export interface PackedContext {
   messages: Message[];
   systemPrompt: string;
 }
 
+/** The system prompt, truncated to the budget if it alone exceeds it. */
+function fitSystemPrompt(
+  systemPrompt: string,
+  maxTokens: number
+): { systemPrompt: string; tokens: number } {
+  const tokens = countTokens(systemPrompt);
+  if (tokens <= maxTokens) return { systemPrompt, tokens };
+  const truncated = truncateToTokens(systemPrompt, maxTokens);
+  return { systemPrompt: truncated, tokens: countTokens(truncated) };
+}
+
 /**
  * Pack messages and system prompt into a token budget.
  *
@@ -49,29 +121,126 @@ export function packContext(
   systemPrompt: string,
   maxTokens: number
 ): PackedContext {
-  let sysPrompt = systemPrompt;
-  let sysTokens = countTokens(sysPrompt);
+  const sys = fitSystemPrompt(systemPrompt, maxTokens);
+  let remaining = maxTokens - sys.tokens;
+  if (remaining <= 0) return { messages: [], systemPrompt: sys.systemPrompt };
 
-  // If system prompt alone exceeds budget, truncate it to the budget.
-  if (sysTokens > maxTokens) {
-    sysPrompt = truncateToTokens(sysPrompt, maxTokens);
-    sysTokens = countTokens(sysPrompt);
+  // Walk messages from most recent to oldest
+  let start = messages.length;
+  while (start > 0) {
+    const tokens = estimateMessageTokens(messages[start - 1]);
+    if (tokens > remaining) break; // stop at the first message that doesn't fit
+    remaining -= tokens;
+    start--;
   }
 
-  let remaining = maxTokens - sysTokens;
-  if (remaining <= 0) return { messages: [], systemPrompt: sysPrompt };
+  return { messages: messages.slice(start), systemPrompt: sys.systemPrompt };
+}
 
-  // Walk messages from most recent to oldest
-  const kept: Message[] = [];
-  for (let i = messages.length - 1; i >= 0; i--) {
-    const tokens = estimateMessageTokens(messages[i]);
-    if (tokens <= remaining) {
-      kept.unshift(messages[i]);
-      remaining -= tokens;
-    } else {
-      break; // stop at the first message that doesn't fit
+/**
+ * Incremental {@link packContext} for a thread that grows between packs.
+ *
+ * Each message is counted once, when it is appended; the packer keeps
+ * running totals, so {@link pack} itself counts nothing but a changed system
+ * prompt and finds the kept suffix by binary search. Packing gives exactly
+ * what `packContext` gives for the same messages.
+ *
+ * Messages are taken as immutable: one edited in place after it was appended
+ * keeps its old count. Use {@link sync} with the edited message replaced by
+ * a new object, or {@link reset}.
+ */
+export class ContextPacker {
+  private _messages: Message[] = [];
+  /** `_prefix[i]` is the token total of the first `i` messages. */
+  private _prefix: number[] = [0];
+  /** The last system prompt fitted, so an unchanged one is not recounted. */
+  private _lastSystem: {
+    prompt: string;
+    maxTokens: number;
+    fit: { systemPrompt: string; tokens: number };
+  } | null = null;
+
+  constructor(messages: readonly Message[] = []) {
+    this._add(messages);
+  }
+
+  /** Messages appended so far, oldest first. */
+  get messages(): readonly Message[] {
+    return this._messages;
+  }
+
+  /** Token total of every appended message. */
+  get messageTokens(): number {
+    return this._prefix[this._prefix.length - 1];
+  }
+
+  /** Count and append new messages. */
+  append(...messages: Message[]): void {
+    this._add(messages);
+  }
+
+  private _add(messages: readonly Message[]): void {
+    let total = this.messageTokens;
+    for (const msg of messages) {
+      total += estimateMessageTokens(msg);
+      this._messages.push(msg);
+      this._prefix.push(total);
     }
   }
 
-  return { messages: kept, systemPrompt: sysPrompt };
+  /**
+   * Follow a thread kept elsewhere. Messages the packer already holds at the
+   * same position (the same objects) keep their counts; everything from the
+   * first difference on is replaced and counted, so the usual call with the
+   * thread one turn longer only counts that turn.
+   */
+  sync(messages: readonly Message[]): void {
+    const known = Math.min(this._messages.length, messages.length);
+    let same = 0;
+    while (same < known && this._messages[same] === messages[same]) same++;
+    this._messages.length = same;
+    this._prefix.length = same + 1;
+    this._add(messages.slice(same));
+  }
+
+  /** Drop every message. */
+  reset(): void {
+    this._messages = [];
+    this._prefix = [0];
+  }
+
+  /** Pack the messages held so far, as {@link packContext} would. */
+  pack(systemPrompt: string, maxTokens: number): PackedContext {
+    const sys = this._fitSystemPrompt(systemPrompt, maxTokens);
+    const remaining = maxTokens - sys.tokens;
+    if (remaining <= 0) return { messages: [], systemPrompt: sys.systemPrompt };
+
+    // Smallest start whose suffix fits; counts are never negative, so the
+    // suffix totals only shrink as the start moves towards the newest.
+    const total = this.messageTokens;
+    let lo = 0;
+    let hi = this._messages.length;
+    while (lo < hi) {
+      const mid = (lo + hi) >>> 1;
+      if (total - this._prefix[mid] <= remaining) hi = mid;
+      else lo = mid + 1;
+    }
+    return {
+      messages: this._messages.slice(lo),
+      systemPrompt: sys.systemPrompt
+    };
+  }
+
+  private _fitSystemPrompt(
+    systemPrompt: string,
+    maxTokens: number
+  ): { systemPrompt: string; tokens: number } {
+    const last = this._lastSystem;
+    if (last?.prompt === systemPrompt && last.maxTokens === maxTokens) {
+      return last.fit;
+    }
+    const fit = fitSystemPrompt(systemPrompt, maxTokens);
+    this._lastSystem = { prompt: systemPrompt, maxTokens, fit };
+    return fit;
+  }
 }
@@ -26,6 +26,7 @@ import {
 } from "./invocation-account.js";
 import { VariableChannel } from "./variable-channel.js";
 import { loadMediaRefBytes, type MediaRefValue } from "./media-ref-bytes.js";
+import type { MediaBytesSource } from "./media-bytes-cache.js";
 import { encodeRawImageRef } from "./image-codec.js";
 import {
   isCallable,
@@ -40,6 +41,7 @@ import {
 } from "./prompt-asset-refs.js";
 import { getNodeBuiltinSync } from "@nodetool-ai/config";
 import type { Workspace } from "./workspace.js";
+import { TieredCache, type TieredCacheOptions } from "./tiered-cache.js";
 
 // `node:fs/promises`, `node:path`, `node:url`, `node:crypto` are loaded
 // lazily so this module loads in browser / Edge runtimes. The
@@ -1435,6 +1437,11 @@ export class ProcessingContext {
     assetOutputMode?: AssetOutputMode;
     persistOutputAssets?: boolean;
     cache?: CacheAdapter;
+    /**
+     * Build a bounded {@link TieredCache} from these options when no `cache`
+     * is passed. Without either, the context uses an unbounded MemoryCache.
+     */
+    cacheOptions?: TieredCacheOptions;
     storage?: StorageAdapter | null;
     assetStorage?: StorageAdapter | null;
     workspaceStorage?: StorageAdapter | null;
@@ -1486,7 +1493,11 @@ export class ProcessingContext {
     this.workspaceDir = this.workspace?.localDir ?? opts.workspaceDir ?? null;
     this.assetOutputMode = opts.assetOutputMode ?? "native";
     this.persistOutputAssets = opts.persistOutputAssets ?? true;
-    this.cache = opts.cache ?? new MemoryCache();
+    this.cache =
+      opts.cache ??
+      (opts.cacheOptions
+        ? new TieredCache(opts.cacheOptions)
+        : new MemoryCache());
     this.storage = opts.storage ?? null;
     this.assetStorage = opts.assetStorage ?? null;
     this.workspaceStorage = opts.workspaceStorage ?? null;
@@ -1730,11 +1741,15 @@ export class ProcessingContext {
     if (pending) return pending;
 
     const resolution = (async () => {
-      const resolved = this._providerResolver
+      const provider = this._providerResolver
         ? await this._providerResolver(providerId)
         : await import("./providers/index.js").then(({ getProvider }) =>
             getProvider(providerId, (key) => this.getSecret(key))
           );
+      // Opt-in response cache (NODETOOL_LLM_CACHE_MODELS); a no-op when unset.
+      const resolved = await import("./providers/caching-provider.js").then(
+        ({ cachingProviderFromEnv }) => cachingProviderFromEnv(provider)
+      );
       this._providers.set(providerId, resolved);
       resolved.setMessageEmitter((msg) =>
         this.postMessage(msg as ProcessingMessage)
@@ -2596,13 +2611,18 @@ export class ProcessingContext {
    * a prefix listing that tolerates extension mismatches, then an HTTP download
    * from the server's `/api/storage` route. Returns the bytes plus an `attempts`
    * trail for callers that build detailed errors; `null` bytes means unresolved.
+   * `source` says where bytes read from storage or a package file came from,
+   * so the media cache can check them again cheaply; downloads carry none.
    */
-  async resolveAssetBytes(
-    assetId: string
-  ): Promise<{ bytes: Uint8Array | null; attempts: string[] }> {
+  async resolveAssetBytes(assetId: string): Promise<{
+    bytes: Uint8Array | null;
+    attempts: string[];
+    source?: MediaBytesSource;
+  }> {
     const idCandidates = this.parseAssetIdCandidates(assetId);
     const trimmed = assetId.trim();
     const attempts: string[] = [];
+    let source: MediaBytesSource | undefined;
 
     // Assets live in the asset store; `this.storage` is the *temp* store on
     // server paths. Probe the asset adapter first and keep the temp adapter as
@@ -2619,6 +2639,7 @@ export class ProcessingContext {
       try {
         const retrieved = await adapter.retrieve(uri);
         if (retrieved) {
+          source = { kind: "storage", adapter, uri };
           return retrieved;
         }
         attempts.push(`storage miss: ${uri}`);
@@ -2650,7 +2671,11 @@ export class ProcessingContext {
             try {
               const bytes = (await readFile(filePath)) as Uint8Array;
               attempts.push(`package asset: ${filePath}`);
-              return { bytes, attempts };
+              return {
+                bytes,
+                attempts,
+                source: { kind: "file", path: filePath }
+              };
             } catch (error) {
               attempts.push(
                 `package asset miss: ${filePath} (${error instanceof Error ? error.message : String(error)})`
@@ -2689,7 +2714,7 @@ export class ProcessingContext {
       for (const adapter of adapters) {
         const direct = await tryStorageUri(adapter, trimmed);
         if (direct) {
-          return { bytes: direct, attempts };
+          return { bytes: direct, attempts, source };
         }
       }
       if (/^https?:\/\//.test(trimmed)) {
@@ -2723,7 +2748,7 @@ export class ProcessingContext {
         for (const key of keys) {
           const bytes = await tryStorageUri(adapter, adapter.uriForKey(key));
           if (bytes) {
-            return { bytes, attempts };
+            return { bytes, attempts, source };
           }
         }
       }
@@ -2787,7 +2812,7 @@ export class ProcessingContext {
         for (const prefix of prefixes) {
           const bytes = await tryListing(prefix);
           if (bytes) {
-            return { bytes, attempts };
+            return { bytes, attempts, source };
           }
         }
       }
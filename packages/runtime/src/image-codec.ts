@@ -7,9 +7,17 @@
  * Python bridge) lazily encodes them to PNG via these helpers. Everything else
  * must go through the shared decode/encode paths rather than assume `data` is
  * already an encoded image.
+ *
+ * Encodes are memoized on the pixel buffer, so an image that reaches several
+ * boundaries (a preview, a saved asset, a Python node) is encoded once per
+ * encoding; the cached bytes live exactly as long as the buffer. In-flight
+ * pixel buffers are treated as immutable — an op writes a new buffer rather
+ * than editing its input. Encode time is charged to the invocation account,
+ * where the run profiler reads it.
  */
 import { importHidden } from "@nodetool-ai/config";
 import { isRawRgbaImage, type ImageRef } from "@nodetool-ai/protocol";
+import { recordInvocationEncodeTime } from "./invocation-account.js";
 
 type SharpModuleNs = typeof import("sharp");
 type SharpFn = SharpModuleNs["default"];
@@ -57,17 +65,63 @@ async function loadSharp(): Promise<SharpFn | null> {
   return _sharpPromise.catch(() => null);
 }
 
-/** Encode raw straight-alpha RGBA8 pixels to PNG bytes. */
-export async function encodeRawRgbaToPng(
+/**
+ * How raw pixels are encoded. `"png"` is a regular compressed PNG, for
+ * anything that leaves the process. `"png-fast"` is a PNG without
+ * compression: still lossless and readable by any decoder, but several times
+ * quicker to write, for internal hops such as the Python bridge where the
+ * bytes are decoded again at once.
+ */
+export type RawImageEncoding = "png" | "png-fast";
+
+/** Encoded bytes per pixel buffer, by encoding and dimensions. */
+const encodedCache = new WeakMap<
+  Uint8Array,
+  Map<string, Promise<Uint8Array>>
+>();
+
+/**
+ * Encode raw straight-alpha RGBA8 pixels to PNG bytes. Each buffer is encoded
+ * at most once per encoding: later calls share the first call's result.
+ */
+export function encodeRawRgbaToPng(
+  data: Uint8Array,
+  width: number,
+  height: number,
+  encoding: RawImageEncoding = "png"
+): Promise<Uint8Array> {
+  let byEncoding = encodedCache.get(data);
+  if (!byEncoding) {
+    byEncoding = new Map();
+    encodedCache.set(data, byEncoding);
+  }
+  const key = `${encoding}:${width}x${height}`;
+  const cached = byEncoding.get(key);
+  if (cached) return cached;
+  const started = performance.now();
+  const encoded = encodeRawRgba(data, width, height, encoding).finally(() =>
+    recordInvocationEncodeTime(performance.now() - started)
+  );
+  byEncoding.set(key, encoded);
+  // A failed encode (no codec yet) is retried by the next caller.
+  encoded.catch(() => {
+    if (byEncoding.get(key) === encoded) byEncoding.delete(key);
+  });
+  return encoded;
+}
+
+async function encodeRawRgba(
   data: Uint8Array,
   width: number,
-  height: number
+  height: number,
+  encoding: RawImageEncoding
 ): Promise<Uint8Array> {
   const sharp = await loadSharp();
   if (!sharp) {
     // No sharp (off Node, or a Node target where the addon won't load). Use
     // OffscreenCanvas when the runtime exposes one (a bundled browser/edge or a
     // Node build with Canvas); otherwise fail with a clear, actionable error.
+    // Canvas has no compression setting, so both encodings are its default.
     if (typeof OffscreenCanvas !== "undefined") {
       const canvas = new OffscreenCanvas(width, height);
       const ctx = canvas.getContext("2d");
@@ -86,7 +140,7 @@ export async function encodeRawRgbaToPng(
     Buffer.from(data.buffer, data.byteOffset, data.byteLength),
     { raw: { width, height, channels: 4 } }
   )
-    .png()
+    .png(encoding === "png-fast" ? { compressionLevel: 0 } : undefined)
     .toBuffer();
   return new Uint8Array(png);
 }
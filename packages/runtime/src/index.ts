@@ -25,6 +25,16 @@ export {
   type StorageStat
 } from "./context.js";
 
+export {
+  DiskCache,
+  TieredCache,
+  estimateCacheValueSize,
+  type DiskCacheOptions,
+  type DiskCacheStats,
+  type TieredCacheOptions,
+  type TieredCacheStats
+} from "./tiered-cache.js";
+
 // The run's workspace, as an interface over any storage backend. Importing
 // `storage-workspace.js` here also installs the factory ProcessingContext uses
 // to build a workspace from a plain `workspaceDir`.
@@ -93,6 +103,8 @@ export {
   inInvocationAccount,
   recordInvocationCost,
   recordInvocationAsset,
+  recordInvocationBridgeTime,
+  recordInvocationEncodeTime,
   currentInvocationAccount,
   type InvocationAccount
 } from "./invocation-account.js";
@@ -102,7 +114,13 @@ export {
   type TurnReservation,
   type CostCappedTurnBudgetOptions
 } from "./turn-budget.js";
-export { packContext, type PackedContext } from "./context-packer.js";
+export {
+  clearMessageTokenCache,
+  ContextPacker,
+  estimateMessageTokens,
+  packContext,
+  type PackedContext
+} from "./context-packer.js";
 export {
   isZodSchema,
   parseWithTypeCoercion,
@@ -111,12 +129,18 @@ export {
   type ZodOrJsonSchema
 } from "./zod-schema.js";
 export { VariableChannel } from "./variable-channel.js";
-export { countTokens, truncateToTokens } from "./token-counter.js";
+export {
+  countTokens,
+  TOKEN_ENCODING,
+  truncateToTokens
+} from "./token-counter.js";
 export {
   PythonStdioBridge,
   type PythonBridgeOptions,
   type PythonNodeMetadata,
   type ExecuteResult,
+  type ExecuteBatchItem,
+  type ExecuteBatchOutcome,
   type ProgressEvent,
   type PythonWorkerLoadError,
   type PythonWorkerStatus
@@ -125,6 +149,7 @@ import { PythonBridgeBase } from "./python-bridge-base.js";
 export { PythonBridgeBase };
 export type {
   UnifiedModelLike,
+  PythonDiscovery,
   ExecuteIdentity,
   JobBoundary,
   PythonJobLifecycle,
@@ -147,12 +172,47 @@ export {
 export { createPythonBridge } from "./python-bridge-factory.js";
 export {
   encodeFrame,
+  writeFrame,
   FrameDecoder,
   FrameSizeError,
   DEFAULT_MAX_BRIDGE_FRAME_SIZE,
-  type FrameDecoderOptions
+  type FrameDecoderOptions,
+  type FrameSink
 } from "./python-bridge-framing.js";
+export {
+  SharedMemoryArena,
+  SHM_CAPABILITY,
+  defaultShmRoot,
+  type ShmDescriptor,
+  type ShmBlobs,
+  type SharedMemoryOptions
+} from "./python-bridge-shm.js";
+export {
+  ArrowColumn,
+  ArrowTable,
+  buildArrowTable,
+  decodeArrowIpc,
+  encodeArrowIpc,
+  type ArrowField,
+  type ArrowType,
+  type ArrowTimeUnit
+} from "./arrow-ipc.js";
+export {
+  ARROW_CAPABILITY,
+  ARROW_FORMAT,
+  ARROW_RESULT_TYPES,
+  dataframeArrowTable,
+  decodeDataframeOutput,
+  encodeDataframeInput,
+  isArrowDataframeMarker,
+  isDataframeValue
+} from "./python-bridge-arrow.js";
 export { SwappableBridge } from "./swappable-python-bridge.js";
+export {
+  PooledPythonBridge,
+  type PooledPythonBridgeOptions,
+  type PythonPoolStats
+} from "./pooled-python-bridge.js";
 /**
  * Transport-agnostic public handle for a Python worker bridge. An interface
  * (not the concrete base) so both the stdio/WebSocket bridges and the
@@ -173,13 +233,25 @@ export {
   encodeRawImageRef,
   extractImageRegion
 } from "./image-codec.js";
-export type { ImageRegion } from "./image-codec.js";
+export type { ImageRegion, RawImageEncoding } from "./image-codec.js";
 export { PythonNodeExecutor } from "./python-node-executor.js";
 export {
   connectPythonBridgeForGraph,
   resolvePythonNodeExecutor
 } from "./python-graph-resolver.js";
-export { loadMediaRefBytes, type MediaRefValue } from "./media-ref-bytes.js";
+export {
+  loadMediaRefBytes,
+  streamMediaRefBytes,
+  type MediaRefValue
+} from "./media-ref-bytes.js";
+export {
+  MediaBytesCache,
+  getMediaBytesCache,
+  type MediaBytesCacheOptions,
+  type MediaBytesCacheStats,
+  type MediaBytesEntry,
+  type MediaBytesSource
+} from "./media-bytes-cache.js";
 export {
   assetRefToPromptToken,
   classifyAssetToken,
@@ -202,10 +274,12 @@ export {
 export { logPythonWorkerStderr } from "./python-worker-stderr.js";
 export {
   type NodeExecutor,
+  type BatchItemResult,
   type StreamingInputs,
   type StreamingOutputs,
   type MessageEnvelopeLike,
-  type TriggerEvent
+  type TriggerEvent,
+  type WorkerNodeSpec
 } from "./node-executor.js";
 export {
   createFakeContext,
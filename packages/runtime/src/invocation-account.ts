@@ -25,12 +25,22 @@ export interface InvocationAccount {
   costUsd: number;
   /** True once the invocation created an asset. */
   createdAssets: boolean;
+  /**
+   * Time (ms) spent waiting on the Python bridge. Read by the run profiler
+   * to split a node's execution between JS and Python.
+   */
+  bridgeMs: number;
+  /**
+   * Time (ms) spent encoding raw images for a boundary (see
+   * `image-codec.ts`). Read by the run profiler.
+   */
+  encodeMs: number;
 }
 
 const store = new AsyncLocalStorage<InvocationAccount>();
 
 export function createInvocationAccount(): InvocationAccount {
-  return { costUsd: 0, createdAssets: false };
+  return { costUsd: 0, createdAssets: false, bridgeMs: 0, encodeMs: 0 };
 }
 
 /**
@@ -67,6 +77,18 @@ export function recordInvocationAsset(): void {
   if (account) account.createdAssets = true;
 }
 
+/** Add Python-bridge wait time to the invocation on the async stack, if any. */
+export function recordInvocationBridgeTime(ms: number): void {
+  const account = store.getStore();
+  if (account) account.bridgeMs += ms;
+}
+
+/** Add raw-image encode time to the invocation on the async stack, if any. */
+export function recordInvocationEncodeTime(ms: number): void {
+  const account = store.getStore();
+  if (account) account.encodeMs += ms;
+}
+
 /** The account for the invocation currently on the async stack, if any. */
 export function currentInvocationAccount(): InvocationAccount | undefined {
   return store.getStore();
@@ -0,0 +1,173 @@
+/**
+ * Process-wide cache of resolved media bytes.
+ *
+ * `loadMediaRefBytes` reads a file, a storage object or a URL every time a
+ * node asks for a ref's bytes; in a fan-out graph the same image is loaded by
+ * every branch. This cache keeps what was loaded, least recently used first
+ * out, under a byte budget, and runs concurrent loads of one key once.
+ *
+ * Every entry remembers where its bytes came from (a {@link MediaBytesSource})
+ * and that source's version — size and mtime for files and storage objects,
+ * the ETag or Last-Modified validator for HTTP. A hit is only served once the
+ * source still reports that version, so a file or object replaced in place is
+ * read again. Bytes handed out are shared between callers: treat them as
+ * read-only.
+ */
+
+import { safeProcessEnv } from "@nodetool-ai/config";
+import type { StorageAdapter } from "./context.js";
+
+/** Default byte budget: 256 MiB. */
+const DEFAULT_MAX_BYTES = 256 * 1024 * 1024;
+
+/** Where a cached entry's bytes were read from. */
+export type MediaBytesSource =
+  | { kind: "file"; path: string }
+  | { kind: "storage"; adapter: StorageAdapter; uri: string }
+  | { kind: "http"; url: string; etag?: string; lastModified?: string };
+
+export interface MediaBytesEntry {
+  bytes: Uint8Array;
+  source: MediaBytesSource;
+  /** The source's version when the bytes were read. */
+  version: string;
+}
+
+/** Counters for a {@link MediaBytesCache}. */
+export interface MediaBytesCacheStats {
+  /** Loads answered from the cache. */
+  hits: number;
+  /** Loads that had to read the source. */
+  misses: number;
+  /** Loads that joined a load of the same key already in flight. */
+  deduped: number;
+  evictions: number;
+  bytes: number;
+  entries: number;
+}
+
+export interface MediaBytesCacheOptions {
+  /** Byte budget; 0 turns caching off (in-flight loads are still shared). */
+  maxBytes?: number;
+  /** Largest single entry kept. Default a quarter of the budget. */
+  maxEntryBytes?: number;
+}
+
+/**
+ * Byte-budgeted LRU of {@link MediaBytesEntry}s plus a table of loads in
+ * flight. It stores and evicts; deciding whether an entry is still current
+ * is the caller's job (see `media-ref-bytes.ts`).
+ */
+export class MediaBytesCache {
+  readonly maxBytes: number;
+  readonly maxEntryBytes: number;
+  /** Insertion order doubles as recency: a hit re-inserts its key. */
+  private _entries = new Map<string, MediaBytesEntry>();
+  private _inFlight = new Map<string, Promise<unknown>>();
+  private _bytes = 0;
+  private _counters = { hits: 0, misses: 0, deduped: 0, evictions: 0 };
+
+  constructor(options: MediaBytesCacheOptions = {}) {
+    this.maxBytes = Math.max(0, options.maxBytes ?? DEFAULT_MAX_BYTES);
+    this.maxEntryBytes = Math.min(
+      this.maxBytes,
+      options.maxEntryBytes ?? Math.floor(this.maxBytes / 4)
+    );
+  }
+
+  /** The entry held for `key`, without counting a hit or touching recency. */
+  peek(key: string): MediaBytesEntry | undefined {
+    return this._entries.get(key);
+  }
+
+  /** Count a hit on `key` and make it the most recently used. */
+  hit(key: string): void {
+    const entry = this._entries.get(key);
+    if (!entry) return;
+    this._counters.hits++;
+    this._entries.delete(key);
+    this._entries.set(key, entry);
+  }
+
+  /** Count a load that had to go to the source. */
+  miss(): void {
+    this._counters.misses++;
+  }
+
+  /**
+   * Keep `entry` under `key`, evicting the least recently used entries to
+   * stay within budget. An entry over `maxEntryBytes` is not kept, and
+   * drops whatever older entry the key held.
+   */
+  set(key: string, entry: MediaBytesEntry): void {
+    this.delete(key);
+    const size = entry.bytes.byteLength;
+    if (size > this.maxEntryBytes) return;
+    this._entries.set(key, entry);
+    this._bytes += size;
+    for (const [oldest, old] of this._entries) {
+      if (this._bytes <= this.maxBytes) break;
+      this._entries.delete(oldest);
+      this._bytes -= old.bytes.byteLength;
+      this._counters.evictions++;
+    }
+  }
+
+  delete(key: string): void {
+    const entry = this._entries.get(key);
+    if (!entry) return;
+    this._entries.delete(key);
+    this._bytes -= entry.bytes.byteLength;
+  }
+
+  clear(): void {
+    this._entries.clear();
+    this._bytes = 0;
+  }
+
+  /**
+   * Run `load` for `key`, or join the run already in flight for it. The
+   * shared promise is forgotten once it settles, so a failure is retried by
+   * the next caller.
+   */
+  dedupe<T>(key: string, load: () => Promise<T>): Promise<T> {
+    const pending = this._inFlight.get(key);
+    if (pending) {
+      this._counters.deduped++;
+      // SAFETY: every load under one key resolves to the same type.
+      return pending as Promise<T>;
+    }
+    const run = load().finally(() => {
+      if (this._inFlight.get(key) === run) this._inFlight.delete(key);
+    });
+    this._inFlight.set(key, run);
+    return run;
+  }
+
+  get stats(): MediaBytesCacheStats {
+    return {
+      ...this._counters,
+      bytes: this._bytes,
+      entries: this._entries.size
+    };
+  }
+}
+
+function budgetFromEnv(): number {
+  const raw = safeProcessEnv()["NODETOOL_MEDIA_CACHE_MAX_BYTES"];
+  const parsed = Number(raw);
+  return raw !== undefined && raw.trim() !== "" && parsed >= 0
+    ? parsed
+    : DEFAULT_MAX_BYTES;
+}
+
+let sharedCache: MediaBytesCache | null = null;
+
+/**
+ * The cache `loadMediaRefBytes` uses, created on first use with the budget
+ * from `NODETOOL_MEDIA_CACHE_MAX_BYTES` (default 256 MiB, 0 for off).
+ */
+export function getMediaBytesCache(): MediaBytesCache {
+  sharedCache ??= new MediaBytesCache({ maxBytes: budgetFromEnv() });
+  return sharedCache;
+}
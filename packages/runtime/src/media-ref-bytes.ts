@@ -1,9 +1,15 @@
 import { isPackageAssetUri, isRawRgbaImage } from "@nodetool-ai/protocol";
 import { getNodeBuiltinSync } from "@nodetool-ai/config";
 import type { ProcessingContext } from "./context.js";
-import { encodeRawRgbaToPng } from "./image-codec.js";
+import { encodeRawRgbaToPng, type RawImageEncoding } from "./image-codec.js";
+import {
+  getMediaBytesCache,
+  type MediaBytesEntry,
+  type MediaBytesSource
+} from "./media-bytes-cache.js";
 import { isNonEmptyString } from "./type-predicates.js";
 
+const _nodeFs = getNodeBuiltinSync<typeof import("node:fs")>("node:fs");
 const _nodeFsP = getNodeBuiltinSync<typeof import("node:fs/promises")>(
   "node:fs/promises"
 );
@@ -101,40 +107,158 @@ function decodeDataUri(uri: string): Uint8Array | null {
   }
 }
 
-async function readUriBytes(uri: string): Promise<Uint8Array | null> {
-  if (uri.startsWith("data:")) {
-    return decodeDataUri(uri);
-  }
+/** Bytes, plus where they were read from when that can be checked again. */
+interface ResolvedBytes {
+  bytes: Uint8Array | null;
+  source?: MediaBytesSource;
+}
 
+/** The filesystem path a `file://` uri or absolute path names, else null. */
+function filePathOf(uri: string): string | null {
   if (uri.startsWith("file://")) {
     try {
-      return await readFile(fileURLToPath(uri));
+      return fileURLToPath(uri);
     } catch {
       return null;
     }
   }
+  return isAbsoluteFilePath(uri) ? uri : null;
+}
 
-  if (isAbsoluteFilePath(uri)) {
+async function readUriBytes(uri: string): Promise<ResolvedBytes> {
+  if (uri.startsWith("data:")) {
+    return { bytes: decodeDataUri(uri) };
+  }
+
+  const path = filePathOf(uri);
+  if (path !== null) {
     try {
-      return await readFile(uri);
+      return { bytes: await readFile(path), source: { kind: "file", path } };
     } catch {
+      return { bytes: null };
+    }
+  }
+
+  return { bytes: null };
+}
+
+/** Validators of an HTTP response, or undefined when it has neither. */
+function httpSource(
+  url: string,
+  response: Response
+): MediaBytesSource | undefined {
+  const etag = response.headers?.get("etag") ?? undefined;
+  const lastModified = response.headers?.get("last-modified") ?? undefined;
+  if (!etag && !lastModified) return undefined;
+  return { kind: "http", url, etag, lastModified };
+}
+
+/**
+ * The version `source` reports now, or null when it cannot say (gone, or an
+ * adapter without `stat`). HTTP sources carry theirs.
+ */
+async function sourceVersion(
+  source: MediaBytesSource
+): Promise<string | null> {
+  try {
+    switch (source.kind) {
+      case "file": {
+        if (!_nodeFsP) return null;
+        const st = await _nodeFsP.stat(source.path);
+        return `${st.size}:${st.mtimeMs}`;
+      }
+      case "storage": {
+        const st = await source.adapter.stat(source.uri);
+        return st ? `${st.size}:${st.modifiedAt}` : null;
+      }
+      case "http":
+        return source.etag ?? source.lastModified ?? null;
+    }
+  } catch {
+    return null;
+  }
+}
+
+/**
+ * Check a cached entry against its source. Returns the entry itself while
+ * the source is unchanged, a fresh entry when revalidating already fetched
+ * the new bytes (an HTTP 200 to a conditional GET; its version is empty when
+ * the response has no validator, so it is served but not kept), or null
+ * when the ref has to be resolved again.
+ */
+async function revalidate(
+  entry: MediaBytesEntry,
+  context: ProcessingContext | undefined
+): Promise<MediaBytesEntry | null> {
+  const { source } = entry;
+  if (source.kind === "storage") {
+    // Only through an adapter this context reads from.
+    if (
+      source.adapter !== context?.storage &&
+      source.adapter !== context?.assetStorage
+    ) {
       return null;
     }
   }
+  if (source.kind !== "http") {
+    return (await sourceVersion(source)) === entry.version ? entry : null;
+  }
+  try {
+    const headers: Record<string, string> = {};
+    if (source.etag) headers["If-None-Match"] = source.etag;
+    if (source.lastModified) {
+      headers["If-Modified-Since"] = source.lastModified;
+    }
+    const response = await fetch(source.url, { headers });
+    if (response.status === 304) return entry;
+    if (!response.ok) return null;
+    const bytes = new Uint8Array(await response.arrayBuffer());
+    const fresh = httpSource(source.url, response);
+    return fresh
+      ? { bytes, source: fresh, version: (await sourceVersion(fresh)) ?? "" }
+      : { bytes, source, version: "" };
+  } catch {
+    return null;
+  }
+}
 
-  return null;
+/** Cache key of a ref: who asks, and every field resolution reads. */
+function mediaCacheKey(
+  value: MediaRefValue,
+  context: ProcessingContext | undefined
+): string {
+  return [
+    context?.userId ?? "",
+    value.type ?? "",
+    value.uri ?? "",
+    value.asset_id ?? ""
+  ].join("\n");
 }
 
 /**
  * Resolve bytes for an image/audio/video/model ref.
  * Shared by the Python bridge and TS nodes (e.g. Save Image).
+ *
+ * A raw-RGBA image is encoded with `options.encoding` (default `"png"`);
+ * internal hops whose bytes never leave the process pass `"png-fast"`.
+ *
+ * Bytes read from a file, storage or a URL go through the process-wide
+ * {@link getMediaBytesCache}: a ref loaded before is served from memory once
+ * its source reports the same version, and concurrent loads of one ref share
+ * a single read. The returned bytes may be shared — do not modify them.
  */
 export async function loadMediaRefBytes(
   value: MediaRefValue,
-  context?: ProcessingContext
+  context?: ProcessingContext,
+  options: { encoding?: RawImageEncoding } = {}
 ): Promise<Uint8Array | null> {
   if (isRawRgbaImage(value)) {
-    return encodeRawRgbaToPng(value.data, value.width, value.height);
+    return encodeRawRgbaToPng(
+      value.data,
+      value.width,
+      value.height,
+      options.encoding
+    );
   }
 
   const data = value.data;
@@ -149,11 +273,52 @@ export async function loadMediaRefBytes(
   if (!uri && !value.asset_id) {
     return null;
   }
+  if (uri?.startsWith("data:")) {
+    // Already in memory; decoding is cheaper than keying on the payload.
+    return decodeDataUri(uri);
+  }
+
+  const cache = getMediaBytesCache();
+  const key = mediaCacheKey(value, context);
+  return cache.dedupe(key, async () => {
+    const held = cache.peek(key);
+    if (held) {
+      const current = await revalidate(held, context);
+      if (current === held) {
+        cache.hit(key);
+        return held.bytes;
+      }
+      cache.miss();
+      if (current) {
+        if (current.version) cache.set(key, current);
+        else cache.delete(key);
+        return current.bytes;
+      }
+      cache.delete(key);
+    } else {
+      cache.miss();
+    }
+
+    const { bytes, source } = await resolveMediaRefBytes(value, context);
+    if (bytes && source) {
+      const version = await sourceVersion(source);
+      if (version !== null) cache.set(key, { bytes, source, version });
+    }
+    return bytes;
+  });
+}
+
+/** Resolve a ref with no inline data, recording where the bytes came from. */
+async function resolveMediaRefBytes(
+  value: MediaRefValue,
+  context: ProcessingContext | undefined
+): Promise<ResolvedBytes> {
+  const uri = value.uri;
 
   if (uri && (uri.startsWith("asset://") || isPackageAssetUri(uri)) && context) {
-    const { bytes } = await context.resolveAssetBytes(uri);
+    const { bytes, source } = await context.resolveAssetBytes(uri);
     if (bytes) {
-      return bytes;
+      return { bytes, source };
     }
   }
 
@@ -161,11 +326,11 @@ export async function loadMediaRefBytes(
   // The early-return above only bails when both uri and asset_id are absent, so
   // an empty-uri ref like `{ asset_id, uri: "" }` still reaches this path.
   if (!uri && value.asset_id && context) {
-    const { bytes } = await context.resolveAssetBytes(
+    const { bytes, source } = await context.resolveAssetBytes(
       `asset://${value.asset_id}`
     );
     if (bytes) {
-      return bytes;
+      return { bytes, source };
     }
   }
 
@@ -186,17 +351,20 @@ export async function loadMediaRefBytes(
     for (const candidate of candidates) {
       const stored = await context.storage.retrieve(candidate);
       if (stored !== null) {
-        return stored;
+        return {
+          bytes: stored,
+          source: { kind: "storage", adapter: context.storage, uri: candidate }
+        };
       }
     }
   }
 
   if (!uri) {
-    return null;
+    return { bytes: null };
   }
 
   const fromUri = await readUriBytes(uri);
-  if (fromUri !== null) {
+  if (fromUri.bytes !== null) {
     return fromUri;
   }
 
@@ -204,12 +372,72 @@ export async function loadMediaRefBytes(
     try {
       const response = await fetch(uri);
       if (response.ok) {
-        return new Uint8Array(await response.arrayBuffer());
+        return {
+          bytes: new Uint8Array(await response.arrayBuffer()),
+          source: httpSource(uri, response)
+        };
       }
     } catch {
       // fall through
     }
   }
 
-  return null;
+  return { bytes: null };
+}
+
+async function* once(bytes: Uint8Array): AsyncGenerator<Uint8Array> {
+  yield bytes;
+}
+
+/**
+ * Streaming {@link loadMediaRefBytes}, for media too large to hold at once
+ * (long videos): a local file or `file://` uri is read in chunks and an
+ * http(s) uri streams its response body, neither ever whole in memory nor
+ * cached. A ref already in the media cache and current is served from it.
+ * Anything else — inline data, raw pixels, assets in storage, which has no
+ * streaming read — is loaded whole and yielded as one chunk.
+ */
+export async function streamMediaRefBytes(
+  value: MediaRefValue,
+  context?: ProcessingContext
+): Promise<AsyncIterable<Uint8Array> | null> {
+  const uri = value.uri;
+  const hasInline =
+    isRawRgbaImage(value) ||
+    isNonEmptyString(value.data) ||
+    (value.data instanceof Uint8Array && value.data.length > 0);
+  if (!hasInline) {
+    const held = getMediaBytesCache().peek(mediaCacheKey(value, context));
+    if (
+      held &&
+      held.source.kind !== "http" &&
+      (await revalidate(held, context)) === held
+    ) {
+      return once(held.bytes);
+    }
+  }
+  if (!hasInline && uri) {
+    const path = filePathOf(uri);
+    if (path !== null && _nodeFs && _nodeFsP) {
+      const isFile = await _nodeFsP.stat(path).then(
+        (st) => st.isFile(),
+        () => false
+      );
+      if (isFile) return _nodeFs.createReadStream(path);
+    }
+
+    if (uri.startsWith("http://") || uri.startsWith("https://")) {
+      try {
+        const response = await fetch(uri);
+        if (response.ok && response.body) {
+          return response.body as unknown as AsyncIterable<Uint8Array>;
+        }
+      } catch {
+        // fall back to the whole-bytes path
+      }
+    }
+  }
+
+  const bytes = await loadMediaRefBytes(value, context);
+  return bytes ? once(bytes) : null;
 }
@@ -155,6 +155,34 @@ export interface TriggerEvent {
 // Node execution interface (implemented by actual node classes)
 // ---------------------------------------------------------------------------
 
+/**
+ * How to run a node's `process` off the main thread. The worker imports
+ * `module`, finds the node class whose `nodeType` matches among its exports
+ * and calls `process` on a fresh instance — so `module` must be importable
+ * on its own and the node must not need a `ProcessingContext`.
+ */
+export interface WorkerNodeSpec {
+  /** URL (usually the defining module's `import.meta.url`) or specifier. */
+  module: string;
+  nodeType: string;
+  /**
+   * Runs on the main thread before the inputs are posted: resolves anything
+   * that needs the context (asset URIs, storage reads) into plain values.
+   */
+  prepare?(
+    inputs: Record<string, unknown>,
+    context?: ProcessingContext
+  ): Promise<Record<string, unknown>>;
+}
+
+/**
+ * One invocation's outcome in {@link NodeExecutor.processBatch}: its outputs,
+ * or the error that failed it and only it.
+ */
+export type BatchItemResult =
+  | { outputs: Record<string, unknown> }
+  | { error: Error };
+
 export interface NodeExecutor {
   /** One-shot processing (buffered mode). */
   process(
@@ -162,6 +190,24 @@ export interface NodeExecutor {
     context?: ProcessingContext
   ): Promise<Record<string, unknown>>;
 
+  /**
+   * Several buffered invocations in one call, e.g. one round trip to a
+   * Python worker for a whole fan-out. The actor groups invocations that are
+   * ready at the same time, up to {@link maxBatchSize}, and still routes,
+   * memoizes and recovers each one on its own. Returns one entry per input,
+   * in order.
+   */
+  processBatch?(
+    inputs: Record<string, unknown>[],
+    context?: ProcessingContext
+  ): Promise<BatchItemResult[]>;
+
+  /**
+   * Most invocations per {@link processBatch} call. Read before each group,
+   * so it may change at run time; below 2 turns batching off.
+   */
+  readonly maxBatchSize?: number;
+
   /**
    * Generator processing (streaming output mode).
    * Each yielded record is a partial output batch.
@@ -209,4 +255,11 @@ export interface NodeExecutor {
     event: TriggerEvent,
     outputs: StreamingOutputs
   ): Promise<void>;
+
+  /**
+   * Set for CPU-bound nodes that can run in a worker thread. A runner given
+   * a worker pool routes their `process` calls there; without one, or for
+   * streaming invocations, the node runs in-process as usual.
+   */
+  worker?: WorkerNodeSpec;
 }
@@ -0,0 +1,877 @@
+/**
+ * A {@link PythonBridge} over a pool of Python workers.
+ *
+ * One worker means one interpreter: every Python-backed node of every
+ * concurrent run shares its GIL, so one heavy node stalls the whole server.
+ * The pool keeps between `minWorkers` and `maxWorkers` worker bridges, each
+ * its own process, and places every call on one of them:
+ *
+ * - A node type (or provider model) sticks to the worker that first ran it,
+ *   so a model that worker loaded stays resident and is never loaded twice.
+ * - Anything new goes to an idle worker, else to a freshly spawned one while
+ *   the pool is below `maxWorkers`, else to the least-loaded worker.
+ *
+ * `spareWorkers` idle workers are kept started ahead of demand, so a burst
+ * does not wait on interpreter startup. Idle workers above `minWorkers` are
+ * closed after `idleTimeoutMs`. A worker that exits, errors or fails a
+ * health check is retired: its placements are dropped and the pool refills.
+ *
+ * Only the first worker sends `discover`; the others are created with its
+ * result (`PythonBridgeOptions.discovered`), and node metadata is answered
+ * from that one copy.
+ *
+ * Node-level calls that carry a request id (`cancel`, model download and
+ * Comfy cancellation) go to the worker that owns the request. Model
+ * management and Comfy calls, which act on state shared by every worker of
+ * the same environment, go to one worker; `jobStart` / `jobEnd` and
+ * `evictModels` go to all of them.
+ */
+
+import { EventEmitter } from "node:events";
+
+import { createLogger } from "@nodetool-ai/config";
+
+import type {
+  PythonBridge,
+  PythonDiscovery,
+  ExecuteResult,
+  ExecuteInputBlobs,
+  ExecuteBatchItem,
+  ExecuteBatchOutcome,
+  ExecuteIdentity,
+  JobBoundary,
+  ModelEvictRequest,
+  ModelEvictResult,
+  ProgressEvent,
+  PythonNodeMetadata,
+  PythonWorkerLoadError,
+  PythonWorkerStatus,
+  PythonProviderInfo,
+  UnifiedModelLike,
+  ModelDownloadRequest,
+  ModelDownloadUpdate,
+  ComfyStatusInfo,
+  ComfyEvent,
+  ComfyExecuteOptions,
+  ComfyExecuteResult,
+  ComfyModelDownloadRequest,
+  ComfyModelDownloadUpdate,
+  ComfyModelInfo
+} from "./python-bridge-types.js";
+import type { ASRResult } from "./providers/types.js";
+
+// Stryker disable next-line StringLiteral: logger name is a diagnostic label, not a behavioural contract
+const log = createLogger("nodetool.runtime.pooled-python-bridge");
+
+/**
+ * Worker events the pool re-emits. `exit` and `error` are not among them: a
+ * worker that exits or errors is replaced, which the pool's holders need not
+ * know about. The pool emits `exit` itself only when it has no worker left.
+ */
+const FORWARDED_EVENTS = [
+  "stderr",
+  "stdout",
+  "activity",
+  "progress",
+  "reconnected"
+] as const;
+
+export interface PooledPythonBridgeOptions {
+  /**
+   * Build one unconnected worker bridge. `discovered` is the first worker's
+   * `discover` result, once there is one; pass it through as
+   * `PythonBridgeOptions.discovered`.
+   */
+  createWorker: (discovered?: PythonDiscovery) => PythonBridge;
+  /** Workers kept running at all times once connected. Default 1. */
+  minWorkers?: number;
+  /** Upper bound on concurrently running workers. Default 4. */
+  maxWorkers?: number;
+  /** Idle workers kept started ahead of demand. Default 1. */
+  spareWorkers?: number;
+  /** Close workers above `minWorkers` idle this long (0 = off). Default 60s. */
+  idleTimeoutMs?: number;
+  /** Interval between health checks of idle workers (0 = off). Default 30s. */
+  healthCheckIntervalMs?: number;
+  /** A health check slower than this fails. Default 10s. */
+  healthCheckTimeoutMs?: number;
+}
+
+/** Pool counters, from {@link PooledPythonBridge.stats}. */
+export interface PythonPoolStats {
+  /** Workers started or running. */
+  workers: number;
+  /** Workers with no call in flight. */
+  idle: number;
+  /** Calls in flight across the pool. */
+  inFlight: number;
+  /** Workers started since the pool was created. */
+  spawned: number;
+  /** Workers retired after an exit, error or failed health check. */
+  retired: number;
+  /** Calls placed on the worker that already ran their node type. */
+  affinityHits: number;
+}
+
+type WorkerState = "starting" | "ready" | "closed";
+
+interface PoolWorker {
+  id: number;
+  bridge: PythonBridge;
+  state: WorkerState;
+  ready: Promise<void>;
+  inFlight: number;
+  idleSince: number;
+  /** Placement keys (node types, provider models) pinned to this worker. */
+  keys: Set<string>;
+  listeners: Array<[string, (...args: unknown[]) => void]>;
+}
+
+export class PooledPythonBridge extends EventEmitter implements PythonBridge {
+  private readonly _createWorker: (
+    discovered?: PythonDiscovery
+  ) => PythonBridge;
+  private readonly _min: number;
+  private readonly _max: number;
+  private readonly _spares: number;
+  private readonly _idleTimeoutMs: number;
+  private readonly _healthIntervalMs: number;
+  private readonly _healthTimeoutMs: number;
+
+  private _workers: PoolWorker[] = [];
+  private _nextId = 0;
+  /** Placement key → the worker it is pinned to. */
+  private _placements = new Map<string, PoolWorker>();
+  /** Request id → the worker serving it, for cancellation. */
+  private _requests = new Map<string, PoolWorker>();
+  private _discovered: PythonDiscovery | null = null;
+  private _connectPromise: Promise<void> | null = null;
+  private _healthTimer: NodeJS.Timeout | null = null;
+  private _closed = false;
+  private _spawned = 0;
+  private _retired = 0;
+  private _affinityHits = 0;
+
+  constructor(options: PooledPythonBridgeOptions) {
+    super();
+    this._createWorker = options.createWorker;
+    this._min = Math.max(1, options.minWorkers ?? 1);
+    this._max = Math.max(this._min, options.maxWorkers ?? 4);
+    this._spares = Math.max(0, options.spareWorkers ?? 1);
+    this._idleTimeoutMs = options.idleTimeoutMs ?? 60_000;
+    this._healthIntervalMs = options.healthCheckIntervalMs ?? 30_000;
+    this._healthTimeoutMs = options.healthCheckTimeoutMs ?? 10_000;
+  }
+
+  get stats(): PythonPoolStats {
+    const live = this._live();
+    return {
+      workers: live.length,
+      idle: live.filter((w) => w.inFlight === 0).length,
+      inFlight: live.reduce((sum, w) => sum + w.inFlight, 0),
+      spawned: this._spawned,
+      retired: this._retired,
+      affinityHits: this._affinityHits
+    };
+  }
+
+  // ── Lifecycle ──────────────────────────────────────────────────────
+
+  /**
+   * Start the first worker — the one that sends `discover` — then bring the
+   * pool up to `minWorkers` with its result. Spares start in the background.
+   */
+  async connect(): Promise<void> {
+    this._closed = false;
+    const first = this._live()[0] ?? this._spawn();
+    await first.ready;
+    const rest: Promise<void>[] = [];
+    while (this._live().length < this._min) rest.push(this._spawn().ready);
+    await Promise.all(rest);
+    this._topUp();
+    this._startHealthChecks();
+  }
+
+  ensureConnected(): Promise<void> {
+    if (this.isConnected && this._live().length >= this._min) {
+      return Promise.resolve();
+    }
+    if (!this._connectPromise) {
+      this._connectPromise = this.connect().then(
+        () => {
+          this._connectPromise = null;
+        },
+        (err) => {
+          this._connectPromise = null;
+          throw err;
+        }
+      );
+    }
+    return this._connectPromise;
+  }
+
+  get isConnected(): boolean {
+    return this._workers.some((w) => w.state === "ready");
+  }
+
+  isAvailable(): boolean {
+    return this._ready()[0]?.bridge.isAvailable() ?? true;
+  }
+
+  close(): void {
+    this._closed = true;
+    if (this._healthTimer) clearInterval(this._healthTimer);
+    this._healthTimer = null;
+    for (const worker of [...this._workers]) this._retire(worker, false);
+  }
+
+  // ── Node metadata (shared) ─────────────────────────────────────────
+
+  getNodeMetadata(): PythonNodeMetadata[] {
+    return this._discovered?.nodes ?? [];
+  }
+
+  getLoadErrors(): PythonWorkerLoadError[] {
+    return (
+      this._ready()[0]?.bridge.getLoadErrors() ??
+      this._discovered?.loadErrors ??
+      []
+    );
+  }
+
+  hasNodeType(nodeType: string): boolean {
+    return this.getNodeMetadata().some((n) => n.node_type === nodeType);
+  }
+
+  async getWorkerStatus(): Promise<PythonWorkerStatus> {
+    return this._withWorker((bridge) => bridge.getWorkerStatus());
+  }
+
+  supportsModelManagement(): boolean {
+    return this._ready()[0]?.bridge.supportsModelManagement() ?? false;
+  }
+
+  supportsJobLifecycle(): boolean {
+    return this._ready()[0]?.bridge.supportsJobLifecycle() ?? false;
+  }
+
+  supportsExecuteBatch(): boolean {
+    return this._ready()[0]?.bridge.supportsExecuteBatch() ?? false;
+  }
+
+  supportsArrow(): boolean {
+    return this._ready()[0]?.bridge.supportsArrow() ?? false;
+  }
+
+  supportsComfy(): boolean {
+    return this._ready()[0]?.bridge.supportsComfy() ?? false;
+  }
+
+  getComfyStatus(): ComfyStatusInfo | null {
+    return this._ready()[0]?.bridge.getComfyStatus() ?? null;
+  }
+
+  getRecentStderrSummary(limit?: number): string | null {
+    const summaries = this._live()
+      .map((w) => w.bridge.getRecentStderrSummary(limit))
+      .filter((s): s is string => !!s);
+    return summaries.length > 0 ? summaries.join("\n") : null;
+  }
+
+  // ── Node execution (placed per node type) ──────────────────────────
+
+  async execute(
+    nodeType: string,
+    fields: Record<string, unknown>,
+    secrets: Record<string, string>,
+    blobs: ExecuteInputBlobs,
+    onProgress?: (event: ProgressEvent) => void,
+    identity?: ExecuteIdentity
+  ): Promise<ExecuteResult> {
+    const worker = await this._acquire(nodeType);
+    const seen = new Set<string>();
+    try {
+      return await worker.bridge.execute(
+        nodeType,
+        fields,
+        secrets,
+        blobs,
+        this._trackProgress(worker, seen, onProgress),
+        identity
+      );
+    } finally {
+      this._release(worker, seen);
+    }
+  }
+
+  async *executeStream(
+    nodeType: string,
+    fields: Record<string, unknown>,
+    secrets: Record<string, string>,
+    blobs: ExecuteInputBlobs,
+    onProgress?: (event: ProgressEvent) => void,
+    identity?: ExecuteIdentity
+  ): AsyncGenerator<ExecuteResult> {
+    const worker = await this._acquire(nodeType);
+    const seen = new Set<string>();
+    try {
+      yield* worker.bridge.executeStream(
+        nodeType,
+        fields,
+        secrets,
+        blobs,
+        this._trackProgress(worker, seen, onProgress),
+        identity
+      );
+    } finally {
+      this._release(worker, seen);
+    }
+  }
+
+  /** A batch is one placement: all of it runs on one worker. */
+  async executeBatch(
+    nodeType: string,
+    items: ExecuteBatchItem[],
+    secrets: Record<string, string>,
+    onProgress?: (event: ProgressEvent) => void,
+    identity?: ExecuteIdentity
+  ): Promise<ExecuteBatchOutcome[]> {
+    const worker = await this._acquire(nodeType);
+    const seen = new Set<string>();
+    try {
+      return await worker.bridge.executeBatch(
+        nodeType,
+        items,
+        secrets,
+        this._trackProgress(worker, seen, onProgress),
+        identity
+      );
+    } finally {
+      this._release(worker, seen);
+    }
+  }
+
+  cancel(requestId: string): void {
+    const owner = this._requests.get(requestId);
+    for (const worker of owner ? [owner] : this._ready()) {
+      try {
+        worker.bridge.cancel(requestId);
+      } catch {
+        // Worker may already be gone; cancel is best-effort.
+      }
+    }
+  }
+
+  // ── Providers (placed per provider model) ──────────────────────────
+
+  listProviders(): Promise<PythonProviderInfo[]> {
+    return this._withWorker((bridge) => bridge.listProviders());
+  }
+
+  getProviderModels(
+    providerId: string,
+    modelType: string,
+    secrets?: Record<string, string>
+  ): Promise<Record<string, unknown>[]> {
+    return this._withWorker((bridge) =>
+      bridge.getProviderModels(providerId, modelType, secrets)
+    );
+  }
+
+  providerGenerate(
+    providerId: string,
+    messages: Record<string, unknown>[],
+    model: string,
+    options?: Record<string, unknown>
+  ): Promise<Record<string, unknown>> {
+    return this._withWorker(
+      (bridge) => bridge.providerGenerate(providerId, messages, model, options),
+      providerKey(providerId, model)
+    );
+  }
+
+  async *providerStream(
+    providerId: string,
+    messages: Record<string, unknown>[],
+    model: string,
+    options?: Record<string, unknown>
+  ): AsyncGenerator<Record<string, unknown>> {
+    const worker = await this._acquire(providerKey(providerId, model));
+    try {
+      yield* worker.bridge.providerStream(providerId, messages, model, options);
+    } finally {
+      this._release(worker);
+    }
+  }
+
+  async *providerTTS(
+    providerId: string,
+    text: string,
+    model: string,
+    options?: Record<string, unknown>
+  ): AsyncGenerator<Uint8Array> {
+    const worker = await this._acquire(providerKey(providerId, model));
+    try {
+      yield* worker.bridge.providerTTS(providerId, text, model, options);
+    } finally {
+      this._release(worker);
+    }
+  }
+
+  providerTextToImage(
+    providerId: string,
+    params: Record<string, unknown>,
+    secrets?: Record<string, string>
+  ): Promise<Uint8Array> {
+    return this._withWorker(
+      (bridge) => bridge.providerTextToImage(providerId, params, secrets),
+      providerKey(providerId, params["model"])
+    );
+  }
+
+  providerImageToImage(
+    providerId: string,
+    image: Uint8Array,
+    params: Record<string, unknown>,
+    secrets?: Record<string, string>
+  ): Promise<Uint8Array> {
+    return this._withWorker(
+      (bridge) =>
+        bridge.providerImageToImage(providerId, image, params, secrets),
+      providerKey(providerId, params["model"])
+    );
+  }
+
+  providerASR(
+    providerId: string,
+    audio: Uint8Array,
+    model: string,
+    options?: Record<string, unknown>
+  ): Promise<ASRResult> {
+    return this._withWorker(
+      (bridge) => bridge.providerASR(providerId, audio, model, options),
+      providerKey(providerId, model)
+    );
+  }
+
+  providerEmbedding(
+    providerId: string,
+    text: string | string[],
+    model: string,
+    dimensions?: number
+  ): Promise<number[][]> {
+    return this._withWorker(
+      (bridge) => bridge.providerEmbedding(providerId, text, model, dimensions),
+      providerKey(providerId, model)
+    );
+  }
+
+  // ── Model management (one worker; the cache is shared on disk) ─────
+
+  listCachedModels(): Promise<UnifiedModelLike[]> {
+    return this._withWorker((bridge) => bridge.listCachedModels());
+  }
+
+  async downloadModel(
+    req: ModelDownloadRequest,
+    onProgress: (update: ModelDownloadUpdate) => void,
+    requestId?: string
+  ): Promise<void> {
+    return this._withRequest(requestId, (bridge) =>
+      bridge.downloadModel(req, onProgress, requestId)
+    );
+  }
+
+  cancelModelDownload(requestId: string): void {
+    const owner = this._requests.get(requestId);
+    for (const worker of owner ? [owner] : this._ready()) {
+      worker.bridge.cancelModelDownload(requestId);
+    }
+  }
+
+  deleteCachedModel(repoId: string): Promise<boolean> {
+    return this._withWorker((bridge) => bridge.deleteCachedModel(repoId));
+  }
+
+  /** Evict on every worker: each holds its own loaded models. */
+  async evictModels(req?: ModelEvictRequest): Promise<ModelEvictResult> {
+    const results = await Promise.all(
+      this._ready().map((w) => w.bridge.evictModels(req))
+    );
+    const merged: ModelEvictResult = { evicted: [] };
+    for (const result of results) {
+      merged.evicted.push(...result.evicted);
+      if (result.freed_vram_gb != null) {
+        merged.freed_vram_gb =
+          (merged.freed_vram_gb ?? 0) + result.freed_vram_gb;
+      }
+    }
+    return merged;
+  }
+
+  // ── Job lifecycle (every worker may hold the job's nodes) ──────────
+
+  async jobStart(job: JobBoundary): Promise<void> {
+    await Promise.all(this._ready().map((w) => w.bridge.jobStart(job)));
+  }
+
+  async jobEnd(job: JobBoundary): Promise<void> {
+    await Promise.all(this._ready().map((w) => w.bridge.jobEnd(job)));
+  }
+
+  // ── ComfyUI (one worker; it proxies one ComfyUI server) ────────────
+
+  comfyExecute(
+    workflow: Record<string, unknown>,
+    options?: ComfyExecuteOptions,
+    onEvent?: (event: ComfyEvent) => void,
+    requestId?: string
+  ): Promise<ComfyExecuteResult> {
+    return this._withRequest(requestId, (bridge) =>
+      bridge.comfyExecute(workflow, options, onEvent, requestId)
+    );
+  }
+
+  cancelComfyExecute(requestId: string): void {
+    const owner = this._requests.get(requestId);
+    for (const worker of owner ? [owner] : this._ready()) {
+      worker.bridge.cancelComfyExecute(requestId);
+    }
+  }
+
+  comfyQueue(): Promise<Record<string, unknown>> {
+    return this._withWorker((bridge) => bridge.comfyQueue());
+  }
+
+  comfyInterrupt(): Promise<void> {
+    return this._withWorker((bridge) => bridge.comfyInterrupt());
+  }
+
+  comfyCancelPrompt(promptId: string): Promise<void> {
+    return this._withWorker((bridge) => bridge.comfyCancelPrompt(promptId));
+  }
+
+  comfyUpload(
+    filename: string,
+    bytes: Uint8Array,
+    options?: Record<string, unknown>
+  ): Promise<Record<string, unknown>> {
+    return this._withWorker((bridge) =>
+      bridge.comfyUpload(filename, bytes, options)
+    );
+  }
+
+  comfyView(
+    filename: string,
+    options?: Record<string, unknown>
+  ): Promise<Record<string, unknown>> {
+    return this._withWorker((bridge) => bridge.comfyView(filename, options));
+  }
+
+  comfyObjectInfo(): Promise<Record<string, unknown>> {
+    return this._withWorker((bridge) => bridge.comfyObjectInfo());
+  }
+
+  comfySystemStats(): Promise<Record<string, unknown>> {
+    return this._withWorker((bridge) => bridge.comfySystemStats());
+  }
+
+  comfyStatus(): Promise<ComfyStatusInfo> {
+    return this._withWorker((bridge) => bridge.comfyStatus());
+  }
+
+  comfyFree(options?: Record<string, unknown>): Promise<void> {
+    return this._withWorker((bridge) => bridge.comfyFree(options));
+  }
+
+  comfyModelsList(folder?: string): Promise<ComfyModelInfo[]> {
+    return this._withWorker((bridge) => bridge.comfyModelsList(folder));
+  }
+
+  comfyModelsDownload(
+    req: ComfyModelDownloadRequest,
+    onProgress: (update: ComfyModelDownloadUpdate) => void,
+    requestId?: string
+  ): Promise<void> {
+    return this._withRequest(requestId, (bridge) =>
+      bridge.comfyModelsDownload(req, onProgress, requestId)
+    );
+  }
+
+  comfyModelsDelete(folder: string, filename: string): Promise<boolean> {
+    return this._withWorker((bridge) =>
+      bridge.comfyModelsDelete(folder, filename)
+    );
+  }
+
+  // ── Placement ──────────────────────────────────────────────────────
+
+  /**
+   * Pick a worker for `key` and count the call against it. Without a key the
+   * call is placed by load alone and pins nothing.
+   */
+  private async _acquire(key?: string): Promise<PoolWorker> {
+    if (this._closed) throw new Error("Python worker pool is closed");
+    if (this._workers.length === 0) await this.ensureConnected();
+    let worker = key ? this._placements.get(key) : undefined;
+    if (worker && worker.state !== "closed") {
+      this._affinityHits++;
+    } else {
+      worker = this._place();
+      if (key) {
+        this._placements.set(key, worker);
+        worker.keys.add(key);
+      }
+    }
+    worker.inFlight++;
+    this._topUp();
+    try {
+      await worker.ready;
+    } catch (err) {
+      worker.inFlight--;
+      throw err;
+    }
+    return worker;
+  }
+
+  /** Idle first (ready over starting), then a new worker, then least-loaded. */
+  private _place(): PoolWorker {
+    const live = this._live();
+    const idle = live.filter((w) => w.inFlight === 0);
+    if (idle.length > 0) {
+      // Fewer pinned keys first spreads resident models across workers.
+      return idle.sort(
+        (a, b) =>
+          Number(b.state === "ready") - Number(a.state === "ready") ||
+          a.keys.size - b.keys.size
+      )[0];
+    }
+    if (live.length < this._max) return this._spawn();
+    return live.reduce((best, w) => (w.inFlight < best.inFlight ? w : best));
+  }
+
+  private _release(worker: PoolWorker, requestIds?: Set<string>): void {
+    worker.inFlight = Math.max(0, worker.inFlight - 1);
+    if (worker.inFlight === 0) worker.idleSince = Date.now();
+    for (const id of requestIds ?? []) this._requests.delete(id);
+  }
+
+  private async _withWorker<T>(
+    call: (bridge: PythonBridge) => Promise<T>,
+    key?: string
+  ): Promise<T> {
+    const worker = await this._acquire(key);
+    try {
+      return await call(worker.bridge);
+    } finally {
+      this._release(worker);
+    }
+  }
+
+  /** Run a call that carries a caller-chosen request id on one worker. */
+  private async _withRequest<T>(
+    requestId: string | undefined,
+    call: (bridge: PythonBridge) => Promise<T>
+  ): Promise<T> {
+    const worker = await this._acquire();
+    if (requestId) this._requests.set(requestId, worker);
+    try {
+      return await call(worker.bridge);
+    } finally {
+      this._release(worker, requestId ? new Set([requestId]) : undefined);
+    }
+  }
+
+  /**
+   * Node executions get their request id inside the worker bridge; learn it
+   * from the first progress event so `cancel` can reach the right worker.
+   */
+  private _trackProgress(
+    worker: PoolWorker,
+    seen: Set<string>,
+    onProgress?: (event: ProgressEvent) => void
+  ): (event: ProgressEvent) => void {
+    return (event) => {
+      if (!seen.has(event.request_id)) {
+        seen.add(event.request_id);
+        this._requests.set(event.request_id, worker);
+      }
+      onProgress?.(event);
+    };
+  }
+
+  // ── Pool management ────────────────────────────────────────────────
+
+  private _live(): PoolWorker[] {
+    return this._workers.filter((w) => w.state !== "closed");
+  }
+
+  private _ready(): PoolWorker[] {
+    return this._workers.filter((w) => w.state === "ready");
+  }
+
+  private _spawn(): PoolWorker {
+    const worker: PoolWorker = {
+      id: this._nextId++,
+      bridge: this._createWorker(this._discovered ?? undefined),
+      state: "starting",
+      ready: Promise.resolve(),
+      inFlight: 0,
+      idleSince: Date.now(),
+      keys: new Set(),
+      listeners: []
+    };
+    for (const event of FORWARDED_EVENTS) {
+      const forward = (...args: unknown[]) => this.emit(event, ...args);
+      worker.listeners.push([event, forward]);
+    }
+    worker.listeners.push(
+      ["exit", (code) => this._onWorkerLost(worker, `exited with ${code}`)],
+      [
+        "error",
+        (err) =>
+          this._onWorkerLost(
+            worker,
+            err instanceof Error ? err.message : String(err)
+          )
+      ]
+    );
+    for (const [event, listener] of worker.listeners) {
+      worker.bridge.on(event, listener);
+    }
+    this._workers.push(worker);
+    this._spawned++;
+
+    worker.ready = worker.bridge.connect().then(
+      () => {
+        if (worker.state === "closed") {
+          throw new Error("Python worker was retired while starting");
+        }
+        worker.state = "ready";
+        this._discovered ??= {
+          nodes: worker.bridge.getNodeMetadata(),
+          loadErrors: worker.bridge.getLoadErrors()
+        };
+      },
+      (err) => {
+        this._retire(worker, false);
+        throw err;
+      }
+    );
+    // Spares start unobserved; their failure surfaces on first use.
+    worker.ready.catch(() => undefined);
+    return worker;
+  }
+
+  /** Start workers until `spareWorkers` are idle, within `maxWorkers`. */
+  private _topUp(): void {
+    if (this._closed || !this._discovered) return;
+    let live = this._live();
+    while (live.length < this._min) {
+      this._spawn();
+      live = this._live();
+    }
+    let idle = live.filter((w) => w.inFlight === 0).length;
+    while (idle < this._spares && live.length < this._max) {
+      this._spawn();
+      live = this._live();
+      idle++;
+    }
+  }
+
+  private _onWorkerLost(worker: PoolWorker, reason: string): void {
+    if (worker.state === "closed" || this._closed) return;
+    // Stryker disable next-line StringLiteral,ObjectLiteral: diagnostic log args only
+    log.warn("Retiring Python worker", { worker: worker.id, reason });
+    this._retire(worker, true);
+  }
+
+  private _retire(worker: PoolWorker, replace: boolean): void {
+    if (worker.state === "closed") return;
+    worker.state = "closed";
+    this._retired += replace ? 1 : 0;
+    this._workers = this._workers.filter((w) => w !== worker);
+    for (const key of worker.keys) {
+      if (this._placements.get(key) === worker) this._placements.delete(key);
+    }
+    for (const [id, owner] of this._requests) {
+      if (owner === worker) this._requests.delete(id);
+    }
+    for (const [event, listener] of worker.listeners) {
+      worker.bridge.off(event, listener);
+    }
+    try {
+      worker.bridge.close();
+    } catch {
+      // Already gone.
+    }
+    if (!replace) return;
+    this._topUp();
+    if (!this.isConnected && this._live().length === 0) this.emit("exit", 1);
+  }
+
+  private _startHealthChecks(): void {
+    if (this._healthTimer || this._healthIntervalMs <= 0) return;
+    this._healthTimer = setInterval(
+      () => void this.checkHealth(),
+      this._healthIntervalMs
+    );
+    this._healthTimer.unref?.();
+  }
+
+  /**
+   * Ping every idle worker with `worker.status` and retire the ones that do
+   * not answer in time; then close workers idle past `idleTimeoutMs`. Busy
+   * workers are skipped: a GIL-bound node delays the reply without the
+   * worker being unwell. Runs on `healthCheckIntervalMs`; public for tests.
+   */
+  async checkHealth(): Promise<void> {
+    const idle = this._ready().filter((w) => w.inFlight === 0);
+    await Promise.all(
+      idle.map(async (worker) => {
+        let timer: NodeJS.Timeout | undefined;
+        try {
+          await Promise.race([
+            worker.bridge.getWorkerStatus(),
+            new Promise((_, reject) => {
+              timer = setTimeout(
+                () => reject(new Error("health check timed out")),
+                this._healthTimeoutMs
+              );
+            })
+          ]);
+        } catch (err) {
+          if (worker.inFlight === 0) {
+            this._onWorkerLost(
+              worker,
+              err instanceof Error ? err.message : String(err)
+            );
+          }
+        } finally {
+          if (timer) clearTimeout(timer);
+        }
+      })
+    );
+    this._reapIdle();
+  }
+
+  private _reapIdle(): void {
+    if (this._idleTimeoutMs <= 0) return;
+    const now = Date.now();
+    // Newest first: older workers hold more resident models.
+    const candidates = this._ready()
+      .filter(
+        (w) => w.inFlight === 0 && now - w.idleSince >= this._idleTimeoutMs
+      )
+      .sort((a, b) => b.id - a.id);
+    for (const worker of candidates) {
+      if (this._live().length <= Math.max(this._min, this._spares)) break;
+      this._retire(worker, false);
+    }
+  }
+}
+
+/** Placement key for a provider model: the worker that loaded it keeps it. */
+function providerKey(providerId: string, model: unknown): string {
+  return `provider:${providerId}:${typeof model === "string" ? model : ""}`;
+}
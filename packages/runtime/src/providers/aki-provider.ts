@@ -1,4 +1,4 @@
-import { loadPackageAssetJson } from "@nodetool-ai/config";
+import { loadPackageAssetJson, sharedFetch } from "@nodetool-ai/config";
 import type OpenAI from "openai";
 import { AkiClient, decodeBinary } from "@aki-io/aki-io";
 import type {
@@ -257,7 +257,7 @@ export class AkiProvider extends OpenAICompatProvider {
       throw new Error("AKI_API_KEY is not configured");
     }
 
-    const fetchFn = options.fetchFn ?? globalThis.fetch.bind(globalThis);
+    const fetchFn = options.fetchFn ?? sharedFetch;
 
     super(
       { providerId: "aki", apiKey, baseURL: AKI_BASE_URL },
@@ -1,3 +1,4 @@
+import { sharedFetch } from "@nodetool-ai/config";
 import {
   OpenAICompatProvider,
   type OpenAICompatProviderOptions
@@ -81,7 +82,7 @@ export class AlibabaProvider extends OpenAICompatProvider {
     // then env) arrive as `secrets`, so honoring `secrets.DASHSCOPE_BASE_URL`
     // is what lets users point the provider at their key's region.
     const baseURL = resolveAlibabaBaseURL(secrets.DASHSCOPE_BASE_URL);
-    const fetchFn = options.fetchFn ?? globalThis.fetch.bind(globalThis);
+    const fetchFn = options.fetchFn ?? sharedFetch;
 
     super(
       {
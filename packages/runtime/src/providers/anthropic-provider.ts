@@ -6,7 +6,7 @@ import type {
   MessageCreateParamsStreaming,
   TextCitation
 } from "@anthropic-ai/sdk/resources/messages/messages.js";
-import { createLogger } from "@nodetool-ai/config";
+import { createLogger, sharedFetch } from "@nodetool-ai/config";
 import { BaseProvider } from "./base-provider.js";
 import { safeFetch } from "./safe-url.js";
 import {
@@ -469,7 +469,10 @@ export class AnthropicProvider extends BaseProvider {
     this._clientFactory =
       options.clientFactory ??
       ((key) => {
-        const clientOptions: ClientOptions = { ...this._clientOptions };
+        const clientOptions: ClientOptions = {
+          fetch: sharedFetch,
+          ...this._clientOptions
+        };
         if (key) {
           clientOptions.apiKey = key;
         }
@@ -478,7 +481,7 @@ export class AnthropicProvider extends BaseProvider {
         }
         return new Anthropic(clientOptions);
       });
-    this._fetch = options.fetchFn ?? globalThis.fetch.bind(globalThis);
+    this._fetch = options.fetchFn ?? sharedFetch;
   }
 
   getContainerEnv(): Record<string, string> {
@@ -28,7 +28,7 @@
 
 import { OpenAICompatProvider } from "./openai-compat-provider.js";
 import type { OpenAICompatProviderOptions } from "./openai-compat-provider.js";
-import { createLogger } from "@nodetool-ai/config";
+import { createLogger, sharedFetch } from "@nodetool-ai/config";
 import { isBoolean, isNumber, isString } from "../type-predicates.js";
 import {
   getManifestNodeMeta,
@@ -561,7 +561,7 @@ export class AtlasCloudProvider extends OpenAICompatProvider {
     if (!apiKey) {
       throw new Error("ATLASCLOUD_API_KEY is required");
     }
-    const fetchFn = options.fetchFn ?? globalThis.fetch.bind(globalThis);
+    const fetchFn = options.fetchFn ?? sharedFetch;
     super(
       { providerId: "atlascloud", apiKey, baseURL: ATLAS_CHAT_BASE_URL },
       { ...options, fetchFn }
@@ -0,0 +1,582 @@
+/**
+ * Response cache for the chat surface of a provider.
+ *
+ * A {@link CachingProvider} wraps an inner {@link BaseProvider} and keys each
+ * `generateMessage` / `generateMessages` call by the request hash the
+ * cassette harness uses (`./cassette-provider.ts`), scoped by provider id. A
+ * hit replays the stored response — a stream item for item, so chunk
+ * boundaries match the original call — without touching the inner provider,
+ * and is tracked as a zero-cost cache hit. A miss delegates and stores the
+ * response once it is complete.
+ *
+ * Only calls whose response is a function of the request are cached:
+ *
+ *  - the model is opted in through `models`;
+ *  - temperature is 0, unless `deterministicOnly` is turned off;
+ *  - no `providerSession`, `loadFullHistory` or `onToolCall` is passed, since
+ *    each makes the result depend on state outside the request;
+ *  - a stream is stored only if it ran to the end and carried no session
+ *    update or agentic-loop message.
+ *
+ * Everything else, and every other modality, goes straight to the inner
+ * provider. Set `NODETOOL_LLM_CACHE_MODELS` to wrap every provider a
+ * `ProcessingContext` resolves (see {@link cachingProviderFromEnv}).
+ */
+
+import {
+  createLogger,
+  getNodetoolCacheDir,
+  getNodeBuiltinSync,
+  safeProcessEnv
+} from "@nodetool-ai/config";
+import type { CacheAdapter } from "../context.js";
+import { DiskCache } from "../tiered-cache.js";
+import {
+  addSlotUsage,
+  createUsageSlot,
+  type LlmUsage
+} from "../tracing-helpers.js";
+import { BaseProvider } from "./base-provider.js";
+import {
+  hashRequest,
+  normalizeRequest,
+  type CassetteMethod
+} from "./cassette-provider.js";
+import type { UsageInfo } from "./cost-calculator.js";
+import type { Message, ProviderStreamItem } from "./types.js";
+
+const log = createLogger("nodetool.runtime.providers.cache");
+
+const nodePath = getNodeBuiltinSync<typeof import("node:path")>("node:path");
+
+/** Default lifetime of a stored response: 7 days. */
+const DEFAULT_TTL_SECONDS = 7 * 24 * 60 * 60;
+
+/** Default byte budget of the on-disk store: 1 GiB. */
+const DEFAULT_MAX_BYTES = 1024 * 1024 * 1024;
+
+/** One stored response. */
+interface CachedResponse {
+  method: CassetteMethod;
+  /** Stream items as yielded, or the single returned message. */
+  response: ProviderStreamItem[] | Message;
+  usage?: UsageInfo;
+  /** What the original call cost, in USD. */
+  cost: number;
+}
+
+/** Counters for a {@link CachingProvider}. */
+export interface CachingProviderStats {
+  /** Calls answered from the store. */
+  hits: number;
+  /** Cacheable calls the store had no answer for. */
+  misses: number;
+  /** Responses written to the store. */
+  stores: number;
+  /** Calls that were not cacheable and went straight through. */
+  bypassed: number;
+  /** USD the hits would have cost as live calls. */
+  savedUsd: number;
+}
+
+export interface CachingProviderOptions {
+  /** Where responses are kept, e.g. a {@link DiskCache}. */
+  store: CacheAdapter;
+  /**
+   * Models whose calls may be cached: a model id, `provider:model`, a prefix
+   * ending in `*`, or `*` for every model. Nothing is cached otherwise.
+   */
+  models: string[];
+  /** Seconds a stored response is served for. Default 7 days. */
+  ttlSeconds?: number;
+  /** Cache only calls made at temperature 0. Default true. */
+  deterministicOnly?: boolean;
+}
+
+function modelMatches(patterns: string[], provider: string, model: string) {
+  const qualified = `${provider}:${model}`;
+  return patterns.some((pattern) => {
+    if (pattern.endsWith("*")) {
+      const prefix = pattern.slice(0, -1);
+      return model.startsWith(prefix) || qualified.startsWith(prefix);
+    }
+    return pattern === model || pattern === qualified;
+  });
+}
+
+/** A deep copy to store, or null for a value that cannot be cloned. */
+function cloneForStore<T>(value: T): T | null {
+  try {
+    return structuredClone(value);
+  } catch {
+    return null;
+  }
+}
+
+/** Whether a stream item ties the response to state outside the request. */
+function isStatefulItem(item: ProviderStreamItem): boolean {
+  const type = (item as { type?: unknown }).type;
+  return type === "session" || type === "message";
+}
+
+/**
+ * Provider that serves repeated deterministic chat calls from a store.
+ *
+ * Everything but the two chat calls is forwarded to the inner provider,
+ * cost included: a miss is charged by the inner provider as usual, and a
+ * hit is tracked on it with the stored token counts and `responseCacheHit`
+ * set, which the cost calculator prices at 0.
+ */
+export class CachingProvider extends BaseProvider {
+  readonly inner: BaseProvider;
+  private readonly _store: CacheAdapter;
+  private readonly _models: string[];
+  private readonly _ttlSeconds: number;
+  private readonly _deterministicOnly: boolean;
+  private _stats: CachingProviderStats = {
+    hits: 0,
+    misses: 0,
+    stores: 0,
+    bypassed: 0,
+    savedUsd: 0
+  };
+
+  constructor(inner: BaseProvider, options: CachingProviderOptions) {
+    super(inner.provider);
+    this.inner = inner;
+    this._store = options.store;
+    this._models = options.models;
+    this._ttlSeconds = options.ttlSeconds ?? DEFAULT_TTL_SECONDS;
+    this._deterministicOnly = options.deterministicOnly ?? true;
+  }
+
+  get stats(): CachingProviderStats {
+    return { ...this._stats };
+  }
+
+  // ── Forwarded to the inner provider ─────────────────────────────────
+
+  override get supportsNativeWebSearch(): boolean {
+    return this.inner.supportsNativeWebSearch;
+  }
+
+  override get supportsNativeImageGeneration(): boolean {
+    return this.inner.supportsNativeImageGeneration;
+  }
+
+  override setMessageEmitter(fn: (msg: unknown) => void): void {
+    super.setMessageEmitter(fn);
+    this.inner.setMessageEmitter(fn);
+  }
+
+  override unavailableReason() {
+    return this.inner.unavailableReason();
+  }
+
+  override getCapabilities() {
+    return this.inner.getCapabilities();
+  }
+
+  override getContainerEnv() {
+    return this.inner.getContainerEnv();
+  }
+
+  override async close(): Promise<void> {
+    await this.inner.close();
+  }
+
+  override hasToolSupport(model: string) {
+    return this.inner.hasToolSupport(model);
+  }
+
+  override trackUsage(model: string, usage: UsageInfo): number {
+    return this.inner.trackUsage(model, usage);
+  }
+
+  override get cost(): number {
+    return this.inner.cost;
+  }
+
+  override getTotalCost(): number {
+    return this.inner.getTotalCost();
+  }
+
+  override resetCost(): void {
+    this.inner.resetCost();
+  }
+
+  override logProviderCall(
+    ...args: Parameters<BaseProvider["logProviderCall"]>
+  ) {
+    return this.inner.logProviderCall(...args);
+  }
+
+  override getAvailableLanguageModels() {
+    return this.inner.getAvailableLanguageModels();
+  }
+
+  override getAvailableImageModels() {
+    return this.inner.getAvailableImageModels();
+  }
+
+  override getAvailableVideoModels() {
+    return this.inner.getAvailableVideoModels();
+  }
+
+  override getAvailableTTSModels() {
+    return this.inner.getAvailableTTSModels();
+  }
+
+  override getAvailableASRModels() {
+    return this.inner.getAvailableASRModels();
+  }
+
+  override getAvailableMusicModels() {
+    return this.inner.getAvailableMusicModels();
+  }
+
+  override getAvailableEmbeddingModels() {
+    return this.inner.getAvailableEmbeddingModels();
+  }
+
+  override getAvailable3DModels() {
+    return this.inner.getAvailable3DModels();
+  }
+
+  /**
+   * A provider that runs its own agentic loop keeps it; the base loop calls
+   * `generateMessages` on this instance, so each of its turns is cacheable.
+   */
+  override generateLoop(...args: Parameters<BaseProvider["generateLoop"]>) {
+    return this.inner.generateLoop !== BaseProvider.prototype.generateLoop
+      ? this.inner.generateLoop(...args)
+      : super.generateLoop(...args);
+  }
+
+  override textToImage(...args: Parameters<BaseProvider["textToImage"]>) {
+    return this.inner.textToImage(...args);
+  }
+
+  override textToImages(...args: Parameters<BaseProvider["textToImages"]>) {
+    return this.inner.textToImages(...args);
+  }
+
+  override imageToImage(...args: Parameters<BaseProvider["imageToImage"]>) {
+    return this.inner.imageToImage(...args);
+  }
+
+  override imageToImages(...args: Parameters<BaseProvider["imageToImages"]>) {
+    return this.inner.imageToImages(...args);
+  }
+
+  override inpaint(...args: Parameters<BaseProvider["inpaint"]>) {
+    return this.inner.inpaint(...args);
+  }
+
+  override inpaintImages(...args: Parameters<BaseProvider["inpaintImages"]>) {
+    return this.inner.inpaintImages(...args);
+  }
+
+  override upscaleImage(...args: Parameters<BaseProvider["upscaleImage"]>) {
+    return this.inner.upscaleImage(...args);
+  }
+
+  override removeBackground(
+    ...args: Parameters<BaseProvider["removeBackground"]>
+  ) {
+    return this.inner.removeBackground(...args);
+  }
+
+  override relightImage(...args: Parameters<BaseProvider["relightImage"]>) {
+    return this.inner.relightImage(...args);
+  }
+
+  override vectorizeImage(
+    ...args: Parameters<BaseProvider["vectorizeImage"]>
+  ) {
+    return this.inner.vectorizeImage(...args);
+  }
+
+  override textToSpeech(...args: Parameters<BaseProvider["textToSpeech"]>) {
+    return this.inner.textToSpeech(...args);
+  }
+
+  override textToSpeechEncoded(
+    ...args: Parameters<BaseProvider["textToSpeechEncoded"]>
+  ) {
+    return this.inner.textToSpeechEncoded(...args);
+  }
+
+  override supportsStreamingTextToSpeech(): boolean {
+    return this.inner.supportsStreamingTextToSpeech();
+  }
+
+  override textToMusic(...args: Parameters<BaseProvider["textToMusic"]>) {
+    return this.inner.textToMusic(...args);
+  }
+
+  override automaticSpeechRecognition(
+    ...args: Parameters<BaseProvider["automaticSpeechRecognition"]>
+  ) {
+    return this.inner.automaticSpeechRecognition(...args);
+  }
+
+  override textToVideo(...args: Parameters<BaseProvider["textToVideo"]>) {
+    return this.inner.textToVideo(...args);
+  }
+
+  override imageToVideo(...args: Parameters<BaseProvider["imageToVideo"]>) {
+    return this.inner.imageToVideo(...args);
+  }
+
+  override videoToVideo(...args: Parameters<BaseProvider["videoToVideo"]>) {
+    return this.inner.videoToVideo(...args);
+  }
+
+  override lipSync(...args: Parameters<BaseProvider["lipSync"]>) {
+    return this.inner.lipSync(...args);
+  }
+
+  override textTo3D(...args: Parameters<BaseProvider["textTo3D"]>) {
+    return this.inner.textTo3D(...args);
+  }
+
+  override imageTo3D(...args: Parameters<BaseProvider["imageTo3D"]>) {
+    return this.inner.imageTo3D(...args);
+  }
+
+  override generateEmbedding(
+    ...args: Parameters<BaseProvider["generateEmbedding"]>
+  ) {
+    return this.inner.generateEmbedding(...args);
+  }
+
+  override isContextLengthError(error: unknown): boolean {
+    return this.inner.isContextLengthError(error);
+  }
+
+  override isRateLimitError(error: unknown): boolean {
+    return this.inner.isRateLimitError(error);
+  }
+
+  override isAuthError(error: unknown): boolean {
+    return this.inner.isAuthError(error);
+  }
+
+  // ── Chat, through the store ─────────────────────────────────────────
+
+  /** The store key for a call, or null when the call must not be cached. */
+  private _key(
+    method: CassetteMethod,
+    args: Parameters<BaseProvider["generateMessages"]>[0]
+  ): string | null {
+    if (
+      !modelMatches(this._models, this.provider, args.model) ||
+      (this._deterministicOnly && args.temperature !== 0) ||
+      args.providerSession ||
+      args.loadFullHistory ||
+      args.onToolCall
+    ) {
+      this._stats.bypassed++;
+      return null;
+    }
+    const hash = hashRequest(method, normalizeRequest(args));
+    return `llm-response:${this.provider}:${hash}`;
+  }
+
+  private async _lookup(
+    key: string,
+    method: CassetteMethod
+  ): Promise<CachedResponse | null> {
+    let entry: CachedResponse | undefined;
+    try {
+      entry = await this._store.get<CachedResponse>(key);
+    } catch (error) {
+      log.warn("Response cache read failed", {
+        error: error instanceof Error ? error.message : String(error)
+      });
+    }
+    if (!entry || entry.method !== method) {
+      this._stats.misses++;
+      return null;
+    }
+    this._stats.hits++;
+    this._stats.savedUsd += entry.cost;
+    return entry;
+  }
+
+  private async _save(key: string, entry: CachedResponse): Promise<void> {
+    try {
+      await this._store.set(key, entry, this._ttlSeconds);
+      this._stats.stores++;
+    } catch (error) {
+      // The call already succeeded; a failed write only costs the next hit.
+      log.warn("Response cache write failed", {
+        error: error instanceof Error ? error.message : String(error)
+      });
+    }
+  }
+
+  private _trackHit(model: string, entry: CachedResponse): void {
+    this.inner.trackUsage(model, { ...entry.usage, responseCacheHit: true });
+  }
+
+  /**
+   * Pass the usage the inner provider charged during a miss on to the
+   * caller's slot, and return it in the stored form.
+   */
+  private _passOnUsage(usage: LlmUsage | null): {
+    usage?: UsageInfo;
+    cost: number;
+  } {
+    if (!usage) return { cost: 0 };
+    addSlotUsage(usage);
+    const info: UsageInfo = {
+      inputTokens: usage.inputTokens,
+      outputTokens: usage.outputTokens
+    };
+    if (usage.cachedInputTokens !== undefined) {
+      info.cachedTokens = usage.cachedInputTokens;
+    }
+    if (usage.cacheWriteTokens !== undefined) {
+      info.cacheWriteTokens = usage.cacheWriteTokens;
+    }
+    return { usage: info, cost: usage.cost ?? 0 };
+  }
+
+  async generateMessage(
+    args: Parameters<BaseProvider["generateMessage"]>[0]
+  ): Promise<Message> {
+    const key = this._key("generateMessage", args);
+    if (key === null) return this.inner.generateMessage(args);
+
+    const hit = await this._lookup(key, "generateMessage");
+    if (hit) {
+      this._trackHit(args.model, hit);
+      return structuredClone(hit.response as Message);
+    }
+
+    const { runInSlot, getUsage } = createUsageSlot();
+    const result = await runInSlot(() => this.inner.generateMessage(args));
+    const { usage, cost } = this._passOnUsage(getUsage());
+    const copy = cloneForStore(result);
+    if (copy !== null) {
+      await this._save(key, {
+        method: "generateMessage",
+        response: copy,
+        usage,
+        cost
+      });
+    }
+    return result;
+  }
+
+  async *generateMessages(
+    args: Parameters<BaseProvider["generateMessages"]>[0]
+  ): AsyncGenerator<ProviderStreamItem> {
+    const key = this._key("generateMessages", args);
+    if (key === null) {
+      yield* this.inner.generateMessages(args);
+      return;
+    }
+
+    const hit = await this._lookup(key, "generateMessages");
+    if (hit) {
+      for (const item of hit.response as ProviderStreamItem[]) {
+        yield structuredClone(item);
+      }
+      // After the stream, like a live call, so post-iteration reads of cost
+      // see this call.
+      this._trackHit(args.model, hit);
+      return;
+    }
+
+    // A usage slot wraps each next() so the inner provider's setLastUsage()
+    // survives across the generator's yields.
+    const { runInSlot, getUsage } = createUsageSlot();
+    const source = this.inner.generateMessages(args);
+    const captured: ProviderStreamItem[] = [];
+    let storable = true;
+    let done = false;
+    try {
+      while (true) {
+        const next = await runInSlot(() => source.next());
+        if (next.done) {
+          done = true;
+          break;
+        }
+        const copy = isStatefulItem(next.value)
+          ? null
+          : cloneForStore(next.value);
+        if (copy === null) storable = false;
+        else if (storable) captured.push(copy);
+        yield next.value;
+      }
+    } finally {
+      // The consumer stopped early: close the inner stream, store nothing.
+      if (!done) await source.return(undefined);
+    }
+    const { usage, cost } = this._passOnUsage(getUsage());
+    if (storable && !args.signal?.aborted) {
+      await this._save(key, {
+        method: "generateMessages",
+        response: captured,
+        usage,
+        cost
+      });
+    }
+  }
+}
+
+function positiveNumber(value: string | undefined, fallback: number): number {
+  const parsed = Number(value);
+  return value && Number.isFinite(parsed) && parsed > 0 ? parsed : fallback;
+}
+
+let sharedStore: DiskCache | null = null;
+
+/**
+ * Wrap `provider` in a {@link CachingProvider} when `NODETOOL_LLM_CACHE_MODELS`
+ * lists models to cache; return it unchanged otherwise. Every wrapped
+ * provider shares one {@link DiskCache} per process, under
+ * `NODETOOL_LLM_CACHE_DIR` (default `<cache dir>/llm-responses`), with
+ * `NODETOOL_LLM_CACHE_MAX_BYTES` and `NODETOOL_LLM_CACHE_TTL_SECONDS`.
+ */
+export function cachingProviderFromEnv(provider: BaseProvider): BaseProvider {
+  const env = safeProcessEnv();
+  const models = (env["NODETOOL_LLM_CACHE_MODELS"] ?? "")
+    .split(",")
+    .map((m) => m.trim())
+    .filter(Boolean);
+  if (models.length === 0 || provider instanceof CachingProvider) {
+    return provider;
+  }
+  if (!sharedStore) {
+    const dir =
+      env["NODETOOL_LLM_CACHE_DIR"]?.trim() ||
+      nodePath?.join(getNodetoolCacheDir(), "llm-responses");
+    if (!dir) return provider;
+    try {
+      sharedStore = new DiskCache({
+        dir,
+        maxBytes: positiveNumber(
+          env["NODETOOL_LLM_CACHE_MAX_BYTES"],
+          DEFAULT_MAX_BYTES
+        )
+      });
+    } catch (error) {
+      log.warn("Response cache disabled", {
+        error: error instanceof Error ? error.message : String(error)
+      });
+      return provider;
+    }
+  }
+  return new CachingProvider(provider, {
+    store: sharedStore,
+    models,
+    ttlSeconds: positiveNumber(
+      env["NODETOOL_LLM_CACHE_TTL_SECONDS"],
+      DEFAULT_TTL_SECONDS
+    )
+  });
+}
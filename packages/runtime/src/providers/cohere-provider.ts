@@ -6,7 +6,7 @@
  */
 
 import { BaseProvider } from "./base-provider.js";
-import { createLogger } from "@nodetool-ai/config";
+import { createLogger, sharedFetch } from "@nodetool-ai/config";
 import type {
   EmbeddingModel,
   Message,
@@ -77,7 +77,7 @@ export class CohereProvider extends BaseProvider {
   ) {
     super("cohere");
     this.apiKey = secrets.COHERE_API_KEY ?? "";
-    this._fetch = options.fetchFn ?? globalThis.fetch.bind(globalThis);
+    this._fetch = options.fetchFn ?? sharedFetch;
     this.inputType = options.inputType ?? "search_document";
     // Diagnostic only; the missing-key contract is enforced (and tested) at call
     // time in generateEmbedding, so this warn is behaviour-neutral.
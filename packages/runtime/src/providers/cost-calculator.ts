@@ -137,6 +137,11 @@ export interface UsageInfo {
   videoSeconds?: number;
   /** Number of tasks submitted (for CostType.TASK_BASED providers). */
   taskCount?: number;
+  /**
+   * Served from NodeTool's response cache (`CachingProvider`) without calling
+   * the provider: the token counts are the original call's, the cost is 0.
+   */
+  responseCacheHit?: boolean;
 }
 
 /**
@@ -298,6 +303,9 @@ export class CostCalculator {
     usage: UsageInfo,
     provider: ProviderId
   ): number {
+    // Nothing was sent to the provider, so nothing was billed.
+    if (usage.responseCacheHit) return 0;
+
     // gpt-image-1 is priced per image by quality, which no MODEL_TO_TIER entry
     // can express — resolve it before the generic tier lookup.
     const gptImageTier = gptImageQualityTier(modelId, usage);
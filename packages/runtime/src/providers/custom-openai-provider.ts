@@ -1,3 +1,4 @@
+import { sharedFetch } from "@nodetool-ai/config";
 /**
  * A provider the user defined at runtime: any endpoint that speaks the OpenAI
  * Chat Completions dialect, reached by base URL plus optional API key.
@@ -80,7 +81,7 @@ export class CustomOpenAIProvider extends OpenAICompatProvider {
       throw new Error(`${baseUrlKey} is required`);
     }
     const apiKey = readString(config, apiKeyKey) || NO_KEY;
-    const fetchFn = options.fetchFn ?? globalThis.fetch.bind(globalThis);
+    const fetchFn = options.fetchFn ?? sharedFetch;
 
     super({ providerId, apiKey, baseURL }, { ...options, fetchFn });
 
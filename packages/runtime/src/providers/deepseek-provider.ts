@@ -1,3 +1,4 @@
+import { sharedFetch } from "@nodetool-ai/config";
 import {
   OpenAICompatProvider,
   type OpenAICompatProviderOptions
@@ -27,7 +28,7 @@ export class DeepSeekProvider extends OpenAICompatProvider {
       throw new Error("DEEPSEEK_API_KEY is required");
     }
 
-    const fetchFn = options.fetchFn ?? globalThis.fetch.bind(globalThis);
+    const fetchFn = options.fetchFn ?? sharedFetch;
 
     super(
       { providerId: "deepseek", apiKey, baseURL: DEEPSEEK_BASE_URL },
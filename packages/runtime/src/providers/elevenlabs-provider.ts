@@ -10,7 +10,7 @@
  *   bytes (the path used by chat audio / media tools).
  */
 
-import { createLogger } from "@nodetool-ai/config";
+import { createLogger, sharedFetch } from "@nodetool-ai/config";
 import { BaseProvider } from "./base-provider.js";
 import type {
   EncodedAudioResult,
@@ -84,7 +84,7 @@ export class ElevenLabsProvider extends BaseProvider {
       throw new Error("ELEVENLABS_API_KEY is required");
     }
     this.apiKey = apiKey;
-    this._fetch = options.fetchFn ?? globalThis.fetch.bind(globalThis);
+    this._fetch = options.fetchFn ?? sharedFetch;
   }
 
   getContainerEnv() {
@@ -1,4 +1,4 @@
-import { createLogger } from "@nodetool-ai/config";
+import { createLogger, sharedFetch } from "@nodetool-ai/config";
 import { safeFetch } from "./safe-url.js";
 import { detectImageMime } from "./image-mime.js";
 import {
@@ -135,7 +135,7 @@ export class EvolinkProvider extends OpenAICompatProvider {
       throw new Error("EVOLINK_API_KEY is required");
     }
 
-    const fetchFn = options.fetchFn ?? globalThis.fetch.bind(globalThis);
+    const fetchFn = options.fetchFn ?? sharedFetch;
 
     super(
       {
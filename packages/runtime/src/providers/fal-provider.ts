@@ -7,7 +7,7 @@
  */
 
 import { BaseProvider } from "./base-provider.js";
-import { createLogger } from "@nodetool-ai/config";
+import { createLogger, sharedFetch } from "@nodetool-ai/config";
 import { OpenAICompatProvider } from "./openai-compat-provider.js";
 import type {
   ImageModel,
@@ -530,7 +530,7 @@ export class FalProvider extends BaseProvider {
   ) {
     super("fal_ai");
     this.apiKey = (secrets["FAL_API_KEY"] as string) ?? "";
-    this._fetch = options.fetchFn ?? globalThis.fetch.bind(globalThis);
+    this._fetch = options.fetchFn ?? sharedFetch;
   }
 
   /** Build an onQueueUpdate callback that forwards progress via emitMessage. */
@@ -1,5 +1,5 @@
 import type { Chunk } from "@nodetool-ai/protocol";
-import { createLogger } from "@nodetool-ai/config";
+import { createLogger, sharedFetch } from "@nodetool-ai/config";
 import { BaseProvider } from "./base-provider.js";
 import { sniffAudioMime } from "./audio-mime.js";
 import { sniffVideoMime } from "./video-mime.js";
@@ -663,7 +663,7 @@ export class GeminiProvider extends BaseProvider {
     }
 
     this.apiKey = apiKey;
-    this._fetch = options.fetchFn ?? globalThis.fetch.bind(globalThis);
+    this._fetch = options.fetchFn ?? sharedFetch;
     this._sleep =
       options.sleepFn ??
       ((ms: number) => new Promise<void>((resolve) => setTimeout(resolve, ms)));
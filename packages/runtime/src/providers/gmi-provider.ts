@@ -1,3 +1,4 @@
+import { sharedFetch } from "@nodetool-ai/config";
 import {
   OpenAICompatProvider,
   type OpenAICompatProviderOptions
@@ -39,7 +40,7 @@ export class GMIProvider extends OpenAICompatProvider {
       throw new Error("GMI_API_KEY is required");
     }
 
-    const fetchFn = options.fetchFn ?? globalThis.fetch.bind(globalThis);
+    const fetchFn = options.fetchFn ?? sharedFetch;
 
     super(
       { providerId: "gmi", apiKey, baseURL: GMI_BASE_URL },
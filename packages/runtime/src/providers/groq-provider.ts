@@ -1,3 +1,4 @@
+import { sharedFetch } from "@nodetool-ai/config";
 import {
   OpenAICompatProvider,
   type OpenAICompatProviderOptions
@@ -20,7 +21,7 @@ export class GroqProvider extends OpenAICompatProvider {
       throw new Error("GROQ_API_KEY is required");
     }
 
-    const fetchFn = options.fetchFn ?? globalThis.fetch.bind(globalThis);
+    const fetchFn = options.fetchFn ?? sharedFetch;
 
     super(
       {
@@ -166,6 +166,14 @@ export type {
   ProviderFault,
   ProviderFaultKind
 } from "./cassette-provider.js";
+export {
+  CachingProvider,
+  cachingProviderFromEnv
+} from "./caching-provider.js";
+export type {
+  CachingProviderOptions,
+  CachingProviderStats
+} from "./caching-provider.js";
 export {
   ScriptedProvider,
   planScript,
@@ -6,7 +6,7 @@
  */
 
 import { BaseProvider } from "./base-provider.js";
-import { createLogger } from "@nodetool-ai/config";
+import { createLogger, sharedFetch } from "@nodetool-ai/config";
 import type {
   EmbeddingModel,
   Message,
@@ -84,7 +84,7 @@ export class JinaProvider extends BaseProvider {
   ) {
     super("jina");
     this.apiKey = secrets.JINA_API_KEY ?? "";
-    this._fetch = options.fetchFn ?? globalThis.fetch.bind(globalThis);
+    this._fetch = options.fetchFn ?? sharedFetch;
     this.task = options.task ?? "retrieval.passage";
     // Stryker disable next-line ConditionalExpression,BlockStatement,BooleanLiteral,StringLiteral: diagnostic warn; missing-key is enforced at call time.
     if (!this.apiKey) {
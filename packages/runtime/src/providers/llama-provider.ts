@@ -1,3 +1,4 @@
+import { sharedFetch } from "@nodetool-ai/config";
 import {
   OpenAICompatProvider,
   type OpenAICompatProviderOptions
@@ -36,7 +37,7 @@ export class LlamaProvider extends OpenAICompatProvider {
       throw new Error("LLAMA_CPP_URL is required");
     }
     const baseURL = trimTrailingSlashes(String(raw));
-    const fetchFn = options.fetchFn ?? globalThis.fetch.bind(globalThis);
+    const fetchFn = options.fetchFn ?? sharedFetch;
 
     super(
       {
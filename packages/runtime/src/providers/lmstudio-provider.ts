@@ -1,3 +1,4 @@
+import { sharedFetch } from "@nodetool-ai/config";
 import {
   OpenAICompatProvider,
   type OpenAICompatProviderOptions
@@ -37,7 +38,7 @@ export class LMStudioProvider extends OpenAICompatProvider {
       LMSTUDIO_DEFAULT_URL;
     const baseURL = trimTrailingSlashes(rawBaseURL);
     const apiKey = secrets.LMSTUDIO_API_KEY ?? "lm-studio";
-    const fetchFn = options.fetchFn ?? globalThis.fetch.bind(globalThis);
+    const fetchFn = options.fetchFn ?? sharedFetch;
 
     super(
       { providerId: "lmstudio", apiKey, baseURL: `${baseURL}/v1` },
@@ -14,7 +14,7 @@ import {
   type OpenAICompatProviderOptions
 } from "./openai-compat-provider.js";
 import type { OpenAIProvider } from "./openai-provider.js";
-import { createLogger } from "@nodetool-ai/config";
+import { createLogger, sharedFetch } from "@nodetool-ai/config";
 import { safeFetch } from "./safe-url.js";
 import type {
   ASRModel,
@@ -196,7 +196,7 @@ export class MinimaxProvider extends OpenAICompatProvider {
       throw new Error("MINIMAX_API_KEY is required");
     }
 
-    const fetchFn = options.fetchFn ?? globalThis.fetch.bind(globalThis);
+    const fetchFn = options.fetchFn ?? sharedFetch;
 
     super(
       {
@@ -1,5 +1,5 @@
 import type { Chunk } from "@nodetool-ai/protocol";
-import { createLogger } from "@nodetool-ai/config";
+import { createLogger, sharedFetch } from "@nodetool-ai/config";
 import { BaseProvider } from "./base-provider.js";
 import { isNonEmptyString, isRecord, isString } from "../type-predicates.js";
 
@@ -119,7 +119,7 @@ export class OllamaProvider extends BaseProvider {
     this.apiUrl = apiUrl.replace(/\/+$/, "");
     const keepAlive = process.env.OLLAMA_KEEP_ALIVE?.trim();
     this.keepAlive = keepAlive && keepAlive.length > 0 ? keepAlive : "10m";
-    this._fetch = options.fetchFn ?? globalThis.fetch.bind(globalThis);
+    this._fetch = options.fetchFn ?? sharedFetch;
   }
 
   getContainerEnv() {
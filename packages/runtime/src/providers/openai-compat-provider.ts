@@ -11,7 +11,7 @@
  */
 import OpenAI from "openai";
 import type { Chunk } from "@nodetool-ai/protocol";
-import { createLogger } from "@nodetool-ai/config";
+import { createLogger, sharedFetch } from "@nodetool-ai/config";
 import { OpenAIProvider } from "./openai-provider.js";
 import {
   OpenAICompatClient,
@@ -73,7 +73,8 @@ export class OpenAICompatProvider extends OpenAIProvider {
           ((key) => {
             const clientOptions: ConstructorParameters<typeof OpenAI>[0] = {
               apiKey: key,
-              baseURL: config.baseURL
+              baseURL: config.baseURL,
+              fetch: sharedFetch
             };
             if (config.defaultHeaders) {
               clientOptions.defaultHeaders = config.defaultHeaders;
@@ -85,7 +86,7 @@ export class OpenAICompatProvider extends OpenAIProvider {
     );
     this._compatConfig = config;
     this._compatClient = options.compatClient ?? null;
-    this._compatFetch = options.fetchFn ?? globalThis.fetch.bind(globalThis);
+    this._compatFetch = options.fetchFn ?? sharedFetch;
   }
 
   protected getCompatClient(): OpenAICompatClient {
@@ -1,3 +1,4 @@
+import { sharedFetch } from "@nodetool-ai/config";
 import { sseEvents } from "./sse.js";
 import {
   OpenAICompatError,
@@ -90,7 +91,7 @@ export class OpenAICompatClient {
     this.baseURL = trimTrailingSlashes(options.baseURL);
     this._apiKey = options.apiKey;
     this._defaultHeaders = options.defaultHeaders ?? {};
-    this._fetch = options.fetchFn ?? globalThis.fetch.bind(globalThis);
+    this._fetch = options.fetchFn ?? sharedFetch;
     this._maxRetries = options.maxRetries ?? DEFAULT_MAX_RETRIES;
     this._timeoutMs = options.timeoutMs ?? DEFAULT_TIMEOUT_MS;
   }
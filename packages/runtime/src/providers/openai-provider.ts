@@ -5,7 +5,7 @@ import OpenAI, { toFile } from "openai";
 // dynamic require for `@img/sharp-*.node` and the app crashes at launch.
 import type { Chunk } from "@nodetool-ai/protocol";
 import { PROVIDER_IDS } from "@nodetool-ai/protocol";
-import { createLogger, importHidden } from "@nodetool-ai/config";
+import { createLogger, importHidden, sharedFetch } from "@nodetool-ai/config";
 import { BaseProvider, splitToolResultImages } from "./base-provider.js";
 import { hashSystemPrompt } from "./provider-session.js";
 import { sniffAudioMime } from "./audio-mime.js";
@@ -346,8 +346,9 @@ export class OpenAIProvider extends BaseProvider {
     this.apiKey = apiKey;
     this._client = options.client ?? null;
     this._clientFactory =
-      options.clientFactory ?? ((key) => new OpenAI({ apiKey: key }));
-    this._fetch = options.fetchFn ?? globalThis.fetch.bind(globalThis);
+      options.clientFactory ??
+      ((key) => new OpenAI({ apiKey: key, fetch: sharedFetch }));
+    this._fetch = options.fetchFn ?? sharedFetch;
   }
 
   getContainerEnv(): Record<string, string> {
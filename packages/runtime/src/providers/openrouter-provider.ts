@@ -1,5 +1,5 @@
 import type OpenAI from "openai";
-import { createLogger } from "@nodetool-ai/config";
+import { createLogger, sharedFetch } from "@nodetool-ai/config";
 import {
   OpenAICompatProvider,
   type OpenAICompatProviderOptions
@@ -43,7 +43,7 @@ export class OpenRouterProvider extends OpenAICompatProvider {
       throw new Error("OPENROUTER_API_KEY is required");
     }
 
-    const fetchFn = options.fetchFn ?? globalThis.fetch.bind(globalThis);
+    const fetchFn = options.fetchFn ?? sharedFetch;
 
     super(
       {
@@ -1,3 +1,4 @@
+import { sharedFetch } from "@nodetool-ai/config";
 import {
   OpenAICompatProvider,
   type OpenAICompatProviderOptions
@@ -36,7 +37,7 @@ export class VLLMProvider extends OpenAICompatProvider {
       secrets.VLLM_API_KEY && secrets.VLLM_API_KEY.trim().length > 0
         ? secrets.VLLM_API_KEY
         : "sk-no-key-required";
-    const fetchFn = options.fetchFn ?? globalThis.fetch.bind(globalThis);
+    const fetchFn = options.fetchFn ?? sharedFetch;
 
     super(
       { providerId: "vllm", apiKey, baseURL: `${baseURL}/v1` },
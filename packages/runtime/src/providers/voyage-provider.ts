@@ -7,7 +7,7 @@
  */
 
 import { BaseProvider } from "./base-provider.js";
-import { createLogger } from "@nodetool-ai/config";
+import { createLogger, sharedFetch } from "@nodetool-ai/config";
 import type {
   EmbeddingModel,
   Message,
@@ -90,7 +90,7 @@ export class VoyageProvider extends BaseProvider {
   ) {
     super("voyage");
     this.apiKey = secrets.VOYAGE_API_KEY ?? "";
-    this._fetch = options.fetchFn ?? globalThis.fetch.bind(globalThis);
+    this._fetch = options.fetchFn ?? sharedFetch;
     this.inputType = options.inputType ?? "document";
     // Stryker disable next-line ConditionalExpression,BlockStatement,BooleanLiteral,StringLiteral: diagnostic warn; missing-key is enforced at call time.
     if (!this.apiKey) {
@@ -0,0 +1,211 @@
+/**
+ * Dataframes across the Python bridge as Arrow IPC streams.
+ *
+ * Without this, a dataframe input is an ordinary field: msgpack'd rows, or
+ * a `columns`/`data` matrix, which the worker turns back into a pandas frame
+ * cell by cell. Once the worker lists the `arrow` capability in
+ * `worker.status`, {@link encodeDataframeInput} turns each field the node
+ * declares as `dataframe` into an Arrow IPC blob under the field's name and
+ * leaves a marker in its place:
+ *
+ *   `{ type: "dataframe", format: "arrow", columns: [...] }`
+ *
+ * so the worker can `pyarrow.ipc.open_stream(blob).read_pandas()`. Requests
+ * to such a worker also carry `result_formats: ["arrow"]`, and the worker
+ * may answer a dataframe output the same way: a blob plus a marker in
+ * `outputs`. {@link decodeDataframeOutput} turns that into a `DataframeRef`
+ * whose `data` rows are only built if something reads them; passed on to
+ * another Python node, the frame goes back out as Arrow without ever
+ * having been rows. A worker without the capability sees the old shapes.
+ *
+ * Only a frame whose columns all have one of the {@link ARROW_RESULT_TYPES}
+ * (sent as `arrow_types`) comes back as Arrow; one with a categorical,
+ * decimal or list column comes back as rows, since the decoder cannot read
+ * those.
+ */
+
+import type { ColumnDef, DataframeRef } from "@nodetool-ai/protocol";
+import {
+  buildArrowTable,
+  decodeArrowIpc,
+  encodeArrowIpc,
+  type ArrowTable,
+  type ArrowType
+} from "./arrow-ipc.js";
+
+/** Worker capability that turns Arrow dataframes on. */
+export const ARROW_CAPABILITY = "arrow";
+
+/** `format` of a dataframe marker whose contents travel as a blob. */
+export const ARROW_FORMAT = "arrow";
+
+/**
+ * The column types `decodeArrowIpc` reads, by pyarrow type name, sent to
+ * the worker as `arrow_types`. A dictionary-encoded column of any of them is
+ * not readable either.
+ */
+export const ARROW_RESULT_TYPES: readonly string[] = [
+  "null",
+  "bool",
+  "int8",
+  "int16",
+  "int32",
+  "int64",
+  "uint8",
+  "uint16",
+  "uint32",
+  "uint64",
+  "float",
+  "double",
+  "string",
+  "large_string",
+  "timestamp",
+  "date32",
+  "date64"
+];
+
+const ARROW_TABLE = Symbol("nodetool.arrowTable");
+
+type Row = Record<string, unknown>;
+
+function isRecord(value: unknown): value is Row {
+  return typeof value === "object" && value !== null && !Array.isArray(value);
+}
+
+/**
+ * Whether `value` is a dataframe this module can encode: a `DataframeRef`
+ * with inline `columns`/`data`, or one decoded from Arrow, or the `{rows}`
+ * object the data nodes produce.
+ */
+export function isDataframeValue(value: unknown): boolean {
+  if (!isRecord(value)) return false;
+  if (dataframeArrowTable(value)) return true;
+  if (value.type === "dataframe") {
+    return (
+      (Array.isArray(value.columns) && Array.isArray(value.data)) ||
+      Array.isArray(value.rows)
+    );
+  }
+  const keys = Object.keys(value);
+  return keys.length === 1 && keys[0] === "rows" && Array.isArray(value.rows);
+}
+
+/** The Arrow table behind a dataframe from {@link decodeDataframeOutput}. */
+export function dataframeArrowTable(value: unknown): ArrowTable | null {
+  if (!isRecord(value)) return null;
+  return (value as { [ARROW_TABLE]?: ArrowTable })[ARROW_TABLE] ?? null;
+}
+
+function columnDataType(type: ArrowType): string {
+  switch (type.kind) {
+    case "int":
+      return "int";
+    case "float":
+      return "float";
+    case "utf8":
+      return "string";
+    case "timestamp":
+    case "date":
+      return "datetime";
+    default:
+      return "object";
+  }
+}
+
+function columnDefs(table: ArrowTable): ColumnDef[] {
+  return table.fields.map((field) => ({
+    name: field.name,
+    data_type: columnDataType(field.type)
+  }));
+}
+
+function tableOf(value: Row): ArrowTable | null {
+  const decoded = dataframeArrowTable(value);
+  if (decoded) return decoded;
+  if (Array.isArray(value.columns) && Array.isArray(value.data)) {
+    const names = value.columns.map((c: unknown) =>
+      isRecord(c) ? String(c.name) : String(c)
+    );
+    const data = value.data as unknown[];
+    return buildArrowTable(names, data.length, (r, c) => {
+      const row = data[r];
+      return Array.isArray(row) ? row[c] : undefined;
+    });
+  }
+  const rows = (value.rows as unknown[]).filter(isRecord);
+  const names: string[] = [];
+  const seen = new Set<string>();
+  for (const row of rows) {
+    for (const key of Object.keys(row)) {
+      if (!seen.has(key)) {
+        seen.add(key);
+        names.push(key);
+      }
+    }
+  }
+  return buildArrowTable(names, rows.length, (r, c) => rows[r][names[c]]);
+}
+
+/**
+ * Encode a dataframe field as an Arrow IPC blob and the marker that takes
+ * its place in `fields`. Null when a column holds values Arrow cannot carry
+ * here (nested objects, mixed kinds); the field then goes as it is.
+ */
+export function encodeDataframeInput(
+  value: unknown
+): { blob: Uint8Array; marker: Row } | null {
+  if (!isRecord(value) || !isDataframeValue(value)) return null;
+  const table = tableOf(value);
+  if (!table) return null;
+  const marker: Row = {};
+  // By key, so a decoded frame's lazy `data` is never read.
+  for (const key of Object.keys(value)) {
+    if (key !== "data" && key !== "rows") marker[key] = value[key];
+  }
+  marker.type = "dataframe";
+  marker.format = ARROW_FORMAT;
+  marker.columns = columnDefs(table);
+  return { blob: encodeArrowIpc(table), marker };
+}
+
+/** Whether a worker output is a marker for an Arrow blob. */
+export function isArrowDataframeMarker(value: unknown): value is Row {
+  return (
+    isRecord(value) &&
+    value.type === "dataframe" &&
+    value.format === ARROW_FORMAT
+  );
+}
+
+/**
+ * The `DataframeRef` for an Arrow blob a worker returned. `columns` comes
+ * from the schema; `data` is an enumerable getter that builds the rows on
+ * first read, so serializing the ref or handing it to a row-based node works
+ * as before, while {@link dataframeArrowTable} reads the columns directly.
+ */
+export function decodeDataframeOutput(
+  blob: Uint8Array,
+  marker: Row
+): DataframeRef {
+  const table = decodeArrowIpc(blob);
+  const ref: Row = { ...marker, type: "dataframe" };
+  delete ref.format;
+  ref.uri ??= "";
+  ref.columns = columnDefs(table);
+  let data: unknown[][] | undefined;
+  Object.defineProperty(ref, "data", {
+    enumerable: true,
+    configurable: true,
+    get: () => (data ??= table.toMatrix()),
+    set: (rows: unknown[][]) => {
+      // Rows written over the frame replace it, for re-encoding too.
+      data = rows;
+      Reflect.deleteProperty(ref, ARROW_TABLE);
+    }
+  });
+  Object.defineProperty(ref, ARROW_TABLE, {
+    value: table,
+    configurable: true
+  });
+  return ref as unknown as DataframeRef;
+}
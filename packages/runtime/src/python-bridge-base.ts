@@ -54,7 +54,17 @@ import {
   MIN_NODETOOL_CORE_VERSION
 } from "@nodetool-ai/protocol/bridge-protocol";
 import { validateBridgeFrame } from "@nodetool-ai/protocol";
-import { isNumber } from "./type-predicates.js";
+import { isNumber, isString } from "./type-predicates.js";
+import {
+  SHM_CAPABILITY,
+  type SharedMemoryArena,
+  type ShmBlobs
+} from "./python-bridge-shm.js";
+import {
+  ARROW_CAPABILITY,
+  ARROW_FORMAT,
+  ARROW_RESULT_TYPES
+} from "./python-bridge-arrow.js";
 
 const log = createLogger("nodetool.runtime.python-bridge-base");
 
@@ -85,6 +95,8 @@ import type {
   PythonNodeMetadata,
   ExecuteResult,
   ExecuteInputBlobs,
+  ExecuteBatchItem,
+  ExecuteBatchOutcome,
   ExecuteIdentity,
   JobBoundary,
   ModelEvictRequest,
@@ -133,6 +145,7 @@ const DEFAULT_STATUS_TIMEOUT_MS = Number(
 const DEFAULT_DOWNLOAD_IDLE_TIMEOUT_MS = Number(
   safeProcessEnv()["NODETOOL_PYTHON_DOWNLOAD_IDLE_TIMEOUT_MS"] ?? 5 * 60 * 1000
 );
+const ARROW_ENABLED = safeProcessEnv()["NODETOOL_BRIDGE_ARROW"] !== "0";
 
 /**
  * Transport-agnostic Python bridge. Subclasses provide the transport via
@@ -161,6 +174,11 @@ export abstract class PythonBridgeBase
   >();
   protected _options: PythonBridgeOptions;
   protected _connected = false;
+  /**
+   * Shared-memory arena for large blobs, set by transports whose worker runs
+   * on this host. Used only once the worker reports the `shm` capability.
+   */
+  protected _shm: SharedMemoryArena | null = null;
   private _connectPromise: Promise<void> | null = null;
 
   constructor(options: PythonBridgeOptions = {}) {
@@ -203,7 +221,13 @@ export abstract class PythonBridgeBase
   async connect(): Promise<void> {
     this._assertCanConnect();
     await this._openTransport();
-    await this._discover();
+    const discovered = this._options.discovered;
+    if (discovered) {
+      this._nodeMetadata = discovered.nodes;
+      this._loadErrors = discovered.loadErrors;
+    } else {
+      await this._discover();
+    }
     try {
       await this._getWorkerStatusWithTimeout();
     } catch (err) {
@@ -296,11 +320,18 @@ export abstract class PythonBridgeBase
       const pending = this._pending.get(requestId);
       if (pending) {
         this._pending.delete(requestId);
-        const data = msg.data as {
-          outputs: Record<string, unknown>;
-          blobs: Record<string, Uint8Array>;
-        };
-        pending.resolve({ outputs: data.outputs, blobs: data.blobs ?? {} });
+        const data = msg.data as Record<string, unknown>;
+        let blobs: Record<string, Uint8Array>;
+        try {
+          blobs = this._resultBlobs(data);
+        } catch (err) {
+          pending.reject(err instanceof Error ? err : new Error(String(err)));
+          return;
+        }
+        pending.resolve({
+          outputs: data.outputs as Record<string, unknown>,
+          blobs
+        });
       }
     } else if (type === "error" && requestId) {
       const streamReq = this._pendingStream.get(requestId);
@@ -497,8 +528,9 @@ export abstract class PythonBridgeBase
             node_type: nodeType,
             fields,
             secrets,
-            blobs,
-            ...this._identityPayload(identity)
+            ...this._stageBlobs(requestId, blobs),
+            ...this._identityPayload(identity),
+            ...this._resultFormats()
           }
         });
       } catch (err) {
@@ -508,7 +540,11 @@ export abstract class PythonBridgeBase
     });
 
     if (timeoutMs <= 0) {
-      return executePromise;
+      try {
+        return await executePromise;
+      } finally {
+        this._releaseShm(requestId);
+      }
     }
 
     let timer: NodeJS.Timeout | undefined;
@@ -539,6 +575,7 @@ export abstract class PythonBridgeBase
       if (timer) {
         clearTimeout(timer);
       }
+      this._releaseShm(requestId);
     }
   }
 
@@ -567,9 +604,19 @@ export abstract class PythonBridgeBase
     }
 
     const onChunk = (chunk: Record<string, unknown>) => {
+      let blobs: Record<string, Uint8Array>;
+      try {
+        blobs = this._resultBlobs(chunk);
+      } catch (err) {
+        this._pendingStream.get(requestId)?.reject(
+          err instanceof Error ? err : new Error(String(err))
+        );
+        this._pendingStream.delete(requestId);
+        return;
+      }
       chunks.push({
         outputs: (chunk.outputs as Record<string, unknown>) ?? {},
-        blobs: (chunk.blobs as Record<string, Uint8Array>) ?? {}
+        blobs
       });
       if (resolveWait) {
         resolveWait();
@@ -587,7 +634,7 @@ export abstract class PythonBridgeBase
       .then((result) => {
         finalResult = {
           outputs: (result.outputs as Record<string, unknown>) ?? {},
-          blobs: (result.blobs as Record<string, Uint8Array>) ?? {}
+          blobs: this._resultBlobs(result)
         };
         done = true;
         this._pending.delete(requestId);
@@ -614,8 +661,9 @@ export abstract class PythonBridgeBase
           node_type: nodeType,
           fields,
           secrets,
-          blobs,
-          ...this._identityPayload(identity)
+          ...this._stageBlobs(requestId, blobs),
+          ...this._identityPayload(identity),
+          ...this._resultFormats()
         }
       });
 
@@ -648,6 +696,251 @@ export abstract class PythonBridgeBase
           // Worker may already be gone; cancel is best-effort.
         }
       }
+      this._releaseShm(requestId);
+    }
+  }
+
+  /**
+   * Whether the attached worker speaks bridge protocol v5+ and therefore
+   * understands `execute.batch`. Per-capability soft gate, like
+   * {@link supportsModelManagement}.
+   */
+  supportsExecuteBatch(): boolean {
+    return (this._workerStatus?.protocol_version ?? 0) >= 5;
+  }
+
+  /**
+   * Run several invocations of one node type in one `execute.batch` round
+   * trip, so the worker builds the node once and can run its model on the
+   * whole batch. Secrets and identity are shared; each item has its own
+   * fields and blobs. Resolves with one outcome per item, in order: an item
+   * the worker failed carries its error and the rest still succeed. Rejects
+   * only when the batch as a whole fails (timeout, worker gone).
+   *
+   * A worker below v5 answers `Unknown message type`, so there each item is
+   * sent as its own `execute`, concurrently.
+   */
+  async executeBatch(
+    nodeType: string,
+    items: ExecuteBatchItem[],
+    secrets: Record<string, string>,
+    onProgress?: (event: ProgressEvent) => void,
+    identity?: ExecuteIdentity
+  ): Promise<ExecuteBatchOutcome[]> {
+    if (!this.supportsExecuteBatch()) {
+      const settled = await Promise.allSettled(
+        items.map((item) =>
+          this.execute(
+            nodeType,
+            item.fields,
+            secrets,
+            item.blobs,
+            onProgress,
+            identity
+          )
+        )
+      );
+      return settled.map((s) => {
+        if (s.status === "fulfilled") return { result: s.value };
+        const reason: unknown = s.reason;
+        return {
+          error: reason instanceof Error ? reason : new Error(String(reason))
+        };
+      });
+    }
+
+    const requestId = randomUUID();
+    // Inputs are staged per item: each has its own file, released below.
+    const itemIds = items.map((_, i) => `${requestId}-${i}`);
+    const timeoutMs =
+      this._options.executeTimeoutMs ?? DEFAULT_EXECUTE_TIMEOUT_MS;
+
+    log.debug("Python bridge execute.batch dispatched", {
+      nodeType,
+      requestId,
+      items: items.length
+    });
+
+    if (onProgress) {
+      this._pending.set(requestId, {
+        resolve: () => undefined,
+        reject: () => undefined,
+        onProgress
+      });
+    }
+    const batchPromise = new Promise<Record<string, unknown>>(
+      (resolve, reject) => {
+        this._pendingStream.set(requestId, {
+          resolve,
+          reject,
+          onChunk: () => {}
+        });
+        try {
+          this._send({
+            type: "execute.batch",
+            request_id: requestId,
+            data: {
+              node_type: nodeType,
+              secrets,
+              items: items.map((item, i) => ({
+                fields: item.fields,
+                ...this._stageBlobs(itemIds[i], item.blobs)
+              })),
+              ...this._identityPayload(identity),
+              ...this._resultFormats()
+            }
+          });
+        } catch (err) {
+          this._pendingStream.delete(requestId);
+          reject(err instanceof Error ? err : new Error(String(err)));
+        }
+      }
+    );
+
+    let timer: NodeJS.Timeout | undefined;
+    const timeoutPromise = new Promise<never>((_, reject) => {
+      if (timeoutMs <= 0) return;
+      timer = setTimeout(() => {
+        if (!this._pendingStream.delete(requestId)) return;
+        try {
+          this.cancel(requestId);
+        } catch {
+          // Worker may already be gone; cancel is best-effort.
+        }
+        reject(
+          new Error(
+            `Python node "${nodeType}" batch of ${items.length} timed out ` +
+              `after ${timeoutMs}ms waiting for the worker.`
+          )
+        );
+      }, timeoutMs);
+    });
+
+    try {
+      const data = await Promise.race([batchPromise, timeoutPromise]);
+      return this._batchOutcomes(data, items.length);
+    } finally {
+      if (timer) clearTimeout(timer);
+      this._pending.delete(requestId);
+      this._releaseShm(requestId);
+      for (const id of itemIds) this._releaseShm(id);
+    }
+  }
+
+  /** Split an `execute.batch` result into per-item outcomes. */
+  private _batchOutcomes(
+    data: Record<string, unknown>,
+    count: number
+  ): ExecuteBatchOutcome[] {
+    const items = data.items;
+    if (!Array.isArray(items) || items.length !== count) {
+      throw new Error(
+        `Python worker answered execute.batch of ${count} with ` +
+          `${Array.isArray(items) ? items.length : "no"} items`
+      );
+    }
+    return items.map((item: Record<string, unknown>): ExecuteBatchOutcome => {
+      if (isString(item.error)) {
+        const err = new Error(item.error);
+        Reflect.set(err, "traceback", item.traceback);
+        return { error: err };
+      }
+      try {
+        return {
+          result: {
+            outputs: (item.outputs as Record<string, unknown>) ?? {},
+            blobs: this._resultBlobs(item)
+          }
+        };
+      } catch (err) {
+        return { error: err instanceof Error ? err : new Error(String(err)) };
+      }
+    });
+  }
+
+  // ── Arrow dataframes ───────────────────────────────────────────────
+
+  /**
+   * Whether the worker reported the `arrow` capability: it reads dataframe
+   * inputs sent as Arrow IPC blobs and, asked through `result_formats`, can
+   * return dataframe outputs the same way. See `python-bridge-arrow.ts`.
+   * `NODETOOL_BRIDGE_ARROW=0` turns it off.
+   */
+  supportsArrow(): boolean {
+    return (
+      ARROW_ENABLED &&
+      (this._workerStatus?.capabilities ?? []).includes(ARROW_CAPABILITY)
+    );
+  }
+
+  /**
+   * The output encodings this side can read, for an `execute` payload, and
+   * the Arrow column types it can decode: a frame with any other column must
+   * come back as rows. Only sent to a worker with the capability; one
+   * without would not look at it.
+   */
+  protected _resultFormats(): Record<string, unknown> {
+    return this.supportsArrow()
+      ? { result_formats: [ARROW_FORMAT], arrow_types: ARROW_RESULT_TYPES }
+      : {};
+  }
+
+  // ── Shared-memory blobs ────────────────────────────────────────────
+
+  /**
+   * Whether large blobs go through {@link _shm}: the transport set an arena
+   * and the worker reported the `shm` capability.
+   */
+  supportsSharedMemory(): boolean {
+    return (
+      this._shm !== null &&
+      (this._workerStatus?.capabilities ?? []).includes(SHM_CAPABILITY)
+    );
+  }
+
+  /**
+   * The blob fields of an `execute` payload: large blobs staged to shared
+   * memory when the worker supports it, everything inline otherwise —
+   * including when staging fails, which costs speed, not the request.
+   */
+  protected _stageBlobs(
+    requestId: string,
+    blobs: ExecuteInputBlobs
+  ): Record<string, unknown> {
+    if (!this._shm || !this.supportsSharedMemory()) return { blobs };
+    try {
+      const staged = this._shm.stage(requestId, blobs);
+      return {
+        blobs: staged.blobs,
+        shm_dir: this._shm.dir,
+        ...(staged.shm ? { shm_blobs: staged.shm } : {})
+      };
+    } catch (err) {
+      // Stryker disable next-line StringLiteral,ObjectLiteral: diagnostic log args only
+      log.warn("Shared-memory staging failed; sending blobs inline", {
+        requestId,
+        error: err instanceof Error ? err.message : String(err)
+      });
+      return { blobs };
+    }
+  }
+
+  /** A result's inline blobs plus any the worker returned by descriptor. */
+  protected _resultBlobs(
+    data: Record<string, unknown>
+  ): Record<string, Uint8Array> {
+    const blobs = (data.blobs as Record<string, Uint8Array>) ?? {};
+    const shm = data.shm_blobs as ShmBlobs | undefined;
+    if (!shm || !this._shm) return blobs;
+    return { ...blobs, ...this._shm.collect(shm) };
+  }
+
+  /** Delete a settled request's shared-memory files. */
+  protected _releaseShm(requestId: string): void {
+    try {
+      this._shm?.release(requestId);
+    } catch {
+      // Best-effort: the arena is emptied when the worker exits anyway.
     }
   }
 
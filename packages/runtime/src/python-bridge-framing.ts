@@ -35,6 +35,8 @@ export class FrameSizeError extends Error {
 /**
  * Encode one msgpack-packed payload into a length-prefixed wire frame:
  * `[4-byte big-endian length][payload]`.
+ *
+ * Copies the payload. Prefer {@link writeFrame} when writing to a stream.
  */
 export function encodeFrame(payload: Buffer | Uint8Array): Buffer {
   const body = Buffer.isBuffer(payload) ? payload : Buffer.from(payload);
@@ -43,6 +45,47 @@ export function encodeFrame(payload: Buffer | Uint8Array): Buffer {
   return Buffer.concat([header, body]);
 }
 
+/**
+ * The subset of a Node `Writable` that {@link writeFrame} uses. `cork` and
+ * `uncork` are optional so plain test sinks still work.
+ */
+export interface FrameSink {
+  write(chunk: Buffer): boolean;
+  cork?(): void;
+  uncork?(): void;
+}
+
+/**
+ * Write one length-prefixed frame to `sink` without copying the payload.
+ *
+ * The 4-byte header and the payload are written as two chunks between `cork`
+ * and `uncork`. Pipes and sockets then flush them with one vectored write
+ * (`writev`). A sink that cannot cork gets a single {@link encodeFrame} buffer
+ * instead, so a reader of that sink never sees a frame split across chunks
+ * it did not ask for.
+ *
+ * Returns the result of the last `write`, i.e. `false` when the sink wants
+ * the caller to wait for `drain`.
+ */
+export function writeFrame(
+  sink: FrameSink,
+  payload: Buffer | Uint8Array
+): boolean {
+  if (!sink.cork || !sink.uncork) return sink.write(encodeFrame(payload));
+  const body = Buffer.isBuffer(payload)
+    ? payload
+    : Buffer.from(payload.buffer, payload.byteOffset, payload.byteLength);
+  const header = Buffer.allocUnsafe(4);
+  header.writeUInt32BE(body.length, 0);
+  sink.cork();
+  try {
+    sink.write(header);
+    return sink.write(body);
+  } finally {
+    sink.uncork();
+  }
+}
+
 export interface FrameDecoderOptions {
   /** Reject any frame whose declared length exceeds this. */
   maxFrameSize?: number;
@@ -54,21 +97,35 @@ export interface FrameDecoderOptions {
  * buffers partial frames and returns every frame that became complete,
  * including the case where a single chunk contains multiple frames.
  *
+ * Incoming chunks are kept as a list, not appended to one growing buffer: a
+ * 200 MB frame arriving in 64 KB pipe chunks would otherwise be re-copied on
+ * every chunk. A frame is copied once, when its last byte arrives, into a
+ * buffer sized from its length prefix — or not at all when it lies within one
+ * chunk.
+ *
  * Stateful and NOT reentrant-safe across a torn-down transport — call
  * {@link reset} (or construct a fresh instance) when the underlying
  * connection is replaced, so a stale partial frame from the old connection
  * can't desync the new one.
  */
 export class FrameDecoder {
-  private _buffer = Buffer.alloc(0);
+  /** Unconsumed chunks, oldest first; the first may be partly consumed. */
+  private _chunks: Buffer[] = [];
+  /** Bytes across `_chunks`. */
+  private _buffered = 0;
   private readonly _maxFrameSize: number;
 
   constructor(options: FrameDecoderOptions = {}) {
     this._maxFrameSize = options.maxFrameSize ?? DEFAULT_MAX_BRIDGE_FRAME_SIZE;
   }
 
+  /** Bytes received but not yet returned as part of a frame. */
+  get bufferedBytes(): number {
+    return this._buffered;
+  }
+
   /**
-   * Append `chunk` to the internal buffer and extract every complete frame
+   * Append `chunk` to the pending chunks and extract every complete frame
    * now available, invoking `onFrame` with each raw (still msgpack-packed)
    * payload as soon as it is extracted — in arrival order, before any later
    * frame in the same chunk is even looked at. This matters when a chunk
@@ -77,26 +134,87 @@ export class FrameDecoder {
    * `onFrame` by the time {@link FrameSizeError} is thrown, so a caller
    * dispatching responses from `onFrame` does not lose them.
    *
+   * A frame handed to `onFrame` may be a view into `chunk`; callers that keep
+   * it past the callback keep that chunk alive, as before.
+   *
    * Throws {@link FrameSizeError} — leaving the decoder's buffer untouched
    * beyond the append — when a declared length exceeds the configured
    * ceiling.
    */
   push(chunk: Buffer, onFrame: (frame: Buffer) => void): void {
-    this._buffer = Buffer.concat([this._buffer, chunk]);
-    while (this._buffer.length >= 4) {
-      const length = this._buffer.readUInt32BE(0);
+    if (chunk.length === 0) return;
+    this._chunks.push(chunk);
+    this._buffered += chunk.length;
+    while (this._buffered >= 4) {
+      const length = this._peekLength();
       if (length > this._maxFrameSize) {
         throw new FrameSizeError(length, this._maxFrameSize);
       }
-      if (this._buffer.length < 4 + length) break; // incomplete frame
-      const frame = this._buffer.subarray(4, 4 + length);
-      this._buffer = this._buffer.subarray(4 + length);
-      onFrame(frame);
+      if (this._buffered < 4 + length) break; // incomplete frame
+      this._skip(4);
+      onFrame(this._take(length));
     }
   }
 
   /** Drop any buffered partial frame. Call when the transport is torn down. */
   reset(): void {
-    this._buffer = Buffer.alloc(0);
+    this._chunks = [];
+    this._buffered = 0;
+  }
+
+  /** Read the 4-byte length prefix, which may straddle chunks. */
+  private _peekLength(): number {
+    const first = this._chunks[0];
+    if (first.length >= 4) return first.readUInt32BE(0);
+    const header = Buffer.allocUnsafe(4);
+    let filled = 0;
+    for (const chunk of this._chunks) {
+      const count = Math.min(chunk.length, 4 - filled);
+      filled += chunk.copy(header, filled, 0, count);
+      if (filled === 4) break;
+    }
+    return header.readUInt32BE(0);
+  }
+
+  /** Discard `n` buffered bytes. */
+  private _skip(n: number): void {
+    this._buffered -= n;
+    while (n > 0) {
+      const first = this._chunks[0];
+      if (first.length > n) {
+        this._chunks[0] = first.subarray(n);
+        return;
+      }
+      n -= first.length;
+      this._chunks.shift();
+    }
+  }
+
+  /** Remove and return the next `n` buffered bytes as one buffer. */
+  private _take(n: number): Buffer {
+    const first = this._chunks[0];
+    if (n === 0) return Buffer.alloc(0);
+    if (first.length >= n) {
+      this._skip(n);
+      return first.subarray(0, n);
+    }
+    const frame = Buffer.allocUnsafe(n);
+    let filled = 0;
+    let used = 0;
+    while (filled < n) {
+      const chunk = this._chunks[used];
+      const count = Math.min(chunk.length, n - filled);
+      chunk.copy(frame, filled, 0, count);
+      filled += count;
+      if (count === chunk.length) {
+        used++;
+      } else {
+        this._chunks[used] = chunk.subarray(count);
+      }
+    }
+    // One splice for the whole frame, not a shift per chunk.
+    this._chunks.splice(0, used);
+    this._buffered -= n;
+    return frame;
   }
 }
@@ -0,0 +1,300 @@
+/**
+ * Out-of-band transfer of large binary payloads between the JS runtime and a
+ * local Python worker, through files in shared memory.
+ *
+ * Inline, a 200 MB image blob is msgpack-encoded into the `execute` frame,
+ * pushed through the stdio pipe and decoded again by the worker: a copy at
+ * every step. With a {@link SharedMemoryArena}, every blob from
+ * `thresholdBytes` up is written once to one file per request under
+ * `/dev/shm` (tmpfs, so the file is memory, not disk; the OS temp dir where
+ * there is no `/dev/shm`). The frame carries only a descriptor per blob, in
+ * `data.shm_blobs`:
+ *
+ *   `{ path, offset, length, dtype: "uint8", shape: [length] }`
+ *
+ * which the worker can `mmap` and hand to NumPy without copying. Offsets are
+ * 64-byte aligned. The worker returns large results the same way: it writes
+ * them to files named `<request_id>.<anything>` under `data.shm_dir` and
+ * answers with `shm_blobs` descriptors, which
+ * {@link SharedMemoryArena.collect} reads back and deletes.
+ *
+ * Each bridge owns one directory. A request's input file is deleted when the
+ * request settles; the whole directory is emptied when the worker exits and
+ * removed when the bridge closes. Directories left behind by a process that
+ * died are swept when the next arena is created.
+ *
+ * Only used with a worker that lists the `shm` capability in `worker.status`,
+ * and only by the stdio transport: a WebSocket worker may be on another host.
+ */
+
+import { getNodeBuiltinSync } from "@nodetool-ai/config";
+
+const nodeFs = getNodeBuiltinSync<typeof import("node:fs")>("node:fs");
+const nodeOs = getNodeBuiltinSync<typeof import("node:os")>("node:os");
+const nodePath = getNodeBuiltinSync<typeof import("node:path")>("node:path");
+
+function fsApi(): typeof import("node:fs") {
+  if (!nodeFs) throw new Error("SharedMemoryArena requires Node");
+  return nodeFs;
+}
+function pathApi(): typeof import("node:path") {
+  if (!nodePath) throw new Error("SharedMemoryArena requires Node");
+  return nodePath;
+}
+
+/** Where one blob sits in a shared-memory file. */
+export interface ShmDescriptor {
+  path: string;
+  offset: number;
+  length: number;
+  dtype: "uint8";
+  shape: number[];
+}
+
+export type ShmBlobs = Record<string, ShmDescriptor | ShmDescriptor[]>;
+
+export interface SharedMemoryOptions {
+  /** Blobs from this many bytes up go through shared memory. Default 1 MiB. */
+  thresholdBytes?: number;
+  /** Parent directory. Default `/dev/shm`, else the OS temp dir. */
+  root?: string;
+}
+
+/** Worker capability that turns shared-memory transfer on. */
+export const SHM_CAPABILITY = "shm";
+
+const DIR_PREFIX = "nodetool-bridge-";
+const ALIGN = 64;
+const DEFAULT_THRESHOLD_BYTES = 1024 * 1024;
+
+let arenaCount = 0;
+
+export class SharedMemoryArena {
+  readonly thresholdBytes: number;
+  /** This arena's directory; created lazily, on the first `stage`. */
+  readonly dir: string;
+  private _created = false;
+
+  constructor(options: SharedMemoryOptions = {}) {
+    this.thresholdBytes = options.thresholdBytes ?? DEFAULT_THRESHOLD_BYTES;
+    const root = options.root ?? defaultShmRoot();
+    sweepStale(root);
+    this.dir = pathApi().join(
+      root,
+      `${DIR_PREFIX}${process.pid}-${arenaCount++}`
+    );
+  }
+
+  /**
+   * Move every blob of at least `thresholdBytes` into one file for
+   * `requestId`. Returns the blobs left inline and descriptors for the rest;
+   * `shm` is null when nothing was moved. Creates {@link dir} either way, so
+   * the worker can write its results there.
+   */
+  stage(
+    requestId: string,
+    blobs: Record<string, Uint8Array | Uint8Array[]>
+  ): {
+    blobs: Record<string, Uint8Array | Uint8Array[]>;
+    shm: ShmBlobs | null;
+  } {
+    this._ensureDir();
+    const large = (b: Uint8Array) => b.byteLength >= this.thresholdBytes;
+    const moved = Object.entries(blobs).filter(([, value]) =>
+      Array.isArray(value) ? value.some(large) : large(value)
+    );
+    if (moved.length === 0) return { blobs, shm: null };
+
+    const inline: Record<string, Uint8Array | Uint8Array[]> = {};
+    for (const [key, value] of Object.entries(blobs)) {
+      if (!moved.some(([k]) => k === key)) inline[key] = value;
+    }
+    const fs = fsApi();
+    const path = this._file(requestId, "in");
+    const fd = fs.openSync(path, "w", 0o600);
+    let offset = 0;
+    const write = (bytes: Uint8Array): ShmDescriptor => {
+      offset = Math.ceil(offset / ALIGN) * ALIGN;
+      // writeSync may write less than asked; a partly filled segment would
+      // reach the worker with the full length.
+      let written = 0;
+      while (written < bytes.byteLength) {
+        const n = fs.writeSync(
+          fd,
+          bytes,
+          written,
+          bytes.byteLength - written,
+          offset + written
+        );
+        if (n <= 0) {
+          throw new Error(
+            `Short write to ${path}: ${written} of ${bytes.byteLength} bytes`
+          );
+        }
+        written += n;
+      }
+      const descriptor: ShmDescriptor = {
+        path,
+        offset,
+        length: bytes.byteLength,
+        dtype: "uint8",
+        shape: [bytes.byteLength]
+      };
+      offset += bytes.byteLength;
+      return descriptor;
+    };
+    const shm: ShmBlobs = {};
+    try {
+      // A list moves whole, so the worker sees one kind of value per key.
+      for (const [key, value] of moved) {
+        shm[key] = Array.isArray(value) ? value.map(write) : write(value);
+      }
+    } catch (error) {
+      fs.closeSync(fd);
+      this.release(requestId);
+      throw error;
+    }
+    fs.closeSync(fd);
+    return { blobs: inline, shm };
+  }
+
+  /**
+   * Read the blobs a worker returned by descriptor and delete their files.
+   * Descriptors pointing outside this arena's directory are refused.
+   */
+  collect(shm: ShmBlobs): Record<string, Uint8Array> {
+    const fs = fsApi();
+    const files = new Set<string>();
+    const read = (d: ShmDescriptor): Buffer => {
+      const path = this._own(d.path);
+      files.add(path);
+      const out = Buffer.allocUnsafe(d.length);
+      const fd = fs.openSync(path, "r");
+      try {
+        let done = 0;
+        while (done < d.length) {
+          const left = d.length - done;
+          const n = fs.readSync(fd, out, done, left, d.offset + done);
+          if (n === 0) {
+            throw new Error(`Shared-memory blob truncated: ${path}`);
+          }
+          done += n;
+        }
+      } finally {
+        fs.closeSync(fd);
+      }
+      return out;
+    };
+    const blobs: Record<string, Uint8Array> = {};
+    try {
+      for (const [key, value] of Object.entries(shm)) {
+        // Result blobs are single buffers; a list keeps only its first.
+        const first = Array.isArray(value) ? value[0] : value;
+        if (first) blobs[key] = read(first);
+      }
+    } finally {
+      for (const path of files) fs.rmSync(path, { force: true });
+    }
+    return blobs;
+  }
+
+  /** Delete every file of `requestId`. Safe to call more than once. */
+  release(requestId: string): void {
+    if (!this._created) return;
+    const fs = fsApi();
+    const prefix = `${safeName(requestId)}.`;
+    for (const name of this._list()) {
+      if (name.startsWith(prefix)) {
+        fs.rmSync(pathApi().join(this.dir, name), { force: true });
+      }
+    }
+  }
+
+  /** Delete every file, e.g. when the worker that could read them died. */
+  clear(): void {
+    if (!this._created) return;
+    const fs = fsApi();
+    for (const name of this._list()) {
+      fs.rmSync(pathApi().join(this.dir, name), { force: true });
+    }
+  }
+
+  /** Remove the directory. The arena recreates it if used again. */
+  dispose(): void {
+    if (!this._created) return;
+    fsApi().rmSync(this.dir, { recursive: true, force: true });
+    this._created = false;
+  }
+
+  private _ensureDir(): void {
+    if (this._created) return;
+    fsApi().mkdirSync(this.dir, { recursive: true, mode: 0o700 });
+    this._created = true;
+  }
+
+  private _list(): string[] {
+    try {
+      return fsApi().readdirSync(this.dir);
+    } catch {
+      return [];
+    }
+  }
+
+  private _file(requestId: string, suffix: string): string {
+    return pathApi().join(this.dir, `${safeName(requestId)}.${suffix}`);
+  }
+
+  private _own(path: string): string {
+    const p = pathApi();
+    const resolved = p.resolve(path);
+    if (p.dirname(resolved) !== p.resolve(this.dir)) {
+      throw new Error(`Shared-memory path outside the bridge arena: ${path}`);
+    }
+    return resolved;
+  }
+}
+
+/** `/dev/shm` where it exists and is writable, else the OS temp dir. */
+export function defaultShmRoot(): string {
+  const fs = fsApi();
+  try {
+    fs.accessSync("/dev/shm", fs.constants.W_OK);
+    return "/dev/shm";
+  } catch {
+    if (!nodeOs) throw new Error("SharedMemoryArena requires Node");
+    return nodeOs.tmpdir();
+  }
+}
+
+/** Remove arena directories whose owning process is gone. */
+function sweepStale(root: string): void {
+  const fs = fsApi();
+  let names: string[];
+  try {
+    names = fs.readdirSync(root);
+  } catch {
+    return;
+  }
+  for (const name of names) {
+    if (!name.startsWith(DIR_PREFIX)) continue;
+    const pid = Number(name.slice(DIR_PREFIX.length).split("-")[0]);
+    if (!Number.isInteger(pid) || pid === process.pid || isAlive(pid)) {
+      continue;
+    }
+    fs.rmSync(pathApi().join(root, name), { recursive: true, force: true });
+  }
+}
+
+function isAlive(pid: number): boolean {
+  try {
+    process.kill(pid, 0);
+    return true;
+  } catch (error) {
+    // EPERM: alive, owned by someone else.
+    return (error as { code?: string }).code === "EPERM";
+  }
+}
+
+function safeName(requestId: string): string {
+  return requestId.replace(/[^A-Za-z0-9_-]/g, "_");
+}
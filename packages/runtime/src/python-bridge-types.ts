@@ -2,6 +2,7 @@ import { EventEmitter } from "node:events";
 import { z } from "zod";
 
 import type { ASRResult } from "./providers/types.js";
+import type { SharedMemoryOptions } from "./python-bridge-shm.js";
 
 interface NodeMetadataProperty {
   name: string;
@@ -116,6 +117,15 @@ export interface ExecuteResult {
 
 export type ExecuteInputBlobs = Record<string, Uint8Array | Uint8Array[]>;
 
+/** One invocation of an `execute.batch` (protocol v5). */
+export interface ExecuteBatchItem {
+  fields: Record<string, unknown>;
+  blobs: ExecuteInputBlobs;
+}
+
+/** One `execute.batch` item's outcome: its result, or what failed it alone. */
+export type ExecuteBatchOutcome = { result: ExecuteResult } | { error: Error };
+
 export interface ProgressEvent {
   request_id: string;
   progress: number;
@@ -350,6 +360,25 @@ export interface PythonBridgeOptions {
    * hangs mid-download cannot leak its pending entries forever. Default ~5min.
    */
   downloadIdleTimeoutMs?: number;
+  /**
+   * Node metadata another worker of the same Python environment already
+   * reported. When set, connect() adopts it instead of sending `discover`, so
+   * a pool of workers pays the discover round trip once. Set by
+   * {@link PooledPythonBridge}; the worker's own `worker.status` still runs.
+   */
+  discovered?: PythonDiscovery;
+  /**
+   * Large-blob transfer through shared memory for a worker on this host
+   * (stdio transport only). `false` turns it off; otherwise it is used when
+   * the worker reports the `shm` capability. See {@link SharedMemoryArena}.
+   */
+  sharedMemory?: SharedMemoryOptions | false;
+}
+
+/** What a worker's `discover` reply carries, shareable across workers. */
+export interface PythonDiscovery {
+  nodes: PythonNodeMetadata[];
+  loadErrors: PythonWorkerLoadError[];
 }
 
 export type StreamCallback = (chunk: Record<string, unknown>) => void;
@@ -378,6 +407,12 @@ export interface PythonWorkerStatus {
   load_errors: PythonWorkerLoadError[];
   transport: string;
   max_frame_size: number;
+  /**
+   * Optional wire features the worker supports, beyond what its protocol
+   * version implies — e.g. `shm` (large blobs by shared-memory descriptor).
+   * Absent on workers that predate the list.
+   */
+  capabilities?: string[];
   /**
    * ComfyUI proxy status (protocol v3+). Present only when the worker fronts a
    * ComfyUI server; used to route `comfy.*` requests (see {@link ComfyStatusInfo}).
@@ -416,6 +451,21 @@ export interface PythonBridge extends EventEmitter {
     onProgress?: (event: ProgressEvent) => void,
     identity?: ExecuteIdentity
   ): AsyncGenerator<ExecuteResult>;
+  /**
+   * Several invocations of one node type in one round trip (`execute.batch`,
+   * protocol v5, gated by {@link supportsExecuteBatch}). One outcome per
+   * item, in order. Below v5 each item is sent as its own `execute`.
+   */
+  executeBatch(
+    nodeType: string,
+    items: ExecuteBatchItem[],
+    secrets: Record<string, string>,
+    onProgress?: (event: ProgressEvent) => void,
+    identity?: ExecuteIdentity
+  ): Promise<ExecuteBatchOutcome[]>;
+  supportsExecuteBatch(): boolean;
+  /** Whether dataframes may cross as Arrow IPC (the `arrow` capability). */
+  supportsArrow(): boolean;
   cancel(requestId: string): void;
   getNodeMetadata(): PythonNodeMetadata[];
   getLoadErrors(): PythonWorkerLoadError[];
@@ -590,6 +640,7 @@ export const workerStatusSchema = z
     load_errors: z.array(workerLoadErrorSchema).catch([]),
     transport: z.string().catch(""),
     max_frame_size: z.number().catch(0),
+    capabilities: z.array(z.string()).optional().catch(undefined),
     comfy: comfyStatusInfoSchema.optional().catch(undefined)
   })
   .loose();
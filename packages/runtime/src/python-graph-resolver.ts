@@ -104,6 +104,9 @@ export function resolvePythonNodeExecutor(
   const outputTypes = Object.fromEntries(
     (meta?.outputs ?? []).map((o) => [o.name, o.type.type])
   );
+  const inputTypes = Object.fromEntries(
+    (meta?.properties ?? []).map((p) => [p.name, p.type.type])
+  );
 
   return new PythonNodeExecutor(
     bridge,
@@ -112,6 +115,7 @@ export function resolvePythonNodeExecutor(
     outputTypes,
     meta?.required_settings ?? [],
     node.id,
-    meta?.requires_vram_gb
+    meta?.requires_vram_gb,
+    inputTypes
   );
 }
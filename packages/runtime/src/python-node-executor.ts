@@ -1,16 +1,36 @@
 import type { ProcessingContext } from "./context.js";
+import type { BatchItemResult } from "./node-executor.js";
 import type {
+  ExecuteBatchItem,
+  ExecuteBatchOutcome,
   ExecuteIdentity,
   ExecuteInputBlobs,
   ExecuteResult,
   ProgressEvent
 } from "./python-bridge-types.js";
 import { loadMediaRefBytes, type MediaRefValue } from "./media-ref-bytes.js";
+import {
+  decodeDataframeOutput,
+  encodeDataframeInput,
+  isArrowDataframeMarker,
+  isDataframeValue
+} from "./python-bridge-arrow.js";
 import { isString } from "./type-predicates.js";
-import { createLogger, getNodeBuiltinSync } from "@nodetool-ai/config";
+import { recordInvocationBridgeTime } from "./invocation-account.js";
+import {
+  createLogger,
+  getNodeBuiltinSync,
+  safeProcessEnv
+} from "@nodetool-ai/config";
 
 const log = createLogger("nodetool.runtime.python-node-executor");
 
+/**
+ * Raw-RGBA inputs are PNG-encoded without compression for the bridge: the
+ * worker decodes them straight away, so encode time is all that matters.
+ */
+const BRIDGE_ENCODING = { encoding: "png-fast" } as const;
+
 /** Minimal interface for the local Python stdio bridge. */
 interface PythonBridgeLike {
   execute(
@@ -29,7 +49,22 @@ interface PythonBridgeLike {
     onProgress?: (event: ProgressEvent) => void,
     identity?: ExecuteIdentity
   ): AsyncGenerator<ExecuteResult>;
+  executeBatch?(
+    nodeType: string,
+    items: ExecuteBatchItem[],
+    secrets: Record<string, string>,
+    onProgress?: (event: ProgressEvent) => void,
+    identity?: ExecuteIdentity
+  ): Promise<ExecuteBatchOutcome[]>;
+  supportsExecuteBatch?(): boolean;
+  supportsArrow?(): boolean;
 }
+
+/** Most invocations sent in one `execute.batch`. */
+const PYTHON_BATCH_SIZE = Number(
+  safeProcessEnv()["NODETOOL_PYTHON_BATCH_SIZE"] ?? 16
+);
+
 const _nodeCrypto = getNodeBuiltinSync<typeof import("node:crypto")>(
   "node:crypto"
 );
@@ -104,7 +139,13 @@ export class PythonNodeExecutor {
      * execute so the worker can size its reclaim pass. Absent for a worker
      * that does not report one.
      */
-    private requiresVramGb?: number
+    private requiresVramGb?: number,
+    /**
+     * Declared input types by property name, from the same metadata. Only
+     * a property declared `dataframe` is sent as Arrow: a dict input that
+     * happens to hold `rows` must reach the worker as a dict.
+     */
+    private inputTypes: Record<string, string> = {}
   ) {}
 
   /**
@@ -175,7 +216,21 @@ export class PythonNodeExecutor {
     }
 
     const blobs: ExecuteInputBlobs = {};
+    const arrow = this.bridge.supportsArrow?.() ?? false;
     for (const [key, value] of Object.entries(fields)) {
+      if (
+        arrow &&
+        this.inputTypes[key] === "dataframe" &&
+        isDataframeValue(value)
+      ) {
+        const encoded = encodeDataframeInput(value);
+        if (encoded) {
+          blobs[key] = encoded.blob;
+          fields[key] = encoded.marker;
+        }
+        continue;
+      }
+
       if (isMediaRef(value)) {
         const ref = value as Record<string, unknown>;
         log.info("Processing media ref input", {
@@ -194,7 +249,7 @@ export class PythonNodeExecutor {
                 : 0,
           hasAssetId: Boolean(ref.asset_id)
         });
-        const data = await loadMediaRefBytes(value, context);
+        const data = await loadMediaRefBytes(value, context, BRIDGE_ENCODING);
         log.info("Media ref blob result", {
           nodeType: this.nodeType,
           key,
@@ -210,7 +265,9 @@ export class PythonNodeExecutor {
 
       if (isMediaRefList(value) && value.length > 0) {
         const items = await Promise.all(
-          value.map((item) => loadMediaRefBytes(item, context))
+          value.map((item) =>
+            loadMediaRefBytes(item, context, BRIDGE_ENCODING)
+          )
         );
         if (items.every((item): item is Uint8Array => item !== null)) {
           blobs[key] = items;
@@ -244,6 +301,11 @@ export class PythonNodeExecutor {
       result.outputs
     );
     for (const [name, blobData] of Object.entries(result.blobs)) {
+      const marker = outputs[name];
+      if (isArrowDataframeMarker(marker)) {
+        outputs[name] = decodeDataframeOutput(blobData, marker);
+        continue;
+      }
       // Guard the outputTypes lookup with Object.hasOwn so an external name like
       // "constructor" can't resolve to an inherited Object.prototype member.
       const mediaType = Object.hasOwn(this.outputTypes, name)
@@ -277,17 +339,81 @@ export class PythonNodeExecutor {
   ): Promise<Record<string, unknown>> {
     const { fields, blobs, secrets } = await this.prepareExecution(inputs, context);
     log.info("Python node executor calling bridge", { nodeType: this.nodeType });
-    const result = await this.bridge.execute(
-      this.nodeType,
-      fields,
-      secrets,
-      blobs,
-      this.progressHandler(context),
-      this.identity(context)
-    );
+    const started = performance.now();
+    let result: ExecuteResult;
+    try {
+      result = await this.bridge.execute(
+        this.nodeType,
+        fields,
+        secrets,
+        blobs,
+        this.progressHandler(context),
+        this.identity(context)
+      );
+    } finally {
+      recordInvocationBridgeTime(performance.now() - started);
+    }
     return this.materializeOutputs(result, context);
   }
 
+  /**
+   * Invocations the actor may group into one {@link processBatch}:
+   * `NODETOOL_PYTHON_BATCH_SIZE` (default 16) once the worker speaks
+   * `execute.batch`, else 1. Read per group, so a worker that connects later
+   * starts batching then.
+   */
+  get maxBatchSize(): number {
+    return this.bridge.executeBatch && this.bridge.supportsExecuteBatch?.()
+      ? PYTHON_BATCH_SIZE
+      : 1;
+  }
+
+  /**
+   * Run a group of invocations as one `execute.batch`. Each keeps its own
+   * fields, blobs and materialized outputs; a failed item fails only its own
+   * entry. Secrets and run identity are the node's, so they are sent once.
+   */
+  async processBatch(
+    inputs: Record<string, unknown>[],
+    context?: ProcessingContext
+  ): Promise<BatchItemResult[]> {
+    if (!this.bridge.executeBatch) {
+      throw new Error("Python bridge does not support execute.batch");
+    }
+    const prepared = await Promise.all(
+      inputs.map((item) => this.prepareExecution(item, context))
+    );
+    log.info("Python node executor calling bridge", {
+      nodeType: this.nodeType,
+      batch: prepared.length
+    });
+    const started = performance.now();
+    let outcomes: ExecuteBatchOutcome[];
+    try {
+      outcomes = await this.bridge.executeBatch(
+        this.nodeType,
+        prepared.map(({ fields, blobs }) => ({ fields, blobs })),
+        prepared[0]?.secrets ?? {},
+        this.progressHandler(context),
+        this.identity(context)
+      );
+    } finally {
+      recordInvocationBridgeTime(performance.now() - started);
+    }
+    return Promise.all(
+      outcomes.map(async (outcome): Promise<BatchItemResult> => {
+        if ("error" in outcome) return { error: outcome.error };
+        try {
+          return {
+            outputs: await this.materializeOutputs(outcome.result, context)
+          };
+        } catch (err) {
+          return { error: err instanceof Error ? err : new Error(String(err)) };
+        }
+      })
+    );
+  }
+
   async *genProcess(
     inputs: Record<string, unknown>,
     context?: ProcessingContext
@@ -298,15 +424,36 @@ export class PythonNodeExecutor {
     }
 
     const { fields, blobs, secrets } = await this.prepareExecution(inputs, context);
-    for await (const partial of this.bridge.executeStream(
+    const stream = this.bridge.executeStream(
       this.nodeType,
       fields,
       secrets,
       blobs,
       this.progressHandler(context),
       this.identity(context)
-    )) {
-      yield await this.materializeOutputs(partial, context);
+    );
+    // Only the waits on the bridge count as bridge time; the time the
+    // consumer holds a yielded frame does not.
+    let finished = false;
+    try {
+      for (;;) {
+        const started = performance.now();
+        let next: IteratorResult<ExecuteResult>;
+        try {
+          next = await stream.next();
+        } finally {
+          recordInvocationBridgeTime(performance.now() - started);
+        }
+        if (next.done) {
+          finished = true;
+          return;
+        }
+        yield await this.materializeOutputs(next.value, context);
+      }
+    } finally {
+      // A consumer that stops early must still close the bridge stream, as
+      // `for await` would.
+      if (!finished) await stream.return(undefined);
     }
   }
 }
@@ -51,10 +51,11 @@ import {
 } from "@nodetool-ai/config";
 
 import { PythonBridgeBase } from "./python-bridge-base.js";
+import { SharedMemoryArena } from "./python-bridge-shm.js";
 import {
-  encodeFrame,
   FrameDecoder,
-  FrameSizeError
+  FrameSizeError,
+  writeFrame
 } from "./python-bridge-framing.js";
 
 const log = createLogger("nodetool.runtime.python-stdio-bridge");
@@ -92,6 +93,11 @@ const MAX_BRIDGE_FRAME_SIZE = getByteLimitEnv(
   "NODETOOL_BRIDGE_MAX_FRAME_SIZE",
   256 * 1024 * 1024
 );
+const SHM_THRESHOLD_BYTES = getByteLimitEnv(
+  "NODETOOL_BRIDGE_SHM_THRESHOLD",
+  1024 * 1024
+);
+const SHM_ENABLED = safeProcessEnv()["NODETOOL_BRIDGE_SHM"] !== "0";
 const PYTHON_BRIDGE_ALLOWED_IN_PRODUCTION =
   safeProcessEnv()["NODETOOL_ALLOW_PYTHON_BRIDGE_IN_PRODUCTION"] === "1";
 
@@ -125,6 +131,13 @@ export class PythonStdioBridge extends PythonBridgeBase {
   // ── Transport: spawn & stdio setup ─────────────────────────────────
 
   protected override async _openTransport(): Promise<void> {
+    const sharedMemory = this._options.sharedMemory;
+    if (!this._shm && SHM_ENABLED && sharedMemory !== false) {
+      this._shm = new SharedMemoryArena({
+        thresholdBytes: SHM_THRESHOLD_BYTES,
+        ...sharedMemory
+      });
+    }
     const candidates = this._getPythonLaunchCandidates();
     let lastError: Error | null = null;
 
@@ -296,6 +309,8 @@ export class PythonStdioBridge extends PythonBridgeBase {
           return;
         }
 
+        // Nothing can read or finish the worker's shared-memory files now.
+        this._shm?.clear();
         this.emit("exit", code);
         const exitErr = new Error(`Python worker exited with code ${code}`);
         for (const [, req] of this._pending) {
@@ -366,7 +381,7 @@ export class PythonStdioBridge extends PythonBridgeBase {
     // Writing to a broken pipe can throw synchronously (or emit 'error'); turn
     // it into a rejected request rather than an uncaught exception.
     try {
-      this._process.stdin.write(encodeFrame(payload));
+      writeFrame(this._process.stdin, payload);
     } catch (err) {
       this._connected = false;
       throw new Error(
@@ -391,6 +406,7 @@ export class PythonStdioBridge extends PythonBridgeBase {
     }
     this._connected = false;
     this._frameDecoder.reset();
+    this._shm?.dispose();
   }
 
   /** Check if a Python interpreter can be found (without spawning). */
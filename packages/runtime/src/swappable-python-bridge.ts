@@ -15,6 +15,8 @@ import type {
   PythonBridge,
   ExecuteResult,
   ExecuteInputBlobs,
+  ExecuteBatchItem,
+  ExecuteBatchOutcome,
   ExecuteIdentity,
   JobBoundary,
   ModelEvictRequest,
@@ -150,6 +152,30 @@ export class SwappableBridge extends EventEmitter implements PythonBridge {
     );
   }
 
+  executeBatch(
+    nodeType: string,
+    items: ExecuteBatchItem[],
+    secrets: Record<string, string>,
+    onProgress?: (event: ProgressEvent) => void,
+    identity?: ExecuteIdentity
+  ): Promise<ExecuteBatchOutcome[]> {
+    return this._target.executeBatch(
+      nodeType,
+      items,
+      secrets,
+      onProgress,
+      identity
+    );
+  }
+
+  supportsExecuteBatch(): boolean {
+    return this._target.supportsExecuteBatch();
+  }
+
+  supportsArrow(): boolean {
+    return this._target.supportsArrow();
+  }
+
   cancel(requestId: string): void {
     this._target.cancel(requestId);
   }
@@ -0,0 +1,574 @@
+/**
+ * Bounded, size-aware CacheAdapter with an optional on-disk spill tier.
+ *
+ * `MemoryCache` never evicts, so a long-lived server caching image or LLM
+ * results grows without bound. `TieredCache` keeps a byte budget on its
+ * in-memory LRU; entries pushed out of it spill to a directory of msgpack
+ * blobs with a budget of its own, and a read that finds an entry on disk
+ * promotes it back to memory.
+ *
+ * Sizes are estimates — JS gives no way to measure a value's heap footprint —
+ * but they count what dominates in practice: string lengths, typed-array and
+ * `ArrayBuffer` byte lengths (an `ImageRef.data` payload), recursively.
+ *
+ * `DiskCache` is the disk tier on its own: every entry is written through, so
+ * the whole cache outlives the process.
+ */
+
+import { pack, unpack } from "msgpackr";
+import { getNodeBuiltinSync } from "@nodetool-ai/config";
+import type { CacheAdapter } from "./context.js";
+
+const nodeCrypto =
+  getNodeBuiltinSync<typeof import("node:crypto")>("node:crypto");
+const nodeFsP =
+  getNodeBuiltinSync<typeof import("node:fs/promises")>("node:fs/promises");
+const nodePath = getNodeBuiltinSync<typeof import("node:path")>("node:path");
+
+/** Flat per-value overhead charged for object headers and map slots. */
+const ENTRY_OVERHEAD_BYTES = 64;
+
+/** Default in-memory budget: 256 MiB. */
+const DEFAULT_MAX_MEMORY_BYTES = 256 * 1024 * 1024;
+
+/** Default on-disk budget: 2 GiB. */
+const DEFAULT_MAX_DISK_BYTES = 2 * 1024 * 1024 * 1024;
+
+/** Blob files written by the disk tier: `<sha256 of key>.msgpack`. */
+const BLOB_FILE = /^[0-9a-f]{64}\.msgpack$/;
+
+/**
+ * Estimate the retained size of a cached value in bytes. Strings count two
+ * bytes per UTF-16 unit; binary payloads count their byte length; objects and
+ * arrays recurse. Shared sub-objects are counted once.
+ */
+export function estimateCacheValueSize(value: unknown): number {
+  return estimate(value, new Set());
+}
+
+function estimate(value: unknown, seen: Set<object>): number {
+  if (value === null || value === undefined) return 8;
+  switch (typeof value) {
+    case "string":
+      return 16 + value.length * 2;
+    case "number":
+    case "bigint":
+      return 8;
+    case "boolean":
+      return 4;
+    case "function":
+    case "symbol":
+      return 0;
+  }
+  const obj = value as object;
+  if (ArrayBuffer.isView(obj)) return 64 + obj.byteLength;
+  if (obj instanceof ArrayBuffer) return 64 + obj.byteLength;
+  if (seen.has(obj)) return 0;
+  seen.add(obj);
+  let total = 32;
+  if (Array.isArray(obj)) {
+    for (const item of obj) total += 8 + estimate(item, seen);
+    return total;
+  }
+  if (obj instanceof Map) {
+    for (const [k, v] of obj) total += estimate(k, seen) + estimate(v, seen);
+    return total;
+  }
+  for (const [k, v] of Object.entries(obj)) {
+    total += 16 + k.length * 2 + estimate(v, seen);
+  }
+  return total;
+}
+
+/** Counters for a {@link TieredCache}. */
+export interface TieredCacheStats {
+  /** Reads answered from either tier. */
+  hits: number;
+  /** Reads answered from memory. */
+  memoryHits: number;
+  /** Reads answered from disk (and promoted back to memory). */
+  diskHits: number;
+  /** Reads that found nothing live in either tier. */
+  misses: number;
+  /** Entries pushed out of the memory tier by its byte budget. */
+  evictions: number;
+  /** Evicted entries written to the disk tier. */
+  spills: number;
+  /** Entries dropped from the disk tier by its byte budget. */
+  diskEvictions: number;
+  memoryBytes: number;
+  memoryEntries: number;
+  diskBytes: number;
+  diskEntries: number;
+}
+
+export interface TieredCacheOptions {
+  /** Byte budget of the in-memory LRU. Default 256 MiB. */
+  maxMemoryBytes?: number;
+  /**
+   * Directory for the spill tier. Unset means memory only: an evicted entry
+   * is dropped.
+   */
+  diskDir?: string;
+  /** Byte budget of the spill tier. Default 2 GiB. */
+  maxDiskBytes?: number;
+  /** Size estimator; override for value shapes the default misjudges. */
+  sizeOf?: (value: unknown) => number;
+}
+
+interface MemoryEntry {
+  value: unknown;
+  expires: number | null;
+  size: number;
+}
+
+/** A disk read of one key that a later write to the key has overtaken. */
+interface Promotion {
+  stale: boolean;
+}
+
+function isExpired(expires: number | null): boolean {
+  return expires !== null && Date.now() > expires;
+}
+
+/**
+ * Directory of msgpack blobs, one per key, evicted least-recently-used under
+ * a byte budget. The index is rebuilt from the directory on first use, so
+ * spilled entries survive a process restart.
+ *
+ * Operations on one key run one after another: otherwise a spill of an old
+ * value still writing could land after a newer value's write, and two
+ * writes of one key would both count their bytes against a single entry.
+ */
+class DiskTier {
+  /** Blob hash → size, in least- to most-recently-used order. */
+  private _index = new Map<string, number>();
+  private _bytes = 0;
+  private _ready: Promise<void> | null = null;
+  /** Tail of each hash's queue of operations, while any is pending. */
+  private _queues = new Map<string, Promise<void>>();
+  evictions = 0;
+
+  constructor(
+    private readonly _dir: string,
+    private readonly _maxBytes: number
+  ) {}
+
+  get bytes(): number {
+    return this._bytes;
+  }
+
+  get entries(): number {
+    return this._index.size;
+  }
+
+  private _hash(key: string): string {
+    return nodeCrypto!.createHash("sha256").update(key).digest("hex");
+  }
+
+  private _file(hash: string): string {
+    return nodePath!.join(this._dir, `${hash}.msgpack`);
+  }
+
+  /** Run `op` once every operation queued before it on `hash` has settled. */
+  private _serialize<T>(hash: string, op: () => Promise<T>): Promise<T> {
+    const prev = this._queues.get(hash) ?? Promise.resolve();
+    const run = prev.then(op);
+    const tail = run.then(
+      () => undefined,
+      () => undefined
+    );
+    this._queues.set(hash, tail);
+    void tail.then(() => {
+      if (this._queues.get(hash) === tail) this._queues.delete(hash);
+    });
+    return run;
+  }
+
+  private _init(): Promise<void> {
+    this._ready ??= (async () => {
+      const fs = nodeFsP!;
+      await fs.mkdir(this._dir, { recursive: true });
+      const found: Array<{ hash: string; size: number; mtime: number }> = [];
+      for (const name of await fs.readdir(this._dir)) {
+        if (!BLOB_FILE.test(name)) continue;
+        try {
+          const st = await fs.stat(nodePath!.join(this._dir, name));
+          found.push({
+            hash: name.slice(0, 64),
+            size: st.size,
+            mtime: st.mtimeMs
+          });
+        } catch {
+          // Removed between readdir and stat — nothing to index.
+        }
+      }
+      found.sort((a, b) => a.mtime - b.mtime);
+      for (const f of found) {
+        this._index.set(f.hash, f.size);
+        this._bytes += f.size;
+      }
+      await this._enforceBudget();
+    })();
+    return this._ready;
+  }
+
+  async get(key: string): Promise<MemoryEntry | undefined> {
+    await this._init();
+    const hash = this._hash(key);
+    return this._serialize(hash, () => this._read(hash, key));
+  }
+
+  private async _read(
+    hash: string,
+    key: string
+  ): Promise<MemoryEntry | undefined> {
+    if (!this._index.has(hash)) return undefined;
+    let record: { key: string; value: unknown; expires: number | null };
+    try {
+      record = unpack(await nodeFsP!.readFile(this._file(hash)));
+    } catch {
+      await this._remove(hash);
+      return undefined;
+    }
+    // A different key under the same hash is a collision, not a hit.
+    if (record.key !== key) return undefined;
+    if (isExpired(record.expires)) {
+      await this._remove(hash);
+      return undefined;
+    }
+    const size = this._index.get(hash);
+    if (size !== undefined) {
+      this._index.delete(hash);
+      this._index.set(hash, size);
+    }
+    return { value: record.value, expires: record.expires, size: 0 };
+  }
+
+  /** Write an entry; returns false when the value cannot be serialized. */
+  async set(
+    key: string,
+    value: unknown,
+    expires: number | null
+  ): Promise<boolean> {
+    await this._init();
+    let blob: Uint8Array;
+    try {
+      blob = pack({ key, value, expires });
+    } catch {
+      return false;
+    }
+    if (blob.byteLength > this._maxBytes) return false;
+    const hash = this._hash(key);
+    await this._serialize(hash, async () => {
+      await this._remove(hash);
+      await nodeFsP!.writeFile(this._file(hash), blob);
+      this._index.set(hash, blob.byteLength);
+      this._bytes += blob.byteLength;
+    });
+    await this._enforceBudget();
+    return true;
+  }
+
+  async delete(key: string): Promise<void> {
+    await this._init();
+    const hash = this._hash(key);
+    await this._serialize(hash, () => this._remove(hash));
+  }
+
+  private async _remove(hash: string): Promise<void> {
+    const size = this._index.get(hash);
+    if (size === undefined) return;
+    this._index.delete(hash);
+    this._bytes -= size;
+    await nodeFsP!.rm(this._file(hash), { force: true });
+  }
+
+  private async _enforceBudget(): Promise<void> {
+    while (this._bytes > this._maxBytes) {
+      const oldest = this._index.keys().next();
+      if (oldest.done) break;
+      const hash = oldest.value;
+      await this._serialize(hash, async () => {
+        // Rewritten or read while queued: no longer the one to evict.
+        if (this._index.keys().next().value !== hash) return;
+        this.evictions++;
+        await this._remove(hash);
+      });
+    }
+  }
+}
+
+/**
+ * CacheAdapter with an LRU byte budget and an optional disk spill tier.
+ * Selectable for a run through `ProcessingContext`'s `cacheOptions`.
+ */
+export class TieredCache implements CacheAdapter {
+  /** Insertion order doubles as recency: a hit re-inserts its key. */
+  private _memory = new Map<string, MemoryEntry>();
+  private _memoryBytes = 0;
+  private readonly _maxMemoryBytes: number;
+  private readonly _sizeOf: (value: unknown) => number;
+  private readonly _disk: DiskTier | null;
+  /**
+   * Entries evicted from memory whose disk write is still in flight. Reads
+   * check here so an entry is never briefly absent from both tiers.
+   */
+  private _spilling = new Map<string, MemoryEntry>();
+  /**
+   * Disk reads in flight per key. A `set` or `delete` marks them stale, so a
+   * read that began before the write cannot promote its older value over it.
+   */
+  private _promotions = new Map<string, Set<Promotion>>();
+  private _counters = {
+    hits: 0,
+    memoryHits: 0,
+    diskHits: 0,
+    misses: 0,
+    evictions: 0,
+    spills: 0
+  };
+
+  constructor(options: TieredCacheOptions = {}) {
+    this._maxMemoryBytes = options.maxMemoryBytes ?? DEFAULT_MAX_MEMORY_BYTES;
+    this._sizeOf = options.sizeOf ?? estimateCacheValueSize;
+    this._disk =
+      options.diskDir && nodeFsP && nodePath && nodeCrypto
+        ? new DiskTier(
+            options.diskDir,
+            options.maxDiskBytes ?? DEFAULT_MAX_DISK_BYTES
+          )
+        : null;
+  }
+
+  async get<TValue>(key: string): Promise<TValue | undefined> {
+    const entry = this._memory.get(key) ?? this._spilling.get(key);
+    if (entry) {
+      if (isExpired(entry.expires)) {
+        await this.delete(key);
+        this._counters.misses++;
+        return undefined;
+      }
+      if (this._memory.has(key)) {
+        this._memory.delete(key);
+        this._memory.set(key, entry);
+      }
+      this._counters.hits++;
+      this._counters.memoryHits++;
+      // SAFETY: `TValue` is what the caller stored under this key.
+      return entry.value as TValue;
+    }
+    const fromDisk = this._disk ? await this._promote(key) : undefined;
+    if (fromDisk) {
+      this._counters.hits++;
+      this._counters.diskHits++;
+      // SAFETY: `TValue` is what the caller stored under this key.
+      return fromDisk.value as TValue;
+    }
+    this._counters.misses++;
+    return undefined;
+  }
+
+  /**
+   * Read `key` from disk and move it into memory. The value read is returned
+   * either way; it is only moved if no `set` or `delete` of the key landed
+   * meanwhile, since that write owns the key now.
+   */
+  private async _promote(key: string): Promise<MemoryEntry | undefined> {
+    const promotion: Promotion = { stale: false };
+    let pending = this._promotions.get(key);
+    if (!pending) {
+      pending = new Set();
+      this._promotions.set(key, pending);
+    }
+    pending.add(promotion);
+    try {
+      const fromDisk = await this._disk!.get(key);
+      if (!fromDisk) return undefined;
+      if (!promotion.stale) await this._disk!.delete(key);
+      if (!promotion.stale) {
+        await this._insert(key, fromDisk.value, fromDisk.expires);
+      }
+      return fromDisk;
+    } finally {
+      pending.delete(promotion);
+      if (pending.size === 0 && this._promotions.get(key) === pending) {
+        this._promotions.delete(key);
+      }
+    }
+  }
+
+  async set<TValue>(
+    key: string,
+    value: TValue,
+    ttlSeconds?: number
+  ): Promise<void> {
+    const expires = ttlSeconds ? Date.now() + ttlSeconds * 1000 : null;
+    this._invalidatePromotions(key);
+    this._removeFromMemory(key);
+    this._spilling.delete(key);
+    await this._disk?.delete(key);
+    await this._insert(key, value, expires);
+  }
+
+  async has(key: string): Promise<boolean> {
+    const entry = this._memory.get(key) ?? this._spilling.get(key);
+    if (entry) return !isExpired(entry.expires);
+    return this._disk ? (await this._disk.get(key)) !== undefined : false;
+  }
+
+  async delete(key: string): Promise<void> {
+    this._invalidatePromotions(key);
+    this._removeFromMemory(key);
+    this._spilling.delete(key);
+    await this._disk?.delete(key);
+  }
+
+  get stats(): TieredCacheStats {
+    return {
+      ...this._counters,
+      diskEvictions: this._disk?.evictions ?? 0,
+      memoryBytes: this._memoryBytes,
+      memoryEntries: this._memory.size,
+      diskBytes: this._disk?.bytes ?? 0,
+      diskEntries: this._disk?.entries ?? 0
+    };
+  }
+
+  private _invalidatePromotions(key: string): void {
+    for (const promotion of this._promotions.get(key) ?? []) {
+      promotion.stale = true;
+    }
+  }
+
+  private _removeFromMemory(key: string): void {
+    const entry = this._memory.get(key);
+    if (!entry) return;
+    this._memory.delete(key);
+    this._memoryBytes -= entry.size;
+  }
+
+  private async _insert(
+    key: string,
+    value: unknown,
+    expires: number | null
+  ): Promise<void> {
+    const size = ENTRY_OVERHEAD_BYTES + this._sizeOf(value);
+    // Two inserts of one key can overlap (concurrent sets, or promotions of
+    // one disk entry); the later one replaces the earlier's bytes.
+    this._removeFromMemory(key);
+    if (size > this._maxMemoryBytes) {
+      // Would evict everything else and still not fit: straight to disk.
+      this._counters.evictions++;
+      await this._spill(key, { value, expires, size });
+      return;
+    }
+    this._memory.set(key, { value, expires, size });
+    this._memoryBytes += size;
+    const evicted: Array<[string, MemoryEntry]> = [];
+    while (this._memoryBytes > this._maxMemoryBytes) {
+      const oldest = this._memory.entries().next();
+      if (oldest.done) break;
+      const [oldKey, oldEntry] = oldest.value;
+      this._memory.delete(oldKey);
+      this._memoryBytes -= oldEntry.size;
+      this._counters.evictions++;
+      if (!isExpired(oldEntry.expires)) evicted.push([oldKey, oldEntry]);
+    }
+    for (const [oldKey, oldEntry] of evicted) {
+      await this._spill(oldKey, oldEntry);
+    }
+  }
+
+  private async _spill(key: string, entry: MemoryEntry): Promise<void> {
+    if (!this._disk) return;
+    this._spilling.set(key, entry);
+    try {
+      if (await this._disk.set(key, entry.value, entry.expires)) {
+        this._counters.spills++;
+      }
+    } finally {
+      // A `set` for this key that landed during the write already replaced
+      // it; only clear the marker this spill placed.
+      if (this._spilling.get(key) === entry) this._spilling.delete(key);
+    }
+  }
+}
+
+/** Counters for a {@link DiskCache}. */
+export interface DiskCacheStats {
+  hits: number;
+  misses: number;
+  /** Entries dropped by the byte budget. */
+  evictions: number;
+  bytes: number;
+  entries: number;
+}
+
+export interface DiskCacheOptions {
+  /** Directory the entries live in; created on first use. */
+  dir: string;
+  /** Byte budget. Default 2 GiB. */
+  maxBytes?: number;
+}
+
+/**
+ * CacheAdapter over a directory of msgpack blobs alone, evicted
+ * least-recently-used under a byte budget. Every `set` is written through, so
+ * entries survive a restart; use it for results worth keeping across runs
+ * rather than within one.
+ */
+export class DiskCache implements CacheAdapter {
+  private readonly _disk: DiskTier;
+  private _counters = { hits: 0, misses: 0 };
+
+  constructor(options: DiskCacheOptions) {
+    if (!nodeFsP || !nodePath || !nodeCrypto) {
+      throw new Error("DiskCache requires node:fs, node:path and node:crypto");
+    }
+    this._disk = new DiskTier(
+      options.dir,
+      options.maxBytes ?? DEFAULT_MAX_DISK_BYTES
+    );
+  }
+
+  async get<TValue>(key: string): Promise<TValue | undefined> {
+    const entry = await this._disk.get(key);
+    if (!entry) {
+      this._counters.misses++;
+      return undefined;
+    }
+    this._counters.hits++;
+    // SAFETY: `TValue` is what the caller stored under this key.
+    return entry.value as TValue;
+  }
+
+  async set<TValue>(
+    key: string,
+    value: TValue,
+    ttlSeconds?: number
+  ): Promise<void> {
+    const expires = ttlSeconds ? Date.now() + ttlSeconds * 1000 : null;
+    if (!(await this._disk.set(key, value, expires))) {
+      // Unserializable or over budget: drop any older value for the key.
+      await this._disk.delete(key);
+    }
+  }
+
+  async has(key: string): Promise<boolean> {
+    return (await this._disk.get(key)) !== undefined;
+  }
+
+  async delete(key: string): Promise<void> {
+    await this._disk.delete(key);
+  }
+
+  get stats(): DiskCacheStats {
+    return {
+      ...this._counters,
+      evictions: this._disk.evictions,
+      bytes: this._disk.bytes,
+      entries: this._disk.entries
+    };
+  }
+}
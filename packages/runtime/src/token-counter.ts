@@ -12,11 +12,14 @@
 
 import { getEncoding, type Tiktoken } from "js-tiktoken";
 
+/** The BPE encoding every count in this module uses. */
+export const TOKEN_ENCODING = "cl100k_base";
+
 let cachedEncoder: Tiktoken | null = null;
 
 function getEncoder(): Tiktoken {
   if (cachedEncoder === null) {
-    cachedEncoder = getEncoding("cl100k_base");
+    cachedEncoder = getEncoding(TOKEN_ENCODING);
   }
   return cachedEncoder;
 }
@@ -92,6 +92,15 @@ export function setLastUsage(usage: LlmUsage): void {
   // made outside a capture slot still cost money, and retry safety turns on
   // whether this invocation spent anything.
   recordInvocationCost(usage.cost);
+  addSlotUsage(usage);
+}
+
+/**
+ * Add token usage to the in-flight call's slot without charging the node
+ * invocation: for a wrapper passing on usage an inner provider already
+ * charged inside a slot of its own.
+ */
+export function addSlotUsage(usage: LlmUsage): void {
   const slot = usageStore.getStore();
   if (!slot) return;
   const previous = slot.usage;
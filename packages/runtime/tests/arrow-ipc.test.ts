@@ -0,0 +1,174 @@
+/**
+ * Tests for the Arrow IPC codec: decoding a stream written by pyarrow,
+ * reading date columns, round-tripping tables built from JS values, and
+ * refusing what the codec does not support.
+ */
+
+import { describe, it, expect } from "vitest";
+
+import {
+  ArrowTable,
+  buildArrowTable,
+  decodeArrowIpc,
+  encodeArrowIpc
+} from "../src/arrow-ipc.js";
+
+/**
+ * `pyarrow.ipc.new_stream` output for
+ * `{id: int32 [1, null, 3], name: utf8 ["a", "bé", null],
+ *   at: timestamp[us] [2024-05-01] * 3}`, written with `max_chunksize=2`.
+ */
+const PYARROW_STREAM = Buffer.from(
+  "/////+AAAAAQAAAAAAAKAAwABgAFAAgACgAAAAABBAAMAAAACAAIAAAABAAIAAAABAAAAAMA" +
+    "AAB4AAAAOAAAAAQAAACk////AAABChAAAAAcAAAABAAAAAAAAAACAAAAYXQAAAAABgAIAAYA" +
+    "BgAAAAAAAgDU////AAABBRAAAAAcAAAABAAAAAAAAAAEAAAAbmFtZQAAAAAEAAQABAAAABAA" +
+    "FAAIAAYABwAMAAAAEAAQAAAAAAABAhAAAAAcAAAABAAAAAAAAAACAAAAaWQAAAgADAAIAAcA" +
+    "CAAAAAAAAAEgAAAAAAAAAP/////4AAAAFAAAAAAAAAAMABYABgAFAAgADAAMAAAAAAMEABgA" +
+    "AABIAAAAAAAAAAAACgAYAAwABAAIAAoAAACMAAAAEAAAAAIAAAAAAAAAAAAAAAcAAAAAAAAA" +
+    "AAAAAAEAAAAAAAAACAAAAAAAAAAMAAAAAAAAABgAAAAAAAAAAAAAAAAAAAAYAAAAAAAAAAwA" +
+    "AAAAAAAAKAAAAAAAAAAEAAAAAAAAADAAAAAAAAAAAAAAAAAAAAAwAAAAAAAAABgAAAAAAAAA" +
+    "AAAAAAMAAAACAAAAAAAAAAEAAAAAAAAAAgAAAAAAAAAAAAAAAAAAAAIAAAAAAAAAAAAAAAAA" +
+    "AAAFAAAAAAAAAAEAAAAAAAAAAwAAAAAAAAAAAAAAAQAAAAQAAAAAAAAAYWLDqQAAAAAAgO0q" +
+    "WRcGAACA7SpZFwYAAIDtKlkXBgD/////+AAAABQAAAAAAAAADAAWAAYABQAIAAwADAAAAAAD" +
+    "BAAYAAAAIAAAAAAAAAAAAAoAGAAMAAQACAAKAAAAjAAAABAAAAABAAAAAAAAAAAAAAAHAAAA" +
+    "AAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAABAAAAAAAAAAIAAAAAAAAAAEAAAAAAAAAEAAAAAAA" +
+    "AAAIAAAAAAAAABgAAAAAAAAAAAAAAAAAAAAYAAAAAAAAAAAAAAAAAAAAGAAAAAAAAAAIAAAA" +
+    "AAAAAAAAAAADAAAAAQAAAAAAAAAAAAAAAAAAAAEAAAAAAAAAAQAAAAAAAAABAAAAAAAAAAAA" +
+    "AAAAAAAAAwAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAIDtKlkXBgD/////AAAAAA==",
+  "base64"
+);
+
+describe("decodeArrowIpc", () => {
+  it("reads a multi-batch stream written by pyarrow", () => {
+    const table = decodeArrowIpc(PYARROW_STREAM);
+    expect(table.numRows).toBe(3);
+    expect(table.batches).toHaveLength(2);
+    expect(table.fields.map((f) => [f.name, f.type])).toEqual([
+      ["id", { kind: "int", bitWidth: 32, signed: true }],
+      ["name", { kind: "utf8", large: false }],
+      ["at", { kind: "timestamp", unit: "us", timezone: null }]
+    ]);
+    expect(table.column("id")!.toArray()).toEqual([1, null, 3]);
+    expect(table.column("name")!.get(1)).toBe("bé");
+    expect(table.column("name")!.nullCount).toBe(1);
+    expect(table.column("at")!.get(2)).toBe("2024-05-01T00:00:00.000Z");
+    expect(table.toMatrix()).toEqual([
+      [1, "a", "2024-05-01T00:00:00.000Z"],
+      [null, "bé", "2024-05-01T00:00:00.000Z"],
+      [3, null, "2024-05-01T00:00:00.000Z"]
+    ]);
+  });
+
+  it("re-encodes a decoded table batch for batch", () => {
+    const table = decodeArrowIpc(PYARROW_STREAM);
+    const again = decodeArrowIpc(encodeArrowIpc(table));
+    expect(again.batches).toHaveLength(2);
+    expect(again.toMatrix()).toEqual(table.toMatrix());
+  });
+
+  it("reads date32 and date64 columns as calendar dates", () => {
+    // Row 0: 2024-05-01, row 1: null, row 2: 1969-12-31.
+    const days = new DataView(new ArrayBuffer(12));
+    days.setInt32(0, 19844, true);
+    days.setInt32(8, -1, true);
+    const ms = new DataView(new ArrayBuffer(24));
+    ms.setBigInt64(0, BigInt(Date.UTC(2024, 4, 1)), true);
+    ms.setBigInt64(16, BigInt(-86_400_000), true);
+    const chunk = (data: DataView) => ({
+      length: 3,
+      nullCount: 1,
+      validity: new Uint8Array([0b101]),
+      offsets: null,
+      data
+    });
+    const table = new ArrowTable(
+      [
+        { name: "d32", type: { kind: "date", unit: "day" }, nullable: true },
+        { name: "d64", type: { kind: "date", unit: "ms" }, nullable: true }
+      ],
+      [{ length: 3, chunks: [chunk(days), chunk(ms)] }]
+    );
+
+    const back = decodeArrowIpc(encodeArrowIpc(table));
+    expect(back.fields.map((f) => f.type)).toEqual([
+      { kind: "date", unit: "day" },
+      { kind: "date", unit: "ms" }
+    ]);
+    expect(back.toMatrix()).toEqual([
+      ["2024-05-01", "2024-05-01"],
+      [null, null],
+      ["1969-12-31", "1969-12-31"]
+    ]);
+  });
+
+  it("rejects a stream without a schema", () => {
+    expect(() => decodeArrowIpc(new Uint8Array(8).fill(0))).toThrow(
+      /no schema/
+    );
+  });
+
+  it("rejects a truncated stream", () => {
+    expect(() => decodeArrowIpc(PYARROW_STREAM.subarray(0, 100))).toThrow(
+      /Truncated/
+    );
+  });
+});
+
+describe("buildArrowTable", () => {
+  const rows = [
+    { n: 1, x: 0.5, s: "a", b: true, none: null },
+    { n: -(2 ** 40), x: null, s: "ü✓", b: false, none: undefined },
+    { n: null, x: 2, s: null, b: null, none: null }
+  ];
+  const names = ["n", "x", "s", "b", "none"];
+  const build = () =>
+    buildArrowTable(
+      names,
+      rows.length,
+      (r, c) => rows[r][names[c] as keyof (typeof rows)[number]]
+    )!;
+
+  it("infers one type per column", () => {
+    expect(build().fields.map((f) => f.type)).toEqual([
+      { kind: "int", bitWidth: 64, signed: true },
+      { kind: "float", bitWidth: 64 },
+      { kind: "utf8", large: false },
+      { kind: "bool" },
+      { kind: "null" }
+    ]);
+  });
+
+  it("round-trips values and nulls through IPC", () => {
+    const bytes = encodeArrowIpc(build());
+    // Continuation marker, then 8-byte aligned messages, then end-of-stream.
+    expect(bytes.byteLength % 8).toBe(0);
+    expect(Buffer.from(bytes.subarray(-8))).toEqual(
+      Buffer.from([0xff, 0xff, 0xff, 0xff, 0, 0, 0, 0])
+    );
+    expect(decodeArrowIpc(bytes).toMatrix()).toEqual([
+      [1, 0.5, "a", true, null],
+      [-(2 ** 40), null, "ü✓", false, null],
+      [null, 2, null, null, null]
+    ]);
+  });
+
+  it("encodes an empty table", () => {
+    const table = buildArrowTable(["a"], 0, () => 1)!;
+    const back = decodeArrowIpc(encodeArrowIpc(table));
+    expect(back.numRows).toBe(0);
+    expect(back.fields.map((f) => f.name)).toEqual(["a"]);
+  });
+
+  it("returns null for mixed or nested columns", () => {
+    expect(buildArrowTable(["m"], 2, (r) => (r ? "x" : 1))).toBeNull();
+    expect(buildArrowTable(["o"], 1, () => ({ a: 1 }))).toBeNull();
+    expect(buildArrowTable(["d"], 1, () => new Date())).toBeNull();
+  });
+
+  it("reads cells without building rows", () => {
+    const column = build().column("s")!;
+    expect(column.length).toBe(3);
+    expect(column.get(1)).toBe("ü✓");
+    expect(() => column.get(3)).toThrow(RangeError);
+  });
+});
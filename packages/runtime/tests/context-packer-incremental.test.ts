@@ -0,0 +1,140 @@
+/**
+ * Tests for memoized message counts and the incremental ContextPacker: the
+ * cache never changes a count, and packing incrementally gives exactly what
+ * packContext gives for the same thread.
+ */
+import { beforeEach, describe, it, expect } from "vitest";
+import {
+  clearMessageTokenCache,
+  ContextPacker,
+  estimateMessageTokens,
+  packContext
+} from "../src/context-packer.js";
+import { countTokens } from "../src/token-counter.js";
+import type { Message } from "../src/providers/types.js";
+
+function turn(i: number): Message[] {
+  return [
+    {
+      role: "user",
+      content: `question ${i}: ${"why is the sky blue ".repeat(i % 7)}`
+    },
+    {
+      role: "assistant",
+      content: null,
+      toolCalls: [
+        { id: `call-${i}`, name: "search", args: { query: `sky ${i}`, n: i } }
+      ]
+    },
+    { role: "tool", content: `result ${i} `.repeat(20 + (i % 11)) },
+    {
+      role: "assistant",
+      content: [
+        { type: "text", text: `answer ${i} `.repeat(3) },
+        { type: "image_url", image: { uri: "file:///sky.png" } }
+      ]
+    }
+  ];
+}
+
+function thread(turns: number): Message[] {
+  return Array.from({ length: turns }, (_, i) => turn(i)).flat();
+}
+
+beforeEach(() => clearMessageTokenCache());
+
+describe("estimateMessageTokens — memoized", () => {
+  it("gives the same count cold and warm", () => {
+    const text = "the quick brown fox jumps over the lazy dog ".repeat(10);
+    const msg: Message = { role: "user", content: text };
+    const cold = estimateMessageTokens(msg);
+    expect(cold).toBe(countTokens(text));
+    expect(estimateMessageTokens({ ...msg })).toBe(cold);
+  });
+
+  it("keys on where the text sits, not just the text", () => {
+    const a = "alpha ".repeat(20);
+    const b = "beta ".repeat(20);
+    const split: Message = {
+      role: "user",
+      content: [
+        { type: "text", text: a },
+        { type: "text", text: b }
+      ]
+    };
+    const joined: Message = { role: "user", content: a + b };
+    expect(estimateMessageTokens(split)).toBe(countTokens(a) + countTokens(b));
+    expect(estimateMessageTokens(joined)).toBe(countTokens(a + b));
+  });
+
+  it("counts a tool call's arguments as they are now", () => {
+    const args = { query: "x" };
+    const msg: Message = {
+      role: "assistant",
+      content: null,
+      toolCalls: [{ id: "c", name: "search", args }]
+    };
+    const before = estimateMessageTokens(msg);
+    args.query = "a much longer query with many more words ".repeat(5);
+    expect(estimateMessageTokens(msg)).toBe(
+      1 + countTokens("search") + countTokens(JSON.stringify(args))
+    );
+    expect(estimateMessageTokens(msg)).toBeGreaterThan(before);
+  });
+});
+
+describe("ContextPacker", () => {
+  const sys = "You are a careful research assistant.";
+
+  it("packs exactly like packContext at every budget", () => {
+    const messages = thread(30);
+    const packer = new ContextPacker(messages);
+    const total = messages.reduce((n, m) => n + estimateMessageTokens(m), 0);
+    expect(packer.messageTokens).toBe(total);
+    for (const budget of [0, 5, 8, 40, 333, 1000, total, total + 100]) {
+      expect(packer.pack(sys, budget)).toEqual(
+        packContext(messages, sys, budget)
+      );
+    }
+  });
+
+  it("follows a growing thread and counts only the new turn", () => {
+    const messages = thread(10);
+    const packer = new ContextPacker();
+    packer.sync(messages);
+    const before = packer.messageTokens;
+    const next = turn(10);
+    messages.push(...next);
+    packer.sync(messages);
+    expect(packer.messageTokens).toBe(
+      before + next.reduce((n, m) => n + estimateMessageTokens(m), 0)
+    );
+    expect(packer.pack(sys, 400)).toEqual(packContext(messages, sys, 400));
+  });
+
+  it("recounts from the first replaced message", () => {
+    const messages = thread(5);
+    const packer = new ContextPacker(messages);
+    const edited: Message[] = [
+      ...messages.slice(0, 3),
+      { role: "user", content: "short" }
+    ];
+    packer.sync(edited);
+    expect(packer.messages).toEqual(edited);
+    expect(packer.messageTokens).toBe(
+      edited.reduce((n, m) => n + estimateMessageTokens(m), 0)
+    );
+    expect(packer.pack(sys, 60)).toEqual(packContext(edited, sys, 60));
+  });
+
+  it("truncates an oversized system prompt like packContext", () => {
+    const packer = new ContextPacker(thread(2));
+    const long = "x".repeat(200);
+    expect(packer.pack(long, 5)).toEqual(
+      packContext([...packer.messages], long, 5)
+    );
+    packer.reset();
+    expect(packer.messageTokens).toBe(0);
+    expect(packer.pack(sys, 100)).toEqual({ messages: [], systemPrompt: sys });
+  });
+});
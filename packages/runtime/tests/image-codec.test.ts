@@ -17,6 +17,10 @@ import {
   encodeRawImageRef,
   extractImageRegion
 } from "../src/image-codec.js";
+import {
+  createInvocationAccount,
+  inInvocationAccount
+} from "../src/invocation-account.js";
 import { RAW_RGBA_MIME, type ImageRef } from "@nodetool-ai/protocol";
 
 const PNG_SIGNATURE = [0x89, 0x50, 0x4e, 0x47, 0x0d, 0x0a, 0x1a, 0x0a];
@@ -54,6 +58,34 @@ describe("encodeRawRgbaToPng", () => {
   });
 });
 
+describe("encodeRawRgbaToPng — encode cache", () => {
+  it("encodes a buffer once per encoding", async () => {
+    const px = new Uint8Array(64 * 64 * 4).fill(200);
+    const first = await encodeRawRgbaToPng(px, 64, 64);
+    expect(await encodeRawRgbaToPng(px, 64, 64)).toBe(first);
+    // An equal but distinct buffer is a different image.
+    expect(await encodeRawRgbaToPng(px.slice(), 64, 64)).not.toBe(first);
+
+    const fast = await encodeRawRgbaToPng(px, 64, 64, "png-fast");
+    expect(fast).not.toBe(first);
+    expect(await encodeRawRgbaToPng(px, 64, 64, "png-fast")).toBe(fast);
+    expect(Array.from(fast.slice(0, 8))).toEqual(PNG_SIGNATURE);
+    // Uncompressed: at least one byte per pixel channel.
+    expect(fast.byteLength).toBeGreaterThan(px.byteLength);
+    expect(first.byteLength).toBeLessThan(px.byteLength);
+  });
+
+  it("charges encode time to the invocation that encoded", async () => {
+    const px = new Uint8Array(32 * 32 * 4).fill(7);
+    const encoder = createInvocationAccount();
+    const reader = createInvocationAccount();
+    await inInvocationAccount(encoder, () => encodeRawRgbaToPng(px, 32, 32));
+    await inInvocationAccount(reader, () => encodeRawRgbaToPng(px, 32, 32));
+    expect(encoder.encodeMs).toBeGreaterThan(0);
+    expect(reader.encodeMs).toBe(0);
+  });
+});
+
 describe("encodeRawImageRef", () => {
   it("converts a raw-RGBA ref to a PNG ref", async () => {
     const ref: ImageRef = {
@@ -130,7 +162,8 @@ describe("encodeRawRgbaToPng without a working sharp", () => {
     vi.doMock("@nodetool-ai/config", () => ({
       importHidden: (name: string) => importHiddenImpl(name),
       // Other exports the module may pull from config; unused here.
-      IS_NODE: true
+      IS_NODE: true,
+      getNodeBuiltinSync: () => null
     }));
   });
 
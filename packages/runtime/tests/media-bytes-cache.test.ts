@@ -0,0 +1,174 @@
+/**
+ * Tests for the media bytes cache: the LRU itself, and loadMediaRefBytes
+ * serving repeat loads from it only while the source reports the same
+ * version, sharing concurrent loads, and streamMediaRefBytes reading files
+ * without caching them.
+ */
+import { describe, it, expect, vi, beforeEach, afterEach } from "vitest";
+import { mkdtempSync, writeFileSync } from "node:fs";
+import { tmpdir } from "node:os";
+import { join } from "node:path";
+import {
+  MediaBytesCache,
+  getMediaBytesCache,
+  type MediaBytesEntry
+} from "../src/media-bytes-cache.js";
+import {
+  loadMediaRefBytes,
+  streamMediaRefBytes
+} from "../src/media-ref-bytes.js";
+import type { ProcessingContext, StorageStat } from "../src/context.js";
+
+const tmp = mkdtempSync(join(tmpdir(), "media-bytes-cache-"));
+
+function entry(bytes: number): MediaBytesEntry {
+  return {
+    bytes: new Uint8Array(bytes),
+    source: { kind: "file", path: "/x" },
+    version: "1"
+  };
+}
+
+beforeEach(() => getMediaBytesCache().clear());
+
+afterEach(() => {
+  vi.unstubAllGlobals();
+});
+
+describe("MediaBytesCache", () => {
+  it("evicts the least recently used entries over budget", () => {
+    const cache = new MediaBytesCache({ maxBytes: 100, maxEntryBytes: 50 });
+    cache.set("a", entry(40));
+    cache.set("b", entry(40));
+    cache.hit("a");
+    cache.set("c", entry(40));
+    expect(cache.peek("a")).toBeDefined();
+    expect(cache.peek("b")).toBeUndefined();
+    expect(cache.stats).toMatchObject({ bytes: 80, entries: 2, evictions: 1 });
+  });
+
+  it("keeps no entry over the per-entry limit", () => {
+    const cache = new MediaBytesCache({ maxBytes: 100 });
+    cache.set("a", entry(10));
+    cache.set("a", entry(26));
+    expect(cache.peek("a")).toBeUndefined();
+    expect(cache.stats.bytes).toBe(0);
+  });
+
+  it("runs concurrent loads of one key once", async () => {
+    const cache = new MediaBytesCache();
+    let calls = 0;
+    const load = async () => ++calls;
+    const results = await Promise.all([
+      cache.dedupe("k", load),
+      cache.dedupe("k", load)
+    ]);
+    expect(results).toEqual([1, 1]);
+    expect(cache.stats.deduped).toBe(1);
+    expect(await cache.dedupe("k", load)).toBe(2);
+  });
+});
+
+describe("loadMediaRefBytes — cached", () => {
+  it("serves a file again until it changes", async () => {
+    const file = join(tmp, "hero.png");
+    writeFileSync(file, Buffer.from([1, 2, 3]));
+    const first = await loadMediaRefBytes({ type: "image", uri: file });
+    expect(await loadMediaRefBytes({ type: "image", uri: file })).toBe(first);
+    expect(getMediaBytesCache().stats).toMatchObject({ hits: 1, misses: 1 });
+
+    writeFileSync(file, Buffer.from([4, 5, 6, 7]));
+    const changed = await loadMediaRefBytes({ type: "image", uri: file });
+    expect(Array.from(changed!)).toEqual([4, 5, 6, 7]);
+  });
+
+  it("shares one asset resolution between concurrent loads", async () => {
+    const stat = vi.fn(
+      async (): Promise<StorageStat> => ({
+        key: "a.png",
+        size: 2,
+        modifiedAt: 1
+      })
+    );
+    const storage = { stat };
+    const resolveAssetBytes = vi.fn(async () => ({
+      bytes: new Uint8Array([9, 9]),
+      attempts: [],
+      source: { kind: "storage" as const, adapter: storage, uri: "mem://a" }
+    }));
+    const ctx = {
+      userId: "u1",
+      storage,
+      assetStorage: null,
+      resolveAssetBytes
+    } as unknown as ProcessingContext;
+    const ref = { type: "image", uri: "asset://a.png" };
+
+    const [a, b] = await Promise.all([
+      loadMediaRefBytes(ref, ctx),
+      loadMediaRefBytes(ref, ctx)
+    ]);
+    expect(a).toBe(b);
+    expect(resolveAssetBytes).toHaveBeenCalledTimes(1);
+
+    expect(await loadMediaRefBytes(ref, ctx)).toBe(a);
+    expect(resolveAssetBytes).toHaveBeenCalledTimes(1);
+
+    // Another user's context resolves for itself.
+    const other = { ...ctx, userId: "u2" } as unknown as ProcessingContext;
+    await loadMediaRefBytes(ref, other);
+    expect(resolveAssetBytes).toHaveBeenCalledTimes(2);
+
+    // A replaced object reports a new version.
+    stat.mockResolvedValue({ key: "a.png", size: 2, modifiedAt: 2 });
+    await loadMediaRefBytes(ref, ctx);
+    expect(resolveAssetBytes).toHaveBeenCalledTimes(3);
+  });
+
+  it("revalidates a URL with its ETag", async () => {
+    const fetchMock = vi.fn(
+      async (_url: string, init?: { headers?: Record<string, string> }) =>
+        init?.headers?.["If-None-Match"] === '"v1"'
+          ? new Response(null, { status: 304 })
+          : new Response(new Uint8Array([1, 2]), {
+              headers: { etag: '"v1"' }
+            })
+    );
+    vi.stubGlobal("fetch", fetchMock);
+    const ref = { type: "image", uri: "https://example.com/hero.png" };
+    const first = await loadMediaRefBytes(ref);
+    expect(await loadMediaRefBytes(ref)).toBe(first);
+    expect(fetchMock).toHaveBeenCalledTimes(2);
+    expect(getMediaBytesCache().stats.hits).toBe(1);
+  });
+});
+
+describe("streamMediaRefBytes", () => {
+  async function drain(
+    chunks: AsyncIterable<Uint8Array> | null
+  ): Promise<number[]> {
+    const out: number[] = [];
+    for await (const chunk of chunks ?? []) out.push(...chunk);
+    return out;
+  }
+
+  it("streams a file without caching it", async () => {
+    const file = join(tmp, "clip.mp4");
+    writeFileSync(file, Buffer.from([5, 6, 7, 8]));
+    const chunks = await streamMediaRefBytes({ type: "video", uri: file });
+    expect(await drain(chunks)).toEqual([5, 6, 7, 8]);
+    expect(getMediaBytesCache().stats.entries).toBe(0);
+  });
+
+  it("yields inline bytes as one chunk", async () => {
+    const data = new Uint8Array([1, 2]);
+    const chunks = await streamMediaRefBytes({ type: "video", data });
+    expect(await drain(chunks)).toEqual([1, 2]);
+  });
+
+  it("returns null for a ref that does not resolve", async () => {
+    expect(
+      await streamMediaRefBytes({ type: "video", uri: "/no/such/clip.mp4" })
+    ).toBeNull();
+  });
+});
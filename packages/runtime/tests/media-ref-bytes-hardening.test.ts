@@ -66,6 +66,23 @@ describe("raw-RGBA refs encode to PNG before any uri handling", () => {
       0x89, 0x50, 0x4e, 0x47, 0x0d, 0x0a, 0x1a, 0x0a
     ]);
   });
+
+  it("shares one encode per encoding across calls", async () => {
+    const value = {
+      type: "image",
+      data: new Uint8Array(16 * 16 * 4).fill(9),
+      width: 16,
+      height: 16,
+      mimeType: RAW_RGBA_MIME
+    } as unknown as MediaRefValue;
+    const png = await loadMediaRefBytes(value);
+    expect(await loadMediaRefBytes({ ...value })).toBe(png);
+    const fast = await loadMediaRefBytes(value, undefined, {
+      encoding: "png-fast"
+    });
+    expect(fast).not.toBe(png);
+    expect(fast!.byteLength).toBeGreaterThan(png!.byteLength);
+  });
 });
 
 describe("inline data takes priority and is decoded exactly", () => {
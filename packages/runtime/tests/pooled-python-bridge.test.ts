@@ -0,0 +1,251 @@
+/**
+ * Tests for PooledPythonBridge — placement of Python calls across a pool of
+ * worker bridges. Uses fake workers (EventEmitters with just the members the
+ * pool calls) whose executions stay pending until the test releases them, so
+ * placement under concurrency is deterministic.
+ */
+
+import { describe, it, expect, vi } from "vitest";
+import { EventEmitter } from "node:events";
+
+import { PooledPythonBridge } from "../src/pooled-python-bridge.js";
+import type {
+  ExecuteResult,
+  ProgressEvent,
+  PythonBridge,
+  PythonDiscovery
+} from "../src/python-bridge-types.js";
+
+const NODES = [{ node_type: "hf.Whisper" }, { node_type: "hf.Flux" }];
+
+class FakeWorker extends EventEmitter {
+  connected = false;
+  ran: string[] = [];
+  cancelled: string[] = [];
+  jobs: string[] = [];
+  healthy = true;
+  private _waiting: Array<() => void> = [];
+
+  constructor(readonly discovered?: PythonDiscovery) {
+    super();
+  }
+
+  async connect(): Promise<void> {
+    this.connected = true;
+  }
+  get isConnected(): boolean {
+    return this.connected;
+  }
+  isAvailable(): boolean {
+    return true;
+  }
+  getNodeMetadata() {
+    return this.discovered?.nodes ?? NODES;
+  }
+  getLoadErrors() {
+    return this.discovered?.loadErrors ?? [];
+  }
+  async getWorkerStatus() {
+    if (!this.healthy) return new Promise<never>(() => undefined);
+    return { protocol_version: 4 };
+  }
+  async execute(
+    nodeType: string,
+    _fields: unknown,
+    _secrets: unknown,
+    _blobs: unknown,
+    onProgress?: (event: ProgressEvent) => void
+  ): Promise<ExecuteResult> {
+    this.ran.push(nodeType);
+    onProgress?.({ request_id: `req-${nodeType}`, progress: 0, total: 1 });
+    await new Promise<void>((resolve) => this._waiting.push(resolve));
+    return { outputs: { nodeType }, blobs: {} };
+  }
+  cancel(requestId: string): void {
+    this.cancelled.push(requestId);
+  }
+  async jobStart(job: { jobId: string }): Promise<void> {
+    this.jobs.push(job.jobId);
+  }
+  finishAll(): void {
+    for (const resolve of this._waiting.splice(0)) resolve();
+  }
+  close(): void {
+    this.connected = false;
+  }
+}
+
+function pool(options: { min?: number; max?: number; spares?: number } = {}) {
+  const workers: FakeWorker[] = [];
+  const createWorker = vi.fn((discovered?: PythonDiscovery) => {
+    const worker = new FakeWorker(discovered);
+    workers.push(worker);
+    return worker as unknown as PythonBridge;
+  });
+  const bridge = new PooledPythonBridge({
+    createWorker,
+    minWorkers: options.min,
+    maxWorkers: options.max,
+    spareWorkers: options.spares ?? 0,
+    healthCheckIntervalMs: 0,
+    healthCheckTimeoutMs: 20
+  });
+  return { bridge, workers, createWorker };
+}
+
+const run = (bridge: PythonBridge, nodeType: string) =>
+  bridge.execute(nodeType, {}, {}, {});
+
+const tick = () => new Promise((r) => setTimeout(r, 0));
+
+describe("PooledPythonBridge", () => {
+  it("discovers once and seeds every later worker", async () => {
+    const { bridge, workers } = pool({ min: 3 });
+    await bridge.connect();
+
+    expect(workers).toHaveLength(3);
+    expect(workers[0].discovered).toBeUndefined();
+    expect(workers[1].discovered?.nodes).toBe(workers[0].getNodeMetadata());
+    expect(workers[2].discovered?.nodes).toBe(workers[0].getNodeMetadata());
+    expect(bridge.hasNodeType("hf.Flux")).toBe(true);
+    expect(bridge.isConnected).toBe(true);
+    bridge.close();
+  });
+
+  it("runs concurrent node types on separate workers", async () => {
+    const { bridge, workers } = pool({ min: 1, max: 2 });
+    await bridge.connect();
+
+    const a = run(bridge, "hf.Whisper");
+    const b = run(bridge, "hf.Flux");
+    await tick();
+    expect(workers).toHaveLength(2);
+    expect(workers[0].ran).toEqual(["hf.Whisper"]);
+    expect(workers[1].ran).toEqual(["hf.Flux"]);
+
+    for (const w of workers) w.finishAll();
+    await expect(a).resolves.toMatchObject({
+      outputs: { nodeType: "hf.Whisper" }
+    });
+    await b;
+    expect(bridge.stats).toMatchObject({ workers: 2, idle: 2, inFlight: 0 });
+    bridge.close();
+  });
+
+  it("keeps a node type on the worker that already ran it", async () => {
+    const { bridge, workers } = pool({ min: 2, max: 2 });
+    await bridge.connect();
+
+    const first = run(bridge, "hf.Flux");
+    await tick();
+    workers[0].finishAll();
+    await first;
+
+    // Both workers are idle; the model lives in worker 0, so Flux goes there.
+    const again = run(bridge, "hf.Flux");
+    const other = run(bridge, "hf.Whisper");
+    await tick();
+    expect(workers[0].ran).toEqual(["hf.Flux", "hf.Flux"]);
+    expect(workers[1].ran).toEqual(["hf.Whisper"]);
+    expect(bridge.stats.affinityHits).toBe(1);
+    for (const w of workers) w.finishAll();
+    await Promise.all([again, other]);
+    bridge.close();
+  });
+
+  it("falls back to the least-loaded worker at max size", async () => {
+    const { bridge, workers } = pool({ min: 2, max: 2 });
+    await bridge.connect();
+
+    const calls = [
+      run(bridge, "a"),
+      run(bridge, "b"),
+      run(bridge, "c"),
+      run(bridge, "d")
+    ];
+    await tick();
+    expect(workers).toHaveLength(2);
+    expect(workers.map((w) => w.ran.length)).toEqual([2, 2]);
+    for (const w of workers) w.finishAll();
+    await Promise.all(calls);
+    bridge.close();
+  });
+
+  it("keeps warm spares ahead of demand", async () => {
+    const { bridge, workers } = pool({ min: 1, max: 3, spares: 1 });
+    await bridge.connect();
+    expect(workers).toHaveLength(1);
+
+    const busy = run(bridge, "a");
+    await tick();
+    // The only worker is busy: a spare starts before anything needs it.
+    expect(workers).toHaveLength(2);
+    expect(bridge.stats.idle).toBe(1);
+
+    const next = run(bridge, "b");
+    await tick();
+    expect(workers[1].ran).toEqual(["b"]);
+    expect(workers).toHaveLength(3);
+    for (const w of workers) w.finishAll();
+    await Promise.all([busy, next]);
+    bridge.close();
+  });
+
+  it("routes cancel to the worker running the request", async () => {
+    const { bridge, workers } = pool({ min: 2, max: 2 });
+    await bridge.connect();
+    const a = run(bridge, "a");
+    const b = run(bridge, "b");
+    await tick();
+
+    bridge.cancel("req-b");
+    expect(workers[0].cancelled).toEqual([]);
+    expect(workers[1].cancelled).toEqual(["req-b"]);
+    for (const w of workers) w.finishAll();
+    await Promise.all([a, b]);
+    bridge.close();
+  });
+
+  it("broadcasts job boundaries to every worker", async () => {
+    const { bridge, workers } = pool({ min: 2 });
+    await bridge.connect();
+    await bridge.jobStart({ jobId: "job-1" });
+    expect(workers.map((w) => w.jobs)).toEqual([["job-1"], ["job-1"]]);
+    bridge.close();
+  });
+
+  it("replaces a worker that exits and drops its placements", async () => {
+    const { bridge, workers } = pool({ min: 1, max: 2 });
+    const exits = vi.fn();
+    bridge.on("exit", exits);
+    await bridge.connect();
+    const first = run(bridge, "hf.Flux");
+    await tick();
+    workers[0].finishAll();
+    await first;
+
+    workers[0].emit("exit", 137);
+    expect(workers).toHaveLength(2);
+    expect(bridge.stats).toMatchObject({ workers: 1, retired: 1 });
+    expect(exits).not.toHaveBeenCalled();
+
+    const again = run(bridge, "hf.Flux");
+    await tick();
+    expect(workers[1].ran).toEqual(["hf.Flux"]);
+    workers[1].finishAll();
+    await again;
+    bridge.close();
+  });
+
+  it("retires workers that fail a health check", async () => {
+    const { bridge, workers } = pool({ min: 2, max: 2 });
+    await bridge.connect();
+    workers[1].healthy = false;
+
+    await bridge.checkHealth();
+    expect(workers).toHaveLength(3);
+    expect(workers[1].connected).toBe(false);
+    expect(bridge.stats).toMatchObject({ workers: 2, retired: 1 });
+    bridge.close();
+  });
+});
@@ -0,0 +1,172 @@
+/**
+ * Tests for CachingProvider: a hit replays the stored response chunk for
+ * chunk without calling the inner provider and costs nothing, and calls that
+ * are not deterministic, not opted in or cut short are never stored.
+ */
+import { describe, it, expect } from "vitest";
+import { MemoryCache } from "../../src/context.js";
+import { BaseProvider } from "../../src/providers/base-provider.js";
+import {
+  CachingProvider,
+  cachingProviderFromEnv
+} from "../../src/providers/caching-provider.js";
+import { createUsageSlot } from "../../src/tracing-helpers.js";
+import type {
+  Message,
+  ProviderStreamItem
+} from "../../src/providers/types.js";
+
+const USER: Message[] = [{ role: "user", content: "hello" }];
+const MODEL = "gpt-4o-mini";
+
+/** Streams three chunks and charges 1000 in / 500 out per call. */
+class ScriptedProvider extends BaseProvider {
+  calls = 0;
+
+  constructor() {
+    super("openai");
+  }
+
+  async generateMessage(args: { model: string }): Promise<Message> {
+    this.calls++;
+    this.trackUsage(args.model, { inputTokens: 1000, outputTokens: 500 });
+    return { role: "assistant", content: `reply ${this.calls}` };
+  }
+
+  async *generateMessages(args: {
+    model: string;
+  }): AsyncGenerator<ProviderStreamItem> {
+    this.calls++;
+    for (const content of ["Hel", "lo, ", "world"]) {
+      yield { type: "chunk", content, done: false, content_type: "text" };
+    }
+    this.trackUsage(args.model, { inputTokens: 1000, outputTokens: 500 });
+  }
+
+  override async getAvailableLanguageModels() {
+    return [{ id: MODEL, name: "GPT-4o mini", provider: "openai" as const }];
+  }
+}
+
+async function collect(
+  gen: AsyncGenerator<ProviderStreamItem>
+): Promise<ProviderStreamItem[]> {
+  const items: ProviderStreamItem[] = [];
+  for await (const item of gen) items.push(item);
+  return items;
+}
+
+function setup(models = [MODEL]) {
+  const inner = new ScriptedProvider();
+  const provider = new CachingProvider(inner, {
+    store: new MemoryCache(),
+    models
+  });
+  return { inner, provider };
+}
+
+const deterministic = { messages: USER, model: MODEL, temperature: 0 };
+
+describe("CachingProvider", () => {
+  it("replays a stream with the same chunk boundaries", async () => {
+    const { inner, provider } = setup();
+    const live = await collect(provider.generateMessages(deterministic));
+    const replay = await collect(provider.generateMessages(deterministic));
+    expect(replay).toEqual(live);
+    expect(replay).toHaveLength(3);
+    expect(inner.calls).toBe(1);
+    expect(provider.stats).toMatchObject({ hits: 1, misses: 1, stores: 1 });
+  });
+
+  it("replays generateMessage and returns a copy", async () => {
+    const { inner, provider } = setup();
+    const first = await provider.generateMessage(deterministic);
+    first.content = "mutated";
+    const second = await provider.generateMessage(deterministic);
+    expect(second).toEqual({ role: "assistant", content: "reply 1" });
+    expect(inner.calls).toBe(1);
+  });
+
+  it("charges a hit nothing but reports its tokens", async () => {
+    const { inner, provider } = setup();
+    await collect(provider.generateMessages(deterministic));
+    const liveCost = inner.getTotalCost();
+    expect(liveCost).toBeGreaterThan(0);
+
+    const { runInSlot, getUsage } = createUsageSlot();
+    await runInSlot(() => collect(provider.generateMessages(deterministic)));
+    expect(getUsage()).toMatchObject({
+      inputTokens: 1000,
+      outputTokens: 500,
+      cost: 0
+    });
+    expect(provider.getTotalCost()).toBe(liveCost);
+    expect(provider.stats.savedUsd).toBeCloseTo(liveCost);
+  });
+
+  it("passes a miss's usage on to the caller's slot once", async () => {
+    const { inner, provider } = setup();
+    const { runInSlot, getUsage } = createUsageSlot();
+    await runInSlot(() => collect(provider.generateMessages(deterministic)));
+    expect(getUsage()).toMatchObject({
+      inputTokens: 1000,
+      outputTokens: 500,
+      cost: inner.getTotalCost()
+    });
+  });
+
+  it("bypasses sampled calls and models that are not opted in", async () => {
+    const { inner, provider } = setup(["claude-*"]);
+    await provider.generateMessage(deterministic);
+    await provider.generateMessage(deterministic);
+    const sampled = setup();
+    await sampled.provider.generateMessage({
+      ...deterministic,
+      temperature: 1
+    });
+    await sampled.provider.generateMessage({ messages: USER, model: MODEL });
+    expect(inner.calls).toBe(2);
+    expect(sampled.inner.calls).toBe(2);
+    expect(sampled.provider.stats).toMatchObject({ bypassed: 2, stores: 0 });
+  });
+
+  it("matches provider-qualified and prefix patterns", async () => {
+    const qualified = setup([`openai:${MODEL}`]);
+    const prefix = setup(["gpt-4o*"]);
+    for (const { inner, provider } of [qualified, prefix]) {
+      await provider.generateMessage(deterministic);
+      await provider.generateMessage(deterministic);
+      expect(inner.calls).toBe(1);
+    }
+  });
+
+  it("does not store a stream the consumer stopped early", async () => {
+    const { inner, provider } = setup();
+    for await (const _item of provider.generateMessages(deterministic)) break;
+    await collect(provider.generateMessages(deterministic));
+    expect(inner.calls).toBe(2);
+    expect(provider.stats.stores).toBe(1);
+  });
+
+  it("forwards the rest of the provider surface", async () => {
+    const { inner, provider } = setup();
+    expect(provider.provider).toBe("openai");
+    expect(await provider.getAvailableLanguageModels()).toEqual(
+      await inner.getAvailableLanguageModels()
+    );
+    expect(provider.getCapabilities()).toEqual(inner.getCapabilities());
+  });
+});
+
+describe("cachingProviderFromEnv", () => {
+  it("returns the provider unchanged when no models are listed", () => {
+    const inner = new ScriptedProvider();
+    const saved = process.env.NODETOOL_LLM_CACHE_MODELS;
+    delete process.env.NODETOOL_LLM_CACHE_MODELS;
+    try {
+      expect(cachingProviderFromEnv(inner)).toBe(inner);
+    } finally {
+      if (saved !== undefined) process.env.NODETOOL_LLM_CACHE_MODELS = saved;
+    }
+  });
+});
@@ -125,6 +125,15 @@ describe("CostCalculator.calculate – token pricing via genai-prices (USD)", ()
   it("returns 0 for empty usage on a known model", () => {
     expect(CostCalculator.calculate("gpt-4o-mini", {}, "openai")).toBe(0);
   });
+
+  it("returns 0 for a response served from the response cache", () => {
+    const cost = CostCalculator.calculate(
+      "gpt-4o-mini",
+      { inputTokens: 1000, outputTokens: 500, responseCacheHit: true },
+      "openai"
+    );
+    expect(cost).toBe(0);
+  });
 });
 
 describe("CostCalculator.calculate – local non-token modalities (USD)", () => {
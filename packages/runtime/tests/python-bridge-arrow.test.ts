@@ -0,0 +1,283 @@
+/**
+ * Tests for Arrow dataframes across the Python bridge: the field/output
+ * adapters, the `arrow` capability gate on PythonBridgeBase, and
+ * PythonNodeExecutor sending dataframe inputs as Arrow blobs and reading
+ * Arrow outputs back as columnar DataframeRefs.
+ */
+
+import { describe, it, expect, vi } from "vitest";
+
+import {
+  ArrowTable,
+  buildArrowTable,
+  decodeArrowIpc,
+  encodeArrowIpc
+} from "../src/arrow-ipc.js";
+import {
+  ARROW_RESULT_TYPES,
+  dataframeArrowTable,
+  decodeDataframeOutput,
+  encodeDataframeInput,
+  isDataframeValue
+} from "../src/python-bridge-arrow.js";
+import { PythonBridgeBase } from "../src/python-bridge-base.js";
+import { PythonNodeExecutor } from "../src/python-node-executor.js";
+import type { PythonStdioBridge } from "../src/index.js";
+
+type Frame = Record<string, unknown>;
+
+const FRAME = {
+  type: "dataframe",
+  uri: "",
+  columns: [
+    { name: "city", data_type: "string" },
+    { name: "pop", data_type: "int" }
+  ],
+  data: [
+    ["Oslo", 709_000],
+    ["Bergen", null]
+  ]
+};
+
+function arrowBlob(): Uint8Array {
+  const cities = ["Oslo", "Bergen"];
+  return encodeArrowIpc(
+    buildArrowTable(["city", "km2"], 2, (r, c) =>
+      c === 0 ? cities[r] : [454.1, 465.3][r]
+    )!
+  );
+}
+
+describe("Arrow dataframe adapters", () => {
+  it("recognises dataframe refs and the data nodes' {rows}", () => {
+    expect(isDataframeValue(FRAME)).toBe(true);
+    expect(isDataframeValue({ rows: [{ a: 1 }] })).toBe(true);
+    expect(isDataframeValue({ rows: [], limit: 3 })).toBe(false);
+    expect(isDataframeValue({ type: "dataframe", uri: "asset://x" })).toBe(
+      false
+    );
+  });
+
+  it("encodes a columns/data frame and keeps the ref's other keys", () => {
+    const { blob, marker } = encodeDataframeInput(FRAME)!;
+    expect(marker).toEqual({
+      type: "dataframe",
+      uri: "",
+      format: "arrow",
+      columns: [
+        { name: "city", data_type: "string" },
+        { name: "pop", data_type: "int" }
+      ]
+    });
+    expect(decodeArrowIpc(blob).toMatrix()).toEqual(FRAME.data);
+  });
+
+  it("encodes {rows} over the union of their keys", () => {
+    const { blob } = encodeDataframeInput({
+      rows: [{ a: 1, b: "x" }, { a: 2, c: true }]
+    })!;
+    expect(decodeArrowIpc(blob).toMatrix()).toEqual([
+      [1, "x", null],
+      [2, null, true]
+    ]);
+  });
+
+  it("leaves frames with nested values to the plain path", () => {
+    expect(encodeDataframeInput({ rows: [{ a: { b: 1 } }] })).toBeNull();
+  });
+
+  it("decodes an output lazily and re-encodes it from the columns", () => {
+    const ref = decodeDataframeOutput(arrowBlob(), {
+      type: "dataframe",
+      format: "arrow"
+    }) as unknown as Frame;
+    const table = dataframeArrowTable(ref)!;
+    expect(table.column("km2")!.get(1)).toBe(465.3);
+    expect(ref.columns).toEqual([
+      { name: "city", data_type: "string" },
+      { name: "km2", data_type: "float" }
+    ]);
+    expect(ref.format).toBeUndefined();
+
+    const toMatrix = vi.spyOn(table, "toMatrix");
+    const again = encodeDataframeInput(ref)!;
+    expect(toMatrix).not.toHaveBeenCalled();
+    expect(decodeArrowIpc(again.blob).numRows).toBe(2);
+
+    // Serializing (or any other read of `data`) still sees rows.
+    expect(JSON.parse(JSON.stringify(ref)).data).toEqual([
+      ["Oslo", 454.1],
+      ["Bergen", 465.3]
+    ]);
+    expect(toMatrix).toHaveBeenCalledTimes(1);
+  });
+
+  it("decodes a worker's date column instead of failing the node", () => {
+    const days = new DataView(new ArrayBuffer(4));
+    days.setInt32(0, 19844, true);
+    const blob = encodeArrowIpc(
+      new ArrowTable(
+        [{ name: "day", type: { kind: "date", unit: "day" }, nullable: true }],
+        [
+          {
+            length: 1,
+            chunks: [
+              {
+                length: 1,
+                nullCount: 0,
+                validity: null,
+                offsets: null,
+                data: days
+              }
+            ]
+          }
+        ]
+      )
+    );
+    const ref = decodeDataframeOutput(blob, {
+      type: "dataframe",
+      format: "arrow"
+    }) as unknown as Frame;
+    expect(ref.columns).toEqual([{ name: "day", data_type: "datetime" }]);
+    expect(ref.data).toEqual([["2024-05-01"]]);
+  });
+
+  it("drops the columns once rows are written over them", () => {
+    const ref = decodeDataframeOutput(arrowBlob(), {
+      type: "dataframe",
+      format: "arrow"
+    }) as unknown as Frame;
+    ref.data = [["Tromsø", 2521]];
+    expect(dataframeArrowTable(ref)).toBeNull();
+    expect(ref.data).toEqual([["Tromsø", 2521]]);
+  });
+});
+
+class ArrowBridge extends PythonBridgeBase {
+  sent: Frame[] = [];
+
+  constructor(capabilities: string[]) {
+    super();
+    this._workerStatus = { protocol_version: 5, capabilities };
+  }
+
+  protected async _openTransport(): Promise<void> {
+    this._connected = true;
+  }
+
+  protected _send(msg: Frame): void {
+    this.sent.push(msg);
+  }
+
+  close(): void {
+    this._rejectAllPending(new Error("bridge closed"));
+  }
+}
+
+describe("PythonBridgeBase — arrow capability", () => {
+  it("asks for Arrow results only from a worker that offers them", () => {
+    const arrow = new ArrowBridge(["arrow"]);
+    const plain = new ArrowBridge([]);
+    expect(arrow.supportsArrow()).toBe(true);
+    expect(plain.supportsArrow()).toBe(false);
+
+    void arrow.execute("n.T", {}, {}, {}).catch(() => {});
+    void plain.execute("n.T", {}, {}, {}).catch(() => {});
+    void arrow
+      .executeBatch("n.T", [{ fields: {}, blobs: {} }], {})
+      .catch(() => {});
+    expect((arrow.sent[0].data as Frame).result_formats).toEqual(["arrow"]);
+    expect((arrow.sent[1].data as Frame).result_formats).toEqual(["arrow"]);
+    expect((plain.sent[0].data as Frame).result_formats).toBeUndefined();
+    // Categoricals (dictionary), decimals and lists must come back as rows.
+    const types = (arrow.sent[0].data as Frame).arrow_types as string[];
+    expect(types).toEqual(ARROW_RESULT_TYPES);
+    expect(types).toContain("date32");
+    expect(types).not.toContain("dictionary");
+    expect(types).not.toContain("decimal128");
+    expect((plain.sent[0].data as Frame).arrow_types).toBeUndefined();
+    arrow.close();
+    plain.close();
+  });
+});
+
+describe("PythonNodeExecutor — Arrow dataframes", () => {
+  function mockBridge(arrow: boolean, outputs: Frame, blobs: Frame) {
+    return {
+      execute: vi.fn().mockResolvedValue({ outputs, blobs }),
+      supportsArrow: vi.fn().mockReturnValue(arrow)
+    } as unknown as PythonStdioBridge;
+  }
+
+  /** An executor whose `df` input is declared `dataframe`, `opts` a dict. */
+  function describeExecutor(bridge: PythonStdioBridge) {
+    return new PythonNodeExecutor(
+      bridge,
+      "pd.Describe",
+      {},
+      {},
+      [],
+      undefined,
+      undefined,
+      { df: "dataframe", opts: "dict", n: "int" }
+    );
+  }
+
+  it("sends dataframe inputs as Arrow blobs to a capable worker", async () => {
+    const bridge = mockBridge(true, {}, {});
+    const executor = describeExecutor(bridge);
+    await executor.process({ df: FRAME, n: 3 });
+
+    const [, fields, , blobs] = vi.mocked(bridge.execute).mock.calls[0];
+    expect(fields).toEqual({
+      n: 3,
+      df: expect.objectContaining({ type: "dataframe", format: "arrow" })
+    });
+    expect(decodeArrowIpc(blobs.df as Uint8Array).toMatrix()).toEqual(
+      FRAME.data
+    );
+  });
+
+  it("leaves a {rows} value on a field not declared dataframe", async () => {
+    const bridge = mockBridge(true, {}, {});
+    const opts = { rows: [{ a: 1 }, { a: 2 }] };
+    await describeExecutor(bridge).process({ opts });
+
+    const [, fields, , blobs] = vi.mocked(bridge.execute).mock.calls[0];
+    expect(fields).toEqual({ opts });
+    expect(blobs).toEqual({});
+  });
+
+  it("sends dataframes unchanged to a worker without it", async () => {
+    const bridge = mockBridge(false, {}, {});
+    const executor = describeExecutor(bridge);
+    await executor.process({ df: FRAME });
+
+    const [, fields, , blobs] = vi.mocked(bridge.execute).mock.calls[0];
+    expect(fields).toEqual({ df: FRAME });
+    expect(blobs).toEqual({});
+  });
+
+  it("reads Arrow outputs back as columnar dataframes", async () => {
+    const bridge = mockBridge(
+      true,
+      { output: { type: "dataframe", format: "arrow" } },
+      { output: arrowBlob() }
+    );
+    const executor = new PythonNodeExecutor(
+      bridge,
+      "pd.Filter",
+      {},
+      { output: "dataframe" },
+      []
+    );
+    const outputs = await executor.process({});
+
+    const table = dataframeArrowTable(outputs.output)!;
+    expect(table.column("city")!.toArray()).toEqual(["Oslo", "Bergen"]);
+    expect((outputs.output as Frame).data).toEqual([
+      ["Oslo", 454.1],
+      ["Bergen", 465.3]
+    ]);
+  });
+});
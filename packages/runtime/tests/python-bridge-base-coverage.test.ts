@@ -175,6 +175,22 @@ describe("PythonBridgeBase — connection lifecycle", () => {
     expect(bridge.sent.some((f) => f.type === "worker.status")).toBe(true);
   });
 
+  it("connect() adopts seeded discover results instead of sending discover", async () => {
+    const loadErrors = [{ module: "m", phase: "import", error: "x" }];
+    const bridge = makeBridge({
+      discovered: {
+        nodes: [{ node_type: "test.Seeded" }] as never,
+        loadErrors
+      }
+    });
+    await connectBridge(bridge);
+
+    expect(bridge.sent.some((f) => f.type === "discover")).toBe(false);
+    expect(bridge.sent.some((f) => f.type === "worker.status")).toBe(true);
+    expect(bridge.hasNodeType("test.Seeded")).toBe(true);
+    expect(bridge.getLoadErrors()).toEqual(loadErrors);
+  });
+
   it("_assertCanConnect can refuse connection", async () => {
     const bridge = makeBridge();
     bridge.assertError = new Error("refused in production");
@@ -509,6 +525,90 @@ describe("PythonBridgeBase — executeStream", () => {
   });
 });
 
+describe("PythonBridgeBase — execute.batch", () => {
+  const items = [
+    { fields: { text: "a" }, blobs: {} },
+    { fields: { text: "b" }, blobs: {} }
+  ];
+
+  it("sends one frame and splits the result per item", async () => {
+    const bridge = makeBridge();
+    await connectBridge(bridge);
+    expect(bridge.supportsExecuteBatch()).toBe(true);
+
+    const p = bridge.executeBatch("n.T", items, { KEY: "v" }, undefined, {
+      nodeId: "node-1"
+    });
+    const frame = bridge.lastSent();
+    expect(frame.type).toBe("execute.batch");
+    expect(frame.data).toEqual({
+      node_type: "n.T",
+      secrets: { KEY: "v" },
+      items: [
+        { fields: { text: "a" }, blobs: {} },
+        { fields: { text: "b" }, blobs: {} }
+      ],
+      node_id: "node-1"
+    });
+    bridge.handle({
+      type: "result",
+      request_id: frame.request_id,
+      data: {
+        items: [
+          { outputs: { label: "A" }, blobs: {} },
+          { error: "bad input", traceback: "tb" }
+        ]
+      }
+    });
+
+    const [ok, failed] = await p;
+    expect(ok).toEqual({ result: { outputs: { label: "A" }, blobs: {} } });
+    expect("error" in failed && failed.error.message).toBe("bad input");
+    expect(bridge.pendingStreamSize()).toBe(0);
+  });
+
+  it("rejects when the worker answers with the wrong item count", async () => {
+    const bridge = makeBridge();
+    await connectBridge(bridge);
+    const p = bridge.executeBatch("n.T", items, {});
+    bridge.handle({
+      type: "result",
+      request_id: bridge.lastSent().request_id,
+      data: { items: [{ outputs: {} }] }
+    });
+    await expect(p).rejects.toThrow(/execute.batch of 2 with 1 items/);
+  });
+
+  it("sends one execute per item to a pre-v5 worker", async () => {
+    const bridge = makeBridge();
+    await connectBridge(bridge, { statusVersion: 4 });
+    expect(bridge.supportsExecuteBatch()).toBe(false);
+    bridge.responder = (msg) => {
+      if (msg.type !== "execute") return;
+      const text = (msg.data as { fields: { text: string } }).fields.text;
+      bridge.handle(
+        text === "a"
+          ? {
+              type: "result",
+              request_id: msg.request_id,
+              data: { outputs: { label: "A" }, blobs: {} }
+            }
+          : {
+              type: "error",
+              request_id: msg.request_id,
+              data: { error: "bad input" }
+            }
+      );
+    };
+
+    const [ok, failed] = await bridge.executeBatch("n.T", items, {});
+    expect(bridge.sent.filter((f) => f.type === "execute")).toHaveLength(2);
+    expect(bridge.sent.some((f) => f.type === "execute.batch")).toBe(false);
+    expect(ok).toEqual({ result: { outputs: { label: "A" }, blobs: {} } });
+    expect("error" in failed && failed.error.message).toBe("bad input");
+  });
+});
+
 describe("PythonBridgeBase — worker status & capabilities", () => {
   it("getWorkerStatus() sends worker.status and stores the result", async () => {
     const bridge = makeBridge();
@@ -0,0 +1,129 @@
+/**
+ * Tests for the bridge's length-prefixed framing: FrameDecoder reassembly
+ * across arbitrary chunk boundaries, and writeFrame's two-chunk corked write.
+ */
+
+import { describe, it, expect } from "vitest";
+
+import {
+  encodeFrame,
+  FrameDecoder,
+  FrameSizeError,
+  writeFrame
+} from "../src/python-bridge-framing.js";
+
+function payload(size: number, seed = 1): Buffer {
+  const buf = Buffer.allocUnsafe(size);
+  for (let i = 0; i < size; i++) buf[i] = (i * 31 + seed) & 0xff;
+  return buf;
+}
+
+/** Split `bytes` into chunks of the given sizes, cycling through them. */
+function split(bytes: Buffer, sizes: number[]): Buffer[] {
+  const out: Buffer[] = [];
+  let offset = 0;
+  for (let i = 0; offset < bytes.length; i++) {
+    const size = sizes[i % sizes.length];
+    out.push(bytes.subarray(offset, offset + size));
+    offset += size;
+  }
+  return out;
+}
+
+function decodeAll(decoder: FrameDecoder, chunks: Buffer[]): Buffer[] {
+  const frames: Buffer[] = [];
+  for (const chunk of chunks) {
+    decoder.push(chunk, (frame) => frames.push(Buffer.from(frame)));
+  }
+  return frames;
+}
+
+describe("FrameDecoder", () => {
+  it("reassembles frames across any chunk boundaries", () => {
+    const bodies = [payload(0), payload(3, 2), payload(70_000, 3), payload(5)];
+    const stream = Buffer.concat(bodies.map((b) => encodeFrame(b)));
+    for (const sizes of [[1], [2, 3], [4], [7, 1, 4096], [stream.length]]) {
+      const decoder = new FrameDecoder();
+      const frames = decodeAll(decoder, split(stream, sizes));
+      expect(frames).toEqual(bodies);
+      expect(decoder.bufferedBytes).toBe(0);
+    }
+  });
+
+  it("hands out a frame within one chunk without copying it", () => {
+    const chunk = encodeFrame(payload(16));
+    const decoder = new FrameDecoder();
+    let frame: Buffer | undefined;
+    decoder.push(chunk, (f) => (frame = f));
+    expect(frame!.buffer).toBe(chunk.buffer);
+  });
+
+  it("keeps a partial frame until its last byte arrives", () => {
+    const body = payload(1000);
+    const chunks = split(encodeFrame(body), [300]);
+    const decoder = new FrameDecoder();
+    const frames = decodeAll(decoder, chunks.slice(0, -1));
+    expect(frames).toEqual([]);
+    expect(decoder.bufferedBytes).toBe(900);
+    expect(decodeAll(decoder, chunks.slice(-1))).toEqual([body]);
+  });
+
+  it("delivers earlier frames before rejecting an oversized one", () => {
+    const bad = Buffer.alloc(4);
+    bad.writeUInt32BE(1025, 0);
+    const decoder = new FrameDecoder({ maxFrameSize: 1024 });
+    const frames: Buffer[] = [];
+    expect(() =>
+      decoder.push(Buffer.concat([encodeFrame(payload(8)), bad]), (f) =>
+        frames.push(f)
+      )
+    ).toThrow(FrameSizeError);
+    expect(frames).toHaveLength(1);
+  });
+
+  it("reset drops a buffered partial frame", () => {
+    const decoder = new FrameDecoder();
+    decodeAll(decoder, [encodeFrame(payload(100)).subarray(0, 50)]);
+    decoder.reset();
+    expect(decoder.bufferedBytes).toBe(0);
+    expect(decodeAll(decoder, [encodeFrame(payload(2))])).toEqual([payload(2)]);
+  });
+});
+
+describe("writeFrame", () => {
+  it("writes header and payload as two corked chunks", () => {
+    const calls: string[] = [];
+    const written: Buffer[] = [];
+    const body = payload(64);
+    const ok = writeFrame(
+      {
+        write: (chunk) => {
+          written.push(chunk);
+          return true;
+        },
+        cork: () => calls.push("cork"),
+        uncork: () => calls.push("uncork")
+      },
+      body
+    );
+    expect(ok).toBe(true);
+    expect(calls).toEqual(["cork", "uncork"]);
+    expect(written).toHaveLength(2);
+    expect(written[1]).toBe(body);
+    expect(Buffer.concat(written)).toEqual(encodeFrame(body));
+  });
+
+  it("writes one encoded frame to a sink that cannot cork", () => {
+    const written: Buffer[] = [];
+    writeFrame(
+      {
+        write: (chunk) => {
+          written.push(chunk);
+          return false;
+        }
+      },
+      new Uint8Array([1, 2, 3])
+    );
+    expect(written).toEqual([encodeFrame(Buffer.from([1, 2, 3]))]);
+  });
+});
@@ -0,0 +1,266 @@
+/**
+ * Tests for shared-memory blob transfer: SharedMemoryArena staging,
+ * collection and cleanup in a temp root, and PythonBridgeBase sending large
+ * blobs by descriptor once the worker reports the `shm` capability.
+ */
+
+import { describe, it, expect, beforeEach, afterEach, vi } from "vitest";
+import fs, {
+  existsSync,
+  mkdirSync,
+  mkdtempSync,
+  readdirSync,
+  readFileSync,
+  rmSync,
+  writeFileSync
+} from "node:fs";
+import { tmpdir } from "node:os";
+import { join } from "node:path";
+
+import {
+  SharedMemoryArena,
+  type ShmDescriptor
+} from "../src/python-bridge-shm.js";
+import { PythonBridgeBase } from "../src/python-bridge-base.js";
+
+type Frame = Record<string, unknown>;
+
+function bytes(size: number, seed = 1): Uint8Array {
+  const out = new Uint8Array(size);
+  for (let i = 0; i < size; i++) out[i] = (i * 7 + seed) & 0xff;
+  return out;
+}
+
+function readDescriptor(d: ShmDescriptor): Buffer {
+  return readFileSync(d.path).subarray(d.offset, d.offset + d.length);
+}
+
+let root: string;
+beforeEach(() => {
+  root = mkdtempSync(join(tmpdir(), "shm-test-"));
+});
+afterEach(() => {
+  rmSync(root, { recursive: true, force: true });
+  vi.restoreAllMocks();
+});
+
+describe("SharedMemoryArena", () => {
+  it("moves blobs over the threshold into one aligned file", () => {
+    const arena = new SharedMemoryArena({ thresholdBytes: 100, root });
+    const big = bytes(150);
+    const list = [bytes(10, 2), bytes(200, 3)];
+    const { blobs, shm } = arena.stage("req-1", {
+      small: bytes(99),
+      big,
+      list
+    });
+
+    expect(Object.keys(blobs)).toEqual(["small"]);
+    const bigD = shm!.big as ShmDescriptor;
+    const listD = shm!.list as ShmDescriptor[];
+    expect(bigD).toMatchObject({ offset: 0, length: 150, dtype: "uint8" });
+    expect(bigD.shape).toEqual([150]);
+    // A list moves whole, each item on a 64-byte boundary.
+    expect(listD.map((d) => d.offset)).toEqual([192, 256]);
+    expect(new Set([bigD.path, ...listD.map((d) => d.path)]).size).toBe(1);
+    expect(readDescriptor(bigD)).toEqual(Buffer.from(big));
+    expect(readDescriptor(listD[1])).toEqual(Buffer.from(list[1]));
+    arena.dispose();
+  });
+
+  it("leaves small blobs inline but still creates the directory", () => {
+    const arena = new SharedMemoryArena({ thresholdBytes: 100, root });
+    const input = { a: bytes(4) };
+    const staged = arena.stage("req-1", input);
+    expect(staged).toEqual({ blobs: input, shm: null });
+    expect(existsSync(arena.dir)).toBe(true);
+    arena.dispose();
+  });
+
+  it("collects result blobs and deletes their files", () => {
+    const arena = new SharedMemoryArena({ root });
+    arena.stage("req-1", {});
+    const path = join(arena.dir, "req-1.out");
+    const payload = bytes(300);
+    const file = Buffer.alloc(364);
+    file.set(payload, 64);
+    writeFileSync(path, file);
+
+    const blobs = arena.collect({
+      image: { path, offset: 64, length: 300, dtype: "uint8", shape: [300] }
+    });
+    expect(Buffer.from(blobs.image)).toEqual(Buffer.from(payload));
+    expect(existsSync(path)).toBe(false);
+    arena.dispose();
+  });
+
+  it("refuses descriptors outside its directory", () => {
+    const arena = new SharedMemoryArena({ root });
+    arena.stage("req-1", {});
+    const outside = join(root, "secret");
+    writeFileSync(outside, "x");
+    expect(() =>
+      arena.collect({
+        x: { path: outside, offset: 0, length: 1, dtype: "uint8", shape: [1] }
+      })
+    ).toThrow(/outside the bridge arena/);
+    expect(existsSync(outside)).toBe(true);
+    arena.dispose();
+  });
+
+  it("finishes a blob the OS wrote only part of", () => {
+    const write = fs.writeSync.bind(fs) as (...args: unknown[]) => number;
+    // Write at most 5 bytes per call, as a pipe or a full device might.
+    vi.spyOn(fs, "writeSync").mockImplementation(((
+      fd: number,
+      buf: Uint8Array,
+      off: number,
+      len: number,
+      pos: number
+    ) => write(fd, buf, off, Math.min(len, 5), pos)) as typeof fs.writeSync);
+    const arena = new SharedMemoryArena({ thresholdBytes: 1, root });
+    const a = bytes(23);
+    const { shm } = arena.stage("req-1", { a });
+    expect(new Uint8Array(readDescriptor(shm!.a as ShmDescriptor))).toEqual(a);
+    arena.dispose();
+  });
+
+  it("throws rather than stage a segment that stopped short", () => {
+    vi.spyOn(fs, "writeSync").mockReturnValue(0);
+    const arena = new SharedMemoryArena({ thresholdBytes: 1, root });
+    expect(() => arena.stage("req-1", { a: bytes(8) })).toThrow(/Short write/);
+    expect(readdirSync(arena.dir)).toEqual([]);
+    arena.dispose();
+  });
+
+  it("rejects a descriptor longer than its file", () => {
+    const arena = new SharedMemoryArena({ root });
+    arena.stage("req-1", {});
+    const path = join(arena.dir, "req-1.out");
+    writeFileSync(path, Buffer.alloc(10));
+    expect(() =>
+      arena.collect({
+        x: { path, offset: 0, length: 20, dtype: "uint8", shape: [20] }
+      })
+    ).toThrow(/truncated/);
+    arena.dispose();
+  });
+
+  it("release deletes one request's files; clear and dispose the rest", () => {
+    const arena = new SharedMemoryArena({ thresholdBytes: 1, root });
+    arena.stage("req-1", { a: bytes(8) });
+    arena.stage("req-2", { a: bytes(8) });
+    writeFileSync(join(arena.dir, "req-1.out"), "x");
+
+    arena.release("req-1");
+    arena.release("req-1");
+    expect(readdirSync(arena.dir)).toEqual(["req-2.in"]);
+    arena.clear();
+    expect(readdirSync(arena.dir)).toEqual([]);
+    arena.dispose();
+    expect(existsSync(arena.dir)).toBe(false);
+  });
+
+  it("sweeps directories left by dead processes", () => {
+    // PIDs are bounded well below this on Linux and macOS.
+    const stale = join(root, "nodetool-bridge-2147483646-0");
+    const live = join(root, `nodetool-bridge-${process.pid}-99`);
+    mkdirSync(stale);
+    mkdirSync(live);
+    new SharedMemoryArena({ root });
+    expect(existsSync(stale)).toBe(false);
+    expect(existsSync(live)).toBe(true);
+  });
+});
+
+class ShmBridge extends PythonBridgeBase {
+  sent: Frame[] = [];
+
+  constructor(arena: SharedMemoryArena, capabilities: string[]) {
+    super();
+    this._shm = arena;
+    this._workerStatus = { protocol_version: 4, capabilities };
+  }
+
+  protected async _openTransport(): Promise<void> {
+    this._connected = true;
+  }
+
+  protected _send(msg: Frame): void {
+    this.sent.push(msg);
+  }
+
+  close(): void {
+    this._rejectAllPending(new Error("bridge closed"));
+  }
+
+  handle(msg: Frame): void {
+    this._handleMessage(msg);
+  }
+}
+
+describe("PythonBridgeBase — shared-memory blobs", () => {
+  it("sends large blobs by descriptor and collects results", async () => {
+    const arena = new SharedMemoryArena({ thresholdBytes: 16, root });
+    const bridge = new ShmBridge(arena, ["shm"]);
+    expect(bridge.supportsSharedMemory()).toBe(true);
+
+    const p = bridge.execute("n.T", {}, {}, { big: bytes(64), tiny: bytes(2) });
+    const frame = bridge.sent[0];
+    const data = frame.data as Frame;
+    expect(Object.keys(data.blobs as Frame)).toEqual(["tiny"]);
+    expect(data.shm_dir).toBe(arena.dir);
+    const input = (data.shm_blobs as Record<string, ShmDescriptor>).big;
+    expect(readDescriptor(input)).toEqual(Buffer.from(bytes(64)));
+
+    const out = join(arena.dir, `${frame.request_id}.out`);
+    writeFileSync(out, bytes(32, 5));
+    bridge.handle({
+      type: "result",
+      request_id: frame.request_id,
+      data: {
+        outputs: {},
+        blobs: {},
+        shm_blobs: {
+          image: { path: out, offset: 0, length: 32, dtype: "uint8" }
+        }
+      }
+    });
+    const result = await p;
+    expect(Buffer.from(result.blobs.image)).toEqual(Buffer.from(bytes(32, 5)));
+    // Input and output files are gone once the request settles.
+    expect(readdirSync(arena.dir)).toEqual([]);
+    arena.dispose();
+  });
+
+  it("sends everything inline without the worker capability", () => {
+    const arena = new SharedMemoryArena({ thresholdBytes: 16, root });
+    const bridge = new ShmBridge(arena, []);
+    expect(bridge.supportsSharedMemory()).toBe(false);
+
+    void bridge.execute("n.T", {}, {}, { big: bytes(64) }).catch(() => {});
+    const data = bridge.sent[0].data as Frame;
+    expect(Object.keys(data.blobs as Frame)).toEqual(["big"]);
+    expect(data.shm_blobs).toBeUndefined();
+    expect(data.shm_dir).toBeUndefined();
+    bridge.close();
+  });
+
+  it("rejects a result whose descriptor escapes the arena", async () => {
+    const arena = new SharedMemoryArena({ root });
+    const bridge = new ShmBridge(arena, ["shm"]);
+    const p = bridge.execute("n.T", {}, {}, {});
+    bridge.handle({
+      type: "result",
+      request_id: bridge.sent[0].request_id,
+      data: {
+        outputs: {},
+        shm_blobs: {
+          x: { path: "/etc/passwd", offset: 0, length: 1, dtype: "uint8" }
+        }
+      }
+    });
+    await expect(p).rejects.toThrow(/outside the bridge arena/);
+    arena.dispose();
+  });
+});
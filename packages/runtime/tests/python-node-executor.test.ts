@@ -244,4 +244,55 @@ describe("PythonNodeExecutor", () => {
       {}
     );
   });
+
+  it("batches invocations once the bridge supports execute.batch", async () => {
+    const bridge = {
+      ...createMockBridge({ outputs: {}, blobs: {} }),
+      supportsExecuteBatch: vi.fn().mockReturnValue(true),
+      executeBatch: vi.fn().mockResolvedValue([
+        { result: { outputs: { label: "A" }, blobs: {} } },
+        { error: new Error("bad input") }
+      ])
+    } as unknown as PythonStdioBridge;
+    const executor = new PythonNodeExecutor(
+      bridge,
+      "test.Classifier",
+      {},
+      { label: "str" },
+      ["HF_TOKEN"],
+      "node-1"
+    );
+    expect(executor.maxBatchSize).toBeGreaterThan(1);
+
+    const context = createMockContext();
+    const results = await executor.processBatch(
+      [{ text: "a" }, { text: "b", __internal: 1 }],
+      context
+    );
+    expect(results).toEqual([
+      { outputs: { label: "A" } },
+      { error: new Error("bad input") }
+    ]);
+    expect(bridge.executeBatch).toHaveBeenCalledWith(
+      "test.Classifier",
+      [
+        { fields: { text: "a" }, blobs: {} },
+        { fields: { text: "b" }, blobs: {} }
+      ],
+      { HF_TOKEN: "test-secret" },
+      expect.any(Function),
+      { nodeId: "node-1", jobId: "job-1", workflowId: "wf-1", userId: "user-1" }
+    );
+  });
+
+  it("does not batch on a bridge without execute.batch", () => {
+    const executor = new PythonNodeExecutor(
+      createMockBridge({ outputs: {}, blobs: {} }),
+      "test.Classifier",
+      {},
+      {},
+      []
+    );
+    expect(executor.maxBatchSize).toBe(1);
+  });
 });
@@ -0,0 +1,290 @@
+import { describe, it, expect, beforeEach, afterEach, vi } from "vitest";
+import fsp, { mkdtemp, readdir, rm, stat } from "node:fs/promises";
+import { tmpdir } from "node:os";
+import { join } from "node:path";
+import {
+  DiskCache,
+  TieredCache,
+  estimateCacheValueSize
+} from "../src/tiered-cache.js";
+import { MemoryCache, ProcessingContext } from "../src/context.js";
+
+const KB = 1024;
+
+function blob(bytes: number, fill = 1): Uint8Array {
+  return new Uint8Array(bytes).fill(fill);
+}
+
+/**
+ * Hold the next disk write until `release` is called. `started` resolves
+ * once that write has begun.
+ */
+function holdNextWrite() {
+  const write = fsp.writeFile.bind(fsp);
+  let release!: () => void;
+  const gate = new Promise<void>((resolve) => (release = resolve));
+  let started!: () => void;
+  const begun = new Promise<void>((resolve) => (started = resolve));
+  let held = false;
+  const spy = vi
+    .spyOn(fsp, "writeFile")
+    .mockImplementation(async (...args: Parameters<typeof fsp.writeFile>) => {
+      if (!held) {
+        held = true;
+        started();
+        await gate;
+      }
+      return write(...args);
+    });
+  return { started: begun, release, restore: () => spy.mockRestore() };
+}
+
+async function dirBytes(dir: string): Promise<number> {
+  let total = 0;
+  for (const name of await readdir(dir)) {
+    total += (await stat(join(dir, name))).size;
+  }
+  return total;
+}
+
+describe("estimateCacheValueSize", () => {
+  it("counts binary payloads by byte length, including nested image data", () => {
+    const image = { type: "image", uri: "", data: blob(100 * KB) };
+    expect(estimateCacheValueSize(image)).toBeGreaterThan(100 * KB);
+    expect(estimateCacheValueSize(image)).toBeLessThan(101 * KB);
+  });
+
+  it("counts strings by length and shared objects once", () => {
+    expect(estimateCacheValueSize("x".repeat(1000))).toBeGreaterThan(2000);
+    const shared = { data: blob(10 * KB) };
+    expect(estimateCacheValueSize([shared, shared])).toBeLessThan(11 * KB);
+  });
+});
+
+describe("TieredCache — memory only", () => {
+  it("evicts least-recently-used entries over the byte budget", async () => {
+    const cache = new TieredCache({ maxMemoryBytes: 25 * KB });
+    await cache.set("a", blob(10 * KB));
+    await cache.set("b", blob(10 * KB));
+    // Touch `a` so `b` is the oldest.
+    expect(await cache.get("a")).toBeDefined();
+    await cache.set("c", blob(10 * KB));
+
+    expect(await cache.has("a")).toBe(true);
+    expect(await cache.has("b")).toBe(false);
+    expect(await cache.has("c")).toBe(true);
+    const stats = cache.stats;
+    expect(stats.evictions).toBe(1);
+    expect(stats.memoryEntries).toBe(2);
+    expect(stats.memoryBytes).toBeLessThanOrEqual(25 * KB);
+  });
+
+  it("counts hits and misses", async () => {
+    const cache = new TieredCache();
+    await cache.set("k", "v");
+    expect(await cache.get("k")).toBe("v");
+    expect(await cache.get("missing")).toBeUndefined();
+    expect(cache.stats).toMatchObject({ hits: 1, memoryHits: 1, misses: 1 });
+  });
+
+  it("expires entries by TTL", async () => {
+    const cache = new TieredCache();
+    await cache.set("k", "v", 0.001);
+    await new Promise((r) => setTimeout(r, 10));
+    expect(await cache.get("k")).toBeUndefined();
+    expect(cache.stats.memoryEntries).toBe(0);
+  });
+
+  it("replaces an entry's size when the key is overwritten", async () => {
+    const cache = new TieredCache();
+    await cache.set("k", blob(10 * KB));
+    await cache.set("k", blob(1 * KB));
+    expect(cache.stats.memoryBytes).toBeLessThan(2 * KB);
+  });
+});
+
+describe("TieredCache — disk tier", () => {
+  let dir: string;
+
+  beforeEach(async () => {
+    dir = await mkdtemp(join(tmpdir(), "nodetool-tiered-cache-"));
+  });
+
+  afterEach(async () => {
+    await rm(dir, { recursive: true, force: true });
+  });
+
+  it("spills evicted entries to disk and promotes them on read", async () => {
+    const cache = new TieredCache({ maxMemoryBytes: 25 * KB, diskDir: dir });
+    await cache.set("a", blob(10 * KB, 7));
+    await cache.set("b", blob(10 * KB));
+    await cache.set("c", blob(10 * KB));
+    expect(cache.stats).toMatchObject({ evictions: 1, spills: 1, diskEntries: 1 });
+
+    const a = await cache.get<Uint8Array>("a");
+    expect(a).toBeInstanceOf(Uint8Array);
+    expect(a![0]).toBe(7);
+    expect(a!.byteLength).toBe(10 * KB);
+    const stats = cache.stats;
+    expect(stats.diskHits).toBe(1);
+    // `a` is back in memory; `b` took its place on disk.
+    expect(stats.memoryEntries).toBe(2);
+    expect(stats.diskEntries).toBe(1);
+  });
+
+  it("keeps the disk tier under its own budget", async () => {
+    const cache = new TieredCache({
+      maxMemoryBytes: 12 * KB,
+      diskDir: dir,
+      maxDiskBytes: 25 * KB
+    });
+    for (const key of ["a", "b", "c", "d", "e"]) {
+      await cache.set(key, blob(10 * KB));
+    }
+    const stats = cache.stats;
+    expect(stats.diskBytes).toBeLessThanOrEqual(25 * KB);
+    expect(stats.diskEvictions).toBeGreaterThan(0);
+    expect(await cache.has("a")).toBe(false);
+    expect(await cache.has("e")).toBe(true);
+  });
+
+  it("sends entries larger than the memory budget straight to disk", async () => {
+    const cache = new TieredCache({ maxMemoryBytes: 4 * KB, diskDir: dir });
+    await cache.set("big", { data: blob(8 * KB) });
+    expect(cache.stats).toMatchObject({ memoryEntries: 0, diskEntries: 1 });
+    expect(await cache.has("big")).toBe(true);
+  });
+
+  it("deletes from both tiers", async () => {
+    const cache = new TieredCache({ maxMemoryBytes: 12 * KB, diskDir: dir });
+    await cache.set("a", blob(10 * KB));
+    await cache.set("b", blob(10 * KB));
+    await cache.delete("a");
+    expect(await cache.has("a")).toBe(false);
+    expect(await readdir(dir)).toHaveLength(0);
+  });
+
+  it("lets a set made during a spill win over the spilled value", async () => {
+    const cache = new TieredCache({ maxMemoryBytes: 12 * KB, diskDir: dir });
+    await cache.set("a", blob(10 * KB, 1));
+    const hold = holdNextWrite();
+    try {
+      // Evicts `a`; its spill stalls mid-write.
+      const spilling = cache.set("b", blob(10 * KB));
+      await hold.started;
+      // Too large for memory, so this also goes straight to disk.
+      const replacing = cache.set("a", { data: blob(16 * KB, 2) });
+      hold.release();
+      await Promise.all([spilling, replacing]);
+    } finally {
+      hold.restore();
+    }
+    const a = await cache.get<{ data: Uint8Array }>("a");
+    expect(a!.data[0]).toBe(2);
+    expect(cache.stats.diskBytes).toBe(await dirBytes(dir));
+  });
+
+  it("lets a set or delete made during a promotion win over the disk value", async () => {
+    const cache = new TieredCache({ maxMemoryBytes: 12 * KB, diskDir: dir });
+    await cache.set("a", blob(10 * KB, 1));
+    await cache.set("b", blob(10 * KB, 1));
+    expect(cache.stats.diskEntries).toBe(1);
+
+    // `a` is on disk; the set lands while the read is still in flight.
+    const [read] = await Promise.all([
+      cache.get<Uint8Array>("a"),
+      cache.set("a", blob(10 * KB, 2))
+    ]);
+    expect(read![0]).toBe(1);
+    expect((await cache.get<Uint8Array>("a"))![0]).toBe(2);
+
+    // `b` went to disk to make room; a delete must not be undone either.
+    await Promise.all([cache.get("b"), cache.delete("b")]);
+    expect(await cache.has("b")).toBe(false);
+    expect(cache.stats.memoryBytes).toBeLessThanOrEqual(12 * KB);
+  });
+
+  it("reopens spilled entries written by an earlier instance", async () => {
+    const value = "persisted".repeat(200);
+    const first = new TieredCache({ maxMemoryBytes: KB, diskDir: dir });
+    await first.set("a", value);
+    expect(first.stats.diskEntries).toBe(1);
+    const second = new TieredCache({ maxMemoryBytes: 64 * KB, diskDir: dir });
+    expect(await second.get("a")).toBe(value);
+  });
+});
+
+describe("DiskCache", () => {
+  let dir: string;
+
+  beforeEach(async () => {
+    dir = await mkdtemp(join(tmpdir(), "nodetool-disk-cache-"));
+  });
+
+  afterEach(async () => {
+    await rm(dir, { recursive: true, force: true });
+  });
+
+  it("keeps entries across instances", async () => {
+    const first = new DiskCache({ dir });
+    await first.set("a", { text: "hello", n: 1 });
+    const second = new DiskCache({ dir });
+    expect(await second.get("a")).toEqual({ text: "hello", n: 1 });
+    expect(second.stats).toMatchObject({ hits: 1, entries: 1 });
+    expect(await second.get("missing")).toBeUndefined();
+    expect(second.stats.misses).toBe(1);
+  });
+
+  it("expires entries after their TTL", async () => {
+    const cache = new DiskCache({ dir });
+    const now = Date.now();
+    const spy = vi.spyOn(Date, "now").mockReturnValue(now);
+    try {
+      await cache.set("a", "short-lived", 1);
+      expect(await cache.has("a")).toBe(true);
+      spy.mockReturnValue(now + 2000);
+      expect(await cache.get("a")).toBeUndefined();
+    } finally {
+      spy.mockRestore();
+    }
+  });
+
+  it("counts one entry's bytes once under concurrent sets", async () => {
+    const cache = new DiskCache({ dir });
+    await Promise.all([
+      cache.set("k", blob(4 * KB, 1)),
+      cache.set("k", blob(6 * KB, 2))
+    ]);
+    expect(cache.stats.entries).toBe(1);
+    expect(cache.stats.bytes).toBe(await dirBytes(dir));
+    expect((await cache.get<Uint8Array>("k"))![0]).toBe(2);
+  });
+
+  it("evicts the least recently read entries over budget", async () => {
+    const cache = new DiskCache({ dir, maxBytes: 25 * KB });
+    await cache.set("a", blob(10 * KB));
+    await cache.set("b", blob(10 * KB));
+    await cache.get("a");
+    await cache.set("c", blob(10 * KB));
+    expect(cache.stats.bytes).toBeLessThanOrEqual(25 * KB);
+    expect(cache.stats.evictions).toBe(1);
+    expect(await cache.has("a")).toBe(true);
+    expect(await cache.has("b")).toBe(false);
+  });
+});
+
+describe("ProcessingContext cache selection", () => {
+  it("builds a TieredCache from cacheOptions", () => {
+    const ctx = new ProcessingContext({
+      jobId: "j",
+      cacheOptions: { maxMemoryBytes: KB }
+    });
+    expect(ctx.cache).toBeInstanceOf(TieredCache);
+  });
+
+  it("keeps MemoryCache as the default", () => {
+    expect(new ProcessingContext({ jobId: "j" }).cache).toBeInstanceOf(
+      MemoryCache
+    );
+  });
+});
@@ -5,7 +5,7 @@
  * (OpenAI, Ollama, Gemini, Mistral, Cohere, Voyage AI, Jina AI).
  */
 
-import { createLogger } from "@nodetool-ai/config";
+import { createLogger, sharedFetch } from "@nodetool-ai/config";
 import { getSecret } from "@nodetool-ai/models";
 import type { EmbeddingFunction } from "./sqlite-vec-store.js";
 
@@ -126,7 +126,7 @@ export class ProviderEmbeddingFunction implements EmbeddingFunction {
     };
     if (this.dimensions) body.dimensions = this.dimensions;
 
-    const resp = await fetch("https://api.openai.com/v1/embeddings", {
+    const resp = await sharedFetch("https://api.openai.com/v1/embeddings", {
       method: "POST",
       headers: {
         "Content-Type": "application/json",
@@ -155,7 +155,7 @@ export class ProviderEmbeddingFunction implements EmbeddingFunction {
   private async _generateOllama(texts: string[]): Promise<number[][]> {
     const baseUrl = (await this.resolveApiKey()) || "http://127.0.0.1:11434";
 
-    const resp = await fetch(`${baseUrl}/api/embed`, {
+    const resp = await sharedFetch(`${baseUrl}/api/embed`, {
       method: "POST",
       headers: { "Content-Type": "application/json" },
       body: JSON.stringify({ model: this.model, input: texts })
@@ -180,7 +180,7 @@ export class ProviderEmbeddingFunction implements EmbeddingFunction {
     const embeddings: number[][] = [];
     for (const text of texts) {
       const url = `https://generativelanguage.googleapis.com/v1beta/models/${this.model}:embedContent?key=${apiKey}`;
-      const resp = await fetch(url, {
+      const resp = await sharedFetch(url, {
         method: "POST",
         headers: { "Content-Type": "application/json" },
         body: JSON.stringify({
@@ -207,7 +207,7 @@ export class ProviderEmbeddingFunction implements EmbeddingFunction {
     const apiKey = await this.resolveApiKey();
     if (!apiKey) throw new Error("MISTRAL_API_KEY not configured");
 
-    const resp = await fetch("https://api.mistral.ai/v1/embeddings", {
+    const resp = await sharedFetch("https://api.mistral.ai/v1/embeddings", {
       method: "POST",
       headers: {
         "Content-Type": "application/json",
@@ -246,7 +246,7 @@ export class ProviderEmbeddingFunction implements EmbeddingFunction {
     };
     if (this.dimensions) body.output_dimension = this.dimensions;
 
-    const resp = await fetch("https://api.cohere.com/v2/embed", {
+    const resp = await sharedFetch("https://api.cohere.com/v2/embed", {
       method: "POST",
       headers: {
         "Content-Type": "application/json",
@@ -285,7 +285,7 @@ export class ProviderEmbeddingFunction implements EmbeddingFunction {
     };
     if (this.dimensions) body.output_dimension = this.dimensions;
 
-    const resp = await fetch("https://api.voyageai.com/v1/embeddings", {
+    const resp = await sharedFetch("https://api.voyageai.com/v1/embeddings", {
       method: "POST",
       headers: {
         "Content-Type": "application/json",
@@ -322,7 +322,7 @@ export class ProviderEmbeddingFunction implements EmbeddingFunction {
     }
     if (this.dimensions) body.dimensions = this.dimensions;
 
-    const resp = await fetch("https://api.jina.ai/v1/embeddings", {
+    const resp = await sharedFetch("https://api.jina.ai/v1/embeddings", {
       method: "POST",
       headers: {
         "Content-Type": "application/json",
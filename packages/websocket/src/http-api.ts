@@ -502,7 +502,10 @@ export async function getWorkflowRuntimeEnvironment(
             ),
             meta?.required_settings ?? [],
             node.id,
-            meta?.requires_vram_gb
+            meta?.requires_vram_gb,
+            Object.fromEntries(
+              (meta?.properties ?? []).map((p) => [p.name, p.type.type])
+            )
           );
         }
         if (registry.getMetadata(node.type) && !registry.has(node.type)) {
@@ -87,3 +87,16 @@ export {
   createAssetModelInterface,
   type CreateAssetArgs
 } from "./lib/asset-model-interface.js";
+export {
+  DrizzleDurableInboxStore,
+  DrizzleTriggerInputStore
+} from "./triggers/stores.js";
+export {
+  GroupCommitDurableInboxStore,
+  type GroupCommitInboxOptions,
+  type GroupCommitInboxStats
+} from "./triggers/group-commit-inbox-store.js";
+export {
+  RunNodeStateCheckpointStore,
+  type RunNodeStateCheckpointOptions
+} from "./run-checkpoint-store.js";
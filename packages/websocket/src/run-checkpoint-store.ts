@@ -0,0 +1,166 @@
+/**
+ * `RunCheckpointStore` over the `run_node_state` table.
+ *
+ * Each completed node becomes a `completed` row whose `outputs_json` holds
+ * the node's checkpoint: its fingerprint, every output record it sent and
+ * its final result. A recovered job loads those rows back so the kernel can
+ * skip the nodes they cover.
+ *
+ * Output values are workflow values, not JSON: image, audio and video refs
+ * carry their bytes in `data`. Byte buffers are written as base64 inline, or
+ * — with a `storage` adapter, from `bytesThreshold` up — to storage, with
+ * only the URI kept in the row. Other values go through `JSON.stringify`.
+ *
+ * Nothing resumes a job once it is over, so its owner calls `clear` at the
+ * terminal status to delete the rows and the moved buffers.
+ */
+
+import { createLogger } from "@nodetool-ai/config";
+import { RunNodeState } from "@nodetool-ai/models";
+import type { NodeCheckpoint, RunCheckpointStore } from "@nodetool-ai/kernel";
+import type { StorageAdapter } from "@nodetool-ai/runtime";
+
+// Stryker disable next-line StringLiteral: logger name is a diagnostic label, not a behavioural contract
+const log = createLogger("nodetool.websocket.run-checkpoint-store");
+
+export interface RunNodeStateCheckpointOptions {
+  /** Where large byte buffers go. Without one, every buffer stays inline. */
+  storage?: StorageAdapter;
+  /** Buffer size moved to `storage`. Default 256 KiB. */
+  bytesThreshold?: number;
+  /** Storage key prefix for moved buffers. Default `run-checkpoints`. */
+  keyPrefix?: string;
+}
+
+const DEFAULT_BYTES_THRESHOLD = 256 * 1024;
+const DEFAULT_KEY_PREFIX = "run-checkpoints";
+
+/** Marker keys for encoded buffers; no workflow value uses them. */
+const BYTES_KEY = "__checkpoint_bytes__";
+const REF_KEY = "__checkpoint_ref__";
+
+export class RunNodeStateCheckpointStore implements RunCheckpointStore {
+  private readonly _storage: StorageAdapter | undefined;
+  private readonly _threshold: number;
+  private readonly _keyPrefix: string;
+
+  constructor(options: RunNodeStateCheckpointOptions = {}) {
+    this._storage = options.storage;
+    this._threshold = options.bytesThreshold ?? DEFAULT_BYTES_THRESHOLD;
+    this._keyPrefix = options.keyPrefix ?? DEFAULT_KEY_PREFIX;
+  }
+
+  /** Whether an earlier attempt at `runId` left checkpoints behind. */
+  static async has(runId: string): Promise<boolean> {
+    const rows = await RunNodeState.getCompletedNodes(runId);
+    return rows.some(isCheckpointRow);
+  }
+
+  async load(runId: string): Promise<NodeCheckpoint[]> {
+    const rows = await RunNodeState.getCompletedNodes(runId);
+    const checkpoints: NodeCheckpoint[] = [];
+    for (const row of rows) {
+      const stored = row.outputs_json;
+      if (!stored || !isCheckpointRow(row)) continue;
+      try {
+        checkpoints.push({
+          ...((await this._decode(stored)) as Omit<NodeCheckpoint, "nodeId">),
+          nodeId: row.node_id
+        });
+      } catch (error) {
+        // An unreadable checkpoint costs a re-run of its node, nothing more.
+        // Stryker disable next-line StringLiteral,ObjectLiteral: diagnostic log args only
+        log.warn("Skipping unreadable checkpoint", {
+          runId,
+          nodeId: row.node_id,
+          error: error instanceof Error ? error.message : String(error)
+        });
+      }
+    }
+    return checkpoints;
+  }
+
+  async save(runId: string, checkpoint: NodeCheckpoint): Promise<void> {
+    const { nodeId, ...rest } = checkpoint;
+    let moved = 0;
+    const encoded = await this._encode(rest, async (bytes) => {
+      const key = `${this._keyPrefix}/${runId}/${nodeId}/${moved++}`;
+      return this._storage!.store(key, bytes, "application/octet-stream");
+    });
+    const state = new RunNodeState({ run_id: runId, node_id: nodeId });
+    await state.markCompleted(encoded as Record<string, unknown>);
+  }
+
+  /** Delete a run's checkpoint rows and every buffer moved for them. */
+  async clear(runId: string): Promise<void> {
+    if (this._storage) {
+      const storage = this._storage;
+      const { entries } = await storage.list(`${this._keyPrefix}/${runId}/`);
+      await Promise.all(entries.map((entry) => storage.delete(entry.uri)));
+    }
+    const rows = await RunNodeState.getCompletedNodes(runId);
+    for (const row of rows) {
+      if (isCheckpointRow(row)) await row.delete();
+    }
+  }
+
+  private async _encode(
+    value: unknown,
+    move: (bytes: Uint8Array) => Promise<string>
+  ): Promise<unknown> {
+    if (value instanceof Uint8Array) {
+      if (this._storage && value.byteLength >= this._threshold) {
+        return { [REF_KEY]: await move(value) };
+      }
+      return { [BYTES_KEY]: Buffer.from(value).toString("base64") };
+    }
+    if (Array.isArray(value)) {
+      const out: unknown[] = [];
+      for (const item of value) out.push(await this._encode(item, move));
+      return out;
+    }
+    if (isPlainObject(value)) {
+      const out: Record<string, unknown> = {};
+      for (const [key, item] of Object.entries(value)) {
+        out[key] = await this._encode(item, move);
+      }
+      return out;
+    }
+    return value;
+  }
+
+  private async _decode(value: unknown): Promise<unknown> {
+    if (Array.isArray(value)) {
+      return Promise.all(value.map((item) => this._decode(item)));
+    }
+    if (!isPlainObject(value)) return value;
+    const bytes = value[BYTES_KEY];
+    if (typeof bytes === "string") {
+      return new Uint8Array(Buffer.from(bytes, "base64"));
+    }
+    const ref = value[REF_KEY];
+    if (typeof ref === "string") {
+      if (!this._storage) {
+        throw new Error(`No storage to load checkpoint bytes from: ${ref}`);
+      }
+      const stored = await this._storage.retrieve(ref);
+      if (!stored) throw new Error(`Checkpoint bytes missing: ${ref}`);
+      return stored;
+    }
+    const out: Record<string, unknown> = {};
+    for (const [key, item] of Object.entries(value)) {
+      out[key] = await this._decode(item);
+    }
+    return out;
+  }
+}
+
+function isCheckpointRow(row: RunNodeState): boolean {
+  return typeof row.outputs_json?.fingerprint === "string";
+}
+
+function isPlainObject(value: unknown): value is Record<string, unknown> {
+  if (value === null || typeof value !== "object") return false;
+  const proto = Object.getPrototypeOf(value);
+  return proto === Object.prototype || proto === null;
+}
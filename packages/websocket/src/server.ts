@@ -45,6 +45,7 @@ import {
   createPythonBridge,
   WebsocketPythonBridge,
   SwappableBridge,
+  PooledPythonBridge,
   logPythonWorkerStderr,
   type ModelDownloadUpdate,
   type PythonBridge
@@ -468,11 +469,24 @@ if (process.env["NODETOOL_ENV"] !== "production") {
 // Python bridge
 // ---------------------------------------------------------------------------
 
-const localBridge = createPythonBridge({
+const localBridgeOptions = {
   workerArgs: process.env["NODETOOL_WORKER_NAMESPACES"]
     ? ["--namespaces", process.env["NODETOOL_WORKER_NAMESPACES"]]
     : []
-});
+};
+// `NODETOOL_PYTHON_WORKERS` above 1 runs local Python nodes on a pool of
+// stdio workers instead of one shared interpreter. A remote worker
+// (`NODETOOL_WORKER_URL`) is one process however many sockets reach it, so it
+// is never pooled.
+const pythonWorkers = Number(process.env["NODETOOL_PYTHON_WORKERS"] ?? 1);
+const localBridge: PythonBridge =
+  pythonWorkers > 1 && !process.env["NODETOOL_WORKER_URL"]?.trim()
+    ? new PooledPythonBridge({
+        createWorker: (discovered) =>
+          createPythonBridge({ ...localBridgeOptions, discovered }),
+        maxWorkers: pythonWorkers
+      })
+    : createPythonBridge(localBridgeOptions);
 
 // The ONE stable bridge reference handed to every consumer. It delegates to the
 // local bridge by default; attaching a worker swaps in a dedicated WebSocket
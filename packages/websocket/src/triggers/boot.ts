@@ -34,10 +34,8 @@ import {
 } from "./dispatcher.js";
 import { startFileWatch, type FileWatchHandle } from "./file-watch.js";
 import { startScheduler, type SchedulerHandle } from "./scheduler.js";
-import {
-  DrizzleDurableInboxStore,
-  DrizzleTriggerInputStore
-} from "./stores.js";
+import { GroupCommitDurableInboxStore } from "./group-commit-inbox-store.js";
+import { DrizzleTriggerInputStore } from "./stores.js";
 import { createWebhookRoute } from "./webhook-route.js";
 
 // Stryker disable next-line StringLiteral: logger name is a diagnostic label, not a behavioural contract
@@ -124,10 +122,8 @@ export function startTriggerServices(
   }
 
   const inputStore = new DrizzleTriggerInputStore();
-  const wakeupService = new TriggerWakeupService(
-    new DrizzleDurableInboxStore(),
-    inputStore
-  );
+  const inboxStore = new GroupCommitDurableInboxStore();
+  const wakeupService = new TriggerWakeupService(inboxStore, inputStore);
   setTriggerWakeupService(wakeupService);
 
   let dispatcher: DispatcherHandle | null = null;
@@ -202,6 +198,7 @@ export function startTriggerServices(
       // The file-watch teardown persists each registration's catch-up cursor,
       // so it is awaited rather than fired and forgotten.
       await fileWatch?.();
+      await inboxStore.close();
       if (getTriggerWakeupService() === wakeupService) {
         setTriggerWakeupService(null);
       }
@@ -0,0 +1,404 @@
+/**
+ * Group-commit `DurableInboxStore` over the `run_inbox_messages` table.
+ *
+ * `DrizzleDurableInboxStore` pays one write transaction per `save` and a read
+ * plus a write per `markConsumed`. On SQLite every one of those is a journal
+ * sync, so a busy trigger fan-in spends its time in fsync rather than in the
+ * workflow. This store buffers appends and consumes for a short window (or
+ * until a batch fills) and commits the whole batch as one transaction of
+ * multi-row statements. `save` and `markConsumed` still resolve only once
+ * their batch is durable, so callers keep at-least-once semantics; what they
+ * share is the commit.
+ *
+ * Reads see buffered and in-flight batches on top of the table, so
+ * `getMaxSeq`, `findByMessageId` and `findPending` answer as if every write
+ * had already landed — `DurableInbox.append` relies on that for sequencing
+ * and idempotency.
+ *
+ * With a `storage` adapter, payloads whose JSON is at least
+ * `payloadThresholdBytes` are written there and the row keeps only the URI in
+ * `payload_ref`; reads load them back transparently. `payloadRef`s supplied by
+ * the caller are left alone.
+ */
+
+import { createLogger } from "@nodetool-ai/config";
+import {
+  getDb,
+  RunInboxMessage,
+  type RunInboxMessageInsert
+} from "@nodetool-ai/models";
+import type { DurableMessage } from "@nodetool-ai/kernel";
+import type { StorageAdapter } from "@nodetool-ai/runtime";
+import { DrizzleDurableInboxStore } from "./stores.js";
+
+// Stryker disable next-line StringLiteral: logger name is a diagnostic label, not a behavioural contract
+const log = createLogger("nodetool.websocket.triggers.group-commit-inbox");
+
+export interface GroupCommitInboxOptions {
+  /** How long the first write of a batch waits for company, in ms. Default 2. */
+  windowMs?: number;
+  /** Writes (appends plus consumes) that close a batch early. Default 256. */
+  maxBatch?: number;
+  /** Serialized payload size moved to `storage`. Default 64 KiB. */
+  payloadThresholdBytes?: number;
+  /** Where large payloads go. Without one, every payload stays inline. */
+  storage?: StorageAdapter;
+  /** Storage key prefix for spilled payloads. Default `inbox-payloads`. */
+  keyPrefix?: string;
+}
+
+/** Counters since the store was created. */
+export interface GroupCommitInboxStats {
+  /** Transactions committed. */
+  commits: number;
+  /** Messages inserted. */
+  saved: number;
+  /** Messages marked consumed. */
+  consumed: number;
+  /** Most writes in one commit. */
+  largestBatch: number;
+  /** Payloads written to storage instead of the row. */
+  spilled: number;
+  spilledBytes: number;
+}
+
+const DEFAULT_WINDOW_MS = 2;
+const DEFAULT_MAX_BATCH = 256;
+const DEFAULT_PAYLOAD_THRESHOLD = 64 * 1024;
+const DEFAULT_KEY_PREFIX = "inbox-payloads";
+
+/** Writes that share one commit. */
+class Batch {
+  /** messageId → message as saved, payload inline. */
+  readonly inserts = new Map<string, DurableMessage>();
+  /** messageId → spilled payload URI, for inserts whose payload was moved. */
+  readonly spilledRefs = new Map<string, string>();
+  /** messageId → consume time, for messages not inserted by this batch. */
+  readonly consumed = new Map<string, Date>();
+  readonly done: Promise<void>;
+  resolve!: () => void;
+  reject!: (err: unknown) => void;
+
+  constructor() {
+    this.done = new Promise<void>((resolve, reject) => {
+      this.resolve = resolve;
+      this.reject = reject;
+    });
+  }
+
+  get size(): number {
+    return this.inserts.size + this.consumed.size;
+  }
+}
+
+function matches(
+  m: DurableMessage,
+  runId: string,
+  nodeId: string,
+  handle: string
+): boolean {
+  return m.runId === runId && m.nodeId === nodeId && m.handle === handle;
+}
+
+export class GroupCommitDurableInboxStore extends DrizzleDurableInboxStore {
+  private readonly _windowMs: number;
+  private readonly _maxBatch: number;
+  private readonly _threshold: number;
+  private readonly _storage: StorageAdapter | undefined;
+  private readonly _keyPrefix: string;
+  private _open = new Batch();
+  /** Sealed batches not yet committed, oldest first. */
+  private _inflight: Batch[] = [];
+  private _timer: ReturnType<typeof setTimeout> | null = null;
+  private _commitChain: Promise<void> = Promise.resolve();
+  private _stats: GroupCommitInboxStats = {
+    commits: 0,
+    saved: 0,
+    consumed: 0,
+    largestBatch: 0,
+    spilled: 0,
+    spilledBytes: 0
+  };
+
+  constructor(options: GroupCommitInboxOptions = {}) {
+    super();
+    this._windowMs = options.windowMs ?? DEFAULT_WINDOW_MS;
+    this._maxBatch = Math.max(1, options.maxBatch ?? DEFAULT_MAX_BATCH);
+    this._threshold = options.payloadThresholdBytes ?? DEFAULT_PAYLOAD_THRESHOLD;
+    this._storage = options.storage;
+    this._keyPrefix = options.keyPrefix ?? DEFAULT_KEY_PREFIX;
+  }
+
+  get stats(): GroupCommitInboxStats {
+    return { ...this._stats };
+  }
+
+  // ── Writes ───────────────────────────────────────────────────────
+
+  override async save(message: DurableMessage): Promise<void> {
+    const spilledRef = await this._spill(message);
+    const batch = this._open;
+    if (!this._buffered(message.messageId)) {
+      batch.inserts.set(message.messageId, { ...message });
+      if (spilledRef) batch.spilledRefs.set(message.messageId, spilledRef);
+    }
+    this._scheduled(batch);
+    return batch.done;
+  }
+
+  override async markConsumed(messageId: string): Promise<void> {
+    const batch = this._open;
+    const now = new Date();
+    const buffered = batch.inserts.get(messageId);
+    if (buffered) {
+      // Inserted and consumed in the same commit: one row, final status.
+      buffered.status = "consumed";
+      buffered.consumedAt = now;
+    } else {
+      batch.consumed.set(messageId, now);
+    }
+    this._scheduled(batch);
+    return batch.done;
+  }
+
+  override async deleteConsumed(
+    runId: string,
+    nodeId: string,
+    handle: string,
+    olderThanSeq: number
+  ): Promise<number> {
+    await this.flush();
+    if (this._storage) {
+      const rows = await getDb().query.runInboxMessages.findMany({
+        columns: { payload_ref: true },
+        where: (t, { and, eq, lt, isNotNull }) =>
+          and(
+            eq(t.run_id, runId),
+            eq(t.node_id, nodeId),
+            eq(t.handle, handle),
+            eq(t.status, "consumed"),
+            lt(t.msg_seq, olderThanSeq),
+            isNotNull(t.payload_ref)
+          )
+      });
+      for (const { payload_ref } of rows) {
+        if (payload_ref && this._isSpilled(payload_ref)) {
+          await this._storage.delete(payload_ref);
+        }
+      }
+    }
+    return super.deleteConsumed(runId, nodeId, handle, olderThanSeq);
+  }
+
+  /** Commit whatever is buffered and wait for every pending commit. */
+  async flush(): Promise<void> {
+    if (this._open.size > 0) this._seal();
+    await this._commitChain;
+  }
+
+  /** Alias for {@link flush}; call before dropping the store. */
+  async close(): Promise<void> {
+    await this.flush();
+  }
+
+  // ── Reads ────────────────────────────────────────────────────────
+
+  override async findByMessageId(
+    messageId: string
+  ): Promise<DurableMessage | null> {
+    for (const batch of this._layers().reverse()) {
+      const buffered = batch.inserts.get(messageId);
+      if (buffered) return this._withConsume({ ...buffered });
+    }
+    const stored = await super.findByMessageId(messageId);
+    return stored ? this._hydrate(this._withConsume(stored)) : null;
+  }
+
+  override async findPending(
+    runId: string,
+    nodeId: string,
+    handle: string,
+    limit: number,
+    minSeq = 0
+  ): Promise<DurableMessage[]> {
+    const layers = this._layers();
+    const consumedIds = new Set<string>();
+    for (const batch of layers) {
+      for (const id of batch.consumed.keys()) consumedIds.add(id);
+    }
+    // Over-fetch by the buffered consumes, which may hide stored rows.
+    const stored = await super.findPending(
+      runId,
+      nodeId,
+      handle,
+      limit + consumedIds.size,
+      minSeq
+    );
+    const byId = new Map<string, DurableMessage>();
+    for (const m of stored) {
+      if (!consumedIds.has(m.messageId)) byId.set(m.messageId, m);
+    }
+    for (const batch of layers) {
+      for (const m of batch.inserts.values()) {
+        if (
+          matches(m, runId, nodeId, handle) &&
+          m.status === "pending" &&
+          m.seq >= minSeq &&
+          !consumedIds.has(m.messageId)
+        ) {
+          byId.set(m.messageId, { ...m });
+        }
+      }
+    }
+    const pending = [...byId.values()]
+      .sort((a, b) => a.seq - b.seq)
+      .slice(0, limit);
+    return Promise.all(pending.map((m) => this._hydrate(m)));
+  }
+
+  override async getMaxSeq(
+    runId: string,
+    nodeId: string,
+    handle: string
+  ): Promise<number> {
+    let max = await super.getMaxSeq(runId, nodeId, handle);
+    for (const batch of this._layers()) {
+      for (const m of batch.inserts.values()) {
+        if (matches(m, runId, nodeId, handle) && m.seq > max) max = m.seq;
+      }
+    }
+    return max;
+  }
+
+  // ── Batching ─────────────────────────────────────────────────────
+
+  private _layers(): Batch[] {
+    return [...this._inflight, this._open];
+  }
+
+  private _buffered(messageId: string): boolean {
+    return this._layers().some((b) => b.inserts.has(messageId));
+  }
+
+  /** Arm the window for a batch that just gained a write, or seal it if full. */
+  private _scheduled(batch: Batch): void {
+    if (batch.size >= this._maxBatch) {
+      this._seal();
+    } else if (!this._timer) {
+      this._timer = setTimeout(() => this._seal(), this._windowMs);
+    }
+  }
+
+  private _seal(): void {
+    if (this._timer) {
+      clearTimeout(this._timer);
+      this._timer = null;
+    }
+    const batch = this._open;
+    if (batch.size === 0) return;
+    this._open = new Batch();
+    this._inflight.push(batch);
+    this._commitChain = this._commitChain.then(() => this._commit(batch));
+  }
+
+  private async _commit(batch: Batch): Promise<void> {
+    const rows: RunInboxMessageInsert[] = [];
+    for (const m of batch.inserts.values()) {
+      const spilledRef = batch.spilledRefs.get(m.messageId);
+      rows.push({
+        message_id: m.messageId,
+        run_id: m.runId,
+        node_id: m.nodeId,
+        handle: m.handle,
+        msg_seq: m.seq,
+        payload_json: spilledRef ? null : m.payload,
+        payload_ref: spilledRef ?? m.payloadRef ?? null,
+        status: m.status,
+        consumed_at: m.consumedAt?.toISOString() ?? null,
+        created_at: m.createdAt.toISOString()
+      });
+    }
+    // One timestamp per commit; consumes within a few ms share it.
+    const consumedAt = [...batch.consumed.values()].at(-1)?.toISOString();
+    try {
+      await RunInboxMessage.commitBatch(
+        rows,
+        [...batch.consumed.keys()],
+        consumedAt
+      );
+      this._stats.commits++;
+      this._stats.saved += rows.length;
+      this._stats.consumed += batch.consumed.size;
+      this._stats.largestBatch = Math.max(this._stats.largestBatch, batch.size);
+      batch.resolve();
+    } catch (err) {
+      // Stryker disable next-line StringLiteral,ObjectLiteral: diagnostic log args only
+      log.warn("Inbox group commit failed", {
+        writes: batch.size,
+        error: String(err)
+      });
+      batch.reject(err);
+    } finally {
+      this._inflight.splice(this._inflight.indexOf(batch), 1);
+    }
+  }
+
+  /** Reflect consumes that are buffered but not yet committed. */
+  private _withConsume(message: DurableMessage): DurableMessage {
+    for (const batch of this._layers()) {
+      const at = batch.consumed.get(message.messageId);
+      if (at) return { ...message, status: "consumed", consumedAt: at };
+    }
+    return message;
+  }
+
+  // ── Payload spill ────────────────────────────────────────────────
+
+  private _spillPrefix(): string {
+    return `${this._storage!.uriForKey(this._keyPrefix)}/`;
+  }
+
+  private _isSpilled(uri: string): boolean {
+    return this._storage !== undefined && uri.startsWith(this._spillPrefix());
+  }
+
+  /** Store a large payload; returns its URI, or undefined to keep it inline. */
+  private async _spill(message: DurableMessage): Promise<string | undefined> {
+    if (
+      !this._storage ||
+      message.payloadRef !== undefined ||
+      message.payload === undefined
+    ) {
+      return undefined;
+    }
+    const bytes = new TextEncoder().encode(JSON.stringify(message.payload));
+    if (bytes.byteLength < this._threshold) return undefined;
+    const uri = await this._storage.store(
+      `${this._keyPrefix}/${message.messageId}.json`,
+      bytes,
+      "application/json"
+    );
+    this._stats.spilled++;
+    this._stats.spilledBytes += bytes.byteLength;
+    return uri;
+  }
+
+  /** Load a spilled payload back into a stored message. */
+  private async _hydrate(message: DurableMessage): Promise<DurableMessage> {
+    const ref = message.payloadRef;
+    if (message.payload != null || !ref || !this._isSpilled(ref)) {
+      return message;
+    }
+    const bytes = await this._storage!.retrieve(ref);
+    if (!bytes) {
+      throw new Error(
+        `Inbox payload for ${message.messageId} is missing from storage: ${ref}`
+      );
+    }
+    return {
+      ...message,
+      payload: JSON.parse(new TextDecoder().decode(bytes)),
+      payloadRef: undefined
+    };
+  }
+}
@@ -17,6 +17,7 @@ import {
   isGoogleWorkspaceEnabled
 } from "@nodetool-ai/config";
 import { getAssetAdapter, getTempAdapter } from "./lib/storage.js";
+import { RunNodeStateCheckpointStore } from "./run-checkpoint-store.js";
 import { createTempUrlResolver } from "./lib/temp-url-resolver.js";
 import {
   isBoolean,
@@ -44,9 +45,11 @@ import {
 import {
   Graph,
   withExplicitNodeFlags,
+  type ChromeTrace,
   type NodeExecutor,
   type NodeTypeResolver,
-  type NodeValidator
+  type NodeValidator,
+  type RunProfile
 } from "@nodetool-ai/kernel";
 import {
   ExecutionSession,
@@ -1527,6 +1530,9 @@ const GUEST_TOOL_PREFIX = "tools.";
 /** Threads whose codeact `state` this connection keeps between turns. */
 const MAX_CODEACT_STATE_THREADS = 8;
 
+/** Finished runs whose profile `get_job_profile` can still return. */
+const RECENT_PROFILES_LIMIT = 16;
+
 /** Recover the plain tool name from a `tools.<name>` slip. */
 export function normalizeToolCallName(name: string): string {
   return name.startsWith(GUEST_TOOL_PREFIX)
@@ -1757,6 +1763,8 @@ export interface RunJobRequest {
     persistence?: "job" | "session";
     event_detail?: "full" | "outputs" | "terminal";
     asset_persistence?: "auto" | "temporary";
+    /** Checkpoint node outputs so a lost run resumes. Job persistence only. */
+    checkpoint?: boolean;
   };
   /**
    * Supervise this run (docs/workflow-supervisor-design.md). Off unless the
@@ -1766,6 +1774,17 @@ export interface RunJobRequest {
   supervise?: boolean;
   /** Supervisor configuration. Ignored unless `supervise` is true. */
   supervisor?: SupervisorRunOptions | null;
+  /**
+   * Profile this run. Its Chrome trace and per-node/per-edge summary are
+   * then available from `get_job_profile` while it runs and for a while
+   * after it finishes.
+   */
+  profile?: boolean;
+  /**
+   * Run only these nodes and their ancestors; the rest of the graph is
+   * skipped. For previewing one output of a large graph.
+   */
+  target_nodes?: string[] | null;
   /** Internal monotonic timestamp captured when runJob accepts the request. */
   _accepted_at_ms?: number;
   settings?: Record<string, unknown>;
@@ -1790,21 +1809,24 @@ export interface RunJobExecutionOptions {
   persistence: "job" | "session";
   eventDetail: "full" | "outputs" | "terminal";
   assetPersistence: "auto" | "temporary";
+  checkpoint: boolean;
 }
 
 export const DEFAULT_RUN_JOB_EXECUTION_OPTIONS: Readonly<RunJobExecutionOptions> =
   Object.freeze({
     persistence: "job",
     eventDetail: "full",
-    assetPersistence: "auto"
+    assetPersistence: "auto",
+    checkpoint: false
   });
 
 export function resolveRunJobExecutionOptions(
   value: RunJobRequest["execution_options"],
   sdkDefaults = false
 ): RunJobExecutionOptions {
+  const persistence = value?.persistence === "session" ? "session" : "job";
   return {
-    persistence: value?.persistence === "session" ? "session" : "job",
+    persistence,
     eventDetail:
       value?.event_detail === "outputs" || value?.event_detail === "terminal"
         ? value.event_detail
@@ -1813,10 +1835,36 @@ export function resolveRunJobExecutionOptions(
       value?.asset_persistence === "temporary" ||
       (value?.asset_persistence == null && sdkDefaults)
         ? "temporary"
-        : "auto"
+        : "auto",
+    checkpoint: persistence === "job" && value?.checkpoint === true
   };
 }
 
+/**
+ * Where a checkpointed run keeps its request on the Job row. The row already
+ * holds the graph, params, name, workflow and user; this is everything else
+ * (target nodes, execution options, supervision, settings, …), so a recovered
+ * run executes exactly as it was started.
+ */
+const RUN_REQUEST_KEY = "run_request";
+
+/** The run options a restart needs that the Job row does not hold. */
+function recoverableRunRequest(req: RunJobRequest): Partial<RunJobRequest> {
+  // The auth token is a credential, not an option: it never reaches the row.
+  const {
+    job_id,
+    workflow_id,
+    user_id,
+    auth_token,
+    job_name,
+    params,
+    graph,
+    _accepted_at_ms,
+    ...options
+  } = req;
+  return options;
+}
+
 export function resolveRunJobUserId(
   requestUserId: string | undefined,
   connectionUserId: string | null
@@ -1854,6 +1902,8 @@ interface ActiveJob {
   error?: string;
   requireTerminalResult: boolean;
   executionOptions: RunJobExecutionOptions;
+  /** Where this run's checkpoints go, when it asked for them. */
+  checkpointStore?: RunNodeStateCheckpointStore;
   timings: {
     acceptedAt: number;
     queueMs: number;
@@ -2150,6 +2200,14 @@ export class UnifiedWebSocketRunner {
 
   private sendLock: Promise<void> = Promise.resolve();
   private activeJobs = new Map<string, ActiveJob>();
+  /**
+   * Profiles of the most recent finished profiled runs, oldest first, so
+   * `get_job_profile` still answers after a run leaves `activeJobs`.
+   */
+  private recentProfiles = new Map<
+    string,
+    { profile: RunProfile; trace: ChromeTrace }
+  >();
   /**
    * Runs that arrived while {@link MAX_CONCURRENT_JOBS} runs were already in
    * flight. They start automatically (FIFO) as active jobs finish.
@@ -3714,10 +3772,20 @@ export class UnifiedWebSocketRunner {
     // Which machine holds this run's session, for owner-aware reconnects and
     // cross-instance cancel. Null on a single-machine deployment.
     const instanceId = getInstanceId();
+    // A row left `recovering` was running when its server went away; its
+    // completed nodes are checkpointed and need not run again.
+    let recovering = false;
     if (executionOptions.persistence === "job") {
       try {
         const existing = await Job.get(jobId);
+        // Only a checkpointed run can be recovered, so only it keeps its
+        // request; a recovering row already holds the one it started with.
+        const runRequest =
+          executionOptions.checkpoint && existing?.status !== "recovering"
+            ? { [RUN_REQUEST_KEY]: recoverableRunRequest(req) }
+            : null;
         if (existing) {
+          recovering = existing.status === "recovering";
           if (existing.status === "cancelled") {
             log.info("Skipping start of cancelled job", { jobId });
             // Nothing was registered in activeJobs yet — free the reserved
@@ -3738,6 +3806,12 @@ export class UnifiedWebSocketRunner {
           // Was persisted as "queued" while waiting for a slot — flip it to
           // running now that it's actually starting. The stamp goes on here
           // too: the queued row may have been written by another instance.
+          if (runRequest) {
+            existing.metadata_json = {
+              ...(existing.metadata_json ?? {}),
+              ...runRequest
+            };
+          }
           if (
             existing.status !== "running" ||
             existing.runner_instance !== instanceId
@@ -3745,6 +3819,8 @@ export class UnifiedWebSocketRunner {
             existing.markRunning();
             existing.runner_instance = instanceId;
             await existing.save();
+          } else if (runRequest) {
+            await existing.save();
           }
         } else {
           await Job.create({
@@ -3756,7 +3832,8 @@ export class UnifiedWebSocketRunner {
             started_at: new Date().toISOString(),
             params: req.params ?? {},
             graph,
-            runner_instance: instanceId
+            runner_instance: instanceId,
+            metadata_json: runRequest
           });
         }
       } catch (error) {
@@ -3806,6 +3883,23 @@ export class UnifiedWebSocketRunner {
     if (supervisor) {
       sessionOptions.supervisor = supervisor;
     }
+    if (req.profile) {
+      sessionOptions.profile = {};
+    }
+    if (req.target_nodes?.length) {
+      sessionOptions.targetNodes = req.target_nodes;
+    }
+    // Opt-in: a checkpoint is a row (and for large buffers a blob) per
+    // completed node, deleted once the job reaches a terminal status.
+    const checkpointStore = executionOptions.checkpoint
+      ? new RunNodeStateCheckpointStore({ storage: getTempAdapter() })
+      : undefined;
+    if (checkpointStore) {
+      sessionOptions.checkpoint = {
+        store: checkpointStore,
+        resume: recovering
+      };
+    }
     // A graph this runtime cannot honour (unknown model, unregistered
     // provider, missing credential) is refused before the kernel starts.
     // Route it through the same terminal `job_update` a failed pre-run hook
@@ -3836,6 +3930,7 @@ export class UnifiedWebSocketRunner {
       status: "running",
       requireTerminalResult: req.require_terminal_result === true,
       executionOptions,
+      checkpointStore,
       timings: {
         acceptedAt,
         queueMs: Math.max(0, preparationStartedAt - acceptedAt),
@@ -3987,11 +4082,25 @@ export class UnifiedWebSocketRunner {
       // window, so a client reconnecting shortly after still gets the tail
       // (and the outcome) before the persisted row becomes the only source.
       active.runSession?.finish(active.status);
+      this.retainProfile(active);
       this.activeJobs.delete(active.jobId);
       this.drainQueue();
     }
   }
 
+  /** Keep a finished profiled run's profile for `get_job_profile`. */
+  private retainProfile(active: ActiveJob): void {
+    const profile = active.session.profile();
+    const trace = active.session.chromeTrace();
+    if (!profile || !trace) return;
+    this.recentProfiles.delete(active.jobId);
+    this.recentProfiles.set(active.jobId, { profile, trace });
+    while (this.recentProfiles.size > RECENT_PROFILES_LIMIT) {
+      const oldest = this.recentProfiles.keys().next().value as string;
+      this.recentProfiles.delete(oldest);
+    }
+  }
+
   /**
    * Write the run's terminal status onto the persisted Job row. Skipped for
    * explicitly session-scoped runs, which own no row. Never throws —
@@ -4037,6 +4146,15 @@ export class UnifiedWebSocketRunner {
     } catch (error) {
       this.logError("job persistence (final status) failed", error);
     }
+    // A suspended run resumes later; any other outcome is final, and nothing
+    // will read its checkpoints again.
+    if (active.checkpointStore && active.status !== "suspended") {
+      try {
+        await active.checkpointStore.clear(active.jobId);
+      } catch (error) {
+        this.logError("checkpoint cleanup failed", error);
+      }
+    }
   }
 
   /**
@@ -4532,6 +4650,9 @@ export class UnifiedWebSocketRunner {
           !job.runner_instance ||
           !instanceId ||
           job.runner_instance === instanceId;
+        // A lost run that checkpointed its nodes starts again instead,
+        // resuming where it stopped; this connection receives its frames.
+        if (ownedHere && (await this.recoverJob(job))) return;
         if (ownedHere) {
           try {
             job.markFailed(
@@ -4585,6 +4706,44 @@ export class UnifiedWebSocketRunner {
     }
   }
 
+  /**
+   * Start a lost run again under its own job id, with the request it was
+   * started with, when it left checkpoints. The row goes to `recovering`,
+   * which is what makes `startJobInner` resume from them. Returns false,
+   * having done nothing, when there is nothing to resume from or the
+   * original request was not kept: a run restarted with other options could
+   * execute a different subgraph, so it is failed instead.
+   */
+  private async recoverJob(job: Job): Promise<boolean> {
+    const graph = job.graph as RunJobRequest["graph"] | null;
+    const stored = job.metadata_json?.[RUN_REQUEST_KEY];
+    if (job.status !== "running" || !graph || !isRecord(stored)) {
+      return false;
+    }
+    // SAFETY: written by `recoverableRunRequest` from this run's request.
+    const original = stored as Partial<RunJobRequest>;
+    try {
+      if (!(await RunNodeStateCheckpointStore.has(job.id))) return false;
+      job.markRecovering();
+      await job.save();
+    } catch (error) {
+      this.logError("job recovery failed", error);
+      return false;
+    }
+    log.info("Resuming lost job from checkpoints", { jobId: job.id });
+    await this.runJob({
+      ...original,
+      job_id: job.id,
+      workflow_id: job.workflow_id || undefined,
+      user_id: job.user_id,
+      job_name: job.name,
+      params: job.params ?? {},
+      graph,
+      execution_options: { ...original.execution_options, checkpoint: true }
+    });
+    return true;
+  }
+
   async resumeJob(
     jobId: string,
     workflowId?: string,
@@ -4728,6 +4887,26 @@ export class UnifiedWebSocketRunner {
     };
   }
 
+  /**
+   * A profiled run's Chrome trace (open it in Perfetto) and its per-node and
+   * per-edge summary — live for a running job, final for a recently finished
+   * one.
+   */
+  getJobProfile(jobId: string): Record<string, unknown> {
+    const active = this.activeJobs.get(jobId);
+    if (active) {
+      const profile = active.session.profile();
+      const trace = active.session.chromeTrace();
+      if (!profile || !trace) {
+        return { error: "job was not started with profile: true", job_id: jobId };
+      }
+      return { job_id: jobId, status: active.status, profile, trace };
+    }
+    const recent = this.recentProfiles.get(jobId);
+    if (!recent) return { status: "not_found", job_id: jobId };
+    return { job_id: jobId, status: "finished", ...recent };
+  }
+
   getStatus(jobId?: string) {
     if (jobId) {
       const active = this.activeJobs.get(jobId);
@@ -8831,6 +9010,9 @@ export class UnifiedWebSocketRunner {
       }
       case "get_status":
         return this.getStatus(jobId);
+      case "get_job_profile":
+        if (!jobId) return { error: "job_id is required" };
+        return this.getJobProfile(jobId);
       case "set_mode": {
         const mode = data.mode;
         if (mode !== "binary" && mode !== "text") {
@@ -0,0 +1,159 @@
+import { mkdtempSync, rmSync } from "node:fs";
+import { tmpdir } from "node:os";
+import { join } from "node:path";
+import { afterEach, beforeEach, describe, expect, it } from "vitest";
+import { closeDb, initDb, RunInboxMessage } from "@nodetool-ai/models";
+import { DurableInbox, type DurableMessage } from "@nodetool-ai/kernel";
+import { InMemoryStorageAdapter } from "@nodetool-ai/runtime";
+import { GroupCommitDurableInboxStore } from "../src/triggers/group-commit-inbox-store.js";
+
+let dbDir: string;
+
+function message(
+  messageId: string,
+  seq: number,
+  overrides: Partial<DurableMessage> = {}
+): DurableMessage {
+  return {
+    id: messageId,
+    runId: "r1",
+    nodeId: "n1",
+    handle: "trigger",
+    messageId,
+    seq,
+    payload: { seq },
+    status: "pending",
+    createdAt: new Date("2026-01-01T00:00:00.000Z"),
+    ...overrides
+  };
+}
+
+beforeEach(() => {
+  dbDir = mkdtempSync(join(tmpdir(), "group-commit-inbox-"));
+  initDb(join(dbDir, "test.sqlite3"));
+});
+
+afterEach(() => {
+  closeDb();
+  rmSync(dbDir, { recursive: true, force: true });
+});
+
+describe("GroupCommitDurableInboxStore", () => {
+  it("commits concurrent appends across inboxes together", async () => {
+    const store = new GroupCommitDurableInboxStore({ windowMs: 5 });
+    const inboxes = ["a", "b", "c", "d"].map(
+      (nodeId) => new DurableInbox("r1", nodeId, store)
+    );
+
+    await Promise.all(inboxes.map((inbox) => inbox.append("trigger", 1)));
+
+    expect(store.stats).toMatchObject({ commits: 1, saved: 4, largestBatch: 4 });
+    for (const nodeId of ["a", "b", "c", "d"]) {
+      const rows = await RunInboxMessage.findPending("r1", nodeId, "trigger");
+      expect(rows.map((r) => r.msg_seq)).toEqual([1]);
+    }
+  });
+
+  it("closes a batch early when it fills", async () => {
+    const store = new GroupCommitDurableInboxStore({
+      windowMs: 10_000,
+      maxBatch: 2
+    });
+
+    await Promise.all([store.save(message("m1", 1)), store.save(message("m2", 2))]);
+
+    expect(store.stats.commits).toBe(1);
+  });
+
+  it("answers reads from writes that have not committed yet", async () => {
+    const store = new GroupCommitDurableInboxStore({ windowMs: 10_000 });
+    await store.save(message("m1", 1));
+    await store.flush();
+
+    const saving = store.save(message("m2", 2));
+    const consuming = store.markConsumed("m1");
+
+    expect(await store.getMaxSeq("r1", "n1", "trigger")).toBe(2);
+    expect((await store.findByMessageId("m2"))?.payload).toEqual({ seq: 2 });
+    expect((await store.findByMessageId("m1"))?.status).toBe("consumed");
+    expect(
+      (await store.findPending("r1", "n1", "trigger", 10)).map((m) => m.messageId)
+    ).toEqual(["m2"]);
+    expect(await RunInboxMessage.findPending("r1", "n1", "trigger")).toHaveLength(
+      1
+    );
+
+    await store.flush();
+    await Promise.all([saving, consuming]);
+    const rows = await RunInboxMessage.findPending("r1", "n1", "trigger");
+    expect(rows.map((r) => r.message_id)).toEqual(["m2"]);
+  });
+
+  it("writes a message consumed in its own batch as one consumed row", async () => {
+    const store = new GroupCommitDurableInboxStore({ windowMs: 10_000 });
+    const saving = store.save(message("m1", 1));
+    const consuming = store.markConsumed("m1");
+    await store.flush();
+    await Promise.all([saving, consuming]);
+
+    expect(store.stats).toMatchObject({ commits: 1, saved: 1, consumed: 0 });
+    const stored = await new GroupCommitDurableInboxStore().findByMessageId("m1");
+    expect(stored?.status).toBe("consumed");
+    expect(stored?.consumedAt).toBeInstanceOf(Date);
+  });
+
+  it("keeps the first copy of a duplicate message id", async () => {
+    const store = new GroupCommitDurableInboxStore();
+    await store.save(message("m1", 1));
+    await store.save(message("m1", 1, { payload: "second" }));
+
+    expect((await store.findByMessageId("m1"))?.payload).toEqual({ seq: 1 });
+    expect(await RunInboxMessage.findPending("r1", "n1", "trigger")).toHaveLength(
+      1
+    );
+  });
+
+  it("spills large payloads to storage and reads them back", async () => {
+    const storage = new InMemoryStorageAdapter();
+    const store = new GroupCommitDurableInboxStore({
+      storage,
+      payloadThresholdBytes: 100
+    });
+    const big = { text: "x".repeat(500) };
+    await store.save(message("big", 1, { payload: big }));
+    await store.save(message("small", 2));
+    await store.save(
+      message("ref", 3, { payload: null, payloadRef: "s3://bucket/own" })
+    );
+
+    const rows = await RunInboxMessage.findPending("r1", "n1", "trigger");
+    expect(rows[0].payload_json).toBeNull();
+    expect(rows[0].payload_ref).toMatch(/^memory:\/\/inbox-payloads\//);
+    expect(rows[1].payload_json).toEqual({ seq: 2 });
+    expect(store.stats.spilled).toBe(1);
+
+    const reader = new GroupCommitDurableInboxStore({ storage });
+    const pending = await reader.findPending("r1", "n1", "trigger", 10);
+    expect(pending[0]).toMatchObject({ payload: big, payloadRef: undefined });
+    expect(pending[2]).toMatchObject({
+      payload: null,
+      payloadRef: "s3://bucket/own"
+    });
+
+    await reader.markConsumed("big");
+    expect(await reader.deleteConsumed("r1", "n1", "trigger", 10)).toBe(1);
+    expect(await storage.exists(rows[0].payload_ref!)).toBe(false);
+  });
+
+  it("rejects every write in a batch that fails to commit", async () => {
+    const store = new GroupCommitDurableInboxStore({ windowMs: 10_000 });
+    const saving = store.save(message("m1", 1)).catch((err: unknown) => err);
+    closeDb();
+
+    await store.flush();
+    expect(await saving).toBeInstanceOf(Error);
+    expect(store.stats.commits).toBe(0);
+    initDb(join(dbDir, "test.sqlite3"));
+    expect(await store.findByMessageId("m1")).toBeNull();
+  });
+});
@@ -10,7 +10,8 @@
  * These tests drive `streamJobMessages` directly against a fake ActiveJob (the
  * same harness `unified-websocket-runner-runjob-coverage.test.ts` uses) so the
  * disconnect can be timed precisely mid-run, and wire the session exactly as
- * `startJobInner` does.
+ * `startJobInner` does. A run whose process died is the exception: it is
+ * started for real, so its resume can be checked against its checkpoints.
  */
 import { describe, it, expect, vi, beforeEach, afterEach } from "vitest";
 import { unpack } from "msgpackr";
@@ -24,6 +25,7 @@ import {
   jobRunRegistry,
   type JobRunExecutionHooks
 } from "../src/job-run-registry.js";
+import { RunNodeStateCheckpointStore } from "../src/run-checkpoint-store.js";
 import { initTestDb, Job } from "@nodetool-ai/models";
 
 class MockWebSocket implements WebSocketConnection {
@@ -503,3 +505,169 @@ describe("workflow runs survive a dropped socket", () => {
     expect(row?.status).toBe("suspended");
   });
 });
+
+describe("a lost run that checkpointed its nodes", () => {
+  const jobId = "resilient-job-checkpoint";
+  const graph = {
+    nodes: [
+      { id: "gen", type: "test.Generate", properties: {} },
+      { id: "slow", type: "test.Slow", properties: {} },
+      // Outside the requested target subgraph: never runs.
+      { id: "other", type: "test.Other", properties: {} }
+    ],
+    edges: [
+      {
+        id: "e1",
+        source: "gen",
+        sourceHandle: "output",
+        target: "slow",
+        targetHandle: "value"
+      }
+    ]
+  };
+
+  beforeEach(async () => {
+    await initTestDb();
+  });
+
+  afterEach(() => {
+    registeredJobIds.push(jobId);
+    dropRegisteredRuns();
+  });
+
+  it("resumes from its checkpoints on reconnect instead of failing", async () => {
+    const calls: string[] = [];
+    let stall = true;
+    let release = () => {};
+    const stalled = new Promise<void>((resolve) => (release = resolve));
+    const countingExecutor = (node: { id: string }) => ({
+      async process(inputs: Record<string, unknown>) {
+        calls.push(node.id);
+        if (node.id === "slow" && stall) await stalled;
+        return { output: `${node.id}:${String(inputs.value ?? "")}` };
+      }
+    });
+
+    // First attempt: gen completes and is checkpointed, slow never returns.
+    const wsA = new MockWebSocket();
+    const runnerA = new UnifiedWebSocketRunner({
+      resolveExecutor: countingExecutor
+    });
+    await runnerA.connect(wsA);
+    await runnerA.runJob({
+      job_id: jobId,
+      workflow_id: "wf",
+      graph,
+      target_nodes: ["slow"],
+      execution_options: { checkpoint: true, event_detail: "outputs" }
+    });
+    await waitFor(() => calls.includes("slow"), "slow to start");
+    for (let i = 0; !(await RunNodeStateCheckpointStore.has(jobId)); i++) {
+      if (i > 500) throw new Error("timed out waiting for the checkpoint");
+      await new Promise((resolve) => setTimeout(resolve, 10));
+    }
+
+    // The process dies: its session and in-memory job are gone, the row
+    // still says running.
+    const lost = asAny(runnerA).activeJobs.get(jobId) as {
+      session: { cancel(): void };
+      streamTask?: Promise<void>;
+    };
+    asAny(runnerA).activeJobs.delete(jobId);
+    jobRunRegistry.drop(jobRunRegistry.get("1", jobId)!);
+
+    stall = false;
+    calls.length = 0;
+    const wsB = new MockWebSocket();
+    const runnerB = new UnifiedWebSocketRunner({
+      resolveExecutor: countingExecutor
+    });
+    await runnerB.connect(wsB);
+    await runnerB.handleCommand({
+      command: "reconnect_job",
+      data: { job_id: jobId, workflow_id: "wf" }
+    });
+    const resumed = asAny(runnerB).activeJobs.get(jobId) as
+      | {
+          streamTask?: Promise<void>;
+          executionOptions: { eventDetail: string; checkpoint: boolean };
+        }
+      | undefined;
+    expect(resumed?.executionOptions).toMatchObject({
+      eventDetail: "outputs",
+      checkpoint: true
+    });
+    await resumed!.streamTask;
+
+    // Resumed with its original request: gen is restored from its
+    // checkpoint, and `other` stays outside the target subgraph.
+    expect(calls).toEqual(["slow"]);
+    const update = decodeAll(wsB).find(
+      (m) => m.type === "job_update" && m.status === "completed"
+    );
+    expect(update?.job_id).toBe(jobId);
+    const row = (await Job.get(jobId)) as Job | null;
+    expect(row?.status).toBe("completed");
+    // Over, so nothing will resume it again: the checkpoints are gone.
+    expect(await RunNodeStateCheckpointStore.has(jobId)).toBe(false);
+
+    lost.session.cancel();
+    release();
+    await lost.streamTask;
+    await runnerA.disconnect();
+    await runnerB.disconnect();
+  });
+
+  it("fails a lost run whose request was not kept", async () => {
+    await Job.create({
+      id: jobId,
+      workflow_id: "wf",
+      user_id: "1",
+      status: "running",
+      params: {},
+      graph
+    });
+    await new RunNodeStateCheckpointStore().save(jobId, {
+      nodeId: "gen",
+      fingerprint: "fp-gen",
+      emissions: [{ outputs: { output: "gen:" } }],
+      result: { output: "gen:" }
+    });
+    const ws = new MockWebSocket();
+    const runner = new UnifiedWebSocketRunner({ resolveExecutor });
+    await runner.connect(ws);
+    await runner.handleCommand({
+      command: "reconnect_job",
+      data: { job_id: jobId, workflow_id: "wf" }
+    });
+
+    // Restarting without its target nodes and options could run another
+    // subgraph, so the run is failed rather than recovered.
+    const row = (await Job.get(jobId)) as Job | null;
+    expect(row?.status).toBe("failed");
+    expect(asAny(runner).activeJobs.has(jobId)).toBe(false);
+    await runner.disconnect();
+  });
+
+  it("fails a lost run that did not checkpoint", async () => {
+    await Job.create({
+      id: jobId,
+      workflow_id: "wf",
+      user_id: "1",
+      status: "running",
+      params: {},
+      graph
+    });
+    const ws = new MockWebSocket();
+    const runner = new UnifiedWebSocketRunner({ resolveExecutor });
+    await runner.connect(ws);
+    await runner.handleCommand({
+      command: "reconnect_job",
+      data: { job_id: jobId, workflow_id: "wf" }
+    });
+
+    const row = (await Job.get(jobId)) as Job | null;
+    expect(row?.status).toBe("failed");
+    await runner.disconnect();
+  });
+});
@@ -0,0 +1,135 @@
+import { mkdtempSync, rmSync } from "node:fs";
+import { tmpdir } from "node:os";
+import { join } from "node:path";
+import { afterEach, beforeEach, describe, expect, it } from "vitest";
+import { closeDb, initDb, RunNodeState } from "@nodetool-ai/models";
+import { WorkflowRunner, type NodeCheckpoint } from "@nodetool-ai/kernel";
+import { InMemoryStorageAdapter } from "@nodetool-ai/runtime";
+import { RunNodeStateCheckpointStore } from "../src/run-checkpoint-store.js";
+
+let dbDir: string;
+
+function checkpoint(
+  nodeId: string,
+  outputs: Record<string, unknown>
+): NodeCheckpoint {
+  return {
+    nodeId,
+    fingerprint: `fp-${nodeId}`,
+    emissions: [{ outputs, lineage: { fe: { id: "t", index: 1 } } as never }],
+    result: outputs
+  };
+}
+
+beforeEach(() => {
+  dbDir = mkdtempSync(join(tmpdir(), "run-checkpoint-store-"));
+  initDb(join(dbDir, "test.sqlite3"));
+});
+
+afterEach(() => {
+  closeDb();
+  rmSync(dbDir, { recursive: true, force: true });
+});
+
+describe("RunNodeStateCheckpointStore", () => {
+  it("round-trips checkpoints through completed node rows", async () => {
+    const store = new RunNodeStateCheckpointStore();
+    const saved = checkpoint("n1", {
+      text: "hi",
+      image: { type: "image", data: new Uint8Array([1, 2, 3]) }
+    });
+    await store.save("r1", saved);
+    await store.save("r2", checkpoint("n1", { text: "other run" }));
+
+    const row = await RunNodeState.getNodeState("r1", "n1");
+    expect(row?.status).toBe("completed");
+    expect(await store.load("r1")).toEqual([saved]);
+  });
+
+  it("moves large buffers to storage and keeps only the URI", async () => {
+    const storage = new InMemoryStorageAdapter();
+    const store = new RunNodeStateCheckpointStore({
+      storage,
+      bytesThreshold: 16
+    });
+    const big = new Uint8Array(64).fill(7);
+    await store.save("r1", checkpoint("n1", { audio: { data: big } }));
+
+    const row = await RunNodeState.getNodeState("r1", "n1");
+    expect(JSON.stringify(row?.outputs_json)).toContain("__checkpoint_ref__");
+    const [loaded] = await store.load("r1");
+    expect(loaded.result).toEqual({ audio: { data: big } });
+
+    // Without the bytes the checkpoint is skipped, not fatal.
+    const reader = new RunNodeStateCheckpointStore();
+    expect(await reader.load("r1")).toEqual([]);
+  });
+
+  it("clears a run's rows and moved buffers, and only that run's", async () => {
+    const storage = new InMemoryStorageAdapter();
+    const store = new RunNodeStateCheckpointStore({
+      storage,
+      bytesThreshold: 16
+    });
+    const big = { data: new Uint8Array(64).fill(7) };
+    await store.save("r1", checkpoint("n1", { audio: big }));
+    await store.save("r2", checkpoint("n1", { audio: big }));
+    expect(await RunNodeStateCheckpointStore.has("r1")).toBe(true);
+
+    await store.clear("r1");
+    expect(await RunNodeStateCheckpointStore.has("r1")).toBe(false);
+    expect(await RunNodeState.getNodeState("r1", "n1")).toBeNull();
+    expect((await storage.list("run-checkpoints/r1/")).entries).toEqual([]);
+    expect((await storage.list("run-checkpoints/r2/")).entries).toHaveLength(
+      1
+    );
+    expect(await store.load("r2")).toHaveLength(1);
+  });
+
+  it("lets a recovered run skip the nodes it already completed", async () => {
+    const store = new RunNodeStateCheckpointStore();
+    const calls: string[] = [];
+    const graph = {
+      nodes: [
+        { id: "input", type: "test.Input", name: "x" },
+        { id: "gen", type: "test.Generate" },
+        { id: "out", type: "test.Output", name: "result" }
+      ],
+      edges: [
+        {
+          id: "e1",
+          source: "input",
+          sourceHandle: "value",
+          target: "gen",
+          targetHandle: "prompt"
+        },
+        {
+          id: "e2",
+          source: "gen",
+          sourceHandle: "output",
+          target: "out",
+          targetHandle: "value"
+        }
+      ]
+    };
+    const run = (resume: boolean) =>
+      new WorkflowRunner("job-1", {
+        resolveExecutor: (node) => ({
+          async process(inputs) {
+            calls.push(node.id);
+            return node.id === "gen"
+              ? { output: new Uint8Array([9, 9]) }
+              : inputs;
+          }
+        }),
+        checkpoint: { store, resume }
+      }).run({ job_id: "job-1", params: { x: "cat" } }, graph as never);
+
+    await run(false);
+    calls.length = 0;
+    const resumed = await run(true);
+    expect(resumed.status).toBe("completed");
+    expect(calls).toEqual([]);
+    expect(resumed.outputs.result).toEqual([new Uint8Array([9, 9])]);
+  });
+});
@@ -314,6 +314,24 @@ describe("handleCommand dispatch (non-RPC branches)", () => {
     await runner.disconnect();
   });
 
+  it("get_job_profile needs a job id and reports unknown jobs", async () => {
+    const runner = await makeRunner(ws);
+    const missing = await runOne(ws, runner, {
+      command: "get_job_profile",
+      data: {}
+    });
+    expect(missing.error).toBe("job_id is required");
+
+    ws.sentBytes.length = 0;
+    ws.sentText.length = 0;
+    const unknown = await runOne(ws, runner, {
+      command: "get_job_profile",
+      data: { job_id: "nope" }
+    });
+    expect(unknown).toMatchObject({ status: "not_found", job_id: "nope" });
+    await runner.disconnect();
+  });
+
   it("stop emits generation_stopped then a processed ack", async () => {
     const runner = await makeRunner(ws);
     ws.queue.push({
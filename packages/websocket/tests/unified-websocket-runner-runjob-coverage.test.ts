@@ -212,13 +212,26 @@ describe("run_job execution option defaults", () => {
     expect(resolveRunJobExecutionOptions(undefined, true)).toEqual({
       persistence: "job",
       eventDetail: "full",
-      assetPersistence: "temporary"
+      assetPersistence: "temporary",
+      checkpoint: false
     });
     expect(
       resolveRunJobExecutionOptions({ asset_persistence: "auto" }, true)
     ).toEqual(DEFAULT_RUN_JOB_EXECUTION_OPTIONS);
   });
 
+  it("checkpoints only job-persisted runs that ask for it", () => {
+    expect(resolveRunJobExecutionOptions({ checkpoint: true }).checkpoint).toBe(
+      true
+    );
+    expect(
+      resolveRunJobExecutionOptions({
+        persistence: "session",
+        checkpoint: true
+      }).checkpoint
+    ).toBe(false);
+  });
+
   it("treats a blank request user id as absent", () => {
     expect(resolveRunJobUserId("", "connection-user")).toBe(
       "connection-user"